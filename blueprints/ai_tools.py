@@ -382,7 +382,7 @@ def api_ai_tools_vision():
 def api_ai_tools_chat():
     """도구 결과에 대한 추가 대화"""
     try:
-        from openai import OpenAI
+        from scripts.common.llm_clients import require_client
 
         data = request.get_json()
         message = data.get('message', '')
@@ -392,7 +392,7 @@ def api_ai_tools_chat():
         if not message:
             return jsonify({"ok": False, "error": "메시지를 입력하세요"})
 
-        client = OpenAI()
+        client = require_client("openai")
 
         messages = [
             {
@@ -513,8 +513,7 @@ def run_bible_episode_pipeline(
             )
             print(f"[BIBLE] 테스트 에피소드 생성: {len(filtered_verses)}개 절", flush=True)
         else:
-            episodes = pipeline.generate_all_bible_episodes()
-            episode = next((ep for ep in episodes if ep.day_number == day_number), None)
+            episode = pipeline.get_episode_by_day(day_number)
 
             if not episode:
                 return {"ok": False, "error": f"Day {day_number} 에피소드를 찾을 수 없습니다"}
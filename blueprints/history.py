@@ -939,7 +939,8 @@ def api_history_generate_image():
     {
         "episode_id": "ep022",
         "timestamp_sec": 0,
-        "prompt": "establishing_shot, massive Khitan cavalry..."
+        "prompt": "establishing_shot, massive Khitan cavalry...",
+        "regenerate": false     # true면 같은 프롬프트의 캐시 이미지를 쓰지 않고 새로 생성 (Gemini)
     }
 
     Output:
@@ -958,6 +959,7 @@ def api_history_generate_image():
         timestamp_sec = data.get("timestamp_sec", 0)
         prompt = data.get("prompt", "")
         use_gpu = data.get("use_gpu", True)  # 기본값: GPU 사용
+        regenerate = bool(data.get("regenerate"))  # '다시 생성' 요청이면 캐시를 건너뛰고 새로 생성
 
         if not episode_id or not prompt:
             return jsonify({"ok": False, "error": "episode_id and prompt required"}), 400
@@ -992,7 +994,8 @@ hand-painted feel with clean aesthetic, accessible and friendly, bright warm pal
                 prompt=full_prompt,
                 size="1280x720",
                 output_dir=output_dir,
-                add_aspect_instruction=True
+                add_aspect_instruction=True,
+                use_cache=not regenerate
             )
 
         if result.get("ok"):
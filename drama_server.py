@@ -1,4 +1,7 @@
 import os
+import time as _startup_time
+_STARTUP_BEGIN = _startup_time.perf_counter()  # 모듈 로드 시간 측정 (scripts/profile_startup.py 참고)
+
 from dotenv import load_dotenv
 load_dotenv()  # .env 파일 로드
 
@@ -15,8 +18,12 @@ import tempfile
 import requests
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime as dt
-from flask import Flask, render_template, request, jsonify, send_file, Response, redirect, send_from_directory
-from openai import OpenAI
+from flask import Flask, render_template, request, jsonify, send_file, Response, redirect, send_from_directory, stream_with_context
+
+
+# ===== LLM 클라이언트 레지스트리 =====
+# openai SDK는 첫 API 호출 시점에 import, 클라이언트는 (제공자, 키, 타임아웃)별로 공유
+from scripts.common import llm_clients, script_analysis
 
 # Routes Blueprint 등록
 from routes import register_blueprints
@@ -184,9 +191,11 @@ video_jobs = {}  # {job_id: {status, progress, result, error, created_at}}
 video_jobs_lock = threading.Lock()
 VIDEO_JOBS_FILE = 'data/video_jobs.json'
 
-# ===== 파이프라인 동시 실행 방지 Lock =====
-# cron job이 동시에 여러 worker에서 실행되는 것을 방지
-pipeline_lock = threading.Lock()
+# ===== 파이프라인 동시 실행 방지 Lease =====
+# cron job이 동시에 여러 worker(프로세스)에서 실행되는 것을 방지
+# 파일 락 기반 리스라 gunicorn 워커 간에도 공유됨 (threading.Lock과 같은 acquire/release 인터페이스)
+from pipeline_lease import PipelineLease, claim_first, is_leased, sheet_lease_name, MAX_CONCURRENT as PIPELINE_MAX_CONCURRENT
+pipeline_lock = PipelineLease('bible')  # BIBLE 전용 엔드포인트 (blueprints/bible.py)
 
 # ===== 서버 시작 시간 (orphan 작업 감지용) =====
 # 서버 재시작 전에 시작된 "처리중" 작업을 자동 감지하여 실패 처리
@@ -299,7 +308,7 @@ def video_worker():
             print(f"[VIDEO-WORKER] 워커 루프 오류: {str(e)}")
             traceback.print_exc()
 
-# 서버 시작 시 저장된 jobs 로드
+# 서버 시작 시 저장된 jobs 로드 (preload 시 master에서 1회)
 load_video_jobs()
 
 # 서버 재시작 시 pending/processing 작업 정리
@@ -319,10 +328,30 @@ def cleanup_stale_jobs():
 
 cleanup_stale_jobs()
 
-# 워커 스레드 시작
-video_worker_thread = threading.Thread(target=video_worker, daemon=True)
-video_worker_thread.start()
-print(f"[VIDEO-WORKER] 워커 스레드 시작됨 (alive: {video_worker_thread.is_alive()})")
+# ===== 백그라운드 서비스 (fork 이후 시작) =====
+# preload_app=True에서는 master가 만든 스레드가 fork된 워커로 복사되지 않으므로
+# 워커 스레드/fontconfig 갱신은 gunicorn post_fork 훅(또는 첫 요청)에서 프로세스별로 시작
+video_worker_thread = None
+_background_started_pid = None
+_background_start_lock = threading.Lock()
+
+
+def start_background_services():
+    """현재 프로세스에서 백그라운드 워커 시작 (프로세스당 1회, 중복 호출 안전)"""
+    global video_worker_thread, _background_started_pid
+    if _background_started_pid == os.getpid():
+        return
+    with _background_start_lock:
+        if _background_started_pid == os.getpid():
+            return
+        _background_started_pid = os.getpid()
+
+        video_worker_thread = threading.Thread(target=video_worker, name="video-worker", daemon=True)
+        video_worker_thread.start()
+        print(f"[VIDEO-WORKER] 워커 스레드 시작됨 (pid: {os.getpid()}, alive: {video_worker_thread.is_alive()})")
+
+        # fc-cache는 수 초가 걸릴 수 있어 요청 처리와 병렬로 실행
+        threading.Thread(target=setup_fontconfig, name="fontconfig-setup", daemon=True).start()
 
 # ===== JSON 지침 파일 로드 =====
 GUIDES_DIR = os.path.join(os.path.dirname(__file__), 'guides')
@@ -761,7 +790,8 @@ def get_client():
         print("[WARNING] OPENAI_API_KEY가 설정되지 않았습니다. API 호출 시 오류가 발생할 수 있습니다.")
         return None
     # GPT-5.1 긴 처리 시간을 위한 타임아웃 설정 (10분) - sermon_server.py와 동일
-    return OpenAI(api_key=key, timeout=600.0)
+    # 공유 클라이언트 레지스트리 사용 (keep-alive 재사용, 통계는 호출 함수별 집계)
+    return llm_clients.get_client("openai", timeout="default", api_key=key)
 
 client = get_client()
 
@@ -771,14 +801,7 @@ def get_laozhang_client():
     if not key:
         print("[LAOZHANG] API 키가 설정되지 않았습니다.")
         return None
-    try:
-        return OpenAI(
-            base_url="https://api.laozhang.ai/v1",
-            api_key=key
-        )
-    except Exception as e:
-        print(f"[LAOZHANG] 클라이언트 초기화 실패: {e}")
-        return None
+    return llm_clients.get_client("laozhang", api_key=key)
 
 laozhang_client = get_laozhang_client()
 
@@ -788,14 +811,7 @@ def get_openrouter_client():
     if not key:
         print("[OPENROUTER] API 키가 설정되지 않았습니다.")
         return None
-    try:
-        return OpenAI(
-            base_url="https://openrouter.ai/api/v1",
-            api_key=key
-        )
-    except Exception as e:
-        print(f"[OPENROUTER] 클라이언트 초기화 실패: {e}")
-        return None
+    return llm_clients.get_client("openrouter", api_key=key)
 
 openrouter_client = get_openrouter_client()
 
@@ -1104,7 +1120,7 @@ gpt_set_db_connection(get_db_connection)
 gpt_set_openai_client(laozhang_client or client)
 gpt_set_use_postgres(USE_POSTGRES)
 
-# Bible Blueprint 의존성 주입 (get_sheets_service_account, _mix_bgm_with_video, pipeline_lock는 나중에 정의됨)
+# Bible Blueprint 의존성 주입 (get_sheets_service_account, _mix_bgm_with_video, pipeline_lock(리스)는 나중에 주입됨)
 # NOTE: 실제 주입은 함수 정의 이후에 수행 (아래 참조)
 
 # ===== DB 가이드 조회 함수 =====
@@ -1347,6 +1363,12 @@ def product_manage():
 def health():
     return jsonify({"ok": True})
 
+
+@app.before_request
+def _ensure_background_services():
+    """gunicorn 훅 없이 실행된 경우(flask run 등) 첫 요청에서 백그라운드 서비스 시작"""
+    start_background_services()
+
 # ===== JSON 지침 API =====
 @app.route("/api/drama/guidelines", methods=["GET"])
 def api_get_guidelines():
@@ -3475,6 +3497,7 @@ def api_generate_image():
         prompt = data.get("prompt", "")
         size = data.get("size", "1024x1024")
         image_provider = data.get("imageProvider", "gemini")  # gemini, flux, dalle
+        regenerate = bool(data.get("regenerate"))  # '다시 생성' 요청이면 캐시를 건너뛰고 새로 생성
 
         print(f"[DRAMA-STEP4-IMAGE] 요청 수신 - Provider: {image_provider}, Size: {size}")
         print(f"[DRAMA-STEP4-IMAGE] 프롬프트 길이: {len(prompt)} 글자")
@@ -3487,7 +3510,7 @@ def api_generate_image():
             print(f"[DRAMA-STEP4-IMAGE] Gemini 3 Pro 이미지 생성 시작 - 요청 사이즈: {size}")
 
             # image 모듈의 generate_image 사용 (Gemini 3 Pro - 고품질)
-            result = image_generate(prompt=prompt, size=size, model=GEMINI_PRO)
+            result = image_generate(prompt=prompt, size=size, model=GEMINI_PRO, use_cache=not regenerate)
 
             if not result.get("ok"):
                 return jsonify({"ok": False, "error": result.get("error", "이미지 생성 실패")}), 200
@@ -3690,8 +3713,7 @@ def api_upload_bgm():
         print(f"[BGM-UPLOAD] 디렉토리: {bgm_dir}")
 
         # 기존 파일 확인하여 번호 부여
-        import glob
-        existing = glob.glob(os.path.join(bgm_dir, f"{mood}*.mp3"))
+        existing = audio_library.find_files("bgm", mood)
         num = len(existing) + 1
         filename = f"{mood}_{num:02d}.mp3"
         filepath = os.path.join(bgm_dir, filename)
@@ -3699,6 +3721,9 @@ def api_upload_bgm():
         file.save(filepath)
         print(f"[BGM-UPLOAD] 저장됨: {filepath}")
 
+        # 라이브러리 인덱스에 즉시 등록 (길이/라우드니스 분석)
+        track = audio_library.register_file(filepath, "bgm")
+
         # Git에 자동 커밋 (배포 후에도 파일 유지)
         try:
             import subprocess
@@ -3714,7 +3739,9 @@ def api_upload_bgm():
             "filename": filename,
             "path": filepath,
             "mood": mood,
-            "count": num
+            "count": num,
+            "duration": track.get("duration"),
+            "lufs": track.get("lufs")
         })
 
     except Exception as e:
@@ -3724,26 +3751,11 @@ def api_upload_bgm():
 
 @app.route('/api/bgm/list', methods=['GET'])
 def api_list_bgm():
-    """업로드된 BGM 파일 목록"""
+    """업로드된 BGM 파일 목록 (라이브러리 인덱스 - 디렉토리가 바뀐 경우에만 재스캔)"""
     try:
-        import glob
-        script_dir = os.path.dirname(os.path.abspath(__file__))
-        bgm_dir = os.path.join(script_dir, "static", "audio", "bgm")
-        os.makedirs(bgm_dir, exist_ok=True)
-
-        files = glob.glob(os.path.join(bgm_dir, "*.mp3"))
-        print(f"[BGM-LIST] 디렉토리: {bgm_dir}, 파일 수: {len(files)}")
-        moods = {}
-
-        for f in files:
-            filename = os.path.basename(f)
-            # mood 추출: hopeful_01.mp3 -> hopeful
-            mood = filename.split('_')[0].split('.')[0].split(' ')[0]
-            if mood not in moods:
-                moods[mood] = []
-            moods[mood].append(filename)
-
-        return jsonify({"ok": True, "moods": moods, "total": len(files)})
+        moods = audio_library.list_categories("bgm")
+        total = sum(len(files) for files in moods.values())
+        return jsonify({"ok": True, "moods": moods, "total": total})
 
     except Exception as e:
         return jsonify({"ok": False, "error": str(e)}), 500
@@ -4204,8 +4216,7 @@ def api_upload_sfx():
         print(f"[SFX-UPLOAD] 디렉토리: {sfx_dir}")
 
         # 기존 파일 확인하여 번호 부여
-        import glob
-        existing = glob.glob(os.path.join(sfx_dir, f"{sfx_type}*.mp3"))
+        existing = audio_library.find_files("sfx", sfx_type)
         num = len(existing) + 1
         filename = f"{sfx_type}_{num:02d}.mp3"
         filepath = os.path.join(sfx_dir, filename)
@@ -4213,6 +4224,9 @@ def api_upload_sfx():
         file.save(filepath)
         print(f"[SFX-UPLOAD] 저장됨: {filepath}")
 
+        # 라이브러리 인덱스에 즉시 등록
+        track = audio_library.register_file(filepath, "sfx")
+
         # Git에 자동 커밋 (배포 후에도 파일 유지)
         try:
             import subprocess
@@ -4228,7 +4242,8 @@ def api_upload_sfx():
             "filename": filename,
             "path": filepath,
             "type": sfx_type,
-            "count": num
+            "count": num,
+            "duration": track.get("duration")
         })
 
     except Exception as e:
@@ -4238,25 +4253,11 @@ def api_upload_sfx():
 
 @app.route('/api/sfx/list', methods=['GET'])
 def api_list_sfx():
-    """업로드된 효과음 파일 목록"""
+    """업로드된 효과음 파일 목록 (라이브러리 인덱스)"""
     try:
-        import glob
-        script_dir = os.path.dirname(os.path.abspath(__file__))
-        sfx_dir = os.path.join(script_dir, "static", "audio", "sfx")
-        os.makedirs(sfx_dir, exist_ok=True)
-
-        files = glob.glob(os.path.join(sfx_dir, "*.mp3"))
-        print(f"[SFX-LIST] 디렉토리: {sfx_dir}, 파일 수: {len(files)}")
-        types = {}
-
-        for f in files:
-            filename = os.path.basename(f)
-            sfx_type = filename.split('_')[0].split('.')[0]
-            if sfx_type not in types:
-                types[sfx_type] = []
-            types[sfx_type].append(filename)
-
-        return jsonify({"ok": True, "types": types, "total": len(files)})
+        types = audio_library.list_categories("sfx")
+        total = sum(len(files) for files in types.values())
+        return jsonify({"ok": True, "types": types, "total": total})
 
     except Exception as e:
         return jsonify({"ok": False, "error": str(e)}), 500
@@ -6042,6 +6043,12 @@ def api_worker_status():
     })
 
 
+@app.route('/api/llm/stats', methods=['GET'])
+def api_llm_stats():
+    """LLM 호출 지점별 토큰/지연 시간/캐시 히트 통계 (디버깅용)"""
+    return jsonify({"ok": True, "stats": llm_clients.get_stats()})
+
+
 # ===== Step7: 유튜브 업로드 API =====
 # NOTE: /api/drama/generate-metadata는 line 2512에 이미 정의됨 (중복 제거됨)
 
@@ -6631,8 +6638,7 @@ def youtube_callback():
         primary_channel_info = None
 
         try:
-            from googleapiclient.discovery import build
-            youtube = build('youtube', 'v3', credentials=credentials)
+            youtube = build_client('youtube', 'v3', credentials)
 
             # 1. managedByMe=True로 모든 관리 채널 조회
             try:
@@ -6871,7 +6877,6 @@ def youtube_channels():
     try:
         from google.oauth2.credentials import Credentials
         from google.auth.transport.requests import Request
-        from googleapiclient.discovery import build
 
         # 데이터베이스에 저장된 모든 채널 가져오기
         saved_channels = load_all_youtube_channels_from_db()
@@ -6923,7 +6928,7 @@ def youtube_channels():
             save_youtube_token_to_db(token_data)
 
         # YouTube API 클라이언트 생성
-        youtube = build('youtube', 'v3', credentials=credentials)
+        youtube = build_client('youtube', 'v3', credentials)
 
         # 내 채널 목록 가져오기
         channels_response = youtube.channels().list(
@@ -7009,7 +7014,6 @@ def upload_youtube():
     try:
         from google.oauth2.credentials import Credentials
         from google.auth.transport.requests import Request
-        from googleapiclient.discovery import build
         from googleapiclient.http import MediaFileUpload
 
         data = request.get_json()
@@ -7053,7 +7057,7 @@ def upload_youtube():
             print(f"[YOUTUBE-UPLOAD] 비디오 파일 준비 완료: {len(video_bytes)} bytes")
 
             # YouTube API 클라이언트 생성
-            youtube = build('youtube', 'v3', credentials=credentials)
+            youtube = build_client('youtube', 'v3', credentials)
 
             # 비디오 메타데이터
             status_data = {
@@ -7156,7 +7160,6 @@ def upload_youtube_thumbnail():
     try:
         from google.oauth2.credentials import Credentials
         from google.auth.transport.requests import Request
-        from googleapiclient.discovery import build
         from googleapiclient.http import MediaFileUpload
 
         data = request.get_json()
@@ -7216,7 +7219,7 @@ def upload_youtube_thumbnail():
                 print(f"[YOUTUBE-THUMBNAIL] 토큰 갱신 실패: {refresh_error}")
                 # 갱신 실패해도 기존 토큰으로 시도
 
-        youtube = build('youtube', 'v3', credentials=credentials)
+        youtube = build_client('youtube', 'v3', credentials)
 
         # 썸네일 파일 준비
         with tempfile.TemporaryDirectory() as temp_dir:
@@ -7271,7 +7274,6 @@ def update_youtube_video():
     try:
         from google.oauth2.credentials import Credentials
         from google.auth.transport.requests import Request
-        from googleapiclient.discovery import build
 
         data = request.get_json()
         video_id = data.get('video_id')
@@ -7296,7 +7298,7 @@ def update_youtube_video():
             token_data['token'] = credentials.token
             save_youtube_token_to_db(token_data, channel_id=channel_id)
 
-        youtube = build('youtube', 'v3', credentials=credentials)
+        youtube = build_client('youtube', 'v3', credentials)
 
         # 현재 영상 정보 가져오기
         video_response = youtube.videos().list(
@@ -7361,7 +7363,6 @@ def youtube_comment():
     try:
         from google.oauth2.credentials import Credentials
         from google.auth.transport.requests import Request
-        from googleapiclient.discovery import build
 
         data = request.get_json()
         video_id = data.get('video_id')
@@ -7385,7 +7386,7 @@ def youtube_comment():
             token_data['token'] = credentials.token
             save_youtube_token_to_db(token_data, channel_id=channel_id)
 
-        youtube = build('youtube', 'v3', credentials=credentials)
+        youtube = build_client('youtube', 'v3', credentials)
 
         # 댓글 작성
         response = youtube.commentThreads().insert(
@@ -7765,7 +7766,6 @@ def api_youtube_auth_status_test():
         try:
             from google.oauth2.credentials import Credentials
             from google.auth.transport.requests import Request
-            from googleapiclient.discovery import build
 
             creds = Credentials.from_authorized_user_info(token_data)
 
@@ -7785,7 +7785,7 @@ def api_youtube_auth_status_test():
                 print("[YOUTUBE-AUTH-STATUS] 토큰 갱신 완료")
 
             # YouTube API로 채널 정보 조회
-            youtube = build('youtube', 'v3', credentials=creds)
+            youtube = build_client('youtube', 'v3', creds)
             channel_response = youtube.channels().list(part="snippet", mine=True).execute()
 
             items = channel_response.get("items", [])
@@ -8249,7 +8249,6 @@ def youtube_upload():
         # 할당량 초과 시 _2 프로젝트로 자동 재시도
         from google.oauth2.credentials import Credentials
         from google.auth.transport.requests import Request
-        from googleapiclient.discovery import build
         from googleapiclient.http import MediaFileUpload
 
         # 프로젝트 접미사 결정: 파이프라인에서 전달된 값 우선, 없으면 자동 선택
@@ -8329,7 +8328,7 @@ def youtube_upload():
                     save_youtube_token_to_db(updated_token, channel_id=channel_id, project_suffix=project_suffix)
 
                 # YouTube API 클라이언트 생성
-                youtube = build('youtube', 'v3', credentials=creds)
+                youtube = build_client('youtube', 'v3', creds)
 
                 # 업로드 실행
                 print(f"[YOUTUBE-UPLOAD] 실제 업로드 시작 - 파일: {full_path}")
@@ -9108,15 +9107,11 @@ def _analyze_seo_keywords(script, lang='ko'):
 def api_image_analyze_script():
     """이미지 제작용 대본 분석 - 씬 분리 + 썸네일/이미지 프롬프트 생성"""
     try:
-        from openai import OpenAI
-        import httpx
-        # GPT-5.1 응답 대기 시간 설정 - 모든 타임아웃 명시적 설정
-        client = OpenAI(timeout=httpx.Timeout(
-            timeout=900.0,  # 전체 타임아웃 15분
-            connect=60.0,   # 연결 타임아웃 1분
-            read=900.0,     # 읽기 타임아웃 15분
-            write=60.0      # 쓰기 타임아웃 1분
-        ))
+        # GPT-5.1 응답 대기 시간 15분 (long 등급) + 같은 대본 재시도는 캐시 응답
+        client = llm_clients.require_client(
+            "openai", timeout="long", call_site="image-analyze-script",
+            cache_ttl=llm_clients.DEFAULT_CACHE_TTL
+        )
 
         data = request.get_json()
         script = data.get('script', '')
@@ -9128,6 +9123,7 @@ def api_image_analyze_script():
         output_language = data.get('output_language', 'ko')  # 출력 언어 (ko/en/ja/auto)
         channel_style = data.get('channel_style', '')  # [TUBELENS] 채널별 스타일 정보
         benchmark_style = data.get('benchmark_style', '')  # 벤치마킹 스타일 이름
+        stream = bool(data.get('stream'))  # NDJSON으로 청크별 씬을 먼저 받기
 
         # ★ 벤치마킹 스타일 로드
         benchmark_prompt = ""
@@ -9523,18 +9519,19 @@ The "narration" field MUST contain the EXACT ORIGINAL TEXT from the script!
 - DO NOT summarize or paraphrase - COPY-PASTE the exact sentences
 - This helps the user know EXACTLY where to place each image in the video"""
 
-        # Style-specific user prompt
-        if image_style == 'animation':
-            # Thumbnail rules by audience
-            if audience == 'general':
-                thumb_instruction = "Thumbnail text for General audience (4-7 chars, provocative/shocking style)"
-            else:
-                thumb_instruction = "Thumbnail text for Senior audience (8-12 chars, nostalgic/reflective style)"
+        # Style-specific user prompt (긴 대본은 청크별로 다시 호출)
+        def build_user_prompt(script, image_count):
+            if image_style == 'animation':
+                # Thumbnail rules by audience
+                if audience == 'general':
+                    thumb_instruction = "Thumbnail text for General audience (4-7 chars, provocative/shocking style)"
+                else:
+                    thumb_instruction = "Thumbnail text for Senior audience (8-12 chars, nostalgic/reflective style)"
 
-            # ★★★ 카테고리별 스타일 분기 ★★★
-            if category_style:
-                # history, news, mystery 등 특정 카테고리용 스타일
-                user_prompt = f"""Script:
+                # ★★★ 카테고리별 스타일 분기 ★★★
+                if category_style:
+                    # history, news, mystery 등 특정 카테고리용 스타일
+                    user_prompt = f"""Script:
 {script}
 
 ★★★ OUTPUT LANGUAGE: {lang_config['name']} ({lang_config['native']}) ★★★
@@ -9560,9 +9557,9 @@ Rules:
 5. ⚠️ NARRATION = EXACT SCRIPT TEXT! Copy-paste the original sentences from the script. DO NOT summarize or paraphrase!
 
 image_prompt MUST be in English."""
-            else:
-                # 기본 웹툰 스타일
-                user_prompt = f"""Script:
+                else:
+                    # 기본 웹툰 스타일
+                    user_prompt = f"""Script:
 {script}
 
 ★★★ OUTPUT LANGUAGE: {lang_config['name']} ({lang_config['native']}) ★★★
@@ -9601,17 +9598,17 @@ Rules:
 9. ⚠️ NARRATION = EXACT SCRIPT TEXT! Copy-paste the original sentences from the script. DO NOT summarize or paraphrase!
 
 image_prompt MUST be in English."""
-        else:
-            # Thumbnail rules by audience
-            if audience == 'general':
-                thumbnail_instruction = "Thumbnail text for General audience (4-7 chars, provocative/curiosity/shocking style)"
             else:
-                thumbnail_instruction = "Thumbnail text for Senior audience (8-12 chars, nostalgic/reflective/experience-sharing style)"
+                # Thumbnail rules by audience
+                if audience == 'general':
+                    thumbnail_instruction = "Thumbnail text for General audience (4-7 chars, provocative/curiosity/shocking style)"
+                else:
+                    thumbnail_instruction = "Thumbnail text for Senior audience (8-12 chars, nostalgic/reflective/experience-sharing style)"
 
-            # ★★★ 카테고리별 스타일 분기 ★★★
-            if category_style:
-                # history, news, mystery 등 특정 카테고리용 스타일
-                user_prompt = f"""Script:
+                # ★★★ 카테고리별 스타일 분기 ★★★
+                if category_style:
+                    # history, news, mystery 등 특정 카테고리용 스타일
+                    user_prompt = f"""Script:
 {script}
 
 ★★★ OUTPUT LANGUAGE: {lang_config['name']} ({lang_config['native']}) ★★★
@@ -9642,9 +9639,9 @@ Rules:
 - DO NOT summarize! DO NOT write new sentences!
 - Script is {len(script)} chars → each narration should be ~{len(script) // image_count} chars
 - If your total narration is less than {len(script) * 0.9} chars, YOU ARE DOING IT WRONG!"""
-            else:
-                # 기본 스타일
-                user_prompt = f"""Script:
+                else:
+                    # 기본 스타일
+                    user_prompt = f"""Script:
 {script}
 
 ★★★ OUTPUT LANGUAGE: {lang_config['name']} ({lang_config['native']}) ★★★
@@ -9666,94 +9663,133 @@ Rules:
 - DO NOT summarize! DO NOT write new sentences!
 - Script is {len(script)} chars → each narration should be ~{len(script) // image_count} chars
 - If your total narration is less than {len(script) * 0.9} chars, YOU ARE DOING IT WRONG!"""
+            return user_prompt
 
         print(f"[IMAGE-ANALYZE] GPT-4o generating prompts... (style: {image_style}, content: {content_type}, audience: {audience}, language: {output_language}, category: {pre_detected_category})")
 
-        # GPT-4o는 Chat Completions API 사용
-        # max_tokens=16384: 긴 대본(20분+)의 전체 narration을 포함하기 위해 필요
-        response = client.chat.completions.create(
-            model="gpt-4o",
-            messages=[
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": user_prompt + "\n\nIMPORTANT: Respond ONLY with valid JSON. No other text, just pure JSON output."}
-            ],
-            temperature=0.7,
-            max_tokens=16384,
-            response_format={"type": "json_object"}
-        )
+        def build_payload(result):
+            """GPT 결과 JSON → 응답 dict (+ 로깅)"""
+            # video_effects 추출 및 로깅
+            video_effects = result.get("video_effects", {})
+            detected_category = result.get("detected_category", "story")
+
+            print(f"[IMAGE-ANALYZE] detected_category: {detected_category}")
+
+            # 씬 정보 로깅 (영상 길이 디버깅용)
+            scenes_data = result.get("scenes", [])
+            total_narration_len = sum(len(s.get('narration', '')) for s in scenes_data)
+            print(f"[IMAGE-ANALYZE] ★ 씬 개수: {len(scenes_data)}개, 총 나레이션 길이: {total_narration_len}자")
+            for i, scene in enumerate(scenes_data[:3]):  # 처음 3개 씬만 로깅
+                narr_preview = scene.get('narration', '')[:50]
+                print(f"[IMAGE-ANALYZE]   씬 {i+1}: narration {len(scene.get('narration', ''))}자 - '{narr_preview}...'")
+
+            print(f"[IMAGE-ANALYZE] video_effects keys: {list(video_effects.keys())}")
+            if video_effects:
+                print(f"[IMAGE-ANALYZE] bgm_mood: {video_effects.get('bgm_mood', '(없음)')}")
+                print(f"[IMAGE-ANALYZE] sound_effects: {len(video_effects.get('sound_effects', []))}개")
+                print(f"[IMAGE-ANALYZE] scene_bgm_changes: {len(video_effects.get('scene_bgm_changes', []))}개")
+
+            # 유튜브 메타데이터 로깅
+            youtube_meta = result.get("youtube", {})
+            desc = youtube_meta.get("description", {})
+            if isinstance(desc, dict):
+                print(f"[IMAGE-ANALYZE] description.full_text 길이: {len(desc.get('full_text', ''))}자")
+                print(f"[IMAGE-ANALYZE] description.chapters: {len(desc.get('chapters', []))}개")
+            print(f"[IMAGE-ANALYZE] hashtags: {youtube_meta.get('hashtags', [])}")
+            print(f"[IMAGE-ANALYZE] tags: {len(youtube_meta.get('tags', []))}개")
+            print(f"[IMAGE-ANALYZE] pin_comment: {'있음' if youtube_meta.get('pin_comment') else '없음'}")
 
-        # 응답 완료 체크 (truncation 감지)
-        finish_reason = response.choices[0].finish_reason
-        usage = getattr(response, 'usage', None)
-        print(f"[IMAGE-ANALYZE] GPT-4o 응답 완료 - finish_reason: {finish_reason}")
-        if usage:
-            print(f"[IMAGE-ANALYZE] 토큰 사용량 - input: {usage.prompt_tokens}, output: {usage.completion_tokens}")
-        if finish_reason == 'length':
-            print(f"[IMAGE-ANALYZE] ⚠️ 경고: 응답이 max_tokens에 의해 잘렸습니다! 출력 토큰 부족")
+            payload = {
+                "ok": True,
+                "youtube": result.get("youtube", {}),
+                "thumbnail": result.get("thumbnail", {}),
+                "scenes": result.get("scenes", []),
+                "video_effects": video_effects,
+                "detected_category": detected_category,
+                "settings": {
+                    "content_type": content_type,
+                    "image_style": image_style,
+                    "image_count": image_count,
+                    "audience": audience
+                }
+            }
+            if result.get("meta_error"):
+                # 청크 분석에서 메타데이터만 실패 - 씬은 살리고 경고로 알림
+                payload["warning"] = f"메타데이터 생성 실패: {result['meta_error']}"
+            return payload
+
+        # ★ 긴 대본: 문장 경계 청크로 나눠 씬 분석(map)과 메타데이터(reduce)를 동시 실행
+        chunks = script_analysis.plan_chunks(script, image_count)
+        if len(chunks) > 1:
+            events = script_analysis.iter_chunked_analysis(
+                client, system_prompt, build_user_prompt, script, image_count, chunks=chunks
+            )
 
-        # Chat Completions API 결과 추출
-        result_text = response.choices[0].message.content.strip()
+            if stream:
+                # NDJSON 스트리밍: 끝난 청크의 씬부터 보내 이미지 생성을 먼저 시작할 수 있게 함
+                def generate():
+                    try:
+                        for event in events:
+                            if event["type"] == "scenes":
+                                # provisional=True인 씬 번호는 임시 - result의 remap[chunk] + 청크 안 순서가 최종 번호
+                                line = {"type": "scenes", "chunk": event["chunk"], "first_scene": event["first_scene"],
+                                        "provisional": event["provisional"], "scenes": event["scenes"]}
+                            elif event["type"] == "done":
+                                line = {"type": "result", "remap": event["remap"], **build_payload(event["result"])}
+                            else:
+                                continue
+                            yield json.dumps(line, ensure_ascii=False) + "\n"
+                    except Exception as e:
+                        print(f"[IMAGE-ANALYZE][ERROR] 스트리밍 분석 실패: {e}")
+                        yield json.dumps({"type": "error", "ok": False, "error": str(e)}, ensure_ascii=False) + "\n"
 
-        # JSON 파싱 (마크다운 코드블록 제거)
-        if result_text.startswith("```"):
-            result_text = result_text.split("```")[1]
-            if result_text.startswith("json"):
-                result_text = result_text[4:]
-        result_text = result_text.strip()
+                return Response(stream_with_context(generate()), mimetype='application/x-ndjson')
 
-        # Trailing comma 제거 (LLM이 자주 실수하는 패턴)
-        import re
-        # ,] → ]
-        result_text = re.sub(r',\s*\]', ']', result_text)
-        # ,} → }
-        result_text = re.sub(r',\s*\}', '}', result_text)
+            result = next(event["result"] for event in events if event["type"] == "done")
+        else:
+            user_prompt = build_user_prompt(script, image_count)
 
-        result = json.loads(result_text)
-
-        # video_effects 추출 및 로깅
-        video_effects = result.get("video_effects", {})
-        detected_category = result.get("detected_category", "story")
-
-        print(f"[IMAGE-ANALYZE] detected_category: {detected_category}")
-
-        # 씬 정보 로깅 (영상 길이 디버깅용)
-        scenes_data = result.get("scenes", [])
-        total_narration_len = sum(len(s.get('narration', '')) for s in scenes_data)
-        print(f"[IMAGE-ANALYZE] ★ 씬 개수: {len(scenes_data)}개, 총 나레이션 길이: {total_narration_len}자")
-        for i, scene in enumerate(scenes_data[:3]):  # 처음 3개 씬만 로깅
-            narr_preview = scene.get('narration', '')[:50]
-            print(f"[IMAGE-ANALYZE]   씬 {i+1}: narration {len(scene.get('narration', ''))}자 - '{narr_preview}...'")
-
-        print(f"[IMAGE-ANALYZE] video_effects keys: {list(video_effects.keys())}")
-        if video_effects:
-            print(f"[IMAGE-ANALYZE] bgm_mood: {video_effects.get('bgm_mood', '(없음)')}")
-            print(f"[IMAGE-ANALYZE] sound_effects: {len(video_effects.get('sound_effects', []))}개")
-            print(f"[IMAGE-ANALYZE] scene_bgm_changes: {len(video_effects.get('scene_bgm_changes', []))}개")
-
-        # 유튜브 메타데이터 로깅
-        youtube_meta = result.get("youtube", {})
-        desc = youtube_meta.get("description", {})
-        if isinstance(desc, dict):
-            print(f"[IMAGE-ANALYZE] description.full_text 길이: {len(desc.get('full_text', ''))}자")
-            print(f"[IMAGE-ANALYZE] description.chapters: {len(desc.get('chapters', []))}개")
-        print(f"[IMAGE-ANALYZE] hashtags: {youtube_meta.get('hashtags', [])}")
-        print(f"[IMAGE-ANALYZE] tags: {len(youtube_meta.get('tags', []))}개")
-        print(f"[IMAGE-ANALYZE] pin_comment: {'있음' if youtube_meta.get('pin_comment') else '없음'}")
+            # GPT-4o는 Chat Completions API 사용
+            # max_tokens=16384: 긴 대본(20분+)의 전체 narration을 포함하기 위해 필요
+            response = client.chat.completions.create(
+                model=script_analysis.ANALYZE_MODEL,
+                messages=[
+                    {"role": "system", "content": system_prompt},
+                    {"role": "user", "content": user_prompt + script_analysis.JSON_ONLY}
+                ],
+                temperature=0.7,
+                max_tokens=16384,
+                response_format={"type": "json_object"}
+            )
 
-        return jsonify({
-            "ok": True,
-            "youtube": result.get("youtube", {}),
-            "thumbnail": result.get("thumbnail", {}),
-            "scenes": result.get("scenes", []),
-            "video_effects": video_effects,
-            "detected_category": detected_category,
-            "settings": {
-                "content_type": content_type,
-                "image_style": image_style,
-                "image_count": image_count,
-                "audience": audience
-            }
-        })
+            # 응답 완료 체크 (truncation 감지)
+            finish_reason = response.choices[0].finish_reason
+            usage = getattr(response, 'usage', None)
+            print(f"[IMAGE-ANALYZE] GPT-4o 응답 완료 - finish_reason: {finish_reason}")
+            if usage:
+                print(f"[IMAGE-ANALYZE] 토큰 사용량 - input: {usage.prompt_tokens}, output: {usage.completion_tokens}")
+            if finish_reason == 'length':
+                print(f"[IMAGE-ANALYZE] ⚠️ 경고: 응답이 max_tokens에 의해 잘렸습니다! 출력 토큰 부족")
+
+            # JSON 파싱 (마크다운 코드블록 / trailing comma 정리)
+            try:
+                result = script_analysis.parse_json_response(response.choices[0].message.content)
+            except ValueError:
+                llm_clients.invalidate(response)  # 재시도 시 같은 잘못된 응답을 캐시에서 받지 않도록
+                raise
+
+        payload = build_payload(result)
+        if stream:
+            # 짧은 대본도 같은 NDJSON 형식 (씬 1회 + 최종 결과)
+            lines = [
+                {"type": "scenes", "chunk": 0, "first_scene": 1, "provisional": False, "scenes": payload["scenes"]},
+                {"type": "result", "remap": {0: 1}, **payload},
+            ]
+            return Response(
+                "".join(json.dumps(line, ensure_ascii=False) + "\n" for line in lines),
+                mimetype='application/x-ndjson'
+            )
+        return jsonify(payload)
 
     except Exception as e:
         print(f"[IMAGE-ANALYZE][ERROR] {str(e)}")
@@ -9878,8 +9914,10 @@ def api_image_generate_assets_zip():
                     print("[SUBTITLE-SPLIT] OpenAI API 키 없음, 폴백 사용")
                     return split_korean_semantic_fallback(text)
 
-                from openai import OpenAI
-                client = OpenAI(api_key=openai_api_key)
+                client = llm_clients.require_client(
+                    "openai", api_key=openai_api_key, call_site="subtitle-split",
+                    cache_ttl=llm_clients.DEFAULT_CACHE_TTL
+                )
 
                 prompt = f"""다음 나레이션을 TTS 자막용으로 자연스럽게 분리해주세요.
 
@@ -9932,6 +9970,7 @@ def api_image_generate_assets_zip():
                     return lines
                 else:
                     print("[SUBTITLE-SPLIT] GPT 응답 비어있음, 폴백 사용")
+                    llm_clients.invalidate(response)
                     return split_korean_semantic_fallback(text)
 
             except Exception as e:
@@ -11267,3087 +11306,2018 @@ def _update_job_status(job_id, **kwargs):
             with open(job_file, 'w', encoding='utf-8') as f:
                 json.dump(status, f, ensure_ascii=False)
 
-def _get_subtitle_style(lang):
-    """언어별 자막 스타일 반환 (ASS 형식) - 반투명 검정박스 + 흰색 텍스트
-
-    깔끔한 스타일: 반투명 검정 배경 박스 위에 흰색 텍스트
-    """
-    # 깔끔한 스타일: 흰색 텍스트 + 반투명 검정 박스
-    # BorderStyle=4: 외곽선 + 배경 박스
-    # PrimaryColour=&HFFFFFF: 흰색 텍스트 (BGR 순서)
-    # BackColour=&H80000000: 반투명 검정 박스 (80=약 50% 투명도)
-    # OutlineColour=&H00000000: 검정 외곽선
-    # Outline=1: 얇은 외곽선
-    if lang == 'ko':
-        font_name = lang_ko.FONTS['default_name']
-        return (
-            f"FontName={font_name},FontSize=48,PrimaryColour=&HFFFFFF,"
-            "OutlineColour=&H00000000,BackColour=&H80000000,"
-            "BorderStyle=4,Outline=1,Shadow=0,MarginV=50,Bold=1"
-        )
-    elif lang == 'ja':
-        font_name = lang_ja.FONTS['default_name']
-        font_size = lang_ja.SUBTITLE['style']['font_size']
-        return (
-            f"FontName={font_name},FontSize={font_size},PrimaryColour=&HFFFFFF,"
-            "OutlineColour=&H00000000,BackColour=&H80000000,"
-            "BorderStyle=4,Outline=1,Shadow=0,MarginV=40,Bold=1"
-        )
-    elif lang == 'en':
-        font_name = lang_en.FONTS['default_name']
-        font_size = lang_en.SUBTITLE['style']['font_size']
-        return (
-            f"FontName={font_name},FontSize={font_size},PrimaryColour=&HFFFFFF,"
-            "OutlineColour=&H00000000,BackColour=&H80000000,"
-            "BorderStyle=4,Outline=1,Shadow=0,MarginV=40,Bold=1"
-        )
-    else:
-        font_name = lang_en.FONTS['default_name']
-        return (
-            f"FontName={font_name},FontSize=22,PrimaryColour=&HFFFFFF,"
-            "OutlineColour=&H00000000,BackColour=&H80000000,"
-            "BorderStyle=4,Outline=1,Shadow=0,MarginV=40,Bold=1"
-        )
-
-def _hex_to_ass_color(hex_color):
-    """HEX 색상을 ASS 포맷으로 변환 (#RRGGBB -> &HBBGGRR&)"""
-    if not hex_color or not hex_color.startswith('#'):
-        return "&HFFFFFF&"  # 기본 흰색
-    hex_color = hex_color.lstrip('#')
-    if len(hex_color) == 6:
-        r, g, b = hex_color[0:2], hex_color[2:4], hex_color[4:6]
-        return f"&H{b}{g}{r}&"
-    return "&HFFFFFF&"  # 기본 흰색
-
-
-def _apply_subtitle_highlights(text, highlights):
-    """자막 텍스트에 키워드 색상 강조 적용 (박스 배경 포함)
+# ===== ASS 자막/오버레이 필터 → scripts/common/ass_utils.py로 이동 =====
+from scripts.common.ass_utils import (
+    _get_subtitle_style,
+    _hex_to_ass_color,
+    _apply_subtitle_highlights,
+    _format_ass_time,
+    _generate_ass_subtitles,
+    _generate_screen_overlay_filter,
+    _generate_lower_thirds_filter,
+    _generate_news_ticker_filter,
+)
 
-    Args:
-        text: 원본 자막 텍스트
-        highlights: [{"keyword": "단어", "color": "#FF0000"}, ...]
 
-    Returns:
-        색상 태그가 적용된 텍스트 (ASS override tags)
-    """
-    if not highlights:
-        return text
-
-    result = text
-    for h in highlights:
-        keyword = h.get('keyword', '')
-        color = h.get('color', '#FFFF00')
-        if keyword and keyword in result:
-            ass_color = _hex_to_ass_color(color)
-            # ASS 자막 색상 강조 (원래 스타일 - 색상만 변경)
-            # - \c{색상}: 텍스트 색상을 강조색으로 변경
-            # - 강조 후 원래 흰색으로 복원
-            colored_keyword = f"{{\\c{ass_color}}}{keyword}{{\\c&HFFFFFF&}}"
-            result = result.replace(keyword, colored_keyword)
-
-    return result
-
-
-def _format_ass_time(seconds):
-    """초를 ASS 시간 형식으로 변환 (H:MM:SS.cc)"""
-    hours = int(seconds // 3600)
-    minutes = int((seconds % 3600) // 60)
-    secs = int(seconds % 60)
-    centisecs = int((seconds % 1) * 100)
-    return f"{hours}:{minutes:02d}:{secs:02d}.{centisecs:02d}"
+# ===== BGM/효과음 선택 및 믹싱 → scripts/common/bgm_utils.py로 이동 =====
+from scripts.common.bgm_utils import (
+    BGM_MOOD_ALIAS,
+    _get_bgm_file,
+    _mix_bgm_with_video,
+    _mix_scene_bgm_with_video,
+    _get_sfx_file,
+    _trim_sfx,
+    _mix_sfx_into_video,
+)
+from scripts.common import audio_library  # BGM/효과음 인덱스 (길이/라우드니스 사전 분석)
+from scripts.common.bgm_beds import render_segment_bed  # 챕터별 BGM 베드 (NumPy 크로스페이드)
 
 
-def _generate_ass_subtitles(subtitles, highlights, output_path, lang='ko'):
-    """ASS 형식 자막 파일 생성 (색상 강조 지원)
+def _generate_outro_video(output_path, duration=5, fonts_dir=None):
+    """공용 아웃트로 영상 생성 (구독/좋아요 요청)
 
     Args:
-        subtitles: [{"start": 0.0, "end": 3.0, "text": "자막"}, ...]
-        highlights: [{"keyword": "단어", "color": "#FF0000"}, ...]
-        output_path: ASS 파일 출력 경로
-        lang: 언어 코드
+        output_path: 출력 파일 경로
+        duration: 아웃트로 길이 (초)
+        fonts_dir: 폰트 디렉토리 (없으면 스크립트 위치 기준)
 
     Returns:
-        성공 여부
+        성공 여부 (bool)
     """
     try:
-        # 언어별 폰트 설정 (큰 자막 - 50대+ 시청자 가독성)
-        # 한국어 폰트: lang/ko.py에서 관리
-        if lang == 'ko':
-            font_name = lang_ko.FONTS['default_name']
-            font_size = 48  # 24 → 48 (2배 크기)
-            max_chars_per_line = 100  # ★ 청킹 방식: 줄바꿈 비활성화 (한 문장 = 한 자막)
-        elif lang == 'ja':
-            # 일본어: lang/ja.py에서 관리
-            font_name = lang_ja.FONTS['default_name']
-            font_size = lang_ja.SUBTITLE['style']['font_size_burn']
-            max_chars_per_line = lang_ja.SUBTITLE['max_chars_per_line']
-        elif lang == 'en':
-            # 영어: lang/en.py에서 관리
-            font_name = lang_en.FONTS['default_name']
-            font_size = lang_en.SUBTITLE['style']['font_size_burn']
-            max_chars_per_line = lang_en.SUBTITLE['max_chars_per_line']
-        else:
-            # 기타 언어 - 영어 설정으로 fallback
-            font_name = lang_en.FONTS['default_name']
-            font_size = lang_en.SUBTITLE['style']['font_size_burn']
-            max_chars_per_line = lang_en.SUBTITLE['max_chars_per_line']
-
-        # 긴 텍스트 자동 줄바꿈 함수
-        def wrap_text(text, max_chars):
-            """긴 텍스트를 max_chars 기준으로 줄바꿈"""
-            if len(text) <= max_chars:
-                return text
-
-            # 이미 줄바꿈이 있으면 각 줄에 대해 재귀 처리
-            if '\n' in text:
-                return '\n'.join(wrap_text(line, max_chars) for line in text.split('\n'))
-            if '\\N' in text:
-                return '\\N'.join(wrap_text(line, max_chars) for line in text.split('\\N'))
-
-            # 언어에 따른 분리 기준
-            # 일본어/한국어: 구두점, 한국어: 띄어쓰기도 포함
-            punctuation = '、。，．!?！？ 　'  # 일본어 구두점 + 공백
-
-            # 자연스러운 줄바꿈 위치 찾기 (구두점/공백에서 분리)
-            words = []
-            current = ""
-            for char in text:
-                current += char
-                if char in punctuation:
-                    words.append(current)
-                    current = ""
-            if current:
-                words.append(current)
-
-            # 단어 단위로 줄바꿈
-            lines = []
-            current_line = ""
-            for word in words:
-                # 단어 자체가 max_chars보다 긴 경우 강제 분할
-                if len(word) > max_chars:
-                    # 현재 줄 저장
-                    if current_line:
-                        lines.append(current_line.strip())
-                        current_line = ""
-                    # 긴 단어 강제 분할
-                    while len(word) > max_chars:
-                        lines.append(word[:max_chars])
-                        word = word[max_chars:]
-                    if word:
-                        current_line = word
-                elif len(current_line) + len(word) <= max_chars:
-                    current_line += word
-                else:
-                    if current_line:
-                        lines.append(current_line.strip())
-                    current_line = word
-            if current_line:
-                lines.append(current_line.strip())
-
-            # 빈 줄 제거
-            lines = [l for l in lines if l]
-
-            # 마지막 줄이 너무 짧으면 (8자 미만) 이전 줄과 합치기
-            # 예: "해드리겠습니다." (8자) 같은 짧은 끝 부분 방지
-            min_last_line_chars = 8
-            if len(lines) >= 2 and len(lines[-1]) < min_last_line_chars:
-                # 이전 줄과 합쳤을 때 max_chars를 약간 초과해도 허용 (가독성 우선)
-                combined = lines[-2] + ' ' + lines[-1]
-                if len(combined) <= max_chars + 6:  # 최대 32자까지 허용
-                    lines[-2] = combined
-                    lines.pop()
-
-            result = '\n'.join(lines)
-            return result
-
-        # ASS 헤더 (반투명 박스 + 자동 줄바꿈)
-        # BorderStyle=4: 외곽선 + 배경 박스
-        # BackColour=&H80000000: 반투명 검정 배경 (80 = 약 50% 투명)
-        # PrimaryColour=&HFFFFFF: 흰색 텍스트 (BGR 순서)
-        # OutlineColour=&H00000000: 검정 외곽선
-        # Outline=1: 얇은 외곽선
-        # Shadow=0: 그림자 제거
-        # MarginL/R=100: 좌우 여백으로 자동 줄바꿈 영역 제한
-        # MarginV=40: 하단 여백
-        # WrapStyle=0: 스마트 줄바꿈 (긴 텍스트 자동 2줄)
-        ass_header = f"""[Script Info]
-ScriptType: v4.00+
-PlayResX: 1280
-PlayResY: 720
-WrapStyle: 0
-
-[V4+ Styles]
-Format: Name, Fontname, Fontsize, PrimaryColour, SecondaryColour, OutlineColour, BackColour, Bold, Italic, Underline, StrikeOut, ScaleX, ScaleY, Spacing, Angle, BorderStyle, Outline, Shadow, Alignment, MarginL, MarginR, MarginV, Encoding
-Style: Default,{font_name},{font_size},&HFFFFFF,&H000000FF,&H00000000,&H80000000,1,0,0,0,100,100,0,0,4,1,0,2,100,100,40,1
-
-[Events]
-Format: Layer, Start, End, Style, Name, MarginL, MarginR, MarginV, Effect, Text
-"""
-
-        # 이벤트 생성
-        events = []
-        for sub in subtitles:
-            start = _format_ass_time(sub['start'])
-            end = _format_ass_time(sub['end'])
-            text = sub.get('text', '')
+        # 스크립트 위치 기준 절대 경로 사용
+        if fonts_dir is None:
+            script_dir = os.path.dirname(os.path.abspath(__file__))
+            fonts_dir = os.path.join(script_dir, "fonts")
 
-            # 긴 텍스트 자동 줄바꿈 적용
-            original_text = text
-            text = wrap_text(text, max_chars_per_line)
-            if text != original_text:
-                print(f"[ASS] 자막 줄바꿈 적용 (lang={lang}): '{original_text[:30]}...' → {text.count(chr(10)) + 1}줄")
+        print(f"[OUTRO] 폰트 디렉토리: {fonts_dir}")
+        print(f"[OUTRO] 디렉토리 존재: {os.path.exists(fonts_dir)}")
 
-            # 색상 강조 적용
-            if highlights:
-                text = _apply_subtitle_highlights(text, highlights)
+        # 폰트 설정: lang/ko.py에서 관리
+        font_path = None
+        for font_file in lang_ko.FONTS['priority']:
+            candidate = os.path.join(fonts_dir, font_file)
+            if os.path.exists(candidate):
+                font_path = candidate
+                break
+        if not font_path:
+            # 시스템 폰트 시도
+            for sys_path in lang_ko.FONTS['system_paths']:
+                if os.path.exists(sys_path):
+                    font_path = sys_path
+                    break
+        if not font_path:
+            print(f"[OUTRO] 폰트 파일 없음: {fonts_dir}")
+            return False
 
-            # ASS에서는 \N이 줄바꿈
-            text = text.replace('\n', '\\N')
+        print(f"[OUTRO] 사용 폰트: {font_path}")
+        font_escaped = font_path.replace('\\', '/').replace(':', '\\:')
 
-            events.append(f"Dialogue: 0,{start},{end},Default,,0,0,0,,{text}")
+        # 그라데이션 배경 + 텍스트 아웃트로
+        # 메인 영상과 동일한 1280x720 해상도 사용 (concat 호환성)
+        # 이모지 제거 (FFmpeg drawtext 호환성 문제)
+        ffmpeg_cmd = [
+            "ffmpeg", "-y",
+            "-f", "lavfi",
+            "-i", f"color=c=0x1a1a2e:s=1280x720:d={duration}",
+            "-f", "lavfi",
+            "-i", f"anullsrc=r=44100:cl=stereo:d={duration}",
+            "-vf", (
+                f"drawtext=text='시청해 주셔서 감사합니다':"
+                f"fontfile='{font_escaped}':fontsize=48:fontcolor=white:"
+                f"x=(w-text_w)/2:y=(h-text_h)/2-70,"
+                f"drawtext=text='좋아요와 구독 부탁드려요':"
+                f"fontfile='{font_escaped}':fontsize=38:fontcolor=yellow:"
+                f"x=(w-text_w)/2:y=(h-text_h)/2+15,"
+                f"drawtext=text='알림 설정도 잊지 마세요':"
+                f"fontfile='{font_escaped}':fontsize=30:fontcolor=#aaaaaa:"
+                f"x=(w-text_w)/2:y=(h-text_h)/2+80,"
+                f"fade=t=in:st=0:d=0.5,fade=t=out:st={duration-0.5}:d=0.5"
+            ),
+            # 메인 영상과 동일한 인코딩 설정 (concat demuxer 호환)
+            "-c:v", "libx264", "-preset", "fast", "-profile:v", "high", "-level", "4.0",
+            "-pix_fmt", "yuv420p", "-r", "24",  # 24fps (메인 영상과 동일)
+            "-c:a", "aac", "-b:a", "128k", "-ar", "44100",
+            "-movflags", "+faststart",
+            "-t", str(duration),
+            output_path
+        ]
 
-        with open(output_path, 'w', encoding='utf-8') as f:
-            f.write(ass_header)
-            f.write('\n'.join(events))
+        result = subprocess.run(ffmpeg_cmd, stdout=subprocess.DEVNULL,
+                               stderr=subprocess.PIPE, timeout=60)
 
-        print(f"[ASS] 자막 생성 완료: {len(subtitles)}개 자막, {len(highlights)}개 강조 키워드")
-        return True
+        if result.returncode == 0:
+            print(f"[OUTRO] 아웃트로 생성 완료 (1280x720, 24fps): {output_path}")
+            return True
+        else:
+            stderr = result.stderr.decode('utf-8', errors='ignore')[:300]
+            print(f"[OUTRO] 생성 실패: {stderr}")
+            return False
 
     except Exception as e:
-        print(f"[ASS] 자막 생성 오류: {e}")
+        print(f"[OUTRO] 오류: {e}")
         return False
 
 
-def _generate_screen_overlay_filter(screen_overlays, scenes, fonts_dir, subtitles=None, lang='ko'):
-    """화면 텍스트 오버레이용 FFmpeg drawtext 필터 생성 (나레이션 싱크)
+def _append_outro_to_video(video_path, outro_path, output_path):
+    """비디오에 아웃트로 연결 (concat demuxer 사용 - 재인코딩 없이 빠름)
 
     Args:
-        screen_overlays: [{"scene": 3, "text": "대박!", "duration": 3, "style": "impact"}, ...]
-        scenes: 씬 목록 (duration 계산용)
-        fonts_dir: 폰트 디렉토리 경로
-        subtitles: 자막 데이터 [{"start": 0.0, "end": 2.5, "text": "..."}, ...] (나레이션 싱크용)
-        lang: 언어 코드 (ko, ja, en)
+        video_path: 원본 비디오 경로
+        outro_path: 아웃트로 비디오 경로
+        output_path: 출력 비디오 경로
 
     Returns:
-        FFmpeg drawtext 필터 문자열 또는 None
+        성공 여부 (bool)
     """
-    if not screen_overlays:
-        return None
-
-    # 씬별 시작 시간 계산 (fallback용)
-    scene_start_times = {}
-    current_time = 0
-    for idx, scene in enumerate(scenes):
-        scene_start_times[idx + 1] = current_time  # 1-based index
-        current_time += scene.get('duration', 0)
-
-    filters = []
-    # 언어별 폰트 선택 (font= 파라미터로 fontconfig 폴백 활성화)
-    if lang == 'ja':
-        font_name = lang_ja.FONTS['default_name']
-    elif lang == 'en':
-        font_name = lang_en.FONTS['default_name']
-    else:
-        font_name = lang_ko.FONTS['default_name']
-    font_escaped = font_name.replace(':', '\\:')
+    try:
+        # concat demuxer 방식 사용 (재인코딩 없이 스트림 복사 - 매우 빠름)
+        # 단, 두 파일의 코덱/해상도/프레임레이트가 동일해야 함
+        work_dir = os.path.dirname(output_path)
+        concat_list_path = os.path.join(work_dir, "concat_list.txt")
 
-    for overlay in screen_overlays:
-        scene_num = overlay.get('scene', 1)
-        text = overlay.get('text', '')
-        duration = overlay.get('duration', 5)  # 기본 5초로 증가 (기존 3초)
-        style = overlay.get('style', 'impact')
+        # concat 리스트 파일 생성
+        with open(concat_list_path, 'w', encoding='utf-8') as f:
+            f.write(f"file '{os.path.abspath(video_path)}'\n")
+            f.write(f"file '{os.path.abspath(outro_path)}'\n")
 
-        if not text:
-            continue
+        ffmpeg_cmd = [
+            "ffmpeg", "-y",
+            "-f", "concat",
+            "-safe", "0",
+            "-i", concat_list_path,
+            "-c", "copy",  # 스트림 복사 (재인코딩 없음)
+            "-movflags", "+faststart",
+            output_path
+        ]
 
-        # ========== 나레이션 싱크: 자막에서 해당 텍스트가 나오는 시간 찾기 ==========
-        start_time = None
-        if subtitles:
-            # 오버레이 텍스트가 포함된 자막 찾기
-            text_lower = text.lower().replace(' ', '')
-            for sub in subtitles:
-                sub_text = sub.get('text', '').lower().replace(' ', '')
-                if text_lower in sub_text:
-                    start_time = sub.get('start', 0)
-                    print(f"[OVERLAY] 나레이션 싱크 성공: '{text}' → {start_time:.1f}s (자막: '{sub.get('text', '')[:30]}...')")
-                    break
+        # concat demuxer + copy는 매우 빠름 (60초면 충분)
+        result = subprocess.run(ffmpeg_cmd, stdout=subprocess.DEVNULL,
+                               stderr=subprocess.PIPE, timeout=60)
 
-        # 자막에서 못 찾으면 씬 시작 시간 사용 (fallback)
-        if start_time is None:
-            if scene_num in scene_start_times:
-                start_time = scene_start_times[scene_num]
-                print(f"[OVERLAY] 나레이션 싱크 실패, 씬 시작 시간 사용: '{text}' → scene {scene_num} = {start_time:.1f}s")
-            else:
-                print(f"[OVERLAY] 스킵: text='{text}', scene={scene_num} 없음")
-                continue
+        # 임시 파일 삭제
+        if os.path.exists(concat_list_path):
+            os.remove(concat_list_path)
 
-        end_time = start_time + duration
-
-        # ========== 스타일별 설정 (박스 배경 추가) ==========
-        # 3번 이미지처럼 텍스트에 박스 배경 적용
-        if style == 'impact':
-            # 빨간 박스 + 흰색 텍스트 (가장 강렬)
-            fontcolor = "white"
-            fontsize = 100
-            borderw = 3
-            bordercolor = "black"
-            box_enabled = True
-            boxcolor = "red@0.9"  # 빨간 박스 90% 불투명
-            boxborderw = 15  # 박스 패딩
-        elif style == 'dramatic':
-            # 노란 박스 + 검은 텍스트
-            fontcolor = "black"
-            fontsize = 90
-            borderw = 0
-            bordercolor = "black"
-            box_enabled = True
-            boxcolor = "yellow@0.9"  # 노란 박스
-            boxborderw = 12
-        elif style == 'emotional':
-            # 청록 박스 + 흰색 텍스트
-            fontcolor = "white"
-            fontsize = 80
-            borderw = 2
-            bordercolor = "black"
-            box_enabled = True
-            boxcolor = "#00CCCC@0.85"  # 청록 박스
-            boxborderw = 10
+        if result.returncode == 0:
+            print(f"[OUTRO] 아웃트로 연결 완료 (concat demuxer): {output_path}")
+            return True
         else:
-            # 기본: 검은 박스 + 흰색 텍스트
-            fontcolor = "white"
-            fontsize = 90
-            borderw = 2
-            bordercolor = "black"
-            box_enabled = True
-            boxcolor = "black@0.8"
-            boxborderw = 12
-
-        # FFmpeg drawtext 텍스트 이스케이프
-        text_escaped = text.replace('\\', '\\\\').replace("'", "\\'").replace(':', '\\:').replace('=', '\\=')
-
-        print(f"[OVERLAY] 추가: text='{text}', style={style}, time={start_time:.1f}-{end_time:.1f}s (duration={duration}s)")
-
-        # drawtext 필터 생성 (화면 중앙, 박스 배경 추가)
-        # font= 파라미터 사용으로 fontconfig 폴백 활성화 (일본어 문자 깨짐 방지)
-        drawtext = (
-            f"drawtext=text='{text_escaped}':"
-            f"font='{font_escaped}':"
-            f"fontsize={fontsize}:"
-            f"fontcolor={fontcolor}:"
-            f"bordercolor={bordercolor}:"
-            f"borderw={borderw}:"
-            f"box=1:"
-            f"boxcolor={boxcolor}:"
-            f"boxborderw={boxborderw}:"
-            f"x=(w-text_w)/2:"
-            f"y=(h-text_h)/2:"
-            f"enable='between(t,{start_time},{end_time})'"
-        )
-        filters.append(drawtext)
-
-    if filters:
-        return ",".join(filters)
-    return None
-
+            stderr = result.stderr.decode('utf-8', errors='ignore')[-500:]
+            print(f"[OUTRO] concat demuxer 실패: {stderr}")
 
-def _generate_lower_thirds_filter(lower_thirds, scenes, fonts_dir, lang='ko'):
-    """로워서드(하단 자막) 오버레이용 FFmpeg drawtext 필터 생성
+            # Fallback: concat filter 사용 (재인코딩 필요하지만 호환성 높음)
+            print(f"[OUTRO] Fallback: concat filter 사용...")
+            ffmpeg_cmd_fallback = [
+                "ffmpeg", "-y",
+                "-i", video_path,
+                "-i", outro_path,
+                "-filter_complex",
+                "[0:v][0:a][1:v][1:a]concat=n=2:v=1:a=1[outv][outa]",
+                "-map", "[outv]", "-map", "[outa]",
+                "-c:v", "libx264", "-preset", "ultrafast",  # 더 빠른 프리셋
+                "-c:a", "aac", "-b:a", "128k",
+                "-movflags", "+faststart",
+                output_path
+            ]
 
-    Args:
-        lower_thirds: [{"scene": 2, "text": "출처: OO일보", "position": "bottom-left"}, ...]
-        scenes: 씬 목록 (duration 계산용)
-        fonts_dir: 폰트 디렉토리 경로
-        lang: 언어 코드 (ko, ja, en)
+            result_fallback = subprocess.run(ffmpeg_cmd_fallback, stdout=subprocess.DEVNULL,
+                                            stderr=subprocess.PIPE, timeout=1200)  # 20분 타임아웃
 
-    Returns:
-        FFmpeg drawtext 필터 문자열 또는 None
-    """
-    if not lower_thirds:
-        return None
-
-    # 씬별 시작 시간 계산
-    scene_start_times = {}
-    scene_durations = {}
-    current_time = 0
-    for idx, scene in enumerate(scenes):
-        scene_start_times[idx + 1] = current_time  # 1-based index
-        scene_durations[idx + 1] = scene.get('duration', 0)
-        current_time += scene.get('duration', 0)
-
-    filters = []
-    # 언어별 폰트 선택 (font= 파라미터로 fontconfig 폴백 활성화)
-    if lang == 'ja':
-        font_name = lang_ja.FONTS['default_name']
-    elif lang == 'en':
-        font_name = lang_en.FONTS['default_name']
-    else:
-        font_name = lang_ko.FONTS['default_name']
-    font_escaped = font_name.replace(':', '\\:')
-
-    for lt in lower_thirds:
-        scene_num = lt.get('scene', 1)
-        text = lt.get('text', '')
-        position = lt.get('position', 'bottom-left')
-
-        if not text or scene_num not in scene_start_times:
-            continue
-
-        start_time = scene_start_times[scene_num]
-        # 로워서드는 씬 전체 동안 표시 (페이드인/아웃)
-        scene_duration = scene_durations.get(scene_num, 5)
-        end_time = start_time + scene_duration
-
-        # 위치별 좌표 설정
-        # 자막과 겹치지 않도록 충분히 위로 (하단에서 180px)
-        if position == 'bottom-left':
-            x_pos = "30"
-            y_pos = "h-th-180"  # 하단에서 180px 위 (자막 위)
-        elif position == 'bottom-right':
-            x_pos = "w-tw-30"
-            y_pos = "h-th-180"
-        elif position == 'bottom-center':
-            x_pos = "(w-tw)/2"
-            y_pos = "h-th-180"
-        else:  # default: bottom-left
-            x_pos = "30"
-            y_pos = "h-th-180"
-
-        # 반투명 배경 박스 + 텍스트 (뉴스 스타일)
-        # 배경 박스 필터 (drawbox)
-        box_filter = (
-            f"drawbox=x={x_pos}-10:y={y_pos}-10:"
-            f"w=tw+20:h=th+20:"
-            f"color=black@0.7:t=fill:"
-            f"enable='between(t,{start_time},{end_time})'"
-        )
-
-        # 텍스트 필터 (font= 파라미터로 fontconfig 폴백 활성화)
-        text_escaped = text.replace("'", "'\\''").replace(":", "\\:")
-        text_filter = (
-            f"drawtext=text='{text_escaped}':"
-            f"font='{font_escaped}':"
-            f"fontsize=28:"
-            f"fontcolor=white:"
-            f"x={x_pos}:"
-            f"y={y_pos}:"
-            f"enable='between(t,{start_time},{end_time})'"
-        )
-
-        # drawbox는 text_w를 모르므로 대략적인 크기 사용
-        # 더 정확한 방법: 텍스트만 표시 (배경 없이)
-        # 또는 box=1:boxcolor=black@0.7:boxborderw=10 사용
-        text_with_bg = (
-            f"drawtext=text='{text_escaped}':"
-            f"font='{font_escaped}':"
-            f"fontsize=28:"
-            f"fontcolor=white:"
-            f"box=1:"
-            f"boxcolor=black@0.7:"
-            f"boxborderw=10:"
-            f"x={x_pos}:"
-            f"y={y_pos}:"
-            f"enable='between(t,{start_time},{end_time})'"
-        )
-
-        filters.append(text_with_bg)
+            if result_fallback.returncode == 0:
+                print(f"[OUTRO] 아웃트로 연결 완료 (concat filter fallback): {output_path}")
+                return True
+            else:
+                stderr_fb = result_fallback.stderr.decode('utf-8', errors='ignore')[-300:]
+                print(f"[OUTRO] concat filter도 실패: {stderr_fb}")
+                return False
 
-    if filters:
-        return ",".join(filters)
-    return None
+    except Exception as e:
+        print(f"[OUTRO] 연결 오류: {e}")
+        return False
 
 
-def _generate_news_ticker_filter(news_ticker, total_duration, fonts_dir, lang='ko'):
-    """뉴스 티커(스크롤 헤드라인) 필터 생성
+def _analyze_shorts_content_gpt(highlight_narrations, title, detected_category, audience="general", duration_target=45):
+    """GPT-5.1로 쇼츠 전용 콘텐츠 분석 및 beats 구조 생성
 
     Args:
-        news_ticker: {"enabled": true, "headlines": ["속보: ...", "이슈: ..."]}
-        total_duration: 전체 영상 길이 (초)
-        fonts_dir: 폰트 디렉토리 경로
-        lang: 언어 코드 (ko, ja, en)
+        highlight_narrations: 하이라이트 씬들의 나레이션 목록
+        title: 원본 영상 제목
+        detected_category: news 또는 story
+        audience: general 또는 senior
+        duration_target: 목표 길이 (초)
 
     Returns:
-        FFmpeg drawtext 필터 문자열 또는 None
+        dict: beats 구조, meta, design_guide 등
     """
-    if not news_ticker or not news_ticker.get('enabled'):
-        return None
-
-    headlines = news_ticker.get('headlines', [])
-    if not headlines:
-        return None
-
-    # 헤드라인을 하나의 긴 텍스트로 연결 (구분자: ●)
-    ticker_text = "   ●   ".join(headlines) + "   ●   " + headlines[0]  # 반복을 위해 첫 번째 추가
-    ticker_text = ticker_text.replace("'", "'\\''").replace(":", "\\:")
-
-    # 언어별 폰트 선택 (font= 파라미터로 fontconfig 폴백 활성화)
-    if lang == 'ja':
-        font_name = lang_ja.FONTS['default_name']
-    elif lang == 'en':
-        font_name = lang_en.FONTS['default_name']
-    else:
-        font_name = lang_ko.FONTS['default_name']
-    font_escaped = font_name.replace(':', '\\:')
-
-    # 스크롤 속도: 전체 영상 동안 텍스트가 2-3번 정도 지나가도록
-    # x = w - (mod(t * speed, tw + w))
-    # speed = (tw + w) / (total_duration / scroll_cycles)
-    scroll_speed = 100  # 초당 100픽셀 이동
-
-    # 뉴스 티커 스타일: 하단에 어두운 빨간 배경(반투명) + 흰 텍스트
-    # 참고: drawbox에서 w=w는 순환 참조 에러 발생, iw(입력 너비) 사용
-    # font= 파라미터 사용으로 fontconfig 폴백 활성화 (일본어 문자 깨짐 방지)
-    ticker_filter = (
-        f"drawbox=x=0:y=ih-40:w=iw:h=40:color=0x8B0000@0.7:t=fill,"
-        f"drawtext=text='{ticker_text}':"
-        f"font='{font_escaped}':"
-        f"fontsize=24:"
-        f"fontcolor=white:"
-        f"x=w-mod(t*{scroll_speed}\\,tw+w):"
-        f"y=h-35"
-    )
-
-    return ticker_filter
-
-
-# BGM 분위기 별칭 매핑 (파일이 없을 경우 대체 분위기로 폴백)
-# 현재 사용 가능한 BGM: calm, cinematic, comedic, dramatic, epic, hopeful, horror, mysterious, nostalgic, sad, tense, upbeat
-BGM_MOOD_ALIAS = {
-    # 뉴스/다큐멘터리/기업 계열 → calm 또는 cinematic
-    "documentary": "cinematic",
-    "news": "calm",
-    "informative": "calm",
-    "corporate": "calm",
-    "trailer": "cinematic",
-
-    # 감정 계열 → sad, hopeful, nostalgic
-    "melancholy": "sad",
-    "melancholic": "sad",
-    "sentimental": "sad",
-    "touching": "sad",
-    "emotional": "sad",
-    "inspiring": "hopeful",
-    "uplifting": "hopeful",
-    "motivational": "hopeful",
-    "triumphant": "epic",
-    "romantic": "nostalgic",
-
-    # 긴장/서스펜스 계열 → tense, mysterious, horror
-    "suspense": "tense",
-    "suspenseful": "tense",
-    "thriller": "tense",
-    "chase": "tense",
-    "dark": "mysterious",
-    "ethereal": "mysterious",
-
-    # 밝은/긍정/에너지 계열 → upbeat, comedic
-    "cheerful": "upbeat",
-    "happy": "upbeat",
-    "bright": "upbeat",
-    "energetic": "upbeat",
-    "whimsical": "comedic",
-
-    # 차분한/평화 계열 → calm
-    "peaceful": "calm",
-    "relaxing": "calm",
-    "ambient": "calm",
-    "jazz": "calm",
-    "classical": "calm",
-    "acoustic": "calm",
-    "piano": "calm",
-    "electronic": "upbeat",
-
-    # 액션/모험 계열 → epic, dramatic
-    "action": "epic",
-    "adventure": "epic",
-    "battle": "epic",
-    "heroic": "epic",
-}
+    try:
+        client = llm_clients.require_client(
+            "openai", call_site="shorts-content-analyze", cache_ttl=llm_clients.DEFAULT_CACHE_TTL
+        )
 
+        # 나레이션에서 핵심 포인트 추출
+        combined_narration = "\n".join(highlight_narrations)
+        main_points = highlight_narrations[:3] if len(highlight_narrations) >= 3 else highlight_narrations
 
-def _get_bgm_file(mood, bgm_dir=None):
-    """분위기에 맞는 BGM 파일 선택 (여러 개면 랜덤)
+        # short_type 결정
+        short_type = "해설" if detected_category == "news" else "사례소개"
 
-    Args:
-        mood: 지원 분위기 (12종) - calm, cinematic, comedic, dramatic, epic,
-              hopeful, horror, mysterious, nostalgic, sad, tense, upbeat
-              (파일이 없으면 BGM_MOOD_ALIAS에 따라 대체 분위기로 폴백)
-        bgm_dir: BGM 파일 디렉토리 (없으면 스크립트 위치 기준)
+        # audience_needs 설정
+        if audience == "senior":
+            audience_desc = "50-70대 시니어"
+            audience_needs = ["짧은 시간에 핵심만 알고 싶다", "복잡한 설명 없이 요점만"]
+        else:
+            audience_desc = "20-40대 직장인"
+            audience_needs = ["출퇴근 1분 안에 핵심만", "지금 당장 뭘 해야 하는지"]
 
-    Returns:
-        BGM 파일 경로 또는 None
-    """
-    import glob
-    import random
+        system_prompt = f'''너는 "유튜브 쇼츠 전담 PD + 편집 디렉터 + 각본가"다.
+뉴스·시사·경제·정보 콘텐츠를 쇼츠 포맷(60초 이하)으로 최적화하는 전문가다.
 
-    # 스크립트 위치 기준 절대 경로 사용
-    if bgm_dir is None:
-        script_dir = os.path.dirname(os.path.abspath(__file__))
-        bgm_dir = os.path.join(script_dir, "static", "audio", "bgm")
+목표:
+1) 1.5초 안에 스크롤을 멈추는 강력한 훅
+2) 완주율 80-90% 목표의 구조 설계
+3) 편집자가 그대로 따라 만들 수 있는 씬 단위 설계서(JSON)
 
-    print(f"[BGM] 검색 시작: mood='{mood}', dir='{bgm_dir}'")
+## 포맷 규격
+- 방향: 세로 9:16 (1080x1920)
+- 길이: 35-60초 (정보/해설형)
+- 첫 1.5-3초 안에 스크롤 멈추는 훅 필수
 
-    if not mood:
-        print(f"[BGM] mood가 비어있음")
-        return None
+## 입력값
+- short_topic: "{title}"
+- short_type: "{short_type}"
+- main_audience: "{audience_desc}"
+- audience_needs: {audience_needs}
+- main_point_1: "{main_points[0] if len(main_points) > 0 else ''}"
+- main_point_2: "{main_points[1] if len(main_points) > 1 else ''}"
+- main_point_3: "{main_points[2] if len(main_points) > 2 else ''}"
+- duration_target_sec: {duration_target}
+- hook_angle_preference: "숫자, 솔루션"
 
-    if not os.path.exists(bgm_dir):
-        print(f"[BGM] 디렉토리 없음: {bgm_dir}")
-        print(f"[BGM] ⚠️ BGM 파일을 {bgm_dir}에 업로드하세요. 예: {mood}.mp3, {mood}_01.mp3")
-        return None
+## beats 설계 규칙
+- 1.0-3.0초 단위의 beat를 연속 설계
+- 기본 구조:
+  - Beat 1: hook (0-2초) - 12-18자, 3초 이내 낭독
+  - Beat 2: 상황/문제 제기 (2-6초)
+  - Beat 3-4: 핵심 포인트 1,2 (6-18초)
+  - Beat 5-6: 핵심 포인트 3 + 반전/경고 (18-35초)
+  - Beat 7: 요약 + CTA or loop (마지막 3-5초)
 
-    # 파일명 패턴: mood.mp3, mood_01.mp3, mood (1).mp3 등
-    patterns = [
-        os.path.join(bgm_dir, f"{mood}.mp3"),
-        os.path.join(bgm_dir, f"{mood}_*.mp3"),
-        os.path.join(bgm_dir, f"{mood} *.mp3"),  # 공백 포함
-        os.path.join(bgm_dir, f"{mood}*.mp3"),
-    ]
+## 각 beat 필수 포함
+- voiceover: TTS용 자연스러운 구어체
+- on_screen_text: 핵심 1-2줄 (16자 내외)
+- visual_type: A-roll_talking_head / B-roll / infographic / text_only
+- visual_direction: 화면 구성 설명
+- broll_idea_or_prompt: AI 이미지 생성용 영어 프롬프트
+- caption_style: {{ use_captions, emphasis_words, position }}
+- sound_direction: {{ bgm_mood, sfx, pause_hint }}
 
-    matching_files = []
-    for pattern in patterns:
-        found = glob.glob(pattern)
-        matching_files.extend(found)
-
-    # 중복 제거
-    matching_files = list(set(matching_files))
-
-    # 디렉토리 내 모든 파일 출력 (디버그용)
-    all_files = glob.glob(os.path.join(bgm_dir, "*.mp3"))
-    print(f"[BGM] 디렉토리 내 전체 파일: {[os.path.basename(f) for f in all_files]}")
-
-    if not matching_files:
-        # 별칭 매핑으로 폴백 시도
-        alias_mood = BGM_MOOD_ALIAS.get(mood)
-        if alias_mood:
-            print(f"[BGM] '{mood}' 파일 없음 → '{alias_mood}'로 폴백 시도")
-            alias_patterns = [
-                os.path.join(bgm_dir, f"{alias_mood}.mp3"),
-                os.path.join(bgm_dir, f"{alias_mood}_*.mp3"),
-                os.path.join(bgm_dir, f"{alias_mood} *.mp3"),
-                os.path.join(bgm_dir, f"{alias_mood}*.mp3"),
-            ]
-            for pattern in alias_patterns:
-                matching_files.extend(glob.glob(pattern))
-            matching_files = list(set(matching_files))
+## 출력 형식 (JSON ONLY)
+JSON 외부에 어떤 텍스트도 쓰지 말 것.'''
 
-        if not matching_files:
-            print(f"[BGM] '{mood}' 분위기 BGM 파일 없음")
-            print(f"[BGM] ⚠️ {bgm_dir}/{mood}.mp3 또는 {mood}_01.mp3 형식으로 파일을 업로드하세요")
-            return None
+        user_prompt = f'''원본 영상의 하이라이트 나레이션:
+{combined_narration}
 
-    # 랜덤 선택
-    selected = random.choice(matching_files)
-    print(f"[BGM] 선택된 BGM: {selected} (후보 {len(matching_files)}개 중)")
-    return selected
+위 내용을 기반으로 {duration_target}초 쇼츠를 설계해줘.
+훅은 "숫자 + 위험/기회 + 타깃"을 조합해서 강력하게 만들어.
 
+JSON 형식으로만 출력해. 다른 텍스트 없이 순수 JSON만.'''
 
-def _mix_bgm_with_video(video_path, bgm_path, output_path, bgm_volume=0.10):
-    """비디오에 BGM 믹싱 (나레이션 유지, BGM은 작게)
+        print(f"[SHORTS-GPT] 쇼츠 콘텐츠 분석 시작...")
 
-    Args:
-        video_path: 원본 비디오 경로
-        bgm_path: BGM 오디오 경로
-        output_path: 출력 비디오 경로
-        bgm_volume: BGM 볼륨 (0.0~1.0, 기본 0.10 = 10%)
+        response = client.responses.create(
+            model="gpt-5.1",
+            input=[
+                {"role": "system", "content": [{"type": "input_text", "text": system_prompt}]},
+                {"role": "user", "content": [{"type": "input_text", "text": user_prompt}]}
+            ],
+            temperature=0.7
+        )
 
-    Returns:
-        성공 여부 (bool)
-    """
-    try:
-        # 비디오 길이 확인
-        probe_cmd = ["ffprobe", "-v", "error", "-show_entries", "format=duration",
-                     "-of", "default=noprint_wrappers=1:nokey=1", video_path]
-        result = subprocess.run(probe_cmd, capture_output=True, text=True, timeout=30)
-        video_duration = float(result.stdout.strip())
+        # 결과 추출
+        if getattr(response, "output_text", None):
+            result_text = response.output_text.strip()
+        else:
+            text_chunks = []
+            for item in getattr(response, "output", []) or []:
+                for content in getattr(item, "content", []) or []:
+                    if getattr(content, "type", "") == "text":
+                        text_chunks.append(getattr(content, "text", ""))
+            result_text = "\n".join(text_chunks).strip()
 
-        print(f"[BGM] 비디오 길이: {video_duration:.1f}초", flush=True)
+        # JSON 파싱
+        print(f"[SHORTS-GPT] GPT 응답 길이: {len(result_text)}자")
+        print(f"[SHORTS-GPT] GPT 응답 (처음 500자): {result_text[:500]}")
 
-        # FFmpeg 명령: BGM 루프 + 볼륨 조절 + 믹싱 + 페이드아웃
-        # -stream_loop -1: BGM 무한 루프
-        # volume: BGM 볼륨 낮춤
-        # amix: 오디오 믹싱
-        # afade: 마지막 3초 페이드아웃
+        if result_text.startswith("```"):
+            result_text = result_text.split("```")[1]
+            if result_text.startswith("json"):
+                result_text = result_text[4:]
+        result_text = result_text.strip()
 
-        fade_start = max(0, video_duration - 3)  # 마지막 3초
+        import re
+        result_text = re.sub(r',\s*\]', ']', result_text)
+        result_text = re.sub(r',\s*\}', '}', result_text)
 
-        ffmpeg_cmd = [
-            "ffmpeg", "-y",
-            "-i", video_path,                          # 원본 비디오 (오디오 포함)
-            "-stream_loop", "-1", "-i", bgm_path,      # BGM 루프
-            "-filter_complex",
-            f"[1:a]volume={bgm_volume},afade=t=in:st=0:d=2,afade=t=out:st={fade_start}:d=3[bgm];"  # BGM 볼륨+페이드
-            f"[0:a][bgm]amix=inputs=2:duration=first:dropout_transition=2:normalize=0[aout]",  # 믹싱 (normalize=0: TTS 볼륨 유지)
-            "-map", "0:v",                             # 비디오 스트림
-            "-map", "[aout]",                          # 믹싱된 오디오
-            "-c:v", "copy",                            # 비디오 재인코딩 안함
-            "-c:a", "aac", "-b:a", "128k",            # 오디오 인코딩
-            "-shortest",                               # 비디오 길이에 맞춤
-            output_path
-        ]
+        try:
+            result = json.loads(result_text)
+        except json.JSONDecodeError as je:
+            print(f"[SHORTS-GPT] JSON 파싱 실패: {je}")
+            print(f"[SHORTS-GPT] 파싱 시도한 텍스트: {result_text[:1000]}")
+            llm_clients.invalidate(response)
+            return None
 
-        print(f"[BGM] 믹싱 시작...", flush=True)
-        result = subprocess.run(ffmpeg_cmd, stdout=subprocess.DEVNULL,
-                               stderr=subprocess.PIPE, timeout=600)
+        # beats 위치: result.beats 또는 result.structure.beats
+        beats = result.get("beats", []) or result.get("structure", {}).get("beats", [])
+        print(f"[SHORTS-GPT] 분석 완료: {len(beats)}개 beats 생성")
+        if len(beats) == 0:
+            print(f"[SHORTS-GPT] 경고: beats 없음. result keys: {list(result.keys())}")
+            if "beats" in result:
+                print(f"[SHORTS-GPT] beats 타입: {type(result['beats'])}")
 
-        if result.returncode == 0:
-            print(f"[BGM] 믹싱 완료: {output_path}", flush=True)
-            return True
-        else:
-            stderr = result.stderr.decode('utf-8', errors='ignore')[:300]
-            print(f"[BGM] 믹싱 실패: {stderr}", flush=True)
-            return False
+        return result
 
     except Exception as e:
-        print(f"[BGM] 믹싱 오류: {e}", flush=True)
-        return False
+        print(f"[SHORTS-GPT] 오류: {e}")
+        import traceback
+        traceback.print_exc()
+        return None
 
 
-def _mix_scene_bgm_with_video(video_path, scenes, video_effects, output_path, bgm_volume=0.10):
-    """비디오에 씬별 BGM 믹싱 (감정 흐름에 따라 BGM 전환)
+def _generate_shorts_video_v2(shorts_analysis, voice_name, output_path, base_url="http://localhost:5000", scene_images=None, fixed_title=None):
+    """쇼츠 전용 영상 생성 (새 TTS + 메인 영상 이미지 크롭 + 한국 뉴스 스타일 텍스트)
 
     Args:
-        video_path: 원본 비디오 경로
-        scenes: 씬 목록 (duration 정보 포함)
-        video_effects: video_effects 객체 (bgm_mood, scene_bgm_changes 포함)
-        output_path: 출력 비디오 경로
-        bgm_volume: BGM 볼륨 (0.0~1.0, 기본 0.10 = 10%)
+        shorts_analysis: GPT-5.1 쇼츠 분석 결과 (beats 포함)
+        voice_name: TTS 음성 이름
+        output_path: 출력 파일 경로
+        base_url: API 서버 URL
+        scene_images: 메인 영상의 씬 이미지 URL 리스트 (16:9 → 9:16 크롭용)
+        fixed_title: 전체 영상에 고정 표시할 타이틀 (영상 제목)
 
     Returns:
-        성공 여부 (bool)
+        dict: {ok, shorts_path, duration, cost}
     """
+    import requests as req
     import tempfile
     import shutil
 
-    try:
-        base_mood = video_effects.get('bgm_mood', '')
-        scene_bgm_changes = video_effects.get('scene_bgm_changes', [])
-
-        if not base_mood:
-            print(f"[BGM-SCENE] 기본 BGM 분위기가 없음")
-            return False
-
-        # 씬별 시작/종료 시간 계산
-        scene_times = []
-        current_time = 0
-        for idx, scene in enumerate(scenes):
-            duration = scene.get('duration', 0)
-            scene_times.append({
-                'scene': idx + 1,
-                'start': current_time,
-                'end': current_time + duration,
-                'duration': duration
-            })
-            current_time += duration
-
-        total_duration = current_time
-        print(f"[BGM-SCENE] 전체 길이: {total_duration:.1f}초, 씬 수: {len(scenes)}")
-
-        # scene_bgm_changes가 없거나 비어있으면 기존 방식으로 폴백
-        if not scene_bgm_changes:
-            print(f"[BGM-SCENE] 씬별 BGM 변경 없음, 기존 방식 사용")
-            bgm_file = _get_bgm_file(base_mood)
-            if bgm_file:
-                return _mix_bgm_with_video(video_path, bgm_file, output_path, bgm_volume)
-            return False
+    print(f"[SHORTS-V2] 쇼츠 영상 생성 시작 (메인 이미지 크롭 + 한국 뉴스 스타일)")
 
-        # BGM 구간 계산 (각 구간의 mood와 시간)
-        bgm_segments = []
-        changes_dict = {c['scene']: c['mood'] for c in scene_bgm_changes}
-
-        current_mood = base_mood
-        segment_start = 0
-
-        for st in scene_times:
-            scene_num = st['scene']
-            if scene_num in changes_dict:
-                # 이전 구간 저장
-                if st['start'] > segment_start:
-                    bgm_segments.append({
-                        'mood': current_mood,
-                        'start': segment_start,
-                        'end': st['start'],
-                        'duration': st['start'] - segment_start
-                    })
-                # 새 mood로 전환
-                current_mood = changes_dict[scene_num]
-                segment_start = st['start']
-
-        # 마지막 구간 추가
-        if total_duration > segment_start:
-            bgm_segments.append({
-                'mood': current_mood,
-                'start': segment_start,
-                'end': total_duration,
-                'duration': total_duration - segment_start
-            })
+    try:
+        # beats 위치: result.beats 또는 result.structure.beats
+        beats = shorts_analysis.get("beats", []) or shorts_analysis.get("structure", {}).get("beats", [])
+        if not beats:
+            return {"ok": False, "error": "beats 데이터 없음"}
 
-        print(f"[BGM-SCENE] BGM 구간: {len(bgm_segments)}개")
-        for seg in bgm_segments:
-            print(f"  - {seg['mood']}: {seg['start']:.1f}s ~ {seg['end']:.1f}s ({seg['duration']:.1f}s)")
+        print(f"[SHORTS-V2] {len(beats)}개 beats 처리 시작")
 
-        # 임시 디렉토리 생성
         temp_dir = tempfile.mkdtemp()
+        total_cost = 0.0
+        beat_data = []  # [{audio_path, image_path, duration, subtitles, on_screen_text}]
 
         try:
-            # 각 구간별 BGM 세그먼트 준비
-            input_files = [video_path]
-            filter_parts = []
-
-            for i, seg in enumerate(bgm_segments):
-                bgm_file = _get_bgm_file(seg['mood'])
-                if not bgm_file:
-                    print(f"[BGM-SCENE] '{seg['mood']}' BGM 파일 없음, 건너뜀")
-                    continue
+            # ========== 1. 각 beat별 TTS + 이미지 생성 ==========
+            for idx, beat in enumerate(beats):
+                beat_id = beat.get("id", idx + 1)
+                voiceover = beat.get("voiceover", "")
+                on_screen_text = beat.get("on_screen_text", "")
+                visual_direction = beat.get("visual_direction", "")
+                broll_prompt = beat.get("broll_idea_or_prompt", "")
+                caption_style = beat.get("caption_style", {})
 
-                input_files.append(bgm_file)
-                input_idx = len(input_files) - 1
+                print(f"[SHORTS-V2] Beat {beat_id}: {voiceover[:30]}...")
 
-                # 각 BGM 구간에 볼륨, 딜레이, 트림, 페이드 적용
-                delay_ms = int(seg['start'] * 1000)
-                duration = seg['duration']
+                # 1-1. TTS 생성
+                audio_path = os.path.join(temp_dir, f"beat_{beat_id:02d}_audio.mp3")
+                try:
+                    tts_resp = req.post(f"{base_url}/api/shorts/generate-tts", json={
+                        "text": voiceover,
+                        "voice": voice_name,
+                        "speed": 1.2
+                    }, timeout=60)
 
-                # 페이드 인/아웃: 구간 시작/끝에 1초씩
-                fade_in_duration = min(1.0, duration * 0.2)
-                fade_out_start = max(0, duration - 1.0)
-                fade_out_duration = min(1.0, duration * 0.2)
+                    if tts_resp.status_code == 200:
+                        tts_data = tts_resp.json()
+                        if tts_data.get("ok"):
+                            # 오디오 URL에서 다운로드
+                            audio_url = tts_data.get("audioUrl", "")
+                            if audio_url:
+                                audio_resp = req.get(f"{base_url}{audio_url}", timeout=30)
+                                with open(audio_path, "wb") as f:
+                                    f.write(audio_resp.content)
+                                total_cost += len(voiceover) * 0.000004
+                                print(f"[SHORTS-V2] Beat {beat_id} TTS 완료")
+                except Exception as tts_err:
+                    print(f"[SHORTS-V2] Beat {beat_id} TTS 실패: {tts_err}")
+                    # TTS 실패 시 무음 생성
+                    subprocess.run([
+                        "ffmpeg", "-y", "-f", "lavfi",
+                        "-i", f"anullsrc=r=44100:cl=mono",
+                        "-t", "3", audio_path
+                    ], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
 
-                filter_parts.append(
-                    f"[{input_idx}:a]atrim=0:{duration},asetpts=PTS-STARTPTS,"
-                    f"volume={bgm_volume},"
-                    f"afade=t=in:st=0:d={fade_in_duration},"
-                    f"afade=t=out:st={fade_out_start}:d={fade_out_duration},"
-                    f"adelay={delay_ms}|{delay_ms}[bgm{i}]"
-                )
-
-            if not filter_parts:
-                print(f"[BGM-SCENE] 사용 가능한 BGM 없음")
-                shutil.rmtree(temp_dir, ignore_errors=True)
-                return False
-
-            # 모든 BGM 스트림 믹싱
-            bgm_labels = "".join([f"[bgm{i}]" for i in range(len(filter_parts))])
-            filter_parts.append(
-                f"{bgm_labels}amix=inputs={len(filter_parts)}:duration=longest:dropout_transition=2:normalize=0[bgm_mixed]"
-            )
+                # 오디오 길이 측정
+                duration = 3.0  # 기본값
+                if os.path.exists(audio_path):
+                    probe_result = subprocess.run([
+                        "ffprobe", "-v", "error", "-show_entries", "format=duration",
+                        "-of", "default=noprint_wrappers=1:nokey=1", audio_path
+                    ], capture_output=True, text=True)
+                    if probe_result.returncode == 0:
+                        try:
+                            duration = float(probe_result.stdout.strip())
+                        except:
+                            pass
 
-            # 원본 오디오와 믹싱된 BGM 합치기
-            filter_parts.append(
-                f"[0:a][bgm_mixed]amix=inputs=2:duration=first:dropout_transition=2:normalize=0[aout]"
-            )
+                # 1-2. 쇼츠용 9:16 이미지 생성 (스틱맨 중앙 배치)
+                image_path = os.path.join(temp_dir, f"beat_{beat_id:02d}_image.png")
 
-            filter_complex = ";".join(filter_parts)
+                # 옵션 1: broll_prompt가 있으면 전용 9:16 이미지 생성 시도
+                shorts_image_generated = False
+                if broll_prompt:
+                    try:
+                        # 9:16 세로 이미지용 프롬프트 강화
+                        # 중요: 웹툰 스타일 캐릭터 + 배경 (다른 사람/텍스트 없음)
+                        vertical_prompt = f"""VERTICAL 9:16 PORTRAIT composition for mobile shorts.
 
-            # FFmpeg 명령 구성
-            input_args = []
-            for f in input_files:
-                if f == input_files[0]:
-                    input_args.extend(["-i", f])
-                else:
-                    input_args.extend(["-stream_loop", "-1", "-i", f])
+CRITICAL - KOREAN WEBTOON/MANHWA STYLE CHARACTER:
+- CENTER a Korean webtoon/manhwa style character in the frame
+- Character design: EXAGGERATED EXPRESSION (shocked face, wide eyes, open mouth, sweat drops), 30-50 year old Korean man or woman
+- Clean bold outlines, vibrant flat colors, comic-style expression marks
+- Position character in the CENTER-BOTTOM area (leaving top 25% for text overlay)
 
-            ffmpeg_cmd = [
-                "ffmpeg", "-y",
-                *input_args,
-                "-filter_complex", filter_complex,
-                "-map", "0:v",
-                "-map", "[aout]",
-                "-c:v", "copy",
-                "-c:a", "aac", "-b:a", "128k",
-                "-shortest",
-                output_path
-            ]
+FORBIDDEN - DO NOT INCLUDE:
+- NO photorealistic humans or photographs
+- NO stickman/stick figures
+- NO text, letters, words, Korean characters, or any writing in the image
+- NO Japanese anime style, NO 3D render
 
-            print(f"[BGM-SCENE] 씬별 BGM 믹싱 시작...")
-            result = subprocess.run(ffmpeg_cmd, stdout=subprocess.DEVNULL,
-                                   stderr=subprocess.PIPE, timeout=900)
+Background style: Detailed background related to the scene, vibrant colors
+Scene environment: {broll_prompt}
 
-            if result.returncode == 0:
-                print(f"[BGM-SCENE] 믹싱 완료: {output_path}")
-                return True
-            else:
-                stderr = result.stderr.decode('utf-8', errors='ignore')[-500:]
-                print(f"[BGM-SCENE] 믹싱 실패: {stderr}")
-                # 실패 시 기존 방식으로 폴백
-                print(f"[BGM-SCENE] 기존 방식으로 폴백...")
-                bgm_file = _get_bgm_file(base_mood)
-                if bgm_file:
-                    return _mix_bgm_with_video(video_path, bgm_file, output_path, bgm_volume)
-                return False
+OUTPUT: 1080x1920 vertical Korean webtoon style illustration with centered character against scenic background."""
 
-        finally:
-            shutil.rmtree(temp_dir, ignore_errors=True)
+                        # Gemini API로 9:16 이미지 생성
+                        gen_resp = req.post(f"{base_url}/api/drama/generate-image", json={
+                            "prompt": vertical_prompt,
+                            "width": 1080,
+                            "height": 1920,
+                            "model": "gemini-2.5-flash"
+                        }, timeout=60)
 
-    except Exception as e:
-        print(f"[BGM-SCENE] 믹싱 오류: {e}")
-        import traceback
-        traceback.print_exc()
-        # 실패 시 기존 방식으로 폴백
-        try:
-            base_mood = video_effects.get('bgm_mood', '')
-            if base_mood:
-                bgm_file = _get_bgm_file(base_mood)
-                if bgm_file:
-                    return _mix_bgm_with_video(video_path, bgm_file, output_path, bgm_volume)
-        except:
-            pass
-        return False
+                        if gen_resp.status_code == 200:
+                            gen_data = gen_resp.json()
+                            if gen_data.get("ok") and gen_data.get("imageUrl"):
+                                img_url = gen_data["imageUrl"]
+                                # 생성된 이미지 다운로드
+                                if img_url.startswith("http"):
+                                    img_download = req.get(img_url, timeout=30)
+                                else:
+                                    img_download = req.get(f"{base_url}{img_url}", timeout=30)
 
+                                with open(image_path, "wb") as f:
+                                    f.write(img_download.content)
 
-def _get_sfx_file(sfx_type, sfx_dir=None):
-    """효과음 타입에 맞는 파일 선택 (여러 개면 랜덤)
+                                if os.path.exists(image_path) and os.path.getsize(image_path) > 1000:
+                                    shorts_image_generated = True
+                                    total_cost += 0.02  # Gemini 이미지 생성 비용
+                                    print(f"[SHORTS-V2] Beat {beat_id} 전용 9:16 이미지 생성 완료 (스틱맨 중앙)")
+                    except Exception as gen_err:
+                        print(f"[SHORTS-V2] Beat {beat_id} 이미지 생성 실패, 크롭으로 fallback: {gen_err}")
 
-    Args:
-        sfx_type: impact, whoosh, ding, tension, emotional, success
-        sfx_dir: 효과음 파일 디렉토리 (없으면 스크립트 위치 기준)
+                # 옵션 2: 전용 이미지 생성 실패 시 기존 이미지 크롭
+                if not shorts_image_generated and scene_images and len(scene_images) > 0:
+                    # beat_id에 해당하는 이미지 선택 (순환)
+                    img_idx = (idx) % len(scene_images)
+                    source_img_url = scene_images[img_idx]
 
-    Returns:
-        효과음 파일 경로 또는 None
-    """
-    import glob
-    import random
+                    if source_img_url:
+                        try:
+                            # 원본 이미지 다운로드
+                            temp_source = os.path.join(temp_dir, f"source_{beat_id:02d}.png")
+                            if source_img_url.startswith("http"):
+                                img_download = req.get(source_img_url, timeout=30)
+                            else:
+                                img_download = req.get(f"{base_url}{source_img_url}", timeout=30)
 
-    # 스크립트 위치 기준 절대 경로 사용
-    if sfx_dir is None:
-        script_dir = os.path.dirname(os.path.abspath(__file__))
-        sfx_dir = os.path.join(script_dir, "static", "audio", "sfx")
+                            with open(temp_source, "wb") as f:
+                                f.write(img_download.content)
 
-    print(f"[SFX] 검색 시작: type='{sfx_type}', dir='{sfx_dir}'")
+                            # 16:9 → 9:16 크롭 (중앙 기준, 세로로 확대 후 좌우 크롭)
+                            # scale=-1:1920 = 높이 1920으로 스케일 (비율 유지)
+                            # crop=1080:1920 = 중앙에서 1080x1920 크롭
+                            crop_cmd = [
+                                "ffmpeg", "-y", "-i", temp_source,
+                                "-vf", "scale=-1:1920,crop=1080:1920",
+                                "-frames:v", "1", image_path
+                            ]
+                            crop_result = subprocess.run(crop_cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, timeout=30)
 
-    if not sfx_type:
-        print(f"[SFX] sfx_type이 비어있음")
-        return None
+                            if crop_result.returncode == 0 and os.path.exists(image_path):
+                                print(f"[SHORTS-V2] Beat {beat_id} 이미지 크롭 완료 (원본: {img_idx+1}번째, 스틱맨 잘릴 수 있음)")
+                            else:
+                                print(f"[SHORTS-V2] Beat {beat_id} 크롭 실패: {crop_result.stderr.decode('utf-8', errors='ignore')[-200:]}")
+                        except Exception as crop_err:
+                            print(f"[SHORTS-V2] Beat {beat_id} 이미지 크롭 실패: {crop_err}")
 
-    if not os.path.exists(sfx_dir):
-        print(f"[SFX] 디렉토리 없음: {sfx_dir}")
-        print(f"[SFX] ⚠️ 효과음 파일을 {sfx_dir}에 업로드하세요. 예: {sfx_type}.mp3")
-        return None
+                # 이미지 파일이 없으면 fallback: 어두운 그라데이션 배경 생성
+                if not os.path.exists(image_path):
+                    print(f"[SHORTS-V2] Beat {beat_id} 이미지 없음, 그라데이션 배경 생성")
+                    # 뉴스 스타일 어두운 그라데이션 배경 (상단 진한 파랑 → 하단 검정)
+                    subprocess.run([
+                        "ffmpeg", "-y", "-f", "lavfi",
+                        "-i", "gradients=s=1080x1920:c0=0x0a1628:c1=0x000000:x0=0:y0=0:x1=0:y1=1920:d=1",
+                        "-frames:v", "1", image_path
+                    ], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
 
-    patterns = [
-        os.path.join(sfx_dir, f"{sfx_type}.mp3"),
-        os.path.join(sfx_dir, f"{sfx_type}_*.mp3"),
-        os.path.join(sfx_dir, f"{sfx_type}*.mp3"),
-    ]
+                    # gradients 필터가 없는 FFmpeg 버전 fallback
+                    if not os.path.exists(image_path):
+                        subprocess.run([
+                            "ffmpeg", "-y", "-f", "lavfi",
+                            "-i", "color=c=0x0a1628:s=1080x1920:d=1",
+                            "-frames:v", "1", image_path
+                        ], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
 
-    matching_files = []
-    for pattern in patterns:
-        matching_files.extend(glob.glob(pattern))
+                # 자막 정보 저장
+                emphasis_words = caption_style.get("emphasis_words", [])
 
-    matching_files = list(set(matching_files))
+                beat_data.append({
+                    "beat_id": beat_id,
+                    "audio_path": audio_path,
+                    "image_path": image_path,
+                    "duration": duration,
+                    "voiceover": voiceover,
+                    "on_screen_text": on_screen_text,
+                    "emphasis_words": emphasis_words
+                })
 
-    # 디렉토리 내 모든 파일 출력 (디버그용)
-    all_files = glob.glob(os.path.join(sfx_dir, "*.mp3"))
-    print(f"[SFX] 디렉토리 내 전체 파일: {[os.path.basename(f) for f in all_files]}")
+            # ========== 2. 각 beat를 클립으로 합성 ==========
+            print(f"[SHORTS-V2] 클립 합성 시작...")
+            clip_paths = []
 
-    if not matching_files:
-        print(f"[SFX] '{sfx_type}' 효과음 파일 없음")
-        print(f"[SFX] ⚠️ {sfx_dir}/{sfx_type}.mp3 형식으로 파일을 업로드하세요")
-        return None
+            for bd in beat_data:
+                clip_path = os.path.join(temp_dir, f"clip_{bd['beat_id']:02d}.mp4")
 
-    selected = random.choice(matching_files)
-    print(f"[SFX] 선택된 효과음: {selected}")
-    return selected
+                # 이미지 + 오디오 + 자막 합성 (한국 뉴스 스타일 + TTS 싱크)
+                voiceover_raw = bd['voiceover']
+                beat_duration = bd['duration']
 
+                # 폰트 설정: lang/ko.py에서 관리
+                font_path = f"fonts/{lang_ko.FONTS['default']}"
+                if not os.path.exists(font_path):
+                    font_path = lang_ko.FONTS['system_paths'][0] if lang_ko.FONTS['system_paths'] else font_path
+                font_escaped = font_path.replace("\\", "/").replace(":", "\\:")
 
-def _trim_sfx(input_path, output_path, max_duration=2.5, fade_out=0.5):
-    """효과음을 지정 길이로 자르고 페이드아웃 적용
+                # ========== TTS 싱크 자막: 문장/구 단위로 분할 ==========
+                # 마침표, 쉼표, 물음표 등으로 분할
+                import re
+                # 문장 구분자로 분할 (구분자 포함)
+                sentence_pattern = r'([^.!?,。，、！？]+[.!?,。，、！？]?)'
+                raw_segments = re.findall(sentence_pattern, voiceover_raw)
+                # 빈 문자열 제거 및 정리
+                segments = [s.strip() for s in raw_segments if s.strip()]
 
-    Args:
-        input_path: 원본 효과음 경로
-        output_path: 출력 경로
-        max_duration: 최대 길이 (초)
-        fade_out: 페이드아웃 길이 (초)
+                # 세그먼트가 너무 많으면 병합 (최대 4개)
+                if len(segments) > 4:
+                    merged = []
+                    chunk_size = (len(segments) + 3) // 4
+                    for i in range(0, len(segments), chunk_size):
+                        merged.append(' '.join(segments[i:i+chunk_size]))
+                    segments = merged
 
-    Returns:
-        성공 여부 (bool)
-    """
-    try:
-        fade_start = max(0, max_duration - fade_out)
-        ffmpeg_cmd = [
-            "ffmpeg", "-y",
-            "-i", input_path,
-            "-t", str(max_duration),
-            "-af", f"afade=t=out:st={fade_start}:d={fade_out}",
-            "-c:a", "libmp3lame", "-q:a", "2",
-            output_path
-        ]
-        result = subprocess.run(ffmpeg_cmd, stdout=subprocess.DEVNULL,
-                               stderr=subprocess.PIPE, timeout=30)
-        return result.returncode == 0
-    except Exception as e:
-        print(f"[SFX] 트림 오류: {e}")
-        return False
+                # 세그먼트가 없으면 전체를 하나로
+                if not segments:
+                    segments = [voiceover_raw]
 
+                # 각 세그먼트의 시간 계산 (글자 수 비율 기반)
+                total_chars = sum(len(s) for s in segments)
+                if total_chars == 0:
+                    total_chars = 1
 
-def _mix_sfx_into_video(video_path, sound_effects, scenes, output_path, sfx_dir=None):
-    """비디오에 효과음 믹싱
+                segment_timings = []
+                current_time = 0.0
+                for seg in segments:
+                    seg_duration = (len(seg) / total_chars) * beat_duration
+                    segment_timings.append({
+                        'text': seg,
+                        'start': current_time,
+                        'end': current_time + seg_duration
+                    })
+                    current_time += seg_duration
 
-    Args:
-        video_path: 원본 비디오 경로
-        sound_effects: [{"scene": 1, "type": "impact"}, ...]
-        scenes: 씬 목록 (타이밍 계산용)
-        output_path: 출력 비디오 경로
-        sfx_dir: 효과음 디렉토리 (없으면 스크립트 위치 기준)
+                # ========== 한국 뉴스 스타일 텍스트 오버레이 ==========
+                # 쇼츠 해상도: 1080x1920 (9:16)
+                # 1. 기본 필터: 해상도 + 하단 배경 박스
+                subtitle_filter = (
+                    f"scale=1080:1920:force_original_aspect_ratio=decrease,pad=1080:1920:(ow-iw)/2:(oh-ih)/2:black,"
+                    f"drawbox=x=0:y=ih*0.68:w=iw:h=ih*0.32:color=black@0.75:t=fill"
+                )
 
-    Returns:
-        성공 여부 (bool)
-    """
-    if not sound_effects:
-        return False
+                # 2. TTS 싱크 자막: 각 세그먼트를 시간에 맞춰 표시
+                for seg_idx, seg_info in enumerate(segment_timings):
+                    # 텍스트 줄바꿈 처리 (14자마다)
+                    seg_text = seg_info['text']
+                    max_chars_per_line = 14
+                    lines = []
+                    current_line = ""
+                    for char in seg_text:
+                        current_line += char
+                        if len(current_line) >= max_chars_per_line:
+                            lines.append(current_line)
+                            current_line = ""
+                    if current_line:
+                        lines.append(current_line)
+                    wrapped_text = "\n".join(lines[:3])  # 최대 3줄
 
-    try:
-        import tempfile
+                    # FFmpeg 이스케이프
+                    text_escaped = wrapped_text.replace("\\", "\\\\").replace(":", "\\:").replace("'", "'\\''")
 
-        # 스크립트 위치 기준 절대 경로 사용
-        if sfx_dir is None:
-            script_dir = os.path.dirname(os.path.abspath(__file__))
-            sfx_dir = os.path.join(script_dir, "static", "audio", "sfx")
+                    # enable 표현식으로 시간 범위 지정
+                    start_t = seg_info['start']
+                    end_t = seg_info['end']
 
-        print(f"[SFX] 효과음 디렉토리: {sfx_dir}")
-        print(f"[SFX] 디렉토리 존재 여부: {os.path.exists(sfx_dir)}")
-        if os.path.exists(sfx_dir):
-            import glob
-            all_sfx = glob.glob(os.path.join(sfx_dir, "*.mp3"))
-            print(f"[SFX] 디렉토리 내 전체 파일: {[os.path.basename(f) for f in all_sfx]}")
+                    subtitle_filter += (
+                        f",drawtext=text='{text_escaped}':"
+                        f"fontfile='{font_escaped}':fontsize=68:fontcolor=white:"
+                        f"borderw=4:bordercolor=black:"
+                        f"x=(w-text_w)/2:y=h*0.73:"
+                        f"line_spacing=16:"
+                        f"enable='between(t,{start_t:.2f},{end_t:.2f})'"
+                    )
 
-        # 씬별 시작 시간 계산
-        scene_start_times = {}
-        current_time = 0
-        for idx, scene in enumerate(scenes):
-            scene_start_times[idx + 1] = current_time
-            current_time += scene.get('duration', 0)
-
-        # 효과음 파일 준비 및 타이밍 계산
-        sfx_inputs = []
-        adelay_filters = []
-
-        temp_dir = tempfile.mkdtemp()
+                # 2. 상단 헤드라인: 고정 타이틀 (영상 제목) - 노란색, 전체 영상에 동일하게 표시
+                # fixed_title이 있으면 사용, 없으면 on_screen_text fallback
+                headline_text = fixed_title if fixed_title else bd.get('on_screen_text', '')
+                if headline_text:
+                    # FFmpeg drawtext 이스케이프 순서: 백슬래시 → 콜론 → 따옴표
+                    text_escaped = headline_text.replace("\\", "\\\\").replace(":", "\\:").replace("'", "'\\''")
 
-        # 순차적 인덱스 사용 (continue로 건너뛴 항목과 관계없이 연속 인덱스 보장)
-        sfx_idx = 0
-        for sfx in sound_effects:
-            scene_num = sfx.get('scene', 1)
-            sfx_type = sfx.get('type', '')
+                    # 텍스트 길이에 따라 폰트 크기 조절 (더 굵고 크게)
+                    text_len = len(headline_text)
+                    if text_len <= 8:
+                        headline_fontsize = 100  # 매우 짧은 타이틀
+                    elif text_len <= 15:
+                        headline_fontsize = 88   # 짧은 타이틀
+                    elif text_len <= 25:
+                        headline_fontsize = 72   # 중간 타이틀
+                    else:
+                        headline_fontsize = 60   # 긴 타이틀
 
-            if scene_num not in scene_start_times:
-                continue
+                    # 고정 타이틀은 항상 노란색 (일관성)
+                    headline_color = "yellow"
 
-            # 효과음 파일 찾기 (None 전달 시 절대 경로 사용)
-            sfx_file = _get_sfx_file(sfx_type)
-            if not sfx_file:
-                continue
+                    subtitle_filter += (
+                        # 상단 반투명 배경 (상단 22% - 더 큰 타이틀 공간)
+                        f",drawbox=x=0:y=0:w=iw:h=ih*0.22:color=black@0.65:t=fill,"
+                        # 헤드라인 텍스트 (폰트/테두리 증가)
+                        f"drawtext=text='{text_escaped}':"
+                        f"fontfile='{font_escaped}':fontsize={headline_fontsize}:fontcolor={headline_color}:"
+                        f"borderw=6:bordercolor=black:"
+                        f"x=(w-text_w)/2:y=h*0.10"
+                    )
 
-            # 효과음 트림 (2.5초로 자르기)
-            trimmed_path = os.path.join(temp_dir, f"sfx_{sfx_idx}.mp3")
-            if not _trim_sfx(sfx_file, trimmed_path, max_duration=2.5, fade_out=0.5):
-                continue
+                cmd = [
+                    "ffmpeg", "-y",
+                    "-loop", "1", "-i", bd['image_path'],
+                    "-i", bd['audio_path'],
+                    "-vf", subtitle_filter,
+                    "-c:v", "libx264", "-preset", "fast",
+                    "-c:a", "aac", "-b:a", "128k", "-ar", "44100",
+                    "-pix_fmt", "yuv420p",
+                    "-t", str(bd['duration']),
+                    "-shortest",
+                    clip_path
+                ]
 
-            # 딜레이 계산 (씬 시작 + 0.5초)
-            delay_ms = int((scene_start_times[scene_num] + 0.5) * 1000)
+                # 파일 존재 확인
+                if not os.path.exists(bd['image_path']):
+                    print(f"[SHORTS-V2] 클립 {bd['beat_id']} 이미지 파일 없음: {bd['image_path']}")
+                    continue
+                if not os.path.exists(bd['audio_path']):
+                    print(f"[SHORTS-V2] 클립 {bd['beat_id']} 오디오 파일 없음: {bd['audio_path']}")
+                    continue
 
-            sfx_inputs.append(trimmed_path)
-            # FFmpeg 입력 인덱스: [0]=비디오, [1]=첫번째 SFX, [2]=두번째 SFX...
-            # sfx_idx는 0부터 시작하므로 입력 인덱스는 sfx_idx+1
-            adelay_filters.append(f"[{sfx_idx+1}:a]adelay={delay_ms}|{delay_ms},volume=0.8[sfx{sfx_idx}]")
-            sfx_idx += 1
+                result = subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, timeout=120)
+                if result.returncode == 0 and os.path.exists(clip_path):
+                    clip_paths.append(clip_path)
+                    print(f"[SHORTS-V2] 클립 {bd['beat_id']} 완료 ({bd['duration']:.1f}초)")
+                else:
+                    stderr = result.stderr.decode('utf-8', errors='ignore')[-500:]  # 마지막 500자 (에러 메시지가 끝에 있음)
+                    print(f"[SHORTS-V2] 클립 {bd['beat_id']} 실패: {stderr}")
 
-        if not sfx_inputs:
-            print(f"[SFX] 사용 가능한 효과음 없음")
-            return False
+            if not clip_paths:
+                return {"ok": False, "error": "클립 생성 실패"}
 
-        # FFmpeg 명령 구성
-        input_args = ["-i", video_path]
-        for sfx_path in sfx_inputs:
-            input_args.extend(["-i", sfx_path])
+            # ========== 3. 클립 병합 ==========
+            print(f"[SHORTS-V2] {len(clip_paths)}개 클립 병합...")
+            concat_list = os.path.join(temp_dir, "concat.txt")
+            with open(concat_list, 'w') as f:
+                for clip_path in clip_paths:
+                    f.write(f"file '{os.path.abspath(clip_path)}'\n")
 
-        # 필터 구성: 모든 효과음 + 원본 오디오 믹싱
-        filter_parts = adelay_filters.copy()
+            # 병합
+            concat_cmd = [
+                "ffmpeg", "-y",
+                "-f", "concat", "-safe", "0",
+                "-i", concat_list,
+                "-c:v", "libx264", "-preset", "fast",
+                "-c:a", "aac", "-b:a", "128k",
+                "-movflags", "+faststart",
+                output_path
+            ]
 
-        # amix로 모든 오디오 합치기
-        sfx_labels = "".join([f"[sfx{i}]" for i in range(len(sfx_inputs))])
-        mix_inputs = len(sfx_inputs) + 1  # 효과음 개수 + 원본 오디오
-        filter_parts.append(f"[0:a]{sfx_labels}amix=inputs={mix_inputs}:duration=first:dropout_transition=2:normalize=0[aout]")
+            result = subprocess.run(concat_cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, timeout=180)
 
-        filter_complex = ";".join(filter_parts)
+            if result.returncode == 0 and os.path.exists(output_path):
+                # 최종 영상 길이 확인
+                probe_result = subprocess.run([
+                    "ffprobe", "-v", "error", "-show_entries", "format=duration",
+                    "-of", "default=noprint_wrappers=1:nokey=1", output_path
+                ], capture_output=True, text=True)
 
-        ffmpeg_cmd = [
-            "ffmpeg", "-y",
-            *input_args,
-            "-filter_complex", filter_complex,
-            "-map", "0:v",
-            "-map", "[aout]",
-            "-c:v", "copy",
-            "-c:a", "aac", "-b:a", "128k",
-            output_path
-        ]
+                final_duration = 0
+                if probe_result.returncode == 0:
+                    try:
+                        final_duration = float(probe_result.stdout.strip())
+                    except:
+                        pass
 
-        print(f"[SFX] 효과음 {len(sfx_inputs)}개 믹싱 중...")
-        result = subprocess.run(ffmpeg_cmd, stdout=subprocess.DEVNULL,
-                               stderr=subprocess.PIPE, timeout=600)
+                print(f"[SHORTS-V2] 쇼츠 생성 완료: {output_path} ({final_duration:.1f}초)")
 
-        # 임시 파일 정리
-        import shutil
-        shutil.rmtree(temp_dir, ignore_errors=True)
+                return {
+                    "ok": True,
+                    "shorts_path": output_path,
+                    "duration": final_duration,
+                    "cost": total_cost,
+                    "beats_count": len(beats)
+                }
+            else:
+                stderr = result.stderr.decode('utf-8', errors='ignore')[:300]
+                return {"ok": False, "error": f"병합 실패: {stderr}"}
 
-        if result.returncode == 0:
-            print(f"[SFX] 효과음 믹싱 완료")
-            return True
-        else:
-            stderr = result.stderr.decode('utf-8', errors='ignore')[:300]
-            print(f"[SFX] 믹싱 실패: {stderr}")
-            return False
+        finally:
+            # 임시 파일 정리
+            shutil.rmtree(temp_dir, ignore_errors=True)
 
     except Exception as e:
-        print(f"[SFX] 믹싱 오류: {e}")
+        print(f"[SHORTS-V2] 오류: {e}")
         import traceback
         traceback.print_exc()
-        return False
+        return {"ok": False, "error": str(e)}
 
 
-def _generate_outro_video(output_path, duration=5, fonts_dir=None):
-    """공용 아웃트로 영상 생성 (구독/좋아요 요청)
+def _generate_shorts_video(main_video_path, scenes, highlight_scenes, hook_text, output_path):
+    """메인 영상에서 쇼츠용 세로 영상(9:16) 생성 [레거시 - 크롭 방식]
 
     Args:
-        output_path: 출력 파일 경로
-        duration: 아웃트로 길이 (초)
-        fonts_dir: 폰트 디렉토리 (없으면 스크립트 위치 기준)
+        main_video_path: 원본 메인 영상 경로
+        scenes: 씬 정보 목록 (duration 포함)
+        highlight_scenes: 하이라이트 씬 번호 목록 [1, 2, 3]
+        hook_text: 쇼츠 시작 훅 텍스트
+        output_path: 출력 경로
 
     Returns:
         성공 여부 (bool)
     """
-    try:
-        # 스크립트 위치 기준 절대 경로 사용
-        if fonts_dir is None:
-            script_dir = os.path.dirname(os.path.abspath(__file__))
-            fonts_dir = os.path.join(script_dir, "fonts")
-
-        print(f"[OUTRO] 폰트 디렉토리: {fonts_dir}")
-        print(f"[OUTRO] 디렉토리 존재: {os.path.exists(fonts_dir)}")
+    print(f"[SHORTS] 쇼츠 생성 시작")
+    print(f"[SHORTS] 메인 영상: {main_video_path}, 존재: {os.path.exists(main_video_path)}")
+    print(f"[SHORTS] 씬 수: {len(scenes) if scenes else 0}")
+    print(f"[SHORTS] 하이라이트 씬: {highlight_scenes}")
+    print(f"[SHORTS] 훅 텍스트: {hook_text}")
+    print(f"[SHORTS] 출력 경로: {output_path}")
 
-        # 폰트 설정: lang/ko.py에서 관리
-        font_path = None
-        for font_file in lang_ko.FONTS['priority']:
-            candidate = os.path.join(fonts_dir, font_file)
-            if os.path.exists(candidate):
-                font_path = candidate
-                break
-        if not font_path:
-            # 시스템 폰트 시도
-            for sys_path in lang_ko.FONTS['system_paths']:
-                if os.path.exists(sys_path):
-                    font_path = sys_path
-                    break
-        if not font_path:
-            print(f"[OUTRO] 폰트 파일 없음: {fonts_dir}")
-            return False
+    try:
+        import tempfile
+        import shutil
 
-        print(f"[OUTRO] 사용 폰트: {font_path}")
-        font_escaped = font_path.replace('\\', '/').replace(':', '\\:')
+        # 씬별 시작/종료 시간 계산
+        scene_times = []
+        current_time = 0
+        for idx, scene in enumerate(scenes):
+            duration = scene.get('duration', 5)
+            scene_times.append({
+                'scene_num': idx + 1,
+                'start': current_time,
+                'end': current_time + duration,
+                'duration': duration
+            })
+            current_time += duration
 
-        # 그라데이션 배경 + 텍스트 아웃트로
-        # 메인 영상과 동일한 1280x720 해상도 사용 (concat 호환성)
-        # 이모지 제거 (FFmpeg drawtext 호환성 문제)
-        ffmpeg_cmd = [
-            "ffmpeg", "-y",
-            "-f", "lavfi",
-            "-i", f"color=c=0x1a1a2e:s=1280x720:d={duration}",
-            "-f", "lavfi",
-            "-i", f"anullsrc=r=44100:cl=stereo:d={duration}",
-            "-vf", (
-                f"drawtext=text='시청해 주셔서 감사합니다':"
-                f"fontfile='{font_escaped}':fontsize=48:fontcolor=white:"
-                f"x=(w-text_w)/2:y=(h-text_h)/2-70,"
-                f"drawtext=text='좋아요와 구독 부탁드려요':"
-                f"fontfile='{font_escaped}':fontsize=38:fontcolor=yellow:"
-                f"x=(w-text_w)/2:y=(h-text_h)/2+15,"
-                f"drawtext=text='알림 설정도 잊지 마세요':"
-                f"fontfile='{font_escaped}':fontsize=30:fontcolor=#aaaaaa:"
-                f"x=(w-text_w)/2:y=(h-text_h)/2+80,"
-                f"fade=t=in:st=0:d=0.5,fade=t=out:st={duration-0.5}:d=0.5"
-            ),
-            # 메인 영상과 동일한 인코딩 설정 (concat demuxer 호환)
-            "-c:v", "libx264", "-preset", "fast", "-profile:v", "high", "-level", "4.0",
-            "-pix_fmt", "yuv420p", "-r", "24",  # 24fps (메인 영상과 동일)
-            "-c:a", "aac", "-b:a", "128k", "-ar", "44100",
-            "-movflags", "+faststart",
-            "-t", str(duration),
-            output_path
-        ]
+        # 하이라이트 씬 추출 (60초 이하로 제한)
+        selected_clips = []
+        total_duration = 0
+        max_duration = 58  # 60초 제한 (여유 2초)
 
-        result = subprocess.run(ffmpeg_cmd, stdout=subprocess.DEVNULL,
-                               stderr=subprocess.PIPE, timeout=60)
+        for scene_num in highlight_scenes:
+            if scene_num < 1 or scene_num > len(scene_times):
+                continue
+            scene_info = scene_times[scene_num - 1]
+            if total_duration + scene_info['duration'] <= max_duration:
+                selected_clips.append(scene_info)
+                total_duration += scene_info['duration']
+            else:
+                # 남은 시간만큼만 추가
+                remaining = max_duration - total_duration
+                if remaining > 3:  # 최소 3초 이상일 때만 추가
+                    selected_clips.append({
+                        **scene_info,
+                        'end': scene_info['start'] + remaining,
+                        'duration': remaining
+                    })
+                    total_duration += remaining
+                break
 
-        if result.returncode == 0:
-            print(f"[OUTRO] 아웃트로 생성 완료 (1280x720, 24fps): {output_path}")
-            return True
-        else:
-            stderr = result.stderr.decode('utf-8', errors='ignore')[:300]
-            print(f"[OUTRO] 생성 실패: {stderr}")
+        if not selected_clips:
+            print(f"[SHORTS] 선택된 클립 없음")
             return False
 
-    except Exception as e:
-        print(f"[OUTRO] 오류: {e}")
-        return False
-
+        print(f"[SHORTS] {len(selected_clips)}개 클립 선택, 총 {total_duration:.1f}초")
 
-def _append_outro_to_video(video_path, outro_path, output_path):
-    """비디오에 아웃트로 연결 (concat demuxer 사용 - 재인코딩 없이 빠름)
+        # 임시 디렉토리 생성
+        temp_dir = tempfile.mkdtemp()
+        concat_list = os.path.join(temp_dir, "concat.txt")
 
-    Args:
-        video_path: 원본 비디오 경로
-        outro_path: 아웃트로 비디오 경로
-        output_path: 출력 비디오 경로
-
-    Returns:
-        성공 여부 (bool)
-    """
-    try:
-        # concat demuxer 방식 사용 (재인코딩 없이 스트림 복사 - 매우 빠름)
-        # 단, 두 파일의 코덱/해상도/프레임레이트가 동일해야 함
-        work_dir = os.path.dirname(output_path)
-        concat_list_path = os.path.join(work_dir, "concat_list.txt")
+        try:
+            # 각 하이라이트 클립 추출 및 세로 변환
+            clip_paths = []
+            for i, clip in enumerate(selected_clips):
+                clip_path = os.path.join(temp_dir, f"clip_{i:03d}.mp4")
 
-        # concat 리스트 파일 생성
-        with open(concat_list_path, 'w', encoding='utf-8') as f:
-            f.write(f"file '{os.path.abspath(video_path)}'\n")
-            f.write(f"file '{os.path.abspath(outro_path)}'\n")
+                # 가로(16:9) → 세로(9:16) 변환 + 클립 추출
+                # 중앙 크롭 + 블러 배경 방식
+                vf_filter = (
+                    # 원본을 1080x1920 세로 비율로 크롭 (중앙)
+                    "scale=1080:1920:force_original_aspect_ratio=increase,"
+                    "crop=1080:1920,"
+                    # 자막 위치 조정 (하단)
+                    "setsar=1"
+                )
 
-        ffmpeg_cmd = [
-            "ffmpeg", "-y",
-            "-f", "concat",
-            "-safe", "0",
-            "-i", concat_list_path,
-            "-c", "copy",  # 스트림 복사 (재인코딩 없음)
-            "-movflags", "+faststart",
-            output_path
-        ]
+                cmd = [
+                    "ffmpeg", "-y",
+                    "-ss", str(clip['start']),
+                    "-i", main_video_path,
+                    "-t", str(clip['duration']),
+                    "-vf", vf_filter,
+                    "-c:v", "libx264", "-preset", "fast",
+                    "-c:a", "aac", "-b:a", "128k", "-ar", "44100",
+                    "-pix_fmt", "yuv420p",
+                    clip_path
+                ]
 
-        # concat demuxer + copy는 매우 빠름 (60초면 충분)
-        result = subprocess.run(ffmpeg_cmd, stdout=subprocess.DEVNULL,
-                               stderr=subprocess.PIPE, timeout=60)
+                result = subprocess.run(cmd, stdout=subprocess.DEVNULL,
+                                       stderr=subprocess.PIPE, timeout=120)
+                if result.returncode == 0 and os.path.exists(clip_path):
+                    clip_paths.append(clip_path)
+                    print(f"[SHORTS] 클립 {i+1}/{len(selected_clips)} 추출 완료")
+                else:
+                    stderr = result.stderr.decode('utf-8', errors='ignore')[:200]
+                    print(f"[SHORTS] 클립 {i+1} 추출 실패: {stderr}")
 
-        # 임시 파일 삭제
-        if os.path.exists(concat_list_path):
-            os.remove(concat_list_path)
+            if not clip_paths:
+                print(f"[SHORTS] 클립 추출 실패")
+                return False
 
-        if result.returncode == 0:
-            print(f"[OUTRO] 아웃트로 연결 완료 (concat demuxer): {output_path}")
-            return True
-        else:
-            stderr = result.stderr.decode('utf-8', errors='ignore')[-500:]
-            print(f"[OUTRO] concat demuxer 실패: {stderr}")
+            # concat 파일 생성
+            with open(concat_list, 'w') as f:
+                for clip_path in clip_paths:
+                    f.write(f"file '{os.path.abspath(clip_path)}'\n")
 
-            # Fallback: concat filter 사용 (재인코딩 필요하지만 호환성 높음)
-            print(f"[OUTRO] Fallback: concat filter 사용...")
-            ffmpeg_cmd_fallback = [
+            # 클립 병합
+            merged_path = os.path.join(temp_dir, "merged.mp4")
+            concat_cmd = [
                 "ffmpeg", "-y",
-                "-i", video_path,
-                "-i", outro_path,
-                "-filter_complex",
-                "[0:v][0:a][1:v][1:a]concat=n=2:v=1:a=1[outv][outa]",
-                "-map", "[outv]", "-map", "[outa]",
-                "-c:v", "libx264", "-preset", "ultrafast",  # 더 빠른 프리셋
-                "-c:a", "aac", "-b:a", "128k",
-                "-movflags", "+faststart",
-                output_path
+                "-f", "concat", "-safe", "0",
+                "-i", concat_list,
+                "-c", "copy",
+                merged_path
             ]
+            result = subprocess.run(concat_cmd, stdout=subprocess.DEVNULL,
+                                   stderr=subprocess.PIPE, timeout=120)
 
-            result_fallback = subprocess.run(ffmpeg_cmd_fallback, stdout=subprocess.DEVNULL,
-                                            stderr=subprocess.PIPE, timeout=1200)  # 20분 타임아웃
+            if result.returncode != 0:
+                stderr = result.stderr.decode('utf-8', errors='ignore')[:200]
+                print(f"[SHORTS] 클립 병합 실패: {stderr}")
+                return False
 
-            if result_fallback.returncode == 0:
-                print(f"[OUTRO] 아웃트로 연결 완료 (concat filter fallback): {output_path}")
+            # 훅 텍스트 오버레이 추가 (처음 3초)
+            # 폰트 설정: lang/ko.py에서 관리
+            if hook_text:
+                font_path = f"fonts/{lang_ko.FONTS['default']}"
+                font_escaped = font_path.replace('\\', '/').replace(':', '\\:')
+
+                hook_filter = (
+                    f"drawtext=text='{hook_text}':"
+                    f"fontfile='{font_escaped}':fontsize=48:fontcolor=white:"
+                    f"borderw=3:bordercolor=black:"
+                    f"x=(w-text_w)/2:y=h*0.15:"
+                    f"enable='lt(t,3)'"  # 처음 3초만 표시
+                )
+
+                final_cmd = [
+                    "ffmpeg", "-y",
+                    "-i", merged_path,
+                    "-vf", hook_filter,
+                    "-c:v", "libx264", "-preset", "fast",
+                    "-c:a", "copy",
+                    output_path
+                ]
+            else:
+                final_cmd = ["cp", merged_path, output_path]
+
+            result = subprocess.run(final_cmd, stdout=subprocess.DEVNULL,
+                                   stderr=subprocess.PIPE, timeout=120)
+
+            if result.returncode == 0 and os.path.exists(output_path):
+                print(f"[SHORTS] 쇼츠 생성 완료: {output_path}")
                 return True
             else:
-                stderr_fb = result_fallback.stderr.decode('utf-8', errors='ignore')[-300:]
-                print(f"[OUTRO] concat filter도 실패: {stderr_fb}")
+                stderr = result.stderr.decode('utf-8', errors='ignore')[:200]
+                print(f"[SHORTS] 최종 생성 실패: {stderr}")
                 return False
 
+        finally:
+            # 임시 파일 정리
+            shutil.rmtree(temp_dir, ignore_errors=True)
+
     except Exception as e:
-        print(f"[OUTRO] 연결 오류: {e}")
+        print(f"[SHORTS] 오류: {e}")
+        import traceback
+        traceback.print_exc()
         return False
 
 
-def _analyze_shorts_content_gpt(highlight_narrations, title, detected_category, audience="general", duration_target=45):
-    """GPT-5.1로 쇼츠 전용 콘텐츠 분석 및 beats 구조 생성
+def _apply_transitions(clip_paths, output_path, transition_style="crossfade", duration=0.5):
+    """클립들 사이에 전환 효과 적용
 
     Args:
-        highlight_narrations: 하이라이트 씬들의 나레이션 목록
-        title: 원본 영상 제목
-        detected_category: news 또는 story
-        audience: general 또는 senior
-        duration_target: 목표 길이 (초)
+        clip_paths: 클립 파일 경로 목록
+        output_path: 출력 파일 경로
+        transition_style: crossfade, fade_black, fade_white, none
+        duration: 전환 효과 길이 (초)
 
     Returns:
-        dict: beats 구조, meta, design_guide 등
+        성공 여부 (bool)
     """
+    if not clip_paths or len(clip_paths) < 2:
+        # 클립이 1개 이하면 전환 효과 불필요
+        if clip_paths:
+            import shutil
+            shutil.copy(clip_paths[0], output_path)
+            return True
+        return False
+
     try:
-        from openai import OpenAI
-        client = OpenAI()
+        if transition_style == "none":
+            # 전환 효과 없이 단순 concat
+            import tempfile
+            concat_list = tempfile.NamedTemporaryFile(mode='w', suffix='.txt', delete=False)
+            for clip_path in clip_paths:
+                concat_list.write(f"file '{os.path.abspath(clip_path)}'\n")
+            concat_list.close()
 
-        # 나레이션에서 핵심 포인트 추출
-        combined_narration = "\n".join(highlight_narrations)
-        main_points = highlight_narrations[:3] if len(highlight_narrations) >= 3 else highlight_narrations
+            cmd = [
+                "ffmpeg", "-y",
+                "-f", "concat", "-safe", "0",
+                "-i", concat_list.name,
+                "-c", "copy",
+                output_path
+            ]
+            result = subprocess.run(cmd, stdout=subprocess.DEVNULL,
+                                   stderr=subprocess.PIPE, timeout=300)
+            os.unlink(concat_list.name)
+            return result.returncode == 0
 
-        # short_type 결정
-        short_type = "해설" if detected_category == "news" else "사례소개"
+        # xfade 필터로 전환 효과 적용
+        n = len(clip_paths)
 
-        # audience_needs 설정
-        if audience == "senior":
-            audience_desc = "50-70대 시니어"
-            audience_needs = ["짧은 시간에 핵심만 알고 싶다", "복잡한 설명 없이 요점만"]
-        else:
-            audience_desc = "20-40대 직장인"
-            audience_needs = ["출퇴근 1분 안에 핵심만", "지금 당장 뭘 해야 하는지"]
+        # 입력 파일 옵션
+        input_args = []
+        for clip_path in clip_paths:
+            input_args.extend(["-i", clip_path])
 
-        system_prompt = f'''너는 "유튜브 쇼츠 전담 PD + 편집 디렉터 + 각본가"다.
-뉴스·시사·경제·정보 콘텐츠를 쇼츠 포맷(60초 이하)으로 최적화하는 전문가다.
+        # xfade 필터 체인 구성
+        # fade 색상 설정
+        fade_color = "black" if transition_style == "fade_black" else "white" if transition_style == "fade_white" else None
 
-목표:
-1) 1.5초 안에 스크롤을 멈추는 강력한 훅
-2) 완주율 80-90% 목표의 구조 설계
-3) 편집자가 그대로 따라 만들 수 있는 씬 단위 설계서(JSON)
+        if n == 2:
+            # 2개 클립: 단일 xfade
+            if fade_color:
+                filter_complex = f"[0:v]fade=t=out:st=0:d={duration}:color={fade_color}[v0];[1:v]fade=t=in:st=0:d={duration}:color={fade_color}[v1];[v0][v1]concat=n=2:v=1:a=0[outv];[0:a][1:a]concat=n=2:v=0:a=1[outa]"
+            else:
+                # crossfade
+                filter_complex = f"[0:v][1:v]xfade=transition=fade:duration={duration}:offset=0[outv];[0:a][1:a]acrossfade=d={duration}[outa]"
+        else:
+            # 3개 이상: 체인 xfade (복잡, 단순화)
+            # 간단하게 각 클립에 fade in만 적용 후 concat
+            # 주의: fade out은 클립 길이를 모르면 st 계산 불가하므로 생략
+            filter_parts = []
+            for i in range(n):
+                if fade_color:
+                    filter_parts.append(f"[{i}:v]fade=t=in:st=0:d={duration/2}:color={fade_color}[v{i}]")
+                else:
+                    filter_parts.append(f"[{i}:v]fade=t=in:st=0:d={duration/2}[v{i}]")
 
-## 포맷 규격
-- 방향: 세로 9:16 (1080x1920)
-- 길이: 35-60초 (정보/해설형)
-- 첫 1.5-3초 안에 스크롤 멈추는 훅 필수
+            video_concat = "".join([f"[v{i}]" for i in range(n)]) + f"concat=n={n}:v=1:a=0[outv]"
+            audio_concat = "".join([f"[{i}:a]" for i in range(n)]) + f"concat=n={n}:v=0:a=1[outa]"
 
-## 입력값
-- short_topic: "{title}"
-- short_type: "{short_type}"
-- main_audience: "{audience_desc}"
-- audience_needs: {audience_needs}
-- main_point_1: "{main_points[0] if len(main_points) > 0 else ''}"
-- main_point_2: "{main_points[1] if len(main_points) > 1 else ''}"
-- main_point_3: "{main_points[2] if len(main_points) > 2 else ''}"
-- duration_target_sec: {duration_target}
-- hook_angle_preference: "숫자, 솔루션"
+            filter_complex = ";".join(filter_parts) + ";" + video_concat + ";" + audio_concat
 
-## beats 설계 규칙
-- 1.0-3.0초 단위의 beat를 연속 설계
-- 기본 구조:
-  - Beat 1: hook (0-2초) - 12-18자, 3초 이내 낭독
-  - Beat 2: 상황/문제 제기 (2-6초)
-  - Beat 3-4: 핵심 포인트 1,2 (6-18초)
-  - Beat 5-6: 핵심 포인트 3 + 반전/경고 (18-35초)
-  - Beat 7: 요약 + CTA or loop (마지막 3-5초)
+        cmd = [
+            "ffmpeg", "-y",
+            *input_args,
+            "-filter_complex", filter_complex,
+            "-map", "[outv]", "-map", "[outa]",
+            "-c:v", "libx264", "-preset", "fast",
+            "-c:a", "aac", "-b:a", "128k",
+            output_path
+        ]
 
-## 각 beat 필수 포함
-- voiceover: TTS용 자연스러운 구어체
-- on_screen_text: 핵심 1-2줄 (16자 내외)
-- visual_type: A-roll_talking_head / B-roll / infographic / text_only
-- visual_direction: 화면 구성 설명
-- broll_idea_or_prompt: AI 이미지 생성용 영어 프롬프트
-- caption_style: {{ use_captions, emphasis_words, position }}
-- sound_direction: {{ bgm_mood, sfx, pause_hint }}
+        print(f"[TRANSITIONS] {transition_style} 효과 적용 중 ({n}개 클립)...")
+        result = subprocess.run(cmd, stdout=subprocess.DEVNULL,
+                               stderr=subprocess.PIPE, timeout=600)
 
-## 출력 형식 (JSON ONLY)
-JSON 외부에 어떤 텍스트도 쓰지 말 것.'''
+        if result.returncode == 0:
+            print(f"[TRANSITIONS] 전환 효과 적용 완료")
+            return True
+        else:
+            stderr = result.stderr.decode('utf-8', errors='ignore')[:300]
+            print(f"[TRANSITIONS] 실패: {stderr}")
+            # 실패 시 단순 concat으로 폴백
+            print(f"[TRANSITIONS] 단순 concat으로 폴백...")
+            return _apply_transitions(clip_paths, output_path, "none", 0)
 
-        user_prompt = f'''원본 영상의 하이라이트 나레이션:
-{combined_narration}
+    except Exception as e:
+        print(f"[TRANSITIONS] 오류: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
 
-위 내용을 기반으로 {duration_target}초 쇼츠를 설계해줘.
-훅은 "숫자 + 위험/기회 + 타깃"을 조합해서 강력하게 만들어.
 
-JSON 형식으로만 출력해. 다른 텍스트 없이 순수 JSON만.'''
+def _upload_youtube_captions(video_id, srt_path, language="ko", credentials=None):
+    """YouTube에 자막 파일(.srt) 업로드
 
-        print(f"[SHORTS-GPT] 쇼츠 콘텐츠 분석 시작...")
+    Args:
+        video_id: YouTube 비디오 ID
+        srt_path: SRT 자막 파일 경로
+        language: 자막 언어 코드 (ko, en, ja 등)
+        credentials: Google OAuth 자격 증명
 
-        response = client.responses.create(
-            model="gpt-5.1",
-            input=[
-                {"role": "system", "content": [{"type": "input_text", "text": system_prompt}]},
-                {"role": "user", "content": [{"type": "input_text", "text": user_prompt}]}
-            ],
-            temperature=0.7
-        )
+    Returns:
+        성공 여부 (bool)
+    """
+    try:
+        from googleapiclient.http import MediaFileUpload
 
-        # 결과 추출
-        if getattr(response, "output_text", None):
-            result_text = response.output_text.strip()
-        else:
-            text_chunks = []
-            for item in getattr(response, "output", []) or []:
-                for content in getattr(item, "content", []) or []:
-                    if getattr(content, "type", "") == "text":
-                        text_chunks.append(getattr(content, "text", ""))
-            result_text = "\n".join(text_chunks).strip()
+        if not credentials:
+            print(f"[CAPTIONS] 자격 증명 없음")
+            return False
 
-        # JSON 파싱
-        print(f"[SHORTS-GPT] GPT 응답 길이: {len(result_text)}자")
-        print(f"[SHORTS-GPT] GPT 응답 (처음 500자): {result_text[:500]}")
+        if not os.path.exists(srt_path):
+            print(f"[CAPTIONS] 자막 파일 없음: {srt_path}")
+            return False
 
-        if result_text.startswith("```"):
-            result_text = result_text.split("```")[1]
-            if result_text.startswith("json"):
-                result_text = result_text[4:]
-        result_text = result_text.strip()
+        youtube = build_client('youtube', 'v3', credentials)
 
-        import re
-        result_text = re.sub(r',\s*\]', ']', result_text)
-        result_text = re.sub(r',\s*\}', '}', result_text)
+        # 자막 삽입 요청
+        caption_body = {
+            "snippet": {
+                "videoId": video_id,
+                "language": language,
+                "name": "Korean" if language == "ko" else language.upper(),
+                "isDraft": False
+            }
+        }
 
-        try:
-            result = json.loads(result_text)
-        except json.JSONDecodeError as je:
-            print(f"[SHORTS-GPT] JSON 파싱 실패: {je}")
-            print(f"[SHORTS-GPT] 파싱 시도한 텍스트: {result_text[:1000]}")
-            return None
+        media = MediaFileUpload(srt_path, mimetype='application/x-subrip', resumable=True)
 
-        # beats 위치: result.beats 또는 result.structure.beats
-        beats = result.get("beats", []) or result.get("structure", {}).get("beats", [])
-        print(f"[SHORTS-GPT] 분석 완료: {len(beats)}개 beats 생성")
-        if len(beats) == 0:
-            print(f"[SHORTS-GPT] 경고: beats 없음. result keys: {list(result.keys())}")
-            if "beats" in result:
-                print(f"[SHORTS-GPT] beats 타입: {type(result['beats'])}")
+        request = youtube.captions().insert(
+            part="snippet",
+            body=caption_body,
+            media_body=media
+        )
 
-        return result
+        response = None
+        while response is None:
+            status, response = request.next_chunk()
+            if status:
+                print(f"[CAPTIONS] 업로드 진행률: {int(status.progress() * 100)}%")
+
+        print(f"[CAPTIONS] 자막 업로드 완료: {response.get('id')}")
+        return True
 
     except Exception as e:
-        print(f"[SHORTS-GPT] 오류: {e}")
+        print(f"[CAPTIONS] 업로드 오류: {e}")
         import traceback
         traceback.print_exc()
-        return None
+        return False
 
 
-def _generate_shorts_video_v2(shorts_analysis, voice_name, output_path, base_url="http://localhost:5000", scene_images=None, fixed_title=None):
-    """쇼츠 전용 영상 생성 (새 TTS + 메인 영상 이미지 크롭 + 한국 뉴스 스타일 텍스트)
+def _get_ken_burns_filter(effect_type, duration, fps=24, output_size="1280x720"):
+    """Ken Burns 효과용 zoompan 필터 생성 - 부드러운 sin/cos 모션
 
     Args:
-        shorts_analysis: GPT-5.1 쇼츠 분석 결과 (beats 포함)
-        voice_name: TTS 음성 이름
-        output_path: 출력 파일 경로
-        base_url: API 서버 URL
-        scene_images: 메인 영상의 씬 이미지 URL 리스트 (16:9 → 9:16 크롭용)
-        fixed_title: 전체 영상에 고정 표시할 타이틀 (영상 제목)
+        effect_type: zoom_in, zoom_out, pan_left, pan_right, pan_up, pan_down
+        duration: 클립 길이 (초)
+        fps: 프레임 레이트
+        output_size: 출력 해상도
 
     Returns:
-        dict: {ok, shorts_path, duration, cost}
+        FFmpeg vf filter string (scale + zoompan + fade)
     """
-    import requests as req
-    import tempfile
-    import shutil
+    total_frames = int(duration * fps)
+    w, h = map(int, output_size.split('x'))
 
-    print(f"[SHORTS-V2] 쇼츠 영상 생성 시작 (메인 이미지 크롭 + 한국 뉴스 스타일)")
+    # 부드러운 움직임을 위한 설정
+    # 이미지를 크게 스케일해서 패닝/줌 시 검정 테두리 방지
+    scale_w = int(w * 1.4)  # 40% 더 크게
+    scale_h = int(h * 1.4)
 
-    try:
-        # beats 위치: result.beats 또는 result.structure.beats
-        beats = shorts_analysis.get("beats", []) or shorts_analysis.get("structure", {}).get("beats", [])
-        if not beats:
-            return {"ok": False, "error": "beats 데이터 없음"}
+    fade_in = min(0.5, duration * 0.1)  # 페이드인 (최대 0.5초)
+    fade_out = min(0.5, duration * 0.1)  # 페이드아웃 (최대 0.5초)
+    fade_out_start = max(0, duration - fade_out)
 
-        print(f"[SHORTS-V2] {len(beats)}개 beats 처리 시작")
+    # 각 효과별 설정 (sin/cos로 매우 부드러운 움직임)
+    # on: 현재 프레임 번호, total_frames: 전체 프레임 수
+    # ★ 느린 움직임: sin/cos 주기 2배, 움직임 범위 1/2
+    if effect_type == 'zoom_in':
+        # 천천히 줌인 + 아주 미세한 패닝
+        zoom_expr = f"1.0+0.08*on/{total_frames}"  # 1.0 → 1.08로 (더 작은 줌)
+        x_expr = f"(iw-{w})/2+8*sin(on/120)"  # 좌우 아주 미세 (주기 120)
+        y_expr = f"(ih-{h})/2+6*cos(on/150)"  # 상하 아주 미세 (주기 150)
+    elif effect_type == 'zoom_out':
+        # 천천히 줌아웃 + 아주 미세한 패닝
+        zoom_expr = f"1.08-0.08*on/{total_frames}"  # 1.08 → 1.0으로
+        x_expr = f"(iw-{w})/2-8*sin(on/120)"
+        y_expr = f"(ih-{h})/2-6*cos(on/150)"
+    elif effect_type == 'pan_left':
+        # 오른쪽에서 왼쪽으로 아주 천천히 패닝
+        zoom_expr = "1.03"  # 줌 거의 없음
+        x_expr = f"(iw-{w})*0.6*(1-on/{total_frames})+5*sin(on/100)"  # 부드러운 패닝
+        y_expr = f"(ih-{h})/2+4*cos(on/140)"
+    elif effect_type == 'pan_right':
+        # 왼쪽에서 오른쪽으로 아주 천천히 패닝
+        zoom_expr = "1.03"
+        x_expr = f"(iw-{w})*0.4+(iw-{w})*0.2*on/{total_frames}+5*sin(on/100)"
+        y_expr = f"(ih-{h})/2+4*cos(on/140)"
+    elif effect_type == 'pan_up':
+        # 아래에서 위로 아주 천천히 패닝
+        zoom_expr = "1.03"
+        x_expr = f"(iw-{w})/2+5*sin(on/120)"
+        y_expr = f"(ih-{h})*0.6*(1-on/{total_frames})+4*cos(on/100)"
+    elif effect_type == 'pan_down':
+        # 위에서 아래로 아주 천천히 패닝
+        zoom_expr = "1.03"
+        x_expr = f"(iw-{w})/2+5*sin(on/120)"
+        y_expr = f"(ih-{h})*0.4+(ih-{h})*0.2*on/{total_frames}+4*cos(on/100)"
+    else:
+        # 기본: 줌인 + 아주 미세한 움직임
+        zoom_expr = f"1.0+0.08*on/{total_frames}"
+        x_expr = f"(iw-{w})/2+8*sin(on/120)"
+        y_expr = f"(ih-{h})/2+6*cos(on/150)"
 
-        temp_dir = tempfile.mkdtemp()
-        total_cost = 0.0
-        beat_data = []  # [{audio_path, image_path, duration, subtitles, on_screen_text}]
+    # 필터 체인: scale(크게) → zoompan(부드러운 움직임) → fade(페이드인/아웃)
+    vf_filter = (
+        f"scale={scale_w}:{scale_h}:force_original_aspect_ratio=increase,"
+        f"crop={scale_w}:{scale_h},"
+        f"zoompan=z='{zoom_expr}':x='{x_expr}':y='{y_expr}':d={total_frames}:s={output_size}:fps={fps},"
+        f"fade=t=in:st=0:d={fade_in},fade=t=out:st={fade_out_start}:d={fade_out}"
+    )
 
-        try:
-            # ========== 1. 각 beat별 TTS + 이미지 생성 ==========
-            for idx, beat in enumerate(beats):
-                beat_id = beat.get("id", idx + 1)
-                voiceover = beat.get("voiceover", "")
-                on_screen_text = beat.get("on_screen_text", "")
-                visual_direction = beat.get("visual_direction", "")
-                broll_prompt = beat.get("broll_idea_or_prompt", "")
-                caption_style = beat.get("caption_style", {})
+    return vf_filter
 
-                print(f"[SHORTS-V2] Beat {beat_id}: {voiceover[:30]}...")
 
-                # 1-1. TTS 생성
-                audio_path = os.path.join(temp_dir, f"beat_{beat_id:02d}_audio.mp3")
-                try:
-                    tts_resp = req.post(f"{base_url}/api/shorts/generate-tts", json={
-                        "text": voiceover,
-                        "voice": voice_name,
-                        "speed": 1.2
-                    }, timeout=60)
+def _create_scene_clip_worker(task):
+    """
+    단일 씬의 클립을 생성하는 헬퍼 함수 (ThreadPoolExecutor용)
+    병렬 처리 시 각 워커에서 독립적으로 실행됨
+    """
+    import subprocess
+    import shutil
+    import urllib.request
+    import gc
 
-                    if tts_resp.status_code == 200:
-                        tts_data = tts_resp.json()
-                        if tts_data.get("ok"):
-                            # 오디오 URL에서 다운로드
-                            audio_url = tts_data.get("audioUrl", "")
-                            if audio_url:
-                                audio_resp = req.get(f"{base_url}{audio_url}", timeout=30)
-                                with open(audio_path, "wb") as f:
-                                    f.write(audio_resp.content)
-                                total_cost += len(voiceover) * 0.000004
-                                print(f"[SHORTS-V2] Beat {beat_id} TTS 완료")
-                except Exception as tts_err:
-                    print(f"[SHORTS-V2] Beat {beat_id} TTS 실패: {tts_err}")
-                    # TTS 실패 시 무음 생성
-                    subprocess.run([
-                        "ffmpeg", "-y", "-f", "lavfi",
-                        "-i", f"anullsrc=r=44100:cl=mono",
-                        "-t", "3", audio_path
-                    ], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    idx, scene, work_dir, total_scenes = task
 
-                # 오디오 길이 측정
-                duration = 3.0  # 기본값
-                if os.path.exists(audio_path):
-                    probe_result = subprocess.run([
-                        "ffprobe", "-v", "error", "-show_entries", "format=duration",
-                        "-of", "default=noprint_wrappers=1:nokey=1", audio_path
-                    ], capture_output=True, text=True)
-                    if probe_result.returncode == 0:
-                        try:
-                            duration = float(probe_result.stdout.strip())
-                        except:
-                            pass
+    image_url = scene.get('image_url', '')
+    audio_url = scene.get('audio_url', '')
+    duration = scene.get('duration', 5.0)
 
-                # 1-2. 쇼츠용 9:16 이미지 생성 (스틱맨 중앙 배치)
-                image_path = os.path.join(temp_dir, f"beat_{beat_id:02d}_image.png")
+    print(f"[VIDEO-WORKER-PARALLEL] 씬 {idx+1}/{total_scenes} 처리 시작...")
 
-                # 옵션 1: broll_prompt가 있으면 전용 9:16 이미지 생성 시도
-                shorts_image_generated = False
-                if broll_prompt:
-                    try:
-                        # 9:16 세로 이미지용 프롬프트 강화
-                        # 중요: 웹툰 스타일 캐릭터 + 배경 (다른 사람/텍스트 없음)
-                        vertical_prompt = f"""VERTICAL 9:16 PORTRAIT composition for mobile shorts.
+    if not image_url:
+        print(f"[VIDEO-WORKER-PARALLEL] 씬 {idx+1} 스킵 - 이미지 URL 없음")
+        return idx, None, duration
 
-CRITICAL - KOREAN WEBTOON/MANHWA STYLE CHARACTER:
-- CENTER a Korean webtoon/manhwa style character in the frame
-- Character design: EXAGGERATED EXPRESSION (shocked face, wide eyes, open mouth, sweat drops), 30-50 year old Korean man or woman
-- Clean bold outlines, vibrant flat colors, comic-style expression marks
-- Position character in the CENTER-BOTTOM area (leaving top 25% for text overlay)
+    # 이미지 다운로드
+    img_path = os.path.join(work_dir, f"scene_{idx:03d}.jpg")
+    try:
+        if image_url.startswith('http'):
+            req = urllib.request.Request(image_url, headers={'User-Agent': 'Mozilla/5.0'})
+            with urllib.request.urlopen(req, timeout=30) as response:
+                with open(img_path, 'wb') as f:
+                    f.write(response.read())
+        elif image_url.startswith('/'):
+            local_path = image_url.lstrip('/')
+            if os.path.exists(local_path):
+                shutil.copy(local_path, img_path)
+            else:
+                print(f"[VIDEO-WORKER-PARALLEL] 씬 {idx+1} 로컬 이미지 없음: {local_path}")
+                return idx, None, duration
+        else:
+            # 로컬 경로 (/ 없이 시작하는 경우, 예: uploads/xxx/image.png)
+            if os.path.exists(image_url):
+                shutil.copy(image_url, img_path)
+            else:
+                print(f"[VIDEO-WORKER-PARALLEL] 씬 {idx+1} 로컬 이미지 없음: {image_url}")
+                return idx, None, duration
+    except Exception as e:
+        print(f"[VIDEO-WORKER-PARALLEL] 씬 {idx+1} 이미지 다운로드 실패: {e}")
+        return idx, None, duration
 
-FORBIDDEN - DO NOT INCLUDE:
-- NO photorealistic humans or photographs
-- NO stickman/stick figures
-- NO text, letters, words, Korean characters, or any writing in the image
-- NO Japanese anime style, NO 3D render
+    if not os.path.exists(img_path):
+        return idx, None, duration
 
-Background style: Detailed background related to the scene, vibrant colors
-Scene environment: {broll_prompt}
+    # 오디오 다운로드
+    audio_path = None
+    if audio_url:
+        audio_path = os.path.join(work_dir, f"audio_{idx:03d}.mp3")
+        try:
+            if audio_url.startswith('http'):
+                req = urllib.request.Request(audio_url, headers={'User-Agent': 'Mozilla/5.0'})
+                with urllib.request.urlopen(req, timeout=30) as response:
+                    with open(audio_path, 'wb') as f:
+                        f.write(response.read())
+            elif audio_url.startswith('/'):
+                local_path = audio_url.lstrip('/')
+                if os.path.exists(local_path):
+                    shutil.copy(local_path, audio_path)
+            else:
+                # 로컬 경로 (/ 없이 시작하는 경우)
+                if os.path.exists(audio_url):
+                    shutil.copy(audio_url, audio_path)
+        except Exception as e:
+            print(f"[VIDEO-WORKER-PARALLEL] 씬 {idx+1} 오디오 다운로드 실패: {e}")
+            audio_path = None
 
-OUTPUT: 1080x1920 vertical Korean webtoon style illustration with centered character against scenic background."""
+    # Ken Burns 효과 (씬별로 다양한 효과 자동 배정)
+    ken_burns_effect = scene.get('ken_burns', None)
+    if not ken_burns_effect:
+        effects_cycle = ['zoom_in', 'pan_right', 'zoom_out', 'pan_left', 'zoom_in', 'pan_up']
+        ken_burns_effect = effects_cycle[idx % len(effects_cycle)]
 
-                        # Gemini API로 9:16 이미지 생성
-                        gen_resp = req.post(f"{base_url}/api/drama/generate-image", json={
-                            "prompt": vertical_prompt,
-                            "width": 1080,
-                            "height": 1920,
-                            "model": "gemini-2.5-flash"
-                        }, timeout=60)
+    ken_burns_filter = _get_ken_burns_filter(ken_burns_effect, duration)
 
-                        if gen_resp.status_code == 200:
-                            gen_data = gen_resp.json()
-                            if gen_data.get("ok") and gen_data.get("imageUrl"):
-                                img_url = gen_data["imageUrl"]
-                                # 생성된 이미지 다운로드
-                                if img_url.startswith("http"):
-                                    img_download = req.get(img_url, timeout=30)
-                                else:
-                                    img_download = req.get(f"{base_url}{img_url}", timeout=30)
+    # 씬 클립 생성
+    clip_path = os.path.join(work_dir, f"clip_{idx:03d}.mp4")
+    if audio_path and os.path.exists(audio_path):
+        cmd = [
+            "ffmpeg", "-y",
+            "-loop", "1",
+            "-framerate", "24",
+            "-i", img_path,
+            "-i", audio_path,
+            "-vf", ken_burns_filter,
+            "-c:v", "libx264", "-preset", "fast",
+            "-c:a", "aac", "-b:a", "128k", "-ar", "44100",
+            "-pix_fmt", "yuv420p",
+            "-shortest", "-t", str(duration),
+            clip_path
+        ]
+    else:
+        cmd = [
+            "ffmpeg", "-y",
+            "-loop", "1",
+            "-framerate", "24",
+            "-i", img_path,
+            "-f", "lavfi", "-i", "anullsrc=r=44100:cl=stereo",
+            "-vf", ken_burns_filter,
+            "-c:v", "libx264", "-preset", "fast",
+            "-c:a", "aac", "-b:a", "128k", "-ar", "44100",
+            "-pix_fmt", "yuv420p",
+            "-t", str(duration), "-shortest",
+            clip_path
+        ]
 
-                                with open(image_path, "wb") as f:
-                                    f.write(img_download.content)
+    result = subprocess.run(
+        cmd,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        timeout=600
+    )
 
-                                if os.path.exists(image_path) and os.path.getsize(image_path) > 1000:
-                                    shorts_image_generated = True
-                                    total_cost += 0.02  # Gemini 이미지 생성 비용
-                                    print(f"[SHORTS-V2] Beat {beat_id} 전용 9:16 이미지 생성 완료 (스틱맨 중앙)")
-                    except Exception as gen_err:
-                        print(f"[SHORTS-V2] Beat {beat_id} 이미지 생성 실패, 크롭으로 fallback: {gen_err}")
+    if result.returncode == 0 and os.path.exists(clip_path):
+        print(f"[VIDEO-WORKER-PARALLEL] 씬 {idx+1} 완료: {duration:.1f}초")
+        del result
+        gc.collect()
+        return idx, clip_path, duration
 
-                # 옵션 2: 전용 이미지 생성 실패 시 기존 이미지 크롭
-                if not shorts_image_generated and scene_images and len(scene_images) > 0:
-                    # beat_id에 해당하는 이미지 선택 (순환)
-                    img_idx = (idx) % len(scene_images)
-                    source_img_url = scene_images[img_idx]
+    # Ken Burns 실패 시 단순 방식으로 재시도
+    stderr_msg = result.stderr.decode('utf-8', errors='ignore')[:300] if result.stderr else ''
+    print(f"[VIDEO-WORKER-PARALLEL] 씬 {idx+1} Ken Burns 실패, 단순 방식 재시도: {stderr_msg}")
+    del result
+    gc.collect()
 
-                    if source_img_url:
-                        try:
-                            # 원본 이미지 다운로드
-                            temp_source = os.path.join(temp_dir, f"source_{beat_id:02d}.png")
-                            if source_img_url.startswith("http"):
-                                img_download = req.get(source_img_url, timeout=30)
-                            else:
-                                img_download = req.get(f"{base_url}{source_img_url}", timeout=30)
+    simple_filter = "scale=1280:720:force_original_aspect_ratio=decrease,pad=1280:720:(ow-iw)/2:(oh-ih)/2"
+    if audio_path and os.path.exists(audio_path):
+        fallback_cmd = [
+            "ffmpeg", "-y",
+            "-loop", "1",
+            "-i", img_path,
+            "-i", audio_path,
+            "-vf", simple_filter,
+            "-c:v", "libx264", "-preset", "fast",
+            "-c:a", "aac", "-b:a", "128k", "-ar", "44100",
+            "-pix_fmt", "yuv420p",
+            "-shortest", "-t", str(duration),
+            clip_path
+        ]
+    else:
+        fallback_cmd = [
+            "ffmpeg", "-y",
+            "-loop", "1",
+            "-i", img_path,
+            "-f", "lavfi", "-i", "anullsrc=r=44100:cl=stereo",
+            "-vf", simple_filter,
+            "-c:v", "libx264", "-preset", "fast",
+            "-c:a", "aac", "-b:a", "128k", "-ar", "44100",
+            "-pix_fmt", "yuv420p",
+            "-t", str(duration), "-shortest",
+            clip_path
+        ]
 
-                            with open(temp_source, "wb") as f:
-                                f.write(img_download.content)
+    fallback_result = subprocess.run(
+        fallback_cmd,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        timeout=600
+    )
 
-                            # 16:9 → 9:16 크롭 (중앙 기준, 세로로 확대 후 좌우 크롭)
-                            # scale=-1:1920 = 높이 1920으로 스케일 (비율 유지)
-                            # crop=1080:1920 = 중앙에서 1080x1920 크롭
-                            crop_cmd = [
-                                "ffmpeg", "-y", "-i", temp_source,
-                                "-vf", "scale=-1:1920,crop=1080:1920",
-                                "-frames:v", "1", image_path
-                            ]
-                            crop_result = subprocess.run(crop_cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, timeout=30)
+    if fallback_result.returncode == 0 and os.path.exists(clip_path):
+        print(f"[VIDEO-WORKER-PARALLEL] 씬 {idx+1} 단순 방식 성공: {duration:.1f}초")
+        del fallback_result
+        gc.collect()
+        return idx, clip_path, duration
 
-                            if crop_result.returncode == 0 and os.path.exists(image_path):
-                                print(f"[SHORTS-V2] Beat {beat_id} 이미지 크롭 완료 (원본: {img_idx+1}번째, 스틱맨 잘릴 수 있음)")
-                            else:
-                                print(f"[SHORTS-V2] Beat {beat_id} 크롭 실패: {crop_result.stderr.decode('utf-8', errors='ignore')[-200:]}")
-                        except Exception as crop_err:
-                            print(f"[SHORTS-V2] Beat {beat_id} 이미지 크롭 실패: {crop_err}")
+    print(f"[VIDEO-WORKER-PARALLEL] 씬 {idx+1} 최종 실패")
+    del fallback_result
+    gc.collect()
+    return idx, None, duration
 
-                # 이미지 파일이 없으면 fallback: 어두운 그라데이션 배경 생성
-                if not os.path.exists(image_path):
-                    print(f"[SHORTS-V2] Beat {beat_id} 이미지 없음, 그라데이션 배경 생성")
-                    # 뉴스 스타일 어두운 그라데이션 배경 (상단 진한 파랑 → 하단 검정)
-                    subprocess.run([
-                        "ffmpeg", "-y", "-f", "lavfi",
-                        "-i", "gradients=s=1080x1920:c0=0x0a1628:c1=0x000000:x0=0:y0=0:x1=0:y1=1920:d=1",
-                        "-frames:v", "1", image_path
-                    ], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
 
-                    # gradients 필터가 없는 FFmpeg 버전 fallback
-                    if not os.path.exists(image_path):
-                        subprocess.run([
-                            "ffmpeg", "-y", "-f", "lavfi",
-                            "-i", "color=c=0x0a1628:s=1080x1920:d=1",
-                            "-frames:v", "1", image_path
-                        ], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
-
-                # 자막 정보 저장
-                emphasis_words = caption_style.get("emphasis_words", [])
+def _generate_video_worker(job_id, session_id, scenes, detected_lang, video_effects=None, prebuilt_clips=None):
+    """백그라운드 영상 생성 워커
 
-                beat_data.append({
-                    "beat_id": beat_id,
-                    "audio_path": audio_path,
-                    "image_path": image_path,
-                    "duration": duration,
-                    "voiceover": voiceover,
-                    "on_screen_text": on_screen_text,
-                    "emphasis_words": emphasis_words
-                })
+    prebuilt_clips: {씬 인덱스: 클립 경로} - 자동화 파이프라인이 씬별로 미리 인코딩한 클립
+    (있으면 클립 생성을 건너뛰고 병합/자막/BGM 단계부터 진행)
 
-            # ========== 2. 각 beat를 클립으로 합성 ==========
-            print(f"[SHORTS-V2] 클립 합성 시작...")
-            clip_paths = []
+    video_effects 구조:
+    {
+        "bgm_mood": "calm/cinematic/comedic/dramatic/epic/hopeful/horror/mysterious/nostalgic/sad/tense/upbeat",
+        "subtitle_highlights": [{"keyword": "단어", "color": "#FF0000"}],
+        "sound_effects": [{"scene": 1, "type": "impact", "moment": "..."}],
+        "lower_thirds": [{"scene": 2, "text": "출처", "position": "bottom-left"}]
+    }
+    """
+    import subprocess
+    import shutil
+    import urllib.request
+    import gc  # 메모리 정리용
 
-            for bd in beat_data:
-                clip_path = os.path.join(temp_dir, f"clip_{bd['beat_id']:02d}.mp4")
+    if video_effects is None:
+        video_effects = {}
 
-                # 이미지 + 오디오 + 자막 합성 (한국 뉴스 스타일 + TTS 싱크)
-                voiceover_raw = bd['voiceover']
-                beat_duration = bd['duration']
+    # FFmpeg 세마포어 획득 (다른 FFmpeg 작업과 동시 실행 방지 - 메모리 보호)
+    print(f"[VIDEO-WORKER] FFmpeg 세마포어 대기 중...")
+    ffmpeg_semaphore.acquire()
+    print(f"[VIDEO-WORKER] FFmpeg 세마포어 획득, 영상 생성 시작...")
 
-                # 폰트 설정: lang/ko.py에서 관리
-                font_path = f"fonts/{lang_ko.FONTS['default']}"
-                if not os.path.exists(font_path):
-                    font_path = lang_ko.FONTS['system_paths'][0] if lang_ko.FONTS['system_paths'] else font_path
-                font_escaped = font_path.replace("\\", "/").replace(":", "\\:")
+    try:
+        _update_job_status(job_id, status='processing', message='영상 생성 시작...')
 
-                # ========== TTS 싱크 자막: 문장/구 단위로 분할 ==========
-                # 마침표, 쉼표, 물음표 등으로 분할
-                import re
-                # 문장 구분자로 분할 (구분자 포함)
-                sentence_pattern = r'([^.!?,。，、！？]+[.!?,。，、！？]?)'
-                raw_segments = re.findall(sentence_pattern, voiceover_raw)
-                # 빈 문자열 제거 및 정리
-                segments = [s.strip() for s in raw_segments if s.strip()]
+        # === video_effects 디버그 로깅 ===
+        print(f"[VIDEO-WORKER] ========== VIDEO EFFECTS 설정 ==========")
+        print(f"[VIDEO-WORKER] bgm_mood: {video_effects.get('bgm_mood', '(없음)')}")
+        print(f"[VIDEO-WORKER] subtitle_highlights: {len(video_effects.get('subtitle_highlights', []))}개")
+        print(f"[VIDEO-WORKER] screen_overlays: {len(video_effects.get('screen_overlays', []))}개")
+        print(f"[VIDEO-WORKER] sound_effects: {len(video_effects.get('sound_effects', []))}개")
+        print(f"[VIDEO-WORKER] lower_thirds: {len(video_effects.get('lower_thirds', []))}개")
+        print(f"[VIDEO-WORKER] news_ticker enabled: {video_effects.get('news_ticker', {}).get('enabled', False)}")
+        print(f"[VIDEO-WORKER] shorts highlight_scenes: {video_effects.get('shorts', {}).get('highlight_scenes', [])}")
+        print(f"[VIDEO-WORKER] transitions style: {video_effects.get('transitions', {}).get('style', 'none')}")
+        print(f"[VIDEO-WORKER] add_outro: {video_effects.get('add_outro', True)}")
+        print(f"[VIDEO-WORKER] ============================================")
 
-                # 세그먼트가 너무 많으면 병합 (최대 4개)
-                if len(segments) > 4:
-                    merged = []
-                    chunk_size = (len(segments) + 3) // 4
-                    for i in range(0, len(segments), chunk_size):
-                        merged.append(' '.join(segments[i:i+chunk_size]))
-                    segments = merged
+        total_scenes = len(scenes)
+        upload_dir = "uploads"
+        os.makedirs(upload_dir, exist_ok=True)
 
-                # 세그먼트가 없으면 전체를 하나로
-                if not segments:
-                    segments = [voiceover_raw]
+        # 작업 디렉토리 생성 (tempfile 대신 직접 관리)
+        work_dir = os.path.join(upload_dir, f"work_{job_id}")
+        os.makedirs(work_dir, exist_ok=True)
 
-                # 각 세그먼트의 시간 계산 (글자 수 비율 기반)
-                total_chars = sum(len(s) for s in segments)
-                if total_chars == 0:
-                    total_chars = 1
+        try:
+            scene_videos = []
+            all_subtitles = []
+            current_time = 0.0
 
-                segment_timings = []
-                current_time = 0.0
-                for seg in segments:
-                    seg_duration = (len(seg) / total_chars) * beat_duration
-                    segment_timings.append({
-                        'text': seg,
-                        'start': current_time,
-                        'end': current_time + seg_duration
-                    })
-                    current_time += seg_duration
+            # 환경변수로 병렬 처리 워커 수 설정 (기본값: 1 = 순차 처리)
+            # Render Pro (4GB) 환경에서는 2로 설정 권장
+            parallel_workers = int(os.environ.get('VIDEO_PARALLEL_WORKERS', 1))
 
-                # ========== 한국 뉴스 스타일 텍스트 오버레이 ==========
-                # 쇼츠 해상도: 1080x1920 (9:16)
-                # 1. 기본 필터: 해상도 + 하단 배경 박스
-                subtitle_filter = (
-                    f"scale=1080:1920:force_original_aspect_ratio=decrease,pad=1080:1920:(ow-iw)/2:(oh-ih)/2:black,"
-                    f"drawbox=x=0:y=ih*0.68:w=iw:h=ih*0.32:color=black@0.75:t=fill"
-                )
+            # 1. 각 씬별 영상 클립 생성
+            if prebuilt_clips is not None:
+                # ========== 사전 인코딩 클립 사용 (자동화 파이프라인) ==========
+                print(f"[VIDEO-WORKER] 사전 인코딩 클립 사용 - {len(prebuilt_clips)}/{total_scenes}개")
+                _update_job_status(job_id, progress=70, message='사전 인코딩 클립 확인 중...')
 
-                # 2. TTS 싱크 자막: 각 세그먼트를 시간에 맞춰 표시
-                for seg_idx, seg_info in enumerate(segment_timings):
-                    # 텍스트 줄바꿈 처리 (14자마다)
-                    seg_text = seg_info['text']
-                    max_chars_per_line = 14
-                    lines = []
-                    current_line = ""
-                    for char in seg_text:
-                        current_line += char
-                        if len(current_line) >= max_chars_per_line:
-                            lines.append(current_line)
-                            current_line = ""
-                    if current_line:
-                        lines.append(current_line)
-                    wrapped_text = "\n".join(lines[:3])  # 최대 3줄
+                for idx, scene in enumerate(scenes):
+                    duration = scene.get('duration', 5.0)
+                    clip_path = prebuilt_clips.get(idx)
+                    if not (clip_path and os.path.exists(clip_path)) and scene.get('image_url'):
+                        # 파이프라인에서 인코딩 실패한 씬만 다시 생성
+                        _, clip_path, _ = _create_scene_clip_worker((idx, scene, work_dir, total_scenes))
+                    if clip_path and os.path.exists(clip_path):
+                        scene_videos.append(clip_path)
 
-                    # FFmpeg 이스케이프
-                    text_escaped = wrapped_text.replace("\\", "\\\\").replace(":", "\\:").replace("'", "'\\''")
+                    # 자막 시간 조정 (병렬 모드와 동일)
+                    for sub in scene.get('subtitles', []):
+                        all_subtitles.append({
+                            'start': current_time + sub.get('start', 0),
+                            'end': current_time + sub.get('end', duration),
+                            'text': sub.get('text', '')
+                        })
+                    current_time += duration
 
-                    # enable 표현식으로 시간 범위 지정
-                    start_t = seg_info['start']
-                    end_t = seg_info['end']
+            elif parallel_workers > 1:
+                # ========== 병렬 처리 모드 ==========
+                from concurrent.futures import ThreadPoolExecutor, as_completed
 
-                    subtitle_filter += (
-                        f",drawtext=text='{text_escaped}':"
-                        f"fontfile='{font_escaped}':fontsize=68:fontcolor=white:"
-                        f"borderw=4:bordercolor=black:"
-                        f"x=(w-text_w)/2:y=h*0.73:"
-                        f"line_spacing=16:"
-                        f"enable='between(t,{start_t:.2f},{end_t:.2f})'"
-                    )
+                print(f"[VIDEO-WORKER-PARALLEL] 병렬 처리 시작 - {total_scenes}개 씬, {parallel_workers}개 워커")
+                _update_job_status(job_id, progress=5, message=f'병렬 처리 시작 ({parallel_workers}개 워커)...')
 
-                # 2. 상단 헤드라인: 고정 타이틀 (영상 제목) - 노란색, 전체 영상에 동일하게 표시
-                # fixed_title이 있으면 사용, 없으면 on_screen_text fallback
-                headline_text = fixed_title if fixed_title else bd.get('on_screen_text', '')
-                if headline_text:
-                    # FFmpeg drawtext 이스케이프 순서: 백슬래시 → 콜론 → 따옴표
-                    text_escaped = headline_text.replace("\\", "\\\\").replace(":", "\\:").replace("'", "'\\''")
+                tasks = [(idx, scene, work_dir, total_scenes) for idx, scene in enumerate(scenes)]
+                results = [None] * total_scenes  # 순서 유지를 위한 리스트
 
-                    # 텍스트 길이에 따라 폰트 크기 조절 (더 굵고 크게)
-                    text_len = len(headline_text)
-                    if text_len <= 8:
-                        headline_fontsize = 100  # 매우 짧은 타이틀
-                    elif text_len <= 15:
-                        headline_fontsize = 88   # 짧은 타이틀
-                    elif text_len <= 25:
-                        headline_fontsize = 72   # 중간 타이틀
-                    else:
-                        headline_fontsize = 60   # 긴 타이틀
+                with ThreadPoolExecutor(max_workers=parallel_workers) as executor:
+                    future_to_idx = {executor.submit(_create_scene_clip_worker, task): task[0] for task in tasks}
+                    completed = 0
 
-                    # 고정 타이틀은 항상 노란색 (일관성)
-                    headline_color = "yellow"
+                    for future in as_completed(future_to_idx):
+                        idx = future_to_idx[future]
+                        completed += 1
+                        progress = int((completed / total_scenes) * 70)
+                        _update_job_status(job_id, progress=progress, message=f'씬 {completed}/{total_scenes} 클립 생성 중...')
 
-                    subtitle_filter += (
-                        # 상단 반투명 배경 (상단 22% - 더 큰 타이틀 공간)
-                        f",drawbox=x=0:y=0:w=iw:h=ih*0.22:color=black@0.65:t=fill,"
-                        # 헤드라인 텍스트 (폰트/테두리 증가)
-                        f"drawtext=text='{text_escaped}':"
-                        f"fontfile='{font_escaped}':fontsize={headline_fontsize}:fontcolor={headline_color}:"
-                        f"borderw=6:bordercolor=black:"
-                        f"x=(w-text_w)/2:y=h*0.10"
-                    )
+                        try:
+                            result_idx, clip_path, duration = future.result()
+                            results[idx] = (clip_path, duration)
+                        except Exception as e:
+                            print(f"[VIDEO-WORKER-PARALLEL] 씬 {idx+1} 오류: {e}")
+                            results[idx] = (None, scenes[idx].get('duration', 5.0))
 
-                cmd = [
-                    "ffmpeg", "-y",
-                    "-loop", "1", "-i", bd['image_path'],
-                    "-i", bd['audio_path'],
-                    "-vf", subtitle_filter,
-                    "-c:v", "libx264", "-preset", "fast",
-                    "-c:a", "aac", "-b:a", "128k", "-ar", "44100",
-                    "-pix_fmt", "yuv420p",
-                    "-t", str(bd['duration']),
-                    "-shortest",
-                    clip_path
-                ]
+                # 결과 정리 (순서대로) + 자막 시간 계산
+                for idx, (clip_path, duration) in enumerate(results):
+                    if clip_path and os.path.exists(clip_path):
+                        scene_videos.append(clip_path)
 
-                # 파일 존재 확인
-                if not os.path.exists(bd['image_path']):
-                    print(f"[SHORTS-V2] 클립 {bd['beat_id']} 이미지 파일 없음: {bd['image_path']}")
-                    continue
-                if not os.path.exists(bd['audio_path']):
-                    print(f"[SHORTS-V2] 클립 {bd['beat_id']} 오디오 파일 없음: {bd['audio_path']}")
-                    continue
+                    # 자막 시간 조정 (순차적으로)
+                    subtitles = scenes[idx].get('subtitles', [])
+                    for sub in subtitles:
+                        all_subtitles.append({
+                            'start': current_time + sub.get('start', 0),
+                            'end': current_time + sub.get('end', duration),
+                            'text': sub.get('text', '')
+                        })
+                    current_time += duration
 
-                result = subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, timeout=120)
-                if result.returncode == 0 and os.path.exists(clip_path):
-                    clip_paths.append(clip_path)
-                    print(f"[SHORTS-V2] 클립 {bd['beat_id']} 완료 ({bd['duration']:.1f}초)")
-                else:
-                    stderr = result.stderr.decode('utf-8', errors='ignore')[-500:]  # 마지막 500자 (에러 메시지가 끝에 있음)
-                    print(f"[SHORTS-V2] 클립 {bd['beat_id']} 실패: {stderr}")
+                gc.collect()
+                print(f"[VIDEO-WORKER-PARALLEL] 병렬 처리 완료 - 성공: {len(scene_videos)}/{total_scenes}")
 
-            if not clip_paths:
-                return {"ok": False, "error": "클립 생성 실패"}
+            else:
+                # ========== 순차 처리 모드 (기본값 - 메모리 절약) ==========
+                print(f"[VIDEO-WORKER-SEQUENTIAL] 순차 처리 시작 - {total_scenes}개 씬 (메모리 절약 모드)")
 
-            # ========== 3. 클립 병합 ==========
-            print(f"[SHORTS-V2] {len(clip_paths)}개 클립 병합...")
-            concat_list = os.path.join(temp_dir, "concat.txt")
-            with open(concat_list, 'w') as f:
-                for clip_path in clip_paths:
-                    f.write(f"file '{os.path.abspath(clip_path)}'\n")
+                for idx, scene in enumerate(scenes):
+                    progress = int((idx / total_scenes) * 70)
+                    _update_job_status(job_id, progress=progress, message=f'씬 {idx + 1}/{total_scenes} 처리 중...')
 
-            # 병합
-            concat_cmd = [
-                "ffmpeg", "-y",
-                "-f", "concat", "-safe", "0",
-                "-i", concat_list,
-                "-c:v", "libx264", "-preset", "fast",
-                "-c:a", "aac", "-b:a", "128k",
-                "-movflags", "+faststart",
-                output_path
-            ]
+                    image_url = scene.get('image_url', '')
+                    audio_url = scene.get('audio_url', '')
+                    duration = scene.get('duration', 5.0)
+                    subtitles = scene.get('subtitles', [])
 
-            result = subprocess.run(concat_cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, timeout=180)
+                    print(f"[VIDEO-WORKER-SEQUENTIAL] Scene {idx + 1}: duration={duration:.2f}s")
 
-            if result.returncode == 0 and os.path.exists(output_path):
-                # 최종 영상 길이 확인
-                probe_result = subprocess.run([
-                    "ffprobe", "-v", "error", "-show_entries", "format=duration",
-                    "-of", "default=noprint_wrappers=1:nokey=1", output_path
-                ], capture_output=True, text=True)
+                    if not image_url:
+                        current_time += duration
+                        continue
 
-                final_duration = 0
-                if probe_result.returncode == 0:
+                    # 이미지 다운로드
+                    img_path = os.path.join(work_dir, f"scene_{idx:03d}.jpg")
+                    print(f"[VIDEO-WORKER-SEQUENTIAL] Scene {idx + 1} image_url: {image_url[:100]}...")
                     try:
-                        final_duration = float(probe_result.stdout.strip())
-                    except:
-                        pass
+                        if image_url.startswith('http'):
+                            req = urllib.request.Request(image_url, headers={'User-Agent': 'Mozilla/5.0'})
+                            with urllib.request.urlopen(req, timeout=30) as response:
+                                with open(img_path, 'wb') as f:
+                                    f.write(response.read())
+                        elif image_url.startswith('/'):
+                            local_path = image_url.lstrip('/')
+                            if os.path.exists(local_path):
+                                shutil.copy(local_path, img_path)
+                            else:
+                                print(f"[VIDEO-WORKER-SEQUENTIAL] Local image not found: {local_path}")
+                                current_time += duration
+                                continue
+                        else:
+                            # 로컬 경로 (/ 없이 시작하는 경우)
+                            if os.path.exists(image_url):
+                                shutil.copy(image_url, img_path)
+                            else:
+                                print(f"[VIDEO-WORKER-SEQUENTIAL] Local image not found: {image_url}")
+                                current_time += duration
+                                continue
+                    except Exception as e:
+                        print(f"[VIDEO-WORKER-SEQUENTIAL] Image download failed: {e}")
+                        current_time += duration
+                        continue
 
-                print(f"[SHORTS-V2] 쇼츠 생성 완료: {output_path} ({final_duration:.1f}초)")
+                    # 이미지 파일 검증
+                    if not os.path.exists(img_path):
+                        print(f"[VIDEO-WORKER-SEQUENTIAL] Image file not created: {img_path}")
+                        current_time += duration
+                        continue
+                    img_size = os.path.getsize(img_path)
+                    print(f"[VIDEO-WORKER-SEQUENTIAL] Scene {idx + 1} image saved: {img_size} bytes")
 
-                return {
-                    "ok": True,
-                    "shorts_path": output_path,
-                    "duration": final_duration,
-                    "cost": total_cost,
-                    "beats_count": len(beats)
-                }
-            else:
-                stderr = result.stderr.decode('utf-8', errors='ignore')[:300]
-                return {"ok": False, "error": f"병합 실패: {stderr}"}
+                    # 오디오 다운로드
+                    audio_path = None
+                    if audio_url:
+                        audio_path = os.path.join(work_dir, f"audio_{idx:03d}.mp3")
+                        try:
+                            if audio_url.startswith('http'):
+                                req = urllib.request.Request(audio_url, headers={'User-Agent': 'Mozilla/5.0'})
+                                with urllib.request.urlopen(req, timeout=30) as response:
+                                    with open(audio_path, 'wb') as f:
+                                        f.write(response.read())
+                            elif audio_url.startswith('/'):
+                                local_path = audio_url.lstrip('/')
+                                if os.path.exists(local_path):
+                                    shutil.copy(local_path, audio_path)
+                            else:
+                                # 로컬 경로 (/ 없이 시작하는 경우)
+                                if os.path.exists(audio_url):
+                                    shutil.copy(audio_url, audio_path)
+                        except Exception as e:
+                            print(f"[VIDEO-WORKER-SEQUENTIAL] Audio download failed: {e}")
+                            audio_path = None
 
-        finally:
-            # 임시 파일 정리
-            shutil.rmtree(temp_dir, ignore_errors=True)
+                    # 자막 시간 조정
+                    for sub in subtitles:
+                        all_subtitles.append({
+                            'start': current_time + sub.get('start', 0),
+                            'end': current_time + sub.get('end', duration),
+                            'text': sub.get('text', '')
+                        })
+                    current_time += duration
 
-    except Exception as e:
-        print(f"[SHORTS-V2] 오류: {e}")
-        import traceback
-        traceback.print_exc()
-        return {"ok": False, "error": str(e)}
+                    # Ken Burns 효과 가져오기 (씬별로 다른 효과 적용)
+                    ken_burns_effect = scene.get('ken_burns', None)
+                    if not ken_burns_effect:
+                        # 씬별로 다양한 효과 자동 배정 (다이나믹한 영상을 위해)
+                        effects_cycle = ['zoom_in', 'pan_right', 'zoom_out', 'pan_left', 'zoom_in', 'pan_up']
+                        ken_burns_effect = effects_cycle[idx % len(effects_cycle)]
 
+                    ken_burns_filter = _get_ken_burns_filter(ken_burns_effect, duration)
+                    print(f"[VIDEO-WORKER-SEQUENTIAL] Scene {idx + 1} Ken Burns: {ken_burns_effect}")
 
-def _generate_shorts_video(main_video_path, scenes, highlight_scenes, hook_text, output_path):
-    """메인 영상에서 쇼츠용 세로 영상(9:16) 생성 [레거시 - 크롭 방식]
+                    # 씬 클립 생성 (Ken Burns 효과 포함)
+                    clip_path = os.path.join(work_dir, f"clip_{idx:03d}.mp4")
+                    if audio_path and os.path.exists(audio_path):
+                        cmd = [
+                            "ffmpeg", "-y",
+                            "-loop", "1",
+                            "-framerate", "24",
+                            "-i", img_path,
+                            "-i", audio_path,
+                            "-vf", ken_burns_filter,
+                            "-c:v", "libx264", "-preset", "fast",
+                            "-c:a", "aac", "-b:a", "128k", "-ar", "44100",
+                            "-pix_fmt", "yuv420p",
+                            "-shortest", "-t", str(duration),
+                            clip_path
+                        ]
+                    else:
+                        cmd = [
+                            "ffmpeg", "-y",
+                            "-loop", "1",
+                            "-framerate", "24",
+                            "-i", img_path,
+                            "-f", "lavfi", "-i", "anullsrc=r=44100:cl=stereo",
+                            "-vf", ken_burns_filter,
+                            "-c:v", "libx264", "-preset", "fast",
+                            "-c:a", "aac", "-b:a", "128k", "-ar", "44100",
+                            "-pix_fmt", "yuv420p",
+                            "-t", str(duration), "-shortest",
+                            clip_path
+                        ]
 
-    Args:
-        main_video_path: 원본 메인 영상 경로
-        scenes: 씬 정보 목록 (duration 포함)
-        highlight_scenes: 하이라이트 씬 번호 목록 [1, 2, 3]
-        hook_text: 쇼츠 시작 훅 텍스트
-        output_path: 출력 경로
+                    # 메모리 최적화: stdout DEVNULL, stderr만 PIPE (OOM 방지)
+                    result = subprocess.run(
+                        cmd,
+                        stdout=subprocess.DEVNULL,
+                        stderr=subprocess.PIPE,
+                        timeout=600
+                    )
+                    if result.returncode == 0 and os.path.exists(clip_path):
+                        scene_videos.append(clip_path)
+                        print(f"[VIDEO-WORKER-SEQUENTIAL] Clip {idx+1} created successfully")
+                        del result
+                        gc.collect()
+                    else:
+                        stderr = result.stderr.decode('utf-8', errors='ignore')[:500] if result.stderr else 'no stderr'
+                        print(f"[VIDEO-WORKER-SEQUENTIAL] Clip {idx+1} FAILED: {stderr[:200]}")
+                        del result
+                        gc.collect()
 
-    Returns:
-        성공 여부 (bool)
-    """
-    print(f"[SHORTS] 쇼츠 생성 시작")
-    print(f"[SHORTS] 메인 영상: {main_video_path}, 존재: {os.path.exists(main_video_path)}")
-    print(f"[SHORTS] 씬 수: {len(scenes) if scenes else 0}")
-    print(f"[SHORTS] 하이라이트 씬: {highlight_scenes}")
-    print(f"[SHORTS] 훅 텍스트: {hook_text}")
-    print(f"[SHORTS] 출력 경로: {output_path}")
+                        # Ken Burns 실패 시 단순 방식으로 재시도
+                        print(f"[VIDEO-WORKER-SEQUENTIAL] Clip {idx+1} 단순 방식으로 재시도...")
+                        simple_filter = "scale=1280:720:force_original_aspect_ratio=decrease,pad=1280:720:(ow-iw)/2:(oh-ih)/2"
+                        if audio_path and os.path.exists(audio_path):
+                            fallback_cmd = [
+                                "ffmpeg", "-y",
+                                "-loop", "1",
+                                "-i", img_path,
+                                "-i", audio_path,
+                                "-vf", simple_filter,
+                                "-c:v", "libx264", "-preset", "fast",
+                                "-c:a", "aac", "-b:a", "128k", "-ar", "44100",
+                                "-pix_fmt", "yuv420p",
+                                "-shortest", "-t", str(duration),
+                                clip_path
+                            ]
+                        else:
+                            fallback_cmd = [
+                                "ffmpeg", "-y",
+                                "-loop", "1",
+                                "-i", img_path,
+                                "-f", "lavfi", "-i", "anullsrc=r=44100:cl=stereo",
+                                "-vf", simple_filter,
+                                "-c:v", "libx264", "-preset", "fast",
+                                "-c:a", "aac", "-b:a", "128k", "-ar", "44100",
+                                "-pix_fmt", "yuv420p",
+                                "-t", str(duration), "-shortest",
+                                clip_path
+                            ]
 
-    try:
-        import tempfile
-        import shutil
+                        fallback_result = subprocess.run(
+                            fallback_cmd,
+                            stdout=subprocess.DEVNULL,
+                            stderr=subprocess.PIPE,
+                            timeout=600
+                        )
+                        if fallback_result.returncode == 0 and os.path.exists(clip_path):
+                            scene_videos.append(clip_path)
+                            print(f"[VIDEO-WORKER-SEQUENTIAL] Clip {idx+1} 단순 방식 성공")
+                        else:
+                            fallback_stderr = fallback_result.stderr.decode('utf-8', errors='ignore')[:300] if fallback_result.stderr else ''
+                            print(f"[VIDEO-WORKER-SEQUENTIAL] Clip {idx+1} 단순 방식도 실패: {fallback_stderr}")
+                        del fallback_result
+                        gc.collect()
 
-        # 씬별 시작/종료 시간 계산
-        scene_times = []
-        current_time = 0
-        for idx, scene in enumerate(scenes):
-            duration = scene.get('duration', 5)
-            scene_times.append({
-                'scene_num': idx + 1,
-                'start': current_time,
-                'end': current_time + duration,
-                'duration': duration
-            })
-            current_time += duration
+                print(f"[VIDEO-WORKER-SEQUENTIAL] 순차 처리 완료 - 성공: {len(scene_videos)}/{total_scenes}")
 
-        # 하이라이트 씬 추출 (60초 이하로 제한)
-        selected_clips = []
-        total_duration = 0
-        max_duration = 58  # 60초 제한 (여유 2초)
+            print(f"[VIDEO-WORKER] Total clips created: {len(scene_videos)} / {total_scenes}")
 
-        for scene_num in highlight_scenes:
-            if scene_num < 1 or scene_num > len(scene_times):
-                continue
-            scene_info = scene_times[scene_num - 1]
-            if total_duration + scene_info['duration'] <= max_duration:
-                selected_clips.append(scene_info)
-                total_duration += scene_info['duration']
-            else:
-                # 남은 시간만큼만 추가
-                remaining = max_duration - total_duration
-                if remaining > 3:  # 최소 3초 이상일 때만 추가
-                    selected_clips.append({
-                        **scene_info,
-                        'end': scene_info['start'] + remaining,
-                        'duration': remaining
-                    })
-                    total_duration += remaining
-                break
-
-        if not selected_clips:
-            print(f"[SHORTS] 선택된 클립 없음")
-            return False
-
-        print(f"[SHORTS] {len(selected_clips)}개 클립 선택, 총 {total_duration:.1f}초")
+            if not scene_videos:
+                raise Exception("영상 클립 생성 실패")
 
-        # 임시 디렉토리 생성
-        temp_dir = tempfile.mkdtemp()
-        concat_list = os.path.join(temp_dir, "concat.txt")
+            # 2. 클립 병합 (전환 효과 옵션)
+            _update_job_status(job_id, progress=75, message='클립 병합 중...')
 
-        try:
-            # 각 하이라이트 클립 추출 및 세로 변환
-            clip_paths = []
-            for i, clip in enumerate(selected_clips):
-                clip_path = os.path.join(temp_dir, f"clip_{i:03d}.mp4")
+            merged_path = os.path.join(work_dir, "merged.mp4")
 
-                # 가로(16:9) → 세로(9:16) 변환 + 클립 추출
-                # 중앙 크롭 + 블러 배경 방식
-                vf_filter = (
-                    # 원본을 1080x1920 세로 비율로 크롭 (중앙)
-                    "scale=1080:1920:force_original_aspect_ratio=increase,"
-                    "crop=1080:1920,"
-                    # 자막 위치 조정 (하단)
-                    "setsar=1"
-                )
+            # 전환 효과 설정 확인
+            transitions_config = video_effects.get('transitions', {})
+            transition_style = transitions_config.get('style', 'none')  # 기본값: none (빠른 처리)
+            transition_duration = transitions_config.get('duration', 0.5)
 
-                cmd = [
-                    "ffmpeg", "-y",
-                    "-ss", str(clip['start']),
-                    "-i", main_video_path,
-                    "-t", str(clip['duration']),
-                    "-vf", vf_filter,
-                    "-c:v", "libx264", "-preset", "fast",
-                    "-c:a", "aac", "-b:a", "128k", "-ar", "44100",
-                    "-pix_fmt", "yuv420p",
-                    clip_path
-                ]
+            if transition_style and transition_style != 'none' and len(scene_videos) > 1:
+                # 전환 효과 적용
+                print(f"[VIDEO-WORKER] 전환 효과 적용: {transition_style}, {transition_duration}초")
+                _update_job_status(job_id, progress=76, message=f'전환 효과 적용 중 ({transition_style})...')
 
-                result = subprocess.run(cmd, stdout=subprocess.DEVNULL,
-                                       stderr=subprocess.PIPE, timeout=120)
-                if result.returncode == 0 and os.path.exists(clip_path):
-                    clip_paths.append(clip_path)
-                    print(f"[SHORTS] 클립 {i+1}/{len(selected_clips)} 추출 완료")
+                if _apply_transitions(scene_videos, merged_path, transition_style, transition_duration):
+                    print(f"[VIDEO-WORKER] 전환 효과 적용 완료")
                 else:
-                    stderr = result.stderr.decode('utf-8', errors='ignore')[:200]
-                    print(f"[SHORTS] 클립 {i+1} 추출 실패: {stderr}")
+                    # 전환 효과 실패 시 단순 concat으로 폴백
+                    print(f"[VIDEO-WORKER] 전환 효과 실패, 단순 concat으로 폴백")
+                    transition_style = 'none'
 
-            if not clip_paths:
-                print(f"[SHORTS] 클립 추출 실패")
-                return False
+            if transition_style == 'none' or not os.path.exists(merged_path):
+                # 전환 효과 없이 단순 concat
+                concat_list = os.path.join(work_dir, "concat.txt")
+                with open(concat_list, 'w') as f:
+                    for clip in scene_videos:
+                        # 절대 경로 사용
+                        abs_clip = os.path.abspath(clip)
+                        f.write(f"file '{abs_clip}'\n")
 
-            # concat 파일 생성
-            with open(concat_list, 'w') as f:
-                for clip_path in clip_paths:
-                    f.write(f"file '{os.path.abspath(clip_path)}'\n")
+                print(f"[VIDEO-WORKER] Concat list created with {len(scene_videos)} clips")
 
-            # 클립 병합
-            merged_path = os.path.join(temp_dir, "merged.mp4")
-            concat_cmd = [
-                "ffmpeg", "-y",
-                "-f", "concat", "-safe", "0",
-                "-i", concat_list,
-                "-c", "copy",
-                merged_path
-            ]
-            result = subprocess.run(concat_cmd, stdout=subprocess.DEVNULL,
-                                   stderr=subprocess.PIPE, timeout=120)
+                # 클립 파일 존재 확인
+                for clip in scene_videos:
+                    if os.path.exists(clip):
+                        file_size = os.path.getsize(clip)
+                        print(f"[VIDEO-WORKER] Clip exists: {clip} ({file_size} bytes)")
+                    else:
+                        print(f"[VIDEO-WORKER] Clip MISSING: {clip}")
 
-            if result.returncode != 0:
-                stderr = result.stderr.decode('utf-8', errors='ignore')[:200]
-                print(f"[SHORTS] 클립 병합 실패: {stderr}")
-                return False
+                # IMPORTANT: stdout=DEVNULL, stderr=PIPE to avoid OOM from buffering all FFmpeg output
+                concat_result = subprocess.run(
+                    ["ffmpeg", "-y", "-f", "concat", "-safe", "0", "-i", concat_list, "-c", "copy", merged_path],
+                    stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, timeout=600
+                )
 
-            # 훅 텍스트 오버레이 추가 (처음 3초)
-            # 폰트 설정: lang/ko.py에서 관리
-            if hook_text:
-                font_path = f"fonts/{lang_ko.FONTS['default']}"
-                font_escaped = font_path.replace('\\', '/').replace(':', '\\:')
+                if concat_result.returncode != 0:
+                    stderr = concat_result.stderr.decode('utf-8', errors='ignore') if concat_result.stderr else ""
+                    print(f"[VIDEO-WORKER] Concat FAILED (code {concat_result.returncode}): {stderr[:500]}")
+                    del concat_result
+                    gc.collect()
+                    raise Exception(f"클립 병합 실패: {stderr[:200]}")
 
-                hook_filter = (
-                    f"drawtext=text='{hook_text}':"
-                    f"fontfile='{font_escaped}':fontsize=48:fontcolor=white:"
-                    f"borderw=3:bordercolor=black:"
-                    f"x=(w-text_w)/2:y=h*0.15:"
-                    f"enable='lt(t,3)'"  # 처음 3초만 표시
-                )
+                del concat_result
+                gc.collect()
 
-                final_cmd = [
-                    "ffmpeg", "-y",
-                    "-i", merged_path,
-                    "-vf", hook_filter,
-                    "-c:v", "libx264", "-preset", "fast",
-                    "-c:a", "copy",
-                    output_path
-                ]
-            else:
-                final_cmd = ["cp", merged_path, output_path]
+            if not os.path.exists(merged_path):
+                raise Exception("merged.mp4 파일이 생성되지 않음")
 
-            result = subprocess.run(final_cmd, stdout=subprocess.DEVNULL,
-                                   stderr=subprocess.PIPE, timeout=120)
+            # 3. ASS 자막 생성 (색상 강조 지원)
+            _update_job_status(job_id, progress=85, message='자막 처리 중...')
 
-            if result.returncode == 0 and os.path.exists(output_path):
-                print(f"[SHORTS] 쇼츠 생성 완료: {output_path}")
-                return True
+            # 자막 강조 키워드 가져오기
+            subtitle_highlights = video_effects.get('subtitle_highlights', [])
+            if subtitle_highlights:
+                print(f"[VIDEO-WORKER] 자막 강조 키워드: {[h.get('keyword') for h in subtitle_highlights]}")
+                print(f"[VIDEO-WORKER] 자막 강조 색상: {[h.get('color') for h in subtitle_highlights]}")
             else:
-                stderr = result.stderr.decode('utf-8', errors='ignore')[:200]
-                print(f"[SHORTS] 최종 생성 실패: {stderr}")
-                return False
+                print(f"[VIDEO-WORKER] ⚠️ 자막 강조 키워드 없음 - GPT가 subtitle_highlights를 생성하지 않음")
 
-        finally:
-            # 임시 파일 정리
-            shutil.rmtree(temp_dir, ignore_errors=True)
+            # ASS 형식 사용 (색상 강조 지원)
+            ass_path = os.path.join(work_dir, "subtitles.ass")
+            _generate_ass_subtitles(all_subtitles, subtitle_highlights, ass_path, lang=detected_lang)
 
-    except Exception as e:
-        print(f"[SHORTS] 오류: {e}")
-        import traceback
-        traceback.print_exc()
-        return False
+            # 4. 자막 burn-in + 화면 텍스트 오버레이
+            _update_job_status(job_id, progress=90, message='자막 및 효과 삽입 중...')
 
+            final_path = os.path.join(work_dir, "final.mp4")
 
-def _apply_transitions(clip_paths, output_path, transition_style="crossfade", duration=0.5):
-    """클립들 사이에 전환 효과 적용
+            # 폰트 디렉토리 절대 경로 설정 (스크립트 위치 기준)
+            script_dir = os.path.dirname(os.path.abspath(__file__))
+            fonts_dir = os.path.join(script_dir, "fonts")
+            print(f"[VIDEO-WORKER] 폰트 디렉토리: {fonts_dir}, 존재: {os.path.exists(fonts_dir)}")
 
-    Args:
-        clip_paths: 클립 파일 경로 목록
-        output_path: 출력 파일 경로
-        transition_style: crossfade, fade_black, fade_white, none
-        duration: 전환 효과 길이 (초)
+            # ASS 파일 절대 경로로 변환하고 FFmpeg용 이스케이프
+            ass_abs_path = os.path.abspath(ass_path)
+            # FFmpeg subtitle filter는 : \ ' 등을 이스케이프해야 함
+            ass_escaped = ass_abs_path.replace('\\', '/').replace(':', '\\:')
+            fonts_escaped = fonts_dir.replace('\\', '/').replace(':', '\\:')
 
-    Returns:
-        성공 여부 (bool)
-    """
-    if not clip_paths or len(clip_paths) < 2:
-        # 클립이 1개 이하면 전환 효과 불필요
-        if clip_paths:
-            import shutil
-            shutil.copy(clip_paths[0], output_path)
-            return True
-        return False
+            # 기본 자막 필터 (ASS 형식은 force_style 불필요 - 파일에 스타일 포함)
+            vf_filter = f"ass={ass_escaped}:fontsdir={fonts_escaped}"
 
-    try:
-        if transition_style == "none":
-            # 전환 효과 없이 단순 concat
-            import tempfile
-            concat_list = tempfile.NamedTemporaryFile(mode='w', suffix='.txt', delete=False)
-            for clip_path in clip_paths:
-                concat_list.write(f"file '{os.path.abspath(clip_path)}'\n")
-            concat_list.close()
+            # ★ VRCS 2.0: screen_overlays, lower_thirds, news_ticker 비활성화
+            # 정보 전달 효과가 낮고 화면을 어지럽힘
+            # screen_overlays = video_effects.get('screen_overlays', [])  # 비활성화
+            # lower_thirds = video_effects.get('lower_thirds', [])  # 비활성화
+            # news_ticker = video_effects.get('news_ticker', {})  # 비활성화
+            print(f"[VIDEO-WORKER] VRCS 2.0: screen_overlays, lower_thirds, news_ticker 비활성화됨")
 
-            cmd = [
-                "ffmpeg", "-y",
-                "-f", "concat", "-safe", "0",
-                "-i", concat_list.name,
-                "-c", "copy",
-                output_path
-            ]
-            result = subprocess.run(cmd, stdout=subprocess.DEVNULL,
-                                   stderr=subprocess.PIPE, timeout=300)
-            os.unlink(concat_list.name)
-            return result.returncode == 0
+            print(f"[VIDEO-WORKER] ASS path: {ass_abs_path}")
+            print(f"[VIDEO-WORKER] VF filter 길이: {len(vf_filter)} chars")
+            print(f"[VIDEO-WORKER] VF filter (처음 500자): {vf_filter[:500]}")
+            print(f"[VIDEO-WORKER] Fonts directory: {fonts_dir}")
 
-        # xfade 필터로 전환 효과 적용
-        n = len(clip_paths)
+            # IMPORTANT: stdout=DEVNULL, stderr=PIPE to avoid OOM from buffering FFmpeg output
+            # FFmpeg video encoding generates massive amounts of progress output to stderr
+            # YouTube 호환 설정: -profile:v high -level 4.0, AAC 오디오, +faststart
+            result = subprocess.run([
+                "ffmpeg", "-y", "-i", merged_path,
+                "-vf", vf_filter,
+                "-c:v", "libx264", "-preset", "fast", "-profile:v", "high", "-level", "4.0",
+                "-c:a", "aac", "-b:a", "128k", "-ar", "44100",
+                "-movflags", "+faststart",
+                final_path
+            ], stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, timeout=1800)  # 30분 타임아웃
 
-        # 입력 파일 옵션
-        input_args = []
-        for clip_path in clip_paths:
-            input_args.extend(["-i", clip_path])
+            if result.returncode != 0:
+                # stderr 전체에서 실제 에러 메시지 추출 (FFmpeg는 마지막에 에러 출력)
+                stderr_full = result.stderr.decode('utf-8', errors='ignore') if result.stderr else ""
+                # 마지막 800자 출력 (실제 에러 메시지 포함)
+                stderr_tail = stderr_full[-800:] if len(stderr_full) > 800 else stderr_full
+                print(f"[VIDEO-WORKER] Subtitle burn-in failed (code {result.returncode})")
+                print(f"[VIDEO-WORKER] stderr (마지막 800자): {stderr_tail}")
 
-        # xfade 필터 체인 구성
-        # fade 색상 설정
-        fade_color = "black" if transition_style == "fade_black" else "white" if transition_style == "fade_white" else None
+                # 자막 burn-in 실패 시 자막 없이 YouTube 호환 인코딩 시도
+                print(f"[VIDEO-WORKER] 자막 없이 YouTube 호환 재인코딩 시도...")
+                fallback_result = subprocess.run([
+                    "ffmpeg", "-y", "-i", merged_path,
+                    "-c:v", "libx264", "-preset", "fast", "-profile:v", "high", "-level", "4.0",
+                    "-c:a", "aac", "-b:a", "128k", "-ar", "44100",
+                    "-movflags", "+faststart",
+                    final_path
+                ], stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, timeout=1800)
 
-        if n == 2:
-            # 2개 클립: 단일 xfade
-            if fade_color:
-                filter_complex = f"[0:v]fade=t=out:st=0:d={duration}:color={fade_color}[v0];[1:v]fade=t=in:st=0:d={duration}:color={fade_color}[v1];[v0][v1]concat=n=2:v=1:a=0[outv];[0:a][1:a]concat=n=2:v=0:a=1[outa]"
-            else:
-                # crossfade
-                filter_complex = f"[0:v][1:v]xfade=transition=fade:duration={duration}:offset=0[outv];[0:a][1:a]acrossfade=d={duration}[outa]"
-        else:
-            # 3개 이상: 체인 xfade (복잡, 단순화)
-            # 간단하게 각 클립에 fade in만 적용 후 concat
-            # 주의: fade out은 클립 길이를 모르면 st 계산 불가하므로 생략
-            filter_parts = []
-            for i in range(n):
-                if fade_color:
-                    filter_parts.append(f"[{i}:v]fade=t=in:st=0:d={duration/2}:color={fade_color}[v{i}]")
+                if fallback_result.returncode != 0:
+                    print(f"[VIDEO-WORKER] Fallback 인코딩도 실패, 원본 사용")
+                    final_path = merged_path
                 else:
-                    filter_parts.append(f"[{i}:v]fade=t=in:st=0:d={duration/2}[v{i}]")
+                    print(f"[VIDEO-WORKER] Fallback 인코딩 성공 (자막 없음)")
 
-            video_concat = "".join([f"[v{i}]" for i in range(n)]) + f"concat=n={n}:v=1:a=0[outv]"
-            audio_concat = "".join([f"[{i}:a]" for i in range(n)]) + f"concat=n={n}:v=0:a=1[outa]"
+            del result
+            gc.collect()
 
-            filter_complex = ";".join(filter_parts) + ";" + video_concat + ";" + audio_concat
+            # 5. BGM 믹싱 (옵션) - 씬별 BGM 변경 지원
+            bgm_mood = video_effects.get('bgm_mood', '')
+            scene_bgm_changes = video_effects.get('scene_bgm_changes', [])
+            if bgm_mood:
+                _update_job_status(job_id, progress=95, message='BGM 믹싱 중...')
+                bgm_output_path = os.path.join(work_dir, "with_bgm.mp4")
 
-        cmd = [
-            "ffmpeg", "-y",
-            *input_args,
-            "-filter_complex", filter_complex,
-            "-map", "[outv]", "-map", "[outa]",
-            "-c:v", "libx264", "-preset", "fast",
-            "-c:a", "aac", "-b:a", "128k",
-            output_path
-        ]
+                # 씬별 BGM 변경이 있으면 새로운 함수 사용
+                if scene_bgm_changes:
+                    print(f"[VIDEO-WORKER] 씬별 BGM 믹싱 시작 (변경 {len(scene_bgm_changes)}회)")
+                    if _mix_scene_bgm_with_video(final_path, scenes, video_effects, bgm_output_path):
+                        final_path = bgm_output_path
+                        print(f"[VIDEO-WORKER] 씬별 BGM 믹싱 완료")
+                    else:
+                        print(f"[VIDEO-WORKER] 씬별 BGM 믹싱 실패, BGM 없이 진행")
+                else:
+                    # 기존 방식: 전체 영상에 하나의 BGM
+                    bgm_file = _get_bgm_file(bgm_mood)
+                    if bgm_file:
+                        if _mix_bgm_with_video(final_path, bgm_file, bgm_output_path):
+                            final_path = bgm_output_path
+                            print(f"[VIDEO-WORKER] BGM 믹싱 완료: {bgm_mood}")
+                        else:
+                            print(f"[VIDEO-WORKER] BGM 믹싱 실패, BGM 없이 진행")
+                    else:
+                        print(f"[VIDEO-WORKER] BGM 파일 없음: {bgm_mood}")
 
-        print(f"[TRANSITIONS] {transition_style} 효과 적용 중 ({n}개 클립)...")
-        result = subprocess.run(cmd, stdout=subprocess.DEVNULL,
-                               stderr=subprocess.PIPE, timeout=600)
+            # 6. 효과음 믹싱 (옵션)
+            sound_effects = video_effects.get('sound_effects', [])
+            if sound_effects:
+                _update_job_status(job_id, progress=96, message='효과음 추가 중...')
+                sfx_output_path = os.path.join(work_dir, "with_sfx.mp4")
+                if _mix_sfx_into_video(final_path, sound_effects, scenes, sfx_output_path):
+                    final_path = sfx_output_path
+                    print(f"[VIDEO-WORKER] 효과음 {len(sound_effects)}개 추가 완료")
+                else:
+                    print(f"[VIDEO-WORKER] 효과음 믹싱 실패, 효과음 없이 진행")
 
-        if result.returncode == 0:
-            print(f"[TRANSITIONS] 전환 효과 적용 완료")
-            return True
-        else:
-            stderr = result.stderr.decode('utf-8', errors='ignore')[:300]
-            print(f"[TRANSITIONS] 실패: {stderr}")
-            # 실패 시 단순 concat으로 폴백
-            print(f"[TRANSITIONS] 단순 concat으로 폴백...")
-            return _apply_transitions(clip_paths, output_path, "none", 0)
+            # 7. 아웃트로 추가 (옵션)
+            add_outro = video_effects.get('add_outro', True)  # 기본값: 추가
+            if add_outro:
+                _update_job_status(job_id, progress=98, message='아웃트로 추가 중...')
+                outro_path = os.path.join(work_dir, "outro.mp4")
+                if _generate_outro_video(outro_path, duration=5, fonts_dir=fonts_dir):
+                    outro_output_path = os.path.join(work_dir, "with_outro.mp4")
+                    if _append_outro_to_video(final_path, outro_path, outro_output_path):
+                        final_path = outro_output_path
+                        print(f"[VIDEO-WORKER] 아웃트로 추가 완료")
+                    else:
+                        print(f"[VIDEO-WORKER] 아웃트로 연결 실패, 아웃트로 없이 진행")
+                else:
+                    print(f"[VIDEO-WORKER] 아웃트로 생성 실패")
+
+            # 8. 결과 저장
+            output_filename = f"video_{session_id}.mp4"
+            output_path = os.path.join(upload_dir, output_filename)
+            shutil.copy(final_path, output_path)
+
+            # 작업 디렉토리 정리
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+            minutes = int(current_time // 60)
+            seconds = int(current_time % 60)
+
+            _update_job_status(job_id,
+                status='completed',
+                progress=100,
+                message='완료!',
+                video_url=f"/uploads/{output_filename}",
+                duration=f"{minutes}분 {seconds}초",
+                subtitle_count=len(all_subtitles)
+            )
+
+            print(f"[VIDEO-WORKER] Completed: {output_path}")
+
+        except Exception as e:
+            shutil.rmtree(work_dir, ignore_errors=True)
+            raise e
 
     except Exception as e:
-        print(f"[TRANSITIONS] 오류: {e}")
+        print(f"[VIDEO-WORKER] Error: {e}")
         import traceback
         traceback.print_exc()
-        return False
+        _update_job_status(job_id, status='failed', error=str(e), message=f'오류: {str(e)}')
+    finally:
+        # 세마포어 해제 (다음 FFmpeg 작업 허용)
+        ffmpeg_semaphore.release()
+        print(f"[VIDEO-WORKER] FFmpeg 세마포어 해제됨")
 
 
-def _upload_youtube_captions(video_id, srt_path, language="ko", credentials=None):
-    """YouTube에 자막 파일(.srt) 업로드
+@app.route('/api/image/generate-video', methods=['POST'])
+def api_image_generate_video():
+    """영상 생성 시작 (백그라운드) - job_id 반환"""
+    import threading
+    import uuid as uuid_module
+    from datetime import datetime
 
-    Args:
-        video_id: YouTube 비디오 ID
-        srt_path: SRT 자막 파일 경로
-        language: 자막 언어 코드 (ko, en, ja 등)
-        credentials: Google OAuth 자격 증명
+    data = request.get_json()
+    session_id = data.get('session_id', str(uuid_module.uuid4())[:8])
+    scenes = data.get('scenes', [])
+    detected_lang = data.get('language', 'en')
+    video_effects = data.get('video_effects', {})  # 새 기능: BGM, 효과음, 자막 강조, Ken Burns 등
+    clip_dir = data.get('clip_dir')  # 자동화 파이프라인이 씬별로 미리 인코딩한 클립 폴더
 
-    Returns:
-        성공 여부 (bool)
-    """
-    try:
-        from googleapiclient.discovery import build
-        from googleapiclient.http import MediaFileUpload
+    if not scenes:
+        return jsonify({"ok": False, "error": "씬 데이터가 없습니다"}), 400
 
-        if not credentials:
-            print(f"[CAPTIONS] 자격 증명 없음")
-            return False
+    prebuilt_clips = None
+    if clip_dir:
+        # uploads/ 아래 폴더만 허용, 클립 파일명은 _create_scene_clip_worker 규칙 (clip_000.mp4)
+        clip_dir = os.path.normpath(clip_dir)
+        if os.path.commonpath([os.path.abspath(clip_dir), os.path.abspath("uploads")]) != os.path.abspath("uploads"):
+            return jsonify({"ok": False, "error": "잘못된 clip_dir"}), 400
+        prebuilt_clips = {}
+        for idx in range(len(scenes)):
+            clip_path = os.path.join(clip_dir, f"clip_{idx:03d}.mp4")
+            if os.path.exists(clip_path):
+                prebuilt_clips[idx] = clip_path
 
-        if not os.path.exists(srt_path):
-            print(f"[CAPTIONS] 자막 파일 없음: {srt_path}")
-            return False
+    total_duration = sum(s.get('duration', 0) for s in scenes)
+    job_id = f"vj_{uuid_module.uuid4().hex[:12]}"
 
-        youtube = build('youtube', 'v3', credentials=credentials)
+    # 작업 상태 초기화 (파일 기반)
+    _save_job_status(job_id, {
+        'status': 'queued',
+        'progress': 0,
+        'message': '대기 중...',
+        'video_url': None,
+        'error': None,
+        'duration': None,
+        'subtitle_count': 0,
+        'created_at': datetime.now().isoformat(),
+        'total_duration': total_duration
+    })
 
-        # 자막 삽입 요청
-        caption_body = {
-            "snippet": {
-                "videoId": video_id,
-                "language": language,
-                "name": "Korean" if language == "ko" else language.upper(),
-                "isDraft": False
-            }
-        }
+    # 백그라운드 스레드 시작
+    thread = threading.Thread(
+        target=_generate_video_worker,
+        args=(job_id, session_id, scenes, detected_lang, video_effects, prebuilt_clips),
+        daemon=True
+    )
+    thread.start()
 
-        media = MediaFileUpload(srt_path, mimetype='application/x-subrip', resumable=True)
+    print(f"[IMAGE-VIDEO] Job started: {job_id}, {len(scenes)} scenes, {total_duration:.1f}s")
 
-        request = youtube.captions().insert(
-            part="snippet",
-            body=caption_body,
-            media_body=media
-        )
+    return jsonify({
+        "ok": True,
+        "job_id": job_id,
+        "message": "영상 생성이 시작되었습니다. 상태를 확인해주세요.",
+        "estimated_time": f"{int(total_duration // 60)}분 {int(total_duration % 60)}초 예상"
+    })
 
-        response = None
-        while response is None:
-            status, response = request.next_chunk()
-            if status:
-                print(f"[CAPTIONS] 업로드 진행률: {int(status.progress() * 100)}%")
 
-        print(f"[CAPTIONS] 자막 업로드 완료: {response.get('id')}")
-        return True
+@app.route('/api/image/video-status/<job_id>', methods=['GET'])
+def api_image_video_status(job_id):
+    """영상 생성 작업 상태 확인 (파일 기반)"""
+    job = _load_job_status(job_id)
+    if not job:
+        return jsonify({"ok": False, "error": "작업을 찾을 수 없습니다"}), 404
 
-    except Exception as e:
-        print(f"[CAPTIONS] 업로드 오류: {e}")
-        import traceback
-        traceback.print_exc()
-        return False
+    return jsonify({
+        "ok": True,
+        "job_id": job_id,
+        "status": job.get('status', 'unknown'),
+        "progress": job.get('progress', 0),
+        "message": job.get('message', ''),
+        "video_url": job.get('video_url'),
+        "duration": job.get('duration'),
+        "subtitle_count": job.get('subtitle_count', 0),
+        "error": job.get('error')
+    })
 
 
-def _get_ken_burns_filter(effect_type, duration, fps=24, output_size="1280x720"):
-    """Ken Burns 효과용 zoompan 필터 생성 - 부드러운 sin/cos 모션
+# ===== 썸네일 자동 생성 API =====
 
-    Args:
-        effect_type: zoom_in, zoom_out, pan_left, pan_right, pan_up, pan_down
-        duration: 클립 길이 (초)
-        fps: 프레임 레이트
-        output_size: 출력 해상도
-
-    Returns:
-        FFmpeg vf filter string (scale + zoompan + fade)
-    """
-    total_frames = int(duration * fps)
-    w, h = map(int, output_size.split('x'))
-
-    # 부드러운 움직임을 위한 설정
-    # 이미지를 크게 스케일해서 패닝/줌 시 검정 테두리 방지
-    scale_w = int(w * 1.4)  # 40% 더 크게
-    scale_h = int(h * 1.4)
-
-    fade_in = min(0.5, duration * 0.1)  # 페이드인 (최대 0.5초)
-    fade_out = min(0.5, duration * 0.1)  # 페이드아웃 (최대 0.5초)
-    fade_out_start = max(0, duration - fade_out)
-
-    # 각 효과별 설정 (sin/cos로 매우 부드러운 움직임)
-    # on: 현재 프레임 번호, total_frames: 전체 프레임 수
-    # ★ 느린 움직임: sin/cos 주기 2배, 움직임 범위 1/2
-    if effect_type == 'zoom_in':
-        # 천천히 줌인 + 아주 미세한 패닝
-        zoom_expr = f"1.0+0.08*on/{total_frames}"  # 1.0 → 1.08로 (더 작은 줌)
-        x_expr = f"(iw-{w})/2+8*sin(on/120)"  # 좌우 아주 미세 (주기 120)
-        y_expr = f"(ih-{h})/2+6*cos(on/150)"  # 상하 아주 미세 (주기 150)
-    elif effect_type == 'zoom_out':
-        # 천천히 줌아웃 + 아주 미세한 패닝
-        zoom_expr = f"1.08-0.08*on/{total_frames}"  # 1.08 → 1.0으로
-        x_expr = f"(iw-{w})/2-8*sin(on/120)"
-        y_expr = f"(ih-{h})/2-6*cos(on/150)"
-    elif effect_type == 'pan_left':
-        # 오른쪽에서 왼쪽으로 아주 천천히 패닝
-        zoom_expr = "1.03"  # 줌 거의 없음
-        x_expr = f"(iw-{w})*0.6*(1-on/{total_frames})+5*sin(on/100)"  # 부드러운 패닝
-        y_expr = f"(ih-{h})/2+4*cos(on/140)"
-    elif effect_type == 'pan_right':
-        # 왼쪽에서 오른쪽으로 아주 천천히 패닝
-        zoom_expr = "1.03"
-        x_expr = f"(iw-{w})*0.4+(iw-{w})*0.2*on/{total_frames}+5*sin(on/100)"
-        y_expr = f"(ih-{h})/2+4*cos(on/140)"
-    elif effect_type == 'pan_up':
-        # 아래에서 위로 아주 천천히 패닝
-        zoom_expr = "1.03"
-        x_expr = f"(iw-{w})/2+5*sin(on/120)"
-        y_expr = f"(ih-{h})*0.6*(1-on/{total_frames})+4*cos(on/100)"
-    elif effect_type == 'pan_down':
-        # 위에서 아래로 아주 천천히 패닝
-        zoom_expr = "1.03"
-        x_expr = f"(iw-{w})/2+5*sin(on/120)"
-        y_expr = f"(ih-{h})*0.4+(ih-{h})*0.2*on/{total_frames}+4*cos(on/100)"
-    else:
-        # 기본: 줌인 + 아주 미세한 움직임
-        zoom_expr = f"1.0+0.08*on/{total_frames}"
-        x_expr = f"(iw-{w})/2+8*sin(on/120)"
-        y_expr = f"(ih-{h})/2+6*cos(on/150)"
-
-    # 필터 체인: scale(크게) → zoompan(부드러운 움직임) → fade(페이드인/아웃)
-    vf_filter = (
-        f"scale={scale_w}:{scale_h}:force_original_aspect_ratio=increase,"
-        f"crop={scale_w}:{scale_h},"
-        f"zoompan=z='{zoom_expr}':x='{x_expr}':y='{y_expr}':d={total_frames}:s={output_size}:fps={fps},"
-        f"fade=t=in:st=0:d={fade_in},fade=t=out:st={fade_out_start}:d={fade_out}"
-    )
-
-    return vf_filter
-
-
-def _create_scene_clip_worker(task):
-    """
-    단일 씬의 클립을 생성하는 헬퍼 함수 (ThreadPoolExecutor용)
-    병렬 처리 시 각 워커에서 독립적으로 실행됨
-    """
-    import subprocess
-    import shutil
-    import urllib.request
-    import gc
-
-    idx, scene, work_dir, total_scenes = task
-
-    image_url = scene.get('image_url', '')
-    audio_url = scene.get('audio_url', '')
-    duration = scene.get('duration', 5.0)
-
-    print(f"[VIDEO-WORKER-PARALLEL] 씬 {idx+1}/{total_scenes} 처리 시작...")
-
-    if not image_url:
-        print(f"[VIDEO-WORKER-PARALLEL] 씬 {idx+1} 스킵 - 이미지 URL 없음")
-        return idx, None, duration
-
-    # 이미지 다운로드
-    img_path = os.path.join(work_dir, f"scene_{idx:03d}.jpg")
-    try:
-        if image_url.startswith('http'):
-            req = urllib.request.Request(image_url, headers={'User-Agent': 'Mozilla/5.0'})
-            with urllib.request.urlopen(req, timeout=30) as response:
-                with open(img_path, 'wb') as f:
-                    f.write(response.read())
-        elif image_url.startswith('/'):
-            local_path = image_url.lstrip('/')
-            if os.path.exists(local_path):
-                shutil.copy(local_path, img_path)
-            else:
-                print(f"[VIDEO-WORKER-PARALLEL] 씬 {idx+1} 로컬 이미지 없음: {local_path}")
-                return idx, None, duration
-        else:
-            # 로컬 경로 (/ 없이 시작하는 경우, 예: uploads/xxx/image.png)
-            if os.path.exists(image_url):
-                shutil.copy(image_url, img_path)
-            else:
-                print(f"[VIDEO-WORKER-PARALLEL] 씬 {idx+1} 로컬 이미지 없음: {image_url}")
-                return idx, None, duration
-    except Exception as e:
-        print(f"[VIDEO-WORKER-PARALLEL] 씬 {idx+1} 이미지 다운로드 실패: {e}")
-        return idx, None, duration
-
-    if not os.path.exists(img_path):
-        return idx, None, duration
-
-    # 오디오 다운로드
-    audio_path = None
-    if audio_url:
-        audio_path = os.path.join(work_dir, f"audio_{idx:03d}.mp3")
-        try:
-            if audio_url.startswith('http'):
-                req = urllib.request.Request(audio_url, headers={'User-Agent': 'Mozilla/5.0'})
-                with urllib.request.urlopen(req, timeout=30) as response:
-                    with open(audio_path, 'wb') as f:
-                        f.write(response.read())
-            elif audio_url.startswith('/'):
-                local_path = audio_url.lstrip('/')
-                if os.path.exists(local_path):
-                    shutil.copy(local_path, audio_path)
-            else:
-                # 로컬 경로 (/ 없이 시작하는 경우)
-                if os.path.exists(audio_url):
-                    shutil.copy(audio_url, audio_path)
-        except Exception as e:
-            print(f"[VIDEO-WORKER-PARALLEL] 씬 {idx+1} 오디오 다운로드 실패: {e}")
-            audio_path = None
-
-    # Ken Burns 효과 (씬별로 다양한 효과 자동 배정)
-    ken_burns_effect = scene.get('ken_burns', None)
-    if not ken_burns_effect:
-        effects_cycle = ['zoom_in', 'pan_right', 'zoom_out', 'pan_left', 'zoom_in', 'pan_up']
-        ken_burns_effect = effects_cycle[idx % len(effects_cycle)]
-
-    ken_burns_filter = _get_ken_burns_filter(ken_burns_effect, duration)
-
-    # 씬 클립 생성
-    clip_path = os.path.join(work_dir, f"clip_{idx:03d}.mp4")
-    if audio_path and os.path.exists(audio_path):
-        cmd = [
-            "ffmpeg", "-y",
-            "-loop", "1",
-            "-framerate", "24",
-            "-i", img_path,
-            "-i", audio_path,
-            "-vf", ken_burns_filter,
-            "-c:v", "libx264", "-preset", "fast",
-            "-c:a", "aac", "-b:a", "128k", "-ar", "44100",
-            "-pix_fmt", "yuv420p",
-            "-shortest", "-t", str(duration),
-            clip_path
-        ]
-    else:
-        cmd = [
-            "ffmpeg", "-y",
-            "-loop", "1",
-            "-framerate", "24",
-            "-i", img_path,
-            "-f", "lavfi", "-i", "anullsrc=r=44100:cl=stereo",
-            "-vf", ken_burns_filter,
-            "-c:v", "libx264", "-preset", "fast",
-            "-c:a", "aac", "-b:a", "128k", "-ar", "44100",
-            "-pix_fmt", "yuv420p",
-            "-t", str(duration), "-shortest",
-            clip_path
-        ]
-
-    result = subprocess.run(
-        cmd,
-        stdout=subprocess.DEVNULL,
-        stderr=subprocess.PIPE,
-        timeout=600
-    )
-
-    if result.returncode == 0 and os.path.exists(clip_path):
-        print(f"[VIDEO-WORKER-PARALLEL] 씬 {idx+1} 완료: {duration:.1f}초")
-        del result
-        gc.collect()
-        return idx, clip_path, duration
-
-    # Ken Burns 실패 시 단순 방식으로 재시도
-    stderr_msg = result.stderr.decode('utf-8', errors='ignore')[:300] if result.stderr else ''
-    print(f"[VIDEO-WORKER-PARALLEL] 씬 {idx+1} Ken Burns 실패, 단순 방식 재시도: {stderr_msg}")
-    del result
-    gc.collect()
-
-    simple_filter = "scale=1280:720:force_original_aspect_ratio=decrease,pad=1280:720:(ow-iw)/2:(oh-ih)/2"
-    if audio_path and os.path.exists(audio_path):
-        fallback_cmd = [
-            "ffmpeg", "-y",
-            "-loop", "1",
-            "-i", img_path,
-            "-i", audio_path,
-            "-vf", simple_filter,
-            "-c:v", "libx264", "-preset", "fast",
-            "-c:a", "aac", "-b:a", "128k", "-ar", "44100",
-            "-pix_fmt", "yuv420p",
-            "-shortest", "-t", str(duration),
-            clip_path
-        ]
-    else:
-        fallback_cmd = [
-            "ffmpeg", "-y",
-            "-loop", "1",
-            "-i", img_path,
-            "-f", "lavfi", "-i", "anullsrc=r=44100:cl=stereo",
-            "-vf", simple_filter,
-            "-c:v", "libx264", "-preset", "fast",
-            "-c:a", "aac", "-b:a", "128k", "-ar", "44100",
-            "-pix_fmt", "yuv420p",
-            "-t", str(duration), "-shortest",
-            clip_path
-        ]
-
-    fallback_result = subprocess.run(
-        fallback_cmd,
-        stdout=subprocess.DEVNULL,
-        stderr=subprocess.PIPE,
-        timeout=600
-    )
-
-    if fallback_result.returncode == 0 and os.path.exists(clip_path):
-        print(f"[VIDEO-WORKER-PARALLEL] 씬 {idx+1} 단순 방식 성공: {duration:.1f}초")
-        del fallback_result
-        gc.collect()
-        return idx, clip_path, duration
-
-    print(f"[VIDEO-WORKER-PARALLEL] 씬 {idx+1} 최종 실패")
-    del fallback_result
-    gc.collect()
-    return idx, None, duration
-
-
-def _generate_video_worker(job_id, session_id, scenes, detected_lang, video_effects=None):
-    """백그라운드 영상 생성 워커
-
-    video_effects 구조:
-    {
-        "bgm_mood": "calm/cinematic/comedic/dramatic/epic/hopeful/horror/mysterious/nostalgic/sad/tense/upbeat",
-        "subtitle_highlights": [{"keyword": "단어", "color": "#FF0000"}],
-        "sound_effects": [{"scene": 1, "type": "impact", "moment": "..."}],
-        "lower_thirds": [{"scene": 2, "text": "출처", "position": "bottom-left"}]
-    }
-    """
-    import subprocess
-    import shutil
-    import urllib.request
-    import gc  # 메모리 정리용
-
-    if video_effects is None:
-        video_effects = {}
-
-    # FFmpeg 세마포어 획득 (다른 FFmpeg 작업과 동시 실행 방지 - 메모리 보호)
-    print(f"[VIDEO-WORKER] FFmpeg 세마포어 대기 중...")
-    ffmpeg_semaphore.acquire()
-    print(f"[VIDEO-WORKER] FFmpeg 세마포어 획득, 영상 생성 시작...")
-
-    try:
-        _update_job_status(job_id, status='processing', message='영상 생성 시작...')
-
-        # === video_effects 디버그 로깅 ===
-        print(f"[VIDEO-WORKER] ========== VIDEO EFFECTS 설정 ==========")
-        print(f"[VIDEO-WORKER] bgm_mood: {video_effects.get('bgm_mood', '(없음)')}")
-        print(f"[VIDEO-WORKER] subtitle_highlights: {len(video_effects.get('subtitle_highlights', []))}개")
-        print(f"[VIDEO-WORKER] screen_overlays: {len(video_effects.get('screen_overlays', []))}개")
-        print(f"[VIDEO-WORKER] sound_effects: {len(video_effects.get('sound_effects', []))}개")
-        print(f"[VIDEO-WORKER] lower_thirds: {len(video_effects.get('lower_thirds', []))}개")
-        print(f"[VIDEO-WORKER] news_ticker enabled: {video_effects.get('news_ticker', {}).get('enabled', False)}")
-        print(f"[VIDEO-WORKER] shorts highlight_scenes: {video_effects.get('shorts', {}).get('highlight_scenes', [])}")
-        print(f"[VIDEO-WORKER] transitions style: {video_effects.get('transitions', {}).get('style', 'none')}")
-        print(f"[VIDEO-WORKER] add_outro: {video_effects.get('add_outro', True)}")
-        print(f"[VIDEO-WORKER] ============================================")
-
-        total_scenes = len(scenes)
-        upload_dir = "uploads"
-        os.makedirs(upload_dir, exist_ok=True)
-
-        # 작업 디렉토리 생성 (tempfile 대신 직접 관리)
-        work_dir = os.path.join(upload_dir, f"work_{job_id}")
-        os.makedirs(work_dir, exist_ok=True)
-
-        try:
-            scene_videos = []
-            all_subtitles = []
-            current_time = 0.0
-
-            # 환경변수로 병렬 처리 워커 수 설정 (기본값: 1 = 순차 처리)
-            # Render Pro (4GB) 환경에서는 2로 설정 권장
-            parallel_workers = int(os.environ.get('VIDEO_PARALLEL_WORKERS', 1))
-
-            # 1. 각 씬별 영상 클립 생성
-            if parallel_workers > 1:
-                # ========== 병렬 처리 모드 ==========
-                from concurrent.futures import ThreadPoolExecutor, as_completed
-
-                print(f"[VIDEO-WORKER-PARALLEL] 병렬 처리 시작 - {total_scenes}개 씬, {parallel_workers}개 워커")
-                _update_job_status(job_id, progress=5, message=f'병렬 처리 시작 ({parallel_workers}개 워커)...')
-
-                tasks = [(idx, scene, work_dir, total_scenes) for idx, scene in enumerate(scenes)]
-                results = [None] * total_scenes  # 순서 유지를 위한 리스트
-
-                with ThreadPoolExecutor(max_workers=parallel_workers) as executor:
-                    future_to_idx = {executor.submit(_create_scene_clip_worker, task): task[0] for task in tasks}
-                    completed = 0
-
-                    for future in as_completed(future_to_idx):
-                        idx = future_to_idx[future]
-                        completed += 1
-                        progress = int((completed / total_scenes) * 70)
-                        _update_job_status(job_id, progress=progress, message=f'씬 {completed}/{total_scenes} 클립 생성 중...')
-
-                        try:
-                            result_idx, clip_path, duration = future.result()
-                            results[idx] = (clip_path, duration)
-                        except Exception as e:
-                            print(f"[VIDEO-WORKER-PARALLEL] 씬 {idx+1} 오류: {e}")
-                            results[idx] = (None, scenes[idx].get('duration', 5.0))
-
-                # 결과 정리 (순서대로) + 자막 시간 계산
-                for idx, (clip_path, duration) in enumerate(results):
-                    if clip_path and os.path.exists(clip_path):
-                        scene_videos.append(clip_path)
-
-                    # 자막 시간 조정 (순차적으로)
-                    subtitles = scenes[idx].get('subtitles', [])
-                    for sub in subtitles:
-                        all_subtitles.append({
-                            'start': current_time + sub.get('start', 0),
-                            'end': current_time + sub.get('end', duration),
-                            'text': sub.get('text', '')
-                        })
-                    current_time += duration
-
-                gc.collect()
-                print(f"[VIDEO-WORKER-PARALLEL] 병렬 처리 완료 - 성공: {len(scene_videos)}/{total_scenes}")
-
-            else:
-                # ========== 순차 처리 모드 (기본값 - 메모리 절약) ==========
-                print(f"[VIDEO-WORKER-SEQUENTIAL] 순차 처리 시작 - {total_scenes}개 씬 (메모리 절약 모드)")
-
-                for idx, scene in enumerate(scenes):
-                    progress = int((idx / total_scenes) * 70)
-                    _update_job_status(job_id, progress=progress, message=f'씬 {idx + 1}/{total_scenes} 처리 중...')
-
-                    image_url = scene.get('image_url', '')
-                    audio_url = scene.get('audio_url', '')
-                    duration = scene.get('duration', 5.0)
-                    subtitles = scene.get('subtitles', [])
-
-                    print(f"[VIDEO-WORKER-SEQUENTIAL] Scene {idx + 1}: duration={duration:.2f}s")
-
-                    if not image_url:
-                        current_time += duration
-                        continue
-
-                    # 이미지 다운로드
-                    img_path = os.path.join(work_dir, f"scene_{idx:03d}.jpg")
-                    print(f"[VIDEO-WORKER-SEQUENTIAL] Scene {idx + 1} image_url: {image_url[:100]}...")
-                    try:
-                        if image_url.startswith('http'):
-                            req = urllib.request.Request(image_url, headers={'User-Agent': 'Mozilla/5.0'})
-                            with urllib.request.urlopen(req, timeout=30) as response:
-                                with open(img_path, 'wb') as f:
-                                    f.write(response.read())
-                        elif image_url.startswith('/'):
-                            local_path = image_url.lstrip('/')
-                            if os.path.exists(local_path):
-                                shutil.copy(local_path, img_path)
-                            else:
-                                print(f"[VIDEO-WORKER-SEQUENTIAL] Local image not found: {local_path}")
-                                current_time += duration
-                                continue
-                        else:
-                            # 로컬 경로 (/ 없이 시작하는 경우)
-                            if os.path.exists(image_url):
-                                shutil.copy(image_url, img_path)
-                            else:
-                                print(f"[VIDEO-WORKER-SEQUENTIAL] Local image not found: {image_url}")
-                                current_time += duration
-                                continue
-                    except Exception as e:
-                        print(f"[VIDEO-WORKER-SEQUENTIAL] Image download failed: {e}")
-                        current_time += duration
-                        continue
-
-                    # 이미지 파일 검증
-                    if not os.path.exists(img_path):
-                        print(f"[VIDEO-WORKER-SEQUENTIAL] Image file not created: {img_path}")
-                        current_time += duration
-                        continue
-                    img_size = os.path.getsize(img_path)
-                    print(f"[VIDEO-WORKER-SEQUENTIAL] Scene {idx + 1} image saved: {img_size} bytes")
-
-                    # 오디오 다운로드
-                    audio_path = None
-                    if audio_url:
-                        audio_path = os.path.join(work_dir, f"audio_{idx:03d}.mp3")
-                        try:
-                            if audio_url.startswith('http'):
-                                req = urllib.request.Request(audio_url, headers={'User-Agent': 'Mozilla/5.0'})
-                                with urllib.request.urlopen(req, timeout=30) as response:
-                                    with open(audio_path, 'wb') as f:
-                                        f.write(response.read())
-                            elif audio_url.startswith('/'):
-                                local_path = audio_url.lstrip('/')
-                                if os.path.exists(local_path):
-                                    shutil.copy(local_path, audio_path)
-                            else:
-                                # 로컬 경로 (/ 없이 시작하는 경우)
-                                if os.path.exists(audio_url):
-                                    shutil.copy(audio_url, audio_path)
-                        except Exception as e:
-                            print(f"[VIDEO-WORKER-SEQUENTIAL] Audio download failed: {e}")
-                            audio_path = None
-
-                    # 자막 시간 조정
-                    for sub in subtitles:
-                        all_subtitles.append({
-                            'start': current_time + sub.get('start', 0),
-                            'end': current_time + sub.get('end', duration),
-                            'text': sub.get('text', '')
-                        })
-                    current_time += duration
-
-                    # Ken Burns 효과 가져오기 (씬별로 다른 효과 적용)
-                    ken_burns_effect = scene.get('ken_burns', None)
-                    if not ken_burns_effect:
-                        # 씬별로 다양한 효과 자동 배정 (다이나믹한 영상을 위해)
-                        effects_cycle = ['zoom_in', 'pan_right', 'zoom_out', 'pan_left', 'zoom_in', 'pan_up']
-                        ken_burns_effect = effects_cycle[idx % len(effects_cycle)]
-
-                    ken_burns_filter = _get_ken_burns_filter(ken_burns_effect, duration)
-                    print(f"[VIDEO-WORKER-SEQUENTIAL] Scene {idx + 1} Ken Burns: {ken_burns_effect}")
-
-                    # 씬 클립 생성 (Ken Burns 효과 포함)
-                    clip_path = os.path.join(work_dir, f"clip_{idx:03d}.mp4")
-                    if audio_path and os.path.exists(audio_path):
-                        cmd = [
-                            "ffmpeg", "-y",
-                            "-loop", "1",
-                            "-framerate", "24",
-                            "-i", img_path,
-                            "-i", audio_path,
-                            "-vf", ken_burns_filter,
-                            "-c:v", "libx264", "-preset", "fast",
-                            "-c:a", "aac", "-b:a", "128k", "-ar", "44100",
-                            "-pix_fmt", "yuv420p",
-                            "-shortest", "-t", str(duration),
-                            clip_path
-                        ]
-                    else:
-                        cmd = [
-                            "ffmpeg", "-y",
-                            "-loop", "1",
-                            "-framerate", "24",
-                            "-i", img_path,
-                            "-f", "lavfi", "-i", "anullsrc=r=44100:cl=stereo",
-                            "-vf", ken_burns_filter,
-                            "-c:v", "libx264", "-preset", "fast",
-                            "-c:a", "aac", "-b:a", "128k", "-ar", "44100",
-                            "-pix_fmt", "yuv420p",
-                            "-t", str(duration), "-shortest",
-                            clip_path
-                        ]
-
-                    # 메모리 최적화: stdout DEVNULL, stderr만 PIPE (OOM 방지)
-                    result = subprocess.run(
-                        cmd,
-                        stdout=subprocess.DEVNULL,
-                        stderr=subprocess.PIPE,
-                        timeout=600
-                    )
-                    if result.returncode == 0 and os.path.exists(clip_path):
-                        scene_videos.append(clip_path)
-                        print(f"[VIDEO-WORKER-SEQUENTIAL] Clip {idx+1} created successfully")
-                        del result
-                        gc.collect()
-                    else:
-                        stderr = result.stderr.decode('utf-8', errors='ignore')[:500] if result.stderr else 'no stderr'
-                        print(f"[VIDEO-WORKER-SEQUENTIAL] Clip {idx+1} FAILED: {stderr[:200]}")
-                        del result
-                        gc.collect()
-
-                        # Ken Burns 실패 시 단순 방식으로 재시도
-                        print(f"[VIDEO-WORKER-SEQUENTIAL] Clip {idx+1} 단순 방식으로 재시도...")
-                        simple_filter = "scale=1280:720:force_original_aspect_ratio=decrease,pad=1280:720:(ow-iw)/2:(oh-ih)/2"
-                        if audio_path and os.path.exists(audio_path):
-                            fallback_cmd = [
-                                "ffmpeg", "-y",
-                                "-loop", "1",
-                                "-i", img_path,
-                                "-i", audio_path,
-                                "-vf", simple_filter,
-                                "-c:v", "libx264", "-preset", "fast",
-                                "-c:a", "aac", "-b:a", "128k", "-ar", "44100",
-                                "-pix_fmt", "yuv420p",
-                                "-shortest", "-t", str(duration),
-                                clip_path
-                            ]
-                        else:
-                            fallback_cmd = [
-                                "ffmpeg", "-y",
-                                "-loop", "1",
-                                "-i", img_path,
-                                "-f", "lavfi", "-i", "anullsrc=r=44100:cl=stereo",
-                                "-vf", simple_filter,
-                                "-c:v", "libx264", "-preset", "fast",
-                                "-c:a", "aac", "-b:a", "128k", "-ar", "44100",
-                                "-pix_fmt", "yuv420p",
-                                "-t", str(duration), "-shortest",
-                                clip_path
-                            ]
-
-                        fallback_result = subprocess.run(
-                            fallback_cmd,
-                            stdout=subprocess.DEVNULL,
-                            stderr=subprocess.PIPE,
-                            timeout=600
-                        )
-                        if fallback_result.returncode == 0 and os.path.exists(clip_path):
-                            scene_videos.append(clip_path)
-                            print(f"[VIDEO-WORKER-SEQUENTIAL] Clip {idx+1} 단순 방식 성공")
-                        else:
-                            fallback_stderr = fallback_result.stderr.decode('utf-8', errors='ignore')[:300] if fallback_result.stderr else ''
-                            print(f"[VIDEO-WORKER-SEQUENTIAL] Clip {idx+1} 단순 방식도 실패: {fallback_stderr}")
-                        del fallback_result
-                        gc.collect()
-
-                print(f"[VIDEO-WORKER-SEQUENTIAL] 순차 처리 완료 - 성공: {len(scene_videos)}/{total_scenes}")
-
-            print(f"[VIDEO-WORKER] Total clips created: {len(scene_videos)} / {total_scenes}")
-
-            if not scene_videos:
-                raise Exception("영상 클립 생성 실패")
-
-            # 2. 클립 병합 (전환 효과 옵션)
-            _update_job_status(job_id, progress=75, message='클립 병합 중...')
-
-            merged_path = os.path.join(work_dir, "merged.mp4")
-
-            # 전환 효과 설정 확인
-            transitions_config = video_effects.get('transitions', {})
-            transition_style = transitions_config.get('style', 'none')  # 기본값: none (빠른 처리)
-            transition_duration = transitions_config.get('duration', 0.5)
-
-            if transition_style and transition_style != 'none' and len(scene_videos) > 1:
-                # 전환 효과 적용
-                print(f"[VIDEO-WORKER] 전환 효과 적용: {transition_style}, {transition_duration}초")
-                _update_job_status(job_id, progress=76, message=f'전환 효과 적용 중 ({transition_style})...')
-
-                if _apply_transitions(scene_videos, merged_path, transition_style, transition_duration):
-                    print(f"[VIDEO-WORKER] 전환 효과 적용 완료")
-                else:
-                    # 전환 효과 실패 시 단순 concat으로 폴백
-                    print(f"[VIDEO-WORKER] 전환 효과 실패, 단순 concat으로 폴백")
-                    transition_style = 'none'
-
-            if transition_style == 'none' or not os.path.exists(merged_path):
-                # 전환 효과 없이 단순 concat
-                concat_list = os.path.join(work_dir, "concat.txt")
-                with open(concat_list, 'w') as f:
-                    for clip in scene_videos:
-                        # 절대 경로 사용
-                        abs_clip = os.path.abspath(clip)
-                        f.write(f"file '{abs_clip}'\n")
-
-                print(f"[VIDEO-WORKER] Concat list created with {len(scene_videos)} clips")
-
-                # 클립 파일 존재 확인
-                for clip in scene_videos:
-                    if os.path.exists(clip):
-                        file_size = os.path.getsize(clip)
-                        print(f"[VIDEO-WORKER] Clip exists: {clip} ({file_size} bytes)")
-                    else:
-                        print(f"[VIDEO-WORKER] Clip MISSING: {clip}")
-
-                # IMPORTANT: stdout=DEVNULL, stderr=PIPE to avoid OOM from buffering all FFmpeg output
-                concat_result = subprocess.run(
-                    ["ffmpeg", "-y", "-f", "concat", "-safe", "0", "-i", concat_list, "-c", "copy", merged_path],
-                    stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, timeout=600
-                )
-
-                if concat_result.returncode != 0:
-                    stderr = concat_result.stderr.decode('utf-8', errors='ignore') if concat_result.stderr else ""
-                    print(f"[VIDEO-WORKER] Concat FAILED (code {concat_result.returncode}): {stderr[:500]}")
-                    del concat_result
-                    gc.collect()
-                    raise Exception(f"클립 병합 실패: {stderr[:200]}")
-
-                del concat_result
-                gc.collect()
-
-            if not os.path.exists(merged_path):
-                raise Exception("merged.mp4 파일이 생성되지 않음")
-
-            # 3. ASS 자막 생성 (색상 강조 지원)
-            _update_job_status(job_id, progress=85, message='자막 처리 중...')
-
-            # 자막 강조 키워드 가져오기
-            subtitle_highlights = video_effects.get('subtitle_highlights', [])
-            if subtitle_highlights:
-                print(f"[VIDEO-WORKER] 자막 강조 키워드: {[h.get('keyword') for h in subtitle_highlights]}")
-                print(f"[VIDEO-WORKER] 자막 강조 색상: {[h.get('color') for h in subtitle_highlights]}")
-            else:
-                print(f"[VIDEO-WORKER] ⚠️ 자막 강조 키워드 없음 - GPT가 subtitle_highlights를 생성하지 않음")
-
-            # ASS 형식 사용 (색상 강조 지원)
-            ass_path = os.path.join(work_dir, "subtitles.ass")
-            _generate_ass_subtitles(all_subtitles, subtitle_highlights, ass_path, lang=detected_lang)
-
-            # 4. 자막 burn-in + 화면 텍스트 오버레이
-            _update_job_status(job_id, progress=90, message='자막 및 효과 삽입 중...')
-
-            final_path = os.path.join(work_dir, "final.mp4")
-
-            # 폰트 디렉토리 절대 경로 설정 (스크립트 위치 기준)
-            script_dir = os.path.dirname(os.path.abspath(__file__))
-            fonts_dir = os.path.join(script_dir, "fonts")
-            print(f"[VIDEO-WORKER] 폰트 디렉토리: {fonts_dir}, 존재: {os.path.exists(fonts_dir)}")
-
-            # ASS 파일 절대 경로로 변환하고 FFmpeg용 이스케이프
-            ass_abs_path = os.path.abspath(ass_path)
-            # FFmpeg subtitle filter는 : \ ' 등을 이스케이프해야 함
-            ass_escaped = ass_abs_path.replace('\\', '/').replace(':', '\\:')
-            fonts_escaped = fonts_dir.replace('\\', '/').replace(':', '\\:')
-
-            # 기본 자막 필터 (ASS 형식은 force_style 불필요 - 파일에 스타일 포함)
-            vf_filter = f"ass={ass_escaped}:fontsdir={fonts_escaped}"
-
-            # ★ VRCS 2.0: screen_overlays, lower_thirds, news_ticker 비활성화
-            # 정보 전달 효과가 낮고 화면을 어지럽힘
-            # screen_overlays = video_effects.get('screen_overlays', [])  # 비활성화
-            # lower_thirds = video_effects.get('lower_thirds', [])  # 비활성화
-            # news_ticker = video_effects.get('news_ticker', {})  # 비활성화
-            print(f"[VIDEO-WORKER] VRCS 2.0: screen_overlays, lower_thirds, news_ticker 비활성화됨")
-
-            print(f"[VIDEO-WORKER] ASS path: {ass_abs_path}")
-            print(f"[VIDEO-WORKER] VF filter 길이: {len(vf_filter)} chars")
-            print(f"[VIDEO-WORKER] VF filter (처음 500자): {vf_filter[:500]}")
-            print(f"[VIDEO-WORKER] Fonts directory: {fonts_dir}")
-
-            # IMPORTANT: stdout=DEVNULL, stderr=PIPE to avoid OOM from buffering FFmpeg output
-            # FFmpeg video encoding generates massive amounts of progress output to stderr
-            # YouTube 호환 설정: -profile:v high -level 4.0, AAC 오디오, +faststart
-            result = subprocess.run([
-                "ffmpeg", "-y", "-i", merged_path,
-                "-vf", vf_filter,
-                "-c:v", "libx264", "-preset", "fast", "-profile:v", "high", "-level", "4.0",
-                "-c:a", "aac", "-b:a", "128k", "-ar", "44100",
-                "-movflags", "+faststart",
-                final_path
-            ], stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, timeout=1800)  # 30분 타임아웃
-
-            if result.returncode != 0:
-                # stderr 전체에서 실제 에러 메시지 추출 (FFmpeg는 마지막에 에러 출력)
-                stderr_full = result.stderr.decode('utf-8', errors='ignore') if result.stderr else ""
-                # 마지막 800자 출력 (실제 에러 메시지 포함)
-                stderr_tail = stderr_full[-800:] if len(stderr_full) > 800 else stderr_full
-                print(f"[VIDEO-WORKER] Subtitle burn-in failed (code {result.returncode})")
-                print(f"[VIDEO-WORKER] stderr (마지막 800자): {stderr_tail}")
-
-                # 자막 burn-in 실패 시 자막 없이 YouTube 호환 인코딩 시도
-                print(f"[VIDEO-WORKER] 자막 없이 YouTube 호환 재인코딩 시도...")
-                fallback_result = subprocess.run([
-                    "ffmpeg", "-y", "-i", merged_path,
-                    "-c:v", "libx264", "-preset", "fast", "-profile:v", "high", "-level", "4.0",
-                    "-c:a", "aac", "-b:a", "128k", "-ar", "44100",
-                    "-movflags", "+faststart",
-                    final_path
-                ], stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, timeout=1800)
-
-                if fallback_result.returncode != 0:
-                    print(f"[VIDEO-WORKER] Fallback 인코딩도 실패, 원본 사용")
-                    final_path = merged_path
-                else:
-                    print(f"[VIDEO-WORKER] Fallback 인코딩 성공 (자막 없음)")
-
-            del result
-            gc.collect()
-
-            # 5. BGM 믹싱 (옵션) - 씬별 BGM 변경 지원
-            bgm_mood = video_effects.get('bgm_mood', '')
-            scene_bgm_changes = video_effects.get('scene_bgm_changes', [])
-            if bgm_mood:
-                _update_job_status(job_id, progress=95, message='BGM 믹싱 중...')
-                bgm_output_path = os.path.join(work_dir, "with_bgm.mp4")
-
-                # 씬별 BGM 변경이 있으면 새로운 함수 사용
-                if scene_bgm_changes:
-                    print(f"[VIDEO-WORKER] 씬별 BGM 믹싱 시작 (변경 {len(scene_bgm_changes)}회)")
-                    if _mix_scene_bgm_with_video(final_path, scenes, video_effects, bgm_output_path):
-                        final_path = bgm_output_path
-                        print(f"[VIDEO-WORKER] 씬별 BGM 믹싱 완료")
-                    else:
-                        print(f"[VIDEO-WORKER] 씬별 BGM 믹싱 실패, BGM 없이 진행")
-                else:
-                    # 기존 방식: 전체 영상에 하나의 BGM
-                    bgm_file = _get_bgm_file(bgm_mood)
-                    if bgm_file:
-                        if _mix_bgm_with_video(final_path, bgm_file, bgm_output_path):
-                            final_path = bgm_output_path
-                            print(f"[VIDEO-WORKER] BGM 믹싱 완료: {bgm_mood}")
-                        else:
-                            print(f"[VIDEO-WORKER] BGM 믹싱 실패, BGM 없이 진행")
-                    else:
-                        print(f"[VIDEO-WORKER] BGM 파일 없음: {bgm_mood}")
-
-            # 6. 효과음 믹싱 (옵션)
-            sound_effects = video_effects.get('sound_effects', [])
-            if sound_effects:
-                _update_job_status(job_id, progress=96, message='효과음 추가 중...')
-                sfx_output_path = os.path.join(work_dir, "with_sfx.mp4")
-                if _mix_sfx_into_video(final_path, sound_effects, scenes, sfx_output_path):
-                    final_path = sfx_output_path
-                    print(f"[VIDEO-WORKER] 효과음 {len(sound_effects)}개 추가 완료")
-                else:
-                    print(f"[VIDEO-WORKER] 효과음 믹싱 실패, 효과음 없이 진행")
-
-            # 7. 아웃트로 추가 (옵션)
-            add_outro = video_effects.get('add_outro', True)  # 기본값: 추가
-            if add_outro:
-                _update_job_status(job_id, progress=98, message='아웃트로 추가 중...')
-                outro_path = os.path.join(work_dir, "outro.mp4")
-                if _generate_outro_video(outro_path, duration=5, fonts_dir=fonts_dir):
-                    outro_output_path = os.path.join(work_dir, "with_outro.mp4")
-                    if _append_outro_to_video(final_path, outro_path, outro_output_path):
-                        final_path = outro_output_path
-                        print(f"[VIDEO-WORKER] 아웃트로 추가 완료")
-                    else:
-                        print(f"[VIDEO-WORKER] 아웃트로 연결 실패, 아웃트로 없이 진행")
-                else:
-                    print(f"[VIDEO-WORKER] 아웃트로 생성 실패")
-
-            # 8. 결과 저장
-            output_filename = f"video_{session_id}.mp4"
-            output_path = os.path.join(upload_dir, output_filename)
-            shutil.copy(final_path, output_path)
-
-            # 작업 디렉토리 정리
-            shutil.rmtree(work_dir, ignore_errors=True)
-
-            minutes = int(current_time // 60)
-            seconds = int(current_time % 60)
-
-            _update_job_status(job_id,
-                status='completed',
-                progress=100,
-                message='완료!',
-                video_url=f"/uploads/{output_filename}",
-                duration=f"{minutes}분 {seconds}초",
-                subtitle_count=len(all_subtitles)
-            )
-
-            print(f"[VIDEO-WORKER] Completed: {output_path}")
-
-        except Exception as e:
-            shutil.rmtree(work_dir, ignore_errors=True)
-            raise e
-
-    except Exception as e:
-        print(f"[VIDEO-WORKER] Error: {e}")
-        import traceback
-        traceback.print_exc()
-        _update_job_status(job_id, status='failed', error=str(e), message=f'오류: {str(e)}')
-    finally:
-        # 세마포어 해제 (다음 FFmpeg 작업 허용)
-        ffmpeg_semaphore.release()
-        print(f"[VIDEO-WORKER] FFmpeg 세마포어 해제됨")
-
-
-@app.route('/api/image/generate-video', methods=['POST'])
-def api_image_generate_video():
-    """영상 생성 시작 (백그라운드) - job_id 반환"""
-    import threading
-    import uuid as uuid_module
-    from datetime import datetime
-
-    data = request.get_json()
-    session_id = data.get('session_id', str(uuid_module.uuid4())[:8])
-    scenes = data.get('scenes', [])
-    detected_lang = data.get('language', 'en')
-    video_effects = data.get('video_effects', {})  # 새 기능: BGM, 효과음, 자막 강조, Ken Burns 등
-
-    if not scenes:
-        return jsonify({"ok": False, "error": "씬 데이터가 없습니다"}), 400
-
-    total_duration = sum(s.get('duration', 0) for s in scenes)
-    job_id = f"vj_{uuid_module.uuid4().hex[:12]}"
-
-    # 작업 상태 초기화 (파일 기반)
-    _save_job_status(job_id, {
-        'status': 'queued',
-        'progress': 0,
-        'message': '대기 중...',
-        'video_url': None,
-        'error': None,
-        'duration': None,
-        'subtitle_count': 0,
-        'created_at': datetime.now().isoformat(),
-        'total_duration': total_duration
-    })
-
-    # 백그라운드 스레드 시작
-    thread = threading.Thread(
-        target=_generate_video_worker,
-        args=(job_id, session_id, scenes, detected_lang, video_effects),
-        daemon=True
-    )
-    thread.start()
-
-    print(f"[IMAGE-VIDEO] Job started: {job_id}, {len(scenes)} scenes, {total_duration:.1f}s")
-
-    return jsonify({
-        "ok": True,
-        "job_id": job_id,
-        "message": "영상 생성이 시작되었습니다. 상태를 확인해주세요.",
-        "estimated_time": f"{int(total_duration // 60)}분 {int(total_duration % 60)}초 예상"
-    })
-
-
-@app.route('/api/image/video-status/<job_id>', methods=['GET'])
-def api_image_video_status(job_id):
-    """영상 생성 작업 상태 확인 (파일 기반)"""
-    job = _load_job_status(job_id)
-    if not job:
-        return jsonify({"ok": False, "error": "작업을 찾을 수 없습니다"}), 404
-
-    return jsonify({
-        "ok": True,
-        "job_id": job_id,
-        "status": job.get('status', 'unknown'),
-        "progress": job.get('progress', 0),
-        "message": job.get('message', ''),
-        "video_url": job.get('video_url'),
-        "duration": job.get('duration'),
-        "subtitle_count": job.get('subtitle_count', 0),
-        "error": job.get('error')
-    })
-
-
-# ===== 썸네일 자동 생성 API =====
-
-@app.route('/thumbnail')
-def thumbnail_page():
-    """썸네일 자동 생성 페이지"""
-    return render_template('thumbnail.html')
+@app.route('/thumbnail')
+def thumbnail_page():
+    """썸네일 자동 생성 페이지"""
+    return render_template('thumbnail.html')
 
 
 @app.route('/thumbnail-ai')
@@ -14602,1074 +13572,751 @@ THUMBNAIL_STYLE_PRESETS = {
     "vlog": {
         "name": "브이로그/일상",
         "description": "밝은 실제 사진, 진짜/처음/해봤다",
-        "audience": "general",
-        "colors": {
-            "background": "#FFFFFF",
-            "text": "#1A1A1A",
-            "accent": "#FF6B6B",
-            "outline": "#FFFFFF"
-        },
-        "font": {
-            "family": "NanumSquareRoundB",
-            "weight": "700",
-            "size": "68px",
-            "letter_spacing": "1px"
-        },
-        "layout": {
-            "position": "bottom-center",
-            "padding": "24px",
-            "text_box": True,
-            "text_box_opacity": 0.8
-        },
-        "image_style": "bright natural lighting, lifestyle photography, warm friendly atmosphere, authentic moment, clean background, empty space for text, YouTube thumbnail style, no text, 16:9"
-    },
-    "dramatic": {
-        "name": "드라마/감정폭발",
-        "description": "얼굴 클로즈업, 왜/몰랐다/그날",
-        "audience": "general",
-        "colors": {
-            "background": "#0D0D0D",
-            "text": "#FFFFFF",
-            "accent": "#FF4444",
-            "outline": "#000000"
-        },
-        "font": {
-            "family": "NanumSquareB",
-            "weight": "900",
-            "size": "88px",
-            "letter_spacing": "-2px"
-        },
-        "layout": {
-            "position": "center",
-            "padding": "20px",
-            "text_box": False,
-            "text_box_opacity": 0
-        },
-        "image_style": "extreme close-up face, intense emotion, dramatic side lighting, high contrast shadows, cinematic portrait, dark background, empty space for text, YouTube thumbnail style, no text, 16:9"
-    }
-}
-
-THUMBNAIL_DESIGN_SYSTEM_PROMPT = """You are an AI system that generates fully structured YouTube thumbnail design data
-based on a single scene description.
-You must follow the "Thumbnail JSON Schema v1".
-
-Your output must ALWAYS be a valid JSON that matches the "result" structure.
-Do not include explanations, plain text, or markdown — ONLY output JSON.
-
-====================
-PRIMARY OBJECTIVE
-====================
-
-Given a scene summary and metadata (audience type, channel type, style preference),
-generate:
-
-1) Thumbnail short text candidates (for Korean thumbnails)
-2) Emotion and intensity classification
-3) Style selection (auto if needed)
-4) Typography recommendation (font, weight, size hint)
-5) Layout suggestion (alignment, position, padding)
-6) Color palette suggestion (HEX codes)
-7) Image-generation prompt (for AI tools like ImageFX, DALL-E, Midjourney)
-8) Optional "notes" to guide background-only image creation
-
-====================
-AUDIENCE RULES
-====================
-
-If "audience": "senior":
-
-- Text length: 8–12 Korean characters
-- Use emotions: 회상, 후회, 그리움, 감사, 깨달음, 기다림
-- Avoid clickbait, avoid slang, avoid excessive punctuation
-- Preferred tones: nostalgia, calm, warm, old photo, clinic, family
-- Friendly and reflective titles
-- Recommended style keys:
-  - "nostalgia"
-  - "clinic_warm"
-  - "family_tearjerker"
-  - "calm_documentary"
-  - "dramatic_conflict"
-  - "newspaper_retro"
-- Colors: low contrast, pastel, film, vintage tones
-
-If "audience": "general":
-
-- Text length: 4–7 Korean characters
-- Use emotions: 긴장, 궁금, 분노, 위기, 충격
-- Clickbait allowed (but stay concise, clear, not abusive)
-- Preferred tones: dramatic, breaking_news, crime, tech, money
-- Recommended style keys:
-  - "breaking_news"
-  - "crime"
-  - "tech"
-  - "money"
-  - "vlog"
-  - "dramatic"
-- Colors: high contrast, red/yellow/black/white dominant
-
-====================
-TEXT GENERATION RULES
-====================
-
-- ONLY Korean text for "text" field
-- Character count must not exceed "max_length"
-- Avoid banned words included in "ban_words"
-- At least one candidate must focus on a clear emotional center
-- Do not generate English mixed headlines
-- NEVER include "유튜브", "클릭", "구독" words
-
-====================
-IMAGE PROMPT RULES
-====================
-
-Image-generation prompts must:
-
-- NOT contain text
-- NOT contain watermark
-- MUST describe background only (no title text rendered inside image)
-- MUST include clear space ("negative space") for text placement
-- ALWAYS include cinematic composition instruction
-- Format: 16:9, no characters unless silhouette is needed
-
-Senior image prompt guidance:
-- "soft light", "vintage photo", "nostalgic Korean street",
-- "film texture", "pastel tones", "calm spring morning",
-- "empty clinic entrance", "falling cherry blossoms"
-
-General image prompt guidance:
-- "high contrast dramatic lighting", "dark background",
-- "silhouette", "red warning light", "empty urban alley",
-- "strong color accent", "center composition", "sharp clarity"
-
-====================
-STYLE AUTO-SELECTION RULES
-====================
-
-If "style": "auto",
-choose style from the "recommended style keys" based on:
-
-- scene_summary keywords
-- audience type
-- channel_type
-
-Examples:
-- scene contains "first day, 진료소, 병원" → "clinic_warm"
-- scene contains "사건, 피해, 증거, 진실" → "crime"
-- scene contains "기억, 편지, 마지막" → "nostalgia"
-- scene contains "돈, 투자, 수익" → "money"
-- scene contains "기술, 방법, 해결" → "tech"
-- scene contains "가족, 부모, 엄마, 아빠" → "family_tearjerker"
-
-====================
-REQUIRED OUTPUT FORMAT (JSON only)
-====================
-
-The final output MUST be a JSON object shaped as:
-
-{
-  "scene_summary": "...",
-  "audience": "...",
-  "channel_type": "...",
-  "style_auto_selected": "...",
-  "candidates": [
-    {
-      "id": "thumb_001",
-      "text": "...",
-      "length": 7,
-      "audience": "...",
-      "emotion": "...",
-      "intensity": 0.7,
-      "style_profile": {
-        "style_key": "...",
-        "tone": "...",
-        "category": "..."
-      },
-      "design": {
-        "layout": {
-          "position": "bottom-left",
-          "text_box": true,
-          "padding": 32,
-          "max_lines": 2,
-          "alignment": "left"
-        },
+        "audience": "general",
         "colors": {
-          "background": "#F2E7D5",
-          "text": "#2B2B2B",
-          "accent": "#A67C52",
-          "suggested_palette": [
-            "#F2E7D5",
-            "#2B2B2B",
-            "#A67C52",
-            "#FFFFFF"
-          ]
+            "background": "#FFFFFF",
+            "text": "#1A1A1A",
+            "accent": "#FF6B6B",
+            "outline": "#FFFFFF"
         },
         "font": {
-          "family": "Noto Sans KR",
-          "weight": "900",
-          "size_hint": "72px",
-          "line_spacing": 1.1
-        }
-      },
-      "image_prompt": {
-        "prompt": "...(AI image-generation prompt)...",
-        "notes": "Background only for thumbnail. No text."
-      }
-    }
-  ]
-}
-
-====================
-VALIDATION RULES
-====================
-
-- ALWAYS return at least 3 candidates
-- NEVER leave any field empty
-- HEX codes must be valid (#RRGGBB)
-- "size_hint" must contain "px"
-- intensity value must be between 0.0 and 1.0
-
-====================
-OUTPUT LANGUAGE
-====================
-
-- Korean for "text"
-- English for "image_prompt"
-
-====================
-FAIL CASE INSTRUCTIONS
-====================
-
-If the request lacks "scene_summary", reply with:
-
-{
-  "error": "scene_summary is required"
-}
-
-NO free text, NO apology.
-
-====================
-END OF SYSTEM PROMPT
-====================
-"""
-
-@app.route('/api/thumbnail/generate', methods=['POST'])
-def api_thumbnail_generate():
-    """통합 썸네일 디자인 자동 생성 API v1 (스타일 + 디자인 + 이미지 프롬프트 포함)"""
-    try:
-        from openai import OpenAI
-        client = OpenAI()
-
-        data = request.get_json() or {}
-
-        # v1 스키마 파라미터
-        scene_summary = data.get("scene_summary", "")
-        audience = data.get("audience", "senior")  # senior / general
-        channel_type = data.get("channel_type", "drama")  # drama / issue / vlog / sermon / news
-        style = data.get("style", "auto")  # auto = AI가 자동 선택
-        num_candidates = data.get("num_candidates", 10)
-        max_length = data.get("max_length", 12 if audience == "senior" else 7)
-        language = data.get("language", "ko")
-        keywords = data.get("keywords", [])
-        ban_words = data.get("ban_words", ["구독", "유튜브", "클릭"])
-        options = data.get("options", {
-            "generate_layout": True,
-            "generate_palette": True,
-            "generate_image_prompt": True
-        })
-
-        if not scene_summary:
-            return jsonify({"ok": False, "error": "scene_summary is required"}), 400
-
-        # audience에 맞는 스타일만 필터링
-        available_styles = [
-            key for key, preset in THUMBNAIL_STYLE_PRESETS.items()
-            if preset.get("audience") == audience
-        ]
-
-        # 기본 스타일 (audience에 맞게)
-        default_style = "nostalgia" if audience == "senior" else "breaking_news"
-
-        user_payload = {
-            "scene_summary": scene_summary,
-            "audience": audience,
-            "channel_type": channel_type,
-            "style": style,
-            "available_styles": available_styles,
-            "num_candidates": num_candidates,
-            "max_length": max_length,
-            "language": language,
-            "keywords": keywords,
-            "ban_words": ban_words,
-            "options": options
-        }
-
-        print(f"[THUMBNAIL-DESIGN-V1] 통합 썸네일 생성 요청")
-        print(f"  - audience: {audience}, channel_type: {channel_type}, style: {style}")
-        print(f"  - available_styles: {available_styles}")
-
-        # GPT 호출
-        completion = client.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=[
-                {"role": "system", "content": THUMBNAIL_DESIGN_SYSTEM_PROMPT},
-                {"role": "user", "content": json.dumps(user_payload, ensure_ascii=False)}
-            ],
-            temperature=0.8,
-            response_format={"type": "json_object"}
-        )
-
-        result = completion.choices[0].message.content
-        result_json = json.loads(result)
-
-        # 에러 체크
-        if "error" in result_json:
-            return jsonify({"ok": False, "error": result_json["error"]}), 400
-
-        # 추천된 스타일 가져오기
-        style_auto_selected = result_json.get("style_auto_selected", default_style)
-        if style != "auto" and style in THUMBNAIL_STYLE_PRESETS:
-            style_auto_selected = style  # 사용자가 직접 지정한 경우
-
-        # 스타일이 audience에 맞는지 확인
-        if style_auto_selected not in available_styles:
-            style_auto_selected = default_style
-
-        style_preset = THUMBNAIL_STYLE_PRESETS.get(style_auto_selected, THUMBNAIL_STYLE_PRESETS[default_style])
-
-        # 각 후보에 디자인 정보 보강 (GPT 출력에 없는 경우 프리셋으로 대체)
-        candidates = result_json.get("candidates", [])
-        for i, c in enumerate(candidates):
-            c["id"] = c.get("id", f"thumb_{str(i+1).zfill(3)}")
-            c["length"] = len(c.get("text", ""))
-            c["audience"] = audience
-
-            # design 보강
-            if "design" not in c or not c["design"]:
-                c["design"] = {
-                    "layout": style_preset["layout"],
-                    "colors": style_preset["colors"],
-                    "font": style_preset["font"]
-                }
-            else:
-                # 부분적으로 누락된 경우 보강
-                if "layout" not in c["design"]:
-                    c["design"]["layout"] = style_preset["layout"]
-                if "colors" not in c["design"]:
-                    c["design"]["colors"] = style_preset["colors"]
-                if "font" not in c["design"]:
-                    c["design"]["font"] = style_preset["font"]
-
-            # image_prompt 보강
-            if "image_prompt" not in c or not c["image_prompt"]:
-                c["image_prompt"] = {
-                    "prompt": style_preset["image_style"] + ", YouTube thumbnail composition, no text, 16:9",
-                    "notes": "Background only for thumbnail. No text."
-                }
-
-        print(f"[THUMBNAIL-DESIGN-V1] 생성 완료 - style: {style_auto_selected}, {len(candidates)}개 후보")
-
-        # v1 스키마 응답
-        return jsonify({
-            "ok": True,
-            "version": "1.0",
-            "scene_summary": scene_summary,
-            "audience": audience,
-            "channel_type": channel_type,
-            "style_auto_selected": style_auto_selected,
-            "style_preset": {
-                "key": style_auto_selected,
-                "name": style_preset["name"],
-                "description": style_preset["description"],
-                "colors": style_preset["colors"],
-                "font": style_preset["font"],
-                "layout": style_preset["layout"],
-                "image_style": style_preset["image_style"]
-            },
-            "candidates": candidates
-        })
-
-    except Exception as e:
-        print(f"[THUMBNAIL-DESIGN-V1][ERROR] {str(e)}")
-        import traceback
-        traceback.print_exc()
-        return jsonify({"ok": False, "error": str(e)}), 500
-
-
-@app.route('/api/thumbnail/styles', methods=['GET'])
-def api_thumbnail_styles():
-    """사용 가능한 썸네일 스타일 목록 조회 (audience 필터 지원)"""
-    audience_filter = request.args.get("audience")  # senior / general / None(전체)
-
-    styles = []
-    for key, preset in THUMBNAIL_STYLE_PRESETS.items():
-        preset_audience = preset.get("audience", "senior")
-
-        # audience 필터 적용
-        if audience_filter and preset_audience != audience_filter:
-            continue
-
-        styles.append({
-            "key": key,
-            "name": preset["name"],
-            "description": preset["description"],
-            "audience": preset_audience,
-            "colors": preset["colors"],
-            "font": preset["font"],
-            "layout": preset["layout"]
-        })
-
-    return jsonify({
-        "ok": True,
-        "audience_filter": audience_filter,
-        "total": len(styles),
-        "styles": styles
-    })
-
-
-# ===== 썸네일 AI 시스템 (GPT-5.1 + Gemini 3 Pro Image) =====
-THUMBNAIL_AI_HISTORY_FILE = 'data/thumbnail_ai_history.json'
-THUMBNAIL_PROMPT_CONFIG_FILE = 'data/thumbnail_prompt_config.json'
-
-
-def load_thumbnail_prompt_config():
-    """썸네일 프롬프트 설정 로드 (웹 UI + 파이프라인 공통)"""
-    try:
-        if os.path.exists(THUMBNAIL_PROMPT_CONFIG_FILE):
-            with open(THUMBNAIL_PROMPT_CONFIG_FILE, 'r', encoding='utf-8') as f:
-                return json.load(f)
-    except Exception as e:
-        print(f"[THUMBNAIL-AI] 프롬프트 설정 로드 오류: {e}")
-    # 기본 설정 반환
-    return {
-        "style": {"default": "webtoon"},
-        "language_settings": {
-            "ko": {"lang_name": "한국어", "lang_english": "Korean", "text_lang_instruction": "한글로", "text_lang_desc": "한글", "webtoon_style": "Korean webtoon style", "character_nationality": "Korean", "character_desc": "Korean man or woman"},
-            "ja": {"lang_name": "日本語", "lang_english": "Japanese", "text_lang_instruction": "日本語で", "text_lang_desc": "日本語", "webtoon_style": "Japanese manga/anime style", "character_nationality": "Japanese", "character_desc": "Japanese man or woman"},
-            "en": {"lang_name": "English", "lang_english": "English", "text_lang_instruction": "in English", "text_lang_desc": "English", "webtoon_style": "Western comic/illustration style", "character_nationality": "Western", "character_desc": "Western man or woman"}
+            "family": "NanumSquareRoundB",
+            "weight": "700",
+            "size": "68px",
+            "letter_spacing": "1px"
         },
-        "few_shot_enabled": True,
-        "few_shot_count": 5,
-        "model_settings": {"analysis_model": "gpt-5.1", "image_model": "google/gemini-3-pro-image-preview", "temperature": 0.8}
+        "layout": {
+            "position": "bottom-center",
+            "padding": "24px",
+            "text_box": True,
+            "text_box_opacity": 0.8
+        },
+        "image_style": "bright natural lighting, lifestyle photography, warm friendly atmosphere, authentic moment, clean background, empty space for text, YouTube thumbnail style, no text, 16:9"
+    },
+    "dramatic": {
+        "name": "드라마/감정폭발",
+        "description": "얼굴 클로즈업, 왜/몰랐다/그날",
+        "audience": "general",
+        "colors": {
+            "background": "#0D0D0D",
+            "text": "#FFFFFF",
+            "accent": "#FF4444",
+            "outline": "#000000"
+        },
+        "font": {
+            "family": "NanumSquareB",
+            "weight": "900",
+            "size": "88px",
+            "letter_spacing": "-2px"
+        },
+        "layout": {
+            "position": "center",
+            "padding": "20px",
+            "text_box": False,
+            "text_box_opacity": 0
+        },
+        "image_style": "extreme close-up face, intense emotion, dramatic side lighting, high contrast shadows, cinematic portrait, dark background, empty space for text, YouTube thumbnail style, no text, 16:9"
     }
+}
 
+THUMBNAIL_DESIGN_SYSTEM_PROMPT = """You are an AI system that generates fully structured YouTube thumbnail design data
+based on a single scene description.
+You must follow the "Thumbnail JSON Schema v1".
 
-def save_thumbnail_prompt_config(config):
-    """썸네일 프롬프트 설정 저장"""
-    try:
-        os.makedirs(os.path.dirname(THUMBNAIL_PROMPT_CONFIG_FILE), exist_ok=True)
-        config['updated_at'] = datetime.now().isoformat()
-        with open(THUMBNAIL_PROMPT_CONFIG_FILE, 'w', encoding='utf-8') as f:
-            json.dump(config, f, ensure_ascii=False, indent=2)
-        return True
-    except Exception as e:
-        print(f"[THUMBNAIL-AI] 프롬프트 설정 저장 오류: {e}")
-        return False
-
-
-@app.route('/api/thumbnail-ai/config', methods=['GET', 'POST'])
-def api_thumbnail_ai_config():
-    """
-    썸네일 프롬프트 설정 조회/수정 API
-    - GET: 현재 설정 조회
-    - POST: 설정 수정
-    """
-    if request.method == 'GET':
-        config = load_thumbnail_prompt_config()
-        return jsonify({"ok": True, "config": config})
-
-    elif request.method == 'POST':
-        try:
-            data = request.get_json() or {}
-            current_config = load_thumbnail_prompt_config()
-
-            # 부분 업데이트 지원
-            for key in data:
-                if key in ['version', 'updated_at']:
-                    continue  # 자동 관리 필드는 스킵
-                current_config[key] = data[key]
-
-            if save_thumbnail_prompt_config(current_config):
-                return jsonify({"ok": True, "message": "설정이 저장되었습니다", "config": current_config})
-            else:
-                return jsonify({"ok": False, "error": "설정 저장 실패"}), 500
-        except Exception as e:
-            return jsonify({"ok": False, "error": str(e)}), 500
-
-
-def load_thumbnail_history():
-    """썸네일 학습 데이터 로드"""
-    try:
-        if os.path.exists(THUMBNAIL_AI_HISTORY_FILE):
-            with open(THUMBNAIL_AI_HISTORY_FILE, 'r', encoding='utf-8') as f:
-                return json.load(f)
-    except Exception as e:
-        print(f"[THUMBNAIL-AI] 히스토리 로드 오류: {e}")
-    return {"selections": []}
-
-
-def save_thumbnail_history(data):
-    """썸네일 학습 데이터 저장"""
-    try:
-        os.makedirs(os.path.dirname(THUMBNAIL_AI_HISTORY_FILE), exist_ok=True)
-        with open(THUMBNAIL_AI_HISTORY_FILE, 'w', encoding='utf-8') as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
-        return True
-    except Exception as e:
-        print(f"[THUMBNAIL-AI] 히스토리 저장 오류: {e}")
-        return False
-
-
-def get_learning_examples(limit=5):
-    """학습용 예시 데이터 가져오기 (최근 선택 데이터 기반)"""
-    history = load_thumbnail_history()
-    selections = history.get("selections", [])
-
-    # 최근 선택 데이터 중 limit개 가져오기
-    recent = selections[-limit:] if len(selections) > limit else selections
-
-    examples = []
-    for sel in recent:
-        selected_key = sel.get("selected")  # "A" or "B"
-        if selected_key and sel.get("prompts", {}).get(selected_key):
-            examples.append({
-                "genre": sel.get("genre", "일반"),
-                "script_summary": sel.get("script_summary", "")[:100],
-                "selected_prompt": sel["prompts"][selected_key],
-                "reason": sel.get("selection_reason", "")
-            })
-
-    return examples
-
+Your output must ALWAYS be a valid JSON that matches the "result" structure.
+Do not include explanations, plain text, or markdown — ONLY output JSON.
 
-@app.route('/api/thumbnail-ai/analyze', methods=['POST'])
-def api_thumbnail_ai_analyze():
-    """
-    GPT-5.1이 대본을 분석하여 썸네일 프롬프트 1개 생성
-    학습 데이터를 Few-shot으로 활용
-    """
-    try:
-        from openai import OpenAI
-        client = OpenAI()
+====================
+PRIMARY OBJECTIVE
+====================
 
-        data = request.get_json() or {}
-        script = data.get('script', '')
-        title = data.get('title', '')
-        additional_prompt = data.get('additional_prompt', '')  # 사용자 추가 요청사항
+Given a scene summary and metadata (audience type, channel type, style preference),
+generate:
 
-        if not script:
-            return jsonify({"ok": False, "error": "대본이 필요합니다"}), 400
+1) Thumbnail short text candidates (for Korean thumbnails)
+2) Emotion and intensity classification
+3) Style selection (auto if needed)
+4) Typography recommendation (font, weight, size hint)
+5) Layout suggestion (alignment, position, padding)
+6) Color palette suggestion (HEX codes)
+7) Image-generation prompt (for AI tools like ImageFX, DALL-E, Midjourney)
+8) Optional "notes" to guide background-only image creation
 
-        # 언어 감지 (대본 기준)
-        def detect_language(text):
-            """대본의 주요 언어를 감지 (비율 기반)
+====================
+AUDIENCE RULES
+====================
 
-            히라가나/가타카나가 한글보다 많으면 일본어로 판단.
-            한글이 더 많으면 한국어로 판단.
-            """
-            import re
-            # 한국어 감지
-            ko_pattern = re.compile(r'[\uAC00-\uD7AF]')
-            ko_count = len(ko_pattern.findall(text[:2000]))
-            # 일본어 감지 (히라가나/가타카나)
-            ja_pattern = re.compile(r'[\u3040-\u309F\u30A0-\u30FF]')
-            ja_count = len(ja_pattern.findall(text[:2000]))
+If "audience": "senior":
 
-            print(f"[THUMBNAIL-AI] 언어 감지 - 한글: {ko_count}자, 일본어: {ja_count}자")
+- Text length: 8–12 Korean characters
+- Use emotions: 회상, 후회, 그리움, 감사, 깨달음, 기다림
+- Avoid clickbait, avoid slang, avoid excessive punctuation
+- Preferred tones: nostalgia, calm, warm, old photo, clinic, family
+- Friendly and reflective titles
+- Recommended style keys:
+  - "nostalgia"
+  - "clinic_warm"
+  - "family_tearjerker"
+  - "calm_documentary"
+  - "dramatic_conflict"
+  - "newspaper_retro"
+- Colors: low contrast, pastel, film, vintage tones
 
-            # 비율 기반 판단: 더 많은 쪽 선택
-            if ja_count > ko_count:
-                return 'ja', '日本語', 'Japanese'
-            elif ko_count > 0:
-                return 'ko', '한국어', 'Korean'
-            elif ja_count > 0:
-                return 'ja', '日本語', 'Japanese'
-            # 기본값: 영어
-            return 'en', 'English', 'English'
+If "audience": "general":
 
-        lang_code, lang_name, lang_english = detect_language(script + title)
-        print(f"[THUMBNAIL-AI] 분석 요청 - 제목: {title}")
-        print(f"[THUMBNAIL-AI] 대본 길이: {len(script)}자, 감지 언어: {lang_name} ({lang_code})")
-        if additional_prompt:
-            print(f"[THUMBNAIL-AI] 추가 요청사항: {additional_prompt}")
+- Text length: 4–7 Korean characters
+- Use emotions: 긴장, 궁금, 분노, 위기, 충격
+- Clickbait allowed (but stay concise, clear, not abusive)
+- Preferred tones: dramatic, breaking_news, crime, tech, money
+- Recommended style keys:
+  - "breaking_news"
+  - "crime"
+  - "tech"
+  - "money"
+  - "vlog"
+  - "dramatic"
+- Colors: high contrast, red/yellow/black/white dominant
 
-        # 학습 데이터 가져오기
-        learning_examples = get_learning_examples(5)
+====================
+TEXT GENERATION RULES
+====================
 
-        # Few-shot 예시 텍스트 생성
-        examples_text = ""
-        if learning_examples:
-            examples_text = "\n\n[과거 사용자가 선호한 썸네일 스타일 예시]\n"
-            for i, ex in enumerate(learning_examples, 1):
-                examples_text += f"""
-예시 {i}:
-- 장르: {ex['genre']}
-- 대본 요약: {ex['script_summary']}
-- 선택된 프롬프트: {ex['selected_prompt']}
-- 선택 이유: {ex['reason'] or '없음'}
-"""
+- ONLY Korean text for "text" field
+- Character count must not exceed "max_length"
+- Avoid banned words included in "ban_words"
+- At least one candidate must focus on a clear emotional center
+- Do not generate English mixed headlines
+- NEVER include "유튜브", "클릭", "구독" words
 
-        # 추가 요청사항 텍스트
-        additional_instruction = ""
-        if additional_prompt:
-            additional_instruction = f"""
+====================
+IMAGE PROMPT RULES
+====================
 
-[사용자 추가 요청사항]
-다음 요청사항을 반드시 썸네일 프롬프트에 반영하세요:
-{additional_prompt}
-"""
+Image-generation prompts must:
 
-        # 공통 프롬프트 설정 로드
-        prompt_config = load_thumbnail_prompt_config()
-        lang_settings = prompt_config.get('language_settings', {}).get(lang_code, prompt_config.get('language_settings', {}).get('ko', {}))
+- NOT contain text
+- NOT contain watermark
+- MUST describe background only (no title text rendered inside image)
+- MUST include clear space ("negative space") for text placement
+- ALWAYS include cinematic composition instruction
+- Format: 16:9, no characters unless silhouette is needed
 
-        # 언어별 설정 (설정 파일에서 가져오기)
-        text_lang_instruction = lang_settings.get('text_lang_instruction', '한글로')
-        text_lang_desc = lang_settings.get('text_lang_desc', '한글')
-        webtoon_style = lang_settings.get('webtoon_style', 'Korean webtoon style')
+Senior image prompt guidance:
+- "soft light", "vintage photo", "nostalgic Korean street",
+- "film texture", "pastel tones", "calm spring morning",
+- "empty clinic entrance", "falling cherry blossoms"
 
-        # 시스템 프롬프트 (설정 파일 템플릿 또는 기본값)
-        system_prompt_template = prompt_config.get('system_prompt_template', '')
-        if system_prompt_template:
-            system_prompt = system_prompt_template.format(
-                lang_name=lang_name,
-                lang_code=lang_code,
-                lang_english=lang_english,
-                text_lang_instruction=text_lang_instruction,
-                text_lang_desc=text_lang_desc,
-                webtoon_style=webtoon_style,
-                examples_text=examples_text,
-                additional_instruction=additional_instruction
-            )
-        else:
-            # 설정 파일에 템플릿이 없으면 기본 프롬프트 사용
-            system_prompt = f"""당신은 유튜브 썸네일 전문 디자이너입니다.
-사용자의 대본을 분석하여 클릭률이 높은 썸네일 이미지 프롬프트 1개를 생성합니다.
+General image prompt guidance:
+- "high contrast dramatic lighting", "dark background",
+- "silhouette", "red warning light", "empty urban alley",
+- "strong color accent", "center composition", "sharp clarity"
 
-★★★ 중요: 대본이 {lang_name}로 작성되어 있으므로, 썸네일 텍스트도 반드시 {lang_name}로 작성하세요! ★★★
+====================
+STYLE AUTO-SELECTION RULES
+====================
 
-[핵심 원칙]
-1. 유튜브 썸네일은 "호기심"과 "감정"을 자극해야 합니다
-2. 텍스트는 {text_lang_instruction}, 크고 굵게, 읽기 쉽게
-3. 대비가 강한 색상 사용 (빨강/노랑/흰색 등)
-4. 얼굴 표정이나 감정적인 요소 포함
-5. {webtoon_style} (저작권 안전)
+If "style": "auto",
+choose style from the "recommended style keys" based on:
 
-[이미지 프롬프트 작성 규칙]
-- 영문으로 작성 (Gemini 3 Pro Image가 이해할 수 있도록)
-- 16:9 가로 비율 (YouTube 썸네일 표준)
-- {lang_english} 텍스트 오버레이 지시 포함
-- 구체적인 색상, 스타일, 구도 명시
-- {webtoon_style} 필수
-- 과장된 감정 표현 (놀람, 충격, 기쁨 등)
-{examples_text}
-{additional_instruction}
+- scene_summary keywords
+- audience type
+- channel_type
 
-[응답 형식]
-반드시 다음 JSON 형식으로만 응답하세요:
-{{
-  "script_summary": "대본 핵심 요약 (1-2문장, {lang_name}로)",
-  "thumbnail_concept": "썸네일 컨셉 설명",
-  "prompts": {{
-    "A": {{
-      "description": "프롬프트 설명",
-      "prompt": "영문 이미지 생성 프롬프트 ({webtoon_style} 포함 필수)",
-      "text_overlay": {{
-        "main": "메인 텍스트 ({text_lang_desc}, 짧고 임팩트있게)",
-        "sub": "서브 텍스트 ({text_lang_desc}, 선택)"
-      }},
-      "style": "스타일 키워드"
-    }}
-  }},
-  "lang": "{lang_code}"
-}}"""
+Examples:
+- scene contains "first day, 진료소, 병원" → "clinic_warm"
+- scene contains "사건, 피해, 증거, 진실" → "crime"
+- scene contains "기억, 편지, 마지막" → "nostalgia"
+- scene contains "돈, 투자, 수익" → "money"
+- scene contains "기술, 방법, 해결" → "tech"
+- scene contains "가족, 부모, 엄마, 아빠" → "family_tearjerker"
 
-        # 사용자 프롬프트 (설정 파일 템플릿 또는 기본값)
-        user_prompt_template = prompt_config.get('user_prompt_template', '')
-        if user_prompt_template:
-            user_prompt = user_prompt_template.format(
-                title=title,
-                lang_name=lang_name,
-                script=script[:3000],
-                webtoon_style=webtoon_style
-            )
-        else:
-            user_prompt = f"""[제목] {title}
-[언어] {lang_name}
+====================
+REQUIRED OUTPUT FORMAT (JSON only)
+====================
 
-[대본]
-{script[:3000]}
+The final output MUST be a JSON object shaped as:
 
-위 대본을 분석하여 클릭률 높은 유튜브 썸네일 프롬프트 1개를 생성해주세요.
-{webtoon_style}로, 과장된 표정과 감정을 담아주세요.
-★ 썸네일의 텍스트는 반드시 {lang_name}로 작성하세요! ★"""
+{
+  "scene_summary": "...",
+  "audience": "...",
+  "channel_type": "...",
+  "style_auto_selected": "...",
+  "candidates": [
+    {
+      "id": "thumb_001",
+      "text": "...",
+      "length": 7,
+      "audience": "...",
+      "emotion": "...",
+      "intensity": 0.7,
+      "style_profile": {
+        "style_key": "...",
+        "tone": "...",
+        "category": "..."
+      },
+      "design": {
+        "layout": {
+          "position": "bottom-left",
+          "text_box": true,
+          "padding": 32,
+          "max_lines": 2,
+          "alignment": "left"
+        },
+        "colors": {
+          "background": "#F2E7D5",
+          "text": "#2B2B2B",
+          "accent": "#A67C52",
+          "suggested_palette": [
+            "#F2E7D5",
+            "#2B2B2B",
+            "#A67C52",
+            "#FFFFFF"
+          ]
+        },
+        "font": {
+          "family": "Noto Sans KR",
+          "weight": "900",
+          "size_hint": "72px",
+          "line_spacing": 1.1
+        }
+      },
+      "image_prompt": {
+        "prompt": "...(AI image-generation prompt)...",
+        "notes": "Background only for thumbnail. No text."
+      }
+    }
+  ]
+}
 
-        # GPT-4o Chat Completions API 호출
-        response = client.chat.completions.create(
-            model="gpt-4o",
-            messages=[
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": user_prompt}
-            ],
-            temperature=0.8,
-            max_tokens=4096,
-            response_format={"type": "json_object"}
-        )
+====================
+VALIDATION RULES
+====================
 
-        # 결과 추출
-        result_text = response.choices[0].message.content.strip()
+- ALWAYS return at least 3 candidates
+- NEVER leave any field empty
+- HEX codes must be valid (#RRGGBB)
+- "size_hint" must contain "px"
+- intensity value must be between 0.0 and 1.0
 
-        # JSON 파싱 (마크다운 코드블록 제거)
-        if result_text.startswith("```"):
-            result_text = result_text.split("```")[1]
-            if result_text.startswith("json"):
-                result_text = result_text[4:]
-        result_text = result_text.strip()
+====================
+OUTPUT LANGUAGE
+====================
 
-        try:
-            result = json.loads(result_text)
-        except json.JSONDecodeError as je:
-            print(f"[THUMBNAIL-AI] JSON 파싱 오류: {je}")
-            print(f"[THUMBNAIL-AI] 원본 텍스트: {result_text[:500]}")
-            return jsonify({"ok": False, "error": f"AI 응답 파싱 오류: {str(je)}"}), 200
+- Korean for "text"
+- English for "image_prompt"
 
-        # 세션 ID 생성
-        session_id = f"thumb_{uuid.uuid4().hex[:12]}"
+====================
+FAIL CASE INSTRUCTIONS
+====================
 
-        print(f"[THUMBNAIL-AI] 분석 완료 - 세션: {session_id}")
+If the request lacks "scene_summary", reply with:
 
-        return jsonify({
-            "ok": True,
-            "session_id": session_id,
-            "script_summary": result.get("script_summary", ""),
-            "thumbnail_concept": result.get("thumbnail_concept", ""),
-            "prompts": result.get("prompts", {}),
-            "title": title,
-            "lang": lang_code,  # 감지된 언어
-            "learning_examples_used": len(learning_examples)
-        })
+{
+  "error": "scene_summary is required"
+}
 
-    except Exception as e:
-        print(f"[THUMBNAIL-AI][ERROR] {str(e)}")
-        import traceback
-        traceback.print_exc()
-        return jsonify({"ok": False, "error": str(e)}), 500
+NO free text, NO apology.
 
+====================
+END OF SYSTEM PROMPT
+====================
+"""
 
-@app.route('/api/thumbnail-ai/generate', methods=['POST'])
-def api_thumbnail_ai_generate():
-    """
-    Gemini 3 Pro Image로 썸네일 이미지 생성
-    한글 텍스트 렌더링 지원
-    """
+@app.route('/api/thumbnail/generate', methods=['POST'])
+def api_thumbnail_generate():
+    """통합 썸네일 디자인 자동 생성 API v1 (스타일 + 디자인 + 이미지 프롬프트 포함)"""
     try:
-        import time
-        import base64
+        client = llm_clients.require_client("openai", call_site="thumbnail-generate")
 
         data = request.get_json() or {}
-        prompt = data.get('prompt', '')
-        text_overlay = data.get('text_overlay', {})
-        style = data.get('style', 'comic')
-        session_id = data.get('session_id', '')
-        variant = data.get('variant', 'A')  # A or B
 
-        if not prompt:
-            return jsonify({"ok": False, "error": "프롬프트가 필요합니다"}), 400
+        # v1 스키마 파라미터
+        scene_summary = data.get("scene_summary", "")
+        audience = data.get("audience", "senior")  # senior / general
+        channel_type = data.get("channel_type", "drama")  # drama / issue / vlog / sermon / news
+        style = data.get("style", "auto")  # auto = AI가 자동 선택
+        num_candidates = data.get("num_candidates", 10)
+        max_length = data.get("max_length", 12 if audience == "senior" else 7)
+        language = data.get("language", "ko")
+        keywords = data.get("keywords", [])
+        ban_words = data.get("ban_words", ["구독", "유튜브", "클릭"])
+        options = data.get("options", {
+            "generate_layout": True,
+            "generate_palette": True,
+            "generate_image_prompt": True
+        })
+
+        if not scene_summary:
+            return jsonify({"ok": False, "error": "scene_summary is required"}), 400
+
+        # audience에 맞는 스타일만 필터링
+        available_styles = [
+            key for key, preset in THUMBNAIL_STYLE_PRESETS.items()
+            if preset.get("audience") == audience
+        ]
 
-        print(f"[THUMBNAIL-AI] 이미지 생성 - 세션: {session_id}, 변형: {variant}")
+        # 기본 스타일 (audience에 맞게)
+        default_style = "nostalgia" if audience == "senior" else "breaking_news"
 
-        # 텍스트 오버레이 지시 추가
-        main_text = text_overlay.get('main', '')
-        sub_text = text_overlay.get('sub', '')
+        user_payload = {
+            "scene_summary": scene_summary,
+            "audience": audience,
+            "channel_type": channel_type,
+            "style": style,
+            "available_styles": available_styles,
+            "num_candidates": num_candidates,
+            "max_length": max_length,
+            "language": language,
+            "keywords": keywords,
+            "ban_words": ban_words,
+            "options": options
+        }
 
-        text_instruction = ""
-        if main_text:
-            text_instruction = f"""
-IMPORTANT TEXT OVERLAY INSTRUCTIONS:
-- Add large, bold Korean text "{main_text}" prominently in the image
-- Text should be highly visible with strong contrast (white text with black outline or vice versa)
-- Text position: center or top area of the image
-"""
-            if sub_text:
-                text_instruction += f'- Add smaller subtitle "{sub_text}" below the main text\n'
+        print(f"[THUMBNAIL-DESIGN-V1] 통합 썸네일 생성 요청")
+        print(f"  - audience: {audience}, channel_type: {channel_type}, style: {style}")
+        print(f"  - available_styles: {available_styles}")
 
-        # 최종 프롬프트 구성
-        enhanced_prompt = f"""Create a YouTube thumbnail image in 16:9 landscape aspect ratio.
+        # GPT 호출
+        completion = client.chat.completions.create(
+            model="gpt-4o-mini",
+            messages=[
+                {"role": "system", "content": THUMBNAIL_DESIGN_SYSTEM_PROMPT},
+                {"role": "user", "content": json.dumps(user_payload, ensure_ascii=False)}
+            ],
+            temperature=0.8,
+            response_format={"type": "json_object"}
+        )
 
-{prompt}
+        result = completion.choices[0].message.content
+        result_json = json.loads(result)
 
-{text_instruction}
+        # 에러 체크
+        if "error" in result_json:
+            return jsonify({"ok": False, "error": result_json["error"]}), 400
 
-Style requirements:
-- High contrast, eye-catching colors
-- Professional YouTube thumbnail quality
-- Comic/illustration style (not photorealistic)
-- Clean composition suitable for small preview
-- {style} aesthetic"""
+        # 추천된 스타일 가져오기
+        style_auto_selected = result_json.get("style_auto_selected", default_style)
+        if style != "auto" and style in THUMBNAIL_STYLE_PRESETS:
+            style_auto_selected = style  # 사용자가 직접 지정한 경우
 
-        # Gemini 3 Pro로 이미지 생성 (image 모듈 사용)
-        result = generate_image_base64(prompt=enhanced_prompt, model=GEMINI_PRO)
-        if not result.get("ok"):
-            return jsonify({"ok": False, "error": result.get("error", "이미지 생성 실패")}), 200
+        # 스타일이 audience에 맞는지 확인
+        if style_auto_selected not in available_styles:
+            style_auto_selected = default_style
 
-        base64_image_data = result.get("base64")
-        if not base64_image_data:
-            return jsonify({"ok": False, "error": "이미지 데이터가 없습니다"}), 200
+        style_preset = THUMBNAIL_STYLE_PRESETS.get(style_auto_selected, THUMBNAIL_STYLE_PRESETS[default_style])
 
-        # 파일로 저장
-        timestamp = int(time.time() * 1000)
-        filename = f"thumbnail_ai_{session_id}_{variant}_{timestamp}.png"
+        # 각 후보에 디자인 정보 보강 (GPT 출력에 없는 경우 프리셋으로 대체)
+        candidates = result_json.get("candidates", [])
+        for i, c in enumerate(candidates):
+            c["id"] = c.get("id", f"thumb_{str(i+1).zfill(3)}")
+            c["length"] = len(c.get("text", ""))
+            c["audience"] = audience
 
-        output_dir = os.path.join(os.path.dirname(__file__), 'outputs')
-        os.makedirs(output_dir, exist_ok=True)
-        filepath = os.path.join(output_dir, filename)
+            # design 보강
+            if "design" not in c or not c["design"]:
+                c["design"] = {
+                    "layout": style_preset["layout"],
+                    "colors": style_preset["colors"],
+                    "font": style_preset["font"]
+                }
+            else:
+                # 부분적으로 누락된 경우 보강
+                if "layout" not in c["design"]:
+                    c["design"]["layout"] = style_preset["layout"]
+                if "colors" not in c["design"]:
+                    c["design"]["colors"] = style_preset["colors"]
+                if "font" not in c["design"]:
+                    c["design"]["font"] = style_preset["font"]
 
-        with open(filepath, 'wb') as f:
-            f.write(base64.b64decode(base64_image_data))
+            # image_prompt 보강
+            if "image_prompt" not in c or not c["image_prompt"]:
+                c["image_prompt"] = {
+                    "prompt": style_preset["image_style"] + ", YouTube thumbnail composition, no text, 16:9",
+                    "notes": "Background only for thumbnail. No text."
+                }
 
-        image_url = f'/output/{filename}'
-        print(f"[THUMBNAIL-AI] 이미지 저장 완료: {image_url}")
+        print(f"[THUMBNAIL-DESIGN-V1] 생성 완료 - style: {style_auto_selected}, {len(candidates)}개 후보")
 
+        # v1 스키마 응답
         return jsonify({
             "ok": True,
-            "image_url": image_url,
-            "session_id": session_id,
-            "variant": variant,
-            "prompt_used": enhanced_prompt[:500]
+            "version": "1.0",
+            "scene_summary": scene_summary,
+            "audience": audience,
+            "channel_type": channel_type,
+            "style_auto_selected": style_auto_selected,
+            "style_preset": {
+                "key": style_auto_selected,
+                "name": style_preset["name"],
+                "description": style_preset["description"],
+                "colors": style_preset["colors"],
+                "font": style_preset["font"],
+                "layout": style_preset["layout"],
+                "image_style": style_preset["image_style"]
+            },
+            "candidates": candidates
         })
 
     except Exception as e:
-        print(f"[THUMBNAIL-AI][ERROR] {str(e)}")
+        print(f"[THUMBNAIL-DESIGN-V1][ERROR] {str(e)}")
         import traceback
         traceback.print_exc()
         return jsonify({"ok": False, "error": str(e)}), 500
 
 
-@app.route('/api/thumbnail-ai/select', methods=['POST'])
-def api_thumbnail_ai_select():
-    """
-    사용자의 썸네일 선택 저장 (학습 데이터)
-    """
-    try:
-        data = request.get_json() or {}
+@app.route('/api/thumbnail/styles', methods=['GET'])
+def api_thumbnail_styles():
+    """사용 가능한 썸네일 스타일 목록 조회 (audience 필터 지원)"""
+    audience_filter = request.args.get("audience")  # senior / general / None(전체)
 
-        session_id = data.get('session_id', '')
-        selected = data.get('selected', '')  # "A" or "B"
-        prompts = data.get('prompts', {})
-        script_summary = data.get('script_summary', '')
-        genre = data.get('genre', '일반')
-        title = data.get('title', '')
-        selection_reason = data.get('selection_reason', '')
-        image_urls = data.get('image_urls', {})
+    styles = []
+    for key, preset in THUMBNAIL_STYLE_PRESETS.items():
+        preset_audience = preset.get("audience", "senior")
 
-        if not session_id or not selected:
-            return jsonify({"ok": False, "error": "세션 ID와 선택 정보가 필요합니다"}), 400
+        # audience 필터 적용
+        if audience_filter and preset_audience != audience_filter:
+            continue
 
-        print(f"[THUMBNAIL-AI] 선택 저장 - 세션: {session_id}, 선택: {selected}")
+        styles.append({
+            "key": key,
+            "name": preset["name"],
+            "description": preset["description"],
+            "audience": preset_audience,
+            "colors": preset["colors"],
+            "font": preset["font"],
+            "layout": preset["layout"]
+        })
 
-        # 학습 데이터 저장
-        history = load_thumbnail_history()
+    return jsonify({
+        "ok": True,
+        "audience_filter": audience_filter,
+        "total": len(styles),
+        "styles": styles
+    })
 
-        selection_data = {
-            "id": session_id,
-            "timestamp": dt.now().isoformat(),
-            "title": title,
-            "genre": genre,
-            "script_summary": script_summary,
-            "prompts": {
-                "A": prompts.get("A", {}).get("prompt", ""),
-                "B": prompts.get("B", {}).get("prompt", "")
-            },
-            "text_overlays": {
-                "A": prompts.get("A", {}).get("text_overlay", {}),
-                "B": prompts.get("B", {}).get("text_overlay", {})
-            },
-            "image_urls": image_urls,
-            "selected": selected,
-            "selection_reason": selection_reason
-        }
 
-        history["selections"].append(selection_data)
+# ===== 썸네일 AI 시스템 (GPT-5.1 + Gemini 3 Pro Image) =====
+THUMBNAIL_AI_HISTORY_FILE = 'data/thumbnail_ai_history.json'
+THUMBNAIL_PROMPT_CONFIG_FILE = 'data/thumbnail_prompt_config.json'
 
-        # 최대 100개까지만 유지
-        if len(history["selections"]) > 100:
-            history["selections"] = history["selections"][-100:]
 
-        save_thumbnail_history(history)
+def load_thumbnail_prompt_config():
+    """썸네일 프롬프트 설정 로드 (웹 UI + 파이프라인 공통)"""
+    try:
+        if os.path.exists(THUMBNAIL_PROMPT_CONFIG_FILE):
+            with open(THUMBNAIL_PROMPT_CONFIG_FILE, 'r', encoding='utf-8') as f:
+                return json.load(f)
+    except Exception as e:
+        print(f"[THUMBNAIL-AI] 프롬프트 설정 로드 오류: {e}")
+    # 기본 설정 반환
+    return {
+        "style": {"default": "webtoon"},
+        "language_settings": {
+            "ko": {"lang_name": "한국어", "lang_english": "Korean", "text_lang_instruction": "한글로", "text_lang_desc": "한글", "webtoon_style": "Korean webtoon style", "character_nationality": "Korean", "character_desc": "Korean man or woman"},
+            "ja": {"lang_name": "日本語", "lang_english": "Japanese", "text_lang_instruction": "日本語で", "text_lang_desc": "日本語", "webtoon_style": "Japanese manga/anime style", "character_nationality": "Japanese", "character_desc": "Japanese man or woman"},
+            "en": {"lang_name": "English", "lang_english": "English", "text_lang_instruction": "in English", "text_lang_desc": "English", "webtoon_style": "Western comic/illustration style", "character_nationality": "Western", "character_desc": "Western man or woman"}
+        },
+        "few_shot_enabled": True,
+        "few_shot_count": 5,
+        "model_settings": {"analysis_model": "gpt-5.1", "image_model": "google/gemini-3-pro-image-preview", "temperature": 0.8}
+    }
+
+
+def save_thumbnail_prompt_config(config):
+    """썸네일 프롬프트 설정 저장"""
+    try:
+        os.makedirs(os.path.dirname(THUMBNAIL_PROMPT_CONFIG_FILE), exist_ok=True)
+        config['updated_at'] = datetime.now().isoformat()
+        with open(THUMBNAIL_PROMPT_CONFIG_FILE, 'w', encoding='utf-8') as f:
+            json.dump(config, f, ensure_ascii=False, indent=2)
+        return True
+    except Exception as e:
+        print(f"[THUMBNAIL-AI] 프롬프트 설정 저장 오류: {e}")
+        return False
+
+
+@app.route('/api/thumbnail-ai/config', methods=['GET', 'POST'])
+def api_thumbnail_ai_config():
+    """
+    썸네일 프롬프트 설정 조회/수정 API
+    - GET: 현재 설정 조회
+    - POST: 설정 수정
+    """
+    if request.method == 'GET':
+        config = load_thumbnail_prompt_config()
+        return jsonify({"ok": True, "config": config})
+
+    elif request.method == 'POST':
+        try:
+            data = request.get_json() or {}
+            current_config = load_thumbnail_prompt_config()
+
+            # 부분 업데이트 지원
+            for key in data:
+                if key in ['version', 'updated_at']:
+                    continue  # 자동 관리 필드는 스킵
+                current_config[key] = data[key]
 
-        print(f"[THUMBNAIL-AI] 학습 데이터 저장 완료 - 총 {len(history['selections'])}개")
+            if save_thumbnail_prompt_config(current_config):
+                return jsonify({"ok": True, "message": "설정이 저장되었습니다", "config": current_config})
+            else:
+                return jsonify({"ok": False, "error": "설정 저장 실패"}), 500
+        except Exception as e:
+            return jsonify({"ok": False, "error": str(e)}), 500
 
-        return jsonify({
-            "ok": True,
-            "message": "선택이 저장되었습니다",
-            "session_id": session_id,
-            "selected": selected,
-            "total_selections": len(history["selections"])
-        })
 
+def load_thumbnail_history():
+    """썸네일 학습 데이터 로드"""
+    try:
+        if os.path.exists(THUMBNAIL_AI_HISTORY_FILE):
+            with open(THUMBNAIL_AI_HISTORY_FILE, 'r', encoding='utf-8') as f:
+                return json.load(f)
     except Exception as e:
-        print(f"[THUMBNAIL-AI][ERROR] {str(e)}")
-        import traceback
-        traceback.print_exc()
-        return jsonify({"ok": False, "error": str(e)}), 500
+        print(f"[THUMBNAIL-AI] 히스토리 로드 오류: {e}")
+    return {"selections": []}
 
 
-@app.route('/api/thumbnail-ai/history', methods=['GET'])
-def api_thumbnail_ai_history():
-    """
-    썸네일 학습 데이터 히스토리 조회
-    """
+def save_thumbnail_history(data):
+    """썸네일 학습 데이터 저장"""
     try:
-        limit = request.args.get('limit', 20, type=int)
-        genre_filter = request.args.get('genre', None)
-
-        history = load_thumbnail_history()
-        selections = history.get("selections", [])
-
-        # 장르 필터
-        if genre_filter:
-            selections = [s for s in selections if s.get("genre") == genre_filter]
-
-        # 최신순 정렬
-        selections = sorted(selections, key=lambda x: x.get("timestamp", ""), reverse=True)
+        os.makedirs(os.path.dirname(THUMBNAIL_AI_HISTORY_FILE), exist_ok=True)
+        with open(THUMBNAIL_AI_HISTORY_FILE, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+        return True
+    except Exception as e:
+        print(f"[THUMBNAIL-AI] 히스토리 저장 오류: {e}")
+        return False
 
-        # limit 적용
-        selections = selections[:limit]
 
-        # 통계 계산
-        all_selections = history.get("selections", [])
-        stats = {
-            "total": len(all_selections),
-            "a_selected": sum(1 for s in all_selections if s.get("selected") == "A"),
-            "b_selected": sum(1 for s in all_selections if s.get("selected") == "B"),
-            "c_selected": sum(1 for s in all_selections if s.get("selected") == "C"),
-            "genres": {}
-        }
+def get_learning_examples(limit=5):
+    """학습용 예시 데이터 가져오기 (최근 선택 데이터 기반)"""
+    history = load_thumbnail_history()
+    selections = history.get("selections", [])
 
-        for s in all_selections:
-            g = s.get("genre", "일반")
-            stats["genres"][g] = stats["genres"].get(g, 0) + 1
+    # 최근 선택 데이터 중 limit개 가져오기
+    recent = selections[-limit:] if len(selections) > limit else selections
 
-        return jsonify({
-            "ok": True,
-            "selections": selections,
-            "stats": stats,
-            "limit": limit,
-            "genre_filter": genre_filter
-        })
+    examples = []
+    for sel in recent:
+        selected_key = sel.get("selected")  # "A" or "B"
+        if selected_key and sel.get("prompts", {}).get(selected_key):
+            examples.append({
+                "genre": sel.get("genre", "일반"),
+                "script_summary": sel.get("script_summary", "")[:100],
+                "selected_prompt": sel["prompts"][selected_key],
+                "reason": sel.get("selection_reason", "")
+            })
 
-    except Exception as e:
-        print(f"[THUMBNAIL-AI][ERROR] {str(e)}")
-        import traceback
-        traceback.print_exc()
-        return jsonify({"ok": False, "error": str(e)}), 500
+    return examples
 
 
-@app.route('/api/thumbnail-ai/generate-single', methods=['POST'])
-def api_thumbnail_ai_generate_single():
+@app.route('/api/thumbnail-ai/analyze', methods=['POST'])
+def api_thumbnail_ai_analyze():
     """
-    단일 썸네일 생성 (자동화 파이프라인용 - A 하나만 생성)
-    ★ Gemini가 직접 텍스트 렌더링
+    GPT-5.1이 대본을 분석하여 썸네일 프롬프트 1개 생성
+    학습 데이터를 Few-shot으로 활용
     """
     try:
-        import base64
-        from PIL import Image
-        import io
+        client = llm_clients.require_client(
+            "openai", call_site="thumbnail-ai-analyze", cache_ttl=llm_clients.DEFAULT_CACHE_TTL
+        )
 
         data = request.get_json() or {}
-        prompt_data = data.get('prompt', {})
-        session_id = data.get('session_id', '')
-        category = data.get('category', '')
-        lang = data.get('lang', 'ko')
-        style = prompt_data.get('style', '')
+        script = data.get('script', '')
+        title = data.get('title', '')
+        additional_prompt = data.get('additional_prompt', '')  # 사용자 추가 요청사항
 
-        if not prompt_data.get('prompt'):
-            return jsonify({"ok": False, "error": "prompt 필드가 필요합니다"}), 400
+        if not script:
+            return jsonify({"ok": False, "error": "대본이 필요합니다"}), 400
 
-        print(f"[THUMBNAIL-AI] 단일 썸네일 생성 - 세션: {session_id}, 카테고리: {category}, 스타일: {style}")
+        # 언어 감지 (대본 기준)
+        def detect_language(text):
+            """대본의 주요 언어를 감지 (비율 기반)
 
-        prompt = prompt_data.get('prompt', '')
-        text_overlay = prompt_data.get('text_overlay', {})
-        main_text = text_overlay.get('main', '')
-        sub_text = text_overlay.get('sub', '')
+            히라가나/가타카나가 한글보다 많으면 일본어로 판단.
+            한글이 더 많으면 한국어로 판단.
+            """
+            import re
+            # 한국어 감지
+            ko_pattern = re.compile(r'[\uAC00-\uD7AF]')
+            ko_count = len(ko_pattern.findall(text[:2000]))
+            # 일본어 감지 (히라가나/가타카나)
+            ja_pattern = re.compile(r'[\u3040-\u309F\u30A0-\u30FF]')
+            ja_count = len(ja_pattern.findall(text[:2000]))
 
-        # 언어에 따른 설정
-        lang_config = {
-            'ja': ("Japanese", "Japanese man or woman"),
-            'en': ("Western", "Western man or woman"),
-        }
-        character_nationality, character_desc = lang_config.get(lang, ("Korean", "Korean man or woman"))
+            print(f"[THUMBNAIL-AI] 언어 감지 - 한글: {ko_count}자, 일본어: {ja_count}자")
 
-        # 프롬프트에서 불필요한 키워드 제거
-        clean_prompt = prompt
-        for kw in ['stickman', 'stick man', 'photorealistic', 'realistic', 'photograph', 'photo', 'Ghibli', 'anime']:
-            clean_prompt = clean_prompt.replace(kw, '').replace(kw.lower(), '').replace(kw.capitalize(), '')
+            # 비율 기반 판단: 더 많은 쪽 선택
+            if ja_count > ko_count:
+                return 'ja', '日本語', 'Japanese'
+            elif ko_count > 0:
+                return 'ko', '한국어', 'Korean'
+            elif ja_count > 0:
+                return 'ja', '日本語', 'Japanese'
+            # 기본값: 영어
+            return 'en', 'English', 'English'
 
-        # 텍스트 오버레이 지시 추가
-        text_instruction = ""
-        if main_text:
-            text_instruction = f"""
-★ TEXT REQUIREMENTS (CRITICAL!) ★
-- Add VERY LARGE, BOLD text "{main_text}" on LEFT side of image
-- Text color: PURE WHITE with THICK BLACK outline (3-4px stroke)
-- Split into 2-4 short lines for maximum impact
-- Text takes 30-40% of image width
-- NO yellow text, NO colored text - WHITE ONLY!
+        lang_code, lang_name, lang_english = detect_language(script + title)
+        print(f"[THUMBNAIL-AI] 분석 요청 - 제목: {title}")
+        print(f"[THUMBNAIL-AI] 대본 길이: {len(script)}자, 감지 언어: {lang_name} ({lang_code})")
+        if additional_prompt:
+            print(f"[THUMBNAIL-AI] 추가 요청사항: {additional_prompt}")
+
+        # 학습 데이터 가져오기
+        learning_examples = get_learning_examples(5)
+
+        # Few-shot 예시 텍스트 생성
+        examples_text = ""
+        if learning_examples:
+            examples_text = "\n\n[과거 사용자가 선호한 썸네일 스타일 예시]\n"
+            for i, ex in enumerate(learning_examples, 1):
+                examples_text += f"""
+예시 {i}:
+- 장르: {ex['genre']}
+- 대본 요약: {ex['script_summary']}
+- 선택된 프롬프트: {ex['selected_prompt']}
+- 선택 이유: {ex['reason'] or '없음'}
 """
-            if sub_text:
-                text_instruction += f'- Subtitle below: "{sub_text}"\n'
 
-        # 최종 프롬프트 구성
-        enhanced_prompt = f"""Create a YouTube thumbnail image in 16:9 landscape aspect ratio.
+        # 추가 요청사항 텍스트
+        additional_instruction = ""
+        if additional_prompt:
+            additional_instruction = f"""
 
-{clean_prompt}
+[사용자 추가 요청사항]
+다음 요청사항을 반드시 썸네일 프롬프트에 반영하세요:
+{additional_prompt}
+"""
 
-LAYOUT: Character/subject on RIGHT side (30-40% of frame)
+        # 공통 프롬프트 설정 로드
+        prompt_config = load_thumbnail_prompt_config()
+        lang_settings = prompt_config.get('language_settings', {}).get(lang_code, prompt_config.get('language_settings', {}).get('ko', {}))
 
-{text_instruction}
+        # 언어별 설정 (설정 파일에서 가져오기)
+        text_lang_instruction = lang_settings.get('text_lang_instruction', '한글로')
+        text_lang_desc = lang_settings.get('text_lang_desc', '한글')
+        webtoon_style = lang_settings.get('webtoon_style', 'Korean webtoon style')
 
-Style: {character_nationality} webtoon style, comic illustration, clean bold outlines, vibrant colors. NOT photorealistic."""
+        # 시스템 프롬프트 (설정 파일 템플릿 또는 기본값)
+        system_prompt_template = prompt_config.get('system_prompt_template', '')
+        if system_prompt_template:
+            system_prompt = system_prompt_template.format(
+                lang_name=lang_name,
+                lang_code=lang_code,
+                lang_english=lang_english,
+                text_lang_instruction=text_lang_instruction,
+                text_lang_desc=text_lang_desc,
+                webtoon_style=webtoon_style,
+                examples_text=examples_text,
+                additional_instruction=additional_instruction
+            )
+        else:
+            # 설정 파일에 템플릿이 없으면 기본 프롬프트 사용
+            system_prompt = f"""당신은 유튜브 썸네일 전문 디자이너입니다.
+사용자의 대본을 분석하여 클릭률이 높은 썸네일 이미지 프롬프트 1개를 생성합니다.
+
+★★★ 중요: 대본이 {lang_name}로 작성되어 있으므로, 썸네일 텍스트도 반드시 {lang_name}로 작성하세요! ★★★
+
+[핵심 원칙]
+1. 유튜브 썸네일은 "호기심"과 "감정"을 자극해야 합니다
+2. 텍스트는 {text_lang_instruction}, 크고 굵게, 읽기 쉽게
+3. 대비가 강한 색상 사용 (빨강/노랑/흰색 등)
+4. 얼굴 표정이나 감정적인 요소 포함
+5. {webtoon_style} (저작권 안전)
+
+[이미지 프롬프트 작성 규칙]
+- 영문으로 작성 (Gemini 3 Pro Image가 이해할 수 있도록)
+- 16:9 가로 비율 (YouTube 썸네일 표준)
+- {lang_english} 텍스트 오버레이 지시 포함
+- 구체적인 색상, 스타일, 구도 명시
+- {webtoon_style} 필수
+- 과장된 감정 표현 (놀람, 충격, 기쁨 등)
+{examples_text}
+{additional_instruction}
+
+[응답 형식]
+반드시 다음 JSON 형식으로만 응답하세요:
+{{
+  "script_summary": "대본 핵심 요약 (1-2문장, {lang_name}로)",
+  "thumbnail_concept": "썸네일 컨셉 설명",
+  "prompts": {{
+    "A": {{
+      "description": "프롬프트 설명",
+      "prompt": "영문 이미지 생성 프롬프트 ({webtoon_style} 포함 필수)",
+      "text_overlay": {{
+        "main": "메인 텍스트 ({text_lang_desc}, 짧고 임팩트있게)",
+        "sub": "서브 텍스트 ({text_lang_desc}, 선택)"
+      }},
+      "style": "스타일 키워드"
+    }}
+  }},
+  "lang": "{lang_code}"
+}}"""
 
-        print(f"[THUMBNAIL-AI] Gemini 프롬프트 (텍스트 직접 생성): {enhanced_prompt[:200]}...")
+        # 사용자 프롬프트 (설정 파일 템플릿 또는 기본값)
+        user_prompt_template = prompt_config.get('user_prompt_template', '')
+        if user_prompt_template:
+            user_prompt = user_prompt_template.format(
+                title=title,
+                lang_name=lang_name,
+                script=script[:3000],
+                webtoon_style=webtoon_style
+            )
+        else:
+            user_prompt = f"""[제목] {title}
+[언어] {lang_name}
 
-        # Gemini 3 Pro로 이미지 생성 (텍스트 포함)
-        result = generate_image_base64(prompt=enhanced_prompt, model=GEMINI_PRO)
-        if not result.get("ok"):
-            return jsonify({"ok": False, "error": result.get("error", "이미지 생성 실패")})
+[대본]
+{script[:3000]}
 
-        base64_image_data = result.get("base64")
-        if not base64_image_data:
-            return jsonify({"ok": False, "error": "이미지 데이터 추출 실패"})
+위 대본을 분석하여 클릭률 높은 유튜브 썸네일 프롬프트 1개를 생성해주세요.
+{webtoon_style}로, 과장된 표정과 감정을 담아주세요.
+★ 썸네일의 텍스트는 반드시 {lang_name}로 작성하세요! ★"""
 
-        # 이미지 처리
-        upload_dir = "uploads/thumbnails"
-        os.makedirs(upload_dir, exist_ok=True)
+        # GPT-4o Chat Completions API 호출
+        response = client.chat.completions.create(
+            model="gpt-4o",
+            messages=[
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": user_prompt}
+            ],
+            temperature=0.8,
+            max_tokens=4096,
+            response_format={"type": "json_object"}
+        )
 
-        image_bytes = base64.b64decode(base64_image_data)
-        img = Image.open(io.BytesIO(image_bytes))
+        # 결과 추출
+        result_text = response.choices[0].message.content.strip()
 
-        # 리사이즈 (1280x720 고정)
-        target_width, target_height = 1280, 720
-        if img.width != target_width or img.height != target_height:
-            img = img.resize((target_width, target_height), Image.LANCZOS)
+        # JSON 파싱 (마크다운 코드블록 제거)
+        if result_text.startswith("```"):
+            result_text = result_text.split("```")[1]
+            if result_text.startswith("json"):
+                result_text = result_text[4:]
+        result_text = result_text.strip()
 
-        # RGB 변환 후 JPEG 저장
-        if img.mode == 'RGBA':
-            background = Image.new('RGB', img.size, (255, 255, 255))
-            background.paste(img, mask=img.split()[3])
-            img = background
-        elif img.mode != 'RGB':
-            img = img.convert('RGB')
+        try:
+            result = json.loads(result_text)
+        except json.JSONDecodeError as je:
+            print(f"[THUMBNAIL-AI] JSON 파싱 오류: {je}")
+            print(f"[THUMBNAIL-AI] 원본 텍스트: {result_text[:500]}")
+            llm_clients.invalidate(response)
+            return jsonify({"ok": False, "error": f"AI 응답 파싱 오류: {str(je)}"}), 200
 
-        filename = f"thumb_{session_id}.jpg"
-        filepath = os.path.join(upload_dir, filename)
-        img.save(filepath, 'JPEG', quality=90, optimize=True)
+        # 세션 ID 생성
+        session_id = f"thumb_{uuid.uuid4().hex[:12]}"
 
-        file_size = os.path.getsize(filepath)
-        print(f"[THUMBNAIL-AI] 썸네일 저장: {filepath} ({file_size / 1024:.1f}KB)")
+        print(f"[THUMBNAIL-AI] 분석 완료 - 세션: {session_id}")
 
         return jsonify({
             "ok": True,
-            "image_url": f"/uploads/thumbnails/{filename}"
+            "session_id": session_id,
+            "script_summary": result.get("script_summary", ""),
+            "thumbnail_concept": result.get("thumbnail_concept", ""),
+            "prompts": result.get("prompts", {}),
+            "title": title,
+            "lang": lang_code,  # 감지된 언어
+            "learning_examples_used": len(learning_examples)
         })
 
     except Exception as e:
@@ -15679,109 +14326,86 @@ Style: {character_nationality} webtoon style, comic illustration, clean bold out
         return jsonify({"ok": False, "error": str(e)}), 500
 
 
-@app.route('/api/thumbnail-ai/generate-both', methods=['POST'])
-@app.route('/api/thumbnail-ai/generate-all', methods=['POST'])
-def api_thumbnail_ai_generate_both():
+@app.route('/api/thumbnail-ai/generate', methods=['POST'])
+def api_thumbnail_ai_generate():
     """
-    A/B/C 3개의 썸네일을 한 번에 생성 (YouTube Test & Compare용)
+    Gemini 3 Pro Image로 썸네일 이미지 생성
+    한글 텍스트 렌더링 지원
     """
     try:
         import time
         import base64
-        from concurrent.futures import ThreadPoolExecutor
 
         data = request.get_json() or {}
-        prompts = data.get('prompts', {})
+        prompt = data.get('prompt', '')
+        text_overlay = data.get('text_overlay', {})
+        style = data.get('style', 'comic')
         session_id = data.get('session_id', '')
+        variant = data.get('variant', 'A')  # A or B
 
-        if not prompts.get('A') or not prompts.get('B'):
-            return jsonify({"ok": False, "error": "A/B 프롬프트가 모두 필요합니다"}), 400
-
-        has_c = prompts.get('C') is not None
-        print(f"[THUMBNAIL-AI] A/B/C 동시 생성 - 세션: {session_id}, C포함: {has_c}")
+        if not prompt:
+            return jsonify({"ok": False, "error": "프롬프트가 필요합니다"}), 400
 
-        def generate_single(variant, prompt_data):
-            """단일 썸네일 생성 (image 모듈 사용)"""
-            prompt = prompt_data.get('prompt', '')
-            text_overlay = prompt_data.get('text_overlay', {})
-            style = prompt_data.get('style', 'comic')
+        print(f"[THUMBNAIL-AI] 이미지 생성 - 세션: {session_id}, 변형: {variant}")
 
-            main_text = text_overlay.get('main', '')
-            sub_text = text_overlay.get('sub', '')
+        # 텍스트 오버레이 지시 추가
+        main_text = text_overlay.get('main', '')
+        sub_text = text_overlay.get('sub', '')
 
-            text_instruction = ""
-            if main_text:
-                text_instruction = f"""
-IMPORTANT TEXT OVERLAY:
-- Add VERY LARGE, BOLD Korean text "{main_text}" on the LEFT side
-- Text style: WHITE text with THICK BLACK outline
-- Split into 2-4 short lines (3-6 chars each) for maximum impact
-- Add comic emphasis marks (!! effects) if appropriate
+        text_instruction = ""
+        if main_text:
+            text_instruction = f"""
+IMPORTANT TEXT OVERLAY INSTRUCTIONS:
+- Add large, bold Korean text "{main_text}" prominently in the image
+- Text should be highly visible with strong contrast (white text with black outline or vice versa)
+- Text position: center or top area of the image
 """
-                if sub_text:
-                    text_instruction += f'- Subtitle: "{sub_text}" (below main text)\n'
+            if sub_text:
+                text_instruction += f'- Add smaller subtitle "{sub_text}" below the main text\n'
 
-            enhanced_prompt = f"""Create a YouTube thumbnail (16:9 landscape).
+        # 최종 프롬프트 구성
+        enhanced_prompt = f"""Create a YouTube thumbnail image in 16:9 landscape aspect ratio.
 
 {prompt}
 
 {text_instruction}
 
-Style: {style}, comic/illustration, eye-catching, high contrast"""
-
-            try:
-                # Gemini 3 Pro로 이미지 생성 (image 모듈 사용)
-                result = generate_image_base64(prompt=enhanced_prompt, model=GEMINI_PRO)
-                if not result.get("ok"):
-                    return {"variant": variant, "ok": False, "error": result.get("error", "이미지 생성 실패")}
-
-                base64_image_data = result.get("base64")
-                if not base64_image_data:
-                    return {"variant": variant, "ok": False, "error": "이미지 데이터 추출 실패"}
-
-                # 파일 저장
-                timestamp = int(time.time() * 1000)
-                filename = f"thumbnail_ai_{session_id}_{variant}_{timestamp}.png"
-                output_dir = os.path.join(os.path.dirname(__file__), 'outputs')
-                os.makedirs(output_dir, exist_ok=True)
-                filepath = os.path.join(output_dir, filename)
-
-                with open(filepath, 'wb') as f:
-                    f.write(base64.b64decode(base64_image_data))
-
-                return {"variant": variant, "ok": True, "image_url": f'/output/{filename}'}
+Style requirements:
+- High contrast, eye-catching colors
+- Professional YouTube thumbnail quality
+- Comic/illustration style (not photorealistic)
+- Clean composition suitable for small preview
+- {style} aesthetic"""
 
-            except Exception as e:
-                return {"variant": variant, "ok": False, "error": str(e)}
+        # Gemini 3 Pro로 이미지 생성 (image 모듈 사용)
+        result = generate_image_base64(prompt=enhanced_prompt, model=GEMINI_PRO)
+        if not result.get("ok"):
+            return jsonify({"ok": False, "error": result.get("error", "이미지 생성 실패")}), 200
 
-        # 병렬 생성 (A/B/C)
-        results = {"A": None, "B": None, "C": None}
-        max_workers = 3 if has_c else 2
+        base64_image_data = result.get("base64")
+        if not base64_image_data:
+            return jsonify({"ok": False, "error": "이미지 데이터가 없습니다"}), 200
 
-        with ThreadPoolExecutor(max_workers=max_workers) as executor:
-            futures = {
-                executor.submit(generate_single, "A", prompts["A"]): "A",
-                executor.submit(generate_single, "B", prompts["B"]): "B"
-            }
-            if has_c:
-                futures[executor.submit(generate_single, "C", prompts["C"])] = "C"
+        # 파일로 저장
+        timestamp = int(time.time() * 1000)
+        filename = f"thumbnail_ai_{session_id}_{variant}_{timestamp}.png"
 
-            for future in as_completed(futures):
-                result = future.result()
-                results[result["variant"]] = result
+        output_dir = os.path.join(os.path.dirname(__file__), 'outputs')
+        os.makedirs(output_dir, exist_ok=True)
+        filepath = os.path.join(output_dir, filename)
 
-        if not has_c:
-            del results["C"]
+        with open(filepath, 'wb') as f:
+            f.write(base64.b64decode(base64_image_data))
 
-        status_msg = f"A: {results['A'].get('ok')}, B: {results['B'].get('ok')}"
-        if has_c:
-            status_msg += f", C: {results['C'].get('ok')}"
-        print(f"[THUMBNAIL-AI] A/B/C 생성 완료 - {status_msg}")
+        image_url = f'/output/{filename}'
+        print(f"[THUMBNAIL-AI] 이미지 저장 완료: {image_url}")
 
         return jsonify({
             "ok": True,
+            "image_url": image_url,
             "session_id": session_id,
-            "results": results
+            "variant": variant,
+            "prompt_used": enhanced_prompt[:500]
         })
 
     except Exception as e:
@@ -15791,612 +14415,457 @@ Style: {style}, comic/illustration, eye-catching, high contrast"""
         return jsonify({"ok": False, "error": str(e)}), 500
 
 
-@app.route('/api/thumbnail-ai/download-zip', methods=['POST'])
-def api_thumbnail_ai_download_zip():
+@app.route('/api/thumbnail-ai/select', methods=['POST'])
+def api_thumbnail_ai_select():
     """
-    생성된 썸네일들을 ZIP 파일로 다운로드
-    YouTube Test & Compare용 3개 썸네일
+    사용자의 썸네일 선택 저장 (학습 데이터)
     """
     try:
-        import zipfile
-        from io import BytesIO
-
         data = request.get_json() or {}
-        image_urls = data.get('image_urls', {})
-        session_id = data.get('session_id', 'thumbnails')
 
-        if not image_urls:
-            return jsonify({"ok": False, "error": "이미지 URL이 필요합니다"}), 400
+        session_id = data.get('session_id', '')
+        selected = data.get('selected', '')  # "A" or "B"
+        prompts = data.get('prompts', {})
+        script_summary = data.get('script_summary', '')
+        genre = data.get('genre', '일반')
+        title = data.get('title', '')
+        selection_reason = data.get('selection_reason', '')
+        image_urls = data.get('image_urls', {})
 
-        # ZIP 파일 생성
-        zip_buffer = BytesIO()
-        output_dir = os.path.join(os.path.dirname(__file__), 'outputs')
+        if not session_id or not selected:
+            return jsonify({"ok": False, "error": "세션 ID와 선택 정보가 필요합니다"}), 400
 
-        with zipfile.ZipFile(zip_buffer, 'w', zipfile.ZIP_DEFLATED) as zip_file:
-            for variant, url in image_urls.items():
-                if not url:
-                    continue
+        print(f"[THUMBNAIL-AI] 선택 저장 - 세션: {session_id}, 선택: {selected}")
 
-                # /output/xxx.png → outputs/xxx.png
-                if url.startswith('/output/'):
-                    filename = url.replace('/output/', '')
-                    filepath = os.path.join(output_dir, filename)
+        # 학습 데이터 저장
+        history = load_thumbnail_history()
 
-                    if os.path.exists(filepath):
-                        # 파일명을 간단하게 변경 (thumbnail_A.png, thumbnail_B.png, thumbnail_C.png)
-                        zip_filename = f"thumbnail_{variant}.png"
-                        zip_file.write(filepath, zip_filename)
-                        print(f"[THUMBNAIL-ZIP] Added: {zip_filename}")
+        selection_data = {
+            "id": session_id,
+            "timestamp": dt.now().isoformat(),
+            "title": title,
+            "genre": genre,
+            "script_summary": script_summary,
+            "prompts": {
+                "A": prompts.get("A", {}).get("prompt", ""),
+                "B": prompts.get("B", {}).get("prompt", "")
+            },
+            "text_overlays": {
+                "A": prompts.get("A", {}).get("text_overlay", {}),
+                "B": prompts.get("B", {}).get("text_overlay", {})
+            },
+            "image_urls": image_urls,
+            "selected": selected,
+            "selection_reason": selection_reason
+        }
 
-        zip_buffer.seek(0)
+        history["selections"].append(selection_data)
 
-        # ZIP 파일 저장
-        zip_filename = f"thumbnails_{session_id}_{int(time.time())}.zip"
-        zip_filepath = os.path.join(output_dir, zip_filename)
+        # 최대 100개까지만 유지
+        if len(history["selections"]) > 100:
+            history["selections"] = history["selections"][-100:]
 
-        with open(zip_filepath, 'wb') as f:
-            f.write(zip_buffer.getvalue())
+        save_thumbnail_history(history)
 
-        print(f"[THUMBNAIL-ZIP] ZIP 생성 완료: {zip_filename}")
+        print(f"[THUMBNAIL-AI] 학습 데이터 저장 완료 - 총 {len(history['selections'])}개")
 
         return jsonify({
             "ok": True,
-            "zip_url": f"/output/{zip_filename}",
-            "filename": zip_filename
+            "message": "선택이 저장되었습니다",
+            "session_id": session_id,
+            "selected": selected,
+            "total_selections": len(history["selections"])
         })
 
     except Exception as e:
-        print(f"[THUMBNAIL-ZIP][ERROR] {str(e)}")
+        print(f"[THUMBNAIL-AI][ERROR] {str(e)}")
         import traceback
         traceback.print_exc()
         return jsonify({"ok": False, "error": str(e)}), 500
 
 
-# ===== Google Sheets 자동화 시스템 (서비스 계정 인증) =====
-from google.oauth2 import service_account
-from googleapiclient.discovery import build
-
-def get_sheets_service_account():
-    """서비스 계정을 사용하여 Google Sheets API 서비스 객체 반환"""
+@app.route('/api/thumbnail-ai/history', methods=['GET'])
+def api_thumbnail_ai_history():
+    """
+    썸네일 학습 데이터 히스토리 조회
+    """
     try:
-        # 환경변수에서 서비스 계정 JSON 로드
-        service_account_json = os.environ.get('GOOGLE_SERVICE_ACCOUNT_JSON')
-        if not service_account_json:
-            print("[SHEETS] GOOGLE_SERVICE_ACCOUNT_JSON 환경변수가 설정되지 않음")
-            return None
-
-        # JSON 문자열을 dict로 파싱
-        service_account_info = json.loads(service_account_json)
+        limit = request.args.get('limit', 20, type=int)
+        genre_filter = request.args.get('genre', None)
 
-        # 서비스 계정 인증 정보 생성
-        credentials = service_account.Credentials.from_service_account_info(
-            service_account_info,
-            scopes=[
-                'https://www.googleapis.com/auth/spreadsheets',
-                'https://www.googleapis.com/auth/spreadsheets.readonly'
-            ]
-        )
+        history = load_thumbnail_history()
+        selections = history.get("selections", [])
 
-        # Sheets API 서비스 빌드
-        service = build('sheets', 'v4', credentials=credentials)
-        return service
-    except json.JSONDecodeError as e:
-        print(f"[SHEETS] 서비스 계정 JSON 파싱 실패: {e}")
-        return None
-    except Exception as e:
-        print(f"[SHEETS] 서비스 계정 인증 실패: {e}")
-        import traceback
-        traceback.print_exc()
-        return None
+        # 장르 필터
+        if genre_filter:
+            selections = [s for s in selections if s.get("genre") == genre_filter]
 
+        # 최신순 정렬
+        selections = sorted(selections, key=lambda x: x.get("timestamp", ""), reverse=True)
 
-def get_docs_service_account():
-    """서비스 계정을 사용하여 Google Docs API 서비스 객체 반환"""
-    try:
-        service_account_json = os.environ.get('GOOGLE_SERVICE_ACCOUNT_JSON')
-        if not service_account_json:
-            print("[DOCS] GOOGLE_SERVICE_ACCOUNT_JSON 환경변수가 설정되지 않음")
-            return None
+        # limit 적용
+        selections = selections[:limit]
 
-        service_account_info = json.loads(service_account_json)
-        credentials = service_account.Credentials.from_service_account_info(
-            service_account_info,
-            scopes=[
-                'https://www.googleapis.com/auth/documents',
-                'https://www.googleapis.com/auth/documents.readonly'
-            ]
-        )
-        service = build('docs', 'v1', credentials=credentials)
-        return service
-    except json.JSONDecodeError as e:
-        print(f"[DOCS] 서비스 계정 JSON 파싱 실패: {e}")
-        return None
-    except Exception as e:
-        print(f"[DOCS] 서비스 계정 인증 실패: {e}")
-        import traceback
-        traceback.print_exc()
-        return None
+        # 통계 계산
+        all_selections = history.get("selections", [])
+        stats = {
+            "total": len(all_selections),
+            "a_selected": sum(1 for s in all_selections if s.get("selected") == "A"),
+            "b_selected": sum(1 for s in all_selections if s.get("selected") == "B"),
+            "c_selected": sum(1 for s in all_selections if s.get("selected") == "C"),
+            "genres": {}
+        }
 
+        for s in all_selections:
+            g = s.get("genre", "일반")
+            stats["genres"][g] = stats["genres"].get(g, 0) + 1
 
-def get_drive_service_account():
-    """서비스 계정을 사용하여 Google Drive API 서비스 객체 반환"""
-    try:
-        service_account_json = os.environ.get('GOOGLE_SERVICE_ACCOUNT_JSON')
-        if not service_account_json:
-            print("[DRIVE] GOOGLE_SERVICE_ACCOUNT_JSON 환경변수가 설정되지 않음")
-            return None
+        return jsonify({
+            "ok": True,
+            "selections": selections,
+            "stats": stats,
+            "limit": limit,
+            "genre_filter": genre_filter
+        })
 
-        service_account_info = json.loads(service_account_json)
-        credentials = service_account.Credentials.from_service_account_info(
-            service_account_info,
-            scopes=[
-                'https://www.googleapis.com/auth/drive',
-                'https://www.googleapis.com/auth/drive.file'
-            ]
-        )
-        service = build('drive', 'v3', credentials=credentials)
-        return service
-    except json.JSONDecodeError as e:
-        print(f"[DRIVE] 서비스 계정 JSON 파싱 실패: {e}")
-        return None
     except Exception as e:
-        print(f"[DRIVE] 서비스 계정 인증 실패: {e}")
+        print(f"[THUMBNAIL-AI][ERROR] {str(e)}")
         import traceback
         traceback.print_exc()
-        return None
-
-
-# Bible Blueprint 의존성 주입 (함수 정의 완료 후)
-bible_set_sheets_service(get_sheets_service_account)
-bible_set_bgm_mixer(_mix_bgm_with_video)
-bible_set_pipeline_lock(pipeline_lock)
+        return jsonify({"ok": False, "error": str(e)}), 500
 
-# History Blueprint 의존성 주입
-history_set_sheets_service(get_sheets_service_account)
 
-# TTS Blueprint 의존성 주입
-tts_set_lang_ko(lang_ko)
+@app.route('/api/thumbnail-ai/generate-single', methods=['POST'])
+def api_thumbnail_ai_generate_single():
+    """
+    단일 썸네일 생성 (자동화 파이프라인용 - A 하나만 생성)
+    ★ Gemini가 직접 텍스트 렌더링
+    """
+    try:
+        import base64
+        from PIL import Image
+        import io
 
+        data = request.get_json() or {}
+        prompt_data = data.get('prompt', {})
+        session_id = data.get('session_id', '')
+        category = data.get('category', '')
+        lang = data.get('lang', 'ko')
+        style = prompt_data.get('style', '')
 
-def sheets_read_rows(service, sheet_id, range_name='Sheet1!A:H', max_retries=3):
-    """
-    Google Sheets에서 행 읽기 (재시도 로직 포함)
-    반환: [[row1_values], [row2_values], ...] 또는 None (API 실패 시)
+        if not prompt_data.get('prompt'):
+            return jsonify({"ok": False, "error": "prompt 필드가 필요합니다"}), 400
 
-    Note: 빈 시트는 [] 반환, API 실패는 None 반환 (구분 필요)
+        print(f"[THUMBNAIL-AI] 단일 썸네일 생성 - 세션: {session_id}, 카테고리: {category}, 스타일: {style}")
 
-    2026-01: 429 Rate Limit 에러 처리 추가
-    - Google Sheets API 한도: 60 읽기/분/사용자
-    - 429 에러 시 60초 대기 후 재시도
-    """
-    import time as time_module
+        prompt = prompt_data.get('prompt', '')
+        text_overlay = prompt_data.get('text_overlay', {})
+        main_text = text_overlay.get('main', '')
+        sub_text = text_overlay.get('sub', '')
 
-    last_error = None
-    for attempt in range(max_retries):
-        try:
-            result = service.spreadsheets().values().get(
-                spreadsheetId=sheet_id,
-                range=range_name
-            ).execute()
-            return result.get('values', [])
-        except Exception as e:
-            last_error = e
-            error_str = str(e).lower()
-
-            # 429 Rate Limit 에러 체크 (별도 처리)
-            is_rate_limit = '429' in error_str or 'rate_limit' in error_str or 'quota exceeded' in error_str
-
-            # 재시도 가능한 일시적 오류 패턴
-            transient_errors = [
-                'authentication backend unknown error',
-                'backend error',
-                'internal error',
-                'service unavailable',
-                'deadline exceeded',
-                'connection reset',
-                'connection refused',
-                'timeout',
-                '500',
-                '502',
-                '503',
-                '504'
-            ]
+        # 언어에 따른 설정
+        lang_config = {
+            'ja': ("Japanese", "Japanese man or woman"),
+            'en': ("Western", "Western man or woman"),
+        }
+        character_nationality, character_desc = lang_config.get(lang, ("Korean", "Korean man or woman"))
 
-            is_transient = any(pattern in error_str for pattern in transient_errors)
-
-            if is_rate_limit and attempt < max_retries - 1:
-                # 429 에러: 60초 대기 (분당 쿼터 리셋 대기)
-                wait_time = 65  # 60초 + 여유 5초
-                print(f"[SHEETS] Rate Limit 초과 (시도 {attempt + 1}/{max_retries}), {wait_time}초 후 재시도")
-                time_module.sleep(wait_time)
-            elif is_transient and attempt < max_retries - 1:
-                wait_time = (2 ** attempt) * 2  # 2초, 4초, 8초
-                print(f"[SHEETS] 일시적 오류 발생 (시도 {attempt + 1}/{max_retries}), {wait_time}초 후 재시도: {e}")
-                time_module.sleep(wait_time)
-            else:
-                print(f"[SHEETS] 읽기 실패 (시도 {attempt + 1}/{max_retries}): {e}")
-                if not is_transient and not is_rate_limit:
-                    break  # 재시도 불가능한 오류는 바로 종료
+        # 프롬프트에서 불필요한 키워드 제거
+        clean_prompt = prompt
+        for kw in ['stickman', 'stick man', 'photorealistic', 'realistic', 'photograph', 'photo', 'Ghibli', 'anime']:
+            clean_prompt = clean_prompt.replace(kw, '').replace(kw.lower(), '').replace(kw.capitalize(), '')
 
-    print(f"[SHEETS] 최종 읽기 실패 (모든 재시도 소진): {last_error}")
-    return None  # API 실패 시 None 반환 (빈 시트 []와 구분)
+        # 텍스트 오버레이 지시 추가
+        text_instruction = ""
+        if main_text:
+            text_instruction = f"""
+★ TEXT REQUIREMENTS (CRITICAL!) ★
+- Add VERY LARGE, BOLD text "{main_text}" on LEFT side of image
+- Text color: PURE WHITE with THICK BLACK outline (3-4px stroke)
+- Split into 2-4 short lines for maximum impact
+- Text takes 30-40% of image width
+- NO yellow text, NO colored text - WHITE ONLY!
+"""
+            if sub_text:
+                text_instruction += f'- Subtitle below: "{sub_text}"\n'
 
+        # 최종 프롬프트 구성
+        enhanced_prompt = f"""Create a YouTube thumbnail image in 16:9 landscape aspect ratio.
 
-def sheets_update_cell(service, sheet_id, cell_range, value, max_retries=3):
-    """
-    Google Sheets 특정 셀 업데이트 (재시도 로직 포함)
-    cell_range 예시: 'Sheet1!A2' 또는 'Sheet1!G2:H2'
+{clean_prompt}
 
-    2026-01: 429 Rate Limit 에러 처리 추가
-    """
-    import time as time_module
+LAYOUT: Character/subject on RIGHT side (30-40% of frame)
 
-    body = {
-        'values': [[value]] if not isinstance(value, list) else [value]
-    }
+{text_instruction}
 
-    last_error = None
-    for attempt in range(max_retries):
-        try:
-            service.spreadsheets().values().update(
-                spreadsheetId=sheet_id,
-                range=cell_range,
-                valueInputOption='RAW',
-                body=body
-            ).execute()
-            return True
-        except Exception as e:
-            last_error = e
-            error_str = str(e).lower()
-
-            # 429 Rate Limit 에러 체크 (별도 처리)
-            is_rate_limit = '429' in error_str or 'rate_limit' in error_str or 'quota exceeded' in error_str
-
-            # 재시도 가능한 일시적 오류 패턴
-            transient_errors = [
-                'authentication backend unknown error',
-                'backend error',
-                'internal error',
-                'service unavailable',
-                'deadline exceeded',
-                'connection reset',
-                'connection refused',
-                'timeout',
-                '500',
-                '502',
-                '503',
-                '504'
-            ]
+Style: {character_nationality} webtoon style, comic illustration, clean bold outlines, vibrant colors. NOT photorealistic."""
 
-            is_transient = any(pattern in error_str for pattern in transient_errors)
-
-            if is_rate_limit and attempt < max_retries - 1:
-                # 429 에러: 60초 대기 (분당 쿼터 리셋 대기)
-                wait_time = 65  # 60초 + 여유 5초
-                print(f"[SHEETS] 셀 업데이트 Rate Limit 초과 (시도 {attempt + 1}/{max_retries}), {wait_time}초 후 재시도")
-                time_module.sleep(wait_time)
-            elif is_transient and attempt < max_retries - 1:
-                wait_time = (2 ** attempt) * 2  # 2초, 4초, 8초
-                print(f"[SHEETS] 셀 업데이트 일시적 오류 (시도 {attempt + 1}/{max_retries}), {wait_time}초 후 재시도: {e}")
-                time_module.sleep(wait_time)
-            else:
-                print(f"[SHEETS] 셀 업데이트 실패 (시도 {attempt + 1}/{max_retries}): {e}")
-                if not is_transient and not is_rate_limit:
-                    break
+        print(f"[THUMBNAIL-AI] Gemini 프롬프트 (텍스트 직접 생성): {enhanced_prompt[:200]}...")
 
-    print(f"[SHEETS] 셀 업데이트 최종 실패: {cell_range} - {last_error}")
-    return False
+        # Gemini 3 Pro로 이미지 생성 (텍스트 포함)
+        result = generate_image_base64(prompt=enhanced_prompt, model=GEMINI_PRO)
+        if not result.get("ok"):
+            return jsonify({"ok": False, "error": result.get("error", "이미지 생성 실패")})
 
+        base64_image_data = result.get("base64")
+        if not base64_image_data:
+            return jsonify({"ok": False, "error": "이미지 데이터 추출 실패"})
 
-# ========== 시트 동적 매핑 함수들 ==========
+        # 이미지 처리
+        upload_dir = "uploads/thumbnails"
+        os.makedirs(upload_dir, exist_ok=True)
 
-def get_all_sheet_names(service, sheet_id):
-    """
-    Google Sheets 파일의 모든 시트(탭) 이름 가져오기
+        image_bytes = base64.b64decode(base64_image_data)
+        img = Image.open(io.BytesIO(image_bytes))
 
-    화이트리스트 방식:
-    - HISTORY: 히스토리 채널
-    - 혈영이세계: 이세계 드라마 채널
+        # 리사이즈 (1280x720 고정)
+        target_width, target_height = 1280, 720
+        if img.width != target_width or img.height != target_height:
+            img = img.resize((target_width, target_height), Image.LANCZOS)
 
-    위 두 시트만 허용, 나머지는 모두 제외
+        # RGB 변환 후 JPEG 저장
+        if img.mode == 'RGBA':
+            background = Image.new('RGB', img.size, (255, 255, 255))
+            background.paste(img, mask=img.split()[3])
+            img = background
+        elif img.mode != 'RGB':
+            img = img.convert('RGB')
 
-    반환: ['HISTORY', '혈영이세계'] 또는 None (실패 시)
-    """
-    # 메인 파이프라인에서 허용할 시트 목록 (화이트리스트)
-    ALLOWED_SHEETS = {'HISTORY', '혈영이세계'}
+        filename = f"thumb_{session_id}.jpg"
+        filepath = os.path.join(upload_dir, filename)
+        img.save(filepath, 'JPEG', quality=90, optimize=True)
 
-    try:
-        spreadsheet = service.spreadsheets().get(spreadsheetId=sheet_id).execute()
-        sheets = spreadsheet.get('sheets', [])
+        file_size = os.path.getsize(filepath)
+        print(f"[THUMBNAIL-AI] 썸네일 저장: {filepath} ({file_size / 1024:.1f}KB)")
 
-        sheet_names = []
-        for sheet in sheets:
-            name = sheet.get('properties', {}).get('title', '')
-            # 화이트리스트에 있는 시트만 허용
-            if name and name in ALLOWED_SHEETS:
-                sheet_names.append(name)
+        return jsonify({
+            "ok": True,
+            "image_url": f"/uploads/thumbnails/{filename}"
+        })
 
-        print(f"[SHEETS] 허용된 시트: {sheet_names} (화이트리스트: {ALLOWED_SHEETS})")
-        return sheet_names
     except Exception as e:
-        print(f"[SHEETS] 시트 목록 가져오기 실패: {e}")
-        return None
+        print(f"[THUMBNAIL-AI][ERROR] {str(e)}")
+        import traceback
+        traceback.print_exc()
+        return jsonify({"ok": False, "error": str(e)}), 500
 
 
-def get_column_mapping(headers):
+@app.route('/api/thumbnail-ai/generate-both', methods=['POST'])
+@app.route('/api/thumbnail-ai/generate-all', methods=['POST'])
+def api_thumbnail_ai_generate_both():
     """
-    헤더 이름으로 열 인덱스/문자 매핑 생성
-
-    headers: ['상태', '공개설정', '플레이리스트ID', ...]
-    반환: {
-        '상태': {'index': 0, 'letter': 'A'},
-        '공개설정': {'index': 1, 'letter': 'B'},
-        ...
-    }
+    A/B/C 3개의 썸네일을 한 번에 생성 (YouTube Test & Compare용)
     """
-    mapping = {}
-    for idx, header in enumerate(headers):
-        if header:  # 빈 헤더 무시
-            # 열 문자 계산 (0->A, 1->B, ..., 25->Z, 26->AA, ...)
-            col_letter = ''
-            temp_idx = idx
-            while True:
-                col_letter = chr(ord('A') + temp_idx % 26) + col_letter
-                temp_idx = temp_idx // 26 - 1
-                if temp_idx < 0:
-                    break
-
-            mapping[header] = {
-                'index': idx,
-                'letter': col_letter
-            }
-
-    return mapping
+    try:
+        import time
+        import base64
+        from concurrent.futures import ThreadPoolExecutor
 
+        data = request.get_json() or {}
+        prompts = data.get('prompts', {})
+        session_id = data.get('session_id', '')
 
-def get_sheet_channel_id(rows):
-    """
-    시트의 1행에서 채널 ID 추출
+        if not prompts.get('A') or not prompts.get('B'):
+            return jsonify({"ok": False, "error": "A/B 프롬프트가 모두 필요합니다"}), 400
 
-    시트 구조:
-    - A1: '채널ID'
-    - B1: 'UCxxxx...'
+        has_c = prompts.get('C') is not None
+        print(f"[THUMBNAIL-AI] A/B/C 동시 생성 - 세션: {session_id}, C포함: {has_c}")
 
-    반환: 채널 ID 문자열 또는 None
-    """
-    if not rows or len(rows) < 1:
-        return None
+        def generate_single(variant, prompt_data):
+            """단일 썸네일 생성 (image 모듈 사용)"""
+            prompt = prompt_data.get('prompt', '')
+            text_overlay = prompt_data.get('text_overlay', {})
+            style = prompt_data.get('style', 'comic')
 
-    first_row = rows[0]
-    if len(first_row) >= 2 and first_row[0] == '채널ID':
-        return first_row[1].strip() if first_row[1] else None
+            main_text = text_overlay.get('main', '')
+            sub_text = text_overlay.get('sub', '')
 
-    return None
+            text_instruction = ""
+            if main_text:
+                text_instruction = f"""
+IMPORTANT TEXT OVERLAY:
+- Add VERY LARGE, BOLD Korean text "{main_text}" on the LEFT side
+- Text style: WHITE text with THICK BLACK outline
+- Split into 2-4 short lines (3-6 chars each) for maximum impact
+- Add comic emphasis marks (!! effects) if appropriate
+"""
+                if sub_text:
+                    text_instruction += f'- Subtitle: "{sub_text}" (below main text)\n'
 
+            enhanced_prompt = f"""Create a YouTube thumbnail (16:9 landscape).
 
-def get_sheet_account_email(rows):
-    """
-    시트의 1행에서 계정 이메일 추출
+{prompt}
 
-    시트 구조:
-    - C1: '계정'
-    - D1: 'user@gmail.com'
+{text_instruction}
 
-    반환: 이메일 문자열 또는 None
-    """
-    if not rows or len(rows) < 1:
-        return None
+Style: {style}, comic/illustration, eye-catching, high contrast"""
 
-    first_row = rows[0]
-    if len(first_row) >= 4 and first_row[2] == '계정':
-        return first_row[3].strip() if first_row[3] else None
+            try:
+                # Gemini 3 Pro로 이미지 생성 (image 모듈 사용)
+                result = generate_image_base64(prompt=enhanced_prompt, model=GEMINI_PRO)
+                if not result.get("ok"):
+                    return {"variant": variant, "ok": False, "error": result.get("error", "이미지 생성 실패")}
 
-    return None
+                base64_image_data = result.get("base64")
+                if not base64_image_data:
+                    return {"variant": variant, "ok": False, "error": "이미지 데이터 추출 실패"}
 
+                # 파일 저장
+                timestamp = int(time.time() * 1000)
+                filename = f"thumbnail_ai_{session_id}_{variant}_{timestamp}.png"
+                output_dir = os.path.join(os.path.dirname(__file__), 'outputs')
+                os.makedirs(output_dir, exist_ok=True)
+                filepath = os.path.join(output_dir, filename)
 
-def get_row_value(row, col_map, header_name, default=''):
-    """
-    헤더 이름으로 행에서 값 가져오기
+                with open(filepath, 'wb') as f:
+                    f.write(base64.b64decode(base64_image_data))
 
-    row: 데이터 행 리스트
-    col_map: get_column_mapping()의 반환값
-    header_name: 열 이름 (예: '상태', '대본')
-    default: 값이 없을 때 기본값
-    """
-    if header_name not in col_map:
-        return default
+                return {"variant": variant, "ok": True, "image_url": f'/output/{filename}'}
 
-    idx = col_map[header_name]['index']
-    if idx < len(row):
-        return row[idx] if row[idx] else default
-    return default
+            except Exception as e:
+                return {"variant": variant, "ok": False, "error": str(e)}
 
+        # 병렬 생성 (A/B/C)
+        results = {"A": None, "B": None, "C": None}
+        max_workers = 3 if has_c else 2
 
-def sheets_update_cell_by_header(service, sheet_id, sheet_name, row_num, col_map, header_name, value):
-    """
-    헤더 이름으로 특정 셀 업데이트
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {
+                executor.submit(generate_single, "A", prompts["A"]): "A",
+                executor.submit(generate_single, "B", prompts["B"]): "B"
+            }
+            if has_c:
+                futures[executor.submit(generate_single, "C", prompts["C"])] = "C"
 
-    sheet_name: 시트 이름 (예: '뉴스채널')
-    row_num: 행 번호 (1-based)
-    col_map: get_column_mapping()의 반환값
-    header_name: 열 이름 (예: '상태')
-    value: 설정할 값
-    """
-    if header_name not in col_map:
-        print(f"[SHEETS] 경고: 헤더 '{header_name}'을 찾을 수 없음")
-        return False
+            for future in as_completed(futures):
+                result = future.result()
+                results[result["variant"]] = result
 
-    col_letter = col_map[header_name]['letter']
-    cell_range = f"'{sheet_name}'!{col_letter}{row_num}"
+        if not has_c:
+            del results["C"]
 
-    return sheets_update_cell(service, sheet_id, cell_range, value)
+        status_msg = f"A: {results['A'].get('ok')}, B: {results['B'].get('ok')}"
+        if has_c:
+            status_msg += f", C: {results['C'].get('ok')}"
+        print(f"[THUMBNAIL-AI] A/B/C 생성 완료 - {status_msg}")
 
+        return jsonify({
+            "ok": True,
+            "session_id": session_id,
+            "results": results
+        })
 
-# ========== CTR 자동화 설정 ==========
-CTR_THRESHOLD = 3.0  # CTR 3% 미만이면 제목 변경
-CTR_CHECK_DAYS = 7   # 업로드 후 7일 후부터 CTR 체크
+    except Exception as e:
+        print(f"[THUMBNAIL-AI][ERROR] {str(e)}")
+        import traceback
+        traceback.print_exc()
+        return jsonify({"ok": False, "error": str(e)}), 500
 
 
-def get_video_ctr_from_analytics(youtube_analytics, channel_id, video_id):
+@app.route('/api/thumbnail-ai/download-zip', methods=['POST'])
+def api_thumbnail_ai_download_zip():
     """
-    YouTube Analytics API로 영상의 CTR (클릭률) 및 조회수/구독자 데이터 조회
-
-    반환: {
-        'ctr': 4.5,  # 클릭률 (%)
-        'impressions': 10000,  # 노출 수
-        'views': 450,  # 총 조회 수 (28일)
-        'views_today': 50,  # 오늘 조회 수
-        'views_yesterday': 45,  # 어제 조회 수
-        'subscribers_gained': 10,  # 구독자 증가
-        'subscribers_lost': 2  # 구독자 감소
-    } 또는 None (실패 시)
+    생성된 썸네일들을 ZIP 파일로 다운로드
+    YouTube Test & Compare용 3개 썸네일
     """
-    from datetime import datetime, timedelta
-
     try:
-        # 최근 28일간 데이터 조회 (조회수, 구독자 변동)
-        # 참고: impressions, impressionClickThroughRate는 video dimension과 함께 사용 불가
-        end_date = datetime.now().strftime('%Y-%m-%d')
-        start_date = (datetime.now() - timedelta(days=28)).strftime('%Y-%m-%d')
-
-        response = youtube_analytics.reports().query(
-            ids=f'channel=={channel_id}',
-            startDate=start_date,
-            endDate=end_date,
-            metrics='views,subscribersGained,subscribersLost',
-            dimensions='video',
-            filters=f'video=={video_id}'
-        ).execute()
-
-        result = {
-            'views': 0,
-            'impressions': 0,  # Analytics API에서 video별 조회 불가
-            'ctr': 0,  # Analytics API에서 video별 조회 불가
-            'subscribers_gained': 0,
-            'subscribers_lost': 0,
-            'views_today': 0,
-            'views_yesterday': 0
-        }
-
-        rows = response.get('rows', [])
-        if rows and len(rows) > 0:
-            # [video_id, views, subscribersGained, subscribersLost]
-            row = rows[0]
-            result['views'] = int(row[1]) if len(row) > 1 else 0
-            result['subscribers_gained'] = int(row[2]) if len(row) > 2 else 0
-            result['subscribers_lost'] = int(row[3]) if len(row) > 3 else 0
-
-        # 오늘과 어제 조회수 별도 조회 (일별 비교용)
-        try:
-            today = datetime.now().strftime('%Y-%m-%d')
-            yesterday = (datetime.now() - timedelta(days=1)).strftime('%Y-%m-%d')
-
-            # 오늘 조회수
-            today_response = youtube_analytics.reports().query(
-                ids=f'channel=={channel_id}',
-                startDate=today,
-                endDate=today,
-                metrics='views',
-                dimensions='video',
-                filters=f'video=={video_id}'
-            ).execute()
-            today_rows = today_response.get('rows', [])
-            if today_rows and len(today_rows) > 0:
-                result['views_today'] = int(today_rows[0][1]) if len(today_rows[0]) > 1 else 0
-
-            # 어제 조회수
-            yesterday_response = youtube_analytics.reports().query(
-                ids=f'channel=={channel_id}',
-                startDate=yesterday,
-                endDate=yesterday,
-                metrics='views',
-                dimensions='video',
-                filters=f'video=={video_id}'
-            ).execute()
-            yesterday_rows = yesterday_response.get('rows', [])
-            if yesterday_rows and len(yesterday_rows) > 0:
-                result['views_yesterday'] = int(yesterday_rows[0][1]) if len(yesterday_rows[0]) > 1 else 0
+        import zipfile
+        from io import BytesIO
 
-        except Exception as e:
-            print(f"[CTR] 일별 조회수 조회 오류 (무시됨): {e}")
+        data = request.get_json() or {}
+        image_urls = data.get('image_urls', {})
+        session_id = data.get('session_id', 'thumbnails')
 
-        return result if result['views'] > 0 or result['impressions'] > 0 else None
-    except Exception as e:
-        print(f"[CTR] Analytics API 오류: {e}")
-        return None
+        if not image_urls:
+            return jsonify({"ok": False, "error": "이미지 URL이 필요합니다"}), 400
 
+        # ZIP 파일 생성
+        zip_buffer = BytesIO()
+        output_dir = os.path.join(os.path.dirname(__file__), 'outputs')
 
-def get_channel_subscriber_count(youtube, channel_id):
-    """
-    YouTube Data API로 채널의 총 구독자 수 조회
+        with zipfile.ZipFile(zip_buffer, 'w', zipfile.ZIP_DEFLATED) as zip_file:
+            for variant, url in image_urls.items():
+                if not url:
+                    continue
 
-    반환: 구독자 수 (int) 또는 None (실패 시)
-    """
-    try:
-        response = youtube.channels().list(
-            part='statistics',
-            id=channel_id
-        ).execute()
+                # /output/xxx.png → outputs/xxx.png
+                if url.startswith('/output/'):
+                    filename = url.replace('/output/', '')
+                    filepath = os.path.join(output_dir, filename)
 
-        items = response.get('items', [])
-        if items and len(items) > 0:
-            stats = items[0].get('statistics', {})
-            subscriber_count = stats.get('subscriberCount', '0')
-            return int(subscriber_count)
+                    if os.path.exists(filepath):
+                        # 파일명을 간단하게 변경 (thumbnail_A.png, thumbnail_B.png, thumbnail_C.png)
+                        zip_filename = f"thumbnail_{variant}.png"
+                        zip_file.write(filepath, zip_filename)
+                        print(f"[THUMBNAIL-ZIP] Added: {zip_filename}")
 
-        return None
-    except Exception as e:
-        print(f"[CTR] 채널 구독자 수 조회 오류: {e}")
-        return None
+        zip_buffer.seek(0)
 
+        # ZIP 파일 저장
+        zip_filename = f"thumbnails_{session_id}_{int(time.time())}.zip"
+        zip_filepath = os.path.join(output_dir, zip_filename)
 
-def get_video_stats_from_data_api(youtube, video_id):
-    """
-    YouTube Data API v3로 영상의 조회수/좋아요 등 조회 (공개 정보)
+        with open(zip_filepath, 'wb') as f:
+            f.write(zip_buffer.getvalue())
 
-    Analytics API가 권한 문제로 실패할 때 fallback으로 사용
+        print(f"[THUMBNAIL-ZIP] ZIP 생성 완료: {zip_filename}")
 
-    반환: {'views': 123, 'likes': 10, 'comments': 5} 또는 None
-    """
-    try:
-        response = youtube.videos().list(
-            part='statistics',
-            id=video_id
-        ).execute()
+        return jsonify({
+            "ok": True,
+            "zip_url": f"/output/{zip_filename}",
+            "filename": zip_filename
+        })
 
-        items = response.get('items', [])
-        if items and len(items) > 0:
-            stats = items[0].get('statistics', {})
-            return {
-                'views': int(stats.get('viewCount', 0)),
-                'likes': int(stats.get('likeCount', 0)),
-                'comments': int(stats.get('commentCount', 0))
-            }
-        return None
     except Exception as e:
-        print(f"[CTR] Data API 영상 통계 조회 오류: {e}")
-        return None
+        print(f"[THUMBNAIL-ZIP][ERROR] {str(e)}")
+        import traceback
+        traceback.print_exc()
+        return jsonify({"ok": False, "error": str(e)}), 500
 
 
-def extract_video_id_from_url(url):
-    """YouTube URL에서 video ID 추출"""
-    import re
+# ===== Google Sheets 자동화 시스템 (서비스 계정 인증) → scripts/common/sheets_utils.py로 이동 =====
+from google_clients import build_client
+from scripts.common.sheets_utils import (
+    SHEETS_SCOPES,
+    DOCS_SCOPES,
+    DRIVE_SCOPES,
+    get_sheets_service_account,
+    get_docs_service_account,
+    get_drive_service_account,
+    sheets_read_rows,
+    sheets_update_cell,
+    sheets_batch_update_values,
+    get_all_sheet_names,
+    get_column_mapping,
+    get_sheet_channel_id,
+    get_sheet_account_email,
+    get_row_value,
+    sheets_update_cell_by_header,
+)
 
-    if not url:
-        return None
+# Bible Blueprint 의존성 주입 (함수 정의 완료 후)
+bible_set_sheets_service(get_sheets_service_account)
+bible_set_bgm_mixer(_mix_bgm_with_video)
+bible_set_pipeline_lock(pipeline_lock)
 
-    # 다양한 YouTube URL 형식 지원
-    patterns = [
-        r'(?:youtube\.com/watch\?v=|youtu\.be/|youtube\.com/embed/)([a-zA-Z0-9_-]{11})',
-        r'(?:youtube\.com/shorts/)([a-zA-Z0-9_-]{11})'
-    ]
+# History Blueprint 의존성 주입
+history_set_sheets_service(get_sheets_service_account)
+
+# TTS Blueprint 의존성 주입
+tts_set_lang_ko(lang_ko)
 
-    for pattern in patterns:
-        match = re.search(pattern, url)
-        if match:
-            return match.group(1)
 
-    return None
+# ========== CTR 자동화 (YouTube 통계 조회) → scripts/common/youtube_utils.py로 이동 ==========
+from scripts.common.youtube_utils import (
+    CTR_THRESHOLD,
+    CTR_CHECK_DAYS,
+    get_video_ctr_from_analytics,
+    get_channel_subscriber_count,
+    get_channel_subscriber_count_cached,
+    get_video_stats_from_data_api,
+    collect_videos_ctr_batch,
+    extract_video_id_from_url,
+)
 
 
 # ========== TubeLens 통합 기능 (자동화 파이프라인용) ==========
@@ -16856,8 +15325,9 @@ def analyze_channel_shorts_style(channel_id: str) -> dict:
             return {"analyzed": False, "summary": "분석할 쇼츠가 부족함"}
 
         # 쇼츠 썸네일 분석 (GPT-5.1 Responses API 사용)
-        from openai import OpenAI
-        client = OpenAI()
+        client = llm_clients.require_client(
+            "openai", call_site="channel-shorts-style", cache_ttl=llm_clients.DEFAULT_CACHE_TTL
+        )
 
         # GPT-5.1 Responses API용 input 구성
         system_prompt = "당신은 YouTube Shorts 전문가입니다. 성공적인 쇼츠의 시각적 패턴을 분석합니다."
@@ -16916,7 +15386,11 @@ JSON 형식으로 답변해주세요:
         elif "```" in result_text:
             result_text = result_text.split("```")[1].split("```")[0].strip()
 
-        result = json.loads(result_text)
+        try:
+            result = json.loads(result_text)
+        except json.JSONDecodeError:
+            llm_clients.invalidate(response)
+            raise
         result["analyzed"] = True
         result["shorts_count"] = len(top_shorts)
 
@@ -17136,6 +15610,7 @@ def run_automation_pipeline(row_data, row_index, selected_project=''):
     import requests as req
     import time as time_module
 
+    clip_dir = None  # 2단계 사전 인코딩 클립 폴더 (어떤 경로로 끝나든 finally에서 삭제)
     try:
         # 시트 컬럼 구조:
         # ===== Google Sheets 컬럼 구조 (CLAUDE.md 기준) =====
@@ -17437,7 +15912,7 @@ def run_automation_pipeline(row_data, row_index, selected_project=''):
             traceback.print_exc()
             return {"ok": False, "error": f"대본 분석 오류: {str(e)}", "video_url": None, "cost": total_cost}
 
-        # ========== 2. 병렬 처리: 이미지 + TTS + 썸네일 ==========
+        # ========== 2. 씬 파이프라인: 이미지 + TTS → 클립 인코딩 (+ 썸네일) ==========
         # 환경변수 사전 검증
         openrouter_key = os.getenv("OPENROUTER_API_KEY", "")
         if not openrouter_key:
@@ -17447,105 +15922,94 @@ def run_automation_pipeline(row_data, row_index, selected_project=''):
             key_preview = f"{openrouter_key[:8]}...{openrouter_key[-4:]}" if len(openrouter_key) > 12 else "***"
             print(f"[AUTOMATION] OpenRouter API 키 확인: {key_preview}")
 
-        print(f"[AUTOMATION] 2. 병렬 처리 시작 (이미지 {len(scenes)}개 + TTS + 썸네일)...")
-        from concurrent.futures import ThreadPoolExecutor, as_completed
+        print(f"[AUTOMATION] 2. 병렬 처리 시작 (이미지 {len(scenes)}개 + TTS + 클립 인코딩 + 썸네일)...")
+        import shutil
+        from concurrent.futures import ThreadPoolExecutor
+        from scripts.common.scene_pipeline import run_scene_pipeline, PipelineAbort
 
         thumbnail_url = None
         parallel_errors = []
 
-        def generate_images():
-            """이미지 생성 (병렬 작업 1) - 4개씩 병렬 처리"""
-            nonlocal total_cost
-            from concurrent.futures import ThreadPoolExecutor as ImgExecutor, as_completed as img_completed
-
-            print(f"[AUTOMATION][IMAGE] 이미지 생성 시작 ({len(scenes)}개, 4개씩 병렬)...")
+        # ★ 씬 단위 파이프라인: 이미지/TTS가 끝난 씬부터 바로 클립 인코딩 (병합은 3단계에서)
+        clip_dir = os.path.join("uploads", f"pipeline_{session_id}")
+        os.makedirs(clip_dir, exist_ok=True)
 
-            def generate_single_image(idx, scene):
-                """단일 이미지 생성 (실패 시 3회 재시도) - 직접 함수 호출"""
-                prompt = scene.get('image_prompt', '')
-                if not prompt:
-                    return idx, None
-
-                max_retries = 3
-                for attempt in range(max_retries):
-                    try:
-                        # HTTP 호출 대신 직접 함수 호출 (self-deadlock 방지)
-                        result = image_generate(prompt=prompt, size="1280x720", model=GEMINI_PRO)
+        def generate_scene_image(idx):
+            """씬 이미지 생성 (실패 시 3회 재시도) - 직접 함수 호출"""
+            prompt = scenes[idx].get('image_prompt', '')
+            if not prompt:
+                return None
 
-                        if result.get('ok') and result.get('image_url'):
-                            print(f"[AUTOMATION][IMAGE] {idx+1}/{len(scenes)} 완료")
-                            return idx, result['image_url']
-                        else:
-                            error_msg = result.get('error', '알 수 없는 오류')
-                            print(f"[AUTOMATION][IMAGE] {idx+1} 실패 (시도 {attempt+1}/{max_retries}): {error_msg}")
-                    except Exception as e:
-                        print(f"[AUTOMATION][IMAGE] {idx+1} 오류 (시도 {attempt+1}/{max_retries}): {e}")
+            max_retries = 3
+            for attempt in range(max_retries):
+                try:
+                    # HTTP 호출 대신 직접 함수 호출 (self-deadlock 방지)
+                    result = image_generate(prompt=prompt, size="1280x720", model=GEMINI_PRO)
 
-                    if attempt < max_retries - 1:
-                        time_module.sleep(2)  # 재시도 전 대기
+                    if result.get('ok') and result.get('image_url'):
+                        scenes[idx]['image_url'] = result['image_url']
+                        print(f"[AUTOMATION][IMAGE] {idx+1}/{len(scenes)} 완료")
+                        return result['image_url']
+                    else:
+                        error_msg = result.get('error', '알 수 없는 오류')
+                        print(f"[AUTOMATION][IMAGE] {idx+1} 실패 (시도 {attempt+1}/{max_retries}): {error_msg}")
+                except Exception as e:
+                    print(f"[AUTOMATION][IMAGE] {idx+1} 오류 (시도 {attempt+1}/{max_retries}): {e}")
 
-                print(f"[AUTOMATION][IMAGE] {idx+1} 최종 실패 (3회 시도)")
-                return idx, None
+                if attempt < max_retries - 1:
+                    time_module.sleep(2)  # 재시도 전 대기
 
-            # 4개씩 병렬 처리
-            with ImgExecutor(max_workers=4) as img_executor:
-                futures = {
-                    img_executor.submit(generate_single_image, i, scene): i
-                    for i, scene in enumerate(scenes)
-                }
+            print(f"[AUTOMATION][IMAGE] {idx+1} 최종 실패 (3회 시도)")
+            return None
 
-                for future in img_completed(futures):
-                    idx, image_url = future.result()
-                    if image_url:
-                        scenes[idx]['image_url'] = image_url
-
-            success_count = len([s for s in scenes if s.get('image_url')])
-            image_cost = success_count * 0.05  # Gemini 3 Pro 비용
-            total_cost += image_cost
-            print(f"[AUTOMATION][IMAGE] 완료: {success_count}/{len(scenes)}개 (비용: ${image_cost:.2f})")
-            return success_count
-
-        def generate_tts():
-            """TTS 생성 (병렬 작업 2)"""
-            nonlocal total_cost
-            print(f"[AUTOMATION][TTS] TTS 생성 시작...")
+        def generate_scene_tts(idx):
+            """씬 TTS 생성 - TTS 워커가 1개라 씬 순서대로 호출 (Gemini Rate Limit 동작은 배치와 동일)"""
+            scene = scenes[idx]
             try:
-                scenes_for_tts = []
-                for i, scene in enumerate(scenes):
-                    scenes_for_tts.append({
-                        "scene_number": i + 1,
+                assets_resp = req.post(f"{base_url}/api/image/generate-assets-zip", json={
+                    "session_id": f"{session_id}_{idx + 1:02d}",
+                    "scenes": [{
+                        "scene_number": idx + 1,
                         "text": scene.get('narration', ''),
-                        "image_url": scene.get('image_url', ''),
+                        "image_url": '',
                         "subtitle_segments": scene.get('subtitle_segments', [])  # VRCS 2.0 문장별 자막
-                    })
-
-                assets_resp = req.post(f"{base_url}/api/image/generate-assets-zip", json={
-                    "session_id": session_id,
-                    "scenes": scenes_for_tts,
+                    }],
                     "voice": voice,
                     "include_images": False
-                }, timeout=900)  # 15분 (긴 대본 + Gemini Rate Limit 배치 처리용)
-
+                }, timeout=900)
                 assets_data = assets_resp.json()
-                if not assets_data.get('ok'):
-                    raise Exception(f"TTS 실패: {assets_data.get('error')}")
-
-                scene_metadata = assets_data.get('scene_metadata', [])
-                for sm in scene_metadata:
-                    idx = sm.get('scene_idx', -1)
-                    if 0 <= idx < len(scenes):
-                        scenes[idx]['audio_url'] = sm.get('audio_url')
-                        scenes[idx]['duration'] = sm.get('duration', 5)
-                        scenes[idx]['subtitles'] = sm.get('subtitles', [])
-
-                tts_cost = len(script) * 0.000004
-                total_cost += tts_cost
-                print(f"[AUTOMATION][TTS] 완료: {len(scene_metadata)}개 씬 (비용: ${tts_cost:.3f})")
-                return True
             except Exception as e:
-                print(f"[AUTOMATION][TTS] 오류: {e}")
                 parallel_errors.append(f"TTS: {str(e)}")
-                return False
+                raise PipelineAbort(f"TTS 오류 (씬 {idx + 1}): {e}")
+
+            if not assets_data.get('ok'):
+                parallel_errors.append(f"TTS: {assets_data.get('error')}")
+                # TTS 실패 시 중단 (남은 이미지 생성 비용 절약)
+                raise PipelineAbort(f"TTS 실패 (씬 {idx + 1}): {assets_data.get('error')}")
+
+            for sm in assets_data.get('scene_metadata', []):
+                scene['audio_url'] = sm.get('audio_url')
+                scene['duration'] = sm.get('duration', 5)
+                scene['subtitles'] = sm.get('subtitles', [])
+
+            # 씬별 호출이라 CapCut ZIP은 필요 없음
+            zip_url = assets_data.get('zip_url', '')
+            if zip_url:
+                try:
+                    os.remove(zip_url.lstrip('/'))
+                except OSError:
+                    pass
+
+            print(f"[AUTOMATION][TTS] {idx+1}/{len(scenes)} 완료 ({scene.get('duration', 0):.1f}초)")
+            return scene.get('audio_url')
+
+        def encode_scene_clip(idx, stage_results):
+            """이미지 + TTS가 모두 끝난 씬의 클립 인코딩 (FFmpeg 세마포어로 다른 영상 작업과 메모리 보호)"""
+            if not stage_results.get('image'):
+                return None
+            with ffmpeg_semaphore:
+                _, clip_path, _ = _create_scene_clip_worker((idx, scenes[idx], clip_dir, len(scenes)))
+            return clip_path
 
         def generate_thumbnail():
             """썸네일 생성 (병렬 작업 3) - 대본 분석에서 생성된 ai_prompts 사용 (웹툰 스타일)"""
@@ -17781,40 +16245,46 @@ NO photorealistic."""
                 print(f"[AUTOMATION][THUMB] 오류: {e}")
                 return None
 
-        # ★ TTS 먼저 실행 (저비용, 실패 시 이미지 생성 비용 절약)
-        print(f"[AUTOMATION] 2a. TTS 생성 시작 (이미지보다 먼저 실행)...", flush=True)
-        tts_success = generate_tts()
-
-        # TTS 실패 시 즉시 중단 (비싼 이미지 생성 방지)
-        if not tts_success or not any(s.get('audio_url') for s in scenes):
-            return {"ok": False, "error": f"TTS 생성 실패: {'; '.join(parallel_errors)}", "video_url": None, "cost": total_cost}
+        # ★ 씬 단위 데이터플로우: 이미지(4개 동시) / TTS(1개, 씬 순서) → 둘 다 끝난 씬부터 클립 인코딩
+        # 썸네일은 씬과 무관하므로 별도 스레드에서 동시에 진행
+        print("[AUTOMATION] 2a. 씬 파이프라인 시작 (이미지 + TTS + 클립 인코딩 동시 진행)...", flush=True)
+        with ThreadPoolExecutor(max_workers=1) as thumb_executor:
+            thumb_future = thumb_executor.submit(generate_thumbnail)
+
+            outcome = run_scene_pipeline(
+                len(scenes),
+                stages={"image": (generate_scene_image, 4), "tts": (generate_scene_tts, 1)},
+                finish=(encode_scene_clip, 1),
+                label="AUTOMATION][PIPELINE",
+            )
 
-        print(f"[AUTOMATION] 2b. TTS 성공, 이미지/썸네일 병렬 생성 시작...", flush=True)
+            try:
+                thumb_future.result()
+                print("[AUTOMATION] 병렬 작업 완료: thumbnail")
+            except Exception as e:
+                print(f"[AUTOMATION] 병렬 작업 실패: thumbnail - {e}")
+                parallel_errors.append(f"thumbnail: {str(e)}")
 
-        # TTS 성공 후 이미지/썸네일 병렬 실행
-        with ThreadPoolExecutor(max_workers=2) as executor:
-            futures = {
-                executor.submit(generate_images): "images",
-                executor.submit(generate_thumbnail): "thumbnail"
-            }
+        # TTS 실패 시 중단
+        if outcome["aborted"] or not any(s.get('audio_url') for s in scenes):
+            return {"ok": False, "error": f"TTS 생성 실패: {'; '.join(parallel_errors) or outcome['aborted']}", "video_url": None, "cost": total_cost}
 
-            for future in as_completed(futures):
-                task_name = futures[future]
-                try:
-                    result = future.result()
-                    print(f"[AUTOMATION] 병렬 작업 완료: {task_name}")
-                except Exception as e:
-                    print(f"[AUTOMATION] 병렬 작업 실패: {task_name} - {e}")
-                    parallel_errors.append(f"{task_name}: {str(e)}")
+        tts_cost = len(script) * 0.000004
+        total_cost += tts_cost
+        print(f"[AUTOMATION][TTS] 완료: {len([s for s in scenes if s.get('audio_url')])}개 씬 (비용: ${tts_cost:.3f})")
 
         # 이미지 실패 시 중단 (최소 1개 이상 필요)
         image_success_count = len([s for s in scenes if s.get('image_url')])
+        image_cost = image_success_count * 0.05  # Gemini 3 Pro 비용
+        total_cost += image_cost
+        print(f"[AUTOMATION][IMAGE] 완료: {image_success_count}/{len(scenes)}개 (비용: ${image_cost:.2f})")
         if image_success_count == 0:
             return {"ok": False, "error": f"이미지 생성 실패: 모든 이미지 생성에 실패했습니다", "video_url": None, "cost": total_cost}
         elif image_success_count < len(scenes):
             print(f"[AUTOMATION] 경고: 이미지 {image_success_count}/{len(scenes)}개만 생성됨")
 
-        print(f"[AUTOMATION] 2. 병렬 처리 완료", flush=True)
+        clip_count = len([c for c in outcome["finished"].values() if c and not isinstance(c, Exception)])
+        print(f"[AUTOMATION] 2. 씬 파이프라인 완료 (클립 {clip_count}/{len(scenes)}개 사전 인코딩)", flush=True)
 
         # ========== 3. 영상 생성 (/api/image/generate-video) ==========
         print(f"[AUTOMATION] 3. 영상 생성 시작...", flush=True)
@@ -17833,7 +16303,8 @@ NO photorealistic."""
                     "session_id": session_id,
                     "scenes": scenes,
                     "language": "ko",  # 한글 자막용 NanumGothic 폰트 적용
-                    "video_effects": video_effects  # 새 기능: BGM, 효과음, 자막 강조, Ken Burns 등
+                    "video_effects": video_effects,  # 새 기능: BGM, 효과음, 자막 강조, Ken Burns 등
+                    "clip_dir": clip_dir  # 2단계에서 미리 인코딩한 씬 클립 → 병합부터 진행
                 }, timeout=600)
 
                 video_data = video_resp.json()
@@ -18304,6 +16775,11 @@ NO photorealistic."""
             "video_url": None,
             "cost": 0.0
         }
+    finally:
+        # 사전 인코딩 클립 정리 (3단계 재시도에서도 재사용하므로 파이프라인이 끝날 때 삭제)
+        if clip_dir:
+            import shutil
+            shutil.rmtree(clip_dir, ignore_errors=True)
 
 
 # NOTE: 레거시 _automation_* 함수들 삭제됨 (2025-12-12)
@@ -18371,16 +16847,10 @@ def api_sheets_check_and_process():
     import sys
     print(f"[SHEETS] ===== check-and-process 호출됨 =====", flush=True)
 
-    # ========== 동시 실행 방지 Lock ==========
-    # 다른 worker에서 이미 파이프라인이 실행 중이면 즉시 반환
-    if not pipeline_lock.acquire(blocking=False):
-        print("[SHEETS] 다른 파이프라인이 이미 실행 중 - 스킵")
-        return jsonify({
-            "ok": True,
-            "message": "다른 파이프라인이 이미 실행 중입니다",
-            "skipped": True,
-            "processed": 0
-        })
+    # ========== 동시 실행 방지 (프로세스 간 리스) ==========
+    # 시트별 리스('sheets:<시트명>')를 5단계에서 스케줄러가 획득
+    # 그룹 동시 실행 상한(PIPELINE_MAX_CONCURRENT, 기본 1)으로 워커 간 중복 실행 방지
+    claimed_lease = None
 
     try:
         from datetime import datetime, timedelta, timezone
@@ -18436,7 +16906,8 @@ def api_sheets_check_and_process():
         print(f"[SHEETS] 총 {len(sheet_names)}개 채널 시트 확인: {sheet_names}")
 
         # ========== 2. 모든 시트에서 처리중 상태 확인 ==========
-        # 어떤 시트에서든 처리중이면 새 작업 시작 안함
+        # 처리중인 시트는 이번 스케줄링에서 제외 (동시 실행 상한에 도달하면 새 작업 시작 안함)
+        busy_sheets = {}  # {시트이름: (행번호, 경과분)}
         # 2026-01: Rate Limit 방지를 위해 시트 읽기 간 딜레이 추가
         import time as time_module
         SHEET_READ_DELAY = 1.2  # 60 reads/min = 1 read/sec, 여유 0.2초 추가
@@ -18470,8 +16941,9 @@ def api_sheets_check_and_process():
                             work_dt = datetime.strptime(work_time, '%Y-%m-%d %H:%M:%S')
                             elapsed_minutes = (now - work_dt).total_seconds() / 60
 
-                            # 서버 재시작 감지: 작업 시작 시간이 서버 시작 시간보다 이전이면 orphan 작업
-                            if work_dt < SERVER_START_TIME:
+                            # 서버 재시작 감지: 작업 시작 시간이 서버 시작 시간보다 이전이고
+                            # 어느 워커도 해당 시트 리스를 보유하지 않으면 orphan 작업
+                            if work_dt < SERVER_START_TIME and not is_leased(sheet_lease_name(sheet_name)):
                                 print(f"[SHEETS] [{sheet_name}] 행 {i}: 서버 재시작으로 orphan 작업 감지 - 대기로 변경")
                                 print(f"  - 작업 시작: {work_time}, 서버 시작: {SERVER_START_TIME.strftime('%Y-%m-%d %H:%M:%S')}")
                                 sheets_update_cell_by_header(service, sheet_id, sheet_name, i, col_map, '상태', '대기')
@@ -18488,15 +16960,9 @@ def api_sheets_check_and_process():
                                 sheets_update_cell_by_header(service, sheet_id, sheet_name, i, col_map, '에러메시지', f'타임아웃: {elapsed_minutes:.0f}분 경과')
                                 continue
                             else:
-                                # 아직 처리중 → 전체 대기
-                                print(f"[SHEETS] [{sheet_name}] 행 {i}에서 처리중 ({elapsed_minutes:.1f}분 경과) - 새 작업 시작 안함")
-                                return jsonify({
-                                    "ok": True,
-                                    "message": f"[{sheet_name}] 행 {i}에서 처리중인 작업이 있어 대기합니다",
-                                    "processing_sheet": sheet_name,
-                                    "processing_row": i,
-                                    "processed": 0
-                                })
+                                # 아직 처리중 → 해당 시트는 이번 스케줄링에서 제외
+                                print(f"[SHEETS] [{sheet_name}] 행 {i}에서 처리중 ({elapsed_minutes:.1f}분 경과)")
+                                busy_sheets.setdefault(sheet_name, (i, elapsed_minutes))
                         except ValueError:
                             # 시간 형식 파싱 실패 → 실패로 처리
                             print(f"[SHEETS] [{sheet_name}] 행 {i}: 시작시간 형식 오류 - 실패 처리")
@@ -18510,9 +16976,22 @@ def api_sheets_check_and_process():
                         sheets_update_cell_by_header(service, sheet_id, sheet_name, i, col_map, '에러메시지', '시작시간 없음 (서버 재시작)')
                         continue
 
+        if busy_sheets and len(busy_sheets) >= max(PIPELINE_MAX_CONCURRENT, 1):
+            busy_name, (busy_row, _) = next(iter(busy_sheets.items()))
+            print(f"[SHEETS] 처리중 시트 {len(busy_sheets)}개 (상한 {PIPELINE_MAX_CONCURRENT}) - 새 작업 시작 안함")
+            return jsonify({
+                "ok": True,
+                "message": f"[{busy_name}] 행 {busy_row}에서 처리중인 작업이 있어 대기합니다",
+                "processing_sheet": busy_name,
+                "processing_row": busy_row,
+                "processed": 0
+            })
+
         # ========== 2.5 HISTORY 시트 '준비' → 대본 생성 → '대기' ==========
         # 영상 생성 전에 먼저 대본이 없는 에피소드의 대본을 자동 생성
-        if 'HISTORY' in sheet_names:
+        # (대본 생성은 렌더링이 없으므로 동시 실행 상한과 무관한 별도 리스로 중복만 방지)
+        script_lease = PipelineLease('history-script', group=None)
+        if 'HISTORY' in sheet_names and script_lease.acquire(blocking=False):
             try:
                 history_rows = sheets_read_rows(service, sheet_id, "'HISTORY'!A:AZ")
                 if history_rows and len(history_rows) >= 3:
@@ -18565,6 +17044,8 @@ def api_sheets_check_and_process():
                 print(f"[HISTORY] 대본 자동 생성 오류 (무시하고 계속): {history_err}")
                 import traceback
                 traceback.print_exc()
+            finally:
+                script_lease.release()
 
         # ========== 3. 모든 시트에서 대기 작업 수집 ==========
         pending_tasks = []  # [(예약시간, 시트순서, 시트이름, 행번호, 행데이터, 채널ID, col_map)]
@@ -18641,9 +17122,44 @@ def api_sheets_check_and_process():
                 "sheets_checked": sheet_names
             })
 
-        # ========== 5. 첫 번째 작업 실행 ==========
-        sort_key, sheet_name, row_num, row_data, channel_id, col_map = pending_tasks[0]
-        print(f"[SHEETS] [{sheet_name}] 행 {row_num} 처리 시작 (채널: {channel_id})")
+        # ========== 5. 리스를 획득할 수 있는 첫 번째 작업 실행 ==========
+        # 처리중인 시트와 다른 워커가 리스를 보유한 시트는 건너뜀
+        # 리스 획득 후 상태 셀을 다시 읽어, 스캔 이후 다른 워커가 처리한 행이면 리스를 풀고 다음 작업으로
+        busy_names = {sheet_lease_name(name) for name in busy_sheets}
+        remaining_tasks = list(pending_tasks)
+        while True:
+            task, claimed_lease = claim_first(
+                remaining_tasks,
+                lambda t: sheet_lease_name(t[1]),
+                busy_names=busy_names
+            )
+            if task is None:
+                break
+
+            _, claimed_sheet, claimed_row, _, _, claimed_col_map = task
+            status_rows = sheets_read_rows(
+                service, sheet_id, f"'{claimed_sheet}'!{claimed_col_map['상태']['letter']}{claimed_row}"
+            )
+            current_status = status_rows[0][0] if status_rows and status_rows[0] else ''
+            if status_rows is not None and current_status == '대기':
+                break
+
+            print(f"[SHEETS] [{claimed_sheet}] 행 {claimed_row}: 상태가 '{current_status or '읽기 실패'}'(으)로 바뀜 - 리스 해제 후 건너뛰기")
+            claimed_lease.release()
+            claimed_lease = None
+            remaining_tasks.remove(task)
+
+        if task is None:
+            print("[SHEETS] 모든 대기 작업이 다른 워커에서 처리 중이거나 동시 실행 상한 도달 - 스킵")
+            return jsonify({
+                "ok": True,
+                "message": "다른 파이프라인이 이미 실행 중입니다",
+                "skipped": True,
+                "processed": 0
+            })
+
+        sort_key, sheet_name, row_num, row_data, channel_id, col_map = task
+        print(f"[SHEETS] [{sheet_name}] 행 {row_num} 처리 시작 (채널: {channel_id}, 리스: {claimed_lease.name})")
 
         # ★★★ Race Condition 방지: 상태를 즉시 '처리중'으로 변경 ★★★
         # 다른 워커/cron이 같은 작업을 중복 처리하지 않도록
@@ -18839,9 +17355,10 @@ def api_sheets_check_and_process():
         traceback.print_exc()
         return jsonify({"ok": False, "error": str(e)}), 500
     finally:
-        # 항상 lock 해제
-        pipeline_lock.release()
-        print("[SHEETS] 파이프라인 Lock 해제됨")
+        # 획득한 리스 해제
+        if claimed_lease is not None:
+            claimed_lease.release()
+            print(f"[SHEETS] 파이프라인 리스 해제됨: {claimed_lease.name}")
 
 
 def run_automation_pipeline_v2(pipeline_data, sheet_name, row_num, col_map, selected_project=''):
@@ -18967,7 +17484,6 @@ def api_sheets_check_ctr_and_update_titles():
             }), 400
 
         # YouTube API 모듈 임포트
-        from googleapiclient.discovery import build
         from google.oauth2.credentials import Credentials
         from google.auth.transport.requests import Request
 
@@ -18988,6 +17504,8 @@ def api_sheets_check_ctr_and_update_titles():
         checked_count = 0
         updated_count = 0
         results = []
+        subscriber_cache = {}  # 채널ID → 구독자 수 (이번 실행 동안 재사용)
+        pending_updates = []   # [(cell_range, value)] - 마지막에 한 번에 기록
 
         for sheet_name in sheet_names:
             rows = sheets_read_rows(service, sheet_id, f"'{sheet_name}'!A:AZ")
@@ -19040,8 +17558,8 @@ def api_sheets_check_ctr_and_update_titles():
                     }
                     save_youtube_token_to_db(updated_token, channel_id=token_key)
 
-                youtube = build('youtube', 'v3', credentials=creds)
-                youtube_analytics = build('youtubeAnalytics', 'v2', credentials=creds)
+                youtube = build_client('youtube', 'v3', creds)
+                youtube_analytics = build_client('youtubeAnalytics', 'v2', creds)
                 print(f"[CTR] [{sheet_name}] YouTube API 초기화 성공 (account: {account_email or 'N/A'})")
             except Exception as e:
                 print(f"[CTR] [{sheet_name}] YouTube API 초기화 실패: {e}")
@@ -19054,12 +17572,12 @@ def api_sheets_check_ctr_and_update_titles():
                 })
                 continue
 
-            # F1에 채널 구독자 수 기록
+            # F1에 채널 구독자 수 기록 (같은 채널은 실행 중 한 번만 조회)
             try:
-                subscriber_count = get_channel_subscriber_count(youtube, channel_id)
+                subscriber_count = get_channel_subscriber_count_cached(youtube, channel_id, subscriber_cache)
                 if subscriber_count is not None:
-                    sheets_update_cell(service, sheet_id, f"'{sheet_name}'!F1", f"구독자: {subscriber_count:,}명")
-                    print(f"[CTR] [{sheet_name}] F1에 구독자 수 기록: {subscriber_count:,}명")
+                    pending_updates.append((f"'{sheet_name}'!F1", f"구독자: {subscriber_count:,}명"))
+                    print(f"[CTR] [{sheet_name}] F1 구독자 수 기록 예약: {subscriber_count:,}명")
             except Exception as e:
                 print(f"[CTR] [{sheet_name}] F1 구독자 수 기록 실패: {e}")
 
@@ -19067,17 +17585,21 @@ def api_sheets_check_ctr_and_update_titles():
             headers = rows[1]
             col_map = get_column_mapping(headers)
 
-            required_headers = ['상태', '영상URL', '작업시간', '제목(GPT생성)', '제목2', '제목3', 'CTR', '노출수', '제목변경일']
             if not all(h in col_map for h in ['상태', '영상URL', '작업시간']):
                 print(f"[CTR] [{sheet_name}] 필수 헤더 없음, 건너뛰기")
                 continue
 
-            # 데이터 행 순회 (행3부터)
+            def queue_update(row_num, header_name, value):
+                """헤더 이름 기준 셀 업데이트를 배치 목록에 추가"""
+                if header_name in col_map:
+                    col_letter = col_map[header_name]['letter']
+                    pending_updates.append((f"'{sheet_name}'!{col_letter}{row_num}", value))
+
+            # 1) 대상 행 수집 (행3부터)
+            targets = []
             for i, row in enumerate(rows[2:], start=3):
                 status = get_row_value(row, col_map, '상태')
                 video_url = get_row_value(row, col_map, '영상URL')
-                work_time_str = get_row_value(row, col_map, '작업시간')
-                title_changed_date = get_row_value(row, col_map, '제목변경일')
 
                 # 완료 상태 + 영상URL 있음
                 if status != '완료' or not video_url:
@@ -19088,25 +17610,21 @@ def api_sheets_check_ctr_and_update_titles():
                 if not video_id:
                     continue
 
-                checked_count += 1
-
-                # CTR 및 조회수/구독 데이터 조회 (Analytics API)
-                ctr_data = get_video_ctr_from_analytics(youtube_analytics, channel_id, video_id)
-
-                # Analytics API 실패 시 Data API로 조회수만 가져오기 (fallback)
-                if not ctr_data:
-                    data_api_stats = get_video_stats_from_data_api(youtube, video_id)
-                    if data_api_stats:
-                        ctr_data = {
-                            'views': data_api_stats.get('views', 0),
-                            'impressions': 0,
-                            'ctr': 0,
-                            'subscribers_gained': 0,
-                            'subscribers_lost': 0,
-                            'views_today': 0,
-                            'views_yesterday': 0
-                        }
-                        print(f"[CTR] Data API fallback 사용: video={video_id}, views={ctr_data['views']}")
+                targets.append((i, row, video_id))
+
+            checked_count += len(targets)
+
+            # 2) CTR 및 조회수/구독 데이터 채널 단위 배치 조회 (Analytics API + Data API fallback)
+            ctr_by_video = collect_videos_ctr_batch(
+                youtube, youtube_analytics, channel_id, [video_id for _, _, video_id in targets]
+            )
+            print(f"[CTR] [{sheet_name}] {len(targets)}개 영상 중 {len(ctr_by_video)}개 통계 수집")
+
+            # 3) 행별 결과 반영
+            for i, row, video_id in targets:
+                work_time_str = get_row_value(row, col_map, '작업시간')
+                title_changed_date = get_row_value(row, col_map, '제목변경일')
+                ctr_data = ctr_by_video.get(video_id)
 
                 if ctr_data:
                     ctr = ctr_data.get('ctr', 0)
@@ -19118,27 +17636,26 @@ def api_sheets_check_ctr_and_update_titles():
                     subs_lost = ctr_data.get('subscribers_lost', 0)
 
                     # 조회수 기록 (Data API로도 가능)
-                    if '조회수' in col_map and views > 0:
-                        sheets_update_cell_by_header(service, sheet_id, sheet_name, i, col_map, '조회수', str(views))
-                        print(f"[CTR] [{sheet_name}] 조회수 기록: {views}")
+                    if views > 0:
+                        queue_update(i, '조회수', str(views))
 
                     # CTR, 노출수 기록 (Analytics API만 가능)
-                    if 'CTR' in col_map and ctr > 0:
-                        sheets_update_cell_by_header(service, sheet_id, sheet_name, i, col_map, 'CTR', f'{ctr:.2f}%')
-                    if '노출수' in col_map and impressions > 0:
-                        sheets_update_cell_by_header(service, sheet_id, sheet_name, i, col_map, '노출수', str(impressions))
+                    if ctr > 0:
+                        queue_update(i, 'CTR', f'{ctr:.2f}%')
+                    if impressions > 0:
+                        queue_update(i, '노출수', str(impressions))
 
                     # 전일대비 (오늘 - 어제) - Analytics API만 가능
-                    if '전일조회수' in col_map and (views_today > 0 or views_yesterday > 0):
+                    if views_today > 0 or views_yesterday > 0:
                         diff = views_today - views_yesterday
                         diff_str = f"+{diff}" if diff >= 0 else str(diff)
-                        sheets_update_cell_by_header(service, sheet_id, sheet_name, i, col_map, '전일조회수', diff_str)
+                        queue_update(i, '전일조회수', diff_str)
 
                     # 구독증가/감소 - Analytics API만 가능
-                    if '구독증가' in col_map and subs_gained > 0:
-                        sheets_update_cell_by_header(service, sheet_id, sheet_name, i, col_map, '구독증가', f"+{subs_gained}")
-                    if '구독감소' in col_map and subs_lost > 0:
-                        sheets_update_cell_by_header(service, sheet_id, sheet_name, i, col_map, '구독감소', f"-{subs_lost}")
+                    if subs_gained > 0:
+                        queue_update(i, '구독증가', f"+{subs_gained}")
+                    if subs_lost > 0:
+                        queue_update(i, '구독감소', f"-{subs_lost}")
 
                 # 제목 변경은 7일 이상 지난 영상만, 제목변경 이력 없는 경우만
                 if title_changed_date:
@@ -19186,8 +17703,8 @@ def api_sheets_check_ctr_and_update_titles():
                                 ).execute()
 
                                 # 시트에 변경 기록
-                                sheets_update_cell_by_header(service, sheet_id, sheet_name, i, col_map, '제목(GPT생성)', new_title)
-                                sheets_update_cell_by_header(service, sheet_id, sheet_name, i, col_map, '제목변경일', now.strftime('%Y-%m-%d %H:%M'))
+                                queue_update(i, '제목(GPT생성)', new_title)
+                                queue_update(i, '제목변경일', now.strftime('%Y-%m-%d %H:%M'))
 
                                 updated_count += 1
                                 results.append({
@@ -19204,6 +17721,10 @@ def api_sheets_check_ctr_and_update_titles():
                             except Exception as e:
                                 print(f"[CTR] [{sheet_name}] 행 {i}: 제목 변경 실패 - {e}")
 
+        # 모든 시트의 셀 변경사항을 한 번의 배치 요청으로 기록
+        cells_written = sheets_batch_update_values(service, sheet_id, pending_updates)
+        print(f"[CTR] 시트 배치 업데이트: {cells_written}/{len(pending_updates)}개 셀")
+
         return jsonify({
             "ok": True,
             "message": f"CTR 확인 완료: {checked_count}개 확인, {updated_count}개 제목 변경",
@@ -20258,8 +18779,14 @@ def _create_chapter_bgm_mix(chapter_bgm_list: list, total_duration: float, outpu
         # 챕터가 1개면 그냥 복사
         return valid_chapters[0][2]
 
+    # 캐시된 BGM 베드를 NumPy로 조립 (BGM 파일 N개를 매번 디코딩하지 않음)
+    bed_path = render_segment_bed(valid_chapters, total_duration, bgm_output,
+                                  crossfade=3.0, log_prefix="[RENDER]")
+    if bed_path:
+        return bed_path
+
     try:
-        # FFmpeg 복합 필터로 챕터별 BGM 연결 + 크로스페이드
+        # (폴백) FFmpeg 복합 필터로 챕터별 BGM 연결 + 크로스페이드
         # 각 챕터 BGM을 해당 구간 길이만큼 트림 후 concat
 
         inputs = []
@@ -20268,19 +18795,26 @@ def _create_chapter_bgm_mix(chapter_bgm_list: list, total_duration: float, outpu
 
         for i, (start, end, bgm_file) in enumerate(valid_chapters):
             chapter_duration = end - start
+
+            # 라이브러리 인덱스: 챕터보다 짧은 트랙만 루프, 트랙별 라우드니스 보정
+            track = audio_library.get_track(bgm_file) or {}
+            track_duration = track.get("duration")
+            if track_duration is None or track_duration < chapter_duration:
+                inputs.extend(["-stream_loop", "-1"])
             inputs.extend(["-i", bgm_file])
+            gain = audio_library.loudness_gain(bgm_file)
 
             # 해당 구간 길이만큼 트림 + 페이드
             if i < len(valid_chapters) - 1:
                 # 마지막이 아니면 끝에 페이드아웃
                 filter_parts.append(
-                    f"[{i}:a]atrim=0:{chapter_duration},asetpts=PTS-STARTPTS,"
+                    f"[{i}:a]atrim=0:{chapter_duration},asetpts=PTS-STARTPTS,volume={gain:.4f},"
                     f"afade=t=in:st=0:d=2,afade=t=out:st={chapter_duration-crossfade_duration}:d={crossfade_duration}[a{i}]"
                 )
             else:
                 # 마지막 챕터는 페이드인만
                 filter_parts.append(
-                    f"[{i}:a]atrim=0:{chapter_duration},asetpts=PTS-STARTPTS,"
+                    f"[{i}:a]atrim=0:{chapter_duration},asetpts=PTS-STARTPTS,volume={gain:.4f},"
                     f"afade=t=in:st=0:d=2[a{i}]"
                 )
 
@@ -20909,16 +19443,19 @@ def setup_fontconfig():
         with open(fonts_conf, 'w') as f:
             f.write(config_content)
 
-        # fontconfig 캐시 업데이트
-        subprocess.run(['fc-cache', '-f'], capture_output=True)
+        # fontconfig 캐시 업데이트 (변경된 디렉토리만 재생성)
+        subprocess.run(['fc-cache'], capture_output=True)
         print(f"[FONTCONFIG] 설정 완료: {fonts_dir}")
     except Exception as e:
         print(f"[FONTCONFIG] 설정 실패 (무시): {e}")
 
-# 서버 시작 시 fontconfig 설정
-setup_fontconfig()
+# fontconfig 설정은 start_background_services()에서 프로세스 시작 후 백그라운드로 실행
+
+STARTUP_IMPORT_SECONDS = _startup_time.perf_counter() - _STARTUP_BEGIN
+print(f"[SERVER] 모듈 로드 완료: {STARTUP_IMPORT_SECONDS:.2f}초")
 
 # ===== Render 배포를 위한 설정 =====
 if __name__ == "__main__":
+    start_background_services()
     port = int(os.environ.get("PORT", 5059))
     app.run(host="0.0.0.0", port=port, debug=False)
@@ -0,0 +1,194 @@
+"""
+Google API 클라이언트 레지스트리
+
+Sheets / Docs / Drive / YouTube 서비스 객체를 프로세스 단위로 재사용합니다.
+
+- discovery 문서는 패키지 내장(static) 문서를 (api, version)당 한 번만 파싱
+- 자격증명은 키(서비스 계정 이메일+scope, OAuth client_id+refresh_token)당 하나만 유지
+- 만료 5분 전에 토큰을 미리 갱신 (요청 도중 401 방지)
+- httplib2는 스레드 안전하지 않으므로 서비스 객체/전송 계층은 스레드별로 생성
+
+사용법:
+    from google_clients import get_service_account_client, build_client
+
+    sheets = get_service_account_client('sheets', 'v4', SHEETS_SCOPES)
+    youtube = build_client('youtube', 'v3', credentials)
+"""
+
+import json
+import os
+import threading
+from datetime import datetime, timedelta
+
+# 만료 몇 초 전에 미리 갱신할지
+TOKEN_REFRESH_MARGIN = int(os.environ.get('GOOGLE_TOKEN_REFRESH_MARGIN', '300'))
+# httplib2 요청 타임아웃 (초)
+HTTP_TIMEOUT = int(os.environ.get('GOOGLE_HTTP_TIMEOUT', '120'))
+
+_lock = threading.Lock()
+_discovery_docs = {}       # (api, version) → 파싱된 discovery 문서(dict)
+_credentials = {}          # cache_key → Credentials
+_refresh_locks = {}        # cache_key → threading.Lock
+_local = threading.local()  # 스레드별 {(api, version, cache_key): Resource}
+_generation = 0             # clear_clients() 호출 시 증가 → 스레드별 캐시 무효화
+
+
+def _get_discovery_doc(api, version):
+    """내장 discovery 문서를 한 번만 로드/파싱하여 반환 (없으면 None)"""
+    key = (api, version)
+    doc = _discovery_docs.get(key)
+    if doc is not None:
+        return doc
+
+    with _lock:
+        doc = _discovery_docs.get(key)
+        if doc is None:
+            try:
+                from googleapiclient.discovery_cache import get_static_doc
+                raw = get_static_doc(api, version)
+            except Exception as e:
+                print(f"[GOOGLE-CLIENTS] static discovery 로드 실패 ({api} {version}): {e}")
+                raw = None
+            if raw:
+                doc = json.loads(raw)
+                _discovery_docs[key] = doc
+    return doc
+
+
+def credentials_cache_key(credentials):
+    """자격증명 식별 키 생성 (같은 계정/토큰이면 같은 키)"""
+    scopes = ','.join(sorted(getattr(credentials, 'scopes', None) or []))
+
+    email = getattr(credentials, 'service_account_email', None)
+    if email:
+        return f"sa:{email}:{scopes}"
+
+    refresh_token = getattr(credentials, 'refresh_token', None)
+    client_id = getattr(credentials, 'client_id', None)
+    if refresh_token:
+        return f"oauth:{client_id}:{refresh_token}"
+
+    # 식별 정보가 없으면 캐시하지 않음
+    return None
+
+
+def _needs_refresh(credentials):
+    """토큰이 없거나 만료 임박 여부"""
+    if not getattr(credentials, 'token', None):
+        return True
+    expiry = getattr(credentials, 'expiry', None)
+    if expiry is None:
+        return False
+    # google-auth는 expiry를 naive UTC로 보관
+    return expiry - timedelta(seconds=TOKEN_REFRESH_MARGIN) <= datetime.utcnow()
+
+
+def ensure_fresh(credentials, cache_key=None):
+    """
+    만료 임박 시 토큰을 미리 갱신
+
+    같은 자격증명을 여러 스레드가 공유하므로 키별 락으로 갱신을 직렬화합니다.
+    반환: 갱신했으면 True
+    """
+    if not _needs_refresh(credentials):
+        return False
+    if not (getattr(credentials, 'refresh_token', None) or getattr(credentials, 'service_account_email', None)):
+        return False
+
+    cache_key = cache_key or credentials_cache_key(credentials) or f"obj:{id(credentials)}"
+    with _lock:
+        refresh_lock = _refresh_locks.setdefault(cache_key, threading.Lock())
+
+    with refresh_lock:
+        # 다른 스레드가 먼저 갱신했을 수 있음
+        if not _needs_refresh(credentials):
+            return False
+        from google.auth.transport.requests import Request
+        credentials.refresh(Request())
+        return True
+
+
+def _register_credentials(credentials, cache_key):
+    """키에 해당하는 공유 자격증명 반환 (처음이면 전달된 자격증명 등록)"""
+    with _lock:
+        existing = _credentials.get(cache_key)
+        if existing is None:
+            _credentials[cache_key] = credentials
+            existing = credentials
+    return existing
+
+
+def _build_resource(api, version, credentials):
+    """현재 스레드 전용 httplib2 전송 계층으로 서비스 객체 생성"""
+    import httplib2
+    import google_auth_httplib2
+    from googleapiclient.discovery import build, build_from_document
+
+    http = google_auth_httplib2.AuthorizedHttp(credentials, http=httplib2.Http(timeout=HTTP_TIMEOUT))
+
+    doc = _get_discovery_doc(api, version)
+    if doc is not None:
+        return build_from_document(doc, http=http)
+
+    # 내장 문서가 없는 API는 기존 방식으로 (캐시 파일 경고 방지)
+    return build(api, version, http=http, cache_discovery=False)
+
+
+def build_client(api, version, credentials, cache_key=None):
+    """
+    googleapiclient.discovery.build 대체 - 자격증명/스레드 단위로 캐시된 서비스 객체 반환
+
+    Args:
+        api: 'sheets', 'youtube', 'youtubeAnalytics' 등
+        version: 'v4', 'v3', 'v2' 등
+        credentials: google-auth 자격증명
+        cache_key: 생략 시 credentials_cache_key()로 계산 (식별 불가 자격증명은 캐시하지 않음)
+    """
+    cache_key = cache_key or credentials_cache_key(credentials)
+    if cache_key is None:
+        return _build_resource(api, version, credentials)
+
+    shared = _register_credentials(credentials, cache_key)
+    ensure_fresh(shared, cache_key)
+
+    clients = getattr(_local, 'clients', None)
+    if clients is None or getattr(_local, 'generation', None) != _generation:
+        clients = _local.clients = {}
+        _local.generation = _generation
+
+    key = (api, version, cache_key)
+    client = clients.get(key)
+    if client is None:
+        client = _build_resource(api, version, shared)
+        clients[key] = client
+    return client
+
+
+def get_service_account_client(api, version, scopes, service_account_json=None):
+    """
+    서비스 계정(GOOGLE_SERVICE_ACCOUNT_JSON)으로 캐시된 서비스 객체 반환
+
+    JSON 파싱/자격증명 생성은 (계정, scope)당 한 번만 수행합니다.
+    환경변수가 없으면 None 반환, JSON 오류는 예외를 그대로 전달합니다.
+    """
+    service_account_json = service_account_json or os.environ.get('GOOGLE_SERVICE_ACCOUNT_JSON')
+    if not service_account_json:
+        return None
+
+    raw_key = f"sa-json:{hash(service_account_json)}:{','.join(sorted(scopes))}"
+    credentials = _credentials.get(raw_key)
+    if credentials is None:
+        from google.oauth2 import service_account
+        info = json.loads(service_account_json)
+        credentials = service_account.Credentials.from_service_account_info(info, scopes=list(scopes))
+
+    return build_client(api, version, credentials, cache_key=raw_key)
+
+
+def clear_clients():
+    """캐시 초기화 (자격증명 교체/테스트용) - 모든 스레드의 서비스 객체가 다음 호출 시 재생성됨"""
+    global _generation
+    with _lock:
+        _credentials.clear()
+        _refresh_locks.clear()
+        _generation += 1
@@ -4,10 +4,12 @@ import os
 bind = f"0.0.0.0:{os.environ.get('PORT', '10000')}"
 
 # Worker processes
-# ★ Race Condition 방지: 파이프라인 동시 실행 문제로 워커 1개로 제한
-# threading.Lock()은 프로세스 간에 공유되지 않음
+# 파이프라인 중복 실행은 pipeline_lease.py의 파일 락 리스가 워커 간에 조율하므로 워커 수 제한 불필요
+# (동시 파이프라인 수는 PIPELINE_MAX_CONCURRENT로 제한, 기본 1)
+# 단, video_jobs 진행 상태는 프로세스 메모리에 있으므로 기본값은 워커 1개 + 스레드로 HTTP 동시성 확보
 workers = int(os.environ.get('GUNICORN_WORKERS', '1'))
-worker_class = 'sync'
+worker_class = os.environ.get('GUNICORN_WORKER_CLASS', 'gthread')
+threads = int(os.environ.get('GUNICORN_THREADS', '8'))  # gthread: 긴 파이프라인 요청이 다른 요청을 막지 않음
 worker_connections = 1000
 timeout = int(os.environ.get('GUNICORN_TIMEOUT', '7200'))  # 환경변수 사용 (기본 2시간)
 keepalive = 5
@@ -24,3 +26,12 @@ proc_name = 'drama_server'
 # Server mechanics
 daemon = False
 preload_app = True
+
+
+def post_fork(server, worker):
+    """워커 fork 직후 백그라운드 서비스 시작 (preload된 master의 스레드는 fork되지 않음)"""
+    try:
+        import drama_server
+        drama_server.start_background_services()
+    except Exception as e:
+        server.log.error(f"[POST-FORK] 백그라운드 서비스 시작 실패: {e}")
@@ -5,14 +5,18 @@ Gemini API를 사용한 씬 이미지 및 썸네일 생성
 핵심 기능:
 - Gemini 3 Pro: 씬 이미지 및 썸네일 생성 (고품질)
 - 16:9/9:16 비율 자동 크롭/리사이즈
-- Base64 → 파일 저장 및 압축
+- Base64 → 파일 저장 및 압축 (디코딩된 프레임은 get_decoded_frame으로 재사용)
+- 키 풀 기반 동시 배치 생성 (generate_images_batch)
 - 영상 길이별 이미지 개수 자동 결정
 """
 
 from .gemini import (
     generate_image,
+    generate_images_batch,
     generate_image_base64,
     generate_thumbnail_image,
+    get_key_pool_stats,
+    get_decoded_frame,
     GEMINI_FLASH,
     GEMINI_PRO,
 )
@@ -64,8 +68,11 @@ def get_image_count_by_script(script_length: int) -> tuple:
 
 __all__ = [
     "generate_image",
+    "generate_images_batch",
     "generate_image_base64",
     "generate_thumbnail_image",
+    "get_key_pool_stats",
+    "get_decoded_frame",
     "get_image_count_by_script",
     "IMAGE_COUNT_CONFIG",
     "GEMINI_FLASH",
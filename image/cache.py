@@ -0,0 +1,245 @@
+"""
+생성 이미지 캐시
+
+같은 프롬프트(템플릿 배경, 성경 책 배경, 재시도 등)로 Gemini/OpenRouter를 다시 호출하지 않도록
+(정규화된 프롬프트, 모델, 크기) 키로 처리 완료된 이미지를 디스크에 저장합니다.
+
+- 저장 위치: data/image_cache/<키 앞 2자>/<키>.<확장자>, 메타데이터는 SQLite 인덱스
+- 용량 상한(IMAGE_CACHE_MAX_MB)을 넘으면 가장 오래 사용하지 않은 항목부터 삭제 (LRU)
+- 선택: 지각 해시(dHash)로 씬 간 거의 같은 결과 이미지 탐지 (IMAGE_CACHE_PHASH=1)
+
+사용법:
+    from image import cache as image_cache
+
+    hit = image_cache.lookup(prompt, model, "1280x720")
+    if hit:
+        path = image_cache.materialize(hit, output_dir, "gemini")
+    else:
+        ...생성...
+        image_cache.store_file(prompt, model, "1280x720", saved_path)
+"""
+
+import hashlib
+import os
+import re
+import shutil
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from typing import Optional, Dict, Any, List
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CACHE_DIR = os.getenv("IMAGE_CACHE_DIR", os.path.join(PROJECT_ROOT, "data", "image_cache"))
+CACHE_ENABLED = os.getenv("IMAGE_CACHE_ENABLED", "1") != "0"
+CACHE_MAX_MB = int(os.getenv("IMAGE_CACHE_MAX_MB", "2048"))
+PHASH_ENABLED = os.getenv("IMAGE_CACHE_PHASH", "0") == "1"
+NEAR_DUPLICATE_DISTANCE = 6  # dHash 해밍 거리 이하면 거의 같은 이미지
+
+_lock = threading.Lock()
+_conn = None
+
+
+def _db() -> sqlite3.Connection:
+    """SQLite 인덱스 연결 (프로세스당 하나, 스레드 간 공유는 _lock으로 직렬화)"""
+    global _conn
+    if _conn is None:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        conn = sqlite3.connect(os.path.join(CACHE_DIR, "index.db"), check_same_thread=False, timeout=30)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS images (
+                key TEXT PRIMARY KEY,
+                prompt TEXT,
+                model TEXT,
+                size TEXT,
+                path TEXT,
+                bytes INTEGER,
+                phash INTEGER,
+                created_at TEXT,
+                last_used REAL,
+                hits INTEGER DEFAULT 0
+            )
+        """)
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_images_last_used ON images(last_used)")
+        conn.commit()
+        _conn = conn
+    return _conn
+
+
+def normalize_prompt(prompt: str) -> str:
+    """대소문자/공백/끝 문장부호 차이를 무시하도록 정규화"""
+    text = re.sub(r"\s+", " ", (prompt or "").strip().lower())
+    return text.rstrip(" .,;")
+
+
+def cache_key(prompt: str, model: str, size: str) -> str:
+    raw = f"{model}|{size}|{normalize_prompt(prompt)}"
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def lookup(prompt: str, model: str, size: str) -> Optional[str]:
+    """캐시된 이미지 경로 (없거나 파일이 지워졌으면 None)"""
+    if not CACHE_ENABLED or not prompt:
+        return None
+
+    key = cache_key(prompt, model, size)
+    with _lock:
+        conn = _db()
+        row = conn.execute("SELECT path FROM images WHERE key = ?", (key,)).fetchone()
+        if not row:
+            return None
+        if not os.path.exists(row[0]):
+            conn.execute("DELETE FROM images WHERE key = ?", (key,))
+            conn.commit()
+            return None
+        conn.execute("UPDATE images SET last_used = ?, hits = hits + 1 WHERE key = ?", (time.time(), key))
+        conn.commit()
+    print(f"[IMAGE-CACHE] 히트: {model} {size} ({key[:10]})")
+    return row[0]
+
+
+def materialize(cached_path: str, output_dir: str, filename_prefix: str = "gemini") -> str:
+    """캐시 파일을 출력 디렉토리에 새 파일로 복사 (호출자가 이동/삭제해도 캐시는 유지)"""
+    os.makedirs(output_dir, exist_ok=True)
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")
+    ext = os.path.splitext(cached_path)[1] or ".jpg"
+    filepath = os.path.join(output_dir, f"{filename_prefix}_{timestamp}{ext}")
+    shutil.copyfile(cached_path, filepath)
+    return filepath
+
+
+def _store(key: str, prompt: str, model: str, size: str, write_func, ext: str) -> Optional[str]:
+    path = os.path.join(CACHE_DIR, key[:2], f"{key}{ext}")
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        write_func(tmp_path)
+        os.replace(tmp_path, path)
+    except OSError as e:
+        print(f"[IMAGE-CACHE] 저장 실패: {e}")
+        return None
+
+    phash = perceptual_hash(path) if PHASH_ENABLED else None
+    with _lock:
+        conn = _db()
+        conn.execute(
+            "INSERT OR REPLACE INTO images (key, prompt, model, size, path, bytes, phash, created_at, last_used, hits) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, 0)",
+            (key, normalize_prompt(prompt)[:2000], model, size, path, os.path.getsize(path),
+             phash, datetime.now().isoformat(), time.time())
+        )
+        conn.commit()
+        _evict(conn)
+    return path
+
+
+def store_file(prompt: str, model: str, size: str, image_path: str) -> Optional[str]:
+    """처리 완료된 이미지 파일을 캐시에 복사"""
+    if not CACHE_ENABLED or not prompt or not image_path or not os.path.exists(image_path):
+        return None
+    key = cache_key(prompt, model, size)
+    ext = os.path.splitext(image_path)[1] or ".jpg"
+    return _store(key, prompt, model, size, lambda dst: shutil.copyfile(image_path, dst), ext)
+
+
+def store_bytes(prompt: str, model: str, size: str, data: bytes, ext: str = ".png") -> Optional[str]:
+    """이미지 바이트를 캐시에 저장 (파일로 저장하지 않는 파이프라인용)"""
+    if not CACHE_ENABLED or not prompt or not data:
+        return None
+
+    def _write(dst):
+        with open(dst, "wb") as f:
+            f.write(data)
+
+    return _store(cache_key(prompt, model, size), prompt, model, size, _write, ext)
+
+
+def _evict(conn: sqlite3.Connection):
+    """용량 상한 초과 시 LRU 순으로 삭제 (_lock 보유 상태에서 호출)"""
+    total = conn.execute("SELECT COALESCE(SUM(bytes), 0) FROM images").fetchone()[0]
+    limit = CACHE_MAX_MB * 1024 * 1024
+    if total <= limit:
+        return
+
+    removed = 0
+    for key, path, size in conn.execute("SELECT key, path, bytes FROM images ORDER BY last_used").fetchall():
+        if total <= limit * 0.9:  # 매번 정리하지 않도록 90%까지 비움
+            break
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+        conn.execute("DELETE FROM images WHERE key = ?", (key,))
+        total -= size or 0
+        removed += 1
+    conn.commit()
+    print(f"[IMAGE-CACHE] LRU 정리: {removed}개 삭제")
+
+
+def perceptual_hash(image_path: str) -> Optional[int]:
+    """dHash (9x8 그레이스케일 인접 픽셀 비교) 64비트 - 실패 시 None"""
+    try:
+        from PIL import Image as PILImage
+        with PILImage.open(image_path) as img:
+            img.draft("L", (64, 64))
+            pixels = list(img.convert("L").resize((9, 8), PILImage.Resampling.BILINEAR).getdata())
+    except Exception:
+        return None
+
+    value = 0
+    for row in range(8):
+        for col in range(8):
+            left = pixels[row * 9 + col]
+            right = pixels[row * 9 + col + 1]
+            value = (value << 1) | (1 if left > right else 0)
+    # SQLite INTEGER는 부호 있는 64비트
+    return value - (1 << 64) if value >= (1 << 63) else value
+
+
+def hamming_distance(a: int, b: int) -> int:
+    return bin((a ^ b) & ((1 << 64) - 1)).count("1")
+
+
+def find_near_duplicates(image_path: str, max_distance: int = NEAR_DUPLICATE_DISTANCE) -> List[Dict[str, Any]]:
+    """캐시에 있는 거의 같은 이미지 목록 (지각 해시 인덱스 사용)"""
+    target = perceptual_hash(image_path)
+    if target is None:
+        return []
+    with _lock:
+        rows = _db().execute("SELECT key, prompt, model, size, path, phash FROM images WHERE phash IS NOT NULL").fetchall()
+    matches = []
+    for key, prompt, model, size, path, phash in rows:
+        distance = hamming_distance(target, phash)
+        if distance <= max_distance:
+            matches.append({"key": key, "prompt": prompt, "model": model, "size": size,
+                            "path": path, "distance": distance})
+    return sorted(matches, key=lambda m: m["distance"])
+
+
+def mark_near_duplicates(image_paths: List[Optional[str]], max_distance: int = NEAR_DUPLICATE_DISTANCE) -> Dict[int, int]:
+    """
+    한 배치(씬 목록) 안에서 거의 같은 이미지 찾기
+
+    Returns:
+        {뒤 인덱스: 앞 인덱스} - 앞 씬과 거의 같은 결과가 나온 씬
+    """
+    hashes = [perceptual_hash(p) if p and os.path.exists(p) else None for p in image_paths]
+    duplicates = {}
+    for i, h in enumerate(hashes):
+        if h is None:
+            continue
+        for j in range(i):
+            if hashes[j] is not None and hamming_distance(h, hashes[j]) <= max_distance:
+                duplicates[i] = j
+                break
+    return duplicates
+
+
+def get_stats() -> Dict[str, Any]:
+    """캐시 통계"""
+    with _lock:
+        count, total, hits = _db().execute(
+            "SELECT COUNT(*), COALESCE(SUM(bytes), 0), COALESCE(SUM(hits), 0) FROM images"
+        ).fetchone()
+    return {"entries": count, "size_mb": round(total / 1024 / 1024, 1), "hits": hits}
@@ -11,12 +11,16 @@ import os
 import json
 import time
 import base64
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from io import BytesIO
-from typing import Optional, Tuple, Dict, Any
+from typing import Optional, Tuple, Dict, Any, List, Union
 
 import requests
-from PIL import Image as PILImage
+
+from . import cache as image_cache
 
 
 # 상수
@@ -26,9 +30,18 @@ DEFAULT_TIMEOUT = 120
 MAX_RETRIES = 3
 INITIAL_RETRY_DELAY = 5
 
-# Google API 키 로테이션 관리
-_google_api_key_index = 0
-_exhausted_keys = set()  # quota 초과된 키 추적
+# 키 풀 설정
+KEY_CONCURRENCY = int(os.getenv("GEMINI_KEY_CONCURRENCY", "2"))        # 키당 동시 요청 수
+KEY_MIN_INTERVAL = float(os.getenv("GEMINI_KEY_MIN_INTERVAL", "1.0"))  # 같은 키 요청 간 최소 간격 (초)
+QUOTA_COOLDOWN = int(os.getenv("GEMINI_QUOTA_COOLDOWN", "60"))         # quota 초과 시 기본 휴식 (초)
+MAX_QUOTA_COOLDOWN = 3600
+KEY_WAIT_TIMEOUT = int(os.getenv("GEMINI_KEY_WAIT_TIMEOUT", "90"))     # 모든 키 휴식 중일 때 최대 대기 (초)
+OPENROUTER_CONCURRENCY = int(os.getenv("OPENROUTER_IMAGE_CONCURRENCY", "4"))
+
+# 디코딩된 프레임 메모리 캐시 (1280x720 RGB 약 2.7MB) - 합성기에서 재디코딩 방지
+FRAME_CACHE_SIZE = int(os.getenv("GEMINI_FRAME_CACHE_SIZE", "12"))
+_frame_cache = OrderedDict()  # 파일 식별자 → PIL Image
+_frame_lock = threading.Lock()
 
 
 def _get_google_api_keys() -> list:
@@ -54,35 +67,162 @@ def _get_google_api_keys() -> list:
     return keys
 
 
-def _get_next_google_api_key() -> Optional[str]:
-    """다음 사용 가능한 Google API 키 반환 (로테이션)"""
-    global _google_api_key_index
+def _key_preview(api_key: str) -> str:
+    return f"{api_key[:8]}...{api_key[-4:]}" if len(api_key) > 12 else "***"
 
-    keys = _get_google_api_keys()
-    if not keys:
-        return None
 
-    # 모든 키가 소진되었으면 초기화
-    available_keys = [k for k in keys if k not in _exhausted_keys]
-    if not available_keys:
-        print("[GEMINI][INFO] 모든 Google API 키 quota 소진, 초기화 후 재시도")
-        _exhausted_keys.clear()
-        available_keys = keys
+class _KeyPool:
+    """
+    스레드 안전 Google API 키 풀
+
+    키마다 동시 요청 수/마지막 사용 시각/quota 휴식(cooldown)을 관리합니다.
+    quota 초과 키는 "전부 소진되면 초기화" 대신 휴식 시간이 지나면 자동 복귀하며,
+    연속으로 초과하면 휴식 시간이 두 배씩 늘어납니다.
+    """
+
+    def __init__(self):
+        self._cond = threading.Condition()
+        self._state = {}  # key → {"in_flight", "last_used", "cooldown_until", "strikes", "requests"}
+
+    def _sync_keys(self):
+        keys = _get_google_api_keys()
+        for key in keys:
+            self._state.setdefault(key, {
+                "in_flight": 0, "last_used": 0.0, "cooldown_until": 0.0, "strikes": 0, "requests": 0,
+            })
+        for key in list(self._state):
+            if key not in keys and self._state[key]["in_flight"] == 0:
+                del self._state[key]
+        return keys
+
+    def size(self) -> int:
+        with self._cond:
+            return len(self._sync_keys())
+
+    def acquire(self, timeout: float = KEY_WAIT_TIMEOUT, exclude=(), wait_cooldown: bool = True) -> Optional[str]:
+        """
+        사용 가능한 키 하나를 점유 (동시 요청이 적고 오래 쉰 키 우선)
+
+        모든 키가 휴식/포화 상태면 timeout까지 대기, 그래도 없으면 None
+        wait_cooldown=False면 모든 키가 quota 휴식 중일 때 기다리지 않고 바로 None (폴백 경로가 있을 때)
+        """
+        deadline = time.time() + timeout
+        with self._cond:
+            while True:
+                keys = [k for k in self._sync_keys() if k not in exclude]
+                if not keys:
+                    return None
+
+                now = time.time()
+                ready = [
+                    k for k in keys
+                    if self._state[k]["cooldown_until"] <= now
+                    and self._state[k]["in_flight"] < KEY_CONCURRENCY
+                    and now - self._state[k]["last_used"] >= KEY_MIN_INTERVAL
+                ]
+                if ready:
+                    key = min(ready, key=lambda k: (self._state[k]["in_flight"], self._state[k]["last_used"]))
+                    state = self._state[key]
+                    state["in_flight"] += 1
+                    state["last_used"] = now
+                    state["requests"] += 1
+                    return key
+
+                if not wait_cooldown and all(self._state[k]["cooldown_until"] > now for k in keys):
+                    return None
+
+                # 다음으로 사용 가능해지는 시점까지 대기
+                wake_times = []
+                for k in keys:
+                    st = self._state[k]
+                    if st["in_flight"] < KEY_CONCURRENCY:
+                        wake_times.append(max(st["cooldown_until"], st["last_used"] + KEY_MIN_INTERVAL))
+                remaining = deadline - now
+                if remaining <= 0:
+                    return None
+                wait = min(remaining, max(0.05, min(wake_times) - now)) if wake_times else remaining
+                self._cond.wait(wait)
+
+    def release(self, key: str, quota_exceeded: bool = False, retry_after: Optional[float] = None):
+        """키 반납 - quota 초과면 휴식 시간 설정"""
+        with self._cond:
+            state = self._state.get(key)
+            if state is not None:
+                state["in_flight"] = max(0, state["in_flight"] - 1)
+                if quota_exceeded:
+                    state["strikes"] += 1
+                    cooldown = retry_after or min(MAX_QUOTA_COOLDOWN, QUOTA_COOLDOWN * 2 ** (state["strikes"] - 1))
+                    state["cooldown_until"] = time.time() + cooldown
+                    ready = sum(1 for st in self._state.values() if st["cooldown_until"] <= time.time())
+                    print(f"[GEMINI][QUOTA] 키 {_key_preview(key)} quota 초과 → {cooldown:.0f}초 휴식, 사용 가능 키: {ready}개")
+                else:
+                    state["strikes"] = 0
+            self._cond.notify_all()
+
+    def stats(self) -> list:
+        """키별 상태 (디버깅/대시보드용, 키는 마스킹)"""
+        now = time.time()
+        with self._cond:
+            self._sync_keys()
+            return [
+                {
+                    "key": _key_preview(k),
+                    "in_flight": st["in_flight"],
+                    "requests": st["requests"],
+                    "cooldown_remaining": max(0, round(st["cooldown_until"] - now)),
+                }
+                for k, st in self._state.items()
+            ]
+
+
+_key_pool = _KeyPool()
+
+# HTTP 세션 (커넥션 풀 재사용 - 요청마다 TLS 핸드셰이크 방지)
+_session = None
+_session_lock = threading.Lock()
+
+
+def _get_session() -> requests.Session:
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                from requests.adapters import HTTPAdapter
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=4, pool_maxsize=32)
+                session.mount("https://", adapter)
+                _session = session
+    return _session
+
+
+def _parse_retry_after(response) -> Optional[float]:
+    """429 응답의 Retry-After 헤더 또는 Google RetryInfo(retryDelay: "37s")"""
+    header = response.headers.get("Retry-After")
+    if header:
+        try:
+            return float(header)
+        except ValueError:
+            pass
+    try:
+        for detail in response.json().get("error", {}).get("details", []):
+            delay = detail.get("retryDelay")
+            if delay and delay.endswith("s"):
+                return float(delay[:-1])
+    except Exception:
+        pass
+    return None
 
-    # 라운드 로빈 방식으로 키 선택
-    _google_api_key_index = _google_api_key_index % len(available_keys)
-    key = available_keys[_google_api_key_index]
-    _google_api_key_index += 1
 
-    return key
+def get_key_pool_stats() -> list:
+    """Google API 키 풀 상태"""
+    return _key_pool.stats()
 
 
-def _mark_key_exhausted(api_key: str):
-    """quota 초과된 키 표시"""
-    _exhausted_keys.add(api_key)
-    key_preview = f"{api_key[:8]}...{api_key[-4:]}" if len(api_key) > 12 else "***"
-    remaining = len(_get_google_api_keys()) - len(_exhausted_keys)
-    print(f"[GEMINI][QUOTA] 키 {key_preview} quota 초과, 남은 키: {remaining}개")
+def recommended_concurrency() -> int:
+    """배치 생성 시 권장 동시 작업 수 (키 수 × 키당 동시 요청, 키가 없으면 OpenRouter 기준)"""
+    keys = _key_pool.size()
+    return max(1, keys * KEY_CONCURRENCY if keys else OPENROUTER_CONCURRENCY)
+
 
 # OpenRouter 모델 상수
 GEMINI_FLASH = "google/gemini-2.5-flash-image-preview"  # 씬 이미지용
@@ -166,7 +306,7 @@ def _call_openrouter_api(prompt: str, api_key: str, model: str = GEMINI_FLASH) -
     for attempt in range(MAX_RETRIES):
         try:
             print(f"[GEMINI][DEBUG] API 요청 시도 {attempt + 1}/{MAX_RETRIES}...")
-            response = requests.post(
+            response = _get_session().post(
                 OPENROUTER_API_URL,
                 headers=headers,
                 json=payload,
@@ -219,7 +359,7 @@ def _call_google_api(prompt: str, api_key: str, model: str = GOOGLE_GEMINI_FLASH
         print("[GEMINI][ERROR] Google API 키가 비어있습니다!")
         return {"ok": False, "error": "GOOGLE_API_KEY가 설정되지 않았습니다"}
 
-    key_preview = f"{api_key[:8]}...{api_key[-4:]}" if len(api_key) > 12 else "***"
+    key_preview = _key_preview(api_key)
     print(f"[GEMINI][DEBUG] Google API 호출 시작 - 모델: {model}, 키: {key_preview}")
 
     url = f"{GOOGLE_API_URL}/{model}:generateContent?key={api_key}"
@@ -237,7 +377,7 @@ def _call_google_api(prompt: str, api_key: str, model: str = GOOGLE_GEMINI_FLASH
     for attempt in range(MAX_RETRIES):
         try:
             print(f"[GEMINI][DEBUG] Google API 요청 시도 {attempt + 1}/{MAX_RETRIES}...")
-            response = requests.post(url, json=payload, timeout=DEFAULT_TIMEOUT)
+            response = _get_session().post(url, json=payload, timeout=DEFAULT_TIMEOUT)
 
             print(f"[GEMINI][DEBUG] 응답 상태: {response.status_code}")
 
@@ -249,11 +389,11 @@ def _call_google_api(prompt: str, api_key: str, model: str = GOOGLE_GEMINI_FLASH
                     print(f"[GEMINI][DEBUG] Google API 응답 - candidates: {len(candidates)}, parts: {len(parts)}")
                 return {"ok": True, "data": data}
             elif response.status_code == 429:
-                # quota 초과 - 키 소진 표시하고 즉시 반환 (다른 키로 재시도하도록)
+                # quota 초과 - 즉시 반환 (호출자가 키를 휴식시키고 다른 키로 재시도)
                 last_error = response.text
                 print(f"[GEMINI][QUOTA] Google API quota 초과 ({response.status_code})")
-                _mark_key_exhausted(api_key)
-                return {"ok": False, "error": "quota_exceeded", "quota_exceeded": True}
+                return {"ok": False, "error": "quota_exceeded", "quota_exceeded": True,
+                        "retry_after": _parse_retry_after(response)}
             elif response.status_code in [502, 503, 504]:
                 last_error = response.text
                 print(f"[GEMINI][RETRY] 서버 오류 ({response.status_code}) (시도 {attempt + 1}/{MAX_RETRIES})")
@@ -382,49 +522,105 @@ def _extract_image_from_response(result: Dict[str, Any]) -> Optional[str]:
     return None
 
 
+def _file_identity(path: str) -> Optional[tuple]:
+    """파일 식별자 (장치, inode, mtime, 크기) - 같은 파일시스템 안에서 이동/이름변경해도 유지"""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_dev, st.st_ino, st.st_mtime_ns, st.st_size)
+
+
+def _remember_frame(filepath: str, img) -> None:
+    identity = _file_identity(filepath)
+    if identity is None:
+        return
+    with _frame_lock:
+        _frame_cache[identity] = img
+        _frame_cache.move_to_end(identity)
+        while len(_frame_cache) > FRAME_CACHE_SIZE:
+            _frame_cache.popitem(last=False)
+
+
+def get_decoded_frame(image_path: str):
+    """
+    방금 저장한 이미지의 디코딩된 RGB 프레임 (PIL Image 복사본)
+
+    _process_and_save_image가 저장하면서 메모리에 남겨둔 프레임을 돌려주므로
+    합성기(shorts compose_frame, bible 썸네일)가 JPEG을 다시 디코딩하지 않습니다.
+    캐시에 없으면 None → 호출자가 Image.open으로 직접 로드.
+    """
+    identity = _file_identity(image_path)
+    if identity is None:
+        return None
+    with _frame_lock:
+        img = _frame_cache.get(identity)
+        if img is None:
+            return None
+        _frame_cache.move_to_end(identity)
+    return img.copy()
+
+
+def _decode_to_frame(image_bytes: bytes, target_width: int, target_height: int):
+    """디코딩 → 비율 크롭 → 축소 → RGB 변환을 한 번에 처리한 PIL 이미지"""
+    from PIL import Image as PILImage  # 지연 로딩 (서버 시작 시간 단축)
+
+    img = PILImage.open(BytesIO(image_bytes))
+    print(f"[GEMINI] 원본 이미지: {img.format} {img.width}x{img.height}, {len(image_bytes)/1024:.1f}KB")
+
+    # JPEG은 디코딩 단계에서 DCT 스케일링으로 1/2~1/8 축소 (목표 크기 이상은 유지)
+    if img.format == "JPEG":
+        img.draft("RGB", (target_width, target_height))
+
+    # 비율 맞추기: 크롭 영역만 계산하고 리사이즈의 box 인자로 넘김 (중간 복사본 없음)
+    target_ratio = target_width / target_height
+    current_ratio = img.width / img.height
+    box = (0, 0, img.width, img.height)
+    if abs(current_ratio - target_ratio) > 0.05:
+        if current_ratio > target_ratio:
+            new_width = int(img.height * target_ratio)
+            left = (img.width - new_width) // 2
+            box = (left, 0, left + new_width, img.height)
+        else:
+            new_height = int(img.width / target_ratio)
+            top = (img.height - new_height) // 2
+            box = (0, top, img.width, top + new_height)
+
+    box_width, box_height = box[2] - box[0], box[3] - box[1]
+    if box_width > target_width or box_height > target_height:
+        # reducing_gap: 큰 배율은 reduce()로 먼저 정수배 축소 후 LANCZOS
+        img = img.resize((target_width, target_height), PILImage.Resampling.LANCZOS,
+                         box=box, reducing_gap=2.0)
+    elif box != (0, 0, img.width, img.height):
+        img = img.crop(box)
+
+    # RGB 변환 (투명 배경은 흰색)
+    if img.mode in ("RGBA", "LA") or (img.mode == "P" and "transparency" in img.info):
+        img = img.convert("RGBA")
+        background = PILImage.new("RGB", img.size, (255, 255, 255))
+        background.paste(img, mask=img.split()[3])
+        img = background
+    elif img.mode != "RGB":
+        img = img.convert("RGB")
+    return img
+
+
 def _process_and_save_image(
     base64_data: str,
     target_width: int,
     target_height: int,
     output_dir: str,
-    filename_prefix: str = "gemini"
+    filename_prefix: str = "gemini",
+    optimize: bool = False
 ) -> Optional[str]:
-    """Base64 이미지를 처리하고 파일로 저장"""
+    """
+    Base64 이미지를 처리하고 파일로 저장
+
+    최종 JPEG 저장과 함께 디코딩된 프레임을 메모리에 남겨 get_decoded_frame()으로 재사용합니다.
+    optimize=True(허프만 테이블 최적화)는 업로드용 썸네일에만 사용 - 씬 이미지는 FFmpeg 입력용 중간 결과.
+    """
     try:
-        # Base64 디코딩
-        image_bytes = base64.b64decode(base64_data)
-        img = PILImage.open(BytesIO(image_bytes))
-
-        original_size = len(image_bytes)
-        print(f"[GEMINI] 원본 이미지: {img.width}x{img.height}, {original_size/1024:.1f}KB")
-
-        # 비율 맞추기 (크롭)
-        target_ratio = target_width / target_height
-        current_ratio = img.width / img.height
-
-        if abs(current_ratio - target_ratio) > 0.05:
-            if current_ratio > target_ratio:
-                new_width = int(img.height * target_ratio)
-                left = (img.width - new_width) // 2
-                img = img.crop((left, 0, left + new_width, img.height))
-            else:
-                new_height = int(img.width / target_ratio)
-                top = (img.height - new_height) // 2
-                img = img.crop((0, top, img.width, top + new_height))
-            print(f"[GEMINI] 크롭 완료: {img.width}x{img.height}")
-
-        # 리사이즈
-        if img.width > target_width or img.height > target_height:
-            img = img.resize((target_width, target_height), PILImage.Resampling.LANCZOS)
-            print(f"[GEMINI] 리사이즈 완료: {target_width}x{target_height}")
-
-        # RGB 변환
-        if img.mode == 'RGBA':
-            background = PILImage.new('RGB', img.size, (255, 255, 255))
-            background.paste(img, mask=img.split()[3])
-            img = background
-        elif img.mode != 'RGB':
-            img = img.convert('RGB')
+        img = _decode_to_frame(base64.b64decode(base64_data), target_width, target_height)
 
         # 파일 저장
         os.makedirs(output_dir, exist_ok=True)
@@ -432,10 +628,11 @@ def _process_and_save_image(
         filename = f"{filename_prefix}_{timestamp}.jpg"
         filepath = os.path.join(output_dir, filename)
 
-        img.save(filepath, 'JPEG', quality=85, optimize=True)
+        img.save(filepath, 'JPEG', quality=85, optimize=optimize)
+        _remember_frame(filepath, img)
 
         final_size = os.path.getsize(filepath)
-        print(f"[GEMINI] 저장 완료: {filepath} ({final_size/1024:.1f}KB)")
+        print(f"[GEMINI] 저장 완료: {filepath} ({img.width}x{img.height}, {final_size/1024:.1f}KB)")
 
         # 실제 파일 경로 반환 (기존: 항상 /static/images/ 반환하던 버그 수정)
         return filepath
@@ -451,7 +648,9 @@ def generate_image(
     output_dir: Optional[str] = None,
     model: str = GEMINI_FLASH,
     add_aspect_instruction: bool = True,
-    use_google_api: bool = True  # Google API 우선 사용 (OpenRouter fallback)
+    use_google_api: bool = True,  # Google API 우선 사용 (OpenRouter fallback)
+    use_cache: bool = True,
+    optimize_jpeg: bool = False
 ) -> Dict[str, Any]:
     """
     Gemini를 사용하여 이미지 생성
@@ -463,6 +662,8 @@ def generate_image(
         model: 사용할 모델 (GEMINI_FLASH 또는 GEMINI_PRO)
         add_aspect_instruction: 비율 지시문 자동 추가 여부
         use_google_api: Google API 우선 사용 (기본: True)
+        use_cache: 같은 (프롬프트, 모델, 크기) 결과가 캐시에 있으면 API 호출 없이 재사용
+        optimize_jpeg: JPEG 최적화 저장 (업로드용 최종 결과만 - 씬 이미지는 불필요)
 
     Returns:
         {"ok": True, "image_url": str, "cost": float} 또는
@@ -479,22 +680,55 @@ def generate_image(
         enhanced_prompt = prompt
 
     model_name = "Pro" if "pro" in model.lower() else "Flash"
+    if output_dir is None:
+        output_dir = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'static', 'images')
+    prefix = "thumbnail" if "pro" in model.lower() else "gemini"
+
+    # 0. 캐시 조회 (요청 모델 기준 - 실제 호출 경로(Google/OpenRouter)와 무관하게 같은 키)
+    cache_model = model
+    if use_cache:
+        cached_path = image_cache.lookup(enhanced_prompt, cache_model, size)
+        if cached_path:
+            try:
+                image_url = image_cache.materialize(cached_path, output_dir, prefix)
+                print(f"[GEMINI-{model_name}] 캐시 재사용 - 비용: $0")
+                return {
+                    "ok": True,
+                    "image_url": image_url,
+                    "cost": 0.0,
+                    "provider": "gemini",
+                    "model": model_name.lower(),
+                    "api_type": "cache",
+                    "cached": True
+                }
+            except OSError as e:
+                print(f"[GEMINI] 캐시 복사 실패, 새로 생성: {e}")
+
     print(f"[GEMINI-{model_name}] 이미지 생성 시작 - 크기: {size}")
 
     base64_data = None
     used_google_api = False
 
-    # 1. Google API 우선 시도 (키 로테이션 지원)
+    # 1. Google API 우선 시도 (키 풀에서 여유 있는 키 선택)
     if use_google_api:
         google_model = GOOGLE_GEMINI_PRO if "pro" in model.lower() else GOOGLE_GEMINI_FLASH
-        max_key_attempts = len(_get_google_api_keys()) or 1
+        max_key_attempts = _key_pool.size() or 1
+        tried_keys = set()
+        # OpenRouter 폴백이 가능하면 quota 휴식 중인 키를 기다리지 않음
+        has_fallback = bool(os.getenv("OPENROUTER_API_KEY"))
 
         for key_attempt in range(max_key_attempts):
-            google_api_key = _get_next_google_api_key()
+            google_api_key = _key_pool.acquire(exclude=tried_keys, wait_cooldown=not has_fallback)
             if not google_api_key:
                 break
+            tried_keys.add(google_api_key)
 
-            result = _call_google_api(enhanced_prompt, google_api_key, google_model)
+            result = {}
+            try:
+                result = _call_google_api(enhanced_prompt, google_api_key, google_model)
+            finally:
+                _key_pool.release(google_api_key, quota_exceeded=bool(result.get("quota_exceeded")),
+                                  retry_after=result.get("retry_after"))
 
             if result.get("ok"):
                 base64_data = _extract_image_from_google_response(result["data"])
@@ -535,17 +769,15 @@ def generate_image(
             return {"ok": False, "error": "Gemini에서 이미지를 생성하지 못했습니다. (응답에 이미지 없음)"}
 
     # 이미지 처리 및 저장
-    if output_dir is None:
-        output_dir = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'static', 'images')
-
-    prefix = "thumbnail" if "pro" in model.lower() else "gemini"
     image_url = _process_and_save_image(
-        base64_data, target_width, target_height, output_dir, prefix
+        base64_data, target_width, target_height, output_dir, prefix, optimize=optimize_jpeg
     )
 
     if not image_url:
-        # 저장 실패 시 base64 URL 반환
-        image_url = f"data:image/png;base64,{base64_data}"
+        # 수 MB짜리 data: URL을 돌려주지 않음 (호출자 메모리/로그 폭증)
+        return {"ok": False, "error": "이미지 처리/저장 실패"}
+    if use_cache:
+        image_cache.store_file(enhanced_prompt, cache_model, size, image_url)
 
     # 모델별 비용
     cost = MODEL_COSTS.get(model, 0.02 if used_google_api else 0.039)
@@ -562,6 +794,54 @@ def generate_image(
     }
 
 
+def generate_images_batch(
+    items: List[Union[str, Dict[str, Any]]],
+    max_workers: Optional[int] = None,
+    **defaults
+) -> List[Dict[str, Any]]:
+    """
+    여러 이미지를 키 풀에 분산하여 동시 생성 (결과는 입력 순서 그대로)
+
+    Args:
+        items: 프롬프트 문자열 또는 generate_image 인자 dict 목록
+            예: [{"prompt": "...", "size": "1280x720"}, "프롬프트2", ...]
+        max_workers: 동시 작업 수 (기본: recommended_concurrency())
+        **defaults: 모든 항목에 공통 적용할 generate_image 인자 (output_dir, model 등)
+
+    Returns:
+        generate_image 결과 목록 (items와 같은 순서, 예외는 {"ok": False, "error": ...})
+        앞 씬과 거의 같은 이미지면 "near_duplicate_of": 앞 씬 인덱스
+    """
+    if not items:
+        return []
+
+    def _run(item):
+        kwargs = dict(defaults)
+        kwargs.update(item if isinstance(item, dict) else {"prompt": item})
+        try:
+            return generate_image(**kwargs)
+        except Exception as e:
+            return {"ok": False, "error": str(e)}
+
+    workers = max(1, min(len(items), max_workers or recommended_concurrency()))
+    started = time.time()
+    print(f"[GEMINI] 배치 생성 시작: {len(items)}개, 동시 {workers}개")
+
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="gemini-image") as executor:
+        results = list(executor.map(_run, items))
+
+    # 씬 간 거의 같은 결과 표시 (IMAGE_CACHE_PHASH=1일 때만)
+    if image_cache.PHASH_ENABLED:
+        paths = [r.get("image_url") if r.get("ok") else None for r in results]
+        for index, original in image_cache.mark_near_duplicates(paths).items():
+            results[index]["near_duplicate_of"] = original
+            print(f"[GEMINI] 이미지 {index + 1}이 이미지 {original + 1}과 거의 동일")
+
+    success = sum(1 for r in results if r.get("ok"))
+    print(f"[GEMINI] 배치 생성 완료: {success}/{len(items)}개 성공, {time.time() - started:.1f}초")
+    return results
+
+
 def generate_image_base64(
     prompt: str,
     model: str = GEMINI_PRO
@@ -627,4 +907,4 @@ def generate_thumbnail_image(
         {"ok": False, "error": str}
     """
     model = GEMINI_PRO if use_pro_model else GEMINI_FLASH
-    return generate_image(prompt, size="1280x720", output_dir=output_dir, model=model)
+    return generate_image(prompt, size="1280x720", output_dir=output_dir, model=model, optimize_jpeg=True)
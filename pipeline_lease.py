@@ -0,0 +1,313 @@
+"""
+파이프라인 리스(lease) 및 스케줄러 - 프로세스 간 동시 실행 조율
+
+threading.Lock()은 gunicorn 워커(프로세스) 간에 공유되지 않아 워커를 1개로 제한해야 했습니다.
+이 모듈은 파일 락 기반의 이름 있는 리스로 같은 호스트의 모든 워커/스레드를 조율합니다.
+
+- 리스 이름: "파이프라인:채널" 형식 (예: 'sheets:HISTORY', 'bible', 'history-script')
+- 리스 기록: data/leases/<이름>.json (소유자 pid/호스트, 하트비트, 만료 시각)
+- 보유 중에는 백그라운드 스레드가 하트비트를 갱신, 프로세스가 죽으면 만료 후(또는 pid 확인 즉시) 회수
+- 그룹 단위 동시 실행 상한: PIPELINE_MAX_CONCURRENT (기본 1 = 기존과 동일하게 한 번에 하나)
+
+사용법:
+    from pipeline_lease import PipelineLease, claim_first
+
+    lock = PipelineLease('bible')
+    if not lock.acquire(blocking=False):
+        return  # 다른 워커에서 실행 중
+    try:
+        ...
+    finally:
+        lock.release()
+"""
+
+import json
+import os
+import socket
+import threading
+import time
+import uuid
+
+try:
+    import fcntl
+except ImportError:  # Windows 등 - 프로세스 내 조율만 가능
+    fcntl = None
+
+LEASE_DIR = os.environ.get('PIPELINE_LEASE_DIR', 'data/leases')
+LEASE_TTL = int(os.environ.get('PIPELINE_LEASE_TTL', '300'))  # 하트비트가 끊긴 뒤 만료까지 (초)
+MAX_CONCURRENT = int(os.environ.get('PIPELINE_MAX_CONCURRENT', '1'))  # 그룹당 동시 실행 상한
+
+_HOSTNAME = socket.gethostname()
+_process_lock = threading.Lock()  # 같은 프로세스 내 스레드 간 직렬화
+
+
+def _safe_name(name):
+    """리스 이름을 파일명으로 변환"""
+    return ''.join(c if c.isalnum() or c in '-_.' else '_' for c in name)
+
+
+def _lease_path(name):
+    return os.path.join(LEASE_DIR, f"{_safe_name(name)}.json")
+
+
+class _RegistryLock:
+    """리스 디렉토리 전체를 보호하는 짧은 파일 락 (읽기-판단-쓰기 원자화)"""
+
+    def __enter__(self):
+        _process_lock.acquire()
+        self._fh = None
+        try:
+            os.makedirs(LEASE_DIR, exist_ok=True)
+            if fcntl is not None:
+                self._fh = open(os.path.join(LEASE_DIR, '.registry.lock'), 'a+')
+                fcntl.flock(self._fh, fcntl.LOCK_EX)
+        except Exception:
+            self._release()
+            raise
+        return self
+
+    def __exit__(self, *exc):
+        self._release()
+        return False
+
+    def _release(self):
+        if self._fh is not None:
+            try:
+                fcntl.flock(self._fh, fcntl.LOCK_UN)
+            finally:
+                self._fh.close()
+                self._fh = None
+        _process_lock.release()
+
+
+def _read_record(name):
+    try:
+        with open(_lease_path(name), 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _write_record(name, record):
+    path = _lease_path(name)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(record, f, ensure_ascii=False)
+    os.replace(tmp_path, path)
+
+
+def _remove_record(name):
+    try:
+        os.remove(_lease_path(name))
+    except OSError:
+        pass
+
+
+def _pid_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    except Exception:
+        return True
+    return True
+
+
+def _is_active(record, now=None):
+    """리스 기록이 유효한지 (만료 전 + 소유 프로세스 생존)"""
+    if not record:
+        return False
+    now = now or time.time()
+    if record.get('expires_at', 0) <= now:
+        return False
+    if record.get('host') == _HOSTNAME and not _pid_alive(record.get('pid', 0)):
+        return False
+    return True
+
+
+def _active_records(group=None):
+    """현재 유효한 리스 기록 목록 (group 지정 시 해당 그룹만)"""
+    records = []
+    try:
+        filenames = os.listdir(LEASE_DIR)
+    except OSError:
+        return records
+
+    now = time.time()
+    for filename in filenames:
+        if not filename.endswith('.json'):
+            continue
+        try:
+            with open(os.path.join(LEASE_DIR, filename), 'r', encoding='utf-8') as f:
+                record = json.load(f)
+        except (OSError, ValueError):
+            continue
+        if _is_active(record, now) and (group is None or record.get('group') == group):
+            records.append(record)
+    return records
+
+
+def list_leases():
+    """현재 보유 중인 리스 목록 (상태 확인/디버깅용)"""
+    return _active_records()
+
+
+def is_leased(name):
+    """다른 워커를 포함해 해당 이름의 리스가 보유 중인지"""
+    return _is_active(_read_record(name))
+
+
+class PipelineLease:
+    """
+    이름 있는 프로세스 간 리스 - threading.Lock과 같은 acquire()/release() 인터페이스
+
+    Args:
+        name: 리스 이름 (예: 'sheets:HISTORY')
+        group: 동시 실행 상한을 공유하는 그룹 (None이면 상한 없음)
+        ttl: 하트비트 없이 유지되는 시간 (초)
+        max_concurrent: 그룹 동시 실행 상한 (기본 PIPELINE_MAX_CONCURRENT)
+    """
+
+    def __init__(self, name, group='pipeline', ttl=None, max_concurrent=None):
+        self.name = name
+        self.group = group
+        self.ttl = ttl or LEASE_TTL
+        self.max_concurrent = max_concurrent if max_concurrent is not None else MAX_CONCURRENT
+        self._token = None
+        self._stop_event = None
+        self._heartbeat_thread = None
+
+    @property
+    def held(self):
+        return self._token is not None
+
+    def _try_acquire(self):
+        with _RegistryLock():
+            if self._token is not None:
+                return False  # 같은 객체 재진입 불가 (threading.Lock과 동일)
+
+            if _is_active(_read_record(self.name)):
+                return False
+
+            if self.group and self.max_concurrent > 0:
+                if len(_active_records(self.group)) >= self.max_concurrent:
+                    return False
+
+            now = time.time()
+            token = uuid.uuid4().hex
+            _write_record(self.name, {
+                'name': self.name,
+                'group': self.group,
+                'token': token,
+                'pid': os.getpid(),
+                'host': _HOSTNAME,
+                'thread': threading.current_thread().name,
+                'acquired_at': now,
+                'heartbeat_at': now,
+                'expires_at': now + self.ttl,
+            })
+            self._token = token
+
+        self._start_heartbeat()
+        return True
+
+    def acquire(self, blocking=True, timeout=-1):
+        """리스 획득 - blocking=False면 즉시 결과 반환"""
+        if not blocking:
+            return self._try_acquire()
+
+        deadline = None if timeout is None or timeout < 0 else time.time() + timeout
+        while True:
+            if self._try_acquire():
+                return True
+            if deadline is not None and time.time() >= deadline:
+                return False
+            time.sleep(1.0)
+
+    def release(self):
+        """리스 해제 - 보유하지 않은 상태면 RuntimeError (threading.Lock과 동일)"""
+        if self._token is None:
+            raise RuntimeError(f"release unlocked lease: {self.name}")
+
+        self._stop_heartbeat()
+        with _RegistryLock():
+            record = _read_record(self.name)
+            if record and record.get('token') == self._token:
+                _remove_record(self.name)
+            self._token = None
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, *exc):
+        self.release()
+        return False
+
+    def _heartbeat(self, stop_event, token):
+        """
+        만료 전에 주기적으로 expires_at 연장
+
+        stop_event/token은 시작 시점 값을 인자로 받음 (해제 후 재획득해도 이전 스레드가 새 리스를 건드리지 않음)
+        """
+        interval = max(1.0, self.ttl / 3)
+        while not stop_event.wait(interval):
+            try:
+                with _RegistryLock():
+                    record = _read_record(self.name)
+                    if not record or record.get('token') != token:
+                        print(f"[LEASE] '{self.name}' 리스를 잃었습니다 (만료 후 다른 워커가 회수)")
+                        return
+                    now = time.time()
+                    record['heartbeat_at'] = now
+                    record['expires_at'] = now + self.ttl
+                    _write_record(self.name, record)
+            except Exception as e:
+                print(f"[LEASE] '{self.name}' 하트비트 실패: {e}")
+
+    def _start_heartbeat(self):
+        self._stop_event = threading.Event()
+        self._heartbeat_thread = threading.Thread(
+            target=self._heartbeat, args=(self._stop_event, self._token),
+            name=f"lease-heartbeat-{self.name}", daemon=True
+        )
+        self._heartbeat_thread.start()
+
+    def _stop_heartbeat(self):
+        if self._stop_event is not None:
+            self._stop_event.set()
+        self._stop_event = None
+        self._heartbeat_thread = None
+
+
+def sheet_lease_name(sheet_name):
+    """시트(채널) 단위 파이프라인 리스 이름"""
+    return f"sheets:{sheet_name}"
+
+
+def claim_first(tasks, lease_name_func, busy_names=()):
+    """
+    정렬된 작업 목록에서 리스를 잡을 수 있는 첫 작업 선택 (간단한 스케줄러)
+
+    Args:
+        tasks: 우선순위 순으로 정렬된 작업 목록
+        lease_name_func: task → 리스 이름
+        busy_names: 이미 처리 중으로 알려진 리스 이름 (시트 '처리중' 행 등)
+
+    Returns:
+        (task, lease) - 획득한 리스는 호출자가 release() 해야 함
+        (None, None) - 모든 작업이 다른 워커에서 처리 중이거나 동시 실행 상한 도달
+    """
+    tried = set(busy_names)
+    for task in tasks:
+        name = lease_name_func(task)
+        if name in tried:
+            continue
+        tried.add(name)
+
+        lease = PipelineLease(name)
+        if lease.acquire(blocking=False):
+            return task, lease
+    return None, None
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+이미지 후처리 벤치마크
+
+Gemini 출력과 비슷한 1~2MP 이미지(PNG/JPEG)를 합성해
+기존 방식(전체 디코딩 → crop → LANCZOS → optimize 저장 → 합성기에서 재디코딩)과
+현재 image.gemini._process_and_save_image(draft/reducing_gap, 프레임 재사용)를 비교합니다.
+
+사용법:
+    python scripts/benchmark_image_processing.py
+    python scripts/benchmark_image_processing.py --repeat 10 --size 1280x720
+"""
+
+import argparse
+import base64
+import os
+import statistics
+import sys
+import tempfile
+import time
+from io import BytesIO
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_ROOT)
+
+# Gemini 2.x/3 이미지 모델이 주로 돌려주는 크기 (약 1~2MP)
+SAMPLES = [
+    (1024, 1024, "PNG"),
+    (1344, 768, "PNG"),
+    (1344, 768, "JPEG"),
+    (1536, 1024, "JPEG"),
+    (1792, 1024, "PNG"),
+]
+
+
+def _make_sample(width, height, fmt):
+    """그라데이션 + 노이즈 (압축률이 실제 사진과 비슷하도록)"""
+    from PIL import Image as PILImage
+
+    gradient = PILImage.linear_gradient("L").resize((width, height))
+    noise = PILImage.effect_noise((width, height), 40)
+    img = PILImage.merge("RGB", (gradient, noise, gradient.transpose(PILImage.Transpose.FLIP_LEFT_RIGHT)))
+    buf = BytesIO()
+    img.save(buf, fmt, quality=95) if fmt == "JPEG" else img.save(buf, fmt)
+    return base64.b64encode(buf.getvalue()).decode("ascii")
+
+
+def legacy_process(base64_data, target_width, target_height, output_dir):
+    """변경 전 _process_and_save_image + compose_frame 재디코딩"""
+    from PIL import Image as PILImage
+
+    img = PILImage.open(BytesIO(base64.b64decode(base64_data)))
+    target_ratio = target_width / target_height
+    current_ratio = img.width / img.height
+    if abs(current_ratio - target_ratio) > 0.05:
+        if current_ratio > target_ratio:
+            new_width = int(img.height * target_ratio)
+            left = (img.width - new_width) // 2
+            img = img.crop((left, 0, left + new_width, img.height))
+        else:
+            new_height = int(img.width / target_ratio)
+            top = (img.height - new_height) // 2
+            img = img.crop((0, top, img.width, top + new_height))
+    if img.width > target_width or img.height > target_height:
+        img = img.resize((target_width, target_height), PILImage.Resampling.LANCZOS)
+    if img.mode != "RGB":
+        img = img.convert("RGB")
+    filepath = os.path.join(output_dir, "legacy.jpg")
+    img.save(filepath, "JPEG", quality=85, optimize=True)
+
+    frame = PILImage.open(filepath)
+    frame.load()
+    return frame
+
+
+def current_process(base64_data, target_width, target_height, output_dir):
+    """현재 _process_and_save_image + get_decoded_frame"""
+    from PIL import Image as PILImage
+    from image.gemini import _process_and_save_image, get_decoded_frame
+
+    filepath = _process_and_save_image(base64_data, target_width, target_height, output_dir, "bench")
+    frame = get_decoded_frame(filepath) or PILImage.open(filepath)
+    os.remove(filepath)
+    return frame
+
+
+def _time(func, repeat, *args):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func(*args)
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="이미지 후처리 벤치마크")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--size", default="1280x720", help="목표 크기 (generate_image size 인자)")
+    args = parser.parse_args()
+
+    target_width, target_height = (int(v) for v in args.size.split("x"))
+
+    # 처리 중 로그가 표를 가리지 않도록 출력 억제
+    devnull = open(os.devnull, "w")
+    print(f"=== 목표 {target_width}x{target_height}, 중앙값 {args.repeat}회 ===")
+    print(f"{'원본':<20}{'기존(ms)':>12}{'현재(ms)':>12}{'개선':>10}")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for width, height, fmt in SAMPLES:
+            data = _make_sample(width, height, fmt)
+            stdout, sys.stdout = sys.stdout, devnull
+            try:
+                legacy_ms = _time(legacy_process, args.repeat, data, target_width, target_height, tmp_dir)
+                current_ms = _time(current_process, args.repeat, data, target_width, target_height, tmp_dir)
+            finally:
+                sys.stdout = stdout
+            label = f"{width}x{height} {fmt}"
+            print(f"{label:<20}{legacy_ms:>12,.1f}{current_ms:>12,.1f}{legacy_ms / current_ms:>9.1f}x")
+    devnull.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -46,6 +46,12 @@ BIBLE_JSON_PATH = os.path.join(
     "korean_bible_gae.json"
 )
 
+# 성경 색인 캐시 (JSON에서 한 번 만든 절 테이블/장 색인, JSON이 바뀌면 다시 생성)
+BIBLE_INDEX_CACHE_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(__file__))),
+    "data", "bible_index.pickle"
+)
+
 # 성경 66권 목록 (구약 39권 + 신약 27권)
 BIBLE_BOOKS: List[Dict[str, Any]] = [
     # ===== 구약 (39권) =====
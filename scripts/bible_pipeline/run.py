@@ -23,10 +23,9 @@
     subtitles = episode["subtitles"]
 """
 
-import json
-import os
+import threading
 from typing import Dict, List, Any, Optional, Tuple
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 
 from .config import (
     BIBLE_JSON_PATH,
@@ -38,6 +37,7 @@ from .config import (
     BIBLE_VIDEO_LENGTH_MINUTES,
     get_book_by_name,
 )
+from .store import BibleStore, load_bible_store
 
 
 @dataclass
@@ -74,10 +74,13 @@ class Chapter:
     book: str           # 책 이름
     chapter: int        # 장 번호
     verses: List[Verse] # 절 목록
+    char_count: Optional[int] = field(default=None, repr=False, compare=False)  # 색인에서 미리 계산한 글자 수
 
     @property
     def total_chars(self) -> int:
         """총 글자 수 (TTS 기준)"""
+        if self.char_count is not None:
+            return self.char_count
         return sum(len(v.text) for v in self.verses)
 
     @property
@@ -242,6 +245,15 @@ class Episode:
         }
 
 
+# 장 객체/에피소드 계획 메모 (같은 프로세스의 BiblePipeline 인스턴스끼리 공유)
+# - 장: (색인 지문, 책, 장) → Chapter (읽기 전용으로 사용, 절 일부만 쓸 때는 새 Chapter를 만들 것)
+# - 계획: (색인 지문, 분당 글자 수, 책 목록) → {"episodes", "by_day", "summary"}
+#   성경 JSON이나 설정(BIBLE_CHARS_PER_MINUTE, BIBLE_BOOKS)이 바뀌면 키가 달라져 다시 계획
+_chapter_cache: Dict[Tuple, Chapter] = {}
+_episode_plans: Dict[Tuple, Dict[str, Any]] = {}
+_plan_lock = threading.Lock()
+
+
 class BiblePipeline:
     """성경통독 파이프라인"""
 
@@ -251,46 +263,47 @@ class BiblePipeline:
             bible_json_path: 성경 JSON 파일 경로
         """
         self.bible_json_path = bible_json_path
-        self.bible_data = None
+        self.store: BibleStore = None
         self._load_bible()
 
     def _load_bible(self):
-        """성경 JSON 로드"""
-        if not os.path.exists(self.bible_json_path):
-            raise FileNotFoundError(f"성경 파일을 찾을 수 없습니다: {self.bible_json_path}")
+        """성경 색인 로드 (JSON은 색인 캐시가 없거나 오래됐을 때만 파싱)"""
+        self.store = load_bible_store(self.bible_json_path)
 
-        with open(self.bible_json_path, 'r', encoding='utf-8') as f:
-            self.bible_data = json.load(f)
+        print(f"[BIBLE] 로드 완료: {self.store.version}")
+        print(f"[BIBLE] 총 {len(self.store.book_names)}권")
 
-        print(f"[BIBLE] 로드 완료: {self.bible_data.get('version', 'Unknown')}")
-        print(f"[BIBLE] 총 {len(self.bible_data.get('books', []))}권")
+    @property
+    def bible_data(self) -> Dict[str, Any]:
+        """원본 JSON 모양의 전체 데이터 (기존 호출 호환용, 매번 색인에서 새로 만듦)"""
+        return {
+            "version": self.store.version,
+            "books": [self.store.book_dict(name) for name in self.store.book_names],
+        }
 
     def get_book(self, book_name: str) -> Optional[Dict[str, Any]]:
         """책 이름으로 성경 책 데이터 조회"""
-        for book in self.bible_data.get("books", []):
-            if book.get("name") == book_name:
-                return book
-        return None
+        return self.store.book_dict(book_name)
 
     def get_chapter(self, book_name: str, chapter_num: int) -> Optional[Chapter]:
-        """특정 장 데이터 조회"""
-        book = self.get_book(book_name)
-        if not book:
+        """특정 장 데이터 조회 (색인에서 O(1), 같은 장은 같은 Chapter 객체 재사용)"""
+        cache_key = (self.store.fingerprint, book_name, chapter_num)
+        chapter = _chapter_cache.get(cache_key)
+        if chapter is not None:
+            return chapter
+
+        verses = self.store.verses(book_name, chapter_num)
+        if verses is None:
             return None
 
-        for ch in book.get("chapters", []):
-            if ch.get("chapter") == chapter_num:
-                verses = [
-                    Verse(
-                        book=book_name,
-                        chapter=chapter_num,
-                        verse=v.get("verse"),
-                        text=v.get("text", "")
-                    )
-                    for v in ch.get("verses", [])
-                ]
-                return Chapter(book=book_name, chapter=chapter_num, verses=verses)
-        return None
+        chapter = Chapter(
+            book=book_name,
+            chapter=chapter_num,
+            verses=[Verse(book=book_name, chapter=chapter_num, verse=verse, text=text) for verse, text in verses],
+            char_count=self.store.chapter_chars(book_name, chapter_num),
+        )
+        _chapter_cache[cache_key] = chapter
+        return chapter
 
     def get_chapters_range(self, book_name: str, start: int, end: int) -> List[Chapter]:
         """특정 범위의 장들 조회"""
@@ -319,21 +332,19 @@ class BiblePipeline:
             (start_chapter, end_chapter, total_chars, estimated_minutes)
         """
         target_chars = target_minutes * BIBLE_CHARS_PER_MINUTE
-        book = self.get_book(book_name)
 
-        if not book:
+        if not self.store.has_book(book_name):
             raise ValueError(f"책을 찾을 수 없습니다: {book_name}")
 
         total_chars = 0
         end_chapter = start_chapter
 
-        for ch in book.get("chapters", []):
-            ch_num = ch.get("chapter")
+        for ch_num in self.store.chapter_numbers(book_name):
             if ch_num < start_chapter:
                 continue
 
-            # 이 장의 글자 수 계산
-            ch_chars = sum(len(v.get("text", "")) for v in ch.get("verses", []))
+            # 이 장의 글자 수 (색인에 미리 계산됨)
+            ch_chars = self.store.chapter_chars(book_name, ch_num)
 
             # 목표 초과 시 이전 장까지
             if total_chars + ch_chars > target_chars:
@@ -423,11 +434,10 @@ class BiblePipeline:
         Returns:
             Episode 목록
         """
-        book = self.get_book(book_name)
-        if not book:
+        if not self.store.has_book(book_name):
             raise ValueError(f"책을 찾을 수 없습니다: {book_name}")
 
-        total_chapters = len(book.get("chapters", []))
+        total_chapters = len(self.store.chapter_numbers(book_name))
         episodes = []
         current_start = 1
         episode_num = 1
@@ -454,7 +464,41 @@ class BiblePipeline:
 
         return episodes
 
+    def _episode_plan(self) -> Dict[str, Any]:
+        """
+        전체 에피소드 계획 (프로세스당 한 번 계산 후 메모, 성경 JSON/설정이 바뀌면 다시 계산)
+
+        Returns:
+            {"episodes": [Episode, ...], "by_day": {day: Episode}, "summary": [요약 dict, ...]}
+        """
+        plan_key = (
+            self.store.fingerprint,
+            BIBLE_CHARS_PER_MINUTE,
+            tuple((b["name"], b["testament"]) for b in BIBLE_BOOKS),
+        )
+        with _plan_lock:
+            plan = _episode_plans.get(plan_key)
+            if plan is None:
+                episodes = self._plan_all_bible_episodes()
+                plan = {
+                    "episodes": episodes,
+                    "by_day": {ep.day_number: ep for ep in episodes},
+                    "summary": [self._episode_summary(ep) for ep in episodes],
+                }
+                _episode_plans.clear()       # 이전 JSON/설정의 계획은 버림
+                _episode_plans[plan_key] = plan
+        return plan
+
     def generate_all_bible_episodes(self) -> List[Episode]:
+        """
+        성경 66권 전체를 약 100개 에피소드로 분할 (메모된 계획 사용)
+
+        Returns:
+            Episode 목록 (약 100개)
+        """
+        return list(self._episode_plan()["episodes"])
+
+    def _plan_all_bible_episodes(self) -> List[Episode]:
         """
         성경 66권 전체를 약 100개 에피소드로 분할 (깔끔한 책 경계 유지)
 
@@ -478,16 +522,14 @@ class BiblePipeline:
 
         for book_info in BIBLE_BOOKS:
             book_name = book_info["name"]
-            book = self.get_book(book_name)
-            if not book:
+            if not self.store.has_book(book_name):
                 continue
 
             book_chars = 0
             chapter_chars = []  # [(chapter_num, chars), ...]
 
-            for ch in book.get("chapters", []):
-                ch_num = ch.get("chapter")
-                ch_chars = sum(len(v.get("text", "")) for v in ch.get("verses", []))
+            for ch_num in self.store.chapter_numbers(book_name):
+                ch_chars = self.store.chapter_chars(book_name, ch_num)
                 chapter_chars.append((ch_num, ch_chars))
                 book_chars += ch_chars
 
@@ -775,11 +817,7 @@ class BiblePipeline:
         Returns:
             해당 Day의 Episode 객체
         """
-        all_episodes = self.generate_all_bible_episodes()
-        for ep in all_episodes:
-            if ep.day_number == day:
-                return ep
-        return None
+        return self._episode_plan()["by_day"].get(day)
 
     def get_episodes_summary(self) -> List[Dict[str, Any]]:
         """
@@ -791,6 +829,7 @@ class BiblePipeline:
                     "day": 1,
                     "episode_id": "EP001",
                     "book": "창세기",
+                    "books": ["창세기"],
                     "start_chapter": 1,
                     "end_chapter": 15,
                     "range_text": "창세기1장~15장",
@@ -801,23 +840,22 @@ class BiblePipeline:
                 ...
             ]
         """
-        episodes = self.generate_all_bible_episodes()
-        summary = []
-
-        for ep in episodes:
-            summary.append({
-                "day": ep.day_number,
-                "episode_id": ep.episode_id,
-                "book": ep.book,
-                "start_chapter": ep.start_chapter,
-                "end_chapter": ep.end_chapter,
-                "range_text": ep.range_text,
-                "video_title": ep.video_title,
-                "total_chars": ep.total_chars,
-                "estimated_minutes": round(ep.estimated_minutes, 1)
-            })
+        return [dict(item) for item in self._episode_plan()["summary"]]
 
-        return summary
+    @staticmethod
+    def _episode_summary(ep: Episode) -> Dict[str, Any]:
+        return {
+            "day": ep.day_number,
+            "episode_id": ep.episode_id,
+            "book": ep.book,
+            "books": ep.books_in_episode or [ep.book],
+            "start_chapter": ep.start_chapter,
+            "end_chapter": ep.end_chapter,
+            "range_text": ep.range_text,
+            "video_title": ep.video_title,
+            "total_chars": ep.total_chars,
+            "estimated_minutes": round(ep.estimated_minutes, 1)
+        }
 
     def get_tts_config(self) -> Dict[str, Any]:
         """TTS 설정 반환 (기존 파이프라인 호환)"""
@@ -97,7 +97,7 @@ def create_bible_sheet(
 
         # 2) 106개 에피소드 데이터 생성
         pipeline = BiblePipeline()
-        episodes = pipeline.generate_all_bible_episodes()
+        episodes = pipeline.get_episodes_summary()  # 메모된 계획의 요약 (글자 수/시간 미리 계산됨)
 
         # 3) 데이터 행 구성
         # 행 1: 채널ID
@@ -111,27 +111,18 @@ def create_bible_sheet(
         data_rows = []
 
         for ep in episodes:
-            # 예상 시간 계산 (분)
-            total_chars = sum(
-                len(v.text) for ch in ep.chapters for v in ch.verses
-            )
-            estimated_minutes = round(total_chars / 910, 1)  # 910자/분
-
             # 책 목록 (다중 책인 경우)
-            if ep.books_in_episode and len(ep.books_in_episode) > 1:
-                books_str = ", ".join(ep.books_in_episode)
-            else:
-                books_str = ep.book
+            books_str = ", ".join(ep["books"])
 
             row = [
-                f"EP{ep.day_number:03d}",  # 에피소드
+                f"EP{ep['day']:03d}",        # 에피소드
                 books_str,                  # 책
-                ep.start_chapter,           # 시작장
-                ep.end_chapter,             # 끝장
-                estimated_minutes,          # 예상시간(분)
-                total_chars,               # 글자수
+                ep["start_chapter"],        # 시작장
+                ep["end_chapter"],          # 끝장
+                ep["estimated_minutes"],    # 예상시간(분)
+                ep["total_chars"],          # 글자수
                 "",                         # 상태 (대기로 설정 시 트리거)
-                ep.video_title,            # 제목 (자동 생성)
+                ep["video_title"],          # 제목 (자동 생성)
                 "",                         # 음성 (기본값 사용)
                 "unlisted",                 # 공개설정
                 "",                         # 예약시간
@@ -0,0 +1,164 @@
+"""
+성경 색인 저장소
+
+성경 JSON(약 3만 절)을 에피소드 하나 만들 때마다 리스트 순회로 찾던 구조를
+한 번 만든 색인으로 바꿉니다.
+
+- 절 테이블: 전체 절을 성경 순서대로 나열한 배열 (절 번호 array('H'), 글자 수 array('I'), 본문 tuple)
+- 장 색인: (책, 장) → 절 테이블 [시작, 끝) 구간 + 장 글자 수 (미리 계산)
+- 책 색인: 책 → 장 번호 목록 (JSON 순서 유지) + 책 글자 수
+- 바이너리 캐시: data/bible_index.pickle (원본 JSON의 크기/수정 시각이 바뀌면 다시 생성)
+
+사용법:
+    from scripts.bible_pipeline.store import load_bible_store
+
+    store = load_bible_store(BIBLE_JSON_PATH)
+    store.chapter_numbers("창세기")      # [1, 2, ..., 50]
+    store.chapter_chars("창세기", 1)     # 장 글자 수 (O(1))
+    store.verses("창세기", 1)            # [(1, "태초에 ..."), ...]
+"""
+
+import json
+import os
+import pickle
+import threading
+from array import array
+from typing import Any, Dict, List, Optional, Tuple
+
+from .config import BIBLE_INDEX_CACHE_PATH
+
+INDEX_FORMAT_VERSION = 1
+
+_stores = {}                # JSON 경로 → BibleStore (프로세스 안에서 공유)
+_stores_lock = threading.Lock()
+
+
+class BibleStore:
+    """절 테이블 + (책, 장) 색인 (생성 후 읽기 전용)"""
+
+    def __init__(self, bible_data: Dict[str, Any], fingerprint: Tuple = ()):
+        self.version = bible_data.get("version", "Unknown")
+        self.fingerprint = fingerprint
+        self.verse_numbers = array("H")
+        self.verse_chars = array("I")
+        texts = []
+        self.book_names: List[str] = []
+        self.book_chapters: Dict[str, List[int]] = {}
+        self.book_chars: Dict[str, int] = {}
+        self.chapter_index: Dict[Tuple[str, int], Tuple[int, int, int]] = {}   # (책, 장) → (시작, 끝, 글자 수)
+
+        for book in bible_data.get("books", []):
+            name = book.get("name")
+            self.book_names.append(name)
+            chapters = self.book_chapters.setdefault(name, [])
+            book_total = 0
+            for ch in book.get("chapters", []):
+                start = len(texts)
+                chapter_total = 0
+                for v in ch.get("verses", []):
+                    text = v.get("text", "")
+                    texts.append(text)
+                    self.verse_numbers.append(v.get("verse") or 0)
+                    self.verse_chars.append(len(text))
+                    chapter_total += len(text)
+                chapter_num = ch.get("chapter")
+                chapters.append(chapter_num)
+                self.chapter_index[(name, chapter_num)] = (start, len(texts), chapter_total)
+                book_total += chapter_total
+            self.book_chars[name] = book_total
+
+        self.texts = tuple(texts)
+
+    def has_book(self, book_name: str) -> bool:
+        return book_name in self.book_chapters
+
+    def chapter_numbers(self, book_name: str) -> List[int]:
+        """책의 장 번호 목록 (JSON 순서)"""
+        return self.book_chapters.get(book_name, [])
+
+    def has_chapter(self, book_name: str, chapter_num: int) -> bool:
+        return (book_name, chapter_num) in self.chapter_index
+
+    def chapter_chars(self, book_name: str, chapter_num: int) -> int:
+        """장 글자 수 (없는 장은 0)"""
+        entry = self.chapter_index.get((book_name, chapter_num))
+        return entry[2] if entry else 0
+
+    def verses(self, book_name: str, chapter_num: int) -> Optional[List[Tuple[int, str]]]:
+        """장의 [(절 번호, 본문), ...] (없는 장은 None)"""
+        entry = self.chapter_index.get((book_name, chapter_num))
+        if entry is None:
+            return None
+        start, end, _ = entry
+        return list(zip(self.verse_numbers[start:end], self.texts[start:end]))
+
+    def book_dict(self, book_name: str) -> Optional[Dict[str, Any]]:
+        """원본 JSON과 같은 모양의 책 dict (기존 호출 호환용)"""
+        if not self.has_book(book_name):
+            return None
+        return {
+            "name": book_name,
+            "chapters": [
+                {
+                    "chapter": chapter_num,
+                    "verses": [{"verse": verse, "text": text} for verse, text in self.verses(book_name, chapter_num)],
+                }
+                for chapter_num in self.chapter_numbers(book_name)
+            ],
+        }
+
+
+def _source_fingerprint(json_path: str) -> Tuple:
+    stat = os.stat(json_path)
+    return (INDEX_FORMAT_VERSION, os.path.abspath(json_path), stat.st_size, stat.st_mtime_ns)
+
+
+def _load_cached_store(cache_path: str, fingerprint: Tuple) -> Optional[BibleStore]:
+    try:
+        with open(cache_path, "rb") as f:
+            store = pickle.load(f)
+    except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError):
+        return None
+    if not isinstance(store, BibleStore) or store.fingerprint != fingerprint:
+        return None
+    return store
+
+
+def _save_cached_store(cache_path: str, store: BibleStore):
+    try:
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            pickle.dump(store, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, cache_path)
+    except OSError as e:
+        print(f"[BIBLE] 색인 캐시 저장 실패: {e}")
+
+
+def load_bible_store(json_path: str, cache_path: str = BIBLE_INDEX_CACHE_PATH) -> BibleStore:
+    """
+    성경 색인 로드 (프로세스 안에서는 한 번만, 디스크 캐시가 유효하면 JSON 파싱 생략)
+
+    Raises:
+        FileNotFoundError: 성경 JSON이 없을 때
+    """
+    if not os.path.exists(json_path):
+        raise FileNotFoundError(f"성경 파일을 찾을 수 없습니다: {json_path}")
+
+    fingerprint = _source_fingerprint(json_path)
+    with _stores_lock:
+        store = _stores.get(json_path)
+        if store is not None and store.fingerprint == fingerprint:
+            return store
+
+        store = _load_cached_store(cache_path, fingerprint)
+        if store is None:
+            with open(json_path, "r", encoding="utf-8") as f:
+                store = BibleStore(json.load(f), fingerprint)
+            _save_cached_store(cache_path, store)
+            print(f"[BIBLE] 색인 생성: {len(store.texts):,}절 → {cache_path}")
+        else:
+            print(f"[BIBLE] 색인 캐시 사용: {cache_path}")
+
+        _stores[json_path] = store
+        return store
@@ -133,8 +133,8 @@ def _generate_with_gemini(
 ) -> Dict[str, Any]:
     """Gemini 3 Pro로 썸네일 생성"""
     try:
-        # drama_server의 generate_image_base64 함수 import
-        from drama_server import generate_image_base64, GEMINI_PRO
+        # 이미지 모듈 직접 import (drama_server 전체 로드 없이)
+        from image import generate_image_base64, GEMINI_PRO
 
         # 프롬프트 구성
         prompt = f"""Create a YouTube thumbnail image for a Korean Bible reading channel.
@@ -199,6 +199,7 @@ def _generate_with_pil(episode, filepath: str, filename: str) -> Dict[str, Any]:
     """PIL로 썸네일 생성 (폴백)"""
     try:
         from PIL import Image, ImageDraw, ImageFont
+        from image.gemini import get_decoded_frame
         from .background import get_background_path, generate_book_background
 
         # 배경 이미지
@@ -210,7 +211,7 @@ def _generate_with_pil(episode, filepath: str, filename: str) -> Dict[str, Any]:
 
         # 배경 로드
         if background_path and os.path.exists(background_path):
-            bg_image = Image.open(background_path)
+            bg_image = get_decoded_frame(background_path) or Image.open(background_path)
             bg_image = bg_image.resize((THUMBNAIL_WIDTH, THUMBNAIL_HEIGHT), Image.Resampling.LANCZOS)
             bg_image = bg_image.convert('RGB')
         else:
@@ -3,9 +3,13 @@
 교적 크롤링 + church-registry 업로드 스크립트
 
 기능:
-1. god4u.dimode.co.kr에서 교적 데이터 크롤링
-2. 프로필 사진 다운로드
-3. church-registry.onrender.com에 업로드
+1. god4u.dimode.co.kr에서 교적 데이터 크롤링 (페이지 동시 요청, god4u 전체 요청 간격 유지)
+2. 프로필 사진 다운로드 (동시 다운로드, 디스크에 바로 저장 → 교인 dict에는 경로/해시만)
+3. church-registry.onrender.com에 업로드 (회원 목록 한 번 조회 후 배치 단위 동시 업로드)
+
+증분 동기화:
+- crawl_state.json에 교인별 내용 해시/사진 해시/업로드·동기화 시점 해시를 기록
+- 다시 실행하면 바뀐 교인만 사진을 다시 받고, 바뀐 교인만 업로드/동기화 (--force로 전체)
 
 사용법:
 1. 브라우저에서 god4u.dimode.co.kr 로그인
@@ -19,7 +23,9 @@ import json
 import csv
 import time
 import base64
+import hashlib
 import os
+import threading
 from datetime import datetime
 from pathlib import Path
 from concurrent.futures import ThreadPoolExecutor, as_completed
@@ -44,12 +50,65 @@ REGISTRY_BASE_URL = "https://church-registry.onrender.com"
 
 # 페이지 설정
 PAGE_SIZE = 100
-DELAY_BETWEEN_PAGES = 0.5
-DELAY_BETWEEN_PHOTOS = 0.1
+DELAY_BETWEEN_PAGES = 0.5      # god4u 요청 시작 간 최소 간격 (페이지 수집 단계)
+DELAY_BETWEEN_PHOTOS = 0.1     # god4u 요청 시작 간 최소 간격 (사진 다운로드 단계)
+DELAY_BETWEEN_SYNC = 0.5       # god4u 요청 시작 간 최소 간격 (registry → god4u 동기화)
+
+# 동시 실행 수 (god4u 요청 간격은 워커 수와 상관없이 위 값으로 유지)
+PAGE_WORKERS = 4
+PHOTO_WORKERS = 4
+SYNC_WORKERS = 2
+UPLOAD_WORKERS = 4             # church-registry 동시 요청 수
+UPLOAD_BATCH_SIZE = 50         # 배치마다 진행 상황 출력 + 상태 저장
 
 # 사진 저장 폴더
 PHOTO_DIR = Path(__file__).parent / "photos"
 
+# 증분 동기화 상태 (교인별 해시)
+STATE_PATH = Path(__file__).parent / "crawl_state.json"
+
+_IMAGE_MAGIC = (b'\xff\xd8\xff', b'\x89PNG', b'GIF8')
+
+_rate_lock = threading.Lock()
+_next_request_time = 0.0
+_state_lock = threading.Lock()
+
+
+def _throttle(interval: float):
+    """god4u 전체 요청 간격 유지 (슬롯 예약 후 잠금 밖에서 대기)"""
+    global _next_request_time
+    with _rate_lock:
+        now = time.time()
+        slot = max(now, _next_request_time)
+        _next_request_time = slot + interval
+    if slot > now:
+        time.sleep(slot - now)
+
+
+def _content_hash(data: dict) -> str:
+    """교인/회원 dict 내용 해시 (내부용 _ 필드 제외)"""
+    clean = {k: v for k, v in data.items() if not str(k).startswith("_")}
+    return hashlib.sha256(json.dumps(clean, ensure_ascii=False, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+
+def _load_state() -> dict:
+    try:
+        with open(STATE_PATH, "r", encoding="utf-8") as f:
+            state = json.load(f)
+    except (OSError, ValueError):
+        state = {}
+    state.setdefault("members", {})       # god4u 교적번호 → {crawl_hash, photo_hash, photo_path, uploaded_hash, uploaded_photo_hash}
+    state.setdefault("god4u_synced", {})  # god4u 교적번호 → 마지막으로 god4u에 보낸 registry 회원 해시
+    return state
+
+
+def _save_state(state: dict):
+    with _state_lock:
+        tmp_path = STATE_PATH.with_suffix(".json.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(state, f, ensure_ascii=False)
+        os.replace(tmp_path, STATE_PATH)
+
 
 def create_payload(page: int = 1, page_size: int = PAGE_SIZE, search_name: str = "") -> dict:
     """API 요청 페이로드 생성"""
@@ -116,7 +175,8 @@ def fetch_page(session: requests.Session, page: int, page_size: int = PAGE_SIZE)
     }
 
     payload = create_payload(page=page, page_size=page_size)
-    response = session.post(GOD4U_API_URL, json=payload, headers=headers)
+    _throttle(DELAY_BETWEEN_PAGES)
+    response = session.post(GOD4U_API_URL, json=payload, headers=headers, timeout=30)
     response.raise_for_status()
 
     data = response.json()
@@ -125,25 +185,126 @@ def fetch_page(session: requests.Session, page: int, page_size: int = PAGE_SIZE)
     return data
 
 
-def download_photo(session: requests.Session, member_id: str) -> bytes | None:
-    """프로필 사진 다운로드"""
+def download_photo_to_file(session: requests.Session, member_id: str, photo_path: Path) -> str | None:
+    """
+    프로필 사진을 디스크로 바로 스트리밍 저장
+
+    Returns:
+        사진 내용 SHA-256, 사진이 없으면(이미지가 아닌 2xx 응답) "",
+        요청 실패(2xx 아님, 로그인 페이지로 리다이렉트) 시 None (파일은 남기지 않음 → 다음 실행에서 재시도)
+    """
+    tmp_path = photo_path.with_suffix(f".{threading.get_ident()}.tmp")
     try:
         url = f"{GOD4U_PHOTO_URL}?id={member_id}"
         headers = {
             "Referer": f"{GOD4U_BASE_URL}/WebMobile/WebChurch/RangeList.cshtml",
         }
-        response = session.get(url, headers=headers, timeout=10)
-
-        # 이미지인지 확인 (Content-Type 또는 매직 바이트)
-        content_type = response.headers.get("Content-Type", "")
-        if "image" in content_type or response.content[:4] in [b'\xff\xd8\xff\xe0', b'\x89PNG', b'GIF8']:
-            return response.content
-        return None
-    except Exception as e:
+        _throttle(DELAY_BETWEEN_PHOTOS)
+        with session.get(url, headers=headers, timeout=10, stream=True) as response:
+            response.raise_for_status()
+            if response.history and "login" in response.url.lower():
+                print(f"   ⚠️ 사진 요청이 로그인 페이지로 이동 (세션 만료?): {member_id}")
+                return None
+            content_type = response.headers.get("Content-Type", "")
+            digest = hashlib.sha256()
+            is_image = "image" in content_type
+            size = 0
+
+            with open(tmp_path, "wb") as f:
+                for chunk in response.iter_content(chunk_size=64 * 1024):
+                    if not chunk:
+                        continue
+                    if size == 0 and not is_image and not chunk.startswith(_IMAGE_MAGIC):
+                        break
+                    digest.update(chunk)
+                    f.write(chunk)
+                    size += len(chunk)
+
+        if size == 0:
+            tmp_path.unlink(missing_ok=True)
+            return ""
+        os.replace(tmp_path, photo_path)
+        return digest.hexdigest()
+    except Exception:
+        tmp_path.unlink(missing_ok=True)
         return None
 
 
-def crawl_all(cookies: dict = None, download_photos: bool = False) -> list:
+def _fetch_remaining_pages(session: requests.Session, total_pages: int) -> dict:
+    """2페이지부터 동시에 요청 ({페이지: 교인 목록}, 실패한 페이지는 제외)"""
+    pages = {}
+    if total_pages < 2:
+        return pages
+
+    with ThreadPoolExecutor(max_workers=PAGE_WORKERS, thread_name_prefix="god4u-page") as executor:
+        futures = {
+            executor.submit(fetch_page, session, page, PAGE_SIZE): page
+            for page in range(2, total_pages + 1)
+        }
+        for future in as_completed(futures):
+            page = futures[future]
+            try:
+                persons = future.result().get("personInfo", [])
+                pages[page] = persons
+                print(f"   페이지 {page}/{total_pages} 완료 ({len(persons)}명)")
+            except Exception as e:
+                print(f"   ⚠️ 페이지 {page} 오류: {e}")
+    return pages
+
+
+def _download_photos(session: requests.Session, persons: list, state: dict, refresh: bool = False) -> int:
+    """
+    사진 동시 다운로드 (교인 dict에는 _photo_path/_photo_hash만 기록)
+
+    내용이 바뀌지 않은 교인은 이전에 받은 사진 파일을 그대로 사용 (refresh=True면 전부 다시 받음)
+    """
+    PHOTO_DIR.mkdir(exist_ok=True)
+    members = state["members"]
+    photo_count = reused = 0
+    targets = []
+
+    for person in persons:
+        member_id = person.get("id")
+        if not member_id:
+            continue
+        previous = members.get(str(member_id), {})
+        if not refresh and previous.get("crawl_hash") == person["_hash"] and "photo_hash" in previous:
+            photo_path = previous.get("photo_path")
+            if previous["photo_hash"] is None:
+                reused += 1          # 지난번에 사진 없음 확인
+                continue
+            if photo_path and os.path.exists(photo_path):
+                person["_photo_path"] = photo_path
+                person["_photo_hash"] = previous["photo_hash"]
+                photo_count += 1
+                reused += 1
+                continue
+        targets.append(person)
+
+    print(f"   변경 없음 {reused}명은 지난 결과 사용, {len(targets)}명 다운로드")
+
+    with ThreadPoolExecutor(max_workers=PHOTO_WORKERS, thread_name_prefix="god4u-photo") as executor:
+        futures = {
+            executor.submit(download_photo_to_file, session, person["id"], PHOTO_DIR / f"{person['id']}.jpg"): person
+            for person in targets
+        }
+        for done, future in enumerate(as_completed(futures), 1):
+            person = futures[future]
+            photo_hash = future.result()
+            if photo_hash is None:
+                person["_photo_error"] = True    # 다음 실행에서 다시 시도
+            elif photo_hash:
+                person["_photo_path"] = str(PHOTO_DIR / f"{person['id']}.jpg")
+                person["_photo_hash"] = photo_hash
+                photo_count += 1
+
+            if done % 100 == 0:
+                print(f"   {done}/{len(targets)} 처리 완료 (사진 {photo_count}개)")
+
+    return photo_count
+
+
+def crawl_all(cookies: dict = None, download_photos: bool = False, refresh_photos: bool = False) -> list:
     """전체 교적 크롤링"""
     if cookies is None:
         cookies = COOKIES
@@ -167,122 +328,194 @@ def crawl_all(cookies: dict = None, download_photos: bool = False) -> list:
     all_persons.extend(persons)
     print(f"   페이지 1/{total_pages} 완료 ({len(persons)}명)")
 
-    # 나머지 페이지 크롤링
-    for page in range(2, total_pages + 1):
-        time.sleep(DELAY_BETWEEN_PAGES)
-        try:
-            page_data = fetch_page(session, page=page, page_size=PAGE_SIZE)
-            persons = page_data.get("personInfo", [])
-            all_persons.extend(persons)
-            print(f"   페이지 {page}/{total_pages} 완료 ({len(persons)}명)")
-        except Exception as e:
-            print(f"   ⚠️ 페이지 {page} 오류: {e}")
-            continue
+    # 나머지 페이지 동시 크롤링 (페이지 순서대로 합침)
+    pages = _fetch_remaining_pages(session, total_pages)
+    for page in sorted(pages):
+        all_persons.extend(pages[page])
 
     print(f"\n✅ 크롤링 완료: 총 {len(all_persons)}명")
 
+    state = _load_state()
+    for person in all_persons:
+        person["_hash"] = _content_hash(person)
+
     # 사진 다운로드
     if download_photos:
         print("\n📸 사진 다운로드 중...")
-        PHOTO_DIR.mkdir(exist_ok=True)
+        photo_count = _download_photos(session, all_persons, state, refresh=refresh_photos)
+        print(f"✅ 사진 다운로드 완료: {photo_count}개")
 
-        photo_count = 0
-        for i, person in enumerate(all_persons):
-            member_id = person.get("id")
-            if not member_id:
-                continue
+    # 다음 실행의 변경 판단용 해시 기록
+    changed = 0
+    for person in all_persons:
+        member_id = person.get("id")
+        if not member_id:
+            continue
+        entry = state["members"].setdefault(str(member_id), {})
+        is_changed = entry.get("crawl_hash") != person["_hash"]
+        changed += is_changed
+        entry["crawl_hash"] = person["_hash"]
+        if download_photos and not person.get("_photo_error"):
+            entry["photo_hash"] = person.get("_photo_hash")   # None = 사진 없음
+            entry["photo_path"] = person.get("_photo_path")
+        elif download_photos or is_changed:
+            entry.pop("photo_hash", None)                     # 사진 상태 모름 → 다음에 다시 받음
+    _save_state(state)
+    print(f"   지난 크롤링 대비 변경/신규: {changed}명")
 
-            photo_data = download_photo(session, member_id)
-            if photo_data:
-                photo_path = PHOTO_DIR / f"{member_id}.jpg"
-                with open(photo_path, "wb") as f:
-                    f.write(photo_data)
-                person["_photo_path"] = str(photo_path)
-                person["_photo_base64"] = base64.b64encode(photo_data).decode("utf-8")
-                photo_count += 1
+    return all_persons
 
-            if (i + 1) % 100 == 0:
-                print(f"   {i + 1}/{len(all_persons)} 처리 완료 (사진 {photo_count}개)")
 
-            time.sleep(DELAY_BETWEEN_PHOTOS)
+def _map_member(person: dict) -> dict:
+    """god4u 교인 → church-registry 회원 데이터"""
+    member_data = {
+        "name": person.get("name", ""),
+        "phone": person.get("handphone", "") or person.get("tel", ""),
+        "email": person.get("email", ""),
+        "address": person.get("addr", ""),
+        "birth_date": person.get("birth", ""),
+        "gender": "M" if person.get("sex") == "남" else "F" if person.get("sex") == "여" else "",
+        "registration_date": person.get("regday", ""),
+        "position": person.get("cvname1") or person.get("cvname", ""),  # 직분
+        "status": "active" if person.get("state3") == "예배출석" else "inactive",
+        "notes": f"god4u ID: {person.get('id')}\n가족: {person.get('ran1', '')}\n차량: {person.get('carnum', '')}",
+        "external_id": person.get("id"),  # god4u 교적번호
+    }
 
-        print(f"✅ 사진 다운로드 완료: {photo_count}개")
+    # 빈 값 제거
+    return {k: v for k, v in member_data.items() if v}
 
-    return all_persons
 
+def _fetch_registry_ids() -> dict | None:
+    """church-registry 회원 목록 한 번 조회 → {교적번호: 회원 id} (실패 시 None)"""
+    try:
+        resp = requests.get(f"{REGISTRY_BASE_URL}/api/members", timeout=30)
+        if resp.status_code != 200:
+            return None
+        return {
+            str(member["external_id"]): member.get("id")
+            for member in resp.json().get("members", [])
+            if member.get("external_id")
+        }
+    except Exception:
+        return None
 
-def upload_to_registry(persons: list, with_photos: bool = True) -> dict:
-    """church-registry에 업로드"""
+
+def _upload_member(person: dict, existing_ids: dict | None, with_photos: bool):
+    """교인 한 명 업로드 → (성공 여부, 오류 메시지, 사진 업로드 성공 여부 - 올릴 사진이 없으면 True)"""
+    member_data = _map_member(person)
+
+    if existing_ids is None:
+        # 회원 목록 조회 실패 시 교인별 확인 (external_id로)
+        check_url = f"{REGISTRY_BASE_URL}/api/members/by-external-id/{person.get('id')}"
+        check_resp = requests.get(check_url, timeout=10)
+        member_id = check_resp.json().get("id") if check_resp.status_code == 200 else None
+    else:
+        member_id = existing_ids.get(str(person.get("id")))
+
+    if member_id:
+        # 기존 회원 업데이트
+        resp = requests.put(f"{REGISTRY_BASE_URL}/api/members/{member_id}", json=member_data, timeout=10)
+    else:
+        # 새 회원 등록
+        resp = requests.post(f"{REGISTRY_BASE_URL}/api/members", json=member_data, timeout=10)
+
+    if resp.status_code not in [200, 201]:
+        return False, f"{person.get('name')}: {resp.status_code}", False
+
+    member_id = resp.json().get("id") or resp.json().get("member", {}).get("id")
+
+    # 사진 업로드 (디스크에서 읽어 요청 직전에만 base64 변환)
+    photo_ok = True
+    photo_path = person.get("_photo_path")
+    if with_photos and (photo_path or person.get("_photo_base64")):
+        photo_ok = False
+        if member_id:
+            try:
+                if person.get("_photo_base64"):
+                    photo_base64 = person["_photo_base64"]
+                else:
+                    with open(photo_path, "rb") as f:
+                        photo_base64 = base64.b64encode(f.read()).decode("utf-8")
+                photo_resp = requests.post(
+                    f"{REGISTRY_BASE_URL}/api/members/{member_id}/photo",
+                    json={"photo": photo_base64},
+                    timeout=30
+                )
+                photo_ok = photo_resp.status_code in [200, 201]
+                if not photo_ok:
+                    print(f"   ⚠️ {person.get('name')} 사진 업로드 실패: {photo_resp.status_code}")
+            except Exception as e:
+                print(f"   ⚠️ {person.get('name')} 사진 업로드 오류: {e}")
+
+    return True, None, photo_ok
+
+
+def upload_to_registry(persons: list, with_photos: bool = True, force: bool = False) -> dict:
+    """
+    church-registry에 업로드
+
+    - 마지막 업로드 이후 내용/사진 해시가 같은 교인은 건너뜀 (force=True면 전체)
+    - 기존 회원 확인은 회원 목록 한 번 조회로 대체, 업로드는 UPLOAD_BATCH_SIZE명씩 동시에
+    """
     print(f"\n🚀 church-registry에 업로드 중...")
     print(f"   대상: {REGISTRY_BASE_URL}")
 
     results = {"success": 0, "failed": 0, "skipped": 0, "errors": []}
+    state = _load_state()
+    members = state["members"]
+
+    targets = []
+    for person in persons:
+        person_hash = person.get("_hash") or _content_hash(person)
+        entry = members.get(str(person.get("id")), {})
+        photo_changed = with_photos and person.get("_photo_hash") != entry.get("uploaded_photo_hash")
+        if not force and entry.get("uploaded_hash") == person_hash and not photo_changed:
+            results["skipped"] += 1
+            continue
+        targets.append((person, person_hash))
 
-    for i, person in enumerate(persons):
-        try:
-            # 데이터 매핑 (god4u → church-registry)
-            member_data = {
-                "name": person.get("name", ""),
-                "phone": person.get("handphone", "") or person.get("tel", ""),
-                "email": person.get("email", ""),
-                "address": person.get("addr", ""),
-                "birth_date": person.get("birth", ""),
-                "gender": "M" if person.get("sex") == "남" else "F" if person.get("sex") == "여" else "",
-                "registration_date": person.get("regday", ""),
-                "position": person.get("cvname1") or person.get("cvname", ""),  # 직분
-                "status": "active" if person.get("state3") == "예배출석" else "inactive",
-                "notes": f"god4u ID: {person.get('id')}\n가족: {person.get('ran1', '')}\n차량: {person.get('carnum', '')}",
-                "external_id": person.get("id"),  # god4u 교적번호
-            }
+    print(f"   변경/신규 {len(targets)}명 업로드, 변경 없음 {results['skipped']}명 건너뜀")
+    if not targets:
+        return results
 
-            # 빈 값 제거
-            member_data = {k: v for k, v in member_data.items() if v}
-
-            # 기존 회원 확인 (external_id로)
-            check_url = f"{REGISTRY_BASE_URL}/api/members/by-external-id/{person.get('id')}"
-            check_resp = requests.get(check_url, timeout=10)
-
-            if check_resp.status_code == 200:
-                # 기존 회원 업데이트
-                existing = check_resp.json()
-                member_id = existing.get("id")
-                update_url = f"{REGISTRY_BASE_URL}/api/members/{member_id}"
-                resp = requests.put(update_url, json=member_data, timeout=10)
-            else:
-                # 새 회원 등록
-                create_url = f"{REGISTRY_BASE_URL}/api/members"
-                resp = requests.post(create_url, json=member_data, timeout=10)
-
-            if resp.status_code in [200, 201]:
-                member_id = resp.json().get("id") or resp.json().get("member", {}).get("id")
-
-                # 사진 업로드
-                if with_photos and person.get("_photo_base64") and member_id:
-                    try:
-                        photo_url = f"{REGISTRY_BASE_URL}/api/members/{member_id}/photo"
-                        photo_resp = requests.post(
-                            photo_url,
-                            json={"photo": person["_photo_base64"]},
-                            timeout=30
-                        )
-                    except:
-                        pass
-
-                results["success"] += 1
-            else:
-                results["failed"] += 1
-                results["errors"].append(f"{person.get('name')}: {resp.status_code}")
-
-        except Exception as e:
-            results["failed"] += 1
-            results["errors"].append(f"{person.get('name')}: {str(e)}")
-
-        if (i + 1) % 50 == 0:
-            print(f"   {i + 1}/{len(persons)} 처리 완료 (성공: {results['success']}, 실패: {results['failed']})")
+    existing_ids = _fetch_registry_ids()
+    if existing_ids is None:
+        print("   ⚠️ 회원 목록 조회 실패 - 교인별로 기존 회원 확인")
+
+    with ThreadPoolExecutor(max_workers=UPLOAD_WORKERS, thread_name_prefix="registry-upload") as executor:
+        for batch_start in range(0, len(targets), UPLOAD_BATCH_SIZE):
+            batch = targets[batch_start:batch_start + UPLOAD_BATCH_SIZE]
+            futures = {
+                executor.submit(_upload_member, person, existing_ids, with_photos): (person, person_hash)
+                for person, person_hash in batch
+            }
+            for future in as_completed(futures):
+                person, person_hash = futures[future]
+                try:
+                    ok, error, photo_ok = future.result()
+                except Exception as e:
+                    ok, error, photo_ok = False, f"{person.get('name')}: {str(e)}", False
+
+                if ok:
+                    results["success"] += 1
+                    entry = members.setdefault(str(person.get("id")), {})
+                    entry["uploaded_hash"] = person_hash
+                    # 사진 업로드가 실패하면 기록하지 않음 → 다음 실행에서 사진만 다시 시도
+                    if with_photos and photo_ok:
+                        entry["uploaded_photo_hash"] = person.get("_photo_hash")
+                else:
+                    results["failed"] += 1
+                    results["errors"].append(error)
+
+            _save_state(state)  # 배치마다 저장 → 중단돼도 다음 실행은 남은 교인만
+            print(f"   {min(batch_start + UPLOAD_BATCH_SIZE, len(targets))}/{len(targets)} 처리 완료 "
+                  f"(성공: {results['success']}, 실패: {results['failed']})")
 
     print(f"\n✅ 업로드 완료!")
     print(f"   성공: {results['success']}명")
     print(f"   실패: {results['failed']}명")
+    print(f"   건너뜀 (변경 없음): {results['skipped']}명")
 
     return results
 
@@ -294,7 +527,7 @@ def upload_to_registry(persons: list, with_photos: bool = True) -> dict:
 GOD4U_UPDATE_URL = f"{GOD4U_BASE_URL}/WebMobile/WebChurch/PersonModifyDetailExecute.cshtml"
 
 
-def sync_to_god4u(member_data: dict, cookies: dict = None) -> bool:
+def sync_to_god4u(member_data: dict, cookies: dict = None, session: requests.Session = None) -> bool:
     """
     church-registry 데이터를 god4u로 동기화
 
@@ -303,6 +536,7 @@ def sync_to_god4u(member_data: dict, cookies: dict = None) -> bool:
             - external_id: god4u 교적번호 (필수)
             - name, phone, email, address, birth_date, gender 등
         cookies: god4u 인증 쿠키
+        session: 재사용할 세션 (여러 명 동기화 시 연결 재사용)
 
     Returns:
         성공 여부
@@ -315,8 +549,9 @@ def sync_to_god4u(member_data: dict, cookies: dict = None) -> bool:
         print(f"⚠️ external_id가 없습니다: {member_data.get('name')}")
         return False
 
-    session = requests.Session()
-    session.cookies.update(cookies)
+    if session is None:
+        session = requests.Session()
+        session.cookies.update(cookies)
 
     # 주소 파싱 (전체 주소를 분리)
     address = member_data.get("address", "")
@@ -449,6 +684,7 @@ def sync_to_god4u(member_data: dict, cookies: dict = None) -> bool:
     }
 
     try:
+        _throttle(DELAY_BETWEEN_SYNC)
         response = session.post(GOD4U_UPDATE_URL, data=payload, headers=headers, timeout=30)
 
         # 성공 여부 확인 (응답에 "정보수정 완료" 포함)
@@ -463,14 +699,14 @@ def sync_to_god4u(member_data: dict, cookies: dict = None) -> bool:
         return False
 
 
-def sync_registry_to_god4u(cookies: dict = None) -> dict:
+def sync_registry_to_god4u(cookies: dict = None, force: bool = False) -> dict:
     """
     church-registry의 모든 회원을 god4u로 동기화
-    (external_id가 있는 회원만)
+    (external_id가 있는 회원만, 마지막 동기화 이후 바뀐 회원만 - force=True면 전체)
     """
     print("\n🔄 church-registry → god4u 동기화 시작...")
 
-    results = {"success": 0, "failed": 0, "skipped": 0, "errors": []}
+    results = {"success": 0, "failed": 0, "skipped": 0, "unchanged": 0, "errors": []}
 
     # church-registry에서 회원 목록 가져오기
     try:
@@ -486,29 +722,53 @@ def sync_registry_to_god4u(cookies: dict = None) -> dict:
         print(f"❌ church-registry 연결 실패: {str(e)}")
         return results
 
-    # god4u로 동기화
-    for i, member in enumerate(members):
-        external_id = member.get("external_id")
+    state = _load_state()
+    synced = state["god4u_synced"]
 
+    targets = []
+    for member in members:
+        external_id = member.get("external_id")
         if not external_id:
             results["skipped"] += 1
             continue
+        member_hash = _content_hash(member)
+        if not force and synced.get(str(external_id)) == member_hash:
+            results["unchanged"] += 1
+            continue
+        targets.append((member, member_hash))
 
-        if sync_to_god4u(member, cookies):
-            results["success"] += 1
-        else:
-            results["failed"] += 1
-            results["errors"].append(member.get("name", "Unknown"))
+    print(f"   변경/신규 {len(targets)}명 동기화, 변경 없음 {results['unchanged']}명 건너뜀")
 
-        if (i + 1) % 50 == 0:
-            print(f"   {i + 1}/{len(members)} 처리 완료")
+    # god4u로 동기화 (세션 공유, god4u 요청 간격은 _throttle로 유지)
+    if cookies is None:
+        cookies = COOKIES
+    session = requests.Session()
+    session.cookies.update(cookies)
 
-        time.sleep(0.5)  # API 부하 방지
+    with ThreadPoolExecutor(max_workers=SYNC_WORKERS, thread_name_prefix="god4u-sync") as executor:
+        for batch_start in range(0, len(targets), UPLOAD_BATCH_SIZE):
+            batch = targets[batch_start:batch_start + UPLOAD_BATCH_SIZE]
+            futures = {
+                executor.submit(sync_to_god4u, member, cookies, session): (member, member_hash)
+                for member, member_hash in batch
+            }
+            for future in as_completed(futures):
+                member, member_hash = futures[future]
+                if future.result():
+                    results["success"] += 1
+                    synced[str(member["external_id"])] = member_hash
+                else:
+                    results["failed"] += 1
+                    results["errors"].append(member.get("name", "Unknown"))
+
+            _save_state(state)
+            print(f"   {min(batch_start + UPLOAD_BATCH_SIZE, len(targets))}/{len(targets)} 처리 완료")
 
     print(f"\n✅ 동기화 완료!")
     print(f"   성공: {results['success']}명")
     print(f"   실패: {results['failed']}명")
     print(f"   건너뜀 (external_id 없음): {results['skipped']}명")
+    print(f"   건너뜀 (변경 없음): {results['unchanged']}명")
 
     return results
 
@@ -594,6 +854,8 @@ def main():
     parser.add_argument("--csv-only", action="store_true", help="CSV만 저장 (사진/업로드 없음)")
     parser.add_argument("--sync-to-god4u", action="store_true", help="church-registry → god4u 동기화")
     parser.add_argument("--full-sync", action="store_true", help="양방향 전체 동기화 (god4u ↔ registry)")
+    parser.add_argument("--force", action="store_true", help="변경 여부와 상관없이 전체 업로드/동기화")
+    parser.add_argument("--refresh-photos", action="store_true", help="변경 없는 교인 사진도 다시 다운로드")
     args = parser.parse_args()
 
     print("=" * 60)
@@ -602,7 +864,7 @@ def main():
     if args.sync_to_god4u:
         print("🔄 church-registry → god4u 동기화")
         print("=" * 60)
-        sync_registry_to_god4u()
+        sync_registry_to_god4u(force=args.force)
         print("\n" + "=" * 60)
         print("🎉 완료!")
         print("=" * 60)
@@ -615,13 +877,13 @@ def main():
 
         # 1. god4u → church-registry
         print("\n[1/2] god4u → church-registry")
-        persons = crawl_all(download_photos=True)
+        persons = crawl_all(download_photos=True, refresh_photos=args.refresh_photos)
         if persons:
-            upload_to_registry(persons, with_photos=True)
+            upload_to_registry(persons, with_photos=True, force=args.force)
 
-        # 2. church-registry → god4u (새로 추가된 회원만)
+        # 2. church-registry → god4u (변경된 회원만)
         print("\n[2/2] church-registry → god4u")
-        sync_registry_to_god4u()
+        sync_registry_to_god4u(force=args.force)
 
         print("\n" + "=" * 60)
         print("🎉 양방향 동기화 완료!")
@@ -635,7 +897,7 @@ def main():
     download_photos = not args.no_photos and not args.csv_only
 
     # 크롤링 실행
-    persons = crawl_all(download_photos=download_photos)
+    persons = crawl_all(download_photos=download_photos, refresh_photos=args.refresh_photos)
 
     if persons:
         # 파일 저장
@@ -644,7 +906,7 @@ def main():
 
         # church-registry 업로드
         if args.upload:
-            upload_to_registry(persons, with_photos=download_photos)
+            upload_to_registry(persons, with_photos=download_photos, force=args.force)
 
     print("\n" + "=" * 60)
     print("🎉 완료!")
@@ -4,8 +4,25 @@ scripts/common - 파이프라인 공통 모듈
 모든 파이프라인에서 공유하는 기본 클래스와 유틸리티를 제공합니다.
 
 - tts: TTS 생성 (Gemini, Chirp3, Google Cloud)
-- base_agent: 에이전트 기본 클래스
+- base_agent: 에이전트 기본 클래스, 비동기 LLM 래퍼/검수자 팬아웃
 - srt_utils: SRT 자막 유틸리티
+- ass_utils: ASS 자막 / 화면 오버레이 필터 생성
+- bgm_utils: BGM/효과음 선택 및 믹싱
+- audio_library: BGM/효과음 인덱스 (분위기별 조회, 길이/라우드니스 사전 분석)
+- bgm_beds: 캐시된 BGM 베드로 챕터/씬별 BGM 트랙 조립 (NumPy)
+- audio_mixer: 나레이션 + BGM 더킹 믹싱 엔진
+- sheets_utils: Google Sheets/Docs/Drive 서비스 계정 헬퍼
+- youtube_utils: YouTube 통계(CTR) 조회 헬퍼
+- llm_clients: OpenAI 호환 클라이언트 레지스트리 (keep-alive 공유, 응답 캐시, 호출 지점별 통계)
+- script_analysis: 긴 대본 청크 map-reduce 분석 (씬 분할 병렬 + 메타데이터 reduce)
+- scene_pipeline: 씬 단위 데이터플로우 실행기 (이미지/TTS 완료 씬부터 클립 인코딩)
+- feed_fetcher: RSS 피드 동시 수집 (ETag/Last-Modified 조건부 요청, 새 항목 증분)
+- news_dedupe: 실행 간 뉴스 중복 제거 인덱스 (SQLite, MinHash-LSH 유사 제목 검출)
+- keyword_matcher: 다중 키워드 매처 (Aho-Corasick, 텍스트 한 번 스캔으로 라벨별 키워드 매칭)
+- reference_corpus: 역사/미스테리 참고자료 로컬 코퍼스 (SQLite FTS5 전문 검색, 만료 시에만 네트워크)
+
+drama_server.py를 import하면 Flask 앱 생성/DB 초기화까지 실행되므로
+CLI 파이프라인은 위 모듈을 직접 import합니다.
 
 사용법:
     from scripts.common.tts import generate_chirp3_tts, is_chirp3_voice
@@ -20,6 +37,9 @@ from .base_agent import (
     AgentResult,
     BaseAgent,
     BudgetManager,
+    AsyncLLMClient,
+    fan_out,
+    run_sync,
 )
 
 # TTS 모듈
@@ -41,6 +61,9 @@ __all__ = [
     "AgentResult",
     "BaseAgent",
     "BudgetManager",
+    "AsyncLLMClient",
+    "fan_out",
+    "run_sync",
     # TTS
     'generate_gemini_tts',
     'generate_chirp3_tts',
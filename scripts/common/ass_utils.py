@@ -0,0 +1,535 @@
+"""
+ASS 자막 / FFmpeg 오버레이 필터 생성 모듈
+
+drama_server.py에서 분리된 부수효과 없는 렌더링 헬퍼:
+- _get_subtitle_style: 언어별 ASS 자막 스타일
+- _generate_ass_subtitles: 색상 강조 지원 ASS 자막 파일 생성
+- _generate_screen_overlay_filter / _generate_lower_thirds_filter / _generate_news_ticker_filter:
+  drawtext 기반 화면 오버레이 필터 문자열 생성
+
+사용법:
+    from scripts.common.ass_utils import _generate_ass_subtitles
+"""
+
+from lang import ko as lang_ko
+from lang import ja as lang_ja
+from lang import en as lang_en
+
+
+def _get_subtitle_style(lang):
+    """언어별 자막 스타일 반환 (ASS 형식) - 반투명 검정박스 + 흰색 텍스트
+
+    깔끔한 스타일: 반투명 검정 배경 박스 위에 흰색 텍스트
+    """
+    # 깔끔한 스타일: 흰색 텍스트 + 반투명 검정 박스
+    # BorderStyle=4: 외곽선 + 배경 박스
+    # PrimaryColour=&HFFFFFF: 흰색 텍스트 (BGR 순서)
+    # BackColour=&H80000000: 반투명 검정 박스 (80=약 50% 투명도)
+    # OutlineColour=&H00000000: 검정 외곽선
+    # Outline=1: 얇은 외곽선
+    if lang == 'ko':
+        font_name = lang_ko.FONTS['default_name']
+        return (
+            f"FontName={font_name},FontSize=48,PrimaryColour=&HFFFFFF,"
+            "OutlineColour=&H00000000,BackColour=&H80000000,"
+            "BorderStyle=4,Outline=1,Shadow=0,MarginV=50,Bold=1"
+        )
+    elif lang == 'ja':
+        font_name = lang_ja.FONTS['default_name']
+        font_size = lang_ja.SUBTITLE['style']['font_size']
+        return (
+            f"FontName={font_name},FontSize={font_size},PrimaryColour=&HFFFFFF,"
+            "OutlineColour=&H00000000,BackColour=&H80000000,"
+            "BorderStyle=4,Outline=1,Shadow=0,MarginV=40,Bold=1"
+        )
+    elif lang == 'en':
+        font_name = lang_en.FONTS['default_name']
+        font_size = lang_en.SUBTITLE['style']['font_size']
+        return (
+            f"FontName={font_name},FontSize={font_size},PrimaryColour=&HFFFFFF,"
+            "OutlineColour=&H00000000,BackColour=&H80000000,"
+            "BorderStyle=4,Outline=1,Shadow=0,MarginV=40,Bold=1"
+        )
+    else:
+        font_name = lang_en.FONTS['default_name']
+        return (
+            f"FontName={font_name},FontSize=22,PrimaryColour=&HFFFFFF,"
+            "OutlineColour=&H00000000,BackColour=&H80000000,"
+            "BorderStyle=4,Outline=1,Shadow=0,MarginV=40,Bold=1"
+        )
+
+def _hex_to_ass_color(hex_color):
+    """HEX 색상을 ASS 포맷으로 변환 (#RRGGBB -> &HBBGGRR&)"""
+    if not hex_color or not hex_color.startswith('#'):
+        return "&HFFFFFF&"  # 기본 흰색
+    hex_color = hex_color.lstrip('#')
+    if len(hex_color) == 6:
+        r, g, b = hex_color[0:2], hex_color[2:4], hex_color[4:6]
+        return f"&H{b}{g}{r}&"
+    return "&HFFFFFF&"  # 기본 흰색
+
+
+def _apply_subtitle_highlights(text, highlights):
+    """자막 텍스트에 키워드 색상 강조 적용 (박스 배경 포함)
+
+    Args:
+        text: 원본 자막 텍스트
+        highlights: [{"keyword": "단어", "color": "#FF0000"}, ...]
+
+    Returns:
+        색상 태그가 적용된 텍스트 (ASS override tags)
+    """
+    if not highlights:
+        return text
+
+    result = text
+    for h in highlights:
+        keyword = h.get('keyword', '')
+        color = h.get('color', '#FFFF00')
+        if keyword and keyword in result:
+            ass_color = _hex_to_ass_color(color)
+            # ASS 자막 색상 강조 (원래 스타일 - 색상만 변경)
+            # - \c{색상}: 텍스트 색상을 강조색으로 변경
+            # - 강조 후 원래 흰색으로 복원
+            colored_keyword = f"{{\\c{ass_color}}}{keyword}{{\\c&HFFFFFF&}}"
+            result = result.replace(keyword, colored_keyword)
+
+    return result
+
+
+def _format_ass_time(seconds):
+    """초를 ASS 시간 형식으로 변환 (H:MM:SS.cc)"""
+    hours = int(seconds // 3600)
+    minutes = int((seconds % 3600) // 60)
+    secs = int(seconds % 60)
+    centisecs = int((seconds % 1) * 100)
+    return f"{hours}:{minutes:02d}:{secs:02d}.{centisecs:02d}"
+
+
+def _generate_ass_subtitles(subtitles, highlights, output_path, lang='ko'):
+    """ASS 형식 자막 파일 생성 (색상 강조 지원)
+
+    Args:
+        subtitles: [{"start": 0.0, "end": 3.0, "text": "자막"}, ...]
+        highlights: [{"keyword": "단어", "color": "#FF0000"}, ...]
+        output_path: ASS 파일 출력 경로
+        lang: 언어 코드
+
+    Returns:
+        성공 여부
+    """
+    try:
+        # 언어별 폰트 설정 (큰 자막 - 50대+ 시청자 가독성)
+        # 한국어 폰트: lang/ko.py에서 관리
+        if lang == 'ko':
+            font_name = lang_ko.FONTS['default_name']
+            font_size = 48  # 24 → 48 (2배 크기)
+            max_chars_per_line = 100  # ★ 청킹 방식: 줄바꿈 비활성화 (한 문장 = 한 자막)
+        elif lang == 'ja':
+            # 일본어: lang/ja.py에서 관리
+            font_name = lang_ja.FONTS['default_name']
+            font_size = lang_ja.SUBTITLE['style']['font_size_burn']
+            max_chars_per_line = lang_ja.SUBTITLE['max_chars_per_line']
+        elif lang == 'en':
+            # 영어: lang/en.py에서 관리
+            font_name = lang_en.FONTS['default_name']
+            font_size = lang_en.SUBTITLE['style']['font_size_burn']
+            max_chars_per_line = lang_en.SUBTITLE['max_chars_per_line']
+        else:
+            # 기타 언어 - 영어 설정으로 fallback
+            font_name = lang_en.FONTS['default_name']
+            font_size = lang_en.SUBTITLE['style']['font_size_burn']
+            max_chars_per_line = lang_en.SUBTITLE['max_chars_per_line']
+
+        # 긴 텍스트 자동 줄바꿈 함수
+        def wrap_text(text, max_chars):
+            """긴 텍스트를 max_chars 기준으로 줄바꿈"""
+            if len(text) <= max_chars:
+                return text
+
+            # 이미 줄바꿈이 있으면 각 줄에 대해 재귀 처리
+            if '\n' in text:
+                return '\n'.join(wrap_text(line, max_chars) for line in text.split('\n'))
+            if '\\N' in text:
+                return '\\N'.join(wrap_text(line, max_chars) for line in text.split('\\N'))
+
+            # 언어에 따른 분리 기준
+            # 일본어/한국어: 구두점, 한국어: 띄어쓰기도 포함
+            punctuation = '、。，．!?！？ 　'  # 일본어 구두점 + 공백
+
+            # 자연스러운 줄바꿈 위치 찾기 (구두점/공백에서 분리)
+            words = []
+            current = ""
+            for char in text:
+                current += char
+                if char in punctuation:
+                    words.append(current)
+                    current = ""
+            if current:
+                words.append(current)
+
+            # 단어 단위로 줄바꿈
+            lines = []
+            current_line = ""
+            for word in words:
+                # 단어 자체가 max_chars보다 긴 경우 강제 분할
+                if len(word) > max_chars:
+                    # 현재 줄 저장
+                    if current_line:
+                        lines.append(current_line.strip())
+                        current_line = ""
+                    # 긴 단어 강제 분할
+                    while len(word) > max_chars:
+                        lines.append(word[:max_chars])
+                        word = word[max_chars:]
+                    if word:
+                        current_line = word
+                elif len(current_line) + len(word) <= max_chars:
+                    current_line += word
+                else:
+                    if current_line:
+                        lines.append(current_line.strip())
+                    current_line = word
+            if current_line:
+                lines.append(current_line.strip())
+
+            # 빈 줄 제거
+            lines = [l for l in lines if l]
+
+            # 마지막 줄이 너무 짧으면 (8자 미만) 이전 줄과 합치기
+            # 예: "해드리겠습니다." (8자) 같은 짧은 끝 부분 방지
+            min_last_line_chars = 8
+            if len(lines) >= 2 and len(lines[-1]) < min_last_line_chars:
+                # 이전 줄과 합쳤을 때 max_chars를 약간 초과해도 허용 (가독성 우선)
+                combined = lines[-2] + ' ' + lines[-1]
+                if len(combined) <= max_chars + 6:  # 최대 32자까지 허용
+                    lines[-2] = combined
+                    lines.pop()
+
+            result = '\n'.join(lines)
+            return result
+
+        # ASS 헤더 (반투명 박스 + 자동 줄바꿈)
+        # BorderStyle=4: 외곽선 + 배경 박스
+        # BackColour=&H80000000: 반투명 검정 배경 (80 = 약 50% 투명)
+        # PrimaryColour=&HFFFFFF: 흰색 텍스트 (BGR 순서)
+        # OutlineColour=&H00000000: 검정 외곽선
+        # Outline=1: 얇은 외곽선
+        # Shadow=0: 그림자 제거
+        # MarginL/R=100: 좌우 여백으로 자동 줄바꿈 영역 제한
+        # MarginV=40: 하단 여백
+        # WrapStyle=0: 스마트 줄바꿈 (긴 텍스트 자동 2줄)
+        ass_header = f"""[Script Info]
+ScriptType: v4.00+
+PlayResX: 1280
+PlayResY: 720
+WrapStyle: 0
+
+[V4+ Styles]
+Format: Name, Fontname, Fontsize, PrimaryColour, SecondaryColour, OutlineColour, BackColour, Bold, Italic, Underline, StrikeOut, ScaleX, ScaleY, Spacing, Angle, BorderStyle, Outline, Shadow, Alignment, MarginL, MarginR, MarginV, Encoding
+Style: Default,{font_name},{font_size},&HFFFFFF,&H000000FF,&H00000000,&H80000000,1,0,0,0,100,100,0,0,4,1,0,2,100,100,40,1
+
+[Events]
+Format: Layer, Start, End, Style, Name, MarginL, MarginR, MarginV, Effect, Text
+"""
+
+        # 이벤트 생성
+        events = []
+        for sub in subtitles:
+            start = _format_ass_time(sub['start'])
+            end = _format_ass_time(sub['end'])
+            text = sub.get('text', '')
+
+            # 긴 텍스트 자동 줄바꿈 적용
+            original_text = text
+            text = wrap_text(text, max_chars_per_line)
+            if text != original_text:
+                print(f"[ASS] 자막 줄바꿈 적용 (lang={lang}): '{original_text[:30]}...' → {text.count(chr(10)) + 1}줄")
+
+            # 색상 강조 적용
+            if highlights:
+                text = _apply_subtitle_highlights(text, highlights)
+
+            # ASS에서는 \N이 줄바꿈
+            text = text.replace('\n', '\\N')
+
+            events.append(f"Dialogue: 0,{start},{end},Default,,0,0,0,,{text}")
+
+        with open(output_path, 'w', encoding='utf-8') as f:
+            f.write(ass_header)
+            f.write('\n'.join(events))
+
+        print(f"[ASS] 자막 생성 완료: {len(subtitles)}개 자막, {len(highlights)}개 강조 키워드")
+        return True
+
+    except Exception as e:
+        print(f"[ASS] 자막 생성 오류: {e}")
+        return False
+
+
+def _generate_screen_overlay_filter(screen_overlays, scenes, fonts_dir, subtitles=None, lang='ko'):
+    """화면 텍스트 오버레이용 FFmpeg drawtext 필터 생성 (나레이션 싱크)
+
+    Args:
+        screen_overlays: [{"scene": 3, "text": "대박!", "duration": 3, "style": "impact"}, ...]
+        scenes: 씬 목록 (duration 계산용)
+        fonts_dir: 폰트 디렉토리 경로
+        subtitles: 자막 데이터 [{"start": 0.0, "end": 2.5, "text": "..."}, ...] (나레이션 싱크용)
+        lang: 언어 코드 (ko, ja, en)
+
+    Returns:
+        FFmpeg drawtext 필터 문자열 또는 None
+    """
+    if not screen_overlays:
+        return None
+
+    # 씬별 시작 시간 계산 (fallback용)
+    scene_start_times = {}
+    current_time = 0
+    for idx, scene in enumerate(scenes):
+        scene_start_times[idx + 1] = current_time  # 1-based index
+        current_time += scene.get('duration', 0)
+
+    filters = []
+    # 언어별 폰트 선택 (font= 파라미터로 fontconfig 폴백 활성화)
+    if lang == 'ja':
+        font_name = lang_ja.FONTS['default_name']
+    elif lang == 'en':
+        font_name = lang_en.FONTS['default_name']
+    else:
+        font_name = lang_ko.FONTS['default_name']
+    font_escaped = font_name.replace(':', '\\:')
+
+    for overlay in screen_overlays:
+        scene_num = overlay.get('scene', 1)
+        text = overlay.get('text', '')
+        duration = overlay.get('duration', 5)  # 기본 5초로 증가 (기존 3초)
+        style = overlay.get('style', 'impact')
+
+        if not text:
+            continue
+
+        # ========== 나레이션 싱크: 자막에서 해당 텍스트가 나오는 시간 찾기 ==========
+        start_time = None
+        if subtitles:
+            # 오버레이 텍스트가 포함된 자막 찾기
+            text_lower = text.lower().replace(' ', '')
+            for sub in subtitles:
+                sub_text = sub.get('text', '').lower().replace(' ', '')
+                if text_lower in sub_text:
+                    start_time = sub.get('start', 0)
+                    print(f"[OVERLAY] 나레이션 싱크 성공: '{text}' → {start_time:.1f}s (자막: '{sub.get('text', '')[:30]}...')")
+                    break
+
+        # 자막에서 못 찾으면 씬 시작 시간 사용 (fallback)
+        if start_time is None:
+            if scene_num in scene_start_times:
+                start_time = scene_start_times[scene_num]
+                print(f"[OVERLAY] 나레이션 싱크 실패, 씬 시작 시간 사용: '{text}' → scene {scene_num} = {start_time:.1f}s")
+            else:
+                print(f"[OVERLAY] 스킵: text='{text}', scene={scene_num} 없음")
+                continue
+
+        end_time = start_time + duration
+
+        # ========== 스타일별 설정 (박스 배경 추가) ==========
+        # 3번 이미지처럼 텍스트에 박스 배경 적용
+        if style == 'impact':
+            # 빨간 박스 + 흰색 텍스트 (가장 강렬)
+            fontcolor = "white"
+            fontsize = 100
+            borderw = 3
+            bordercolor = "black"
+            boxcolor = "red@0.9"  # 빨간 박스 90% 불투명
+            boxborderw = 15  # 박스 패딩
+        elif style == 'dramatic':
+            # 노란 박스 + 검은 텍스트
+            fontcolor = "black"
+            fontsize = 90
+            borderw = 0
+            bordercolor = "black"
+            boxcolor = "yellow@0.9"  # 노란 박스
+            boxborderw = 12
+        elif style == 'emotional':
+            # 청록 박스 + 흰색 텍스트
+            fontcolor = "white"
+            fontsize = 80
+            borderw = 2
+            bordercolor = "black"
+            boxcolor = "#00CCCC@0.85"  # 청록 박스
+            boxborderw = 10
+        else:
+            # 기본: 검은 박스 + 흰색 텍스트
+            fontcolor = "white"
+            fontsize = 90
+            borderw = 2
+            bordercolor = "black"
+            boxcolor = "black@0.8"
+            boxborderw = 12
+
+        # FFmpeg drawtext 텍스트 이스케이프
+        text_escaped = text.replace('\\', '\\\\').replace("'", "\\'").replace(':', '\\:').replace('=', '\\=')
+
+        print(f"[OVERLAY] 추가: text='{text}', style={style}, time={start_time:.1f}-{end_time:.1f}s (duration={duration}s)")
+
+        # drawtext 필터 생성 (화면 중앙, 박스 배경 추가)
+        # font= 파라미터 사용으로 fontconfig 폴백 활성화 (일본어 문자 깨짐 방지)
+        drawtext = (
+            f"drawtext=text='{text_escaped}':"
+            f"font='{font_escaped}':"
+            f"fontsize={fontsize}:"
+            f"fontcolor={fontcolor}:"
+            f"bordercolor={bordercolor}:"
+            f"borderw={borderw}:"
+            f"box=1:"
+            f"boxcolor={boxcolor}:"
+            f"boxborderw={boxborderw}:"
+            f"x=(w-text_w)/2:"
+            f"y=(h-text_h)/2:"
+            f"enable='between(t,{start_time},{end_time})'"
+        )
+        filters.append(drawtext)
+
+    if filters:
+        return ",".join(filters)
+    return None
+
+
+def _generate_lower_thirds_filter(lower_thirds, scenes, fonts_dir, lang='ko'):
+    """로워서드(하단 자막) 오버레이용 FFmpeg drawtext 필터 생성
+
+    Args:
+        lower_thirds: [{"scene": 2, "text": "출처: OO일보", "position": "bottom-left"}, ...]
+        scenes: 씬 목록 (duration 계산용)
+        fonts_dir: 폰트 디렉토리 경로
+        lang: 언어 코드 (ko, ja, en)
+
+    Returns:
+        FFmpeg drawtext 필터 문자열 또는 None
+    """
+    if not lower_thirds:
+        return None
+
+    # 씬별 시작 시간 계산
+    scene_start_times = {}
+    scene_durations = {}
+    current_time = 0
+    for idx, scene in enumerate(scenes):
+        scene_start_times[idx + 1] = current_time  # 1-based index
+        scene_durations[idx + 1] = scene.get('duration', 0)
+        current_time += scene.get('duration', 0)
+
+    filters = []
+    # 언어별 폰트 선택 (font= 파라미터로 fontconfig 폴백 활성화)
+    if lang == 'ja':
+        font_name = lang_ja.FONTS['default_name']
+    elif lang == 'en':
+        font_name = lang_en.FONTS['default_name']
+    else:
+        font_name = lang_ko.FONTS['default_name']
+    font_escaped = font_name.replace(':', '\\:')
+
+    for lt in lower_thirds:
+        scene_num = lt.get('scene', 1)
+        text = lt.get('text', '')
+        position = lt.get('position', 'bottom-left')
+
+        if not text or scene_num not in scene_start_times:
+            continue
+
+        start_time = scene_start_times[scene_num]
+        # 로워서드는 씬 전체 동안 표시 (페이드인/아웃)
+        scene_duration = scene_durations.get(scene_num, 5)
+        end_time = start_time + scene_duration
+
+        # 위치별 좌표 설정
+        # 자막과 겹치지 않도록 충분히 위로 (하단에서 180px)
+        if position == 'bottom-left':
+            x_pos = "30"
+            y_pos = "h-th-180"  # 하단에서 180px 위 (자막 위)
+        elif position == 'bottom-right':
+            x_pos = "w-tw-30"
+            y_pos = "h-th-180"
+        elif position == 'bottom-center':
+            x_pos = "(w-tw)/2"
+            y_pos = "h-th-180"
+        else:  # default: bottom-left
+            x_pos = "30"
+            y_pos = "h-th-180"
+
+        # 반투명 배경 박스 + 텍스트 (뉴스 스타일)
+        # 텍스트 필터 (font= 파라미터로 fontconfig 폴백 활성화)
+        text_escaped = text.replace("'", "'\\''").replace(":", "\\:")
+
+        # drawbox는 텍스트 크기를 모르므로 drawtext의 box=1로 배경 박스를 그림
+        text_with_bg = (
+            f"drawtext=text='{text_escaped}':"
+            f"font='{font_escaped}':"
+            f"fontsize=28:"
+            f"fontcolor=white:"
+            f"box=1:"
+            f"boxcolor=black@0.7:"
+            f"boxborderw=10:"
+            f"x={x_pos}:"
+            f"y={y_pos}:"
+            f"enable='between(t,{start_time},{end_time})'"
+        )
+
+        filters.append(text_with_bg)
+
+    if filters:
+        return ",".join(filters)
+    return None
+
+
+def _generate_news_ticker_filter(news_ticker, total_duration, fonts_dir, lang='ko'):
+    """뉴스 티커(스크롤 헤드라인) 필터 생성
+
+    Args:
+        news_ticker: {"enabled": true, "headlines": ["속보: ...", "이슈: ..."]}
+        total_duration: 전체 영상 길이 (초)
+        fonts_dir: 폰트 디렉토리 경로
+        lang: 언어 코드 (ko, ja, en)
+
+    Returns:
+        FFmpeg drawtext 필터 문자열 또는 None
+    """
+    if not news_ticker or not news_ticker.get('enabled'):
+        return None
+
+    headlines = news_ticker.get('headlines', [])
+    if not headlines:
+        return None
+
+    # 헤드라인을 하나의 긴 텍스트로 연결 (구분자: ●)
+    ticker_text = "   ●   ".join(headlines) + "   ●   " + headlines[0]  # 반복을 위해 첫 번째 추가
+    ticker_text = ticker_text.replace("'", "'\\''").replace(":", "\\:")
+
+    # 언어별 폰트 선택 (font= 파라미터로 fontconfig 폴백 활성화)
+    if lang == 'ja':
+        font_name = lang_ja.FONTS['default_name']
+    elif lang == 'en':
+        font_name = lang_en.FONTS['default_name']
+    else:
+        font_name = lang_ko.FONTS['default_name']
+    font_escaped = font_name.replace(':', '\\:')
+
+    # 스크롤 속도: 전체 영상 동안 텍스트가 2-3번 정도 지나가도록
+    # x = w - (mod(t * speed, tw + w))
+    # speed = (tw + w) / (total_duration / scroll_cycles)
+    scroll_speed = 100  # 초당 100픽셀 이동
+
+    # 뉴스 티커 스타일: 하단에 어두운 빨간 배경(반투명) + 흰 텍스트
+    # 참고: drawbox에서 w=w는 순환 참조 에러 발생, iw(입력 너비) 사용
+    # font= 파라미터 사용으로 fontconfig 폴백 활성화 (일본어 문자 깨짐 방지)
+    ticker_filter = (
+        f"drawbox=x=0:y=ih-40:w=iw:h=40:color=0x8B0000@0.7:t=fill,"
+        f"drawtext=text='{ticker_text}':"
+        f"font='{font_escaped}':"
+        f"fontsize=24:"
+        f"fontcolor=white:"
+        f"x=w-mod(t*{scroll_speed}\\,tw+w):"
+        f"y=h-35"
+    )
+
+    return ticker_filter
@@ -0,0 +1,363 @@
+"""
+BGM / 효과음 라이브러리 인덱스
+
+static/audio/bgm, static/audio/sfx 파일을 한 번 스캔해 분위기(타입)별로 색인하고,
+파일마다 길이/통합 라우드니스(LUFS)/트루 피크를 미리 분석해 data/audio_library.json에 저장합니다.
+
+- 조회: 분위기 → 파일 목록 (dict 조회, 매번 glob/디렉토리 나열 안 함)
+- 갱신: 디렉토리 mtime이 바뀌었을 때만 재스캔, 파일 mtime/크기가 바뀐 항목만 재분석
+- 업로드 API는 register_file()로 즉시 반영
+- 믹싱 시 get_bgm_volume()으로 트랙별 보정 볼륨을 바로 계산 (별도 분석 패스 없음)
+
+사용법:
+    from scripts.common.audio_library import find_files, get_track, get_bgm_volume
+
+    files = find_files('bgm', 'calm')
+    volume = get_bgm_volume(files[0], 0.10)
+
+    # 전체 파일 사전 분석 (배포 후 1회)
+    python -m scripts.common.audio_library
+"""
+
+import json
+import os
+import re
+import subprocess
+import threading
+
+# 프로젝트 루트 (static/audio, data 기준 경로)
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+LIBRARY_DIRS = {
+    "bgm": os.path.join(PROJECT_ROOT, "static", "audio", "bgm"),
+    "sfx": os.path.join(PROJECT_ROOT, "static", "audio", "sfx"),
+}
+INDEX_PATH = os.environ.get(
+    "AUDIO_LIBRARY_INDEX", os.path.join(PROJECT_ROOT, "data", "audio_library.json")
+)
+
+# BGM 볼륨 보정 기준: 이 라우드니스의 트랙에 지정 볼륨(bgm_volume)을 그대로 적용
+BGM_REFERENCE_LUFS = -16.0
+# 보정 배율 한계 (분석 오류/무음 트랙으로 인한 극단값 방지)
+MAX_GAIN_BOOST = 4.0
+MIN_GAIN_CUT = 0.25
+
+_lock = threading.Lock()
+_index = None            # {"files": {abs_path: entry}, "dirs": {kind: {"path", "mtime"}}}
+_by_category = {}        # kind → {category: [abs_path, ...]}
+_loaded_index_mtime = None
+
+
+def _parse_category(filename):
+    """파일명에서 분위기/타입 추출: calm_01.mp3 → calm, clock_tick_02.mp3 → clock_tick, sad (1).mp3 → sad"""
+    stem = os.path.splitext(filename)[0]
+    return re.sub(r"[ _]*\(?\d+\)?$", "", stem) or stem
+
+
+def _probe_duration(path):
+    """ffprobe로 길이(초) 조회 (실패 시 None)"""
+    try:
+        result = subprocess.run(
+            ["ffprobe", "-v", "error", "-show_entries", "format=duration",
+             "-of", "default=noprint_wrappers=1:nokey=1", path],
+            capture_output=True, text=True, timeout=30
+        )
+        return round(float(result.stdout.strip()), 3)
+    except Exception:
+        return None
+
+
+def _measure_loudness(path):
+    """
+    ebur128 필터로 통합 라우드니스(LUFS)와 트루 피크(dBFS) 측정
+
+    Returns:
+        (lufs, peak_db) - 실패 시 (None, None)
+    """
+    try:
+        result = subprocess.run(
+            ["ffmpeg", "-hide_banner", "-nostats", "-i", path,
+             "-af", "ebur128=peak=true", "-f", "null", "-"],
+            capture_output=True, text=True, timeout=120
+        )
+    except Exception as e:
+        print(f"[AUDIO-LIB] 라우드니스 분석 실패: {os.path.basename(path)} - {e}")
+        return None, None
+
+    # 요약(Summary) 블록은 stderr 마지막에 출력됨
+    summary = result.stderr.rsplit("Summary:", 1)[-1]
+    lufs_match = re.search(r"I:\s*(-?[\d.]+|-inf)\s*LUFS", summary)
+    peak_match = re.search(r"Peak:\s*(-?[\d.]+|-inf)\s*dBFS", summary)
+
+    def _to_float(match):
+        if not match or match.group(1) == "-inf":
+            return None
+        return float(match.group(1))
+
+    return _to_float(lufs_match), _to_float(peak_match)
+
+
+def _file_signature(path):
+    st = os.stat(path)
+    return st.st_mtime, st.st_size
+
+
+def _analyze_file(path, kind, analyze=True):
+    """파일 하나의 인덱스 항목 생성 (analyze=False면 길이/라우드니스는 나중에)"""
+    mtime, size = _file_signature(path)
+    entry = {
+        "kind": kind,
+        "filename": os.path.basename(path),
+        "category": _parse_category(os.path.basename(path)),
+        "mtime": mtime,
+        "size": size,
+        "duration": None,
+        "lufs": None,
+        "peak_db": None,
+        "analyzed": False,
+    }
+    if analyze:
+        entry["duration"] = _probe_duration(path)
+        entry["lufs"], entry["peak_db"] = _measure_loudness(path)
+        entry["analyzed"] = True
+    return entry
+
+
+def _load_index():
+    """디스크 인덱스 로드 (다른 워커가 갱신했으면 다시 읽음)"""
+    global _index, _loaded_index_mtime
+    try:
+        index_mtime = os.path.getmtime(INDEX_PATH)
+    except OSError:
+        index_mtime = None
+
+    if _index is not None and index_mtime == _loaded_index_mtime:
+        return
+
+    data = None
+    if index_mtime is not None:
+        try:
+            with open(INDEX_PATH, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"[AUDIO-LIB] 인덱스 로드 실패, 새로 생성: {e}")
+
+    _index = data if isinstance(data, dict) else {"files": {}, "dirs": {}}
+    _index.setdefault("files", {})
+    _index.setdefault("dirs", {})
+    _loaded_index_mtime = index_mtime
+    _rebuild_categories()
+
+
+def _save_index():
+    global _loaded_index_mtime
+    try:
+        os.makedirs(os.path.dirname(INDEX_PATH), exist_ok=True)
+        tmp_path = f"{INDEX_PATH}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(_index, f, ensure_ascii=False, indent=1)
+        os.replace(tmp_path, INDEX_PATH)
+        _loaded_index_mtime = os.path.getmtime(INDEX_PATH)
+    except Exception as e:
+        print(f"[AUDIO-LIB] 인덱스 저장 실패: {e}")
+
+
+def _rebuild_categories():
+    _by_category.clear()
+    for path, entry in sorted(_index["files"].items()):
+        kind_map = _by_category.setdefault(entry.get("kind", ""), {})
+        kind_map.setdefault(entry.get("category", ""), []).append(path)
+
+
+def _scan_dir(kind, directory, analyze):
+    """디렉토리 재스캔 - 추가/변경/삭제된 파일만 반영. 변경 여부 반환"""
+    changed = False
+    files = _index["files"]
+
+    try:
+        names = [n for n in os.listdir(directory) if n.lower().endswith(".mp3")]
+    except OSError:
+        names = []
+    current = {os.path.join(directory, n) for n in names}
+
+    for path in [p for p, e in files.items() if e.get("kind") == kind and os.path.dirname(p) == directory]:
+        if path not in current:
+            del files[path]
+            changed = True
+
+    for path in current:
+        entry = files.get(path)
+        try:
+            signature = _file_signature(path)
+        except OSError:
+            continue
+        if entry and (entry.get("mtime"), entry.get("size")) == signature:
+            if analyze and not entry.get("analyzed"):
+                files[path] = _analyze_file(path, kind, analyze=True)
+                changed = True
+            continue
+        files[path] = _analyze_file(path, kind, analyze=analyze)
+        changed = True
+
+    return changed
+
+
+def refresh(kind=None, analyze=False, force=False):
+    """
+    라이브러리 인덱스 갱신
+
+    Args:
+        kind: 'bgm' / 'sfx' (None이면 전체)
+        analyze: True면 미분석 파일의 길이/라우드니스까지 측정 (느림)
+        force: 디렉토리 mtime과 무관하게 재스캔
+    """
+    kinds = [kind] if kind else list(LIBRARY_DIRS)
+    with _lock:
+        _load_index()
+        changed = False
+        for k in kinds:
+            directory = LIBRARY_DIRS[k]
+            try:
+                dir_mtime = os.path.getmtime(directory)
+            except OSError:
+                dir_mtime = None
+
+            known = _index["dirs"].get(k, {})
+            if not force and not analyze and known.get("path") == directory and known.get("mtime") == dir_mtime:
+                continue
+
+            if _scan_dir(k, directory, analyze):
+                changed = True
+            if known.get("path") != directory or known.get("mtime") != dir_mtime:
+                _index["dirs"][k] = {"path": directory, "mtime": dir_mtime}
+                changed = True
+
+        if changed:
+            _rebuild_categories()
+            _save_index()
+
+
+def register_file(path, kind):
+    """업로드된 파일을 즉시 분석해 인덱스에 추가"""
+    path = os.path.abspath(path)
+    entry = _analyze_file(path, kind, analyze=True)
+    with _lock:
+        _load_index()
+        _index["files"][path] = entry
+        directory = os.path.dirname(path)
+        if LIBRARY_DIRS.get(kind) == directory:
+            _index["dirs"][kind] = {"path": directory, "mtime": os.path.getmtime(directory)}
+        _rebuild_categories()
+        _save_index()
+    print(f"[AUDIO-LIB] 등록: {entry['filename']} ({entry['category']}, "
+          f"{entry['duration']}s, {entry['lufs']} LUFS)")
+    return entry
+
+
+def list_categories(kind):
+    """분위기/타입 → 파일명 목록"""
+    refresh(kind)
+    with _lock:
+        return {
+            category: [os.path.basename(p) for p in paths]
+            for category, paths in sorted(_by_category.get(kind, {}).items())
+        }
+
+
+def find_files(kind, category):
+    """
+    분위기/타입에 해당하는 파일 경로 목록
+
+    기존 glob(`{mood}*.mp3`)과 같은 후보: 정확히 일치하는 분위기 + 분위기로 시작하는 분위기
+    (calm이 있어도 calm_piano2.mp3처럼 접두사 + 접미사로 이름 붙인 트랙을 함께 포함)
+    """
+    if not category:
+        return []
+    refresh(kind)
+    with _lock:
+        categories = _by_category.get(kind, {})
+        files = list(categories.get(category, []))
+        files.extend(
+            path for cat, paths in sorted(categories.items())
+            if cat != category and cat.startswith(category)
+            for path in paths
+        )
+        return files
+
+
+def get_track(path, analyze=True):
+    """
+    파일의 인덱스 항목 (duration, lufs, peak_db 등)
+
+    라이브러리 밖의 파일도 경로 기준으로 분석 결과를 캐시합니다.
+    """
+    if not path:
+        return None
+    path = os.path.abspath(path)
+    try:
+        signature = _file_signature(path)
+    except OSError:
+        return None
+
+    with _lock:
+        _load_index()
+        entry = _index["files"].get(path)
+        if entry and (entry.get("mtime"), entry.get("size")) == signature and (entry.get("analyzed") or not analyze):
+            return dict(entry)
+
+    kind = entry.get("kind") if entry else next(
+        (k for k, d in LIBRARY_DIRS.items() if os.path.dirname(path) == d), "external"
+    )
+    entry = _analyze_file(path, kind, analyze=analyze)
+    with _lock:
+        _index["files"][path] = entry
+        _rebuild_categories()
+        _save_index()
+    return dict(entry)
+
+
+def get_duration(path):
+    """트랙 길이(초) - 인덱스 캐시 사용 (실패 시 None)"""
+    track = get_track(path)
+    return track.get("duration") if track else None
+
+
+def loudness_gain(path, reference_lufs=BGM_REFERENCE_LUFS):
+    """
+    트랙을 기준 라우드니스에 맞추기 위한 선형 배율 (피크가 0dBFS를 넘지 않도록 제한)
+
+    분석 정보가 없으면 1.0
+    """
+    track = get_track(path)
+    if not track or track.get("lufs") is None:
+        return 1.0
+
+    gain = 10 ** ((reference_lufs - track["lufs"]) / 20)
+    gain = min(MAX_GAIN_BOOST, max(MIN_GAIN_CUT, gain))
+
+    peak_db = track.get("peak_db")
+    if peak_db is not None:
+        gain = min(gain, max(MIN_GAIN_CUT, 10 ** (-peak_db / 20)))
+    return gain
+
+
+def get_bgm_volume(path, bgm_volume=0.10):
+    """
+    FFmpeg volume 필터에 넣을 트랙별 BGM 볼륨
+
+    bgm_volume은 기준 라우드니스(-16 LUFS) 트랙 기준 볼륨 - 시끄러운 트랙은 낮추고 조용한 트랙은 올립니다.
+    """
+    return round(bgm_volume * loudness_gain(path), 4)
+
+
+if __name__ == "__main__":
+    import sys
+
+    kinds = sys.argv[1:] or list(LIBRARY_DIRS)
+    for k in kinds:
+        print(f"[AUDIO-LIB] {k} 분석 중: {LIBRARY_DIRS[k]}")
+        refresh(k, analyze=True, force=True)
+    with _lock:
+        _load_index()
+        analyzed = sum(1 for e in _index["files"].values() if e.get("analyzed"))
+    print(f"[AUDIO-LIB] 완료: {analyzed}개 분석됨 → {INDEX_PATH}")
@@ -0,0 +1,321 @@
+"""
+나레이션 + BGM 믹싱 엔진 (사이드체인 더킹)
+
+기존 믹싱은 파이프라인마다 FFmpeg amix로 BGM을 고정 볼륨으로 섞었습니다.
+이 엔진은 나레이션 구간을 구해 BGM 게인 곡선을 NumPy로 계산하고, 디코딩-믹싱-인코딩을 한 번에 처리합니다.
+
+- 나레이션 구간: TTS 타임라인(문장 start/end, SRT)이 있으면 그대로 사용, 없으면 저샘플레이트 RMS 패스로 검출
+- 게인: 나레이션 중에는 bgm_volume, 쉬는 구간(인트로/아웃트로/긴 멈춤)에서는 duck_db만큼 올라옴
+  (문장 사이 짧은 멈춤은 hold로 무시 → BGM이 들썩이지 않음)
+- 비디오 입력이면 영상 스트림은 복사(-c:v copy)하고 오디오만 교체
+- numpy가 없으면 None을 반환하므로 호출자는 기존 FFmpeg amix 경로로 폴백
+
+사용법:
+    from scripts.common.audio_mixer import mix_narration_with_bgm
+
+    mix_narration_with_bgm("voice.mp3", "static/audio/bgm/calm_01.mp3", "mixed.mp3",
+                           bgm_volume=0.10, timeline=[(0.0, 3.2), (3.5, 7.9)])
+"""
+
+import os
+import re
+import subprocess
+
+from scripts.common.bgm_beds import CHANNELS, SAMPLE_RATE, get_bed
+
+ENVELOPE_RATE = 100        # 게인 곡선 해상도 (초당 프레임)
+RMS_SAMPLE_RATE = 8000     # RMS 검출용 디코딩 샘플레이트
+RMS_THRESHOLD_DB = -40.0   # 이보다 크면 나레이션으로 판단 (dBFS)
+DUCK_DB = 6.0              # 나레이션이 없을 때 BGM 상승폭 (dB)
+ATTACK = 0.1               # 나레이션 시작 몇 초 전까지 완전히 줄여둘지 (초)
+RELEASE = 0.8              # 줄이고/올리는 램프 길이 (초)
+HOLD = 1.2                 # 이보다 짧은 멈춤은 나레이션 구간으로 취급 (초)
+BLOCK_SECONDS = 10         # 스트리밍 블록 길이 (초)
+
+
+def _numpy():
+    """numpy 지연 import (없으면 None)"""
+    try:
+        import numpy
+        return numpy
+    except ImportError:
+        return None
+
+
+def load_srt_timeline(srt_path):
+    """SRT 파일에서 [(start, end), ...] 타임라인 추출 (실패 시 None)"""
+    if not srt_path or not os.path.exists(srt_path):
+        return None
+    pattern = re.compile(
+        r"(\d+):(\d+):(\d+)[,.](\d+)\s*-->\s*(\d+):(\d+):(\d+)[,.](\d+)"
+    )
+    timeline = []
+    with open(srt_path, "r", encoding="utf-8", errors="ignore") as f:
+        for match in pattern.finditer(f.read()):
+            h1, m1, s1, ms1, h2, m2, s2, ms2 = (int(x) for x in match.groups())
+            timeline.append((h1 * 3600 + m1 * 60 + s1 + ms1 / 1000,
+                             h2 * 3600 + m2 * 60 + s2 + ms2 / 1000))
+    return timeline or None
+
+
+def _timeline_spans(timeline):
+    """[(start, end, ...)] 또는 [{"start", "end"}] → [(start, end)]"""
+    spans = []
+    for item in timeline or []:
+        if isinstance(item, dict):
+            start, end = item.get("start"), item.get("end")
+        else:
+            start, end = item[0], item[1]
+        if start is not None and end is not None and end > start:
+            spans.append((float(start), float(end)))
+    return spans
+
+
+def _probe_duration(path):
+    result = subprocess.run(
+        ["ffprobe", "-v", "error", "-show_entries", "format=duration",
+         "-of", "default=noprint_wrappers=1:nokey=1", path],
+        capture_output=True, text=True, timeout=30
+    )
+    return float(result.stdout.strip())
+
+
+def _activity_from_timeline(np, spans, n_frames):
+    """타임라인 구간 → 프레임별 나레이션 여부 (0/1)"""
+    activity = np.zeros(n_frames, dtype=np.float32)
+    for start, end in spans:
+        a = max(0, int(start * ENVELOPE_RATE))
+        b = min(n_frames, int(np.ceil(end * ENVELOPE_RATE)))
+        activity[a:b] = 1.0
+    return activity
+
+
+def _activity_from_rms(np, voice_path, n_frames):
+    """저샘플레이트 모노 디코딩 → 10ms 프레임 RMS → 임계값 이상이면 나레이션"""
+    result = subprocess.run(
+        ["ffmpeg", "-v", "error", "-i", voice_path, "-vn", "-f", "s16le",
+         "-ac", "1", "-ar", str(RMS_SAMPLE_RATE), "-"],
+        capture_output=True, timeout=600
+    )
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.decode("utf-8", errors="ignore")[-200:])
+
+    pcm = np.frombuffer(result.stdout, dtype=np.int16).astype(np.float32) / 32768.0
+    hop = RMS_SAMPLE_RATE // ENVELOPE_RATE
+    usable = min(len(pcm) // hop, n_frames) * hop
+    frames = pcm[:usable].reshape(-1, hop)
+    rms_db = 10 * np.log10(np.mean(frames * frames, axis=1) + 1e-10)
+
+    activity = np.zeros(n_frames, dtype=np.float32)
+    activity[:len(rms_db)] = (rms_db > RMS_THRESHOLD_DB).astype(np.float32)
+    return activity
+
+
+def _moving_max(np, values, before, after):
+    """각 프레임을 [i-before, i+after] 구간 최댓값으로 (0/1 마스크 팽창)"""
+    if before <= 0 and after <= 0:
+        return values
+    cumsum = np.concatenate(([0.0], np.cumsum(values)))
+    idx = np.arange(len(values))
+    lo = np.clip(idx - before, 0, len(values))
+    hi = np.clip(idx + after + 1, 0, len(values))
+    return (cumsum[hi] - cumsum[lo] > 0).astype(np.float32)
+
+
+def build_ducking_curve(np, activity, duck_db=DUCK_DB):
+    """
+    나레이션 여부(프레임) → BGM 게인 배율 곡선 (나레이션 중 1.0, 쉬는 구간 10^(duck_db/20))
+
+    짧은 멈춤은 hold로 메우고, attack/release 길이의 이동평균으로 램프를 만듭니다.
+    """
+    hold = int(HOLD * ENVELOPE_RATE)
+    attack = max(1, int(ATTACK * ENVELOPE_RATE))
+    release = max(1, int(RELEASE * ENVELOPE_RATE))
+
+    # 멈춤 메우기(closing): 팽창 후 수축
+    closed = _moving_max(np, activity, hold // 2, hold // 2)
+    closed = 1.0 - _moving_max(np, 1.0 - closed, hold // 2, hold // 2)
+
+    # 이동평균(release 길이) 램프: 나레이션 attack 전에 완전히 내려가 있고, 종료 후 release 동안 올라옴
+    ducked = _moving_max(np, closed, release // 2, release // 2 + attack)
+    kernel = np.ones(release, dtype=np.float32) / release
+    smooth = np.convolve(ducked, kernel, mode="same")
+
+    boost = 10 ** (duck_db / 20)
+    return boost - (boost - 1.0) * np.clip(smooth, 0.0, 1.0)
+
+
+def _read_exact(stream, n_bytes):
+    chunks = []
+    while n_bytes > 0:
+        chunk = stream.read(n_bytes)
+        if not chunk:
+            break
+        chunks.append(chunk)
+        n_bytes -= len(chunk)
+    return b"".join(chunks)
+
+
+def _decoder_cmd(path):
+    return ["ffmpeg", "-v", "error", "-i", path, "-vn", "-f", "s16le",
+            "-ac", str(CHANNELS), "-ar", str(SAMPLE_RATE), "-"]
+
+
+class _PcmStream:
+    """
+    파일을 파이프로 블록 단위 디코딩 (정규화된 베드 등 영상 길이만큼 긴 파일용 - 전체를 메모리에 올리지 않음)
+
+    파일이 끝나면 처음부터 다시 디코딩해 이어 붙임 (캐시 베드의 pos % len(bed) 루프와 같은 동작)
+    """
+
+    def __init__(self, np, path):
+        self.np = np
+        self.path = path
+        self.proc = None
+
+    def read(self, n_samples):
+        """정확히 n_samples 샘플 → int16 (샘플, 채널)"""
+        np = self.np
+        parts, need, fresh = [], n_samples, False
+        while need > 0:
+            if self.proc is None:
+                self.proc = subprocess.Popen(_decoder_cmd(self.path),
+                                             stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+                fresh = True
+            raw = _read_exact(self.proc.stdout, need * CHANNELS * 2)
+            got = len(raw) // (CHANNELS * 2)
+            if got:
+                parts.append(np.frombuffer(raw[:got * CHANNELS * 2], dtype=np.int16).reshape(-1, CHANNELS))
+                need -= got
+                fresh = False
+            if need > 0:
+                if fresh:
+                    raise RuntimeError(f"디코딩 결과 없음: {os.path.basename(self.path)}")
+                self.close()
+        if not parts:
+            return np.zeros((0, CHANNELS), dtype=np.int16)
+        return np.concatenate(parts)
+
+    def close(self):
+        if self.proc is not None:
+            self.proc.kill()
+            self.proc.wait()
+            self.proc = None
+
+
+def _encoder_cmd(output_path, video_path=None):
+    pcm_input = ["-f", "s16le", "-ar", str(SAMPLE_RATE), "-ac", str(CHANNELS), "-i", "-"]
+    if video_path:
+        # 영상은 복사, 오디오만 교체
+        return ["ffmpeg", "-y", "-v", "error", "-i", video_path, *pcm_input,
+                "-map", "0:v", "-map", "1:a", "-c:v", "copy",
+                "-c:a", "aac", "-b:a", "128k", "-shortest", "-movflags", "+faststart",
+                output_path]
+
+    ext = os.path.splitext(output_path)[1].lower()
+    codec = {
+        ".wav": ["-c:a", "pcm_s16le"],
+        ".m4a": ["-c:a", "aac", "-b:a", "192k"],
+        ".flac": ["-c:a", "flac"],
+    }.get(ext, ["-c:a", "libmp3lame", "-b:a", "192k"])
+    return ["ffmpeg", "-y", "-v", "error", *pcm_input, *codec, output_path]
+
+
+def mix_narration_with_bgm(voice_path, bgm_path, output_path, bgm_volume=0.10,
+                           voice_volume=1.0, timeline=None, video=False,
+                           fade_in=2.0, fade_out=3.0, duck_db=DUCK_DB,
+                           bgm_normalized=False, log_prefix="[MIXER]"):
+    """
+    나레이션과 BGM을 더킹하여 한 번에 믹싱
+
+    Args:
+        voice_path: 나레이션 오디오 (video=True면 오디오가 포함된 영상)
+        bgm_path: BGM 파일 (라이브러리 트랙은 캐시된 루프 베드 사용)
+        output_path: 출력 경로 (video=True면 .mp4)
+        bgm_volume: 나레이션 중 BGM 볼륨 (기준 라우드니스 트랙 기준)
+        voice_volume: 나레이션 볼륨 배율
+        timeline: 나레이션 구간 [(start, end, ...)] 또는 [{"start", "end"}] - 없으면 RMS 검출
+        video: True면 voice_path 영상의 비디오 스트림을 복사해 오디오만 교체
+        fade_in / fade_out: BGM 페이드 (초)
+        duck_db: 나레이션이 없을 때 BGM 상승폭 (0이면 고정 볼륨)
+        bgm_normalized: 이미 라우드니스 정규화된 베드면 True (캐시 베드 대신 블록 단위로 스트리밍 디코딩)
+
+    Returns:
+        출력 경로 (numpy 없음/실패 시 None → 호출자가 FFmpeg amix로 폴백)
+    """
+    np = _numpy()
+    if np is None:
+        return None
+
+    try:
+        duration = _probe_duration(voice_path)
+        n_frames = int(np.ceil(duration * ENVELOPE_RATE)) + 1
+
+        spans = _timeline_spans(timeline)
+        if spans:
+            activity = _activity_from_timeline(np, spans, n_frames)
+            source = f"타임라인 {len(spans)}구간"
+        else:
+            activity = _activity_from_rms(np, voice_path, n_frames)
+            source = "RMS 검출"
+        curve = build_ducking_curve(np, activity, duck_db) * bgm_volume
+
+        if bgm_normalized:
+            # 정규화된 베드는 영상 길이만큼 길어 나레이션처럼 블록 단위로 읽음
+            bed, bed_stream = None, _PcmStream(np, bgm_path)
+        else:
+            bed, bed_stream = get_bed(bgm_path), None
+            if bed is None or len(bed) == 0:
+                return None
+    except Exception as e:
+        print(f"{log_prefix} 더킹 믹싱 준비 실패: {e}")
+        return None
+
+    total = int(duration * SAMPLE_RATE)
+    fade_in_n = max(1, int(fade_in * SAMPLE_RATE))
+    fade_out_n = max(1, int(fade_out * SAMPLE_RATE))
+    frame_times = np.arange(n_frames, dtype=np.float64) / ENVELOPE_RATE
+    print(f"{log_prefix} 더킹 믹싱: {duration:.1f}초, {source}, "
+          f"bgm={bgm_volume * 100:.1f}% (+{duck_db:.0f}dB 쉬는 구간)")
+
+    decoder = subprocess.Popen(_decoder_cmd(voice_path), stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+    encoder = subprocess.Popen(
+        _encoder_cmd(output_path, voice_path if video else None),
+        stdin=subprocess.PIPE, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE
+    )
+    block = BLOCK_SECONDS * SAMPLE_RATE
+    try:
+        for b0 in range(0, total, block):
+            b1 = min(total, b0 + block)
+            raw = _read_exact(decoder.stdout, (b1 - b0) * CHANNELS * 2)
+            voice = np.zeros((b1 - b0, CHANNELS), dtype=np.float32)
+            decoded = np.frombuffer(raw, dtype=np.int16).reshape(-1, CHANNELS)
+            voice[:len(decoded)] = decoded.astype(np.float32) / 32768.0
+
+            pos = np.arange(b0, b1)
+            gain = np.interp(pos / SAMPLE_RATE, frame_times, curve).astype(np.float32)
+            gain *= np.minimum(1.0, pos / fade_in_n).astype(np.float32)
+            gain *= np.clip((total - pos) / fade_out_n, 0.0, 1.0).astype(np.float32)
+
+            bgm_pcm = bed_stream.read(b1 - b0) if bed_stream else bed[pos % len(bed)]
+            bgm = bgm_pcm.astype(np.float32) / 32768.0
+            out = voice * voice_volume + bgm * gain[:, None]
+            encoder.stdin.write(np.clip(out * 32767.0, -32768, 32767).astype(np.int16).tobytes())
+
+        encoder.stdin.close()
+        stderr = encoder.stderr.read()
+        encoder.wait(timeout=600)
+    except Exception as e:
+        encoder.kill()
+        print(f"{log_prefix} 더킹 믹싱 실패: {e}")
+        return None
+    finally:
+        decoder.kill()
+        decoder.wait()
+        if bed_stream:
+            bed_stream.close()
+
+    if encoder.returncode != 0 or not os.path.exists(output_path):
+        print(f"{log_prefix} 더킹 믹싱 인코딩 실패: {stderr.decode('utf-8', errors='ignore')[-200:]}")
+        return None
+    return output_path
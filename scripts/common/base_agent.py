@@ -11,14 +11,27 @@ Base Agent - 모든 에이전트의 기본 클래스
         async def execute(self, context, **kwargs) -> AgentResult:
             # 구현
             pass
+
+    # 서로 독립적인 API 호출 에이전트 동시 실행 (소요 시간 ≈ 가장 느린 작업)
+    results = await fan_out({
+        "subtitle": subtitle_agent.execute(context),
+        "image": image_agent.execute(context),
+    }, budget=budget,
+       budget_category={"subtitle": "audio", "image": "creative"},
+       estimated_cost={"subtitle": 0.001, "image": 0.03})
 """
 
 from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional, Union
 from enum import Enum
 import logging
 import asyncio
+import os
+import sys
+import threading
+import time
 
 logger = logging.getLogger(__name__)
 
@@ -267,6 +280,10 @@ class BudgetManager:
         self.default_allocation[to_agent] = self.default_allocation.get(to_agent, 0) + amount / self.total_budget
         return True
 
+    def can_afford(self, agent: str, amount: float) -> bool:
+        """에이전트 잔여 예산으로 amount를 쓸 수 있는지 (fan_out 사전 검사용)"""
+        return self.get_remaining(agent) >= amount
+
     def should_use_premium(self, agent: str) -> bool:
         """
         프리미엄 모델 사용 여부 판단
@@ -296,3 +313,130 @@ class BudgetManager:
                 for agent in self.default_allocation
             }
         }
+
+
+# =====================================================
+# 비동기 LLM 호출 / 팬아웃
+# =====================================================
+
+LLM_MAX_CONCURRENCY = int(os.environ.get("LLM_MAX_CONCURRENCY", "4"))
+_llm_semaphore = threading.BoundedSemaphore(LLM_MAX_CONCURRENCY)
+
+
+class _AsyncEndpoint:
+    def __init__(self, client, path):
+        self._client = client
+        self._path = path
+
+    async def create(self, **kwargs):
+        from scripts.common.llm_clients import LLMClient
+
+        target = self._client._client
+        for name in self._path:
+            target = getattr(target, name)
+        if isinstance(self._client._client, LLMClient):
+            # 스레드에서 실행되므로 통계용 호출 지점을 여기서 잡아 넘김
+            kwargs.setdefault("_call_site", sys._getframe(1).f_code.co_name)
+
+        def _invoke():
+            with _llm_semaphore:
+                return target.create(**kwargs)
+
+        return await asyncio.to_thread(_invoke)
+
+
+class _AsyncChat:
+    def __init__(self, client):
+        self.completions = _AsyncEndpoint(client, ("chat", "completions"))
+
+
+class AsyncLLMClient:
+    """
+    동기 LLM 클라이언트(OpenAI/llm_clients.LLMClient)를 await 가능하게 감싼 래퍼
+
+    async def execute() 안에서 블로킹 HTTP 호출을 하면 이벤트 루프 전체가 멈춰
+    asyncio.gather로 묶은 에이전트도 순차 실행됩니다. 이 래퍼는 create()를 스레드로 넘기고
+    프로세스 전체 동시 호출 수를 LLM_MAX_CONCURRENCY로 제한합니다.
+    (AsyncOpenAI는 이벤트 루프에 묶여 파이프라인마다 새 루프를 만드는 구조와 맞지 않음)
+
+    사용법:
+        client = AsyncLLMClient(get_client("openai"))
+        response = await client.responses.create(model="gpt-5.1", input=[...])
+    """
+
+    def __init__(self, client):
+        self._client = client
+        self.chat = _AsyncChat(self)
+        self.responses = _AsyncEndpoint(self, ("responses",))
+
+
+async def fan_out(
+    jobs: Dict[str, Union[Callable[[], Any], Any]],
+    max_concurrency: int = 4,
+    budget: Optional[BudgetManager] = None,
+    budget_category: Union[str, Dict[str, str]] = "quality",
+    estimated_cost: Union[float, Dict[str, float]] = 0.0,
+) -> Dict[str, Any]:
+    """
+    서로 독립적인 API 호출 작업(LLM/TTS/이미지 생성 에이전트 등)을 동시 실행
+
+    정규식 검사처럼 CPU만 쓰는 작업은 GIL 때문에 빨라지지 않으므로 직접 호출하세요.
+
+    Args:
+        jobs: {이름: 코루틴 | 코루틴 함수 | 일반 함수} - 일반 함수는 스레드에서 실행
+        max_concurrency: 동시 실행 수
+        budget: 예산 관리자 (can_afford/spend 제공, 있으면 시작 전 estimated_cost 검사, 끝나면 AgentResult.cost 차감)
+        budget_category: 예산 항목 (또는 {작업 이름: 예산 항목})
+        estimated_cost: 작업당 예상 비용 $ (또는 {작업 이름: 예상 비용})
+
+    Returns:
+        {이름: 결과} (jobs 순서 유지) - 예외는 결과 자리에 예외 객체로 반환,
+        예산 부족으로 건너뛴 작업은 AgentResult(success=False)
+    """
+    semaphore = asyncio.Semaphore(max(1, max_concurrency))
+
+    async def _run(name, job):
+        category = budget_category.get(name, "quality") if isinstance(budget_category, dict) else budget_category
+        cost = estimated_cost.get(name, 0.0) if isinstance(estimated_cost, dict) else estimated_cost
+        async with semaphore:
+            if budget is not None and cost and not budget.can_afford(category, cost):
+                if asyncio.iscoroutine(job):
+                    job.close()
+                print(f"[FAN-OUT] {name}: 예산 부족으로 건너뜀 ({category}, 예상 ${cost:.3f})")
+                return AgentResult(success=False, error=f"예산 부족: {category}")
+
+            started = time.time()
+            try:
+                if asyncio.iscoroutine(job):
+                    result = await job
+                elif asyncio.iscoroutinefunction(job):
+                    result = await job()
+                else:
+                    result = await asyncio.to_thread(job)
+            except Exception as e:
+                logger.warning(f"[FAN-OUT] {name} 실패: {e}")
+                return e
+
+            if budget is not None and isinstance(result, AgentResult) and result.cost:
+                budget.spend(category, result.cost)
+            logger.info(f"[FAN-OUT] {name} 완료 ({time.time() - started:.1f}초)")
+            return result
+
+    started = time.time()
+    results = await asyncio.gather(*(_run(name, job) for name, job in jobs.items()))
+    print(f"[FAN-OUT] {len(jobs)}개 작업 완료 ({time.time() - started:.1f}초, 동시 {max_concurrency})")
+    return dict(zip(jobs.keys(), results))
+
+
+def run_sync(coro):
+    """
+    동기 코드에서 코루틴 실행
+
+    이벤트 루프가 이미 돌고 있으면(Flask 핸들러 안의 에이전트 등) 별도 스레드의 새 루프에서 실행합니다.
+    """
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coro)
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        return executor.submit(asyncio.run, coro).result()
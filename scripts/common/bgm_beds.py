@@ -0,0 +1,277 @@
+"""
+BGM 베드(bed) 렌더러 - 챕터/씬별 BGM 전환 트랙을 NumPy로 조립
+
+기존 방식은 영상마다 BGM 파일 N개를 FFmpeg 복합 필터(atrim/afade/concat)로 전부 디코딩했습니다.
+이 모듈은 트랙마다 한 번만 디코딩해 루프 가능한 라우드니스 정규화 PCM 베드로 캐시하고,
+구간 배치/크로스페이드는 샘플 단위 배열 연산으로 처리한 뒤 최종 베드를 한 번만 인코딩합니다.
+
+- 베드 캐시: data/bgm_beds/<키>.npy (int16 스테레오, 파일 mtime/크기/보정값이 바뀌면 새로 생성)
+- 루프 이음매는 꼬리를 머리에 크로스페이드하여 반복 재생 시 끊김 없음
+- 출력은 블록 단위로 스트리밍 인코딩 (30분 에피소드도 메모리 사용량 일정)
+- numpy가 없으면 None을 반환하므로 호출자는 기존 FFmpeg 경로로 폴백
+
+사용법:
+    from scripts.common.bgm_beds import render_segment_bed
+
+    bed_path = render_segment_bed(
+        [(0, 600, "static/audio/bgm/epic_01.mp3"), (600, 1200, "static/audio/bgm/calm_02.mp3")],
+        total_duration=1200, output_path="out_bgm.mp3",
+    )
+"""
+
+import collections
+import hashlib
+import os
+import subprocess
+import threading
+
+from scripts.common import audio_library
+
+SAMPLE_RATE = 44100
+CHANNELS = 2
+BED_CACHE_DIR = os.environ.get(
+    "BGM_BED_CACHE_DIR", os.path.join(audio_library.PROJECT_ROOT, "data", "bgm_beds")
+)
+BED_MAX_SECONDS = int(os.environ.get("BGM_BED_MAX_SECONDS", "180"))      # 베드 최대 길이 (이후는 루프)
+BED_CACHE_MAX_MB = int(os.environ.get("BGM_BED_CACHE_MAX_MB", "2048"))  # 디스크 캐시 상한
+LOOP_CROSSFADE = 2.0      # 루프 이음매 크로스페이드 (초)
+BLOCK_SECONDS = 10        # 출력 블록 길이 (초)
+_BED_VERSION = 1          # 베드 생성 방식이 바뀌면 증가 → 캐시 무효화
+
+_lock = threading.Lock()
+_memory_cache = collections.OrderedDict()  # 키 → int16 배열 (mmap)
+_MEMORY_CACHE_SIZE = 8
+
+
+def _numpy():
+    """numpy 지연 import (없으면 None)"""
+    try:
+        import numpy
+        return numpy
+    except ImportError:
+        return None
+
+
+def _bed_key(path):
+    st = os.stat(path)
+    gain = audio_library.loudness_gain(path)
+    raw = f"{os.path.abspath(path)}|{st.st_mtime}|{st.st_size}|{gain:.4f}|{SAMPLE_RATE}|{BED_MAX_SECONDS}|{_BED_VERSION}"
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest(), gain
+
+
+def _decode(np, path):
+    """FFmpeg로 한 번 디코딩 → float32 (샘플, 채널) 배열"""
+    result = subprocess.run(
+        ["ffmpeg", "-v", "error", "-i", path, "-t", str(BED_MAX_SECONDS),
+         "-f", "s16le", "-ac", str(CHANNELS), "-ar", str(SAMPLE_RATE), "-"],
+        capture_output=True, timeout=300
+    )
+    if result.returncode != 0 or not result.stdout:
+        stderr = result.stderr.decode("utf-8", errors="ignore")[-200:]
+        raise RuntimeError(f"디코딩 실패: {os.path.basename(path)} - {stderr}")
+    pcm = np.frombuffer(result.stdout, dtype=np.int16).reshape(-1, CHANNELS)
+    return pcm.astype(np.float32) / 32768.0
+
+
+def _make_loopable(np, pcm):
+    """꼬리 구간을 머리에 등전력 크로스페이드 → 끝에서 처음으로 이어 재생해도 이음매 없음"""
+    xfade = int(LOOP_CROSSFADE * SAMPLE_RATE)
+    if len(pcm) < xfade * 4:
+        return pcm
+    t = np.linspace(0.0, 1.0, xfade, dtype=np.float32)[:, None]
+    looped = pcm[:-xfade].copy()
+    looped[:xfade] = pcm[:xfade] * np.sin(t * np.pi / 2) + pcm[-xfade:] * np.cos(t * np.pi / 2)
+    return looped
+
+
+def _evict_disk_cache():
+    """디스크 캐시가 상한을 넘으면 오래 사용하지 않은 베드부터 삭제"""
+    try:
+        entries = []
+        for name in os.listdir(BED_CACHE_DIR):
+            if name.endswith(".npy"):
+                path = os.path.join(BED_CACHE_DIR, name)
+                st = os.stat(path)
+                entries.append((st.st_mtime, st.st_size, path))
+    except OSError:
+        return
+
+    total = sum(size for _, size, _ in entries)
+    limit = BED_CACHE_MAX_MB * 1024 * 1024
+    for _, size, path in sorted(entries):
+        if total <= limit:
+            break
+        try:
+            os.remove(path)
+            total -= size
+        except OSError:
+            pass
+
+
+def get_bed(path):
+    """
+    트랙의 루프 가능한 라우드니스 정규화 베드 (int16 (샘플, 채널) 배열)
+
+    메모리 → 디스크(.npy) → 디코딩 순으로 조회합니다. numpy가 없으면 None.
+    """
+    np = _numpy()
+    if np is None:
+        return None
+
+    key, gain = _bed_key(path)
+    with _lock:
+        bed = _memory_cache.get(key)
+        if bed is not None:
+            _memory_cache.move_to_end(key)
+            return bed
+
+    cache_path = os.path.join(BED_CACHE_DIR, f"{key}.npy")
+    if os.path.exists(cache_path):
+        try:
+            bed = np.load(cache_path, mmap_mode="r")
+            os.utime(cache_path)
+        except (OSError, ValueError):
+            bed = None
+
+    if bed is None:
+        pcm = _make_loopable(np, _decode(np, path) * gain)
+        bed = np.clip(pcm * 32767.0, -32768, 32767).astype(np.int16)
+        try:
+            os.makedirs(BED_CACHE_DIR, exist_ok=True)
+            tmp_path = f"{cache_path}.{os.getpid()}.tmp.npy"
+            np.save(tmp_path, bed)
+            os.replace(tmp_path, cache_path)
+            _evict_disk_cache()
+        except OSError as e:
+            print(f"[BGM-BED] 캐시 저장 실패: {e}")
+        print(f"[BGM-BED] 베드 생성: {os.path.basename(path)} "
+              f"({len(bed) / SAMPLE_RATE:.1f}s, gain={gain:.2f})")
+
+    with _lock:
+        _memory_cache[key] = bed
+        _memory_cache.move_to_end(key)
+        while len(_memory_cache) > _MEMORY_CACHE_SIZE:
+            _memory_cache.popitem(last=False)
+    return bed
+
+
+def _merge_segments(segments):
+    """유효한 구간만 정렬하고, 같은 트랙이 연속되면 하나로 합침"""
+    merged = []
+    for start, end, path in sorted(segments, key=lambda s: s[0]):
+        if not path or not os.path.exists(path) or end <= start:
+            continue
+        if merged and merged[-1][2] == path and abs(merged[-1][1] - start) < 1e-3:
+            merged[-1] = (merged[-1][0], end, path)
+        else:
+            merged.append((start, end, path))
+    return merged
+
+
+def _open_encoder(output_path):
+    """출력 확장자에 맞는 FFmpeg 인코더를 stdin(s16le)으로 실행"""
+    ext = os.path.splitext(output_path)[1].lower()
+    codec = {
+        ".mp3": ["-c:a", "libmp3lame", "-b:a", "192k"],
+        ".m4a": ["-c:a", "aac", "-b:a", "192k"],
+        ".opus": ["-c:a", "libopus", "-b:a", "128k"],
+        ".flac": ["-c:a", "flac"],
+        ".wav": ["-c:a", "pcm_s16le"],
+    }.get(ext, ["-c:a", "libmp3lame", "-b:a", "192k"])
+    return subprocess.Popen(
+        ["ffmpeg", "-y", "-v", "error", "-f", "s16le", "-ar", str(SAMPLE_RATE),
+         "-ac", str(CHANNELS), "-i", "-", *codec, output_path],
+        stdin=subprocess.PIPE, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE
+    )
+
+
+def render_segment_bed(segments, total_duration, output_path, crossfade=3.0,
+                       fade_in=2.0, fade_out=3.0, log_prefix="[BGM-BED]"):
+    """
+    구간별 BGM을 크로스페이드로 이어 붙인 단일 BGM 트랙 생성
+
+    Args:
+        segments: [(시작초, 종료초, BGM경로), ...]
+        total_duration: 전체 길이 (초)
+        output_path: 출력 경로 (.mp3 / .m4a / .opus / .flac / .wav)
+        crossfade: 구간 전환 크로스페이드 (초) - 이전 구간이 다음 구간 시작 후 crossfade초 동안 겹침
+        fade_in: 첫 구간 페이드인 (초)
+        fade_out: 마지막 페이드아웃 (초)
+
+    Returns:
+        출력 경로 (numpy 없음/실패 시 None → 호출자가 FFmpeg 필터 방식으로 폴백)
+    """
+    np = _numpy()
+    if np is None:
+        print(f"{log_prefix} numpy 없음 - FFmpeg 필터 방식 사용")
+        return None
+
+    segments = _merge_segments(segments)
+    if not segments or total_duration <= 0:
+        return None
+
+    try:
+        beds = [get_bed(path) for _, _, path in segments]
+    except Exception as e:
+        print(f"{log_prefix} 베드 준비 실패: {e}")
+        return None
+
+    sr = SAMPLE_RATE
+    total = int(round(total_duration * sr))
+    xfade = int(crossfade * sr)
+    fade_in_n = max(1, int(fade_in * sr))
+    fade_out_n = max(1, int(fade_out * sr))
+
+    # 구간별 샘플 범위: 마지막이 아니면 다음 구간 시작 후 xfade만큼 겹치며 페이드아웃
+    spans = []
+    for i, (start, end, _) in enumerate(segments):
+        s0 = 0 if i == 0 else int(round(start * sr))
+        s1 = total if i == len(segments) - 1 else min(total, int(round(end * sr)) + xfade)
+        fin = fade_in_n if i == 0 else xfade
+        fout = xfade if i < len(segments) - 1 else 0
+        spans.append((s0, s1, fin, fout, beds[i]))
+
+    print(f"{log_prefix} 베드 조립: {len(segments)}개 구간, {total_duration:.1f}초")
+    encoder = _open_encoder(output_path)
+    block = BLOCK_SECONDS * sr
+    try:
+        for b0 in range(0, total, block):
+            b1 = min(total, b0 + block)
+            out = np.zeros((b1 - b0, CHANNELS), dtype=np.float32)
+
+            for s0, s1, fin, fout, bed in spans:
+                a, b = max(b0, s0), min(b1, s1)
+                if a >= b:
+                    continue
+                pos = np.arange(a - s0, b - s0)
+                env = np.ones(len(pos), dtype=np.float32)
+                if fin:
+                    head = pos < fin
+                    env[head] = np.sin(pos[head] / fin * np.pi / 2)
+                if fout:
+                    tail_start = (s1 - s0) - fout
+                    tail = pos >= tail_start
+                    env[tail] *= np.cos((pos[tail] - tail_start) / fout * np.pi / 2)
+                samples = bed[pos % len(bed)].astype(np.float32) / 32768.0
+                out[a - b0:b - b0] += samples * env[:, None]
+
+            # 전체 마지막 페이드아웃
+            if b1 > total - fade_out_n:
+                pos = np.arange(b0, b1)
+                tail = pos >= total - fade_out_n
+                out[tail] *= ((total - pos[tail]) / fade_out_n)[:, None].astype(np.float32)
+
+            encoder.stdin.write(np.clip(out * 32767.0, -32768, 32767).astype(np.int16).tobytes())
+
+        encoder.stdin.close()
+        stderr = encoder.stderr.read()
+        encoder.wait(timeout=300)
+    except Exception as e:
+        encoder.kill()
+        print(f"{log_prefix} 베드 렌더링 실패: {e}")
+        return None
+
+    if encoder.returncode != 0 or not os.path.exists(output_path):
+        print(f"{log_prefix} 베드 인코딩 실패: {stderr.decode('utf-8', errors='ignore')[-200:]}")
+        return None
+    return output_path
@@ -0,0 +1,595 @@
+"""
+BGM / 효과음 선택 및 믹싱 모듈
+
+drama_server.py에서 분리된 부수효과 없는 오디오 헬퍼 (CLI 파이프라인에서도 import 가능):
+- _get_bgm_file / _get_sfx_file: 분위기/타입별 파일 선택
+- _mix_bgm_with_video / _mix_scene_bgm_with_video: 비디오에 BGM 믹싱
+- _trim_sfx / _mix_sfx_into_video: 효과음 트림 및 믹싱
+
+사용법:
+    from scripts.common.bgm_utils import _get_bgm_file, _mix_bgm_with_video
+"""
+
+import os
+import subprocess
+
+from scripts.common import audio_library
+from scripts.common.bgm_beds import render_segment_bed
+from scripts.common.audio_mixer import mix_narration_with_bgm
+
+# 프로젝트 루트 (static/audio/bgm, static/audio/sfx 기준 경로)
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+# BGM 분위기 별칭 매핑 (파일이 없을 경우 대체 분위기로 폴백)
+# 현재 사용 가능한 BGM: calm, cinematic, comedic, dramatic, epic, hopeful, horror, mysterious, nostalgic, sad, tense, upbeat
+BGM_MOOD_ALIAS = {
+    # 뉴스/다큐멘터리/기업 계열 → calm 또는 cinematic
+    "documentary": "cinematic",
+    "news": "calm",
+    "informative": "calm",
+    "corporate": "calm",
+    "trailer": "cinematic",
+
+    # 감정 계열 → sad, hopeful, nostalgic
+    "melancholy": "sad",
+    "melancholic": "sad",
+    "sentimental": "sad",
+    "touching": "sad",
+    "emotional": "sad",
+    "inspiring": "hopeful",
+    "uplifting": "hopeful",
+    "motivational": "hopeful",
+    "triumphant": "epic",
+    "romantic": "nostalgic",
+
+    # 긴장/서스펜스 계열 → tense, mysterious, horror
+    "suspense": "tense",
+    "suspenseful": "tense",
+    "thriller": "tense",
+    "chase": "tense",
+    "dark": "mysterious",
+    "ethereal": "mysterious",
+
+    # 밝은/긍정/에너지 계열 → upbeat, comedic
+    "cheerful": "upbeat",
+    "happy": "upbeat",
+    "bright": "upbeat",
+    "energetic": "upbeat",
+    "whimsical": "comedic",
+
+    # 차분한/평화 계열 → calm
+    "peaceful": "calm",
+    "relaxing": "calm",
+    "ambient": "calm",
+    "jazz": "calm",
+    "classical": "calm",
+    "acoustic": "calm",
+    "piano": "calm",
+    "electronic": "upbeat",
+
+    # 액션/모험 계열 → epic, dramatic
+    "action": "epic",
+    "adventure": "epic",
+    "battle": "epic",
+    "heroic": "epic",
+}
+
+
+def _find_audio_files(kind, name, directory):
+    """라이브러리 인덱스에서 분위기/타입별 파일 조회 (기본 디렉토리가 아니면 파일명 접두사로 검색)"""
+    if directory == audio_library.LIBRARY_DIRS[kind]:
+        return audio_library.find_files(kind, name)
+    return [
+        os.path.join(directory, f) for f in sorted(os.listdir(directory))
+        if f.startswith(name) and f.lower().endswith(".mp3")
+    ]
+
+
+def _get_bgm_file(mood, bgm_dir=None):
+    """분위기에 맞는 BGM 파일 선택 (여러 개면 랜덤)
+
+    Args:
+        mood: 지원 분위기 (12종) - calm, cinematic, comedic, dramatic, epic,
+              hopeful, horror, mysterious, nostalgic, sad, tense, upbeat
+              (파일이 없으면 BGM_MOOD_ALIAS에 따라 대체 분위기로 폴백)
+        bgm_dir: BGM 파일 디렉토리 (없으면 스크립트 위치 기준)
+
+    Returns:
+        BGM 파일 경로 또는 None
+    """
+    import random
+
+    # 스크립트 위치 기준 절대 경로 사용
+    if bgm_dir is None:
+        bgm_dir = audio_library.LIBRARY_DIRS["bgm"]
+
+    if not mood:
+        print(f"[BGM] mood가 비어있음")
+        return None
+
+    if not os.path.exists(bgm_dir):
+        print(f"[BGM] 디렉토리 없음: {bgm_dir}")
+        print(f"[BGM] ⚠️ BGM 파일을 {bgm_dir}에 업로드하세요. 예: {mood}.mp3, {mood}_01.mp3")
+        return None
+
+    # 파일명 패턴: mood.mp3, mood_01.mp3, mood (1).mp3 등 → 인덱스에서 분위기로 조회
+    matching_files = _find_audio_files("bgm", mood, bgm_dir)
+
+    if not matching_files:
+        # 별칭 매핑으로 폴백 시도
+        alias_mood = BGM_MOOD_ALIAS.get(mood)
+        if alias_mood:
+            print(f"[BGM] '{mood}' 파일 없음 → '{alias_mood}'로 폴백 시도")
+            matching_files = _find_audio_files("bgm", alias_mood, bgm_dir)
+
+        if not matching_files:
+            print(f"[BGM] '{mood}' 분위기 BGM 파일 없음")
+            print(f"[BGM] ⚠️ {bgm_dir}/{mood}.mp3 또는 {mood}_01.mp3 형식으로 파일을 업로드하세요")
+            return None
+
+    # 랜덤 선택
+    selected = random.choice(matching_files)
+    print(f"[BGM] 선택된 BGM: {selected} (후보 {len(matching_files)}개 중)")
+    return selected
+
+
+def _mix_bgm_with_video(video_path, bgm_path, output_path, bgm_volume=0.10, bgm_normalized=False,
+                        timeline=None):
+    """비디오에 BGM 믹싱 (나레이션 유지, BGM은 작게)
+
+    Args:
+        video_path: 원본 비디오 경로
+        bgm_path: BGM 오디오 경로
+        output_path: 출력 비디오 경로
+        bgm_volume: BGM 볼륨 (0.0~1.0, 기본 0.10 = 10%)
+        bgm_normalized: 이미 라우드니스 정규화된 베드면 True (트랙별 보정 생략)
+        timeline: 나레이션 구간 [(start, end), ...] - 없으면 RMS로 검출해 더킹
+
+    Returns:
+        성공 여부 (bool)
+    """
+    # 더킹 엔진: 나레이션 중에는 bgm_volume, 쉬는 구간에서는 BGM이 올라옴 (영상은 복사)
+    if mix_narration_with_bgm(video_path, bgm_path, output_path, bgm_volume=bgm_volume,
+                              timeline=timeline, video=True, bgm_normalized=bgm_normalized,
+                              log_prefix="[BGM]"):
+        print(f"[BGM] 믹싱 완료: {output_path}", flush=True)
+        return True
+
+    try:
+        # (폴백) 비디오 길이 확인
+        probe_cmd = ["ffprobe", "-v", "error", "-show_entries", "format=duration",
+                     "-of", "default=noprint_wrappers=1:nokey=1", video_path]
+        result = subprocess.run(probe_cmd, capture_output=True, text=True, timeout=30)
+        video_duration = float(result.stdout.strip())
+
+        print(f"[BGM] 비디오 길이: {video_duration:.1f}초", flush=True)
+
+        # FFmpeg 명령: BGM 루프 + 볼륨 조절 + 믹싱 + 페이드아웃
+        # -stream_loop -1: BGM 무한 루프
+        # volume: BGM 볼륨 낮춤
+        # amix: 오디오 믹싱
+        # afade: 마지막 3초 페이드아웃
+
+        fade_start = max(0, video_duration - 3)  # 마지막 3초
+
+        # 트랙 라우드니스에 맞춰 볼륨 보정 (라이브러리 인덱스의 사전 분석값 사용)
+        track_volume = bgm_volume if bgm_normalized else audio_library.get_bgm_volume(bgm_path, bgm_volume)
+        print(f"[BGM] 볼륨: {bgm_volume} → {track_volume} (라우드니스 보정)", flush=True)
+
+        ffmpeg_cmd = [
+            "ffmpeg", "-y",
+            "-i", video_path,                          # 원본 비디오 (오디오 포함)
+            "-stream_loop", "-1", "-i", bgm_path,      # BGM 루프
+            "-filter_complex",
+            f"[1:a]volume={track_volume},afade=t=in:st=0:d=2,afade=t=out:st={fade_start}:d=3[bgm];"  # BGM 볼륨+페이드
+            f"[0:a][bgm]amix=inputs=2:duration=first:dropout_transition=2:normalize=0[aout]",  # 믹싱 (normalize=0: TTS 볼륨 유지)
+            "-map", "0:v",                             # 비디오 스트림
+            "-map", "[aout]",                          # 믹싱된 오디오
+            "-c:v", "copy",                            # 비디오 재인코딩 안함
+            "-c:a", "aac", "-b:a", "128k",            # 오디오 인코딩
+            "-shortest",                               # 비디오 길이에 맞춤
+            output_path
+        ]
+
+        print(f"[BGM] 믹싱 시작...", flush=True)
+        result = subprocess.run(ffmpeg_cmd, stdout=subprocess.DEVNULL,
+                               stderr=subprocess.PIPE, timeout=600)
+
+        if result.returncode == 0:
+            print(f"[BGM] 믹싱 완료: {output_path}", flush=True)
+            return True
+        else:
+            stderr = result.stderr.decode('utf-8', errors='ignore')[:300]
+            print(f"[BGM] 믹싱 실패: {stderr}", flush=True)
+            return False
+
+    except Exception as e:
+        print(f"[BGM] 믹싱 오류: {e}", flush=True)
+        return False
+
+
+def _mix_scene_bgm_with_video(video_path, scenes, video_effects, output_path, bgm_volume=0.10):
+    """비디오에 씬별 BGM 믹싱 (감정 흐름에 따라 BGM 전환)
+
+    Args:
+        video_path: 원본 비디오 경로
+        scenes: 씬 목록 (duration 정보 포함)
+        video_effects: video_effects 객체 (bgm_mood, scene_bgm_changes 포함)
+        output_path: 출력 비디오 경로
+        bgm_volume: BGM 볼륨 (0.0~1.0, 기본 0.10 = 10%)
+
+    Returns:
+        성공 여부 (bool)
+    """
+    import tempfile
+    import shutil
+
+    try:
+        base_mood = video_effects.get('bgm_mood', '')
+        scene_bgm_changes = video_effects.get('scene_bgm_changes', [])
+
+        if not base_mood:
+            print(f"[BGM-SCENE] 기본 BGM 분위기가 없음")
+            return False
+
+        # 씬별 시작/종료 시간 계산
+        scene_times = []
+        current_time = 0
+        for idx, scene in enumerate(scenes):
+            duration = scene.get('duration', 0)
+            scene_times.append({
+                'scene': idx + 1,
+                'start': current_time,
+                'end': current_time + duration,
+                'duration': duration
+            })
+            current_time += duration
+
+        total_duration = current_time
+        print(f"[BGM-SCENE] 전체 길이: {total_duration:.1f}초, 씬 수: {len(scenes)}")
+
+        # scene_bgm_changes가 없거나 비어있으면 기존 방식으로 폴백
+        if not scene_bgm_changes:
+            print(f"[BGM-SCENE] 씬별 BGM 변경 없음, 기존 방식 사용")
+            bgm_file = _get_bgm_file(base_mood)
+            if bgm_file:
+                return _mix_bgm_with_video(video_path, bgm_file, output_path, bgm_volume)
+            return False
+
+        # BGM 구간 계산 (각 구간의 mood와 시간)
+        bgm_segments = []
+        changes_dict = {c['scene']: c['mood'] for c in scene_bgm_changes}
+
+        current_mood = base_mood
+        segment_start = 0
+
+        for st in scene_times:
+            scene_num = st['scene']
+            if scene_num in changes_dict:
+                # 이전 구간 저장
+                if st['start'] > segment_start:
+                    bgm_segments.append({
+                        'mood': current_mood,
+                        'start': segment_start,
+                        'end': st['start'],
+                        'duration': st['start'] - segment_start
+                    })
+                # 새 mood로 전환
+                current_mood = changes_dict[scene_num]
+                segment_start = st['start']
+
+        # 마지막 구간 추가
+        if total_duration > segment_start:
+            bgm_segments.append({
+                'mood': current_mood,
+                'start': segment_start,
+                'end': total_duration,
+                'duration': total_duration - segment_start
+            })
+
+        print(f"[BGM-SCENE] BGM 구간: {len(bgm_segments)}개")
+        for seg in bgm_segments:
+            print(f"  - {seg['mood']}: {seg['start']:.1f}s ~ {seg['end']:.1f}s ({seg['duration']:.1f}s)")
+
+        # 임시 디렉토리 생성
+        temp_dir = tempfile.mkdtemp()
+
+        try:
+            # 캐시된 BGM 베드를 NumPy로 조립 → 비디오 오디오와 한 번만 믹싱
+            bed_path = render_segment_bed(
+                [(seg['start'], seg['end'], _get_bgm_file(seg['mood'])) for seg in bgm_segments],
+                total_duration, os.path.join(temp_dir, "bgm_bed.flac"),
+                crossfade=1.0, fade_in=1.0, log_prefix="[BGM-SCENE]"
+            )
+            if bed_path:
+                return _mix_bgm_with_video(video_path, bed_path, output_path, bgm_volume, bgm_normalized=True)
+
+            # (폴백) 각 구간별 BGM 세그먼트 준비
+            input_files = [video_path]
+            filter_parts = []
+
+            for i, seg in enumerate(bgm_segments):
+                bgm_file = _get_bgm_file(seg['mood'])
+                if not bgm_file:
+                    print(f"[BGM-SCENE] '{seg['mood']}' BGM 파일 없음, 건너뜀")
+                    continue
+
+                input_files.append(bgm_file)
+                input_idx = len(input_files) - 1
+
+                # 각 BGM 구간에 볼륨, 딜레이, 트림, 페이드 적용
+                delay_ms = int(seg['start'] * 1000)
+                duration = seg['duration']
+
+                # 페이드 인/아웃: 구간 시작/끝에 1초씩
+                fade_in_duration = min(1.0, duration * 0.2)
+                fade_out_start = max(0, duration - 1.0)
+                fade_out_duration = min(1.0, duration * 0.2)
+
+                filter_parts.append(
+                    f"[{input_idx}:a]atrim=0:{duration},asetpts=PTS-STARTPTS,"
+                    f"volume={audio_library.get_bgm_volume(bgm_file, bgm_volume)},"
+                    f"afade=t=in:st=0:d={fade_in_duration},"
+                    f"afade=t=out:st={fade_out_start}:d={fade_out_duration},"
+                    f"adelay={delay_ms}|{delay_ms}[bgm{i}]"
+                )
+
+            if not filter_parts:
+                print(f"[BGM-SCENE] 사용 가능한 BGM 없음")
+                shutil.rmtree(temp_dir, ignore_errors=True)
+                return False
+
+            # 모든 BGM 스트림 믹싱
+            bgm_labels = "".join([f"[bgm{i}]" for i in range(len(filter_parts))])
+            filter_parts.append(
+                f"{bgm_labels}amix=inputs={len(filter_parts)}:duration=longest:dropout_transition=2:normalize=0[bgm_mixed]"
+            )
+
+            # 원본 오디오와 믹싱된 BGM 합치기
+            filter_parts.append(
+                f"[0:a][bgm_mixed]amix=inputs=2:duration=first:dropout_transition=2:normalize=0[aout]"
+            )
+
+            filter_complex = ";".join(filter_parts)
+
+            # FFmpeg 명령 구성
+            input_args = []
+            for f in input_files:
+                if f == input_files[0]:
+                    input_args.extend(["-i", f])
+                else:
+                    input_args.extend(["-stream_loop", "-1", "-i", f])
+
+            ffmpeg_cmd = [
+                "ffmpeg", "-y",
+                *input_args,
+                "-filter_complex", filter_complex,
+                "-map", "0:v",
+                "-map", "[aout]",
+                "-c:v", "copy",
+                "-c:a", "aac", "-b:a", "128k",
+                "-shortest",
+                output_path
+            ]
+
+            print(f"[BGM-SCENE] 씬별 BGM 믹싱 시작...")
+            result = subprocess.run(ffmpeg_cmd, stdout=subprocess.DEVNULL,
+                                   stderr=subprocess.PIPE, timeout=900)
+
+            if result.returncode == 0:
+                print(f"[BGM-SCENE] 믹싱 완료: {output_path}")
+                return True
+            else:
+                stderr = result.stderr.decode('utf-8', errors='ignore')[-500:]
+                print(f"[BGM-SCENE] 믹싱 실패: {stderr}")
+                # 실패 시 기존 방식으로 폴백
+                print(f"[BGM-SCENE] 기존 방식으로 폴백...")
+                bgm_file = _get_bgm_file(base_mood)
+                if bgm_file:
+                    return _mix_bgm_with_video(video_path, bgm_file, output_path, bgm_volume)
+                return False
+
+        finally:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+
+    except Exception as e:
+        print(f"[BGM-SCENE] 믹싱 오류: {e}")
+        import traceback
+        traceback.print_exc()
+        # 실패 시 기존 방식으로 폴백
+        try:
+            base_mood = video_effects.get('bgm_mood', '')
+            if base_mood:
+                bgm_file = _get_bgm_file(base_mood)
+                if bgm_file:
+                    return _mix_bgm_with_video(video_path, bgm_file, output_path, bgm_volume)
+        except:
+            pass
+        return False
+
+
+def _get_sfx_file(sfx_type, sfx_dir=None):
+    """효과음 타입에 맞는 파일 선택 (여러 개면 랜덤)
+
+    Args:
+        sfx_type: impact, whoosh, ding, tension, emotional, success
+        sfx_dir: 효과음 파일 디렉토리 (없으면 스크립트 위치 기준)
+
+    Returns:
+        효과음 파일 경로 또는 None
+    """
+    import random
+
+    # 스크립트 위치 기준 절대 경로 사용
+    if sfx_dir is None:
+        sfx_dir = audio_library.LIBRARY_DIRS["sfx"]
+
+    if not sfx_type:
+        print(f"[SFX] sfx_type이 비어있음")
+        return None
+
+    if not os.path.exists(sfx_dir):
+        print(f"[SFX] 디렉토리 없음: {sfx_dir}")
+        print(f"[SFX] ⚠️ 효과음 파일을 {sfx_dir}에 업로드하세요. 예: {sfx_type}.mp3")
+        return None
+
+    matching_files = _find_audio_files("sfx", sfx_type, sfx_dir)
+
+    if not matching_files:
+        print(f"[SFX] '{sfx_type}' 효과음 파일 없음")
+        print(f"[SFX] ⚠️ {sfx_dir}/{sfx_type}.mp3 형식으로 파일을 업로드하세요")
+        return None
+
+    selected = random.choice(matching_files)
+    print(f"[SFX] 선택된 효과음: {selected}")
+    return selected
+
+
+def _trim_sfx(input_path, output_path, max_duration=2.5, fade_out=0.5):
+    """효과음을 지정 길이로 자르고 페이드아웃 적용
+
+    Args:
+        input_path: 원본 효과음 경로
+        output_path: 출력 경로
+        max_duration: 최대 길이 (초)
+        fade_out: 페이드아웃 길이 (초)
+
+    Returns:
+        성공 여부 (bool)
+    """
+    try:
+        fade_start = max(0, max_duration - fade_out)
+        ffmpeg_cmd = [
+            "ffmpeg", "-y",
+            "-i", input_path,
+            "-t", str(max_duration),
+            "-af", f"afade=t=out:st={fade_start}:d={fade_out}",
+            "-c:a", "libmp3lame", "-q:a", "2",
+            output_path
+        ]
+        result = subprocess.run(ffmpeg_cmd, stdout=subprocess.DEVNULL,
+                               stderr=subprocess.PIPE, timeout=30)
+        return result.returncode == 0
+    except Exception as e:
+        print(f"[SFX] 트림 오류: {e}")
+        return False
+
+
+def _mix_sfx_into_video(video_path, sound_effects, scenes, output_path, sfx_dir=None):
+    """비디오에 효과음 믹싱
+
+    Args:
+        video_path: 원본 비디오 경로
+        sound_effects: [{"scene": 1, "type": "impact"}, ...]
+        scenes: 씬 목록 (타이밍 계산용)
+        output_path: 출력 비디오 경로
+        sfx_dir: 효과음 디렉토리 (없으면 스크립트 위치 기준)
+
+    Returns:
+        성공 여부 (bool)
+    """
+    if not sound_effects:
+        return False
+
+    try:
+        import tempfile
+
+        # 스크립트 위치 기준 절대 경로 사용
+        if sfx_dir is None:
+            sfx_dir = os.path.join(PROJECT_ROOT, "static", "audio", "sfx")
+
+        print(f"[SFX] 효과음 디렉토리: {sfx_dir}")
+
+        # 씬별 시작 시간 계산
+        scene_start_times = {}
+        current_time = 0
+        for idx, scene in enumerate(scenes):
+            scene_start_times[idx + 1] = current_time
+            current_time += scene.get('duration', 0)
+
+        # 효과음 파일 준비 및 타이밍 계산
+        sfx_inputs = []
+        adelay_filters = []
+
+        temp_dir = tempfile.mkdtemp()
+
+        # 순차적 인덱스 사용 (continue로 건너뛴 항목과 관계없이 연속 인덱스 보장)
+        sfx_idx = 0
+        for sfx in sound_effects:
+            scene_num = sfx.get('scene', 1)
+            sfx_type = sfx.get('type', '')
+
+            if scene_num not in scene_start_times:
+                continue
+
+            # 효과음 파일 찾기 (None 전달 시 절대 경로 사용)
+            sfx_file = _get_sfx_file(sfx_type)
+            if not sfx_file:
+                continue
+
+            # 효과음 트림 (2.5초로 자르기)
+            trimmed_path = os.path.join(temp_dir, f"sfx_{sfx_idx}.mp3")
+            if not _trim_sfx(sfx_file, trimmed_path, max_duration=2.5, fade_out=0.5):
+                continue
+
+            # 딜레이 계산 (씬 시작 + 0.5초)
+            delay_ms = int((scene_start_times[scene_num] + 0.5) * 1000)
+
+            sfx_inputs.append(trimmed_path)
+            # FFmpeg 입력 인덱스: [0]=비디오, [1]=첫번째 SFX, [2]=두번째 SFX...
+            # sfx_idx는 0부터 시작하므로 입력 인덱스는 sfx_idx+1
+            adelay_filters.append(f"[{sfx_idx+1}:a]adelay={delay_ms}|{delay_ms},volume=0.8[sfx{sfx_idx}]")
+            sfx_idx += 1
+
+        if not sfx_inputs:
+            print(f"[SFX] 사용 가능한 효과음 없음")
+            return False
+
+        # FFmpeg 명령 구성
+        input_args = ["-i", video_path]
+        for sfx_path in sfx_inputs:
+            input_args.extend(["-i", sfx_path])
+
+        # 필터 구성: 모든 효과음 + 원본 오디오 믹싱
+        filter_parts = adelay_filters.copy()
+
+        # amix로 모든 오디오 합치기
+        sfx_labels = "".join([f"[sfx{i}]" for i in range(len(sfx_inputs))])
+        mix_inputs = len(sfx_inputs) + 1  # 효과음 개수 + 원본 오디오
+        filter_parts.append(f"[0:a]{sfx_labels}amix=inputs={mix_inputs}:duration=first:dropout_transition=2:normalize=0[aout]")
+
+        filter_complex = ";".join(filter_parts)
+
+        ffmpeg_cmd = [
+            "ffmpeg", "-y",
+            *input_args,
+            "-filter_complex", filter_complex,
+            "-map", "0:v",
+            "-map", "[aout]",
+            "-c:v", "copy",
+            "-c:a", "aac", "-b:a", "128k",
+            output_path
+        ]
+
+        print(f"[SFX] 효과음 {len(sfx_inputs)}개 믹싱 중...")
+        result = subprocess.run(ffmpeg_cmd, stdout=subprocess.DEVNULL,
+                               stderr=subprocess.PIPE, timeout=600)
+
+        # 임시 파일 정리
+        import shutil
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+        if result.returncode == 0:
+            print(f"[SFX] 효과음 믹싱 완료")
+            return True
+        else:
+            stderr = result.stderr.decode('utf-8', errors='ignore')[:300]
+            print(f"[SFX] 믹싱 실패: {stderr}")
+            return False
+
+    except Exception as e:
+        print(f"[SFX] 믹싱 오류: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
@@ -0,0 +1,184 @@
+"""
+RSS 피드 동시 수집 (조건부 GET)
+
+뉴스/쇼츠 수집기는 피드를 하나씩 feedparser.parse(url)로 받아서
+피드 수만큼 대기 시간이 누적되고, 바뀌지 않은 피드도 매번 전체를 다시 내려받았습니다.
+
+- 다운로드: 제한된 스레드 풀에서 모든 피드를 동시에 요청 (전체 시간 ≈ 가장 느린 피드 하나)
+- 조건부 요청: 피드별 ETag / Last-Modified를 기억해 If-None-Match / If-Modified-Since 전송
+  → 304 Not Modified면 본문 없이 지난번 항목을 그대로 사용
+- 파싱: 다운로드 스레드와 분리된 파싱 풀에서 실행 (느린 피드를 기다리는 동안 먼저 온 피드 파싱)
+- 증분: 피드별로 본 항목 ID를 기억해 "지난 실행 이후 새 항목"을 따로 돌려줌
+
+상태는 data/feed_state.json에 저장됩니다 (FEED_STATE_PATH로 변경 가능).
+
+사용법:
+    from scripts.common.feed_fetcher import fetch_feeds
+
+    results = fetch_feeds([url1, url2, ...], max_items=30)
+    for url, result in results.items():
+        result["entries"]      # 이번 피드 항목 (304면 지난번 항목)
+        result["new_entries"]  # 지난 실행 이후 처음 본 항목
+        result["status"]       # 200 / 304 / None(실패)
+"""
+
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+STATE_PATH = os.environ.get("FEED_STATE_PATH", os.path.join(PROJECT_ROOT, "data", "feed_state.json"))
+
+MAX_WORKERS = int(os.environ.get("FEED_FETCH_WORKERS", "8"))
+PARSE_WORKERS = 2
+REQUEST_TIMEOUT = 15
+USER_AGENT = "Mozilla/5.0 (compatible; my_page_v2 feed fetcher)"
+MAX_CACHED_ENTRIES = 100   # 304 응답 시 돌려줄 피드별 지난 항목 수
+MAX_SEEN_IDS = 500         # 피드별로 기억하는 항목 ID 수
+
+_state_lock = threading.Lock()
+_thread_local = threading.local()
+
+
+def _session():
+    """다운로드 스레드별 requests 세션 (keep-alive 재사용)"""
+    session = getattr(_thread_local, "session", None)
+    if session is None:
+        import requests
+        session = requests.Session()
+        session.headers["User-Agent"] = USER_AGENT
+        _thread_local.session = session
+    return session
+
+
+def load_state(path=None):
+    path = path or STATE_PATH
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_state(state, path=None):
+    """임시 파일에 쓰고 교체 (중간에 죽어도 기존 상태 유지)"""
+    path = path or STATE_PATH
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(state, f, ensure_ascii=False)
+    os.replace(tmp_path, path)
+
+
+def _download(url, feed_state, conditional):
+    """(상태 코드, 본문 bytes, 응답 헤더) - 실패 시 예외"""
+    headers = {}
+    if conditional:
+        if feed_state.get("etag"):
+            headers["If-None-Match"] = feed_state["etag"]
+        if feed_state.get("last_modified"):
+            headers["If-Modified-Since"] = feed_state["last_modified"]
+    response = _session().get(url, headers=headers, timeout=REQUEST_TIMEOUT)
+    if response.status_code == 304:
+        return 304, b"", response.headers
+    response.raise_for_status()
+    return response.status_code, response.content, response.headers
+
+
+def _entry_id(entry):
+    return entry.get("id") or entry.get("link") or entry.get("title", "")
+
+
+def _parse(content, max_items):
+    """feedparser 결과를 JSON 저장 가능한 dict 목록으로 변환"""
+    import feedparser
+
+    feed = feedparser.parse(content)
+    entries = []
+    for entry in feed.entries[:max_items]:
+        entries.append({
+            "id": _entry_id(entry),
+            "title": entry.get("title", ""),
+            "link": entry.get("link", ""),
+            "summary": entry.get("summary", ""),
+            "published": entry.get("published", "") or entry.get("updated", ""),
+        })
+    return entries
+
+
+def fetch_feeds(urls, max_items=30, max_workers=None, conditional=True, state_path=None):
+    """
+    피드 여러 개를 동시에 수집
+
+    Args:
+        urls: 피드 URL 목록 (중복은 한 번만 요청)
+        max_items: 피드당 최대 항목 수
+        max_workers: 동시 다운로드 수 (기본 FEED_FETCH_WORKERS=8)
+        conditional: ETag/Last-Modified 조건부 요청 사용 여부
+
+    Returns:
+        {url: {"status", "entries", "new_entries", "error", "elapsed"}} - 입력 순서 유지
+    """
+    unique_urls = list(dict.fromkeys(urls))
+    if not unique_urls:
+        return {}
+
+    with _state_lock:
+        state = load_state(state_path)
+
+    started = time.perf_counter()
+    results = {}
+    workers = max(1, min(len(unique_urls), max_workers or MAX_WORKERS))
+
+    with ThreadPoolExecutor(max_workers=PARSE_WORKERS, thread_name_prefix="feed-parse") as parse_pool, \
+            ThreadPoolExecutor(max_workers=workers, thread_name_prefix="feed-io") as io_pool:
+
+        def _fetch(url):
+            # 다운로드만 하고 파싱은 파싱 풀로 넘김 (I/O 스레드는 바로 다음 피드로)
+            t0 = time.perf_counter()
+            status, content, headers = _download(url, state.get(url, {}), conditional)
+            parse_future = parse_pool.submit(_parse, content, max_items) if status != 304 else None
+            return status, headers, parse_future, time.perf_counter() - t0
+
+        io_futures = {url: io_pool.submit(_fetch, url) for url in unique_urls}
+
+        for url, io_future in io_futures.items():
+            feed_state = state.get(url, {})
+            try:
+                status, headers, parse_future, elapsed = io_future.result()
+                if status == 304:
+                    entries = feed_state.get("entries", [])
+                else:
+                    entries = parse_future.result()
+                    feed_state["etag"] = headers.get("ETag", "")
+                    feed_state["last_modified"] = headers.get("Last-Modified", "")
+                    feed_state["entries"] = entries[:MAX_CACHED_ENTRIES]
+            except Exception as e:
+                print(f"[FEED] 수집 실패: {url[:80]} - {e}")
+                results[url] = {"status": None, "entries": [], "new_entries": [], "error": str(e), "elapsed": 0.0}
+                continue
+
+            seen = feed_state.get("seen_ids", [])
+            seen_set = set(seen)
+            new_entries = [e for e in entries if e["id"] not in seen_set]
+            feed_state["seen_ids"] = (seen + [e["id"] for e in new_entries])[-MAX_SEEN_IDS:]
+            feed_state["fetched_at"] = time.time()
+            state[url] = feed_state
+
+            results[url] = {"status": status, "entries": entries, "new_entries": new_entries,
+                            "error": None, "elapsed": round(elapsed, 2)}
+
+    with _state_lock:
+        # 다른 수집기가 그사이 저장한 피드 상태는 유지
+        merged = load_state(state_path)
+        merged.update({url: state[url] for url in unique_urls if url in state})
+        save_state(merged, state_path)
+
+    not_modified = sum(1 for r in results.values() if r["status"] == 304)
+    failed = sum(1 for r in results.values() if r["status"] is None)
+    new_count = sum(len(r["new_entries"]) for r in results.values())
+    print(f"[FEED] {len(unique_urls)}개 피드 {time.perf_counter() - started:.1f}초 "
+          f"(304: {not_modified}, 실패: {failed}, 새 항목: {new_count})")
+    return results
@@ -0,0 +1,144 @@
+"""
+다중 키워드 매처 (Aho-Corasick)
+
+뉴스 점수화/카테고리 분류/감정 분석은 키워드 목록을 돌며 `k in text`를 키워드 수만큼 반복해서
+키워드를 추가할수록 항목 하나의 처리 시간이 같이 늘었습니다.
+
+이 모듈은 {라벨: [키워드, ...]} 설정 dict를 한 번 컴파일해 두고,
+텍스트를 한 번 훑어 모든 키워드 위치를 돌려줍니다 (텍스트 길이 + 매칭 수에 비례, 키워드 수와 무관).
+
+- 라벨: 카테고리/채널 include/exclude처럼 키워드 묶음 이름 (같은 키워드가 여러 라벨에 있어도 됨)
+- 라벨 순서: 설정 dict 순서 유지 → "dict 순서상 처음 매칭된 라벨" 규칙을 그대로 재현
+- lowercase=True: 키워드와 텍스트를 소문자로 비교 (영어 키워드 섞인 설정용)
+
+사용법:
+    from scripts.common.keyword_matcher import KeywordMatcher
+
+    matcher = KeywordMatcher({"경제": ["금리", "환율"], "정책": ["세금", "연금"]})
+    matcher.find_all("금리 인상과 세금")   # [(0, 2, "금리"), (7, 9, "세금")]
+    matcher.count_by_label(text)          # {"경제": 1, "정책": 1} - 라벨별 서로 다른 키워드 수
+    matcher.first_label(text)             # "경제" - dict 순서상 처음 매칭된 라벨
+"""
+
+import re
+from collections import deque
+
+
+class KeywordMatcher:
+    """라벨별 키워드 묶음을 하나의 오토마톤으로 컴파일한 매처 (생성 후 읽기 전용, 스레드 안전)"""
+
+    def __init__(self, groups, lowercase: bool = False):
+        """
+        Args:
+            groups: {라벨: [키워드, ...]} 또는 키워드 목록 (라벨 = 키워드 자신)
+            lowercase: 대소문자 무시 여부
+        """
+        if not isinstance(groups, dict):
+            groups = {keyword: [keyword] for keyword in groups}
+
+        self.lowercase = lowercase
+        self.labels = list(groups)
+        self._label_order = {label: i for i, label in enumerate(self.labels)}
+        self._keyword_labels = {}                  # 키워드 → 라벨 목록 (설정 순서, 중복 등록은 그대로)
+
+        for label, keywords in groups.items():
+            for keyword in keywords:
+                if not keyword:
+                    continue
+                keyword = keyword.lower() if lowercase else keyword
+                self._keyword_labels.setdefault(keyword, []).append(label)
+
+        self._build(list(self._keyword_labels))
+
+    def _build(self, keywords):
+        """트라이 + 실패 링크 (상태마다 끝나는 키워드 목록을 실패 링크 쪽까지 합쳐 둠)"""
+        goto = [{}]
+        output = [()]
+        for keyword in keywords:
+            state = 0
+            for char in keyword:
+                nxt = goto[state].get(char)
+                if nxt is None:
+                    nxt = len(goto)
+                    goto[state][char] = nxt
+                    goto.append({})
+                    output.append(())
+                state = nxt
+            output[state] = output[state] + (keyword,)
+
+        fail = [0] * len(goto)
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, nxt in goto[state].items():
+                queue.append(nxt)
+                f = fail[state]
+                while f and char not in goto[f]:
+                    f = fail[f]
+                target = goto[f].get(char, 0)
+                fail[nxt] = target if target != nxt else 0     # 루트 자식은 루트로
+                output[nxt] = output[nxt] + output[fail[nxt]]
+
+        self._goto = goto
+        self._fail = fail
+        self._output = output
+        self._first_char_re = re.compile("[" + "".join(re.escape(c) for c in goto[0]) + "]") if goto[0] else None
+
+    def find_all(self, text: str) -> list:
+        """모든 매칭 [(시작, 끝, 키워드), ...] - 겹치는 매칭 포함, 끝 위치 순"""
+        if not text or self._first_char_re is None:
+            return []
+        if self.lowercase:
+            text = text.lower()
+
+        goto, fail, output = self._goto, self._fail, self._output
+        root = goto[0]
+        first_char = self._first_char_re
+        hits = []
+        state = 0
+        pos, length = 0, len(text)
+        while pos < length:
+            if state == 0:
+                # 루트 상태에서는 키워드 첫 글자가 나오는 위치까지 정규식(C)으로 건너뜀
+                match = first_char.search(text, pos)
+                if match is None:
+                    break
+                pos = match.start()
+                state = root[text[pos]]
+            else:
+                char = text[pos]
+                while state and char not in goto[state]:
+                    state = fail[state]
+                state = goto[state].get(char, 0)
+            if output[state]:
+                end = pos + 1
+                for keyword in output[state]:
+                    hits.append((end - len(keyword), end, keyword))
+            pos += 1
+        return hits
+
+    def matched_keywords(self, text: str) -> set:
+        """텍스트에 나온 서로 다른 키워드 집합"""
+        return {keyword for _, _, keyword in self.find_all(text)}
+
+    def labels_of(self, keyword: str) -> list:
+        return self._keyword_labels.get(keyword.lower() if self.lowercase else keyword, [])
+
+    def count_by_label(self, text: str = None, hits=None) -> dict:
+        """
+        {라벨: 매칭된 서로 다른 키워드 수} - sum(1 for k in keywords if k in text)와 같은 값
+
+        hits: 이미 구한 find_all 결과 (같은 텍스트를 여러 점수 함수가 쓸 때 재사용)
+        """
+        counts = {}
+        for keyword in self.matched_keywords(text) if hits is None else {h[2] for h in hits}:
+            for label in self._keyword_labels[keyword]:
+                counts[label] = counts.get(label, 0) + 1
+        return counts
+
+    def first_label(self, text: str = None, hits=None):
+        """설정 순서상 처음으로 매칭된 라벨 (없으면 None)"""
+        counts = self.count_by_label(text, hits)
+        if not counts:
+            return None
+        return min(counts, key=self._label_order.__getitem__)
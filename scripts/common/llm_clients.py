@@ -0,0 +1,305 @@
+"""
+OpenAI 호환 LLM 클라이언트 레지스트리
+
+핸들러마다 OpenAI()를 새로 만들면 요청마다 httpx 커넥션 풀/TLS 핸드셰이크를 다시 하게 됩니다.
+이 모듈은 (제공자, API 키, 타임아웃 등급)별로 클라이언트를 하나만 만들어 keep-alive 연결을 재사용하고,
+호출 지점(call site)별 토큰/지연 시간 통계와 선택적 응답 캐시를 제공합니다.
+
+- 제공자: openai / openrouter / laozhang (모두 OpenAI SDK 호환)
+- 타임아웃 등급: short(60초) / default(10분) / long(15분, GPT-5.1 장문 분석)
+- 응답 캐시: cache_ttl을 준 클라이언트만 (모델, 메시지, 파라미터) 해시로 TTL 캐시
+  → 분석/메타데이터/SEO처럼 같은 입력이면 같은 결과를 원하는 호출의 재시도를 즉시 응답
+  (대본 생성처럼 재시도 시 다른 결과가 필요한 호출은 캐시를 켜지 않음)
+  - max_tokens로 잘린 응답(finish_reason=length)/미완료 Responses 응답은 캐시하지 않음
+  - 호출자가 파싱에 실패하면 invalidate(response)로 버리거나, create(..., _no_cache=True)로 캐시를 건너뜀
+- openai 패키지는 첫 API 호출 시점에 import (서버 시작 시간 영향 없음)
+
+사용법:
+    from scripts.common.llm_clients import get_client
+
+    client = get_client("openai", timeout="long", cache_ttl=3600, call_site="image-analyze")
+    response = client.chat.completions.create(model="gpt-4o", messages=[...])
+    response = client.responses.create(model="gpt-5.1", input=[...])
+
+    try:
+        result = json.loads(response.choices[0].message.content)
+    except ValueError:
+        llm_clients.invalidate(response)   # 같은 요청 재시도가 잘못된 응답을 다시 받지 않도록
+        raise
+"""
+
+import hashlib
+import json
+import os
+import sys
+import threading
+import time
+from collections import OrderedDict
+
+PROVIDERS = {
+    "openai": {"base_url": None, "env": "OPENAI_API_KEY"},
+    "openrouter": {"base_url": "https://openrouter.ai/api/v1", "env": "OPENROUTER_API_KEY"},
+    "laozhang": {"base_url": "https://api.laozhang.ai/v1", "env": "LAOZHANG_API_KEY"},
+}
+
+# 타임아웃 등급 (전체, 연결, 읽기, 쓰기) 초
+TIMEOUTS = {
+    "short": (60.0, 10.0, 60.0, 30.0),
+    "default": (600.0, 30.0, 600.0, 60.0),
+    "long": (900.0, 60.0, 900.0, 60.0),
+}
+
+RESPONSE_CACHE_SIZE = int(os.environ.get("LLM_RESPONSE_CACHE_SIZE", "256"))
+DEFAULT_CACHE_TTL = int(os.environ.get("LLM_RESPONSE_CACHE_TTL", "3600"))
+
+_lock = threading.Lock()
+_base_clients = {}                  # (제공자, 키, 타임아웃 등급) → openai.OpenAI
+_response_cache = OrderedDict()     # 요청 해시 → (만료 시각, 응답)
+_stats = {}                         # 호출 지점 → 통계 dict
+
+
+def _create_base_client(provider, api_key, timeout):
+    """실제 openai.OpenAI 생성 (지연 import, 등급별 httpx 타임아웃)"""
+    import httpx
+    from openai import OpenAI
+
+    total, connect, read, write = TIMEOUTS[timeout]
+    kwargs = {
+        "api_key": api_key,
+        "timeout": httpx.Timeout(timeout=total, connect=connect, read=read, write=write),
+        "max_retries": 2,
+    }
+    base_url = PROVIDERS[provider]["base_url"]
+    if base_url:
+        kwargs["base_url"] = base_url
+    print(f"[LLM] {provider} 클라이언트 생성 (timeout={timeout})")
+    return OpenAI(**kwargs)
+
+
+def get_base_client(provider="openai", timeout="default", api_key=None):
+    """(제공자, 키, 타임아웃 등급)별 공유 openai.OpenAI (스레드 안전, 키 없으면 None)"""
+    if provider not in PROVIDERS:
+        raise ValueError(f"알 수 없는 LLM 제공자: {provider}")
+    if timeout not in TIMEOUTS:
+        raise ValueError(f"알 수 없는 타임아웃 등급: {timeout}")
+
+    api_key = (api_key or os.environ.get(PROVIDERS[provider]["env"]) or "").strip()
+    if not api_key:
+        return None
+
+    cache_key = (provider, api_key, timeout)
+    with _lock:
+        client = _base_clients.get(cache_key)
+        if client is None:
+            client = _create_base_client(provider, api_key, timeout)
+            _base_clients[cache_key] = client
+    return client
+
+
+def _request_hash(provider, endpoint, kwargs):
+    raw = json.dumps({"provider": provider, "endpoint": endpoint, **kwargs},
+                     sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def _cache_get(key):
+    with _lock:
+        entry = _response_cache.get(key)
+        if entry is None:
+            return None
+        expires_at, response = entry
+        if expires_at < time.time():
+            del _response_cache[key]
+            return None
+        _response_cache.move_to_end(key)
+        return response
+
+
+def _cache_put(key, response, ttl):
+    with _lock:
+        _response_cache[key] = (time.time() + ttl, response)
+        _response_cache.move_to_end(key)
+        while len(_response_cache) > RESPONSE_CACHE_SIZE:
+            _response_cache.popitem(last=False)
+
+
+def _is_complete(response):
+    """캐시해도 되는 완성 응답인지 (max_tokens로 잘린 Chat 응답, incomplete/failed Responses 응답 제외)"""
+    choices = getattr(response, "choices", None)
+    if choices:
+        return all(getattr(choice, "finish_reason", None) not in ("length", "content_filter") for choice in choices)
+    return getattr(response, "status", None) in (None, "completed")
+
+
+def invalidate(response):
+    """캐시에서 해당 응답 제거 (파싱 실패 등 호출자가 쓸 수 없는 응답) - 제거했으면 True"""
+    with _lock:
+        for key, (_, cached) in list(_response_cache.items()):
+            if cached is response:
+                del _response_cache[key]
+                return True
+    return False
+
+
+def _usage_tokens(response):
+    """(입력 토큰, 출력 토큰) - Chat Completions(prompt/completion)와 Responses(input/output) 모두 지원"""
+    usage = getattr(response, "usage", None)
+    if usage is None:
+        return 0, 0
+    prompt = getattr(usage, "prompt_tokens", None) or getattr(usage, "input_tokens", None) or 0
+    completion = getattr(usage, "completion_tokens", None) or getattr(usage, "output_tokens", None) or 0
+    return prompt, completion
+
+
+def _record(call_site, model, latency=0.0, response=None, cache_hit=False, error=False):
+    prompt_tokens, completion_tokens = _usage_tokens(response) if response is not None else (0, 0)
+    with _lock:
+        stat = _stats.setdefault(call_site, {
+            "calls": 0, "cache_hits": 0, "errors": 0,
+            "prompt_tokens": 0, "completion_tokens": 0,
+            "total_latency": 0.0, "max_latency": 0.0, "models": {},
+        })
+        if cache_hit:
+            stat["cache_hits"] += 1
+            return
+        stat["calls"] += 1
+        stat["errors"] += 1 if error else 0
+        stat["prompt_tokens"] += prompt_tokens
+        stat["completion_tokens"] += completion_tokens
+        stat["total_latency"] += latency
+        stat["max_latency"] = max(stat["max_latency"], latency)
+        stat["models"][model] = stat["models"].get(model, 0) + 1
+
+
+class _Endpoint:
+    """create() 호출을 계측/캐시하고, 나머지 속성은 SDK 엔드포인트로 위임"""
+
+    def __init__(self, owner, path):
+        self._owner = owner
+        self._path = path
+
+    def _target(self):
+        target = self._owner._raw()
+        for name in self._path.split("."):
+            target = getattr(target, name)
+        return target
+
+    def create(self, **kwargs):
+        # _call_site: 스레드로 위임하는 래퍼(AsyncLLMClient)가 원래 호출 함수 이름을 넘길 때 사용
+        # _no_cache: 캐시된 응답을 쓰지 않고 새로 호출 (재시도용, 새 응답은 캐시에 다시 저장)
+        call_site = kwargs.pop("_call_site", None) or self._owner.call_site or sys._getframe(1).f_code.co_name
+        no_cache = kwargs.pop("_no_cache", False)
+        return self._owner._call(self._path, self._target().create, call_site, kwargs, no_cache)
+
+    def __getattr__(self, item):
+        return getattr(self._target(), item)
+
+
+class _Chat:
+    def __init__(self, owner):
+        self.completions = _Endpoint(owner, "chat.completions")
+        self._owner = owner
+
+    def __getattr__(self, item):
+        return getattr(self._owner._raw().chat, item)
+
+
+class LLMClient:
+    """
+    공유 openai.OpenAI 래퍼 - chat.completions.create / responses.create를 계측
+
+    call_site를 주지 않으면 create()를 호출한 함수 이름으로 통계를 집계합니다.
+    images/audio 등 다른 API는 그대로 SDK 클라이언트로 위임됩니다.
+    """
+
+    def __init__(self, provider="openai", timeout="default", call_site=None, cache_ttl=0, api_key=None):
+        self.provider = provider
+        self.timeout = timeout
+        self.call_site = call_site
+        self.cache_ttl = cache_ttl
+        self._api_key = api_key
+        self.chat = _Chat(self)
+        self.responses = _Endpoint(self, "responses")
+
+    def _raw(self):
+        client = get_base_client(self.provider, self.timeout, self._api_key)
+        if client is None:
+            raise ValueError(f"{PROVIDERS[self.provider]['env']} 환경변수가 설정되지 않았습니다")
+        return client
+
+    def _call(self, path, method, call_site, kwargs, no_cache=False):
+        model = kwargs.get("model", "")
+        key = None
+        if self.cache_ttl > 0 and not kwargs.get("stream"):
+            key = _request_hash(self.provider, path, kwargs)
+            cached = None if no_cache else _cache_get(key)
+            if cached is not None:
+                _record(call_site, model, cache_hit=True)
+                print(f"[LLM] 캐시 응답: {call_site} ({model})")
+                return cached
+
+        started = time.perf_counter()
+        try:
+            response = method(**kwargs)
+        except Exception:
+            _record(call_site, model, time.perf_counter() - started, error=True)
+            raise
+
+        _record(call_site, model, time.perf_counter() - started, response)
+        if key and _is_complete(response):
+            _cache_put(key, response, self.cache_ttl)
+        elif key:
+            print(f"[LLM] 잘린 응답은 캐시하지 않음: {call_site} ({model})")
+        return response
+
+    def __getattr__(self, item):
+        return getattr(self._raw(), item)
+
+
+def get_client(provider="openai", timeout="default", call_site=None, cache_ttl=0, api_key=None):
+    """
+    계측/캐시 래퍼 반환 (API 키가 없으면 None)
+
+    Args:
+        provider: openai / openrouter / laozhang
+        timeout: short / default / long
+        call_site: 통계 이름 (기본: create()를 호출한 함수 이름)
+        cache_ttl: 응답 캐시 유지 시간(초), 0이면 캐시 안 함
+        api_key: 명시적 키 (기본: 제공자 환경변수)
+    """
+    env_key = (api_key or os.environ.get(PROVIDERS[provider]["env"]) or "").strip()
+    if not env_key:
+        return None
+    return LLMClient(provider, timeout, call_site, cache_ttl, env_key)
+
+
+def require_client(provider="openai", **kwargs):
+    """get_client와 같지만 키가 없으면 ValueError (OpenAI()와 같은 실패 방식)"""
+    client = get_client(provider, **kwargs)
+    if client is None:
+        raise ValueError(f"{PROVIDERS[provider]['env']} 환경변수가 설정되지 않았습니다")
+    return client
+
+
+def get_stats():
+    """호출 지점별 통계 (호출/캐시 히트/에러 수, 토큰, 평균/최대 지연 ms)"""
+    with _lock:
+        result = {}
+        for call_site, stat in _stats.items():
+            calls = stat["calls"]
+            result[call_site] = {
+                "calls": calls,
+                "cache_hits": stat["cache_hits"],
+                "errors": stat["errors"],
+                "prompt_tokens": stat["prompt_tokens"],
+                "completion_tokens": stat["completion_tokens"],
+                "avg_latency_ms": round(stat["total_latency"] / calls * 1000) if calls else 0,
+                "max_latency_ms": round(stat["max_latency"] * 1000),
+                "models": dict(stat["models"]),
+            }
+        return result
+
+
+def clear_cache():
+    with _lock:
+        _response_cache.clear()
@@ -0,0 +1,297 @@
+"""
+실행 간 뉴스 중복 제거 인덱스
+
+Google News는 같은 사건을 수십 개 언론사가 제목만 조금씩 바꿔 올린 기사로 보여주고,
+기존 (제목, 링크) 해시 중복 제거는 한 번의 실행 안에서만 동작해서
+점수화/댓글 수집/LLM 대본 생성이 같은 이야기에 반복 실행되었습니다.
+
+- 정확 중복: 호출자가 넘긴 키(해시)로 확인
+- 유사 중복: 정규화한 제목+요약의 글자 2-gram Jaccard 유사도 (기본 0.4 이상)
+  → MinHash 64개를 2개씩 32밴드로 묶어 인덱싱(LSH), 밴드가 하나라도 같은 후보만 실제 Jaccard 비교
+  (한국어 제목은 "한국은행/한은", 조사 차이가 많아 단어 단위보다 글자 2-gram이 안정적)
+- 네임스페이스별 저장 (뉴스 채널별, 쇼츠 등 서로 독립)
+- 처음 본 지 NEWS_DEDUPE_WINDOW_DAYS(기본 3일)가 지나면 만료 → 다시 새 이야기로 취급
+
+저장 위치: data/news_dedupe.db (NEWS_DEDUPE_DB로 변경, NEWS_DEDUPE_ENABLED=0이면 끔)
+
+사용법:
+    from scripts.common import news_dedupe
+
+    if news_dedupe.is_seen("shorts", item_hash, title + " " + summary):
+        continue
+    news_dedupe.mark_seen("shorts", item_hash, title + " " + summary, title=title)
+
+    new_items = news_dedupe.filter_new(items, "news_ECON",
+                                       key=lambda i: i["hash"],
+                                       text=lambda i: f"{i['title']} {i['summary']}")
+    ...  # 후속 처리가 성공한 뒤에만 기록 (실패한 실행의 이야기가 만료 기간 내내 막히지 않도록)
+    news_dedupe.mark_items_seen(new_items, "news_ECON",
+                                key=lambda i: i["hash"],
+                                text=lambda i: f"{i['title']} {i['summary']}")
+"""
+
+import hashlib
+import html
+import os
+import re
+import sqlite3
+import threading
+import time
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+DB_PATH = os.environ.get("NEWS_DEDUPE_DB", os.path.join(PROJECT_ROOT, "data", "news_dedupe.db"))
+ENABLED = os.environ.get("NEWS_DEDUPE_ENABLED", "1") != "0"
+WINDOW_DAYS = float(os.environ.get("NEWS_DEDUPE_WINDOW_DAYS", "3"))
+NEAR_THRESHOLD = float(os.environ.get("NEWS_DEDUPE_THRESHOLD", "0.4"))  # Jaccard 이상이면 같은 이야기
+
+NUM_PERM = 64
+BAND_ROWS = 2                      # 32밴드 × 2행 → Jaccard 0.4 후보 검출 확률 99% 이상
+_MERSENNE = (1 << 61) - 1
+_PERMS = [
+    (int.from_bytes(hashlib.blake2b(f"a{i}".encode(), digest_size=8).digest(), "big") % _MERSENNE | 1,
+     int.from_bytes(hashlib.blake2b(f"b{i}".encode(), digest_size=8).digest(), "big") % _MERSENNE)
+    for i in range(NUM_PERM)
+]
+
+_lock = threading.Lock()
+_conn = None
+_last_purge = 0.0
+
+# Google News 제목 끝의 " - 언론사", 앞뒤 말머리 ([단독], (종합) 등), RSS 요약의 HTML
+_SOURCE_SUFFIX_RE = re.compile(r"\s[-|–—]\s[^-|–—]{1,30}$")
+_TAG_RE = re.compile(r"[\[(【<][^\])】>]{1,12}[\])】>]")
+_HTML_RE = re.compile(r"<[^>]+>|https?://\S+")
+_NON_WORD_RE = re.compile(r"[^\w]")
+
+
+def _db() -> sqlite3.Connection:
+    """SQLite 연결 (프로세스당 하나, 스레드 간 공유는 _lock으로 직렬화)"""
+    global _conn
+    if _conn is None:
+        os.makedirs(os.path.dirname(DB_PATH), exist_ok=True)
+        conn = sqlite3.connect(DB_PATH, check_same_thread=False, timeout=30)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS stories (
+                namespace TEXT,
+                key TEXT,
+                norm TEXT,
+                title TEXT,
+                first_seen REAL,
+                PRIMARY KEY (namespace, key)
+            )
+        """)
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS bands (
+                namespace TEXT,
+                band INTEGER,
+                key TEXT
+            )
+        """)
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_bands_lookup ON bands(namespace, band)")
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_stories_first_seen ON stories(first_seen)")
+        conn.commit()
+        _conn = conn
+    return _conn
+
+
+def normalize_story_text(text: str) -> str:
+    """HTML/언론사 꼬리표/말머리/문장부호/공백 제거 + 소문자"""
+    text = html.unescape(_HTML_RE.sub(" ", text or "")).strip()
+    text = _SOURCE_SUFFIX_RE.sub("", text)
+    text = _TAG_RE.sub(" ", text)
+    return _NON_WORD_RE.sub("", text.lower())
+
+
+def shingles(norm: str) -> set:
+    """글자 2-gram 집합"""
+    return {norm[i:i + 2] for i in range(len(norm) - 1)} or ({norm} if norm else set())
+
+
+def jaccard(a: set, b: set) -> float:
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+def minhash_bands(shingle_set: set) -> list:
+    """MinHash 서명 → 밴드 해시 목록 (밴드 번호를 섞어 밴드끼리 충돌하지 않게)"""
+    base = [int.from_bytes(hashlib.blake2b(s.encode("utf-8"), digest_size=8).digest(), "big")
+            for s in shingle_set]
+    if not base:
+        return []
+    signature = [min((a * h + b) % _MERSENNE for h in base) for a, b in _PERMS]
+    bands = []
+    for index in range(0, NUM_PERM, BAND_ROWS):
+        raw = f"{index}:" + ",".join(str(v) for v in signature[index:index + BAND_ROWS])
+        value = int.from_bytes(hashlib.blake2b(raw.encode(), digest_size=8).digest(), "big")
+        bands.append(value - (1 << 64) if value >= (1 << 63) else value)  # SQLite INTEGER는 부호 있는 64비트
+    return bands
+
+
+def _purge(conn: sqlite3.Connection):
+    """만료 항목 삭제 (_lock 보유 상태, 한 시간에 한 번)"""
+    global _last_purge
+    now = time.time()
+    if now - _last_purge < 3600:
+        return
+    _last_purge = now
+    cutoff = now - WINDOW_DAYS * 86400
+    conn.execute(
+        "DELETE FROM bands WHERE (namespace, key) IN "
+        "(SELECT namespace, key FROM stories WHERE first_seen < ?)", (cutoff,)
+    )
+    deleted = conn.execute("DELETE FROM stories WHERE first_seen < ?", (cutoff,)).rowcount
+    conn.commit()
+    if deleted:
+        print(f"[NEWS-DEDUPE] 만료 {deleted}개 삭제 ({WINDOW_DAYS:g}일 경과)")
+
+
+def _prepare(text: str):
+    norm = normalize_story_text(text)
+    current = shingles(norm)
+    return norm, current, minhash_bands(current)
+
+
+def _find(conn, namespace, key, prepared, threshold, cutoff):
+    """(_lock 보유 상태) 정확 키 → LSH 후보 → 실제 Jaccard 순서로 확인"""
+    _, current, bands = prepared
+    row = conn.execute(
+        "SELECT title FROM stories WHERE namespace = ? AND key = ? AND first_seen >= ?",
+        (namespace, key, cutoff)
+    ).fetchone()
+    if row:
+        return {"reason": "exact", "title": row[0], "similarity": 1.0}
+    if not bands:
+        return None
+
+    placeholders = ",".join("?" * len(bands))
+    candidates = conn.execute(
+        f"SELECT DISTINCT s.norm, s.title FROM bands b JOIN stories s "
+        f"ON s.namespace = b.namespace AND s.key = b.key "
+        f"WHERE b.namespace = ? AND b.band IN ({placeholders}) AND s.first_seen >= ?",
+        (namespace, *bands, cutoff)
+    ).fetchall()
+
+    best = None
+    for other_norm, title in candidates:
+        similarity = jaccard(current, shingles(other_norm))
+        if similarity >= threshold and (best is None or similarity > best["similarity"]):
+            best = {"reason": "near", "title": title, "similarity": round(similarity, 2)}
+    return best
+
+
+def _insert(conn, namespace, key, prepared, title):
+    """(_lock 보유 상태) 같은 키는 처음 본 시각 유지, 커밋은 호출자가"""
+    norm, _, bands = prepared
+    inserted = conn.execute(
+        "INSERT OR IGNORE INTO stories (namespace, key, norm, title, first_seen) VALUES (?, ?, ?, ?, ?)",
+        (namespace, key, norm, title[:200], time.time())
+    ).rowcount
+    if inserted:
+        conn.executemany(
+            "INSERT INTO bands (namespace, band, key) VALUES (?, ?, ?)",
+            [(namespace, band, key) for band in bands]
+        )
+
+
+def find_duplicate(namespace: str, key: str, text: str, threshold: float = NEAR_THRESHOLD):
+    """
+    이미 본 이야기인지 확인
+
+    Returns:
+        None (새 이야기) 또는 {"reason": "exact"|"near", "title": 기존 제목, "similarity": Jaccard}
+    """
+    if not ENABLED:
+        return None
+    prepared = _prepare(text)
+    with _lock:
+        conn = _db()
+        _purge(conn)
+        return _find(conn, namespace, key, prepared, threshold, time.time() - WINDOW_DAYS * 86400)
+
+
+def is_seen(namespace: str, key: str, text: str, threshold: float = NEAR_THRESHOLD) -> bool:
+    return find_duplicate(namespace, key, text, threshold) is not None
+
+
+def mark_seen(namespace: str, key: str, text: str, title: str = ""):
+    """이야기를 인덱스에 기록 (같은 키는 처음 본 시각 유지)"""
+    if not ENABLED:
+        return
+    prepared = _prepare(text)
+    with _lock:
+        conn = _db()
+        _insert(conn, namespace, key, prepared, title or text)
+        conn.commit()
+
+
+def mark_items_seen(items, namespace, key, text, title=None):
+    """
+    여러 항목을 한 번에 기록 (filter_new로 고른 항목을 후속 처리가 성공한 뒤 기록, 커밋 1회)
+
+    Args:
+        key / text: filter_new에 넘긴 것과 같은 함수
+        title: 항목 → 저장할 제목 (없으면 text)
+    """
+    if not ENABLED or not items:
+        return
+    prepared = [(key(item), text(item), title(item) if title else None) for item in items]
+    prepared = [(item_key, _prepare(item_text), item_title or item_text)
+                for item_key, item_text, item_title in prepared]
+    with _lock:
+        conn = _db()
+        for item_key, item_prepared, item_title in prepared:
+            _insert(conn, namespace, item_key, item_prepared, item_title)
+        conn.commit()
+
+
+def filter_new(items, namespace, key, text, threshold: float = NEAR_THRESHOLD):
+    """
+    새 이야기만 남기기 (읽기 전용 - 같은 배치 안의 유사 중복도 제거)
+
+    통과한 항목은 기록하지 않음 → 호출자가 후속 처리 성공 후 mark_items_seen으로 기록
+
+    Args:
+        items: 항목 목록
+        namespace: 인덱스 이름 (예: "news_ECON", "shorts")
+        key: 항목 → 정확 중복 키
+        text: 항목 → 비교할 텍스트 (제목 + 요약)
+    """
+    if not ENABLED:
+        return list(items)
+
+    prepared = [(item, key(item), _prepare(text(item))) for item in items]
+    cutoff = time.time() - WINDOW_DAYS * 86400
+
+    fresh = []
+    exact = near = 0
+    batch_keys = set()
+    batch_bands = {}    # 밴드 해시 → 이번 배치에서 통과한 항목의 2-gram 집합들
+    with _lock:
+        conn = _db()
+        _purge(conn)
+        for item, item_key, item_prepared in prepared:
+            _, current, bands = item_prepared
+            if item_key in batch_keys:
+                exact += 1
+                continue
+            candidates = {id(other): other for band in bands for other in batch_bands.get(band, [])}
+            if any(jaccard(current, other) >= threshold for other in candidates.values()):
+                near += 1
+                continue
+            duplicate = _find(conn, namespace, item_key, item_prepared, threshold, cutoff)
+            if duplicate:
+                if duplicate["reason"] == "exact":
+                    exact += 1
+                else:
+                    near += 1
+                continue
+            fresh.append(item)
+            batch_keys.add(item_key)
+            for band in bands:
+                batch_bands.setdefault(band, []).append(current)
+
+    print(f"[NEWS-DEDUPE] {namespace}: {len(items)} → {len(fresh)}개 (정확 중복 {exact}, 유사 중복 {near})")
+    return fresh
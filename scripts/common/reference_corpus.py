@@ -0,0 +1,273 @@
+"""
+로컬 참고자료 코퍼스 (SQLite + FTS5)
+
+역사/미스테리 파이프라인은 에피소드마다 위키백과/나무위키/대백과사전/박물관을 실시간으로 조회해서
+같은 시대의 같은 문서를 계속 다시 받아왔습니다.
+
+이 모듈은 한 번 받은 문서를 정규화한 본문과 함께 저장하고 전문 검색 인덱스를 유지합니다.
+- 문서: (소스, 키) → 제목/URL/본문/메타, 받은 시각 (키는 URL 또는 문서 제목)
+- 검색 결과: (소스, 검색어) → 결과 문서 키 목록 (같은 검색어는 네트워크 없이 재현)
+- 전문 검색: FTS5 trigram 인덱스 (한국어 부분 문자열 검색, 3글자 미만 검색어는 LIKE로 보완)
+- 만료: 호출자가 max_age(초)를 주면 그보다 오래된 문서는 없는 것으로 취급 → 네트워크로 갱신
+
+저장 위치: data/reference_corpus.db (REFERENCE_CORPUS_DB로 변경, REFERENCE_CORPUS_ENABLED=0이면 끔)
+
+사용법:
+    from scripts.common import reference_corpus
+
+    doc = reference_corpus.get("wikipedia_ko", "광개토대왕", max_age=30 * 86400)
+    if doc is None:
+        content = fetch(...)
+        reference_corpus.put("wikipedia_ko", "광개토대왕", title="광개토대왕", content=content, url=url)
+
+    hits = reference_corpus.search("광개토대왕 정복", source="encykorea", limit=3)
+"""
+
+import html
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+DB_PATH = os.environ.get("REFERENCE_CORPUS_DB", os.path.join(PROJECT_ROOT, "data", "reference_corpus.db"))
+ENABLED = os.environ.get("REFERENCE_CORPUS_ENABLED", "1") != "0"
+DEFAULT_MAX_AGE = int(os.environ.get("REFERENCE_CORPUS_TTL", str(30 * 86400)))
+
+_lock = threading.Lock()
+_conn = None
+_fts = False     # FTS5 trigram 사용 가능 여부 (없으면 LIKE 검색)
+
+_TAG_RE = re.compile(r"<script[^>]*>.*?</script>|<style[^>]*>.*?</style>|<[^>]+>", re.DOTALL | re.IGNORECASE)
+_SPACE_RE = re.compile(r"[ \t\r\f\v]+")
+_BLANK_LINES_RE = re.compile(r"\n\s*\n+")
+
+
+def _db() -> sqlite3.Connection:
+    """SQLite 연결 (프로세스당 하나, 스레드 간 공유는 _lock으로 직렬화)"""
+    global _conn, _fts
+    if _conn is None:
+        os.makedirs(os.path.dirname(DB_PATH), exist_ok=True)
+        conn = sqlite3.connect(DB_PATH, check_same_thread=False, timeout=30)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS articles (
+                id INTEGER PRIMARY KEY,
+                source TEXT NOT NULL,
+                key TEXT NOT NULL,
+                title TEXT,
+                url TEXT,
+                content TEXT,
+                meta TEXT,
+                fetched_at REAL,
+                UNIQUE (source, key)
+            )
+        """)
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS searches (
+                source TEXT NOT NULL,
+                query TEXT NOT NULL,
+                keys TEXT,
+                fetched_at REAL,
+                PRIMARY KEY (source, query)
+            )
+        """)
+        try:
+            conn.execute("""
+                CREATE VIRTUAL TABLE IF NOT EXISTS articles_fts USING fts5(
+                    title, content, content='articles', content_rowid='id', tokenize='trigram'
+                )
+            """)
+            conn.executescript("""
+                CREATE TRIGGER IF NOT EXISTS articles_ai AFTER INSERT ON articles BEGIN
+                    INSERT INTO articles_fts(rowid, title, content) VALUES (new.id, new.title, new.content);
+                END;
+                CREATE TRIGGER IF NOT EXISTS articles_ad AFTER DELETE ON articles BEGIN
+                    INSERT INTO articles_fts(articles_fts, rowid, title, content)
+                    VALUES ('delete', old.id, old.title, old.content);
+                END;
+                CREATE TRIGGER IF NOT EXISTS articles_au AFTER UPDATE ON articles BEGIN
+                    INSERT INTO articles_fts(articles_fts, rowid, title, content)
+                    VALUES ('delete', old.id, old.title, old.content);
+                    INSERT INTO articles_fts(rowid, title, content) VALUES (new.id, new.title, new.content);
+                END;
+            """)
+            _fts = True
+        except sqlite3.OperationalError as e:
+            print(f"[CORPUS] FTS5 trigram 사용 불가 - LIKE 검색으로 대체: {e}")
+            _fts = False
+        conn.commit()
+        _conn = conn
+    return _conn
+
+
+def normalize_text(text: str) -> str:
+    """HTML 태그/엔티티 제거, 공백 정리 (문단 구분은 유지)"""
+    if not text:
+        return ""
+    text = html.unescape(_TAG_RE.sub(" ", text))
+    text = _SPACE_RE.sub(" ", text)
+    text = _BLANK_LINES_RE.sub("\n\n", text)
+    return "\n".join(line.strip() for line in text.split("\n")).strip()
+
+
+def _row_to_doc(row) -> dict:
+    source, key, title, url, content, meta, fetched_at = row
+    return {
+        "source": source, "key": key, "title": title or "", "url": url or "",
+        "content": content or "", "meta": json.loads(meta) if meta else {},
+        "fetched_at": fetched_at,
+    }
+
+
+_COLUMNS = "source, key, title, url, content, meta, fetched_at"
+
+
+def get(source: str, key: str, max_age: float = None):
+    """저장된 문서 (없거나 max_age초보다 오래되면 None)"""
+    if not ENABLED or not key:
+        return None
+    max_age = DEFAULT_MAX_AGE if max_age is None else max_age
+    with _lock:
+        row = _db().execute(
+            f"SELECT {_COLUMNS} FROM articles WHERE source = ? AND key = ? AND fetched_at >= ?",
+            (source, key, time.time() - max_age)
+        ).fetchone()
+    return _row_to_doc(row) if row else None
+
+
+def put(source: str, key: str, title: str = "", content: str = "", url: str = "", meta: dict = None):
+    """문서 저장/갱신 (본문은 normalize_text로 정규화)"""
+    if not ENABLED or not key:
+        return
+    with _lock:
+        conn = _db()
+        conn.execute(
+            f"INSERT INTO articles ({_COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?) "
+            "ON CONFLICT(source, key) DO UPDATE SET title = excluded.title, url = excluded.url, "
+            "content = excluded.content, meta = excluded.meta, fetched_at = excluded.fetched_at",
+            (source, key, title or "", url or "", normalize_text(content),
+             json.dumps(meta or {}, ensure_ascii=False), time.time())
+        )
+        conn.commit()
+
+
+def get_search(source: str, query: str, max_age: float = None):
+    """
+    이전에 같은 검색어로 받은 결과 문서 목록 (없거나 만료/문서 누락이면 None)
+    """
+    if not ENABLED:
+        return None
+    max_age = DEFAULT_MAX_AGE if max_age is None else max_age
+    cutoff = time.time() - max_age
+    with _lock:
+        conn = _db()
+        row = conn.execute(
+            "SELECT keys FROM searches WHERE source = ? AND query = ? AND fetched_at >= ?",
+            (source, query, cutoff)
+        ).fetchone()
+        if not row:
+            return None
+        docs = []
+        for key in json.loads(row[0]):
+            doc_row = conn.execute(
+                f"SELECT {_COLUMNS} FROM articles WHERE source = ? AND key = ? AND fetched_at >= ?",
+                (source, key, cutoff)
+            ).fetchone()
+            if not doc_row:
+                return None
+            docs.append(_row_to_doc(doc_row))
+    return docs
+
+
+def put_search(source: str, query: str, keys: list):
+    """검색어 → 결과 문서 키 목록 저장 (문서는 put으로 먼저 저장)"""
+    if not ENABLED:
+        return
+    with _lock:
+        conn = _db()
+        conn.execute(
+            "INSERT OR REPLACE INTO searches (source, query, keys, fetched_at) VALUES (?, ?, ?, ?)",
+            (source, query, json.dumps(list(keys), ensure_ascii=False), time.time())
+        )
+        conn.commit()
+
+
+def _fts_query(terms: list) -> str:
+    """FTS5 MATCH 식 (각 검색어를 구문으로 인용, 모두 포함)"""
+    return " AND ".join('"' + term.replace('"', '""') + '"' for term in terms)
+
+
+def search(query: str, source: str = None, limit: int = 5, max_age: float = None,
+           title_match: bool = False) -> list:
+    """
+    로컬 전문 검색 (검색어의 모든 단어를 포함하는 문서, 관련도순)
+
+    Args:
+        query: 검색어 (공백으로 단어 구분)
+        source: 특정 소스만 (None이면 전체)
+        limit: 최대 결과 수
+        max_age: 이보다 오래된 문서 제외 (초)
+        title_match: True면 모든 단어가 제목에 있는 문서만 (본문에 스치듯 나온 문서 제외)
+    """
+    if not ENABLED:
+        return []
+    terms = [t for t in normalize_text(query).split() if t]
+    if not terms:
+        return []
+    max_age = DEFAULT_MAX_AGE if max_age is None else max_age
+    cutoff = time.time() - max_age
+
+    long_terms = [t for t in terms if len(t) >= 3]      # trigram 인덱스는 3글자 이상만 사용 가능
+    short_terms = [t for t in terms if len(t) < 3]
+
+    where = ["a.fetched_at >= ?"]
+    params = [cutoff]
+    if source:
+        where.append("a.source = ?")
+        params.append(source)
+    for term in short_terms if _fts else terms:
+        where.append("(a.title LIKE ? OR a.content LIKE ?)")
+        params += [f"%{term}%", f"%{term}%"]
+    if title_match:
+        for term in terms:
+            where.append("a.title LIKE ?")
+            params.append(f"%{term}%")
+
+    started = time.perf_counter()
+    with _lock:
+        conn = _db()
+        if _fts and long_terms:
+            rows = conn.execute(
+                f"SELECT a.source, a.key, a.title, a.url, a.content, a.meta, a.fetched_at "
+                f"FROM articles_fts f JOIN articles a ON a.id = f.rowid "
+                f"WHERE articles_fts MATCH ? AND {' AND '.join(where)} "
+                f"ORDER BY bm25(articles_fts, 5.0, 1.0) LIMIT ?",
+                [_fts_query(long_terms)] + params + [limit]
+            ).fetchall()
+        else:
+            # 짧은 검색어만 있으면 제목 일치 문서를 앞에
+            title_term = f"%{terms[0]}%"
+            rows = conn.execute(
+                f"SELECT a.source, a.key, a.title, a.url, a.content, a.meta, a.fetched_at "
+                f"FROM articles a WHERE {' AND '.join(where)} "
+                f"ORDER BY (a.title LIKE ?) DESC, a.fetched_at DESC LIMIT ?",
+                params + [title_term, limit]
+            ).fetchall()
+
+    docs = [_row_to_doc(row) for row in rows]
+    print(f"[CORPUS] 로컬 검색 '{query}'{f' ({source})' if source else ''}: "
+          f"{len(docs)}개, {(time.perf_counter() - started) * 1000:.1f}ms")
+    return docs
+
+
+def stats() -> dict:
+    """소스별 문서 수"""
+    if not ENABLED:
+        return {}
+    with _lock:
+        rows = _db().execute("SELECT source, COUNT(*) FROM articles GROUP BY source").fetchall()
+    return dict(rows)
@@ -17,6 +17,9 @@ from typing import Dict, Any, List
 
 # 공통 오디오 유틸리티
 from scripts.common.audio_utils import get_audio_duration
+from scripts.common.audio_library import get_bgm_volume
+from scripts.common.bgm_beds import render_segment_bed
+from scripts.common.audio_mixer import mix_narration_with_bgm
 
 
 # 파이프라인별 자막 스타일 프리셋
@@ -423,6 +426,7 @@ def mix_audio_with_multi_bgm(
     voice_volume: float = 1.0,
     crossfade_duration: float = 2.0,
     log_prefix: str = "[RENDERER]",
+    timeline: List[Any] = None,
 ) -> Dict[str, Any]:
     """
     음성과 여러 BGM 세그먼트 믹싱 (씬별 BGM 전환)
@@ -436,6 +440,7 @@ def mix_audio_with_multi_bgm(
         voice_volume: 음성 볼륨 증폭
         crossfade_duration: BGM 전환 시 크로스페이드 길이 (초)
         log_prefix: 로그 접두사
+        timeline: 나레이션 구간 [(start, end, ...)] - BGM 더킹용 (없으면 RMS 검출)
 
     Returns:
         {"ok": True, "audio_path": "..."}
@@ -452,12 +457,34 @@ def mix_audio_with_multi_bgm(
             bgm_volume=bgm_volume,
             voice_volume=voice_volume,
             log_prefix=log_prefix,
+            timeline=timeline,
         )
 
     try:
         voice_duration = get_audio_duration(voice_path)
 
-        # FFmpeg 입력 파일 목록 생성
+        # 캐시된 BGM 베드를 NumPy로 조립 → 음성과 한 번만 믹싱
+        bed_path = render_segment_bed(
+            [(seg["start"], seg["end"], seg["path"]) for seg in bgm_segments],
+            voice_duration, os.path.splitext(output_path)[0] + "_bgm_bed.flac",
+            crossfade=crossfade_duration, fade_in=crossfade_duration, log_prefix=log_prefix,
+        )
+        if bed_path:
+            try:
+                return mix_audio_with_bgm(
+                    voice_path=voice_path,
+                    bgm_path=bed_path,
+                    output_path=output_path,
+                    bgm_volume=bgm_volume,
+                    voice_volume=voice_volume,
+                    log_prefix=log_prefix,
+                    bgm_normalized=True,
+                    timeline=timeline,
+                )
+            finally:
+                os.remove(bed_path)
+
+        # (폴백) FFmpeg 입력 파일 목록 생성
         inputs = ['-i', voice_path]  # 0번: 음성
         for i, seg in enumerate(bgm_segments):
             inputs.extend(['-stream_loop', '-1', '-i', seg["path"]])  # 1번부터: BGM들
@@ -472,15 +499,16 @@ def mix_audio_with_multi_bgm(
             end = seg["end"]
             duration = end - start
 
-            # 각 BGM 세그먼트 트림 및 볼륨 조절
+            # 각 BGM 세그먼트 트림 및 볼륨 조절 (트랙별 라우드니스 보정)
             label = f"bgm{i}"
+            seg_volume = get_bgm_volume(seg["path"], bgm_volume)
             # atrim으로 시작부터 필요한 길이만큼 자르고, adelay로 시작 위치 지정
             delay_ms = int(start * 1000)
 
             if i == len(bgm_segments) - 1:
                 # 마지막 세그먼트: 페이드 아웃 추가
                 filter_parts.append(
-                    f"[{input_idx}:a]atrim=0:{duration},volume={bgm_volume},"
+                    f"[{input_idx}:a]atrim=0:{duration},volume={seg_volume},"
                     f"afade=t=in:d={crossfade_duration},"
                     f"afade=t=out:st={duration-3}:d=3,"
                     f"adelay={delay_ms}|{delay_ms}[{label}]"
@@ -488,14 +516,14 @@ def mix_audio_with_multi_bgm(
             elif i == 0:
                 # 첫 세그먼트: 페이드 아웃만
                 filter_parts.append(
-                    f"[{input_idx}:a]atrim=0:{duration},volume={bgm_volume},"
+                    f"[{input_idx}:a]atrim=0:{duration},volume={seg_volume},"
                     f"afade=t=out:st={duration-crossfade_duration}:d={crossfade_duration},"
                     f"adelay={delay_ms}|{delay_ms}[{label}]"
                 )
             else:
                 # 중간 세그먼트: 페이드 인/아웃 둘 다
                 filter_parts.append(
-                    f"[{input_idx}:a]atrim=0:{duration},volume={bgm_volume},"
+                    f"[{input_idx}:a]atrim=0:{duration},volume={seg_volume},"
                     f"afade=t=in:d={crossfade_duration},"
                     f"afade=t=out:st={duration-crossfade_duration}:d={crossfade_duration},"
                     f"adelay={delay_ms}|{delay_ms}[{label}]"
@@ -545,6 +573,7 @@ def mix_audio_with_multi_bgm(
                 bgm_volume=bgm_volume,
                 voice_volume=voice_volume,
                 log_prefix=log_prefix,
+                timeline=timeline,
             )
 
         if os.path.exists(output_path):
@@ -564,6 +593,8 @@ def mix_audio_with_bgm(
     bgm_volume: float = 0.15,
     voice_volume: float = 1.0,
     log_prefix: str = "[RENDERER]",
+    bgm_normalized: bool = False,
+    timeline: List[Any] = None,
 ) -> Dict[str, Any]:
     """
     음성과 BGM 믹싱
@@ -575,14 +606,26 @@ def mix_audio_with_bgm(
         bgm_volume: BGM 볼륨 (0.0 ~ 1.0, 기본 0.15)
         voice_volume: 음성 볼륨 증폭 (1.0 = 원본, 1.5 = 1.5배)
         log_prefix: 로그 접두사
+        bgm_normalized: 이미 라우드니스 정규화된 베드면 True (트랙별 보정 생략)
+        timeline: 나레이션 구간 [(start, end, ...)] - BGM 더킹용 (없으면 RMS 검출)
 
     Returns:
         {"ok": True, "audio_path": "..."}
     """
+    # 더킹 엔진 (디코딩-믹싱-인코딩 한 번) - numpy가 없거나 실패하면 FFmpeg amix로 폴백
+    if mix_narration_with_bgm(voice_path, bgm_path, output_path, bgm_volume=bgm_volume,
+                              voice_volume=voice_volume, timeline=timeline, fade_in=0.0,
+                              bgm_normalized=bgm_normalized, log_prefix=log_prefix):
+        print(f"{log_prefix} BGM 믹싱 완료: {output_path}")
+        return {"ok": True, "audio_path": output_path}
+
     try:
         # 음성 길이 확인
         voice_duration = get_audio_duration(voice_path)
 
+        # 트랙 라우드니스에 맞춘 BGM 볼륨 (라이브러리 인덱스 사전 분석값)
+        track_volume = bgm_volume if bgm_normalized else get_bgm_volume(bgm_path, bgm_volume)
+
         # FFmpeg로 믹싱 (음성 볼륨 증폭 + BGM 루프 + 페이드 아웃)
         # amix는 자동으로 볼륨을 낮추므로 normalize=0으로 비활성화
         ffmpeg_cmd = [
@@ -591,7 +634,7 @@ def mix_audio_with_bgm(
             '-stream_loop', '-1', '-i', bgm_path,
             '-filter_complex',
             f'[0:a]volume={voice_volume}[voice];'
-            f'[1:a]volume={bgm_volume},afade=t=out:st={voice_duration-3}:d=3[bgm];'
+            f'[1:a]volume={track_volume},afade=t=out:st={voice_duration-3}:d=3[bgm];'
             f'[voice][bgm]amix=inputs=2:duration=first:dropout_transition=2:normalize=0[out]',
             '-map', '[out]',
             '-c:a', 'libmp3lame', '-b:a', '192k',
@@ -599,7 +642,7 @@ def mix_audio_with_bgm(
             output_path
         ]
 
-        print(f"{log_prefix} BGM 믹싱 중... (voice={voice_volume}x, bgm={bgm_volume*100:.0f}%)")
+        print(f"{log_prefix} BGM 믹싱 중... (voice={voice_volume}x, bgm={track_volume*100:.1f}%)")
 
         process = subprocess.run(
             ffmpeg_cmd,
@@ -0,0 +1,124 @@
+"""
+씬 단위 데이터플로우 실행기
+
+자동화 파이프라인은 "전체 TTS → 전체 이미지 → 전체 클립 인코딩" 순서로 단계마다 모든 씬을 기다렸습니다.
+이 모듈은 씬 하나를 작업 단위로 보고, 씬별 독립 단계(이미지/TTS)를 각자의 워커 풀에서 동시에 돌리다가
+한 씬의 모든 단계가 끝나는 즉시 마무리 단계(클립 인코딩)를 시작합니다.
+→ 씬 N 클립 인코딩과 씬 N+1 이미지 생성이 겹쳐서, 전체 소요 시간이 단계 합이 아니라 가장 느린 단계에 가까워짐
+
+- 단계별 워커 수를 따로 지정 (예: 이미지 4개, TTS 1개 - Gemini TTS rate limit, 인코딩 1개 - 메모리)
+- 각 풀은 씬 번호 순서로 제출되므로 앞 씬부터 완료되어 인코딩이 일찍 시작됨
+- 단계 함수가 PipelineAbort를 던지면 대기 중인 작업을 모두 취소 (예: TTS 실패 시 남은 이미지 비용 절약)
+
+사용법:
+    from scripts.common.scene_pipeline import run_scene_pipeline, PipelineAbort
+
+    outcome = run_scene_pipeline(
+        len(scenes),
+        stages={"image": (make_image, 4), "tts": (make_tts, 1)},
+        finish=(encode_clip, 1),
+    )
+    outcome["finished"]   # {씬 인덱스: encode_clip 반환값 또는 Exception}
+"""
+
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+
+class PipelineAbort(Exception):
+    """단계 함수가 던지면 파이프라인 전체를 중단 (대기 중 작업 취소)"""
+
+
+def run_scene_pipeline(count, stages, finish, label="PIPELINE"):
+    """
+    씬별 단계를 동시에 실행하고, 모든 단계가 끝난 씬부터 마무리 단계 실행
+
+    Args:
+        count: 씬 개수
+        stages: {단계 이름: (func(idx) → 결과, 워커 수)} - 서로 독립인 씬별 단계
+        finish: (func(idx, {단계 이름: 결과}) → 결과, 워커 수) - 씬별 마무리 (예: 클립 인코딩)
+        label: 로그 태그
+
+    Returns:
+        {
+            "stages": {단계 이름: {idx: 결과 또는 Exception}},
+            "finished": {idx: 결과 또는 Exception},   # 단계가 하나라도 실패한 씬은 제외
+            "aborted": 중단 사유 문자열 또는 None,
+            "elapsed": 전체 소요 시간(초),
+            "busy": {단계 이름: 작업 시간 합(초)},     # 순차 실행했다면 걸렸을 시간
+        }
+    """
+    finish_func, finish_workers = finish
+    events = queue.Queue()
+    results = {name: {} for name in stages}
+    finished = {}
+    busy = {name: 0.0 for name in list(stages) + ["finish"]}
+    busy_lock = threading.Lock()
+    aborted = None
+    started = time.perf_counter()
+
+    def _timed(name, func, *args):
+        t0 = time.perf_counter()
+        try:
+            return func(*args)
+        finally:
+            with busy_lock:
+                busy[name] += time.perf_counter() - t0
+
+    executors = {
+        name: ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix=f"scene-{name}")
+        for name, (_, workers) in stages.items()
+    }
+    executors["finish"] = ThreadPoolExecutor(max_workers=max(1, finish_workers), thread_name_prefix="scene-finish")
+    futures = []
+
+    def _submit(name, idx, func, *args):
+        future = executors[name].submit(_timed, name, func, *args)
+        future.add_done_callback(lambda f: events.put((name, idx, f)))
+        futures.append(future)
+
+    try:
+        for idx in range(count):
+            for name, (func, _) in stages.items():
+                _submit(name, idx, func, idx)
+
+        pending = count * len(stages)
+        while pending:
+            name, idx, future = events.get()
+            pending -= 1
+            if future.cancelled():
+                continue
+
+            error = future.exception()
+            if name == "finish":
+                finished[idx] = error if error else future.result()
+                continue
+
+            results[name][idx] = error if error else future.result()
+            if isinstance(error, PipelineAbort) and aborted is None:
+                aborted = str(error)
+                print(f"[{label}] 중단: {aborted} - 대기 중 작업 취소")
+                for other in futures:
+                    other.cancel()
+                continue
+            if error:
+                print(f"[{label}] 씬 {idx + 1} {name} 실패: {error}")
+
+            # 이 씬의 모든 단계가 끝났으면 바로 마무리 단계로
+            scene_results = {stage: results[stage].get(idx) for stage in stages}
+            if aborted is None and all(idx in results[stage] for stage in stages):
+                if any(isinstance(r, Exception) for r in scene_results.values()):
+                    continue
+                pending += 1
+                _submit("finish", idx, finish_func, idx, scene_results)
+    finally:
+        for executor in executors.values():
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    elapsed = time.perf_counter() - started
+    busy = {name: round(seconds, 1) for name, seconds in busy.items()}
+    print(f"[{label}] 씬 {count}개: 소요 {elapsed:.1f}초 (단계별 작업 시간 {busy})")
+    return {"stages": results, "finished": finished, "aborted": aborted,
+            "elapsed": elapsed, "busy": busy}
@@ -0,0 +1,276 @@
+"""
+긴 대본 분석 - 청크 map-reduce
+
+/api/image/analyze-script는 대본 전체 + 가이드 + SEO 자료를 GPT 한 번에 보내
+20분 이상 대본에서는 출력(전체 나레이션 복사)이 길어 수 분이 걸리고, 타임아웃 한 번에 전부 잃습니다.
+
+이 모듈은 긴 대본을 문장 경계에서 청크로 나누고:
+- map: 청크별로 씬 분할 + 이미지 프롬프트만 동시 생성 (씬 수는 글자 수 비례 배분)
+- reduce: 전체 대본 기준 메타데이터(썸네일/유튜브/SEO/video_effects)만 생성 - 출력이 짧아 빠름
+map과 reduce는 서로 독립이라 함께 실행되고, 끝난 청크의 씬부터 바로 이벤트로 내보냅니다.
+
+사용법:
+    from scripts.common.script_analysis import plan_chunks, iter_chunked_analysis
+
+    for event in iter_chunked_analysis(client, system_prompt, build_user_prompt, script, image_count):
+        if event["type"] == "scenes":      # 청크 하나 완료 (provisional이면 done의 remap으로 재번호)
+            ...
+        elif event["type"] == "done":      # 병합된 최종 결과 (기존 단일 호출 JSON과 같은 구조)
+            result = event["result"]
+"""
+
+import json
+import math
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from . import llm_clients
+
+CHUNK_THRESHOLD = int(os.environ.get("ANALYZE_CHUNK_THRESHOLD", "9000"))  # 이 글자 수 이하는 단일 호출
+CHUNK_TARGET = int(os.environ.get("ANALYZE_CHUNK_TARGET", "6000"))        # 청크당 목표 글자 수
+MAX_WORKERS = int(os.environ.get("ANALYZE_MAX_WORKERS", "4"))
+MAP_ATTEMPTS = 2
+ANALYZE_MODEL = "gpt-4o"
+JSON_ONLY = "\n\nIMPORTANT: Respond ONLY with valid JSON. No other text, just pure JSON output."
+
+_SENTENCE_RE = re.compile(r"(?<=[.!?。！？…\"”'])\s+|\n+")
+
+
+def parse_json_response(result_text):
+    """LLM JSON 응답 파싱 (코드블록/trailing comma 정리)"""
+    result_text = (result_text or "").strip()
+    if result_text.startswith("```"):
+        result_text = result_text.split("```")[1]
+        if result_text.startswith("json"):
+            result_text = result_text[4:]
+    result_text = result_text.strip()
+    result_text = re.sub(r',\s*\]', ']', result_text)
+    result_text = re.sub(r',\s*\}', '}', result_text)
+    return json.loads(result_text)
+
+
+def _split_units(script):
+    """문장 단위 조각 (원문 그대로 이어 붙일 수 있도록 구분자 포함)"""
+    units, last = [], 0
+    for match in _SENTENCE_RE.finditer(script):
+        units.append(script[last:match.end()])
+        last = match.end()
+    if last < len(script):
+        units.append(script[last:])
+    return [u for u in units if u.strip()]
+
+
+def _allocate_scenes(lengths, image_count):
+    """청크 글자 수에 비례해 씬 수 배분 (최대 잔여법, 청크당 최소 1개)"""
+    total = sum(lengths) or 1
+    raw = [image_count * length / total for length in lengths]
+    counts = [max(1, int(r)) for r in raw]
+    remainders = sorted(range(len(raw)), key=lambda i: raw[i] - int(raw[i]), reverse=True)
+    i = 0
+    while sum(counts) < image_count:
+        counts[remainders[i % len(remainders)]] += 1
+        i += 1
+    while sum(counts) > image_count:
+        largest = max(range(len(counts)), key=lambda j: counts[j])
+        counts[largest] -= 1
+    return counts
+
+
+def plan_chunks(script, image_count, threshold=None, target=None):
+    """
+    대본을 문장 경계에서 청크로 분할
+
+    Returns:
+        [{"index", "text", "scene_count", "first_scene"}, ...] - 짧은 대본은 청크 1개
+    """
+    threshold = CHUNK_THRESHOLD if threshold is None else threshold
+    target = CHUNK_TARGET if target is None else target
+
+    if len(script) <= threshold or image_count < 2:
+        return [{"index": 0, "text": script, "scene_count": image_count, "first_scene": 1}]
+
+    chunk_count = max(2, min(image_count, math.ceil(len(script) / target)))
+    units = _split_units(script)
+    per_chunk = len(script) / chunk_count
+
+    texts, current = [], ""
+    for unit in units:
+        current += unit
+        if len(texts) < chunk_count - 1 and len(current) >= per_chunk:
+            texts.append(current)
+            current = ""
+    if current.strip():
+        texts.append(current)
+
+    counts = _allocate_scenes([len(t) for t in texts], image_count)
+    chunks, first_scene = [], 1
+    for index, (text, count) in enumerate(zip(texts, counts)):
+        chunks.append({"index": index, "text": text, "scene_count": count, "first_scene": first_scene})
+        first_scene += count
+    return chunks
+
+
+def _map_instruction(chunk, chunk_total, image_count):
+    last_scene = chunk["first_scene"] + chunk["scene_count"] - 1
+    return f"""
+
+★★★ PARTIAL SCRIPT ({chunk['index'] + 1}/{chunk_total}) ★★★
+The script above is PART {chunk['index'] + 1} of {chunk_total} of a longer script ({image_count} scenes in total).
+- Generate ONLY scenes {chunk['first_scene']}~{last_scene} for this part ("scene_number" starts at {chunk['first_scene']})
+- Output ONLY {{"scenes": [...]}} - DO NOT output thumbnail, youtube, video_effects (generated separately)"""
+
+
+def _reduce_instruction(chunks):
+    ranges = "\n".join(
+        f"- Scenes {c['first_scene']}~{c['first_scene'] + c['scene_count'] - 1}: "
+        f"part starting with \"{c['text'].strip()[:40]}...\""
+        for c in chunks
+    )
+    return f"""
+
+★★★ METADATA ONLY ★★★
+Scene narrations and image prompts are being generated separately.
+Return "scenes": [] and fill ALL other fields (thumbnail, youtube, video_effects, detected_category).
+Scene boundaries (use these scene numbers in video_effects):
+{ranges}"""
+
+
+def _call(client, system_prompt, user_prompt, model, require_key=None, no_cache=False):
+    """
+    JSON 응답 호출 - 파싱 실패(또는 require_key 값이 비어 있음)면 캐시에서 응답을 버리고 예외
+
+    no_cache: 재시도 시 캐시된 응답을 건너뜀 (llm_clients 래퍼일 때만 전달)
+    """
+    extra = {"_no_cache": True} if no_cache and isinstance(client, llm_clients.LLMClient) else {}
+    response = client.chat.completions.create(
+        model=model,
+        messages=[
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": user_prompt + JSON_ONLY}
+        ],
+        temperature=0.7,
+        max_tokens=16384,
+        response_format={"type": "json_object"},
+        **extra
+    )
+    if response.choices[0].finish_reason == "length":
+        print("[IMAGE-ANALYZE] ⚠️ 경고: 응답이 max_tokens에 의해 잘렸습니다")
+    try:
+        result = parse_json_response(response.choices[0].message.content)
+        if require_key and not (isinstance(result, dict) and result.get(require_key)):
+            raise ValueError(f"'{require_key}' 없음")
+    except ValueError:
+        llm_clients.invalidate(response)
+        raise
+    return result
+
+
+def _map_chunk(client, system_prompt, build_user_prompt, chunk, chunk_total, image_count, model):
+    """청크 하나 분석 (실패 시 캐시를 건너뛰고 1회 재시도 - 한 청크 실패가 전체를 잃지 않도록)"""
+    prompt = build_user_prompt(chunk["text"], chunk["scene_count"]) + _map_instruction(chunk, chunk_total, image_count)
+    last_error = None
+    for attempt in range(MAP_ATTEMPTS):
+        try:
+            return _call(client, system_prompt, prompt, model, require_key="scenes", no_cache=attempt > 0)["scenes"]
+        except Exception as e:
+            last_error = e
+        print(f"[IMAGE-ANALYZE] 청크 {chunk['index'] + 1} 실패 (시도 {attempt + 1}/{MAP_ATTEMPTS}): {last_error}")
+    raise RuntimeError(f"청크 {chunk['index'] + 1}/{chunk_total} 분석 실패: {last_error}")
+
+
+def _reduce_meta(client, system_prompt, build_user_prompt, script, image_count, chunks, model):
+    """
+    메타데이터 호출 (청크와 같은 재시도 - 실패 시 캐시를 건너뛰고 1회 재시도)
+
+    Returns:
+        (메타데이터 dict, 오류 메시지) - 모두 실패하면 ({}, 오류)로 돌려줘 끝난 씬 결과는 살림
+    """
+    prompt = build_user_prompt(script, image_count) + _reduce_instruction(chunks)
+    last_error = None
+    for attempt in range(MAP_ATTEMPTS):
+        try:
+            return _call(client, system_prompt, prompt, model, no_cache=attempt > 0), None
+        except Exception as e:
+            last_error = e
+        print(f"[IMAGE-ANALYZE] 메타데이터 실패 (시도 {attempt + 1}/{MAP_ATTEMPTS}): {last_error}")
+    return {}, str(last_error)
+
+
+def iter_chunked_analysis(client, system_prompt, build_user_prompt, script, image_count,
+                          model=ANALYZE_MODEL, max_workers=None, chunks=None):
+    """
+    청크 map + 메타데이터 reduce를 동시에 실행하며 이벤트를 순서대로 내보냄
+
+    Args:
+        client: chat.completions.create를 제공하는 클라이언트
+        system_prompt: 기존 단일 호출과 같은 시스템 프롬프트
+        build_user_prompt: (대본, 씬 수) → 사용자 프롬프트 (기존 템플릿 재사용)
+        chunks: plan_chunks 결과 (없으면 새로 계산)
+
+    Yields:
+        {"type": "scenes", "chunk": i, "first_scene": n, "provisional": bool, "scenes": [...]}
+            - 청크 완료 순서대로. 앞 청크가 모두 끝났으면 실제 씬 수로 번호를 매겨 최종 번호와 같음
+              (provisional=False), 아니면 계획 배분 기준 임시 번호 (provisional=True, 청크가 계획보다
+              많거나 적은 씬을 돌려주면 겹치거나 빌 수 있음)
+        {"type": "meta", "data": {...}}                  - 메타데이터 완료 (재시도까지 실패하면 생략,
+                                                            done 결과에 meta_error만 남김)
+        {"type": "done", "result": {...}, "remap": {i: n}}
+            - 병합 결과 (scenes 1..N 재번호). remap은 청크별 최종 첫 씬 번호 -
+              임시 번호로 받은 씬은 remap[chunk] + (청크 안 순서)로 다시 매김
+    """
+    chunks = chunks or plan_chunks(script, image_count)
+    workers = min(len(chunks), max_workers or MAX_WORKERS) + 1  # +1: 메타데이터 호출은 항상 동시에
+    print(f"[IMAGE-ANALYZE] 청크 분석: {len(script):,}자 → {len(chunks)}개 청크 "
+          f"({[c['scene_count'] for c in chunks]}씬), 동시 {workers}개")
+
+    scenes_by_chunk = {}
+    meta, meta_error = {}, None
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="analyze") as executor:
+        futures = {
+            executor.submit(_reduce_meta, client, system_prompt, build_user_prompt,
+                            script, image_count, chunks, model): "meta"
+        }
+        for chunk in chunks:
+            future = executor.submit(_map_chunk, client, system_prompt, build_user_prompt,
+                                     chunk, len(chunks), image_count, model)
+            futures[future] = chunk["index"]
+
+        for future in as_completed(futures):
+            key = futures[future]
+            if key == "meta":
+                meta, meta_error = future.result()
+                if meta_error:
+                    print(f"[IMAGE-ANALYZE] ⚠️ 메타데이터 없이 씬 결과만 반환: {meta_error}")
+                    continue
+                yield {"type": "meta", "data": meta}
+                continue
+
+            chunk = chunks[key]
+            scenes = future.result()
+            scenes_by_chunk[key] = scenes
+            provisional = any(index not in scenes_by_chunk for index in range(key))
+            if provisional:
+                first_scene = chunk["first_scene"]
+            else:
+                first_scene = 1 + sum(len(scenes_by_chunk[index]) for index in range(key))
+            if len(scenes) != chunk["scene_count"]:
+                print(f"[IMAGE-ANALYZE] 청크 {key + 1}: 계획 {chunk['scene_count']}씬과 다른 {len(scenes)}씬 반환")
+            print(f"[IMAGE-ANALYZE] 청크 {key + 1}/{len(chunks)} 완료: {len(scenes)}씬")
+            # 병합 때 재번호가 이미 내보낸 씬을 바꾸지 않도록 복사본으로 전달
+            streamed = [dict(scene, scene_number=first_scene + offset) for offset, scene in enumerate(scenes)]
+            yield {"type": "scenes", "chunk": key, "first_scene": first_scene,
+                   "provisional": provisional, "scenes": streamed}
+
+    merged, remap = [], {}
+    for index in sorted(scenes_by_chunk):
+        remap[index] = len(merged) + 1
+        merged.extend(scenes_by_chunk[index])
+    for number, scene in enumerate(merged, 1):
+        scene["scene_number"] = number
+
+    result = dict(meta)
+    result["scenes"] = merged
+    if meta_error:
+        result["meta_error"] = meta_error
+    yield {"type": "done", "result": result, "remap": remap}
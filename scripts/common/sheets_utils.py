@@ -0,0 +1,413 @@
+"""
+Google Sheets / Docs / Drive 공통 모듈 (서비스 계정 인증)
+
+drama_server.py에서 분리된 부수효과 없는 시트 헬퍼 (CLI 파이프라인에서도 import 가능):
+- get_sheets_service_account / get_docs_service_account / get_drive_service_account
+- sheets_read_rows / sheets_update_cell / sheets_batch_update_values: 재시도 포함 읽기/쓰기
+- get_column_mapping / get_row_value / sheets_update_cell_by_header: 헤더 기반 동적 매핑
+
+사용법:
+    from scripts.common.sheets_utils import get_sheets_service_account, sheets_read_rows
+"""
+
+import json
+
+# googleapiclient/google.oauth2는 google_clients에서 첫 서비스 생성 시 import (서버 시작 시간 단축)
+from google_clients import get_service_account_client
+
+SHEETS_BATCH_UPDATE_SIZE = 500    # values.batchUpdate 1회당 최대 range 수
+
+SHEETS_SCOPES = (
+    'https://www.googleapis.com/auth/spreadsheets',
+    'https://www.googleapis.com/auth/spreadsheets.readonly',
+)
+DOCS_SCOPES = (
+    'https://www.googleapis.com/auth/documents',
+    'https://www.googleapis.com/auth/documents.readonly',
+)
+DRIVE_SCOPES = (
+    'https://www.googleapis.com/auth/drive',
+    'https://www.googleapis.com/auth/drive.file',
+)
+
+def get_sheets_service_account():
+    """서비스 계정을 사용하여 Google Sheets API 서비스 객체 반환"""
+    try:
+        # 자격증명/discovery 문서는 프로세스 단위로 캐시, 서비스 객체는 스레드별 재사용
+        service = get_service_account_client('sheets', 'v4', SHEETS_SCOPES)
+        if service is None:
+            print("[SHEETS] GOOGLE_SERVICE_ACCOUNT_JSON 환경변수가 설정되지 않음")
+        return service
+    except json.JSONDecodeError as e:
+        print(f"[SHEETS] 서비스 계정 JSON 파싱 실패: {e}")
+        return None
+    except Exception as e:
+        print(f"[SHEETS] 서비스 계정 인증 실패: {e}")
+        import traceback
+        traceback.print_exc()
+        return None
+
+
+def get_docs_service_account():
+    """서비스 계정을 사용하여 Google Docs API 서비스 객체 반환"""
+    try:
+        # 자격증명/discovery 문서는 프로세스 단위로 캐시, 서비스 객체는 스레드별 재사용
+        service = get_service_account_client('docs', 'v1', DOCS_SCOPES)
+        if service is None:
+            print("[DOCS] GOOGLE_SERVICE_ACCOUNT_JSON 환경변수가 설정되지 않음")
+        return service
+    except json.JSONDecodeError as e:
+        print(f"[DOCS] 서비스 계정 JSON 파싱 실패: {e}")
+        return None
+    except Exception as e:
+        print(f"[DOCS] 서비스 계정 인증 실패: {e}")
+        import traceback
+        traceback.print_exc()
+        return None
+
+
+def get_drive_service_account():
+    """서비스 계정을 사용하여 Google Drive API 서비스 객체 반환"""
+    try:
+        # 자격증명/discovery 문서는 프로세스 단위로 캐시, 서비스 객체는 스레드별 재사용
+        service = get_service_account_client('drive', 'v3', DRIVE_SCOPES)
+        if service is None:
+            print("[DRIVE] GOOGLE_SERVICE_ACCOUNT_JSON 환경변수가 설정되지 않음")
+        return service
+    except json.JSONDecodeError as e:
+        print(f"[DRIVE] 서비스 계정 JSON 파싱 실패: {e}")
+        return None
+    except Exception as e:
+        print(f"[DRIVE] 서비스 계정 인증 실패: {e}")
+        import traceback
+        traceback.print_exc()
+        return None
+
+
+def sheets_read_rows(service, sheet_id, range_name='Sheet1!A:H', max_retries=3):
+    """
+    Google Sheets에서 행 읽기 (재시도 로직 포함)
+    반환: [[row1_values], [row2_values], ...] 또는 None (API 실패 시)
+
+    Note: 빈 시트는 [] 반환, API 실패는 None 반환 (구분 필요)
+
+    2026-01: 429 Rate Limit 에러 처리 추가
+    - Google Sheets API 한도: 60 읽기/분/사용자
+    - 429 에러 시 60초 대기 후 재시도
+    """
+    import time as time_module
+
+    last_error = None
+    for attempt in range(max_retries):
+        try:
+            result = service.spreadsheets().values().get(
+                spreadsheetId=sheet_id,
+                range=range_name
+            ).execute()
+            return result.get('values', [])
+        except Exception as e:
+            last_error = e
+            error_str = str(e).lower()
+
+            # 429 Rate Limit 에러 체크 (별도 처리)
+            is_rate_limit = '429' in error_str or 'rate_limit' in error_str or 'quota exceeded' in error_str
+
+            # 재시도 가능한 일시적 오류 패턴
+            transient_errors = [
+                'authentication backend unknown error',
+                'backend error',
+                'internal error',
+                'service unavailable',
+                'deadline exceeded',
+                'connection reset',
+                'connection refused',
+                'timeout',
+                '500',
+                '502',
+                '503',
+                '504'
+            ]
+
+            is_transient = any(pattern in error_str for pattern in transient_errors)
+
+            if is_rate_limit and attempt < max_retries - 1:
+                # 429 에러: 60초 대기 (분당 쿼터 리셋 대기)
+                wait_time = 65  # 60초 + 여유 5초
+                print(f"[SHEETS] Rate Limit 초과 (시도 {attempt + 1}/{max_retries}), {wait_time}초 후 재시도")
+                time_module.sleep(wait_time)
+            elif is_transient and attempt < max_retries - 1:
+                wait_time = (2 ** attempt) * 2  # 2초, 4초, 8초
+                print(f"[SHEETS] 일시적 오류 발생 (시도 {attempt + 1}/{max_retries}), {wait_time}초 후 재시도: {e}")
+                time_module.sleep(wait_time)
+            else:
+                print(f"[SHEETS] 읽기 실패 (시도 {attempt + 1}/{max_retries}): {e}")
+                if not is_transient and not is_rate_limit:
+                    break  # 재시도 불가능한 오류는 바로 종료
+
+    print(f"[SHEETS] 최종 읽기 실패 (모든 재시도 소진): {last_error}")
+    return None  # API 실패 시 None 반환 (빈 시트 []와 구분)
+
+
+def sheets_update_cell(service, sheet_id, cell_range, value, max_retries=3):
+    """
+    Google Sheets 특정 셀 업데이트 (재시도 로직 포함)
+    cell_range 예시: 'Sheet1!A2' 또는 'Sheet1!G2:H2'
+
+    2026-01: 429 Rate Limit 에러 처리 추가
+    """
+    import time as time_module
+
+    body = {
+        'values': [[value]] if not isinstance(value, list) else [value]
+    }
+
+    last_error = None
+    for attempt in range(max_retries):
+        try:
+            service.spreadsheets().values().update(
+                spreadsheetId=sheet_id,
+                range=cell_range,
+                valueInputOption='RAW',
+                body=body
+            ).execute()
+            return True
+        except Exception as e:
+            last_error = e
+            error_str = str(e).lower()
+
+            # 429 Rate Limit 에러 체크 (별도 처리)
+            is_rate_limit = '429' in error_str or 'rate_limit' in error_str or 'quota exceeded' in error_str
+
+            # 재시도 가능한 일시적 오류 패턴
+            transient_errors = [
+                'authentication backend unknown error',
+                'backend error',
+                'internal error',
+                'service unavailable',
+                'deadline exceeded',
+                'connection reset',
+                'connection refused',
+                'timeout',
+                '500',
+                '502',
+                '503',
+                '504'
+            ]
+
+            is_transient = any(pattern in error_str for pattern in transient_errors)
+
+            if is_rate_limit and attempt < max_retries - 1:
+                # 429 에러: 60초 대기 (분당 쿼터 리셋 대기)
+                wait_time = 65  # 60초 + 여유 5초
+                print(f"[SHEETS] 셀 업데이트 Rate Limit 초과 (시도 {attempt + 1}/{max_retries}), {wait_time}초 후 재시도")
+                time_module.sleep(wait_time)
+            elif is_transient and attempt < max_retries - 1:
+                wait_time = (2 ** attempt) * 2  # 2초, 4초, 8초
+                print(f"[SHEETS] 셀 업데이트 일시적 오류 (시도 {attempt + 1}/{max_retries}), {wait_time}초 후 재시도: {e}")
+                time_module.sleep(wait_time)
+            else:
+                print(f"[SHEETS] 셀 업데이트 실패 (시도 {attempt + 1}/{max_retries}): {e}")
+                if not is_transient and not is_rate_limit:
+                    break
+
+    print(f"[SHEETS] 셀 업데이트 최종 실패: {cell_range} - {last_error}")
+    return False
+
+
+# ========== 시트 동적 매핑 함수들 ==========
+
+def get_all_sheet_names(service, sheet_id):
+    """
+    Google Sheets 파일의 모든 시트(탭) 이름 가져오기
+
+    화이트리스트 방식:
+    - HISTORY: 히스토리 채널
+    - 혈영이세계: 이세계 드라마 채널
+
+    위 두 시트만 허용, 나머지는 모두 제외
+
+    반환: ['HISTORY', '혈영이세계'] 또는 None (실패 시)
+    """
+    # 메인 파이프라인에서 허용할 시트 목록 (화이트리스트)
+    ALLOWED_SHEETS = {'HISTORY', '혈영이세계'}
+
+    try:
+        spreadsheet = service.spreadsheets().get(spreadsheetId=sheet_id).execute()
+        sheets = spreadsheet.get('sheets', [])
+
+        sheet_names = []
+        for sheet in sheets:
+            name = sheet.get('properties', {}).get('title', '')
+            # 화이트리스트에 있는 시트만 허용
+            if name and name in ALLOWED_SHEETS:
+                sheet_names.append(name)
+
+        print(f"[SHEETS] 허용된 시트: {sheet_names} (화이트리스트: {ALLOWED_SHEETS})")
+        return sheet_names
+    except Exception as e:
+        print(f"[SHEETS] 시트 목록 가져오기 실패: {e}")
+        return None
+
+
+def get_column_mapping(headers):
+    """
+    헤더 이름으로 열 인덱스/문자 매핑 생성
+
+    headers: ['상태', '공개설정', '플레이리스트ID', ...]
+    반환: {
+        '상태': {'index': 0, 'letter': 'A'},
+        '공개설정': {'index': 1, 'letter': 'B'},
+        ...
+    }
+    """
+    mapping = {}
+    for idx, header in enumerate(headers):
+        if header:  # 빈 헤더 무시
+            # 열 문자 계산 (0->A, 1->B, ..., 25->Z, 26->AA, ...)
+            col_letter = ''
+            temp_idx = idx
+            while True:
+                col_letter = chr(ord('A') + temp_idx % 26) + col_letter
+                temp_idx = temp_idx // 26 - 1
+                if temp_idx < 0:
+                    break
+
+            mapping[header] = {
+                'index': idx,
+                'letter': col_letter
+            }
+
+    return mapping
+
+
+def get_sheet_channel_id(rows):
+    """
+    시트의 1행에서 채널 ID 추출
+
+    시트 구조:
+    - A1: '채널ID'
+    - B1: 'UCxxxx...'
+
+    반환: 채널 ID 문자열 또는 None
+    """
+    if not rows or len(rows) < 1:
+        return None
+
+    first_row = rows[0]
+    if len(first_row) >= 2 and first_row[0] == '채널ID':
+        return first_row[1].strip() if first_row[1] else None
+
+    return None
+
+
+def get_sheet_account_email(rows):
+    """
+    시트의 1행에서 계정 이메일 추출
+
+    시트 구조:
+    - C1: '계정'
+    - D1: 'user@gmail.com'
+
+    반환: 이메일 문자열 또는 None
+    """
+    if not rows or len(rows) < 1:
+        return None
+
+    first_row = rows[0]
+    if len(first_row) >= 4 and first_row[2] == '계정':
+        return first_row[3].strip() if first_row[3] else None
+
+    return None
+
+
+def get_row_value(row, col_map, header_name, default=''):
+    """
+    헤더 이름으로 행에서 값 가져오기
+
+    row: 데이터 행 리스트
+    col_map: get_column_mapping()의 반환값
+    header_name: 열 이름 (예: '상태', '대본')
+    default: 값이 없을 때 기본값
+    """
+    if header_name not in col_map:
+        return default
+
+    idx = col_map[header_name]['index']
+    if idx < len(row):
+        return row[idx] if row[idx] else default
+    return default
+
+
+def sheets_update_cell_by_header(service, sheet_id, sheet_name, row_num, col_map, header_name, value):
+    """
+    헤더 이름으로 특정 셀 업데이트
+
+    sheet_name: 시트 이름 (예: '뉴스채널')
+    row_num: 행 번호 (1-based)
+    col_map: get_column_mapping()의 반환값
+    header_name: 열 이름 (예: '상태')
+    value: 설정할 값
+    """
+    if header_name not in col_map:
+        print(f"[SHEETS] 경고: 헤더 '{header_name}'을 찾을 수 없음")
+        return False
+
+    col_letter = col_map[header_name]['letter']
+    cell_range = f"'{sheet_name}'!{col_letter}{row_num}"
+
+    return sheets_update_cell(service, sheet_id, cell_range, value)
+
+
+def _chunked(items, size):
+    """리스트를 size 단위로 분할"""
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def sheets_batch_update_values(service, sheet_id, updates, max_retries=3):
+    """
+    여러 셀을 values.batchUpdate로 한 번에 업데이트 (재시도 로직 포함)
+
+    updates: [(cell_range, value), ...] 예: [("'HISTORY'!F1", '구독자: 1,234명')]
+    반환: 업데이트에 성공한 range 수
+    """
+    import time as time_module
+
+    if not updates:
+        return 0
+
+    updated = 0
+    for chunk in _chunked(list(updates), SHEETS_BATCH_UPDATE_SIZE):
+        body = {
+            'valueInputOption': 'RAW',
+            'data': [
+                {'range': cell_range, 'values': [value] if isinstance(value, list) else [[value]]}
+                for cell_range, value in chunk
+            ]
+        }
+
+        for attempt in range(max_retries):
+            try:
+                service.spreadsheets().values().batchUpdate(
+                    spreadsheetId=sheet_id,
+                    body=body
+                ).execute()
+                updated += len(chunk)
+                break
+            except Exception as e:
+                error_str = str(e).lower()
+                is_rate_limit = '429' in error_str or 'rate_limit' in error_str or 'quota exceeded' in error_str
+                is_transient = any(p in error_str for p in (
+                    'backend error', 'internal error', 'service unavailable',
+                    'deadline exceeded', 'connection reset', 'timeout', '500', '502', '503', '504'
+                ))
+
+                if attempt >= max_retries - 1 or not (is_rate_limit or is_transient):
+                    print(f"[SHEETS] 배치 업데이트 실패 ({len(chunk)}개 셀): {e}")
+                    break
+
+                wait_time = 65 if is_rate_limit else (2 ** attempt) * 2
+                print(f"[SHEETS] 배치 업데이트 재시도 (시도 {attempt + 1}/{max_retries}), {wait_time}초 후: {e}")
+                time_module.sleep(wait_time)
+
+    return updated
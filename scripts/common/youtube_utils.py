@@ -0,0 +1,316 @@
+"""
+YouTube 통계 조회 공통 모듈 (CTR 자동화용)
+
+drama_server.py에서 분리된 부수효과 없는 YouTube Data/Analytics API 헬퍼:
+- get_video_ctr_from_analytics / get_video_stats_from_data_api: 영상 단건 조회
+- collect_videos_ctr_batch: 채널 단위 배치 조회 (Analytics 200개, Data API 50개 단위)
+- get_channel_subscriber_count(_cached): 채널 구독자 수
+- extract_video_id_from_url: URL → video ID
+
+사용법:
+    from scripts.common.youtube_utils import collect_videos_ctr_batch, extract_video_id_from_url
+"""
+
+# ========== CTR 자동화 설정 ==========
+CTR_THRESHOLD = 3.0  # CTR 3% 미만이면 제목 변경
+CTR_CHECK_DAYS = 7   # 업로드 후 7일 후부터 CTR 체크
+
+
+def get_video_ctr_from_analytics(youtube_analytics, channel_id, video_id):
+    """
+    YouTube Analytics API로 영상의 CTR (클릭률) 및 조회수/구독자 데이터 조회
+
+    반환: {
+        'ctr': 4.5,  # 클릭률 (%)
+        'impressions': 10000,  # 노출 수
+        'views': 450,  # 총 조회 수 (28일)
+        'views_today': 50,  # 오늘 조회 수
+        'views_yesterday': 45,  # 어제 조회 수
+        'subscribers_gained': 10,  # 구독자 증가
+        'subscribers_lost': 2  # 구독자 감소
+    } 또는 None (실패 시)
+    """
+    from datetime import datetime, timedelta
+
+    try:
+        # 최근 28일간 데이터 조회 (조회수, 구독자 변동)
+        # 참고: impressions, impressionClickThroughRate는 video dimension과 함께 사용 불가
+        end_date = datetime.now().strftime('%Y-%m-%d')
+        start_date = (datetime.now() - timedelta(days=28)).strftime('%Y-%m-%d')
+
+        response = youtube_analytics.reports().query(
+            ids=f'channel=={channel_id}',
+            startDate=start_date,
+            endDate=end_date,
+            metrics='views,subscribersGained,subscribersLost',
+            dimensions='video',
+            filters=f'video=={video_id}'
+        ).execute()
+
+        result = {
+            'views': 0,
+            'impressions': 0,  # Analytics API에서 video별 조회 불가
+            'ctr': 0,  # Analytics API에서 video별 조회 불가
+            'subscribers_gained': 0,
+            'subscribers_lost': 0,
+            'views_today': 0,
+            'views_yesterday': 0
+        }
+
+        rows = response.get('rows', [])
+        if rows and len(rows) > 0:
+            # [video_id, views, subscribersGained, subscribersLost]
+            row = rows[0]
+            result['views'] = int(row[1]) if len(row) > 1 else 0
+            result['subscribers_gained'] = int(row[2]) if len(row) > 2 else 0
+            result['subscribers_lost'] = int(row[3]) if len(row) > 3 else 0
+
+        # 오늘과 어제 조회수 별도 조회 (일별 비교용)
+        try:
+            today = datetime.now().strftime('%Y-%m-%d')
+            yesterday = (datetime.now() - timedelta(days=1)).strftime('%Y-%m-%d')
+
+            # 오늘 조회수
+            today_response = youtube_analytics.reports().query(
+                ids=f'channel=={channel_id}',
+                startDate=today,
+                endDate=today,
+                metrics='views',
+                dimensions='video',
+                filters=f'video=={video_id}'
+            ).execute()
+            today_rows = today_response.get('rows', [])
+            if today_rows and len(today_rows) > 0:
+                result['views_today'] = int(today_rows[0][1]) if len(today_rows[0]) > 1 else 0
+
+            # 어제 조회수
+            yesterday_response = youtube_analytics.reports().query(
+                ids=f'channel=={channel_id}',
+                startDate=yesterday,
+                endDate=yesterday,
+                metrics='views',
+                dimensions='video',
+                filters=f'video=={video_id}'
+            ).execute()
+            yesterday_rows = yesterday_response.get('rows', [])
+            if yesterday_rows and len(yesterday_rows) > 0:
+                result['views_yesterday'] = int(yesterday_rows[0][1]) if len(yesterday_rows[0]) > 1 else 0
+
+        except Exception as e:
+            print(f"[CTR] 일별 조회수 조회 오류 (무시됨): {e}")
+
+        return result if result['views'] > 0 or result['impressions'] > 0 else None
+    except Exception as e:
+        print(f"[CTR] Analytics API 오류: {e}")
+        return None
+
+
+def get_channel_subscriber_count(youtube, channel_id):
+    """
+    YouTube Data API로 채널의 총 구독자 수 조회
+
+    반환: 구독자 수 (int) 또는 None (실패 시)
+    """
+    try:
+        response = youtube.channels().list(
+            part='statistics',
+            id=channel_id
+        ).execute()
+
+        items = response.get('items', [])
+        if items and len(items) > 0:
+            stats = items[0].get('statistics', {})
+            subscriber_count = stats.get('subscriberCount', '0')
+            return int(subscriber_count)
+
+        return None
+    except Exception as e:
+        print(f"[CTR] 채널 구독자 수 조회 오류: {e}")
+        return None
+
+
+def get_video_stats_from_data_api(youtube, video_id):
+    """
+    YouTube Data API v3로 영상의 조회수/좋아요 등 조회 (공개 정보)
+
+    Analytics API가 권한 문제로 실패할 때 fallback으로 사용
+
+    반환: {'views': 123, 'likes': 10, 'comments': 5} 또는 None
+    """
+    try:
+        response = youtube.videos().list(
+            part='statistics',
+            id=video_id
+        ).execute()
+
+        items = response.get('items', [])
+        if items and len(items) > 0:
+            stats = items[0].get('statistics', {})
+            return {
+                'views': int(stats.get('viewCount', 0)),
+                'likes': int(stats.get('likeCount', 0)),
+                'comments': int(stats.get('commentCount', 0))
+            }
+        return None
+    except Exception as e:
+        print(f"[CTR] Data API 영상 통계 조회 오류: {e}")
+        return None
+
+
+# ========== CTR 배치 수집 (채널별 묶음 조회) ==========
+ANALYTICS_VIDEO_BATCH_SIZE = 200  # Analytics API video 필터 1회 최대 ID 수 (maxResults 한도)
+DATA_API_VIDEO_BATCH_SIZE = 50    # videos.list id 파라미터 최대 개수
+
+
+def _chunked(items, size):
+    """리스트를 size 단위로 분할"""
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def _empty_ctr_data():
+    """CTR 결과 기본값 (get_video_ctr_from_analytics와 동일한 키)"""
+    return {
+        'views': 0,
+        'impressions': 0,
+        'ctr': 0,
+        'subscribers_gained': 0,
+        'subscribers_lost': 0,
+        'views_today': 0,
+        'views_yesterday': 0
+    }
+
+
+def _query_analytics_by_videos(youtube_analytics, channel_id, video_ids, start_date, end_date, metrics):
+    """
+    여러 영상을 video==id1,id2,... 필터 한 번으로 조회
+
+    반환: {video_id: [metric1, metric2, ...]}
+    """
+    response = youtube_analytics.reports().query(
+        ids=f'channel=={channel_id}',
+        startDate=start_date,
+        endDate=end_date,
+        metrics=metrics,
+        dimensions='video',
+        filters='video==' + ','.join(video_ids),
+        sort=f"-{metrics.split(',')[0]}",
+        maxResults=len(video_ids)
+    ).execute()
+
+    values = {}
+    for row in response.get('rows', []) or []:
+        if row:
+            values[row[0]] = row[1:]
+    return values
+
+
+def collect_videos_ctr_batch(youtube, youtube_analytics, channel_id, video_ids):
+    """
+    채널 단위로 여러 영상의 CTR/조회수/구독 데이터를 묶어서 조회
+
+    - Analytics API: video 필터에 최대 200개 ID를 묶어 28일/오늘/어제 3회 쿼리
+    - Analytics 결과가 없는 영상은 Data API videos.list (50개 단위)로 조회수만 보충
+
+    반환: {video_id: ctr_data} (get_video_ctr_from_analytics와 같은 형식, 조회 실패 영상은 제외)
+    """
+    from datetime import datetime, timedelta
+
+    unique_ids = list(dict.fromkeys(v for v in video_ids if v))
+    results = {}
+    if not unique_ids:
+        return results
+
+    now = datetime.now()
+    end_date = now.strftime('%Y-%m-%d')
+    start_date = (now - timedelta(days=28)).strftime('%Y-%m-%d')
+    yesterday = (now - timedelta(days=1)).strftime('%Y-%m-%d')
+
+    if youtube_analytics is not None:
+        for chunk in _chunked(unique_ids, ANALYTICS_VIDEO_BATCH_SIZE):
+            try:
+                totals = _query_analytics_by_videos(
+                    youtube_analytics, channel_id, chunk, start_date, end_date,
+                    'views,subscribersGained,subscribersLost'
+                )
+            except Exception as e:
+                print(f"[CTR] Analytics API 배치 오류 ({len(chunk)}개): {e}")
+                continue
+
+            for video_id, row in totals.items():
+                data = _empty_ctr_data()
+                data['views'] = int(row[0]) if len(row) > 0 else 0
+                data['subscribers_gained'] = int(row[1]) if len(row) > 1 else 0
+                data['subscribers_lost'] = int(row[2]) if len(row) > 2 else 0
+                results[video_id] = data
+
+            # 오늘/어제 조회수 (일별 비교용) - 실패해도 28일 데이터는 유지
+            try:
+                for day, key in ((end_date, 'views_today'), (yesterday, 'views_yesterday')):
+                    daily = _query_analytics_by_videos(
+                        youtube_analytics, channel_id, chunk, day, day, 'views'
+                    )
+                    for video_id, row in daily.items():
+                        if video_id in results and row:
+                            results[video_id][key] = int(row[0])
+            except Exception as e:
+                print(f"[CTR] 일별 조회수 배치 조회 오류 (무시됨): {e}")
+
+        # 기존 단건 함수와 동일하게 조회수 0인 결과는 실패로 취급
+        results = {vid: data for vid, data in results.items()
+                   if data['views'] > 0 or data['impressions'] > 0}
+
+    # Analytics API 실패/누락 영상은 Data API로 조회수만 가져오기 (fallback)
+    missing = [vid for vid in unique_ids if vid not in results]
+    if missing and youtube is not None:
+        for chunk in _chunked(missing, DATA_API_VIDEO_BATCH_SIZE):
+            try:
+                response = youtube.videos().list(
+                    part='statistics',
+                    id=','.join(chunk),
+                    maxResults=len(chunk)
+                ).execute()
+            except Exception as e:
+                print(f"[CTR] Data API 영상 통계 배치 조회 오류 ({len(chunk)}개): {e}")
+                continue
+
+            for item in response.get('items', []):
+                stats = item.get('statistics', {})
+                data = _empty_ctr_data()
+                data['views'] = int(stats.get('viewCount', 0))
+                results[item.get('id')] = data
+        print(f"[CTR] Data API fallback 사용: {len(missing)}개 요청")
+
+    return results
+
+
+def get_channel_subscriber_count_cached(youtube, channel_id, cache):
+    """
+    실행 단위 캐시를 사용하는 채널 구독자 수 조회
+
+    cache: 호출자가 한 번의 실행 동안 유지하는 dict (채널ID → 구독자 수)
+    """
+    if channel_id not in cache:
+        cache[channel_id] = get_channel_subscriber_count(youtube, channel_id)
+    return cache[channel_id]
+
+
+def extract_video_id_from_url(url):
+    """YouTube URL에서 video ID 추출"""
+    import re
+
+    if not url:
+        return None
+
+    # 다양한 YouTube URL 형식 지원
+    patterns = [
+        r'(?:youtube\.com/watch\?v=|youtu\.be/|youtube\.com/embed/)([a-zA-Z0-9_-]{11})',
+        r'(?:youtube\.com/shorts/)([a-zA-Z0-9_-]{11})'
+    ]
+
+    for pattern in patterns:
+        match = re.search(pattern, url)
+        if match:
+            return match.group(1)
+
+    return None
@@ -6,11 +6,16 @@
 - 한국민족문화대백과사전, 국립중앙박물관 e뮤지엄 등
 - 실제 내용을 추출하여 Opus에게 전달
 
-수집 소스:
+수집 소스 (모두 동시 검색, 호스트별 속도 제한):
 - Gemini Grounding (Google Search) - 우선 사용
 - 한국민족문화대백과사전 (encykorea.aks.ac.kr) - 웹 접근
-- 국립중앙박물관 e뮤지엄 (API 키 필요)
 - 국사편찬위원회 한국사DB (db.history.go.kr)
+- 문화재청 국가문화유산포털 (heritage.go.kr)
+- 국립중앙박물관 e뮤지엄 (API 키 필요)
+- 위키백과/나무위키 - HISTORY_SOURCES로 켤 때만
+
+검색 결과 본문은 결과가 나오는 즉시 동시에 받아오고, 받은 문서와 검색 결과는 로컬 참고자료 코퍼스
+(scripts/common/reference_corpus.py, FTS5 전문 검색)에 저장 → 같은 검색/문서는 만료(기본 7일) 전까지 네트워크 없이 응답
 """
 
 import os
@@ -18,10 +23,16 @@ import re
 import time
 import html
 import json
+import inspect
+import functools
+import threading
 import requests
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timezone
 from typing import List, Dict, Any, Optional
-from urllib.parse import quote_plus
+from urllib.parse import quote_plus, urlparse
+
+from scripts.common import reference_corpus
 
 from .config import (
     ERAS,
@@ -31,6 +42,143 @@ from .config import (
 )
 
 
+# ============================================================
+# 동시 수집 엔진: 호스트별 속도 제한 + 로컬 참고자료 코퍼스
+# ============================================================
+
+# 호스트별 요청 간 최소 간격 (초) - 소스끼리는 독립, 같은 호스트는 순서대로 슬롯 예약
+HOST_RATE_LIMITS = {
+    "html.duckduckgo.com": 1.0,        # 대백과사전/한국사DB site: 검색 공용 (봇 감지 민감)
+    "encykorea.aks.ac.kr": 0.3,
+    "db.history.go.kr": 0.3,
+    "www.museum.go.kr": 0.3,
+    "www.heritage.go.kr": 0.3,
+    "ko.wikipedia.org": 0.1,
+    "namu.wiki": 0.5,
+}
+DEFAULT_RATE_LIMIT = 0.3
+
+COLLECT_WORKERS = int(os.environ.get("HISTORY_COLLECT_WORKERS", "8"))   # 소스×키워드 검색 동시 실행 수
+CONTENT_WORKERS = int(os.environ.get("HISTORY_CONTENT_WORKERS", "6"))   # 검색 결과 본문 동시 수집 수
+MAX_MATERIALS = int(os.environ.get("HISTORY_MAX_MATERIALS", "10"))      # Opus에 넘길 최대 자료 수
+
+# 수집 소스 (앞쪽이 우선순위 높음)
+# 위키백과/나무위키는 객관성 문제로 기본 제외 - HISTORY_SOURCES에 추가하면 사용
+SOURCE_ORDER = ["grounding", "encykorea", "history_db", "heritage", "emuseum", "wikipedia", "namu"]
+DEFAULT_SOURCES = "grounding,encykorea,history_db,heritage,emuseum"
+
+PAGE_CACHE_TTL = int(os.environ.get("HISTORY_PAGE_CACHE_TTL", str(7 * 86400)))  # 사료 페이지는 거의 안 바뀜
+
+_rate_lock = threading.Lock()
+_next_request_time = {}
+_content_pool = None
+_content_pool_lock = threading.Lock()
+
+
+def _http_get(url: str, **kwargs) -> requests.Response:
+    """호스트별 속도 제한을 지키는 requests.get"""
+    host = urlparse(url).netloc
+    delay = HOST_RATE_LIMITS.get(host, DEFAULT_RATE_LIMIT)
+    with _rate_lock:
+        now = time.time()
+        slot = max(now, _next_request_time.get(host, 0.0))
+        _next_request_time[host] = slot + delay
+    if slot > now:
+        time.sleep(slot - now)
+    return requests.get(url, **kwargs)
+
+
+def _page_cached(fetch_func):
+    """
+    본문 추출 함수 결과를 URL(또는 제목)별로 로컬 코퍼스에 저장 (PAGE_CACHE_TTL)
+
+    에피소드를 다시 수집하거나 같은 시대의 다른 에피소드가 같은 문서를 참조하면 네트워크 없이 응답.
+    내용을 못 얻은 경우(None)는 저장하지 않음.
+    """
+    source = f"page:{fetch_func.__name__.strip('_')}"
+
+    @functools.wraps(fetch_func)
+    def wrapper(key, *args, **kwargs):
+        doc = reference_corpus.get(source, key, max_age=PAGE_CACHE_TTL)
+        if doc and doc["content"]:
+            return doc["content"]
+
+        content = fetch_func(key, *args, **kwargs)
+        if content:
+            reference_corpus.put(source, key, content=content,
+                                 url=key if key.startswith("http") else "")
+        return content
+
+    return wrapper
+
+
+def _corpus_search(source: str, local_search: bool = True):
+    """
+    검색 함수 결과를 로컬 코퍼스에서 먼저 찾기
+
+    1. 같은 검색어로 받은 결과가 있으면 그대로 재현 (문서가 하나라도 만료됐으면 다시 검색)
+    2. 없으면 이 소스에 저장된 문서 중 검색어가 모두 제목에 있는 문서를 찾아 max_results개 이상이면 그 문서로 응답
+       (본문에만 스치듯 나오는 trigram 일치로 네트워크 검색을 대신하지 않도록)
+    3. 그래도 부족하면 네트워크 검색 → 결과 문서와 검색어를 코퍼스에 저장
+    빈 결과는 저장하지 않음 (일시적 차단/오류일 수 있음)
+    """
+    def decorator(search_func):
+        signature = inspect.signature(search_func)
+
+        @functools.wraps(search_func)
+        def wrapper(*args, **kwargs):
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            query = json.dumps(list(bound.arguments.values()), ensure_ascii=False)
+            max_results = bound.arguments.get("max_results", 3)
+
+            docs = reference_corpus.get_search(source, query, max_age=PAGE_CACHE_TTL)
+            if docs is None and local_search:
+                keyword = next(iter(bound.arguments.values()), "")   # 첫 인자 = 검색어 (키워드 인자로 불려도)
+                docs = reference_corpus.search(keyword, source=source, limit=max_results,
+                                               max_age=PAGE_CACHE_TTL, title_match=True)
+                if len(docs) < max_results:
+                    docs = None
+            if docs:
+                return [dict(doc["meta"], title=doc["title"], url=doc["url"], content=doc["content"]) for doc in docs]
+
+            items = search_func(*args, **kwargs)
+            if items:
+                keys = []
+                for item in items:
+                    key = item.get("url") or item.get("title", "")
+                    if not key:
+                        continue
+                    meta = {k: v for k, v in item.items() if k not in ("title", "url", "content")}
+                    reference_corpus.put(source, key, title=item.get("title", ""), content=item.get("content", ""),
+                                         url=item.get("url", ""), meta=meta)
+                    keys.append(key)
+                reference_corpus.put_search(source, query, keys)
+            return items
+
+        return wrapper
+
+    return decorator
+
+
+def _prefetch_pages(fetch_func, keys: List[str], *args) -> Dict[str, Any]:
+    """
+    검색 결과가 나오는 즉시 본문 수집을 공용 풀에 제출 ({키: Future})
+
+    검색 함수는 결과 순서대로 .result()만 기다리면 되고, 그동안 다른 결과의 본문도 함께 받아짐.
+    (검색 작업 풀과 분리된 풀이라 검색 작업이 본문을 기다려도 교착되지 않음)
+    """
+    global _content_pool
+    with _content_pool_lock:
+        if _content_pool is None:
+            _content_pool = ThreadPoolExecutor(max_workers=CONTENT_WORKERS, thread_name_prefix="history-content")
+    futures = {}
+    for key in keys:
+        if key not in futures:
+            futures[key] = _content_pool.submit(fetch_func, key, *args)
+    return futures
+
+
 def _search_with_gemini_grounding(
     query: str,
     era_name: str = "",
@@ -194,12 +342,76 @@ def _search_with_gemini_grounding(
     return items
 
 
+def _enabled_sources() -> List[str]:
+    names = os.environ.get("HISTORY_SOURCES", DEFAULT_SOURCES)
+    return [name.strip() for name in names.split(",") if name.strip() in SOURCE_ORDER]
+
+
+def _collect_from_sources(search_query: str, era_name: str, keywords: List[str]) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    모든 소스 × 키워드 검색을 동시에 실행 ({소스: [자료, ...]}, 키워드 순서 유지)
+
+    각 검색은 호스트별 속도 제한(_http_get)만 지키고 서로 기다리지 않으며,
+    검색 결과의 본문 수집은 결과가 나오는 즉시 본문 풀에서 시작됩니다.
+    → 전체 소요 시간 ≈ 가장 느린 소스 하나
+    """
+    tasks = []  # (소스, 표시 이름, 함수, 인자)
+    for source in _enabled_sources():
+        if source == "grounding":
+            tasks.append((source, "Gemini Grounding", _search_with_gemini_grounding, (search_query, era_name, 3)))
+        elif source == "encykorea":
+            tasks += [(source, f"대백과사전 '{kw}'", _search_encykorea, (kw, 2)) for kw in keywords[:3]]
+        elif source == "history_db":
+            tasks += [(source, f"한국사DB '{kw}'", _search_history_db, (kw, 2)) for kw in keywords[:2]]
+        elif source == "heritage":
+            tasks += [(source, f"문화재청 '{kw}'", _search_heritage, (kw, 2)) for kw in keywords[:2]]
+        elif source == "emuseum":
+            tasks.append((source, "국립중앙박물관", _search_emuseum, (era_name, keywords[:3], 3)))
+        elif source == "wikipedia":
+            tasks += [(source, f"위키백과 '{kw}'", _search_wikipedia_ko, (kw, 1)) for kw in keywords[:2]]
+        elif source == "namu":
+            tasks += [(source, f"나무위키 '{kw}'", _search_namu_wiki, (kw, 1)) for kw in keywords[:2]]
+
+    if not tasks:
+        return {}
+
+    started = time.time()
+    task_results = {}
+    workers = max(1, min(len(tasks), COLLECT_WORKERS))
+    print(f"[HISTORY] {len(tasks)}개 검색 동시 실행 (소스: {', '.join(_enabled_sources())}, 동시 {workers}개)")
+
+    def _run(func, args):
+        t0 = time.time()
+        return func(*args), time.time() - t0
+
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="history-search") as executor:
+        futures = {executor.submit(_run, func, args): index for index, (_, _, func, args) in enumerate(tasks)}
+        for future in as_completed(futures):
+            index = futures[future]
+            label = tasks[index][1]
+            try:
+                items, elapsed = future.result()
+            except Exception as e:
+                print(f"[HISTORY] {label} 실패: {e}")
+                items, elapsed = [], 0.0
+            task_results[index] = items
+            print(f"[HISTORY] {label}: {len(items)}개 ({elapsed:.1f}초)")
+
+    results_by_source = {}
+    for index, (source, _, _, _) in enumerate(tasks):
+        results_by_source.setdefault(source, []).extend(task_results.get(index, []))
+
+    total = sum(len(items) for items in results_by_source.values())
+    print(f"[HISTORY] 전체 검색 완료: {total}개 자료, {time.time() - started:.1f}초")
+    return results_by_source
+
+
 def collect_topic_materials(
     era: str,
     episode: int,
 ) -> Dict[str, Any]:
     """
-    주제별 자료 수집 (4개 공신력 있는 소스에서 수집)
+    주제별 자료 수집 (공신력 있는 소스를 동시에 검색)
 
     Args:
         era: 시대 키 (예: "GOJOSEON")
@@ -243,53 +455,28 @@ def collect_topic_materials(
     print(f"[HISTORY] 키워드: {', '.join(keywords[:5])}")
 
     # ★ 2025-01 변경: 공신력 있는 소스만 사용
-    # 위키백과/나무위키 제외 (객관성 문제)
+    # 위키백과/나무위키 제외 (객관성 문제) - HISTORY_SOURCES로 명시해야 사용
     # 자료 수집 실패해도 GPT의 기존 지식으로 대본 생성 가능
-    all_materials = []
-    all_sources = []
-
-    # ★ 0. Gemini Grounding (Google Search) - 최우선
-    # DuckDuckGo 차단 문제 해결을 위해 Gemini의 Google Search 활용
-    print(f"[HISTORY] ========== 자료 수집 시작 ==========")
-    print(f"[HISTORY] [1/3] Gemini Grounding 검색...")
     search_query = f"{topic_info['title']} {' '.join(keywords[:3])}"
+    print(f"[HISTORY] ========== 자료 수집 시작 ==========")
     print(f"[HISTORY] 검색어: {search_query}")
-    gemini_items = _search_with_gemini_grounding(search_query, era_name, max_results=3)
-    print(f"[HISTORY] Gemini 결과: {len(gemini_items)}개")
-    for item in gemini_items:
-        if item not in all_materials:
+
+    results_by_source = _collect_from_sources(search_query, era_name, keywords)
+
+    # 소스 우선순위 순서로 병합 (URL 중복 제거, 최대 MAX_MATERIALS개)
+    all_materials = []
+    all_sources = []
+    seen = set()
+    for source in SOURCE_ORDER:
+        for item in results_by_source.get(source, []):
+            key = item.get("url") or item.get("title")
+            if key in seen or len(all_materials) >= MAX_MATERIALS:
+                continue
+            seen.add(key)
             all_materials.append(item)
             if item.get("url") and item["url"] not in all_sources:
                 all_sources.append(item["url"])
 
-    # 1. 한국민족문화대백과사전 (Gemini 결과 부족 시 보조)
-    if len(all_materials) < 3:
-        print(f"[HISTORY] [2/3] 한국민족문화대백과사전 검색 (자료 {len(all_materials)}개 부족)...")
-        for keyword in keywords[:3]:
-            items = _search_encykorea(keyword, max_results=2)
-            for item in items:
-                if item not in all_materials:
-                    all_materials.append(item)
-                    if item.get("url") and item["url"] not in all_sources:
-                        all_sources.append(item["url"])
-            time.sleep(0.3)
-        print(f"[HISTORY] 대백과사전 후 총: {len(all_materials)}개")
-    else:
-        print(f"[HISTORY] [2/3] 한국민족문화대백과사전 스킵 (Gemini 자료 충분)")
-
-    # 2. 국립중앙박물관 (유물 정보 - 선택적)
-    if len(all_materials) < 5:
-        print(f"[HISTORY] [3/3] 국립중앙박물관 검색 (자료 {len(all_materials)}개)...")
-        items = _search_emuseum(era_name, keywords[:3], max_results=3)
-        for item in items:
-            if item not in all_materials:
-                all_materials.append(item)
-                if item.get("url") and item["url"] not in all_sources:
-                    all_sources.append(item["url"])
-        print(f"[HISTORY] 박물관 후 총: {len(all_materials)}개")
-    else:
-        print(f"[HISTORY] [3/3] 국립중앙박물관 스킵 (자료 충분)")
-
     # full_content 생성 (GPT-5.1에 전달할 자료)
     content_parts = []
     for i, material in enumerate(all_materials, 1):
@@ -351,6 +538,7 @@ def _fetch_content_from_url(url: str) -> Optional[str]:
         return None
 
 
+@_page_cached
 def _fetch_encykorea_content(url: str) -> Optional[str]:
     """
     한국민족문화대백과사전에서 내용 추출 (강화 버전)
@@ -364,7 +552,7 @@ def _fetch_encykorea_content(url: str) -> Optional[str]:
             "Accept-Language": "ko-KR,ko;q=0.9,en-US;q=0.8,en;q=0.7",
         }
 
-        response = requests.get(url, headers=headers, timeout=15)
+        response = _http_get(url, headers=headers, timeout=15)
 
         if response.status_code != 200:
             print(f"[HISTORY] 대백과사전 응답 실패: {response.status_code}")
@@ -437,6 +625,7 @@ def _fetch_encykorea_content(url: str) -> Optional[str]:
         return None
 
 
+@_page_cached
 def _fetch_history_db_content(url: str) -> Optional[str]:
     """
     국사편찬위원회 한국사데이터베이스에서 내용 추출
@@ -447,7 +636,7 @@ def _fetch_history_db_content(url: str) -> Optional[str]:
             "Accept": "text/html,application/xhtml+xml",
         }
 
-        response = requests.get(url, headers=headers, timeout=15)
+        response = _http_get(url, headers=headers, timeout=15)
 
         if response.status_code != 200:
             return None
@@ -482,6 +671,7 @@ def _fetch_history_db_content(url: str) -> Optional[str]:
         return None
 
 
+@_page_cached
 def _fetch_generic_content(url: str) -> Optional[str]:
     """
     일반 URL에서 내용 추출 (백업용)
@@ -491,7 +681,7 @@ def _fetch_generic_content(url: str) -> Optional[str]:
             "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36",
         }
 
-        response = requests.get(url, headers=headers, timeout=10)
+        response = _http_get(url, headers=headers, timeout=10)
 
         if response.status_code != 200:
             return None
@@ -525,6 +715,7 @@ def _fetch_generic_content(url: str) -> Optional[str]:
         return None
 
 
+@_corpus_search("wikipedia")
 def _search_wikipedia_ko(keyword: str, max_results: int = 2) -> List[Dict[str, Any]]:
     """
     한국어 위키백과 검색 (User-Agent 수정)
@@ -549,7 +740,7 @@ def _search_wikipedia_ko(keyword: str, max_results: int = 2) -> List[Dict[str, A
             "Accept": "application/json",
         }
 
-        response = requests.get(search_url, params=params, headers=headers, timeout=10)
+        response = _http_get(search_url, params=params, headers=headers, timeout=10)
 
         if response.status_code != 200:
             print(f"[HISTORY] 위키백과 검색 실패: {response.status_code}")
@@ -562,6 +753,8 @@ def _search_wikipedia_ko(keyword: str, max_results: int = 2) -> List[Dict[str, A
             print(f"[HISTORY] 위키백과: '{keyword}' 검색 결과 없음")
             return items
 
+        pages = _prefetch_pages(_fetch_wikipedia_content, [r.get("title", "") for r in search_results])
+
         for result in search_results:
             title = result.get("title", "")
             snippet = result.get("snippet", "")
@@ -570,8 +763,8 @@ def _search_wikipedia_ko(keyword: str, max_results: int = 2) -> List[Dict[str, A
             snippet = re.sub(r'<[^>]+>', '', snippet)
             snippet = html.unescape(snippet)
 
-            # 전체 내용 가져오기
-            content = _fetch_wikipedia_content(title)
+            # 전체 내용 가져오기 (검색 직후 동시 수집 시작됨)
+            content = pages[title].result()
 
             items.append({
                 "title": title,
@@ -588,6 +781,7 @@ def _search_wikipedia_ko(keyword: str, max_results: int = 2) -> List[Dict[str, A
     return items
 
 
+@_page_cached
 def _fetch_wikipedia_content(title: str) -> Optional[str]:
     """
     위키백과 문서 내용 가져오기
@@ -609,7 +803,7 @@ def _fetch_wikipedia_content(title: str) -> Optional[str]:
             "Accept": "application/json",
         }
 
-        response = requests.get(api_url, params=params, headers=headers, timeout=10)
+        response = _http_get(api_url, params=params, headers=headers, timeout=10)
 
         if response.status_code != 200:
             return None
@@ -631,6 +825,7 @@ def _fetch_wikipedia_content(title: str) -> Optional[str]:
         return None
 
 
+@_corpus_search("namu")
 def _search_namu_wiki(keyword: str, max_results: int = 2) -> List[Dict[str, Any]]:
     """
     나무위키 검색 (추가 소스)
@@ -647,7 +842,7 @@ def _search_namu_wiki(keyword: str, max_results: int = 2) -> List[Dict[str, Any]
             "Accept": "text/html,application/xhtml+xml",
         }
 
-        response = requests.get(doc_url, headers=headers, timeout=10, allow_redirects=True)
+        response = _http_get(doc_url, headers=headers, timeout=10, allow_redirects=True)
 
         if response.status_code == 200:
             page_html = response.text
@@ -675,6 +870,7 @@ def _search_namu_wiki(keyword: str, max_results: int = 2) -> List[Dict[str, Any]
     return items
 
 
+@_corpus_search("history_db")
 def _search_history_db(keyword: str, max_results: int = 3) -> List[Dict[str, Any]]:
     """
     국사편찬위원회 한국사데이터베이스 검색 (DuckDuckGo site: 검색 방식)
@@ -694,7 +890,7 @@ def _search_history_db(keyword: str, max_results: int = 3) -> List[Dict[str, Any
             "Accept-Language": "ko-KR,ko;q=0.9,en-US;q=0.8,en;q=0.7",
         }
 
-        response = requests.get(search_url, headers=headers, timeout=15)
+        response = _http_get(search_url, headers=headers, timeout=15)
 
         if response.status_code != 200:
             print(f"[HISTORY] 한국사DB 검색 실패: HTTP {response.status_code}")
@@ -713,6 +909,8 @@ def _search_history_db(keyword: str, max_results: int = 3) -> List[Dict[str, Any
 
         seen_urls = set()
 
+        pages = _prefetch_pages(_fetch_history_db_content, [unquote(u) for u in url_matches[:max_results]])
+
         for i, encoded_url in enumerate(url_matches[:max_results]):
             full_url = unquote(encoded_url)
 
@@ -727,8 +925,8 @@ def _search_history_db(keyword: str, max_results: int = 3) -> List[Dict[str, Any
                 title = html.unescape(text_matches[i][0]).strip()
                 snippet = html.unescape(re.sub(r'<[^>]+>', '', text_matches[i][1])).strip()
 
-            # 직접 접근 시도 (차단될 수 있음)
-            content = _fetch_history_db_content(full_url)
+            # 직접 접근 시도 (차단될 수 있음, 검색 직후 동시 수집 시작됨)
+            content = pages[full_url].result()
 
             # 직접 접근 실패시 스니펫 사용
             if not content and snippet:
@@ -746,8 +944,6 @@ def _search_history_db(keyword: str, max_results: int = 3) -> List[Dict[str, Any
                     "source_name": "국사편찬위원회",
                 })
 
-            time.sleep(0.3)
-
         if not items:
             print(f"[HISTORY] 한국사DB: '{keyword}' 검색 결과 없음")
 
@@ -757,6 +953,7 @@ def _search_history_db(keyword: str, max_results: int = 3) -> List[Dict[str, Any
     return items
 
 
+@_corpus_search("heritage")
 def _search_heritage(keyword: str, max_results: int = 3) -> List[Dict[str, Any]]:
     """
     문화재청 국가문화유산포털 검색
@@ -781,7 +978,7 @@ def _search_heritage(keyword: str, max_results: int = 3) -> List[Dict[str, Any]]
             "Referer": "https://www.heritage.go.kr/heri/cul/culSelectTotalList.do",
         }
 
-        response = requests.get(search_url, params=params, headers=headers, timeout=15)
+        response = _http_get(search_url, params=params, headers=headers, timeout=15)
 
         if response.status_code != 200:
             print(f"[HISTORY] 문화재청 검색 실패: {response.status_code}")
@@ -803,19 +1000,19 @@ def _search_heritage(keyword: str, max_results: int = 3) -> List[Dict[str, Any]]
                 matches.extend(found)
                 break
 
+        pages = _prefetch_pages(_fetch_heritage_content,
+                                [_heritage_full_url(url_path) for url_path, _ in matches[:max_results]])
+
         for url_path, title in matches[:max_results]:
-            if url_path.startswith('/'):
-                full_url = f"https://www.heritage.go.kr{url_path}"
-            else:
-                full_url = url_path
+            full_url = _heritage_full_url(url_path)
 
             title = re.sub(r'<[^>]+>', '', title)  # HTML 태그 제거
             title = html.unescape(title.strip())
             if not title or len(title) < 2:
                 continue
 
-            # 상세 정보 추출
-            content = _fetch_heritage_content(full_url)
+            # 상세 정보 추출 (검색 직후 동시 수집 시작됨)
+            content = pages[full_url].result()
 
             items.append({
                 "title": title,
@@ -826,8 +1023,6 @@ def _search_heritage(keyword: str, max_results: int = 3) -> List[Dict[str, Any]]
             })
             print(f"[HISTORY] 문화재청: {title[:30]}...")
 
-            time.sleep(0.3)
-
         if not items:
             print(f"[HISTORY] 문화재청: '{keyword}' 검색 결과 없음")
 
@@ -837,6 +1032,13 @@ def _search_heritage(keyword: str, max_results: int = 3) -> List[Dict[str, Any]]
     return items
 
 
+def _heritage_full_url(url_path: str) -> str:
+    if url_path.startswith('/'):
+        return f"https://www.heritage.go.kr{url_path}"
+    return url_path
+
+
+@_page_cached
 def _fetch_heritage_content(url: str) -> Optional[str]:
     """
     문화재청 상세 페이지에서 내용 추출
@@ -847,7 +1049,7 @@ def _fetch_heritage_content(url: str) -> Optional[str]:
             "Accept": "text/html,application/xhtml+xml",
         }
 
-        response = requests.get(url, headers=headers, timeout=10)
+        response = _http_get(url, headers=headers, timeout=10)
 
         if response.status_code != 200:
             return None
@@ -903,6 +1105,7 @@ def _fetch_heritage_content(url: str) -> Optional[str]:
         return None
 
 
+@_corpus_search("encykorea")
 def _search_encykorea(keyword: str, max_results: int = 3) -> List[Dict[str, Any]]:
     """
     한국민족문화대백과사전 검색 (DuckDuckGo site: 검색 방식)
@@ -922,7 +1125,7 @@ def _search_encykorea(keyword: str, max_results: int = 3) -> List[Dict[str, Any]
             "Accept-Language": "ko-KR,ko;q=0.9,en-US;q=0.8,en;q=0.7",
         }
 
-        response = requests.get(search_url, headers=headers, timeout=15)
+        response = _http_get(search_url, headers=headers, timeout=15)
 
         # 200, 202 모두 콘텐츠가 있을 수 있음
         if response.status_code not in (200, 202):
@@ -948,6 +1151,7 @@ def _search_encykorea(keyword: str, max_results: int = 3) -> List[Dict[str, Any]
         # URL 디코딩 및 중복 제거
         from urllib.parse import unquote
         seen_urls = set()
+        pages = _prefetch_pages(_fetch_encykorea_content, [unquote(u) for u in url_matches[:max_results]])
 
         for i, encoded_url in enumerate(url_matches[:max_results]):
             full_url = unquote(encoded_url)
@@ -966,8 +1170,8 @@ def _search_encykorea(keyword: str, max_results: int = 3) -> List[Dict[str, Any]
             # 문서 ID 추출
             doc_id_match = re.search(r'Article/(E\d+)', full_url)
             if doc_id_match:
-                # 직접 접근 시도 (차단될 수 있음)
-                content = _fetch_encykorea_content(full_url)
+                # 직접 접근 시도 (차단될 수 있음, 검색 직후 동시 수집 시작됨)
+                content = pages[full_url].result()
 
                 # 직접 접근 실패시 스니펫 사용
                 if not content and snippet:
@@ -985,8 +1189,6 @@ def _search_encykorea(keyword: str, max_results: int = 3) -> List[Dict[str, Any]
                         "source_name": "한국민족문화대백과사전",
                     })
 
-            time.sleep(0.3)
-
         if not items:
             print(f"[HISTORY] 대백과사전: '{keyword}' 검색 결과 없음")
 
@@ -996,6 +1198,7 @@ def _search_encykorea(keyword: str, max_results: int = 3) -> List[Dict[str, Any]
     return items
 
 
+@_corpus_search("emuseum", local_search=False)
 def _search_emuseum(
     era_name: str,
     keywords: List[str],
@@ -1027,7 +1230,7 @@ def _search_emuseum(
             }
 
             print(f"[HISTORY] 국립중앙박물관 검색: {keyword}")
-            response = requests.get(search_url, params=params, headers=headers, timeout=15)
+            response = _http_get(search_url, params=params, headers=headers, timeout=15)
 
             if response.status_code != 200:
                 print(f"[HISTORY] 국립중앙박물관 검색 실패: HTTP {response.status_code}")
@@ -1054,6 +1257,9 @@ def _search_emuseum(
                     if len(matches) >= max_results:
                         break
 
+            pages = _prefetch_pages(_fetch_museum_content,
+                                    [_museum_full_url(url_path) for url_path, _ in matches[:max_results]], headers)
+
             for url_path, title in matches[:max_results]:
                 # 중복 제거
                 title_clean = re.sub(r'<[^>]+>', '', title)
@@ -1066,15 +1272,10 @@ def _search_emuseum(
                     continue
 
                 # URL 정리
-                if url_path.startswith('/'):
-                    full_url = f"https://www.museum.go.kr{url_path}"
-                elif url_path.startswith('http'):
-                    full_url = url_path
-                else:
-                    full_url = f"https://www.museum.go.kr/MUSEUM/contents/{url_path}"
+                full_url = _museum_full_url(url_path)
 
-                # 상세 페이지에서 정보 추출
-                content = _fetch_museum_content(full_url, headers)
+                # 상세 페이지에서 정보 추출 (검색 직후 동시 수집 시작됨)
+                content = pages[full_url].result()
 
                 items.append({
                     "title": title_clean,
@@ -1088,8 +1289,6 @@ def _search_emuseum(
                 if len(items) >= max_results:
                     break
 
-            time.sleep(0.3)
-
         except Exception as e:
             print(f"[HISTORY] 국립중앙박물관 검색 오류 ({keyword}): {e}")
 
@@ -1101,6 +1300,15 @@ def _search_emuseum(
     return items
 
 
+def _museum_full_url(url_path: str) -> str:
+    if url_path.startswith('/'):
+        return f"https://www.museum.go.kr{url_path}"
+    if url_path.startswith('http'):
+        return url_path
+    return f"https://www.museum.go.kr/MUSEUM/contents/{url_path}"
+
+
+@_page_cached
 def _fetch_museum_content(url: str, headers: dict = None) -> Optional[str]:
     """
     국립중앙박물관 상세 페이지에서 유물 정보 추출
@@ -1112,7 +1320,7 @@ def _fetch_museum_content(url: str, headers: dict = None) -> Optional[str]:
                 "Accept": "text/html,application/xhtml+xml",
             }
 
-        response = requests.get(url, headers=headers, timeout=10)
+        response = _http_get(url, headers=headers, timeout=10)
 
         if response.status_code != 200:
             return None
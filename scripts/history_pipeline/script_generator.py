@@ -18,8 +18,8 @@ import json
 import re
 from typing import Dict, Any, Optional, List
 
-# OpenRouter API 사용 (OpenAI 호환)
-from openai import OpenAI
+# OpenRouter API 사용 (OpenAI 호환, 공유 클라이언트 레지스트리)
+from scripts.common.llm_clients import require_client
 
 # OpenRouter 설정
 OPENROUTER_BASE_URL = "https://openrouter.ai/api/v1"
@@ -316,10 +316,7 @@ def generate_script_by_parts(
     print(f"[SCRIPT] 다음 에피소드 예고: {'있음' if next_episode_info else '없음(마지막 화)'}")
 
     try:
-        client = OpenAI(
-            api_key=api_key,
-            base_url=OPENROUTER_BASE_URL,
-        )
+        client = require_client("openrouter", api_key=api_key)  # 공유 클라이언트 (keep-alive)
 
         # ========================================
         # Part 1: 인트로 (도입부) - 1,000자
@@ -1346,10 +1343,7 @@ def generate_script_gpt51(
 """
 
     try:
-        client = OpenAI(
-            api_key=api_key,
-            base_url=OPENROUTER_BASE_URL,
-        )
+        client = require_client("openrouter", api_key=api_key)  # 공유 클라이언트 (keep-alive)
 
         print(f"[SCRIPT] Claude Opus 4.5 대본 생성 시작 (OpenRouter)...")
         print(f"[SCRIPT] 입력 자료: {len(full_content):,}자")
@@ -1492,10 +1486,7 @@ def _continue_script(
 """
 
     try:
-        client = OpenAI(
-            api_key=api_key,
-            base_url=OPENROUTER_BASE_URL,
-        )
+        client = require_client("openrouter", api_key=api_key)  # 공유 클라이언트 (keep-alive)
 
         # OpenRouter API 호출 (OpenAI 호환)
         response = client.chat.completions.create(
@@ -233,17 +233,31 @@ def generate_images_batch(
             "failed": []
         }
     """
+    from concurrent.futures import ThreadPoolExecutor
+    from image.gemini import recommended_concurrency
+
     results = {"ok": True, "images": [], "failed": []}
+    if not prompts:
+        return results
+
+    def _generate(item):
+        try:
+            return generate_image(
+                episode_id=episode_id,
+                prompt=item.get("prompt", ""),
+                scene_index=item.get("scene_index", 0),
+            )
+        except Exception as e:
+            return {"ok": False, "error": str(e)}
 
-    for item in prompts:
-        prompt = item.get("prompt", "")
-        scene_index = item.get("scene_index", 0)
+    # Google API 키 풀에 분산하여 동시 생성 (결과는 씬 순서 유지)
+    max_workers = min(len(prompts), recommended_concurrency())
+    print(f"[HISTORY] 이미지 {len(prompts)}개 동시 생성 (워커 {max_workers}개)")
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        outcomes = list(executor.map(_generate, prompts))
 
-        result = generate_image(
-            episode_id=episode_id,
-            prompt=prompt,
-            scene_index=scene_index,
-        )
+    for item, result in zip(prompts, outcomes):
+        scene_index = item.get("scene_index", 0)
 
         if result.get("ok"):
             results["images"].append({
@@ -307,6 +321,10 @@ def render_video(
     from .renderer import render_video as render_single, render_multi_image_video, mix_audio_with_bgm, DEFAULT_BGM_PATH
     from scripts.common.renderer_utils import mix_audio_with_multi_bgm
     from scripts.common.audio_utils import get_audio_duration
+    from scripts.common.audio_mixer import load_srt_timeline
+
+    # 자막 타이밍 = 나레이션 구간 (BGM 더킹용, 없으면 RMS 검출)
+    narration_timeline = load_srt_timeline(srt_path)
 
     # BGM 파일 매핑 (확장)
     base_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -348,6 +366,7 @@ def render_video(
                 bgm_volume=bgm_volume,
                 voice_volume=voice_volume,
                 log_prefix="[HISTORY-RENDERER]",
+                timeline=narration_timeline,
             )
             if mix_result.get("ok"):
                 final_audio_path = mix_result.get("audio_path", mixed_audio_path)
@@ -368,6 +387,7 @@ def render_video(
                 bgm_volume=bgm_volume,
                 voice_volume=voice_volume,
                 log_prefix="[HISTORY-RENDERER]",
+                timeline=narration_timeline,
             )
             if mix_result.get("ok"):
                 final_audio_path = mix_result.get("audio_path", mixed_audio_path)
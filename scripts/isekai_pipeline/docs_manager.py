@@ -25,7 +25,7 @@ def col_index_to_letter(col_idx: int) -> str:
 def get_docs_service():
     """Google Docs 서비스 객체 가져오기"""
     try:
-        from drama_server import get_docs_service_account
+        from scripts.common.sheets_utils import get_docs_service_account
         return get_docs_service_account()
     except ImportError:
         # drama_server에 함수가 없으면 직접 생성
@@ -42,7 +42,7 @@ def get_docs_service():
 def get_drive_service():
     """Google Drive 서비스 객체 가져오기 (폴더 관리용)"""
     try:
-        from drama_server import get_drive_service_account
+        from scripts.common.sheets_utils import get_drive_service_account
         return get_drive_service_account()
     except ImportError:
         try:
@@ -8,9 +8,12 @@
 
 import os
 import base64
+import shutil
 import requests
 from typing import Dict, Any, List
 
+from image import cache as image_cache
+
 
 # Render 서버 URL
 RENDER_API_URL = os.environ.get(
@@ -160,16 +163,31 @@ def generate_image(
     Returns:
         {"ok": True, "image_path": "...", "image_data": bytes}
     """
+    # 0. 캐시 조회 (스타일이 다르면 다른 이미지)
+    cache_prompt = f"{style}|{prompt}"
+    cached_path = image_cache.lookup(cache_prompt, GEMINI_IMAGE_MODEL, aspect_ratio)
+    if cached_path:
+        with open(cached_path, "rb") as f:
+            image_data = f.read()
+        if output_path:
+            os.makedirs(os.path.dirname(output_path) or ".", exist_ok=True)
+            shutil.copyfile(cached_path, output_path)
+            print(f"[HISTORY-IMAGE] 캐시 재사용: {output_path}")
+            return {"ok": True, "image_path": output_path, "image_data": image_data, "cached": True}
+        return {"ok": True, "image_data": image_data, "cached": True}
+
     # 1. Render API 시도 (기본)
     if use_render:
         result = _generate_image_via_render(prompt, output_path, style, aspect_ratio)
         if result.get("ok"):
+            image_cache.store_bytes(cache_prompt, GEMINI_IMAGE_MODEL, aspect_ratio, result.get("image_data"))
             return result
         print(f"[HISTORY-IMAGE] Render API 실패, Gemini 직접 호출 시도...")
 
     # 2. Gemini API 직접 호출 (fallback)
     result = _generate_image_via_gemini(prompt, output_path, style, aspect_ratio)
     if result.get("ok"):
+        image_cache.store_bytes(cache_prompt, GEMINI_IMAGE_MODEL, aspect_ratio, result.get("image_data"))
         return result
     else:
         print(f"[HISTORY-IMAGE] Gemini 직접 호출 실패: {result.get('error')}")
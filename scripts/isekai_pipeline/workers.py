@@ -377,8 +377,8 @@ def _mix_bgm(video_path: str, bgm_mood: str, bgm_volume: float = 0.10) -> Dict[s
         {"ok": True} 또는 {"ok": False, "error": "..."}
     """
     try:
-        # drama_server의 BGM 함수 사용
-        from drama_server import _get_bgm_file, _mix_bgm_with_video
+        # 공통 BGM 함수 사용 (drama_server 전체 로드 없이)
+        from scripts.common.bgm_utils import _get_bgm_file, _mix_bgm_with_video
 
         bgm_file = _get_bgm_file(bgm_mood)
         if not bgm_file:
@@ -403,7 +403,7 @@ def _mix_bgm(video_path: str, bgm_mood: str, bgm_volume: float = 0.10) -> Dict[s
             return {"ok": False, "error": "BGM 믹싱 실패"}
 
     except ImportError as e:
-        return {"ok": False, "error": f"drama_server import 실패: {e}"}
+        return {"ok": False, "error": f"bgm_utils import 실패: {e}"}
     except Exception as e:
         return {"ok": False, "error": str(e)}
 
@@ -428,7 +428,7 @@ def _mix_scene_bgm(
     try:
         import subprocess
         import tempfile
-        from drama_server import _get_bgm_file
+        from scripts.common.bgm_utils import _get_bgm_file
 
         # 씬별 BGM 파일 수집
         scene_bgms = []
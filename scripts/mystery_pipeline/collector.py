@@ -3,6 +3,9 @@
 
 - 해외 미스테리: 영어 위키백과 API
 - 한국 미스테리: 나무위키 (2025-12-22 추가)
+
+검색 결과/문서 정보/나무위키 존재 확인은 로컬 참고자료 코퍼스(scripts/common/reference_corpus.py)에
+저장하고 먼저 조회 → 만료(REFERENCE_CORPUS_TTL, 기본 30일) 전까지 네트워크 요청 없음
 """
 
 import re
@@ -13,6 +16,8 @@ import requests
 from typing import Dict, Any, Optional, List
 from urllib.parse import quote, quote_plus
 
+from scripts.common import reference_corpus
+
 from .config import (
     FEATURED_MYSTERIES,
     MYSTERY_CATEGORIES,
@@ -37,6 +42,12 @@ def search_wikipedia_en(keyword: str, max_results: int = 5) -> List[Dict[str, An
     Returns:
         검색 결과 리스트
     """
+    query = f"{keyword}|{max_results}"
+    docs = reference_corpus.get_search("wikipedia_en_search", query)
+    if docs is not None:
+        print(f"[MYSTERY] Wikipedia 검색 '{keyword}': {len(docs)}개 결과 (로컬 코퍼스)")
+        return [{"title": doc["title"], "snippet": doc["content"], "url": doc["url"]} for doc in docs]
+
     items = []
 
     try:
@@ -79,6 +90,12 @@ def search_wikipedia_en(keyword: str, max_results: int = 5) -> List[Dict[str, An
 
         print(f"[MYSTERY] Wikipedia 검색 '{keyword}': {len(items)}개 결과")
 
+        if items:
+            for item in items:
+                reference_corpus.put("wikipedia_en_search", item["title"], title=item["title"],
+                                     content=item["snippet"], url=item["url"])
+            reference_corpus.put_search("wikipedia_en_search", query, [item["title"] for item in items])
+
     except Exception as e:
         print(f"[MYSTERY] Wikipedia 검색 오류 ({keyword}): {e}")
 
@@ -95,6 +112,11 @@ def get_wikipedia_info(title: str) -> Optional[Dict[str, Any]]:
     Returns:
         문서 기본 정보 딕셔너리 또는 None
     """
+    doc = reference_corpus.get("wikipedia_en", title.replace("_", " "))
+    if doc:
+        print(f"[MYSTERY] 문서 정보 확인 (로컬 코퍼스): {title}")
+        return {"title": doc["title"], "url": doc["url"], "summary": doc["content"]}
+
     try:
         headers = {
             "User-Agent": WIKI_USER_AGENT,
@@ -138,11 +160,14 @@ def get_wikipedia_info(title: str) -> Optional[Dict[str, Any]]:
             print(f"[MYSTERY] 문서 정보 확인 성공: {title}")
             print(f"[MYSTERY] → Opus가 직접 URL에서 읽을 예정: {full_url}")
 
-            return {
+            info = {
                 "title": page_data.get("title", title),
                 "url": full_url,
                 "summary": summary,  # 서론만 (참고용)
             }
+            reference_corpus.put("wikipedia_en", title.replace("_", " "), title=info["title"],
+                                 content=summary, url=full_url)
+            return info
 
         return None
 
@@ -334,6 +359,11 @@ def get_namu_info(namu_title: str) -> Optional[Dict[str, Any]]:
     Returns:
         문서 기본 정보 딕셔너리 또는 None
     """
+    doc = reference_corpus.get("namu_exists", namu_title)
+    if doc:
+        print(f"[KR_MYSTERY] 나무위키 문서 확인 (로컬 코퍼스): {namu_title}")
+        return {"title": doc["title"], "url": doc["url"], "exists": True}
+
     try:
         url = get_namu_url(namu_title)
 
@@ -346,6 +376,7 @@ def get_namu_info(namu_title: str) -> Optional[Dict[str, Any]]:
 
         if response.status_code == 200:
             print(f"[KR_MYSTERY] 나무위키 문서 확인: {namu_title}")
+            reference_corpus.put("namu_exists", namu_title, title=namu_title, url=url)
             return {
                 "title": namu_title,
                 "url": url,
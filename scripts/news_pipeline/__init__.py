@@ -25,6 +25,7 @@ from .utils import (
 from .rss import (
     ingest_rss_feeds,
     deduplicate_items,
+    mark_items_seen,
 )
 
 from .scoring import (
@@ -66,6 +67,7 @@ __all__ = [
     # RSS
     'ingest_rss_feeds',
     'deduplicate_items',
+    'mark_items_seen',
     # Scoring
     'score_and_select_candidates',
     # OPUS
@@ -279,8 +279,8 @@ def _llm_make_opus_input(
         return "", "", ""
 
     try:
-        from openai import OpenAI
-        client = OpenAI(api_key=api_key)
+        from scripts.common.llm_clients import require_client
+        client = require_client("openai", api_key=api_key)
 
         channel_name = CHANNELS.get(channel, {}).get("name", channel)
         weekday_angle = get_weekday_angle()
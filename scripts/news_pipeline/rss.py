@@ -6,6 +6,8 @@ from datetime import datetime, timezone
 
 from .config import NEWS_FEEDS, google_news_rss_url
 from .utils import normalize_text, compute_hash, get_kst_now
+from scripts.common import news_dedupe
+from scripts.common.feed_fetcher import fetch_feeds
 
 try:
     import feedparser
@@ -18,10 +20,16 @@ except ImportError:
     dtparser = None
 
 
-def ingest_rss_feeds(max_per_feed: int = 30) -> tuple[list, list]:
+def ingest_rss_feeds(max_per_feed: int = 30, only_new: bool = False) -> tuple[list, list]:
     """
     RSS 피드에서 기사 수집 (공용)
 
+    모든 피드를 동시에 조건부 요청으로 가져옴 (scripts.common.feed_fetcher)
+
+    Args:
+        max_per_feed: 피드당 최대 기사 수
+        only_new: True면 지난 실행 이후 새로 올라온 기사만 반환
+
     반환: (raw_rows, items)
     - raw_rows: RAW_FEED 시트용 행 데이터
     - items: 후보 선정용 딕셔너리 리스트
@@ -34,20 +42,26 @@ def ingest_rss_feeds(max_per_feed: int = 30) -> tuple[list, list]:
     raw_rows = []
     items = []
 
-    for feed_name, query in NEWS_FEEDS:
-        url = google_news_rss_url(query)
-        print(f"[NEWS] 피드 수집 중: {feed_name}")
+    feed_urls = [(feed_name, google_news_rss_url(query)) for feed_name, query in NEWS_FEEDS]
+    print(f"[NEWS] 피드 {len(feed_urls)}개 동시 수집 중...")
+    results = fetch_feeds([url for _, url in feed_urls], max_items=max_per_feed)
 
-        try:
-            d = feedparser.parse(url)
-            entries = d.entries[:max_per_feed]
-            print(f"[NEWS] {feed_name}: {len(entries)}개 기사 발견")
+    for feed_name, url in feed_urls:
+        result = results.get(url, {})
+        if result.get("error"):
+            print(f"[NEWS] {feed_name} 수집 실패: {result['error']}")
+            continue
+
+        entries = result["new_entries"] if only_new else result["entries"]
+        print(f"[NEWS] {feed_name}: {len(entries)}개 기사 발견"
+              f"{' (변경 없음)' if result['status'] == 304 else ''}")
 
+        try:
             for e in entries:
-                title = normalize_text(getattr(e, "title", ""))
-                link = getattr(e, "link", "")
-                summary = normalize_text(getattr(e, "summary", ""))
-                published = getattr(e, "published", None) or getattr(e, "updated", None)
+                title = normalize_text(e.get("title", ""))
+                link = e.get("link", "")
+                summary = normalize_text(e.get("summary", ""))
+                published = e.get("published") or None
 
                 published_at = ""
                 if published and dtparser:
@@ -93,8 +107,14 @@ def ingest_rss_feeds(max_per_feed: int = 30) -> tuple[list, list]:
     return raw_rows, items
 
 
-def deduplicate_items(items: list) -> list:
-    """해시 기반 중복 제거"""
+def deduplicate_items(items: list, namespace: str = None) -> list:
+    """
+    해시 기반 중복 제거
+
+    namespace를 주면 실행 간 인덱스(scripts.common.news_dedupe)로
+    지난 실행에서 본 기사와 제목만 다른 같은 이야기까지 제외
+    (인덱스에 기록하지는 않음 - 처리 성공 후 mark_items_seen 호출)
+    """
     seen = set()
     unique = []
 
@@ -104,4 +124,22 @@ def deduplicate_items(items: list) -> list:
             unique.append(item)
 
     print(f"[NEWS] 중복 제거: {len(items)} → {len(unique)}개")
+
+    if namespace:
+        unique = news_dedupe.filter_new(unique, namespace, key=_dedupe_key, text=_dedupe_text)
     return unique
+
+
+def mark_items_seen(items: list, namespace: str):
+    """처리가 끝난 기사를 실행 간 인덱스에 기록 (다음 실행부터 같은 이야기 제외)"""
+    news_dedupe.mark_items_seen(items, namespace, key=_dedupe_key, text=_dedupe_text,
+                                title=lambda item: item["title"])
+    print(f"[NEWS] 중복 인덱스 기록: {len(items)}개 ({namespace})")
+
+
+def _dedupe_key(item: dict) -> str:
+    return item["hash"]
+
+
+def _dedupe_text(item: dict) -> str:
+    return f"{item['title']} {item['summary']}"
@@ -18,7 +18,7 @@ import os
 
 from .config import CHANNELS
 from .utils import get_tab_name
-from .rss import ingest_rss_feeds
+from .rss import ingest_rss_feeds, deduplicate_items, mark_items_seen
 from .scoring import score_and_select_candidates
 from .opus import generate_opus_input, NEWS_OPUS_FIELDS
 from .sheets import (
@@ -105,7 +105,10 @@ def run_news_pipeline(
 
         # 2) 채널별 후보 선정
         print(f"[NEWS] === 2단계: 후보 선정 ({channel}) ===")
-        candidate_rows = score_and_select_candidates(items, channel, top_k)
+        # 중복 제거 (지난 실행에서 이 채널이 본 같은 이야기 포함) - 인덱스 기록은 파이프라인 성공 후
+        dedupe_namespace = f"news_{channel}"
+        unique_items = deduplicate_items(items, namespace=dedupe_namespace)
+        candidate_rows = score_and_select_candidates(unique_items, channel, top_k, dedupe=False)
         result["candidate_count"] = len(candidate_rows)
 
         if not candidate_rows:
@@ -149,6 +152,7 @@ def run_news_pipeline(
                     return result
 
         result["success"] = True
+        mark_items_seen(unique_items, dedupe_namespace)
         print(f"[NEWS] === 파이프라인 완료 ({channel}) ===")
 
     except Exception as e:
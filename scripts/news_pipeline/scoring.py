@@ -15,7 +15,7 @@ from .utils import (
 )
 
 
-def score_and_select_candidates(items: list, channel: str, top_k: int = 5) -> list:
+def score_and_select_candidates(items: list, channel: str, top_k: int = 5, dedupe: bool = True) -> list:
     """
     채널별 점수화 + TOP K 후보 선정 (규칙 기반)
 
@@ -23,6 +23,7 @@ def score_and_select_candidates(items: list, channel: str, top_k: int = 5) -> li
         items: 기사 리스트
         channel: 채널 키 (ECON, POLICY, SOCIETY, WORLD)
         top_k: 선정할 후보 수
+        dedupe: False면 호출자가 이미 deduplicate_items로 중복 제거한 목록
 
     Returns:
         CANDIDATES 시트용 행 데이터 리스트
@@ -31,8 +32,8 @@ def score_and_select_candidates(items: list, channel: str, top_k: int = 5) -> li
     run_id = now.strftime("%Y-%m-%d")
     weekday_angle = get_weekday_angle()
 
-    # 중복 제거
-    unique_items = deduplicate_items(items)
+    # 중복 제거 (지난 실행에서 이 채널이 본 같은 이야기 포함)
+    unique_items = deduplicate_items(items, namespace=f"news_{channel}") if dedupe else items
 
     # 채널 필터링 + 점수화
     scored = []
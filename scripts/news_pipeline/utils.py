@@ -5,10 +5,28 @@
 import re
 import hashlib
 from datetime import datetime, timezone, timedelta
+from functools import lru_cache
+
+from scripts.common.keyword_matcher import KeywordMatcher
 
 from .config import CATEGORY_KEYWORDS, CHANNEL_FILTERS, WEEKDAY_ANGLES
 
 
+# 카테고리 + 채널 include/exclude 키워드를 하나의 매처로 컴파일
+# → 채널 필터/관련도/카테고리 점수가 같은 기사 텍스트를 한 번만 훑음
+_KEYWORD_MATCHER = KeywordMatcher({
+    **{("category", cat): keywords for cat, keywords in CATEGORY_KEYWORDS.items()},
+    **{("include", ch): cfg.get("include", []) for ch, cfg in CHANNEL_FILTERS.items()},
+    **{("exclude", ch): cfg.get("exclude", []) for ch, cfg in CHANNEL_FILTERS.items()},
+})
+
+
+@lru_cache(maxsize=4096)
+def _scan_keywords(title: str, summary: str) -> tuple:
+    """"제목 요약" 텍스트의 키워드 매칭 (시작, 끝, 키워드) - 같은 기사는 캐시 재사용"""
+    return tuple(_KEYWORD_MATCHER.find_all(f"{title} {summary}"))
+
+
 def normalize_text(text: str) -> str:
     """텍스트 정규화 (공백 정리)"""
     return re.sub(r"\s+", " ", (text or "").strip())
@@ -39,11 +57,11 @@ def get_weekday_angle() -> str:
 
 def guess_category(title: str, summary: str) -> str:
     """규칙 기반 카테고리 분류"""
-    text = f"{title} {summary}"
+    counts = _KEYWORD_MATCHER.count_by_label(hits=_scan_keywords(title, summary))
     best_cat, best_score = "경제", 0
 
-    for cat, keywords in CATEGORY_KEYWORDS.items():
-        score = sum(1 for k in keywords if k in text)
+    for cat in CATEGORY_KEYWORDS:
+        score = counts.get(("category", cat), 0)
         if score > best_score:
             best_cat, best_score = cat, score
 
@@ -52,15 +70,19 @@ def guess_category(title: str, summary: str) -> str:
 
 def calculate_relevance_score(title: str, summary: str, channel: str) -> int:
     """채널별 관련도 점수 계산"""
-    text = f"{title} {summary}"
     filter_config = CHANNEL_FILTERS.get(channel, {})
-    include_keywords = filter_config.get("include", [])
     weight = filter_config.get("weight", 1.0)
+    label = ("include", channel)
+
+    # 키워드별 가장 앞 매칭이 제목 안(끝 위치 <= 제목 길이)이면 제목 매칭
+    first_end = {}
+    for _, end, keyword in _scan_keywords(title, summary):
+        if keyword not in first_end:
+            first_end[keyword] = end
 
     score = 0
-    for k in include_keywords:
-        if k in text:
-            score += 3 if k in title else 1
+    for keyword, end in first_end.items():
+        score += (3 if end <= len(title) else 1) * _KEYWORD_MATCHER.labels_of(keyword).count(label)
 
     return int(score * weight)
 
@@ -87,14 +109,9 @@ def calculate_recency_score(published_at: str, now: datetime) -> int:
 
 def passes_channel_filter(title: str, summary: str, channel: str) -> bool:
     """채널 필터 통과 여부 (include 1개 이상 + exclude 없음)"""
-    text = f"{title} {summary}"
-    filter_config = CHANNEL_FILTERS.get(channel, {})
-
-    include_keywords = filter_config.get("include", [])
-    exclude_keywords = filter_config.get("exclude", [])
+    counts = _KEYWORD_MATCHER.count_by_label(hits=_scan_keywords(title, summary))
 
-    for k in exclude_keywords:
-        if k in text:
-            return False
+    if counts.get(("exclude", channel)):
+        return False
 
-    return any(k in text for k in include_keywords)
+    return bool(counts.get(("include", channel)))
@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+서버 시작 프로파일러
+
+1. 모듈별 import 시간 리포트 (python -X importtime)
+2. 서버 실행 후 /health 첫 응답까지 걸린 시간 측정
+
+사용법:
+    python scripts/profile_startup.py imports            # drama_server import 시간 상위 30개
+    python scripts/profile_startup.py imports --module scripts.wuxia_pipeline.multi_voice_tts
+    python scripts/profile_startup.py health              # gunicorn으로 띄워서 /health 측정
+    python scripts/profile_startup.py health --dev        # python drama_server.py로 측정
+"""
+
+import argparse
+import os
+import socket
+import subprocess
+import sys
+import time
+import urllib.request
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def profile_imports(module="drama_server", top=30, group_by_package=True):
+    """
+    -X importtime 출력을 파싱하여 누적 import 시간이 큰 순으로 반환
+
+    Returns:
+        [(모듈명, 누적 ms, 자체 ms), ...], 전체 import 시간(ms)
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=PROJECT_ROOT, capture_output=True, text=True
+    )
+
+    rows = {}
+    total_us = 0
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        try:
+            self_us, cumulative_us, raw_name = line.split(":", 1)[1].split("|")
+            self_us, cumulative_us = int(self_us), int(cumulative_us)
+        except ValueError:
+            continue
+
+        # 들여쓰기 없는 항목(구분자 뒤 공백 1칸) = 최상위 import (전체 합계 계산용)
+        name = raw_name.strip()
+        if raw_name[:2] == " " + name[:1]:
+            total_us += cumulative_us
+
+        key = name.split(".")[0] if group_by_package else name
+        prev_cum, prev_self = rows.get(key, (0, 0))
+        # 패키지 단위: 누적은 최댓값(최상위 패키지 항목), 자체 시간은 합계
+        rows[key] = (max(prev_cum, cumulative_us), prev_self + self_us)
+
+    if result.returncode != 0:
+        # import 실패해도 그 전까지의 시간은 유효 - 에러 마지막 줄만 표시
+        tail = [l for l in result.stderr.splitlines() if not l.startswith("import time:")]
+        print(f"[PROFILE] import 실패: {tail[-1] if tail else result.returncode}")
+
+    ranked = sorted(rows.items(), key=lambda kv: kv[1][0], reverse=True)[:top]
+    return [(name, cum / 1000, own / 1000) for name, (cum, own) in ranked], total_us / 1000
+
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def measure_health(dev=False, timeout=180):
+    """
+    서버를 실행하고 /health가 200을 반환할 때까지의 시간(초) 측정
+
+    Returns:
+        초 (실패 시 None)
+    """
+    port = _free_port()
+    env = dict(os.environ, PORT=str(port))
+    if dev:
+        cmd = [sys.executable, "drama_server.py"]
+    else:
+        cmd = [sys.executable, "-m", "gunicorn", "-c", "gunicorn.conf.py", "drama_server:app"]
+
+    started = time.perf_counter()
+    proc = subprocess.Popen(cmd, cwd=PROJECT_ROOT, env=env,
+                            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        url = f"http://127.0.0.1:{port}/health"
+        while time.perf_counter() - started < timeout:
+            if proc.poll() is not None:
+                print(f"[PROFILE] 서버가 종료됨 (exit {proc.returncode})")
+                return None
+            try:
+                with urllib.request.urlopen(url, timeout=2) as resp:
+                    if resp.status == 200:
+                        return time.perf_counter() - started
+            except Exception:
+                time.sleep(0.1)
+        print(f"[PROFILE] {timeout}초 안에 /health 응답 없음")
+        return None
+    finally:
+        proc.terminate()
+        try:
+            proc.wait(timeout=15)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="서버 시작 시간 프로파일러")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p_imports = sub.add_parser("imports", help="모듈별 import 시간")
+    p_imports.add_argument("--module", default="drama_server")
+    p_imports.add_argument("--top", type=int, default=30)
+    p_imports.add_argument("--modules", action="store_true", help="패키지로 묶지 않고 모듈 단위로 표시")
+
+    p_health = sub.add_parser("health", help="/health 첫 응답까지 시간")
+    p_health.add_argument("--dev", action="store_true", help="gunicorn 대신 python drama_server.py 사용")
+    p_health.add_argument("--timeout", type=int, default=180)
+
+    args = parser.parse_args()
+
+    if args.command == "imports":
+        ranked, total_ms = profile_imports(args.module, args.top, group_by_package=not args.modules)
+        print(f"=== import {args.module}: 총 {total_ms:,.0f}ms ===")
+        print(f"{'모듈':<45}{'누적(ms)':>12}{'자체(ms)':>12}")
+        for name, cum_ms, self_ms in ranked:
+            print(f"{name:<45}{cum_ms:>12,.1f}{self_ms:>12,.1f}")
+    else:
+        elapsed = measure_health(dev=args.dev, timeout=args.timeout)
+        if elapsed is None:
+            sys.exit(1)
+        print(f"=== /health 첫 응답: {elapsed:.2f}초 ===")
+
+
+if __name__ == "__main__":
+    main()
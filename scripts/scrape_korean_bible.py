@@ -3,18 +3,30 @@
 개역개정 성경 스크래핑 스크립트
 출처: holybible.or.kr
 
+- 여러 장을 동시에 받되 호스트별 요청 간격(기본 0.5초)은 지킴
+- 받은 장은 바로 체크포인트(출력 파일명.chapters.jsonl)에 한 줄씩 추가
+  → 중단 후 다시 실행하면 남은 장만 받음 (실패한 장은 기록하지 않으므로 다음 실행에서 재시도)
+- HTML 파싱은 받는 스레드가 아니라 메인 스레드에서 (받기 스레드는 네트워크만 기다림)
+
 사용법:
     python scrape_korean_bible.py
+    python scrape_korean_bible.py --workers 6 --interval 0.3
+    python scrape_korean_bible.py --base-url http://127.0.0.1:8000/bibleftxt.php   # 로컬 테스트 서버
 
 출력:
     korean_bible_gae.json - 개역개정 성경 전체 (66권)
 """
 
+import argparse
 import json
+import os
 import re
+import threading
 import time
 import urllib.request
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
+from urllib.parse import urlparse
 
 # 성경 책 정보 (66권)
 BOOKS = [
@@ -88,138 +100,203 @@ BOOKS = [
     {"id": 66, "name": "요한계시록", "abbr": "계", "chapters": 22},
 ]
 
-BASE_URL = "http://www.holybible.or.kr/B_GAE/cgi/bibleftxt.php"
-
-
-def fetch_chapter(book_id: int, chapter: int, retries: int = 3) -> list[dict]:
-    """특정 장의 모든 구절을 가져옵니다."""
-    url = f"{BASE_URL}?VR=GAE&VL={book_id}&CN={chapter}&CV=99"
+BASE_URL = os.environ.get("BIBLE_SCRAPE_BASE_URL", "http://www.holybible.or.kr/B_GAE/cgi/bibleftxt.php")
+FETCH_WORKERS = 4          # 동시 요청 수
+REQUEST_INTERVAL = 0.5     # 같은 호스트 요청 시작 간 최소 간격 (초)
 
-    for attempt in range(retries):
-        try:
-            req = urllib.request.Request(url, headers={
-                'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-                'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
-                'Accept-Language': 'ko-KR,ko;q=0.9,en-US;q=0.8,en;q=0.7',
-                'Referer': 'http://www.holybible.or.kr/',
-            })
-
-            with urllib.request.urlopen(req, timeout=30) as response:
-                # EUC-KR 인코딩
-                data = response.read().decode('euc-kr', errors='ignore')
+REQUEST_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
+    'Accept-Language': 'ko-KR,ko;q=0.9,en-US;q=0.8,en;q=0.7',
+    'Referer': 'http://www.holybible.or.kr/',
+}
 
-                verses = []
+# holybible.or.kr HTML 구조:
+# <ol start=001 id="b_001">
+# <li><font class=tk4l>구절내용</font>
+# <li><font class=tk4l>구절내용</font>
+# ...
+_OL_BLOCK_RE = re.compile(r'<ol start=(\d+)[^>]*>(.*?)</td>', re.DOTALL)
+_VERSE_RE = re.compile(r'<li><font class=tk4l>(.*?)</font>', re.DOTALL)
+_TAG_RE = re.compile(r'<[^>]+>')
+_SPACE_RE = re.compile(r'\s+')
 
-                # holybible.or.kr HTML 구조:
-                # <ol start=001 id="b_001">
-                # <li><font class=tk4l>구절내용</font>
-                # <li><font class=tk4l>구절내용</font>
-                # ...
+_rate_lock = threading.Lock()
+_next_request_time = {}
 
-                # 모든 <ol> 블록 찾기
-                ol_blocks = re.findall(r'<ol start=(\d+)[^>]*>(.*?)</td>', data, re.DOTALL)
 
-                for start_num, ol_content in ol_blocks:
-                    start_verse = int(start_num)
+def _wait_for_slot(url: str, interval: float):
+    """호스트별 요청 슬롯 예약 후 차례까지 대기 (슬롯 계산만 잠금 안에서)"""
+    host = urlparse(url).netloc
+    with _rate_lock:
+        now = time.time()
+        slot = max(now, _next_request_time.get(host, 0.0))
+        _next_request_time[host] = slot + interval
+    if slot > now:
+        time.sleep(slot - now)
 
-                    # <li><font class=tk4l>...</font> 패턴으로 각 구절 추출
-                    li_matches = re.findall(r'<li><font class=tk4l>(.*?)</font>', ol_content, re.DOTALL)
 
-                    for i, verse_content in enumerate(li_matches):
-                        verse_num = start_verse + i
+def chapter_url(book_id: int, chapter: int, base_url: str = BASE_URL) -> str:
+    return f"{base_url}?VR=GAE&VL={book_id}&CN={chapter}&CV=99"
 
-                        # HTML 태그 제거 (사전 링크 등)
-                        clean_text = re.sub(r'<[^>]+>', '', verse_content)
-                        # 연속 공백 정리
-                        clean_text = re.sub(r'\s+', ' ', clean_text).strip()
 
-                        if clean_text:
-                            verses.append({
-                                "verse": verse_num,
-                                "text": clean_text
-                            })
+def fetch_chapter_html(book_id: int, chapter: int, retries: int = 3,
+                       base_url: str = BASE_URL, interval: float = REQUEST_INTERVAL) -> str:
+    """특정 장의 HTML (EUC-KR 디코딩, 실패 시 빈 문자열)"""
+    url = chapter_url(book_id, chapter, base_url)
 
-                return sorted(verses, key=lambda x: x["verse"])
+    for attempt in range(retries):
+        try:
+            _wait_for_slot(url, interval)
+            req = urllib.request.Request(url, headers=REQUEST_HEADERS)
+            with urllib.request.urlopen(req, timeout=30) as response:
+                return response.read().decode('euc-kr', errors='ignore')
 
         except Exception as e:
-            print(f"  오류 (시도 {attempt + 1}/{retries}): {e}")
+            print(f"  오류 {book_id}-{chapter} (시도 {attempt + 1}/{retries}): {e}")
             if attempt < retries - 1:
                 time.sleep(2 ** attempt)  # 지수 백오프
 
-    return []
+    return ""
 
 
-def scrape_bible(output_path: str = "korean_bible_gae.json"):
-    """전체 성경을 스크래핑합니다."""
-    bible_data = {
-        "version": "개역개정",
-        "version_code": "GAE",
-        "source": "holybible.or.kr",
-        "books": []
-    }
+def parse_chapter(data: str) -> list[dict]:
+    """장 HTML → [{"verse": 번호, "text": 본문}, ...] (절 번호순)"""
+    verses = []
 
-    total_chapters = sum(book["chapters"] for book in BOOKS)
-    completed_chapters = 0
+    for start_num, ol_content in _OL_BLOCK_RE.findall(data):
+        start_verse = int(start_num)
+
+        for i, verse_content in enumerate(_VERSE_RE.findall(ol_content)):
+            # HTML 태그 제거 (사전 링크 등) + 연속 공백 정리
+            clean_text = _SPACE_RE.sub(' ', _TAG_RE.sub('', verse_content)).strip()
+
+            if clean_text:
+                verses.append({
+                    "verse": start_verse + i,
+                    "text": clean_text
+                })
+
+    return sorted(verses, key=lambda x: x["verse"])
+
+
+def fetch_chapter(book_id: int, chapter: int, retries: int = 3) -> list[dict]:
+    """특정 장의 모든 구절을 가져옵니다."""
+    return parse_chapter(fetch_chapter_html(book_id, chapter, retries))
 
-    print(f"개역개정 성경 스크래핑 시작 (총 {len(BOOKS)}권, {total_chapters}장)")
-    print("=" * 60)
 
-    for book in BOOKS:
-        book_data = {
-            "id": book["id"],
-            "name": book["name"],
-            "abbr": book["abbr"],
-            "chapters": []
-        }
+def _checkpoint_path(output_path: str) -> str:
+    return f"{os.path.splitext(output_path)[0]}.chapters.jsonl"
 
-        print(f"\n[{book['id']:02d}/66] {book['name']} ({book['chapters']}장)")
 
-        for chapter_num in range(1, book["chapters"] + 1):
-            verses = fetch_chapter(book["id"], chapter_num)
+def load_checkpoint(checkpoint_path: str) -> dict:
+    """체크포인트 → {(책 id, 장): 절 목록} (중단 중 잘린 마지막 줄은 무시)"""
+    done = {}
+    if not os.path.exists(checkpoint_path):
+        return done
+    with open(checkpoint_path, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+                done[(record["book_id"], record["chapter"])] = record["verses"]
+            except (ValueError, KeyError):
+                continue
+    return done
 
-            book_data["chapters"].append({
-                "chapter": chapter_num,
-                "verses": verses
-            })
 
-            completed_chapters += 1
-            progress = (completed_chapters / total_chapters) * 100
-            print(f"  {chapter_num}장: {len(verses)}절 ({progress:.1f}%)", end="\r")
+def scrape_bible(output_path: str = "korean_bible_gae.json", workers: int = FETCH_WORKERS,
+                 interval: float = REQUEST_INTERVAL, base_url: str = BASE_URL):
+    """전체 성경을 스크래핑합니다 (체크포인트가 있으면 이어서)."""
+    checkpoint_path = _checkpoint_path(output_path)
+    done = load_checkpoint(checkpoint_path)
 
-            # 서버 부하 방지를 위한 딜레이
-            time.sleep(0.5)
+    total_chapters = sum(book["chapters"] for book in BOOKS)
+    pending = [
+        (book["id"], chapter_num)
+        for book in BOOKS
+        for chapter_num in range(1, book["chapters"] + 1)
+        if (book["id"], chapter_num) not in done
+    ]
 
-        print(f"  완료: {book['chapters']}장")
-        bible_data["books"].append(book_data)
+    print(f"개역개정 성경 스크래핑 시작 (총 {len(BOOKS)}권, {total_chapters}장)")
+    if done:
+        print(f"  체크포인트: {len(done)}장 완료 → 남은 {len(pending)}장만 수집 ({checkpoint_path})")
+    print(f"  동시 {workers}개, 요청 간격 {interval}초")
+    print("=" * 60)
 
-        # 중간 저장 (10권마다)
-        if book["id"] % 10 == 0:
-            temp_path = output_path.replace(".json", f"_temp_{book['id']}.json")
-            with open(temp_path, "w", encoding="utf-8") as f:
-                json.dump(bible_data, f, ensure_ascii=False, indent=2)
-            print(f"  중간 저장: {temp_path}")
+    failed = []
+    started = time.time()
+    if pending:
+        with open(checkpoint_path, "a", encoding="utf-8") as checkpoint, \
+                ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="bible-fetch") as executor:
+            futures = {
+                executor.submit(fetch_chapter_html, book_id, chapter_num, 3, base_url, interval): (book_id, chapter_num)
+                for book_id, chapter_num in pending
+            }
+            for future in as_completed(futures):
+                book_id, chapter_num = futures[future]
+                verses = parse_chapter(future.result())
+
+                if verses:
+                    done[(book_id, chapter_num)] = verses
+                    checkpoint.write(json.dumps(
+                        {"book_id": book_id, "chapter": chapter_num, "verses": verses}, ensure_ascii=False
+                    ) + "\n")
+                    checkpoint.flush()
+                else:
+                    failed.append((book_id, chapter_num))
+
+                progress = (len(done) / total_chapters) * 100
+                print(f"  [{book_id:02d}/66] {chapter_num}장: {len(verses)}절 ({progress:.1f}%)", end="\r")
+
+    bible_data = {
+        "version": "개역개정",
+        "version_code": "GAE",
+        "source": "holybible.or.kr",
+        "books": [
+            {
+                "id": book["id"],
+                "name": book["name"],
+                "abbr": book["abbr"],
+                "chapters": [
+                    {"chapter": chapter_num, "verses": done.get((book["id"], chapter_num), [])}
+                    for chapter_num in range(1, book["chapters"] + 1)
+                ],
+            }
+            for book in BOOKS
+        ],
+    }
 
-    # 최종 저장
-    with open(output_path, "w", encoding="utf-8") as f:
+    # 최종 저장 (원자적 교체)
+    tmp_path = f"{output_path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
         json.dump(bible_data, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, output_path)
 
     # 통계
-    total_verses = sum(
-        len(chapter["verses"])
-        for book in bible_data["books"]
-        for chapter in book["chapters"]
-    )
+    total_verses = sum(len(verses) for verses in done.values())
 
     print("\n" + "=" * 60)
-    print(f"스크래핑 완료!")
+    print(f"스크래핑 완료! ({time.time() - started:.0f}초)")
     print(f"  - 총 {len(bible_data['books'])}권")
-    print(f"  - 총 {total_chapters}장")
+    print(f"  - 총 {total_chapters}장 (수집 {len(done)}장)")
     print(f"  - 총 {total_verses}절")
     print(f"  - 저장: {output_path}")
+    if failed:
+        failed.sort()
+        print(f"  - ⚠️ 실패 {len(failed)}장: {', '.join(f'{b}-{c}' for b, c in failed[:20])}"
+              f"{' ...' if len(failed) > 20 else ''}")
+        print("    다시 실행하면 실패한 장만 재시도합니다.")
 
     return bible_data
 
 
 if __name__ == "__main__":
-    output_file = Path(__file__).parent / "korean_bible_gae.json"
-    scrape_bible(str(output_file))
+    parser = argparse.ArgumentParser(description="개역개정 성경 스크래핑")
+    parser.add_argument("--output", default=str(Path(__file__).parent / "korean_bible_gae.json"))
+    parser.add_argument("--workers", type=int, default=FETCH_WORKERS, help="동시 요청 수")
+    parser.add_argument("--interval", type=float, default=REQUEST_INTERVAL, help="요청 간 최소 간격 (초)")
+    parser.add_argument("--base-url", default=BASE_URL, help="bibleftxt.php 주소 (테스트 서버용)")
+    args = parser.parse_args()
+
+    scrape_bible(args.output, workers=args.workers, interval=args.interval, base_url=args.base_url)
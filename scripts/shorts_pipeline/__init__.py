@@ -92,6 +92,7 @@ from .sheets import (
 
 from .news_collector import (
     collect_entertainment_news,
+    mark_news_seen,
     search_celebrity_news,
     extract_celebrity_name,
     detect_issue_type,
@@ -141,7 +142,9 @@ try:
         get_best_shorts_topic,
         youtube_to_news_format,
         get_video_comments,
+        get_comments_batch,
         extract_trending_topics,
+        calculate_engagement_scores,
         # 뉴스 연동 (하이브리드)
         search_google_news,
         enrich_topic_with_news,
@@ -223,6 +226,7 @@ __all__ = [
 
     # News Collector
     'collect_entertainment_news',
+    'mark_news_seen',
     'search_celebrity_news',
     'extract_celebrity_name',
     'detect_issue_type',
@@ -268,7 +272,9 @@ __all__ = [
     'get_best_shorts_topic',
     'youtube_to_news_format',
     'get_video_comments',
+    'get_comments_batch',
     'extract_trending_topics',
+    'calculate_engagement_scores',
     # 뉴스 연동 (하이브리드)
     'search_google_news',
     'enrich_topic_with_news',
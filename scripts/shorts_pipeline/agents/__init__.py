@@ -21,6 +21,7 @@ from .supervisor import SupervisorAgent
 from .utils import (
     GPT51_COSTS,
     get_openai_client,
+    get_async_openai_client,
     extract_gpt51_response,
     safe_json_parse,
     repair_json,
@@ -41,6 +42,7 @@ __all__ = [
     # Utils
     "GPT51_COSTS",
     "get_openai_client",
+    "get_async_openai_client",
     "extract_gpt51_response",
     "safe_json_parse",
     "repair_json",
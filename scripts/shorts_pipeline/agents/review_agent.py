@@ -15,7 +15,7 @@ try:
     from .base import BaseAgent, AgentResult, AgentStatus, TaskContext
     from .utils import (
         GPT51_COSTS,
-        get_openai_client,
+        get_async_openai_client,
         extract_gpt51_response,
         safe_json_parse,
     )
@@ -23,7 +23,7 @@ except ImportError:
     from base import BaseAgent, AgentResult, AgentStatus, TaskContext
     from utils import (
         GPT51_COSTS,
-        get_openai_client,
+        get_async_openai_client,
         extract_gpt51_response,
         safe_json_parse,
     )
@@ -239,7 +239,7 @@ class ReviewAgent(BaseAgent):
 
         # 2. LLM 품질 검수
         try:
-            client = get_openai_client()
+            client = get_async_openai_client()
 
             review_prompt = f"""
 당신은 YouTube Shorts 대본 전문 검수자입니다.
@@ -275,7 +275,7 @@ class ReviewAgent(BaseAgent):
 }}
 """
 
-            response = client.responses.create(
+            response = await client.responses.create(
                 model=self.model,
                 input=[
                     {
@@ -13,7 +13,7 @@ try:
     from .base import BaseAgent, AgentResult, AgentStatus, TaskContext
     from .utils import (
         GPT51_COSTS,
-        get_openai_client,
+        get_async_openai_client,
         extract_gpt51_response,
         safe_json_parse,
     )
@@ -21,7 +21,7 @@ except ImportError:
     from base import BaseAgent, AgentResult, AgentStatus, TaskContext
     from utils import (
         GPT51_COSTS,
-        get_openai_client,
+        get_async_openai_client,
         extract_gpt51_response,
         safe_json_parse,
     )
@@ -149,7 +149,7 @@ class ScriptAgent(BaseAgent):
         self.log(f"대본 생성 시작: {context.person} - {context.issue_type}")
 
         try:
-            client = get_openai_client()
+            client = get_async_openai_client()
 
             # 실제 댓글 기반 힌트 (context에 있으면 사용)
             script_hints = getattr(context, 'script_hints', None)
@@ -218,7 +218,7 @@ class ScriptAgent(BaseAgent):
 }}
 """
 
-            response = client.responses.create(
+            response = await client.responses.create(
                 model=self.model,
                 input=[
                     {"role": "system", "content": [{"type": "input_text", "text": "쇼츠 대본 작가. JSON으로만 응답."}]},
@@ -271,7 +271,7 @@ class ScriptAgent(BaseAgent):
             return await self._generate_script(context)
 
         try:
-            client = get_openai_client()
+            client = get_async_openai_client()
 
             # 기존 대본 정보
             current_script = context.script.get("full_script", "")
@@ -304,7 +304,7 @@ class ScriptAgent(BaseAgent):
 }}
 """
 
-            response = client.responses.create(
+            response = await client.responses.create(
                 model=self.model,
                 input=[
                     {
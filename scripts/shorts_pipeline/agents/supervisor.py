@@ -21,13 +21,13 @@ from typing import Any, Dict, List, Optional
 try:
     from .base import BaseAgent, AgentResult, AgentStatus, TaskContext
     from .script_agent import ScriptAgent
-    from .image_agent import ImageAgent
+    from .image_agent import ImageAgent, IMAGE_COST_PER_IMAGE
     from .review_agent import ReviewAgent
     from .subtitle_agent import SubtitleAgent
 except ImportError:
     from base import BaseAgent, AgentResult, AgentStatus, TaskContext
     from script_agent import ScriptAgent
-    from image_agent import ImageAgent
+    from image_agent import ImageAgent, IMAGE_COST_PER_IMAGE
     from review_agent import ReviewAgent
     try:
         from subtitle_agent import SubtitleAgent
@@ -76,6 +76,10 @@ class BudgetManager:
         """예산 사용 기록"""
         self.spent[agent] = self.spent.get(agent, 0) + amount
 
+    def can_afford(self, agent: str, amount: float) -> bool:
+        """잔여 예산으로 amount를 쓸 수 있는지 (fan_out 사전 검사용)"""
+        return self.get_remaining(agent) >= amount
+
     def set_quality(self, agent: str, score: float):
         """품질 점수 기록 (0~1)"""
         self.quality_scores[agent] = min(1.0, max(0, score))
@@ -350,29 +354,43 @@ class SupervisorAgent(BaseAgent):
 
         대본 완성 후 자막과 이미지는 서로 독립적이므로 동시 실행 가능
         → 속도 ~2배 향상
+        시작 전에 첫 시도 예상 비용(TTS 전체, 이미지 최소 1장)을 예산으로 검사
         """
+        from scripts.common.base_agent import fan_out
+
         self.log("Phase 2: 자막 + 이미지 병렬 생성 🚀")
         context.add_log(self.name, "parallel_start", "running", "자막+이미지 동시 생성")
 
         parallel_start = time.time()
 
         # 병렬 태스크 생성
-        tasks = []
+        tasks = {}
+        estimated_cost = {}
 
         if self.subtitle_agent and not skip_subtitle:
-            tasks.append(self._subtitle_generation_task(context))
+            tasks["subtitle"] = self._subtitle_generation_task(context)
+            scenes = (context.script or {}).get("scenes", [])
+            estimated_cost["subtitle"] = self.subtitle_agent._estimate_cost(scenes)
 
         if not skip_images:
-            tasks.append(self._image_generation_task(context))
+            tasks["image"] = self._image_generation_task(context)
+            estimated_cost["image"] = IMAGE_COST_PER_IMAGE
 
-        # 병렬 실행
+        # 병렬 실행 (태스크 안에서 에이전트 비용을 직접 차감하므로 fan_out은 사전 검사만)
         if tasks:
-            results = await asyncio.gather(*tasks, return_exceptions=True)
+            results = await fan_out(
+                tasks,
+                budget=self.budget,
+                budget_category={name: name for name in tasks},
+                estimated_cost=estimated_cost,
+            )
 
             # 결과 처리
-            for i, result in enumerate(results):
+            for name, result in results.items():
                 if isinstance(result, Exception):
-                    self.log(f"병렬 태스크 {i} 실패: {result}", "error")
+                    self.log(f"병렬 태스크 {name} 실패: {result}", "error")
+                elif isinstance(result, AgentResult) and not result.success:
+                    self.log(f"병렬 태스크 {name} 건너뜀: {result.error}", "warning")
 
         parallel_duration = time.time() - parallel_start
         self.log(f"병렬 처리 완료: {parallel_duration:.1f}초")
@@ -7,7 +7,6 @@
 - JSON 파싱 헬퍼
 """
 
-import os
 import re
 import json
 from typing import Any, Dict
@@ -25,16 +24,23 @@ def get_openai_client():
     OpenAI 클라이언트 반환
 
     Returns:
-        OpenAI: 초기화된 OpenAI 클라이언트
+        공유 OpenAI 클라이언트 (scripts.common.llm_clients, 호출 함수별 통계)
 
     Raises:
         ValueError: OPENAI_API_KEY 환경변수가 없는 경우
     """
-    from openai import OpenAI
-    api_key = os.environ.get("OPENAI_API_KEY")
-    if not api_key:
-        raise ValueError("OPENAI_API_KEY 환경변수가 설정되지 않았습니다")
-    return OpenAI(api_key=api_key)
+    from scripts.common.llm_clients import require_client
+    return require_client("openai")
+
+
+def get_async_openai_client():
+    """
+    await 가능한 OpenAI 클라이언트 (create()를 스레드로 위임 → 이벤트 루프를 막지 않음)
+
+    async def execute() 안에서 사용하면 Supervisor의 asyncio.gather 병렬 단계가 실제로 겹쳐 실행됩니다.
+    """
+    from scripts.common.base_agent import AsyncLLMClient
+    return AsyncLLMClient(get_openai_client())
 
 
 def extract_gpt51_response(response) -> str:
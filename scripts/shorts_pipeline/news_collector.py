@@ -24,9 +24,29 @@ from .config import (
 
 # 바이럴 점수화 및 댓글 분석
 from .news_scorer import (
-    analyze_news_viral_potential,
+    analyze_news_batch,
+    merge_viral_analysis,
     rank_news_by_viral_potential,
 )
+from scripts.common import news_dedupe
+from scripts.common.feed_fetcher import fetch_feeds
+from scripts.common.keyword_matcher import KeywordMatcher
+
+# 이슈 유형 키워드 (dict 순서 = 우선순위)
+ISSUE_TYPE_KEYWORDS = {
+    "논란": ["논란", "갑질", "학폭", "폭로", "비판", "사과", "해명", "의혹"],
+    "열애": ["열애", "결혼", "이혼", "파혼", "연인", "커플", "교제"],
+    "컴백": ["컴백", "신곡", "앨범", "발매", "활동", "무대", "데뷔"],
+    "사건": ["사고", "소송", "구속", "체포", "기소", "재판", "사망"],
+    "근황": ["근황", "복귀", "활동", "방송", "출연", "인스타"],
+}
+_ISSUE_TYPE_MATCHER = KeywordMatcher(ISSUE_TYPE_KEYWORDS)
+
+# 알려진 연예인 → 운동선수 순서 (라이브러리 등록 순서가 곧 우선순위)
+_KNOWN_PERSON_MATCHER = KeywordMatcher(
+    [name for name in CELEBRITY_SILHOUETTES if name not in ("default_male", "default_female")]
+    + [name for name in ATHLETE_SILHOUETTES if name != "default_athlete"]
+)
 
 
 def google_news_rss_url(query: str) -> str:
@@ -91,15 +111,10 @@ def extract_celebrity_name(text: str) -> Optional[str]:
         "도파민", "나락", "트렌드", "현상", "연말결산", "베스트", "최고", "최악", "순위",
     }
 
-    # 1) 알려진 연예인 목록에서 찾기 (최우선)
-    for celeb in CELEBRITY_SILHOUETTES.keys():
-        if celeb in text and celeb not in ["default_male", "default_female"]:
-            return celeb
-
-    # 1-1) 운동선수 목록에서도 찾기
-    for athlete in ATHLETE_SILHOUETTES.keys():
-        if athlete in text and athlete not in ["default_athlete"]:
-            return athlete
+    # 1) 알려진 연예인 → 운동선수 목록에서 찾기 (최우선, 한 번의 스캔)
+    known = _KNOWN_PERSON_MATCHER.first_label(text)
+    if known:
+        return known
 
     # 2) ★ 뉴스 제목 패턴: "이시영," "박나래가" 같은 실명 패턴 우선
     #    - 쉼표/마침표 앞의 3글자 이름 (뉴스 제목에서 흔한 패턴)
@@ -161,20 +176,7 @@ def detect_issue_type(text: str) -> str:
     Returns:
         논란/열애/컴백/사건/근황
     """
-    keywords = {
-        "논란": ["논란", "갑질", "학폭", "폭로", "비판", "사과", "해명", "의혹"],
-        "열애": ["열애", "결혼", "이혼", "파혼", "연인", "커플", "교제"],
-        "컴백": ["컴백", "신곡", "앨범", "발매", "활동", "무대", "데뷔"],
-        "사건": ["사고", "소송", "구속", "체포", "기소", "재판", "사망"],
-        "근황": ["근황", "복귀", "활동", "방송", "출연", "인스타"],
-    }
-
-    for issue_type, words in keywords.items():
-        for word in words:
-            if word in text:
-                return issue_type
-
-    return "근황"  # 기본값
+    return _ISSUE_TYPE_MATCHER.first_label(text) or "근황"  # 기본값
 
 
 def get_silhouette_description(
@@ -285,10 +287,25 @@ def compute_hash(text: str) -> str:
     return hashlib.md5(text.encode()).hexdigest()[:12]
 
 
+def mark_news_seen(items: List[Dict[str, Any]]):
+    """
+    처리가 끝난 뉴스를 실행 간 중복 인덱스에 기록 (시트 저장/대본 생성 성공 후 호출)
+
+    collect_entertainment_news는 확인만 하고 기록하지 않음 → 실패한 실행의 뉴스가 만료 기간 동안 막히지 않음
+    """
+    news_dedupe.mark_items_seen(
+        items, "shorts",
+        key=lambda item: compute_hash(item.get("person", "") + item.get("news_url", "")),
+        text=lambda item: item.get("news_summary") or item.get("news_title", ""),
+        title=lambda item: item.get("news_title", ""),
+    )
+
+
 def collect_entertainment_news(
     max_per_feed: int = 10,
     total_limit: int = 20,
-    categories: List[str] = None
+    categories: List[str] = None,
+    only_new: bool = False
 ) -> List[Dict[str, Any]]:
     """
     뉴스 수집 메인 함수 (모든 카테고리 지원)
@@ -297,6 +314,7 @@ def collect_entertainment_news(
         max_per_feed: 피드당 최대 수집 수
         total_limit: 전체 최대 수집 수
         categories: 수집할 카테고리 목록 (None이면 전체)
+        only_new: True면 지난 실행 이후 새로 올라온 기사만
 
     Returns:
         [
@@ -323,6 +341,14 @@ def collect_entertainment_news(
     if categories is None:
         categories = CONTENT_CATEGORIES  # ["연예인", "운동선수", "국뽕"]
 
+    # 모든 카테고리 피드를 한 번에 동시 수집 (조건부 GET, 변경 없는 피드는 지난 항목 재사용)
+    feed_urls = [
+        feed_config["url"]
+        for category in categories if category in RSS_FEEDS
+        for feed_config in RSS_FEEDS[category]
+    ]
+    feed_results = fetch_feeds(feed_urls, max_items=max_per_feed)
+
     for category in categories:
         if category not in RSS_FEEDS:
             print(f"[SHORTS] 알 수 없는 카테고리: {category}")
@@ -335,8 +361,12 @@ def collect_entertainment_news(
             feed_name = feed_config["name"]
             feed_url = feed_config["url"]
 
-            print(f"[SHORTS] RSS 수집 중: {feed_name}")
-            items = fetch_rss_feed(feed_url, max_items=max_per_feed)
+            result = feed_results.get(feed_url, {})
+            if result.get("error"):
+                print(f"[SHORTS] RSS 피드 가져오기 실패: {feed_name} - {result['error']}")
+                continue
+            items = result["new_entries"] if only_new else result["entries"]
+            print(f"[SHORTS] RSS 수집: {feed_name} ({len(items)}개)")
 
             for item in items:
                 title = item["title"]
@@ -348,12 +378,20 @@ def collect_entertainment_news(
                 if not person:
                     continue  # 인물 이름 없으면 스킵
 
-                # 중복 체크
+                # 중복 체크 (이번 실행 + 지난 실행에서 처리한 같은 이야기)
                 item_hash = compute_hash(person + link)
                 if item_hash in seen_hashes:
                     continue
                 seen_hashes.add(item_hash)
 
+                # 뉴스 요약 (중복 인덱스 비교 텍스트로도 사용 - mark_news_seen과 같은 텍스트)
+                news_summary = summarize_news(title, summary)
+
+                duplicate = news_dedupe.find_duplicate("shorts", item_hash, news_summary)
+                if duplicate:
+                    print(f"[SHORTS] 이미 수집한 이야기 스킵: {title[:30]} ≈ {duplicate['title'][:30]}")
+                    continue
+
                 # 이슈 유형 감지
                 issue_type = detect_issue_type(title + " " + summary)
 
@@ -363,9 +401,6 @@ def collect_entertainment_news(
                 # 훅 문장
                 hook_text = generate_hook_text(person, issue_type, title)
 
-                # 뉴스 요약
-                news_summary = summarize_news(title, summary)
-
                 all_items.append({
                     "run_id": today,
                     "category": category,        # ✅ 카테고리 추가
@@ -494,26 +529,11 @@ def collect_and_score_news(
     top_items = news_items[:score_top_n]
     scored_items = []
 
-    for item in top_items:
-        url = item.get("news_url", "")
-        issue_type = item.get("issue_type", "근황")
-
-        # 바이럴 잠재력 분석 (댓글 수집 + 점수화)
-        analysis = analyze_news_viral_potential(url, issue_type)
-
-        # 결과 병합
-        item_with_score = item.copy()
-        item_with_score["viral_score"] = analysis["viral_score"]
-        item_with_score["script_hints"] = analysis["script_hints"]
-        item_with_score["comments_summary"] = {
-            "count": analysis["comments_data"].get("comment_count", 0),
-            "top_keywords": analysis["comments_data"].get("top_keywords", []),
-            "pro_ratio": analysis["comments_data"].get("pro_ratio", 0.5),
-        }
-
+    # 바이럴 잠재력 분석 (댓글 수집 + 점수화) - 호스트별 속도 제한 안에서 동시 실행
+    for item, analysis in analyze_news_batch(top_items):
         # 최소 점수 이상만 포함
         if analysis["viral_score"]["total_score"] >= min_score:
-            scored_items.append(item_with_score)
+            scored_items.append(merge_viral_analysis(item, analysis))
             print(f"  ✅ {item['person']}: 점수={analysis['viral_score']['total_score']}, 등급={analysis['viral_score']['grade']}")
         else:
             print(f"  ❌ {item['person']}: 점수={analysis['viral_score']['total_score']} (최소 {min_score} 미달)")
@@ -7,12 +7,16 @@
 3. 찬/반 의견 분류
 4. 대본에 반영할 핵심 표현 추출
 5. Google News 리다이렉트 URL 해결
-6. API 캐싱 및 속도 제한 (차단 방지)
+6. API 캐싱 및 속도 제한 (차단 방지) - 호스트별 속도 제한 + 동시 수집, LRU/TTL 디스크 캐시
 """
 
+import os
 import re
+import threading
 import time
 import requests
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from typing import List, Dict, Any, Optional, Tuple
 from datetime import datetime, timedelta
 from urllib.parse import urlparse, parse_qs, unquote
@@ -21,28 +25,50 @@ import base64
 import hashlib
 from functools import lru_cache
 
+from scripts.common.keyword_matcher import KeywordMatcher
+
 # User-Agent 설정 (차단 방지)
 HEADERS = {
     "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
     "Accept-Language": "ko-KR,ko;q=0.9,en-US;q=0.8,en;q=0.7",
 }
 
-# API 속도 제한 설정
+# API 속도 제한 설정 (호스트별 독립 - 네이버 대기 중에도 다음/Google 요청은 진행)
 RATE_LIMIT_DELAY = 0.5  # 요청 간 최소 대기 시간 (초)
-_last_request_time = 0.0
+HOST_RATE_LIMITS = {
+    "naver": RATE_LIMIT_DELAY,
+    "daum": RATE_LIMIT_DELAY,
+    "google": 0.2,
+}
+_rate_lock = threading.Lock()
+_next_request_time: Dict[str, float] = {}
 
-# 간단한 메모리 캐시 (URL → 댓글 데이터)
-_comment_cache: Dict[str, Tuple[float, Dict]] = {}
+# 호스트별 댓글 수집/URL 해결 동시 실행 수 (호스트별 속도 제한은 그대로 적용)
+COMMENT_FETCH_WORKERS = int(os.environ.get("COMMENT_FETCH_WORKERS", "3"))
+
+# 댓글/URL 해결 캐시 (LRU + TTL, 디스크에 저장해 1시간 내 재실행은 네트워크 없이 응답)
+_comment_cache: "OrderedDict[str, Tuple[float, Dict]]" = OrderedDict()
+_cache_lock = threading.Lock()
+_cache_loaded = False
+_cache_dirty = False
 CACHE_TTL = 3600  # 캐시 유효 시간 (1시간)
+CACHE_MAX_ENTRIES = 500
+CACHE_PATH = os.environ.get(
+    "NEWS_COMMENT_CACHE_PATH",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+                 "data", "comment_cache.json"),
+)
 
 
-def _rate_limit():
-    """API 호출 간 속도 제한"""
-    global _last_request_time
-    elapsed = time.time() - _last_request_time
-    if elapsed < RATE_LIMIT_DELAY:
-        time.sleep(RATE_LIMIT_DELAY - elapsed)
-    _last_request_time = time.time()
+def _rate_limit(host: str = "naver"):
+    """호스트별 API 호출 간 속도 제한 (동시 호출은 순서대로 슬롯 예약 후 대기)"""
+    delay = HOST_RATE_LIMITS.get(host, RATE_LIMIT_DELAY)
+    with _rate_lock:
+        now = time.time()
+        slot = max(now, _next_request_time.get(host, 0.0))
+        _next_request_time[host] = slot + delay
+    if slot > now:
+        time.sleep(slot - now)
 
 
 def _get_cache_key(url: str) -> str:
@@ -50,28 +76,71 @@ def _get_cache_key(url: str) -> str:
     return hashlib.md5(url.encode()).hexdigest()
 
 
+def _load_cache():
+    """디스크 캐시를 한 번만 읽기 (_cache_lock 보유 상태, 만료 항목 제외)"""
+    global _cache_loaded
+    if _cache_loaded:
+        return
+    _cache_loaded = True
+    try:
+        with open(CACHE_PATH, "r", encoding="utf-8") as f:
+            entries = json.load(f)
+    except (OSError, ValueError):
+        return
+    now = time.time()
+    for key, (cached_time, data) in entries:
+        if now - cached_time < CACHE_TTL:
+            _comment_cache[key] = (cached_time, data)
+    while len(_comment_cache) > CACHE_MAX_ENTRIES:
+        _comment_cache.popitem(last=False)
+
+
+def save_cache():
+    """변경된 캐시를 디스크에 저장 (임시 파일 교체)"""
+    global _cache_dirty
+    with _cache_lock:
+        if not _cache_dirty:
+            return
+        entries = [[key, value] for key, value in _comment_cache.items()]
+        _cache_dirty = False
+    try:
+        os.makedirs(os.path.dirname(CACHE_PATH), exist_ok=True)
+        tmp_path = f"{CACHE_PATH}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(entries, f, ensure_ascii=False)
+        os.replace(tmp_path, CACHE_PATH)
+    except OSError as e:
+        print(f"[NewsScorer] 캐시 저장 실패: {e}")
+
+
 def _get_cached(url: str) -> Optional[Dict]:
     """캐시에서 댓글 데이터 조회"""
     key = _get_cache_key(url)
-    if key in _comment_cache:
-        cached_time, data = _comment_cache[key]
-        if time.time() - cached_time < CACHE_TTL:
-            print(f"[NewsScorer] 캐시 히트: {url[:40]}...")
-            return data
-        else:
+    with _cache_lock:
+        _load_cache()
+        entry = _comment_cache.get(key)
+        if entry is None:
+            return None
+        cached_time, data = entry
+        if time.time() - cached_time >= CACHE_TTL:
             del _comment_cache[key]  # 만료된 캐시 삭제
-    return None
+            return None
+        _comment_cache.move_to_end(key)
+    print(f"[NewsScorer] 캐시 히트: {url[:40]}...")
+    return data
 
 
 def _set_cache(url: str, data: Dict):
-    """댓글 데이터를 캐시에 저장"""
+    """댓글 데이터를 캐시에 저장 (가장 오래 안 쓴 항목부터 제거)"""
+    global _cache_dirty
     key = _get_cache_key(url)
-    _comment_cache[key] = (time.time(), data)
-
-    # 캐시 크기 제한 (최대 100개)
-    if len(_comment_cache) > 100:
-        oldest_key = min(_comment_cache.keys(), key=lambda k: _comment_cache[k][0])
-        del _comment_cache[oldest_key]
+    with _cache_lock:
+        _load_cache()
+        _comment_cache[key] = (time.time(), data)
+        _comment_cache.move_to_end(key)
+        while len(_comment_cache) > CACHE_MAX_ENTRIES:
+            _comment_cache.popitem(last=False)
+        _cache_dirty = True
 
 
 # ============================================================
@@ -113,8 +182,14 @@ def resolve_google_news_url(google_url: str, timeout: int = 10) -> Optional[str]
             print(f"[NewsScorer] URL 디코딩 성공: {decoded_url[:50]}...")
             return decoded_url
 
+        # 이전 실행에서 해결한 URL 재사용
+        cached = _get_cached(f"resolve:{google_url}")
+        if cached:
+            return cached["url"]
+
         # 방법 2: HTTP 리다이렉트 추적
         print(f"[NewsScorer] 리다이렉트 추적 중: {google_url[:50]}...")
+        _rate_limit("google")
         response = requests.head(
             google_url,
             headers=HEADERS,
@@ -126,13 +201,16 @@ def resolve_google_news_url(google_url: str, timeout: int = 10) -> Optional[str]
         # Google URL에서 벗어났는지 확인
         if "news.google.com" not in final_url:
             print(f"[NewsScorer] 리다이렉트 성공: {final_url[:50]}...")
+            _set_cache(f"resolve:{google_url}", {"url": final_url})
             return final_url
 
         # 방법 3: GET 요청으로 실제 페이지에서 추출
+        _rate_limit("google")
         response = requests.get(google_url, headers=HEADERS, timeout=timeout)
         # meta refresh나 canonical URL 추출 시도
         canonical_match = re.search(r'<link[^>]+rel="canonical"[^>]+href="([^"]+)"', response.text)
         if canonical_match:
+            _set_cache(f"resolve:{google_url}", {"url": canonical_match.group(1)})
             return canonical_match.group(1)
 
         return google_url  # 실패 시 원본 반환
@@ -360,7 +438,7 @@ def fetch_naver_comments(
         return {"success": False, "error": "네이버 뉴스 URL이 아닙니다"}
 
     # 속도 제한 적용
-    _rate_limit()
+    _rate_limit("naver")
 
     oid, aid = article_ids
 
@@ -481,7 +559,7 @@ def fetch_daum_comments(
         return {"success": False, "error": "다음 뉴스 URL이 아닙니다"}
 
     # 속도 제한 적용
-    _rate_limit()
+    _rate_limit("daum")
 
     article_id = match.group(1)
 
@@ -551,27 +629,29 @@ def fetch_daum_comments(
 # 감정 분석 및 키워드 추출
 # ============================================================
 
-def analyze_sentiment(text: str) -> str:
-    """
-    간단한 감정 분석 (키워드 기반)
-
-    Returns: "positive", "negative", "neutral"
-    """
-    positive_words = [
+SENTIMENT_KEYWORDS = {
+    "positive": [
         "좋아", "최고", "응원", "대박", "멋지", "잘했", "축하", "기대", "감동",
         "사랑", "행복", "웃기", "귀엽", "예쁘", "잘생", "존경", "화이팅",
-    ]
-
-    negative_words = [
+    ],
+    "negative": [
         "싫어", "최악", "실망", "별로", "쓰레기", "쓰렉", "진짜", "선넘", "선 넘",
         "갑질", "학폭", "폭로", "비판", "논란", "혐오", "역겹", "짜증", "화나",
         "실화", "헐", "에휴", "한심", "어이없", "그만", "꺼져", "나가",
-    ]
+    ],
+}
+_SENTIMENT_MATCHER = KeywordMatcher(SENTIMENT_KEYWORDS, lowercase=True)
 
-    text_lower = text.lower()
 
-    pos_count = sum(1 for w in positive_words if w in text_lower)
-    neg_count = sum(1 for w in negative_words if w in text_lower)
+def analyze_sentiment(text: str) -> str:
+    """
+    간단한 감정 분석 (키워드 기반, 댓글 한 번 스캔)
+
+    Returns: "positive", "negative", "neutral"
+    """
+    counts = _SENTIMENT_MATCHER.count_by_label(text)
+    pos_count = counts.get("positive", 0)
+    neg_count = counts.get("negative", 0)
 
     if neg_count > pos_count:
         return "negative"
@@ -696,10 +776,42 @@ def generate_script_hints(comments_data: Dict[str, Any]) -> Dict[str, Any]:
 # 통합 함수: 뉴스 분석
 # ============================================================
 
+def _resolve_news_url(url: str) -> str:
+    """Google News URL이면 실제 기사 URL로 해결 (아니면 그대로)"""
+    resolved_url = url
+    if "news.google.com" in url:
+        resolved_url = resolve_google_news_url(url) or url
+        if resolved_url != url:
+            print(f"[NewsScorer] 실제 URL: {resolved_url[:50]}...")
+    return resolved_url
+
+
+def _comment_host(url: str) -> Optional[str]:
+    """댓글 API 호스트 (naver / daum / 미지원 None)"""
+    if "naver.com" in url:
+        return "naver"
+    if "daum.net" in url:
+        return "daum"
+    return None
+
+
+def fetch_comments(resolved_url: str) -> Dict[str, Any]:
+    """뉴스 소스 판별 후 댓글 수집"""
+    host = _comment_host(resolved_url)
+    if host == "naver":
+        return fetch_naver_comments(resolved_url)
+    if host == "daum":
+        return fetch_daum_comments(resolved_url)
+    # 기타 소스 (연합뉴스, 조선일보 등) - 댓글 없음
+    return {"success": False, "error": f"댓글 미지원 소스: {urlparse(resolved_url).netloc}"}
+
+
 def analyze_news_viral_potential(
     url: str,
     issue_type: str = "근황",
-    hours_ago: int = 12
+    hours_ago: int = 12,
+    resolved_url: Optional[str] = None,
+    comments_data: Optional[Dict[str, Any]] = None
 ) -> Dict[str, Any]:
     """
     뉴스 바이럴 잠재력 종합 분석
@@ -708,6 +820,7 @@ def analyze_news_viral_potential(
         url: 뉴스 URL (Google News, 네이버, 다음 모두 지원)
         issue_type: 이슈 유형
         hours_ago: 뉴스 발행 후 경과 시간
+        resolved_url, comments_data: 이미 구한 값 (analyze_news_batch에서 전달, 없으면 직접 수집)
 
     Returns:
         {
@@ -720,20 +833,12 @@ def analyze_news_viral_potential(
     print(f"[NewsScorer] 뉴스 분석 시작: {url[:50]}...")
 
     # 1) Google News URL인 경우 실제 URL로 해결
-    resolved_url = url
-    if "news.google.com" in url:
-        resolved_url = resolve_google_news_url(url) or url
-        if resolved_url != url:
-            print(f"[NewsScorer] 실제 URL: {resolved_url[:50]}...")
+    if resolved_url is None:
+        resolved_url = _resolve_news_url(url)
 
     # 2) 뉴스 소스 판별 및 댓글 수집
-    if "naver.com" in resolved_url or "n.news.naver.com" in resolved_url:
-        comments_data = fetch_naver_comments(resolved_url)
-    elif "daum.net" in resolved_url or "v.daum.net" in resolved_url:
-        comments_data = fetch_daum_comments(resolved_url)
-    else:
-        # 기타 소스 (연합뉴스, 조선일보 등) - 댓글 없음
-        comments_data = {"success": False, "error": f"댓글 미지원 소스: {urlparse(resolved_url).netloc}"}
+    if comments_data is None:
+        comments_data = fetch_comments(resolved_url)
 
     # 댓글 데이터 기반 점수 계산
     if comments_data.get("success"):
@@ -772,6 +877,92 @@ def analyze_news_viral_potential(
 # 뉴스 목록 점수화 및 정렬
 # ============================================================
 
+def analyze_news_batch(
+    news_items: List[Dict[str, Any]],
+    max_workers: int = None
+) -> List[Tuple[Dict[str, Any], Dict[str, Any]]]:
+    """
+    여러 뉴스를 동시에 분석 (URL 해결 + 댓글 수집)
+
+    Google(URL 해결)/네이버/다음 호스트마다 별도 워커 풀과 속도 제한을 두고,
+    URL이 해결되는 대로 해당 호스트 풀에 댓글 수집을 넘깁니다.
+    → 네이버 속도 제한을 기다리는 동안 다음/Google 요청이 막히지 않음
+
+    Returns:
+        [(뉴스, analyze_news_viral_potential 결과), ...] - 입력 순서 유지
+    """
+    if not news_items:
+        return []
+
+    workers = max(1, max_workers or COMMENT_FETCH_WORKERS)
+    urls = [item.get("news_url", "") for item in news_items]
+    started = time.time()
+
+    pools = {
+        host: ThreadPoolExecutor(max_workers=workers, thread_name_prefix=f"news-{host}")
+        for host in HOST_RATE_LIMITS
+    }
+    try:
+        # 1) URL 해결 (Google News만 네트워크 필요)
+        resolve_futures = {}
+        resolved = {}
+        for index, url in enumerate(urls):
+            if "news.google.com" in url:
+                resolve_futures[pools["google"].submit(_resolve_news_url, url)] = index
+            else:
+                resolved[index] = url
+
+        # 2) 해결된 순서대로 호스트별 풀에 댓글 수집 제출
+        comment_futures = {}
+
+        def _submit_comments(index):
+            host = _comment_host(resolved[index])
+            if host:
+                comment_futures[index] = pools[host].submit(fetch_comments, resolved[index])
+
+        for index in list(resolved):
+            _submit_comments(index)
+        for future in as_completed(resolve_futures):
+            index = resolve_futures[future]
+            try:
+                resolved[index] = future.result() or urls[index]
+            except Exception as e:
+                print(f"[NewsScorer] URL 해결 실패: {e}")
+                resolved[index] = urls[index]
+            _submit_comments(index)
+
+        # 3) 점수 계산 (입력 순서)
+        results = []
+        for index, item in enumerate(news_items):
+            comments_data = comment_futures[index].result() if index in comment_futures else None
+            analysis = analyze_news_viral_potential(
+                urls[index], item.get("issue_type", "근황"),
+                resolved_url=resolved[index], comments_data=comments_data,
+            )
+            results.append((item, analysis))
+    finally:
+        for pool in pools.values():
+            pool.shutdown(wait=True, cancel_futures=True)
+        save_cache()
+
+    print(f"[NewsScorer] {len(news_items)}개 뉴스 분석: {time.time() - started:.1f}초 "
+          f"(호스트별 동시 {workers}개)")
+    return results
+
+
+def merge_viral_analysis(item: Dict[str, Any], analysis: Dict[str, Any]) -> Dict[str, Any]:
+    """분석 결과를 뉴스 항목에 병합 (viral_score, script_hints, comments_summary 추가)"""
+    item_with_score = item.copy()
+    item_with_score["viral_score"] = analysis["viral_score"]
+    item_with_score["script_hints"] = analysis["script_hints"]
+    item_with_score["comments_summary"] = {
+        "count": analysis["comments_data"].get("comment_count", 0),
+        "top_keywords": analysis["comments_data"].get("top_keywords", []),
+        "pro_ratio": analysis["comments_data"].get("pro_ratio", 0.5),
+    }
+    return item_with_score
+
+
 def rank_news_by_viral_potential(
     news_items: List[Dict[str, Any]],
     min_score: float = 30,
@@ -790,26 +981,10 @@ def rank_news_by_viral_potential(
     """
     scored_items = []
 
-    for item in news_items:
-        url = item.get("news_url", "")
-        issue_type = item.get("issue_type", "근황")
-
-        # 분석 수행
-        analysis = analyze_news_viral_potential(url, issue_type)
-
-        # 결과 병합
-        item_with_score = item.copy()
-        item_with_score["viral_score"] = analysis["viral_score"]
-        item_with_score["script_hints"] = analysis["script_hints"]
-        item_with_score["comments_summary"] = {
-            "count": analysis["comments_data"].get("comment_count", 0),
-            "top_keywords": analysis["comments_data"].get("top_keywords", []),
-            "pro_ratio": analysis["comments_data"].get("pro_ratio", 0.5),
-        }
-
+    for item, analysis in analyze_news_batch(news_items):
         # 최소 점수 이상만 포함
         if analysis["viral_score"]["total_score"] >= min_score:
-            scored_items.append(item_with_score)
+            scored_items.append(merge_viral_analysis(item, analysis))
 
     # 점수순 정렬
     scored_items.sort(key=lambda x: x["viral_score"]["total_score"], reverse=True)
@@ -72,6 +72,7 @@ from .sheets import (
 )
 from .news_collector import (
     collect_entertainment_news,
+    mark_news_seen,
     search_celebrity_news,
     collect_and_score_news,
     get_best_news_for_shorts,
@@ -83,7 +84,7 @@ try:
         get_best_shorts_topic,
         youtube_to_news_format,
         search_shorts_by_category,
-        get_video_comments,
+        get_comments_batch,
         enrich_topic_with_news,  # 뉴스 기사 연동
     )
     YOUTUBE_SEARCH_AVAILABLE = True
@@ -96,7 +97,7 @@ from .script_generator import (
 )
 
 # 메인 파이프라인 이미지 모듈 사용 (OpenRouter API)
-from image import generate_image as main_generate_image, generate_thumbnail_image, GEMINI_FLASH, GEMINI_PRO
+from image import generate_image as main_generate_image, generate_thumbnail_image, get_decoded_frame, GEMINI_FLASH, GEMINI_PRO
 
 
 # ============================================================
@@ -505,6 +506,9 @@ def generate_single_image(
                 image_bytes = base64.b64decode(base64_data)
                 with open(output_path, "wb") as f:
                     f.write(image_bytes)
+            elif os.path.isabs(image_url) and os.path.exists(image_url):
+                # image 모듈이 저장한 실제 파일 경로 - 이동하면 inode가 유지되어 디코딩 프레임 재사용 가능
+                shutil.move(image_url, output_path)
             elif image_url.startswith("/static/"):
                 # 로컬 파일 경로인 경우 - 프로젝트 루트 기준
                 src_path = os.path.join(project_root, image_url.lstrip("/"))
@@ -671,6 +675,8 @@ NO text on image
             image_bytes = base64.b64decode(base64_data)
             with open(temp_1x1_path, "wb") as f:
                 f.write(image_bytes)
+        elif os.path.isabs(image_url) and os.path.exists(image_url):
+            shutil.move(image_url, temp_1x1_path)
         elif image_url.startswith("/static/"):
             src_path = os.path.join(project_root, image_url.lstrip("/"))
             if os.path.exists(src_path):
@@ -743,8 +749,8 @@ def compose_frame(
         bg_rgb = tuple(int(bg_color.lstrip('#')[i:i+2], 16) for i in (0, 2, 4))
         background = PILImage.new('RGB', (VIDEO_WIDTH, VIDEO_HEIGHT), bg_rgb)
 
-        # 1:1 이미지 로드 및 리사이즈
-        img = PILImage.open(image_path)
+        # 1:1 이미지 로드 및 리사이즈 (방금 생성한 이미지는 디코딩된 프레임 재사용)
+        img = get_decoded_frame(image_path) or PILImage.open(image_path)
         img_size = FRAME_LAYOUT["image_size"]  # 720
         img = img.resize((img_size, img_size), PILImage.Resampling.LANCZOS)
 
@@ -1403,37 +1409,36 @@ def render_video(
 def mix_bgm_with_video(
     video_path: str,
     issue_type: str,
-    output_path: str = None
+    output_path: str = None,
+    sentence_timings: List[Dict[str, Any]] = None
 ) -> Dict[str, Any]:
     """
-    비디오에 BGM 믹싱
+    비디오에 BGM 믹싱 (나레이션 구간에서는 BGM 더킹)
 
     Args:
         video_path: 원본 비디오 경로
         issue_type: 이슈 타입 (BGM 분위기 결정)
         output_path: 출력 경로 (없으면 원본 대체)
+        sentence_timings: TTS 문장 타이밍 [{"start", "end"}, ...] (없으면 RMS 검출)
 
     Returns:
         {"ok": True, "path": "..."}
     """
-    import glob
     import random
+    from scripts.common import audio_library
+    from scripts.common.audio_mixer import mix_narration_with_bgm
 
     try:
         # 1) 이슈 타입에 맞는 BGM 분위기 선택
         bgm_mood = SHORTS_BGM_MOODS.get(issue_type, SHORTS_BGM_MOODS.get("default", "dramatic"))
         print(f"[BGM] 분위기 선택: {issue_type} → {bgm_mood}")
 
-        # 2) BGM 파일 찾기
-        script_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-        bgm_dir = os.path.join(script_dir, "static", "audio", "bgm")
-
-        # 해당 분위기의 BGM 파일 목록
-        bgm_files = glob.glob(os.path.join(bgm_dir, f"{bgm_mood}_*.mp3"))
+        # 2) BGM 파일 찾기 (라이브러리 인덱스)
+        bgm_files = audio_library.find_files("bgm", bgm_mood)
 
         if not bgm_files:
             # fallback: dramatic
-            bgm_files = glob.glob(os.path.join(bgm_dir, "dramatic_*.mp3"))
+            bgm_files = audio_library.find_files("bgm", "dramatic")
 
         if not bgm_files:
             print(f"[BGM] BGM 파일 없음: {bgm_mood}")
@@ -1443,24 +1448,31 @@ def mix_bgm_with_video(
         bgm_path = random.choice(bgm_files)
         print(f"[BGM] 선택된 파일: {os.path.basename(bgm_path)}")
 
-        # 3) 비디오 길이 확인
-        probe_cmd = ["ffprobe", "-v", "error", "-show_entries", "format=duration",
-                     "-of", "default=noprint_wrappers=1:nokey=1", video_path]
-        result = subprocess.run(probe_cmd, capture_output=True, text=True, timeout=30)
-        video_duration = float(result.stdout.strip())
-
-        # 4) BGM 볼륨 설정
+        # 3) BGM 볼륨 설정
         bgm_volume = SHORTS_BGM_CONFIG.get("volume", 0.15)
         fade_in = SHORTS_BGM_CONFIG.get("fade_in", 1.0)
         fade_out = SHORTS_BGM_CONFIG.get("fade_out", 2.0)
 
-        fade_out_start = max(0, video_duration - fade_out)
-
-        # 5) 출력 경로 설정
+        # 4) 출력 경로 설정
         if output_path is None:
             output_path = video_path.replace(".mp4", "_bgm.mp4")
 
-        # 6) FFmpeg 믹싱
+        # 5) 더킹 엔진 (영상 복사 + 오디오 한 번에 믹싱) - 실패 시 FFmpeg amix로 폴백
+        if mix_narration_with_bgm(video_path, bgm_path, output_path, bgm_volume=bgm_volume,
+                                  timeline=sentence_timings, video=True,
+                                  fade_in=fade_in, fade_out=fade_out, log_prefix="[BGM]"):
+            print("[BGM] 믹싱 완료")
+            return {"ok": True, "path": output_path}
+
+        # (폴백) 비디오 길이 확인
+        probe_cmd = ["ffprobe", "-v", "error", "-show_entries", "format=duration",
+                     "-of", "default=noprint_wrappers=1:nokey=1", video_path]
+        result = subprocess.run(probe_cmd, capture_output=True, text=True, timeout=30)
+        video_duration = float(result.stdout.strip())
+
+        fade_out_start = max(0, video_duration - fade_out)
+
+        # FFmpeg 믹싱
         ffmpeg_cmd = [
             "ffmpeg", "-y",
             "-i", video_path,
@@ -1637,7 +1649,8 @@ def run_video_generation(
         bgm_result = mix_bgm_with_video(
             video_path=render_result["path"],
             issue_type=issue_type,
-            output_path=final_video_path
+            output_path=final_video_path,
+            sentence_timings=sentence_timings
         )
 
         if bgm_result.get("ok"):
@@ -1736,12 +1749,14 @@ def run_news_collection(
 
         saved = 0
         duplicates = 0
+        handled = []  # 시트에 있거나 저장에 성공한 뉴스 → 실행 간 중복 인덱스에 기록
 
         for item in news_items:
             # 중복 체크 (person 필드 사용)
             person = item.get("person", item.get("celebrity", ""))
             if check_duplicate(service, spreadsheet_id, person, item["news_url"]):
                 duplicates += 1
+                handled.append(item)
                 print(f"[SHORTS] 중복 스킵: {person} - {item['news_title'][:30]}...")
                 continue
 
@@ -1751,8 +1766,11 @@ def run_news_collection(
             # 시트에 추가
             append_row(service, spreadsheet_id, item)
             saved += 1
+            handled.append(item)
             print(f"[SHORTS] 저장: {person} - {item['issue_type']}")
 
+        mark_news_seen(handled)
+
         print(f"\n[SHORTS] 수집 완료: {len(news_items)}개 중 {saved}개 저장, {duplicates}개 중복")
 
         return {
@@ -1834,6 +1852,7 @@ def run_youtube_collection(
                         "sample_videos": [video],
                     })
 
+            comment_targets = []
             for topic in topics[:max_items]:
                 # 참여도 필터 (0이면 필터 비활성화)
                 engagement = topic.get("avg_engagement", 0)
@@ -1853,16 +1872,21 @@ def run_youtube_collection(
                 news_format["category"] = category
                 news_format["source"] = "youtube+news"  # 하이브리드 소스
 
-                # 상위 영상 댓글 수집 (script_hints용)
+                # 상위 영상 (댓글은 카테고리 단위로 한 번에 수집)
                 if enriched_topic.get("sample_videos"):
-                    top_video = enriched_topic["sample_videos"][0]
-                    comments = get_video_comments(top_video["video_id"], max_results=20)
-                    news_format["script_hints"]["hot_phrases"] = [c.get("text", "")[:50] for c in comments[:5]]
+                    comment_targets.append((news_format, enriched_topic["sample_videos"][0]["video_id"]))
 
                 all_topics.append(news_format)
 
                 print(f"  ✅ {topic['topic']}: {topic['video_count']}개 영상 + {len(enriched_topic.get('news_articles', []))}개 뉴스")
 
+            # 상위 영상 댓글 동시 수집 (script_hints용)
+            if comment_targets:
+                comments_by_video = get_comments_batch([vid for _, vid in comment_targets], max_results=20)
+                for news_format, vid in comment_targets:
+                    comments = comments_by_video.get(vid, [])
+                    news_format["script_hints"]["hot_phrases"] = [c.get("text", "")[:50] for c in comments[:5]]
+
         if not all_topics:
             return {"ok": False, "error": "수집된 트렌딩 주제 없음"}
 
@@ -2358,6 +2382,8 @@ def run_viral_pipeline(
         total_cost += script_result.get("cost", 0)
 
         print(f"[SHORTS] 대본 생성 완료: {script_result.get('total_chars', 0)}자")
+        if source != "youtube":
+            mark_news_seen([best_news])  # 대본까지 만든 RSS 뉴스는 다음 실행부터 제외
 
         # ============================================================
         # 3단계: 시트에 저장 (옵션)
@@ -161,9 +161,9 @@ def extract_features_with_llm(
         영어 실루엣 프롬프트
     """
     try:
-        from openai import OpenAI
+        from scripts.common.llm_clients import require_client, invalidate
 
-        client = OpenAI()
+        client = require_client("openai", cache_ttl=86400)  # 같은 인물 재요청은 캐시 응답
 
         # 프롬프트 구성
         if search_result:
@@ -220,6 +220,8 @@ def extract_features_with_llm(
 
         # 따옴표 제거
         result = result.strip('"\'')
+        if not result:
+            invalidate(response)  # 빈 응답은 다음 요청에서 다시 생성
 
         print(f"[SilhouetteGenerator] LLM 결과: {result}")
         return result
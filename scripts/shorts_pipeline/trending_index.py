@@ -0,0 +1,253 @@
+"""
+쇼츠 파이프라인 - YouTube 트렌딩 증분 인덱스
+
+트렌딩 주제를 고를 때마다 search.list(100 유닛) + videos.list + 영상별 commentThreads.list를
+새로 호출해서, 하루에 여러 번 주제를 고르면 같은 영상을 계속 다시 조회했습니다.
+
+이 모듈은 본 영상과 통계 스냅샷을 저장해 두고 바뀐 부분만 다시 받게 합니다.
+- 검색: (검색어, 조건) → 영상 ID 목록 (YOUTUBE_SEARCH_TTL, 기본 3시간 동안 재사용)
+- 영상: 최신 통계 스냅샷 (YOUTUBE_STATS_TTL, 기본 30분 지난 영상만 videos.list로 갱신)
+  + 스냅샷 이력 (조회수 증가 추세 확인용)
+- 댓글: 영상별 댓글 목록 (YOUTUBE_COMMENTS_TTL, 기본 6시간 또는 댓글 수가 20% 이상 늘면 다시 받음)
+
+저장 위치: data/youtube_trending.db (YOUTUBE_TRENDING_DB로 변경, YOUTUBE_TRENDING_INDEX_ENABLED=0이면 끔)
+
+사용법:
+    from . import trending_index
+
+    video_ids = trending_index.get_search(search_key)
+    stale = trending_index.stale_ids(video_ids)          # videos.list로 다시 받을 ID
+    trending_index.upsert_videos(fetched_videos)
+    videos = trending_index.get_videos(video_ids)
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+DB_PATH = os.environ.get("YOUTUBE_TRENDING_DB", os.path.join(PROJECT_ROOT, "data", "youtube_trending.db"))
+ENABLED = os.environ.get("YOUTUBE_TRENDING_INDEX_ENABLED", "1") != "0"
+SEARCH_TTL = float(os.environ.get("YOUTUBE_SEARCH_TTL", str(3 * 3600)))
+STATS_TTL = float(os.environ.get("YOUTUBE_STATS_TTL", str(30 * 60)))
+COMMENTS_TTL = float(os.environ.get("YOUTUBE_COMMENTS_TTL", str(6 * 3600)))
+COMMENTS_GROWTH = 1.2          # 댓글 수가 이 배율 이상 늘면 만료 전이라도 다시 받음
+SNAPSHOT_RETENTION = 7 * 86400
+
+VIDEO_FIELDS = [
+    "video_id", "title", "channel_title", "channel_id", "published_at", "description",
+    "view_count", "like_count", "comment_count", "duration_seconds", "thumbnail_url",
+]
+
+_lock = threading.Lock()
+_conn = None
+_last_purge = 0.0
+
+
+def _db() -> sqlite3.Connection:
+    """SQLite 연결 (프로세스당 하나, 스레드 간 공유는 _lock으로 직렬화)"""
+    global _conn
+    if _conn is None:
+        os.makedirs(os.path.dirname(DB_PATH), exist_ok=True)
+        conn = sqlite3.connect(DB_PATH, check_same_thread=False, timeout=30)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS videos (
+                video_id TEXT PRIMARY KEY,
+                title TEXT,
+                channel_title TEXT,
+                channel_id TEXT,
+                published_at TEXT,
+                description TEXT,
+                view_count INTEGER,
+                like_count INTEGER,
+                comment_count INTEGER,
+                duration_seconds INTEGER,
+                thumbnail_url TEXT,
+                first_seen REAL,
+                fetched_at REAL
+            )
+        """)
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS snapshots (
+                video_id TEXT,
+                fetched_at REAL,
+                view_count INTEGER,
+                like_count INTEGER,
+                comment_count INTEGER
+            )
+        """)
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS searches (
+                search_key TEXT PRIMARY KEY,
+                video_ids TEXT,
+                fetched_at REAL
+            )
+        """)
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS comments (
+                video_id TEXT PRIMARY KEY,
+                comment_count INTEGER,
+                max_results INTEGER,
+                comments TEXT,
+                fetched_at REAL
+            )
+        """)
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_snapshots_video ON snapshots(video_id, fetched_at)")
+        conn.commit()
+        _conn = conn
+    return _conn
+
+
+def _purge(conn: sqlite3.Connection):
+    """오래된 스냅샷/검색 삭제 (_lock 보유 상태, 한 시간에 한 번)"""
+    global _last_purge
+    now = time.time()
+    if now - _last_purge < 3600:
+        return
+    _last_purge = now
+    conn.execute("DELETE FROM snapshots WHERE fetched_at < ?", (now - SNAPSHOT_RETENTION,))
+    conn.execute("DELETE FROM searches WHERE fetched_at < ?", (now - SNAPSHOT_RETENTION,))
+    conn.commit()
+
+
+def search_key(**params) -> str:
+    """검색 조건 → 저장 키 (인자 순서와 무관)"""
+    return json.dumps(params, ensure_ascii=False, sort_keys=True)
+
+
+def get_search(key: str, max_age: float = SEARCH_TTL):
+    """저장된 검색 결과 영상 ID 목록 (없거나 만료면 None)"""
+    if not ENABLED:
+        return None
+    with _lock:
+        row = _db().execute(
+            "SELECT video_ids FROM searches WHERE search_key = ? AND fetched_at >= ?",
+            (key, time.time() - max_age)
+        ).fetchone()
+    return json.loads(row[0]) if row else None
+
+
+def put_search(key: str, video_ids: list):
+    if not ENABLED:
+        return
+    with _lock:
+        conn = _db()
+        conn.execute(
+            "INSERT OR REPLACE INTO searches (search_key, video_ids, fetched_at) VALUES (?, ?, ?)",
+            (key, json.dumps(list(video_ids)), time.time())
+        )
+        conn.commit()
+
+
+def stale_ids(video_ids: list, max_age: float = STATS_TTL) -> list:
+    """통계를 다시 받아야 하는 ID (처음 보거나 스냅샷이 max_age보다 오래됨, 입력 순서 유지)"""
+    if not ENABLED:
+        return list(video_ids)
+    if not video_ids:
+        return []
+    placeholders = ",".join("?" * len(video_ids))
+    with _lock:
+        fresh = {
+            row[0] for row in _db().execute(
+                f"SELECT video_id FROM videos WHERE video_id IN ({placeholders}) AND fetched_at >= ?",
+                (*video_ids, time.time() - max_age)
+            )
+        }
+    return [video_id for video_id in video_ids if video_id not in fresh]
+
+
+def upsert_videos(videos: list):
+    """videos.list 결과 저장 (최신 스냅샷 갱신 + 스냅샷 이력 추가, 처음 본 시각 유지)"""
+    if not ENABLED or not videos:
+        return
+    now = time.time()
+    with _lock:
+        conn = _db()
+        _purge(conn)
+        conn.executemany(
+            f"INSERT INTO videos ({', '.join(VIDEO_FIELDS)}, first_seen, fetched_at) "
+            f"VALUES ({', '.join('?' * (len(VIDEO_FIELDS) + 2))}) "
+            f"ON CONFLICT(video_id) DO UPDATE SET "
+            + ", ".join(f"{field} = excluded.{field}" for field in VIDEO_FIELDS[1:])
+            + ", fetched_at = excluded.fetched_at",
+            [tuple(video.get(field) for field in VIDEO_FIELDS) + (now, now) for video in videos]
+        )
+        conn.executemany(
+            "INSERT INTO snapshots (video_id, fetched_at, view_count, like_count, comment_count) VALUES (?, ?, ?, ?, ?)",
+            [(video["video_id"], now, video.get("view_count", 0), video.get("like_count", 0),
+              video.get("comment_count", 0)) for video in videos]
+        )
+        conn.commit()
+
+
+def get_videos(video_ids: list) -> dict:
+    """{영상 ID: 최신 스냅샷 dict} (저장된 것만)"""
+    if not ENABLED or not video_ids:
+        return {}
+    placeholders = ",".join("?" * len(video_ids))
+    with _lock:
+        rows = _db().execute(
+            f"SELECT {', '.join(VIDEO_FIELDS)}, first_seen, fetched_at FROM videos WHERE video_id IN ({placeholders})",
+            tuple(video_ids)
+        ).fetchall()
+    videos = {}
+    for row in rows:
+        video = dict(zip(VIDEO_FIELDS + ["first_seen", "fetched_at"], row))
+        videos[video["video_id"]] = video
+    return videos
+
+
+def view_growth(video_ids: list) -> dict:
+    """{영상 ID: 첫 스냅샷 대비 조회수 증가량} (스냅샷이 2개 이상인 영상만)"""
+    if not ENABLED or not video_ids:
+        return {}
+    placeholders = ",".join("?" * len(video_ids))
+    with _lock:
+        rows = _db().execute(
+            f"SELECT video_id, MAX(view_count) - MIN(view_count), COUNT(*) FROM snapshots "
+            f"WHERE video_id IN ({placeholders}) GROUP BY video_id",
+            tuple(video_ids)
+        ).fetchall()
+    return {video_id: growth for video_id, growth, count in rows if count > 1}
+
+
+def get_comments(video_id: str, max_results: int, comment_count: int = None, max_age: float = COMMENTS_TTL):
+    """
+    저장된 댓글 (없거나 만료, 더 많은 댓글이 필요하거나 댓글 수가 크게 늘었으면 None)
+
+    Args:
+        comment_count: 현재 스냅샷의 댓글 수 (저장 당시보다 COMMENTS_GROWTH배 이상이면 다시 받음)
+    """
+    if not ENABLED:
+        return None
+    with _lock:
+        row = _db().execute(
+            "SELECT comment_count, max_results, comments FROM comments WHERE video_id = ? AND fetched_at >= ?",
+            (video_id, time.time() - max_age)
+        ).fetchone()
+    if not row:
+        return None
+    stored_count, stored_max, comments = row
+    comments = json.loads(comments)
+    if max_results > stored_max and len(comments) >= stored_max:
+        return None
+    if comment_count is not None and stored_count and comment_count >= stored_count * COMMENTS_GROWTH:
+        return None
+    return comments[:max_results]
+
+
+def put_comments(video_id: str, comments: list, max_results: int, comment_count: int = None):
+    if not ENABLED:
+        return
+    with _lock:
+        conn = _db()
+        conn.execute(
+            "INSERT OR REPLACE INTO comments (video_id, comment_count, max_results, comments, fetched_at) "
+            "VALUES (?, ?, ?, ?, ?)",
+            (video_id, comment_count or 0, max_results, json.dumps(comments, ensure_ascii=False), time.time())
+        )
+        conn.commit()
@@ -3,17 +3,25 @@
 
 YouTube Data API를 사용하여 트렌딩 쇼츠 검색 및 분석
 + Google News 연동으로 원본 자료 확보
+
+검색 결과/통계 스냅샷/댓글은 trending_index(SQLite)에 저장해서,
+같은 날 주제를 여러 번 골라도 새 영상과 통계가 오래된 영상만 API로 다시 받습니다.
 """
 
 import os
 import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
-from typing import List, Dict, Any, Optional
+from functools import lru_cache
+from typing import List, Dict, Any, Optional, Tuple
 from urllib.parse import quote_plus
 
 from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
 
+from . import trending_index
+
 # feedparser (뉴스 검색용)
 try:
     import feedparser
@@ -161,13 +169,38 @@ def enrich_topic_with_news(topic: Dict[str, Any]) -> Dict[str, Any]:
 
 # ========== YouTube API ==========
 
+COMMENT_WORKERS = 4            # 댓글 동시 조회 수
+VIDEOS_LIST_CHUNK = 50         # videos.list 한 번에 조회 가능한 최대 ID 수
+
+_client_local = threading.local()
+
+
 def get_youtube_client():
-    """YouTube Data API 클라이언트 생성"""
+    """
+    YouTube Data API 클라이언트 (스레드마다 하나 생성 후 재사용)
+
+    googleapiclient 클라이언트는 스레드 간 공유가 안전하지 않아서 스레드 로컬로 보관합니다.
+    """
     api_key = os.environ.get("YOUTUBE_API_KEY")
     if not api_key:
         raise ValueError("YOUTUBE_API_KEY 환경변수가 설정되지 않았습니다")
 
-    return build("youtube", "v3", developerKey=api_key)
+    cached = getattr(_client_local, "client", None)
+    if cached is not None and cached[0] == api_key:
+        return cached[1]
+
+    youtube = build("youtube", "v3", developerKey=api_key)
+    _client_local.client = (api_key, youtube)
+    return youtube
+
+
+def _numpy():
+    """numpy 지연 import (없으면 None)"""
+    try:
+        import numpy
+        return numpy
+    except ImportError:
+        return None
 
 
 # 연예인/유명인 이름 DB (자주 등장하는 인물)
@@ -253,66 +286,53 @@ def search_trending_shorts(
         ]
     """
     try:
-        youtube = get_youtube_client()
-
         # 검색 시간 범위 설정
-        published_after = (datetime.now(timezone.utc) - timedelta(hours=hours_ago)).isoformat()
+        cutoff = datetime.now(timezone.utc) - timedelta(hours=hours_ago)
+        published_after = cutoff.isoformat()
 
-        print(f"[YouTube] 검색 중: '{query}' (최근 {hours_ago}시간, {order}순)")
-
-        # 1단계: 검색
-        search_response = youtube.search().list(
-            q=query,
-            part="snippet",
-            type="video",
-            videoDuration="short",  # Shorts (60초 이하)
-            order=order,
-            publishedAfter=published_after,
-            regionCode=region_code,
-            maxResults=max_results,
-            relevanceLanguage="ko",
-        ).execute()
-
-        video_ids = [item["id"]["videoId"] for item in search_response.get("items", [])]
+        # 1단계: 검색 (같은 조건의 최근 검색 결과가 있으면 재사용 - search.list는 100 유닛)
+        key = trending_index.search_key(
+            q=query, max_results=max_results, hours_ago=hours_ago, order=order, region_code=region_code,
+        )
+        video_ids = trending_index.get_search(key)
+        if video_ids is None:
+            print(f"[YouTube] 검색 중: '{query}' (최근 {hours_ago}시간, {order}순)")
+
+            search_response = get_youtube_client().search().list(
+                q=query,
+                part="snippet",
+                type="video",
+                videoDuration="short",  # Shorts (60초 이하)
+                order=order,
+                publishedAfter=published_after,
+                regionCode=region_code,
+                maxResults=max_results,
+                relevanceLanguage="ko",
+            ).execute()
+
+            video_ids = [item["id"]["videoId"] for item in search_response.get("items", [])]
+            trending_index.put_search(key, video_ids)
+        else:
+            print(f"[YouTube] 검색 재사용: '{query}' ({len(video_ids)}개, search.list 생략)")
 
         if not video_ids:
             print("[YouTube] 검색 결과 없음")
             return []
 
-        # 2단계: 비디오 상세 정보 조회
-        videos_response = youtube.videos().list(
-            part="snippet,statistics,contentDetails",
-            id=",".join(video_ids),
-        ).execute()
+        # 2단계: 비디오 상세 정보 (새 영상/통계가 오래된 영상만 조회)
+        videos = _load_videos(video_ids)
 
         results = []
-        for item in videos_response.get("items", []):
-            video_id = item["id"]
-            snippet = item.get("snippet", {})
-            statistics = item.get("statistics", {})
-            content_details = item.get("contentDetails", {})
-
-            # 영상 길이 파싱 (PT45S → 45초)
-            duration_str = content_details.get("duration", "PT0S")
-            duration_seconds = parse_duration(duration_str)
-
+        for video_id in video_ids:
+            video = videos.get(video_id)
             # Shorts는 60초 이하만
-            if duration_seconds > 60:
+            if not video or video["duration_seconds"] > 60:
                 continue
-
-            results.append({
-                "video_id": video_id,
-                "title": snippet.get("title", ""),
-                "channel_title": snippet.get("channelTitle", ""),
-                "channel_id": snippet.get("channelId", ""),
-                "published_at": snippet.get("publishedAt", ""),
-                "description": snippet.get("description", ""),
-                "view_count": int(statistics.get("viewCount", 0)),
-                "like_count": int(statistics.get("likeCount", 0)),
-                "comment_count": int(statistics.get("commentCount", 0)),
-                "duration_seconds": duration_seconds,
-                "thumbnail_url": snippet.get("thumbnails", {}).get("high", {}).get("url", ""),
-            })
+            # 재사용한 검색 결과에서 시간 범위를 벗어난 영상 제외
+            published = _parse_published(video["published_at"])
+            if published and published < cutoff:
+                continue
+            results.append(video)
 
         # 조회수순 정렬
         results.sort(key=lambda x: x["view_count"], reverse=True)
@@ -328,6 +348,68 @@ def search_trending_shorts(
         return []
 
 
+def _video_from_item(item: Dict[str, Any]) -> Dict[str, Any]:
+    """videos.list 항목 → 영상 dict"""
+    snippet = item.get("snippet", {})
+    statistics = item.get("statistics", {})
+    content_details = item.get("contentDetails", {})
+
+    return {
+        "video_id": item["id"],
+        "title": snippet.get("title", ""),
+        "channel_title": snippet.get("channelTitle", ""),
+        "channel_id": snippet.get("channelId", ""),
+        "published_at": snippet.get("publishedAt", ""),
+        "description": snippet.get("description", ""),
+        "view_count": int(statistics.get("viewCount", 0)),
+        "like_count": int(statistics.get("likeCount", 0)),
+        "comment_count": int(statistics.get("commentCount", 0)),
+        # 영상 길이 파싱 (PT45S → 45초)
+        "duration_seconds": parse_duration(content_details.get("duration", "PT0S")),
+        "thumbnail_url": snippet.get("thumbnails", {}).get("high", {}).get("url", ""),
+    }
+
+
+def _load_videos(video_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+    """
+    영상 ID → 최신 스냅샷 (인덱스에 없거나 통계가 오래된 영상만 videos.list로 조회)
+    """
+    stale = trending_index.stale_ids(video_ids)
+    fetched = {}
+    if stale:
+        youtube = get_youtube_client()
+        for i in range(0, len(stale), VIDEOS_LIST_CHUNK):
+            response = youtube.videos().list(
+                part="snippet,statistics,contentDetails",
+                id=",".join(stale[i:i + VIDEOS_LIST_CHUNK]),
+            ).execute()
+            for item in response.get("items", []):
+                video = _video_from_item(item)
+                fetched[video["video_id"]] = video
+        trending_index.upsert_videos(list(fetched.values()))
+
+    cached = len(video_ids) - len(stale)
+    if cached:
+        print(f"[YouTube] 통계 재사용 {cached}개, 조회 {len(stale)}개")
+
+    videos = {
+        video_id: {field: video[field] for field in trending_index.VIDEO_FIELDS}
+        for video_id, video in trending_index.get_videos(video_ids).items()
+    }
+    videos.update(fetched)
+    return videos
+
+
+def _parse_published(published_at: str) -> Optional[datetime]:
+    """YouTube publishedAt (2025-12-28T10:00:00Z) → datetime (실패 시 None)"""
+    if not published_at:
+        return None
+    try:
+        return datetime.fromisoformat(published_at.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+
+
 def parse_duration(duration_str: str) -> int:
     """
     ISO 8601 duration을 초로 변환
@@ -386,15 +468,52 @@ def calculate_engagement_score(video: Dict[str, Any]) -> float:
     return round(total, 1)
 
 
-def get_video_comments(
-    video_id: str,
-    max_results: int = 50,
-) -> List[Dict[str, Any]]:
+def calculate_engagement_scores(videos: List[Dict[str, Any]]) -> List[float]:
+    """
+    여러 영상의 참여도 점수를 한 번에 계산 (calculate_engagement_score와 같은 값)
+
+    조회수/좋아요/댓글/경과 시간을 배열로 모아 numpy로 한 번에 계산합니다.
+    numpy가 없으면 영상별로 계산합니다.
     """
-    영상 댓글 가져오기
+    np = _numpy()
+    if np is None or not videos:
+        return [calculate_engagement_score(v) for v in videos]
+
+    now = datetime.now(timezone.utc)
+    views = np.array([v.get("view_count", 0) for v in videos], dtype=np.float64)
+    likes = np.array([v.get("like_count", 0) for v in videos], dtype=np.float64)
+    comments = np.array([v.get("comment_count", 0) for v in videos], dtype=np.float64)
+    hours_old = np.array([_hours_old(v.get("published_at", ""), now) for v in videos], dtype=np.float64)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        view_score = np.minimum(views / 10000, 100)
+        like_ratio = np.where(views > 0, likes / views * 100, 0)
+        like_score = np.minimum(like_ratio * 10, 100)
+        comment_score = np.minimum(comments / 10, 100)
+        # 발행 시각을 모르면 100점 (calculate_engagement_score와 동일)
+        recency_score = np.where(np.isnan(hours_old), 100, np.maximum(0, 100 - hours_old * 4))
+
+    total = view_score * 0.4 + like_score * 0.3 + comment_score * 0.2 + recency_score * 0.1
+    return [round(float(t), 1) for t in total]
+
+
+def _hours_old(published_at: str, now: datetime) -> float:
+    """발행 후 경과 시간 (시간 단위, 알 수 없으면 nan)"""
+    if not published_at:
+        return float("nan")
+    try:
+        pub_time = datetime.fromisoformat(published_at.replace("Z", "+00:00"))
+        return (now - pub_time).total_seconds() / 3600
+    except Exception:
+        return float("nan")
+
+
+def _fetch_video_comments(video_id: str, max_results: int) -> Tuple[List[Dict[str, Any]], bool]:
+    """
+    commentThreads.list 호출
 
     Returns:
-        [{"text": "...", "likes": 10, "author": "..."}, ...]
+        (댓글 목록, 저장 가능 여부) - 일시적 오류는 저장하지 않음
     """
     try:
         youtube = get_youtube_client()
@@ -417,18 +536,73 @@ def get_video_comments(
                 "published_at": snippet.get("publishedAt", ""),
             })
 
-        return comments
+        return comments, True
 
     except HttpError as e:
         # 댓글 비활성화된 영상
         if "commentsDisabled" in str(e):
             print(f"[YouTube] 댓글 비활성화: {video_id}")
-        else:
-            print(f"[YouTube] 댓글 조회 실패: {e}")
-        return []
+            return [], True
+        print(f"[YouTube] 댓글 조회 실패: {e}")
+        return [], False
     except Exception as e:
         print(f"[YouTube] 댓글 조회 오류: {e}")
-        return []
+        return [], False
+
+
+def get_video_comments(
+    video_id: str,
+    max_results: int = 50,
+) -> List[Dict[str, Any]]:
+    """
+    영상 댓글 가져오기 (저장된 댓글이 유효하면 API 호출 생략)
+
+    Returns:
+        [{"text": "...", "likes": 10, "author": "..."}, ...]
+    """
+    return get_comments_batch([video_id], max_results=max_results).get(video_id, [])
+
+
+def get_comments_batch(
+    video_ids: List[str],
+    max_results: int = 50,
+) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    여러 영상의 댓글을 한 번에 가져오기
+
+    저장된 댓글은 만료 전이고 댓글 수가 크게 늘지 않았으면 재사용하고,
+    나머지는 COMMENT_WORKERS개 스레드로 동시에 조회합니다.
+
+    Returns:
+        {video_id: [{"text": "...", "likes": 10, "author": "..."}, ...]}
+    """
+    video_ids = list(dict.fromkeys(v for v in video_ids if v))
+    snapshots = trending_index.get_videos(video_ids)
+
+    results = {}
+    missing = []
+    for video_id in video_ids:
+        comment_count = snapshots.get(video_id, {}).get("comment_count")
+        cached = trending_index.get_comments(video_id, max_results, comment_count=comment_count)
+        if cached is None:
+            missing.append(video_id)
+        else:
+            results[video_id] = cached
+
+    if missing:
+        with ThreadPoolExecutor(max_workers=min(COMMENT_WORKERS, len(missing))) as pool:
+            fetched = pool.map(lambda vid: _fetch_video_comments(vid, max_results), missing)
+            for video_id, (comments, cacheable) in zip(missing, fetched):
+                results[video_id] = comments
+                if cacheable:
+                    trending_index.put_comments(
+                        video_id, comments, max_results,
+                        comment_count=snapshots.get(video_id, {}).get("comment_count"),
+                    )
+
+    if len(video_ids) > 1 or not missing:
+        print(f"[YouTube] 댓글: {len(video_ids)}개 영상 (재사용 {len(video_ids) - len(missing)}, 조회 {len(missing)})")
+    return results
 
 
 def extract_celebrity_from_title(title: str) -> Optional[str]:
@@ -457,6 +631,23 @@ def extract_celebrity_from_title(title: str) -> Optional[str]:
     return None
 
 
+# 이슈 키워드
+ISSUE_KEYWORDS = [
+    "논란", "갑질", "폭로", "고백", "결혼", "이혼", "열애", "파혼",
+    "컴백", "사과", "해명", "근황", "복귀", "은퇴", "탈퇴", "소식",
+]
+
+
+@lru_cache(maxsize=4096)
+def _detect_title(title: str) -> Tuple[Optional[str], Optional[str]]:
+    """제목 → (연예인, 이슈 키워드) (같은 영상 제목은 다시 분석하지 않음)"""
+    celebrity = extract_celebrity_from_title(title)
+    if not celebrity:
+        return None, None
+    found_issue = next((kw for kw in ISSUE_KEYWORDS if kw in title), None)
+    return celebrity, found_issue
+
+
 def extract_trending_topics(videos: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
     """
     트렌딩 쇼츠에서 주제 추출 (연예인 중심)
@@ -478,26 +669,18 @@ def extract_trending_topics(videos: List[Dict[str, Any]]) -> List[Dict[str, Any]
     # 연예인별 영상 그룹화
     celebrity_videos = defaultdict(list)
 
-    # 이슈 키워드
-    issue_keywords = [
-        "논란", "갑질", "폭로", "고백", "결혼", "이혼", "열애", "파혼",
-        "컴백", "사과", "해명", "근황", "복귀", "은퇴", "탈퇴", "소식",
-    ]
+    # 참여도 점수는 이미 계산된 값(search_shorts_by_category)을 쓰고, 없는 영상만 한 번에 계산
+    unscored = [v for v in videos if "engagement_score" not in v]
+    scores = dict(zip(map(id, unscored), calculate_engagement_scores(unscored)))
 
-    for video in videos:
-        title = video.get("title", "")
+    def engagement(video):
+        return video["engagement_score"] if "engagement_score" in video else scores[id(video)]
 
-        # 연예인 이름 추출
-        celebrity = extract_celebrity_from_title(title)
+    for video in videos:
+        # 연예인 이름 + 이슈 키워드 추출
+        celebrity, found_issue = _detect_title(video.get("title", ""))
 
         if celebrity:
-            # 이슈 키워드 추출
-            found_issue = None
-            for kw in issue_keywords:
-                if kw in title:
-                    found_issue = kw
-                    break
-
             video["detected_celebrity"] = celebrity
             video["detected_issue"] = found_issue or "소식"
             celebrity_videos[celebrity].append(video)
@@ -527,7 +710,7 @@ def extract_trending_topics(videos: List[Dict[str, Any]]) -> List[Dict[str, Any]
             "issue": main_issue,
             "video_count": len(unique_vids),
             "total_views": sum(v.get("view_count", 0) for v in unique_vids),
-            "avg_engagement": sum(calculate_engagement_score(v) for v in unique_vids) / len(unique_vids),
+            "avg_engagement": sum(engagement(v) for v in unique_vids) / len(unique_vids),
             "sample_videos": unique_vids[:3],
         })
 
@@ -550,7 +733,7 @@ def extract_trending_topics(videos: List[Dict[str, Any]]) -> List[Dict[str, Any]
                 "issue": "트렌딩",
                 "video_count": 1,
                 "total_views": video.get("view_count", 0),
-                "avg_engagement": calculate_engagement_score(video),
+                "avg_engagement": engagement(video),
                 "sample_videos": [video],
             })
 
@@ -592,19 +775,26 @@ def search_shorts_by_category(
     all_videos = []
     seen_ids = set()
 
-    for query in category_queries:
-        videos = search_trending_shorts(
-            query=query,
-            max_results=max_results // len(category_queries),
-            hours_ago=hours_ago,
-        )
-
+    # 검색어별 검색 동시 실행 (결과 병합 순서는 검색어 순서 유지)
+    with ThreadPoolExecutor(max_workers=len(category_queries)) as pool:
+        search_results = list(pool.map(
+            lambda query: search_trending_shorts(
+                query=query,
+                max_results=max_results // len(category_queries),
+                hours_ago=hours_ago,
+            ),
+            category_queries,
+        ))
+
+    for videos in search_results:
         for v in videos:
             if v["video_id"] not in seen_ids:
-                v["engagement_score"] = calculate_engagement_score(v)
                 all_videos.append(v)
                 seen_ids.add(v["video_id"])
 
+    for v, score in zip(all_videos, calculate_engagement_scores(all_videos)):
+        v["engagement_score"] = score
+
     # 참여도순 정렬
     all_videos.sort(key=lambda x: x["engagement_score"], reverse=True)
 
@@ -663,11 +853,11 @@ def get_best_shorts_topic(
                 best_topic = topic
                 best_topic["category"] = category
 
-                # 상위 영상의 댓글 수집
-                if topic["sample_videos"]:
-                    top_video = topic["sample_videos"][0]
-                    comments = get_video_comments(top_video["video_id"], max_results=20)
-                    best_topic["top_comments"] = comments[:10]
+    # 최종 주제의 상위 영상 댓글만 수집 (후보마다 조회하지 않음)
+    if best_topic and best_topic["sample_videos"]:
+        top_video = best_topic["sample_videos"][0]
+        comments = get_video_comments(top_video["video_id"], max_results=20)
+        best_topic["top_comments"] = comments[:10]
 
     if best_topic:
         print(f"[YouTube] ✅ 최적 주제: {best_topic['topic']} (참여도 {best_score:.1f})")
@@ -132,11 +132,11 @@ def generate_multi_voice_tts(
             "timeline": [...]  # SRT용 타임라인
         }
     """
-    # 임포트는 여기서 (drama_server와의 의존성)
+    # 공통 TTS 모듈 사용 (drama_server 전체 로드 없이)
     import sys
     sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
 
-    from drama_server import (
+    from scripts.common.tts import (
         is_chirp3_voice,
         is_gemini_voice,
         parse_chirp3_voice,
@@ -350,7 +350,7 @@ def generate_single_voice_tts(
     import sys
     sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
 
-    from drama_server import (
+    from scripts.common.tts import (
         is_chirp3_voice,
         parse_chirp3_voice,
         generate_chirp3_tts,
@@ -14,13 +14,14 @@ from typing import Dict, Any, Optional, List
 
 from openai import OpenAI
 
+from scripts.common.llm_clients import require_client
+
 from .config import (
     SERIES_INFO,
     VOICE_MAP,
     MAIN_CHARACTER_TAGS,
     SCRIPT_CONFIG,
     EPISODE_TEMPLATES,
-    OPENROUTER_BASE_URL,
     CLAUDE_MODEL,
     CHARACTER_APPEARANCES,
     IMAGE_STYLE,
@@ -455,10 +456,7 @@ def generate_episode_script(
     print(f"[WUXIA-SCRIPT] 캐릭터: {', '.join(characters)}")
 
     try:
-        client = OpenAI(
-            api_key=api_key,
-            base_url=OPENROUTER_BASE_URL,
-        )
+        client = require_client("openrouter", api_key=api_key)  # 공유 클라이언트 (keep-alive)
 
         response = client.chat.completions.create(
             model=CLAUDE_MODEL,
@@ -635,10 +633,7 @@ def generate_youtube_metadata(script: str, episode: int, title: str) -> Dict[str
 }}"""
 
     try:
-        client = OpenAI(
-            api_key=api_key,
-            base_url=OPENROUTER_BASE_URL,
-        )
+        client = require_client("openrouter", api_key=api_key)  # 공유 클라이언트 (keep-alive)
 
         response = client.chat.completions.create(
             model=CLAUDE_MODEL,
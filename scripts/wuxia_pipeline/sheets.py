@@ -22,7 +22,7 @@ SHEET_NAME = SERIES_INFO["title"]  # "혈영"
 def get_sheets_service():
     """Google Sheets 서비스 객체 가져오기"""
     try:
-        from drama_server import get_sheets_service_account
+        from scripts.common.sheets_utils import get_sheets_service_account
         return get_sheets_service_account()
     except Exception as e:
         print(f"[WUXIA-SHEETS] 서비스 연결 실패: {e}")
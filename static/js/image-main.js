@@ -1339,7 +1339,7 @@ const ImageMain = {
           <div class="scene-info">
             <div class="scene-info-top">
               <span class="scene-number">${idx + 1}</span>
-              <button class="btn-scene-regenerate" onclick="ImageMain.generateSceneImage(${idx})" title="다시 생성">🔄</button>
+              <button class="btn-scene-regenerate" onclick="ImageMain.generateSceneImage(${idx}, 0, true)" title="다시 생성">🔄</button>
             </div>
             <p class="scene-narration" title="${this.escapeHtml(narration)}">${this.escapeHtml(shortNarration)}</p>
           </div>
@@ -1361,8 +1361,9 @@ const ImageMain = {
 
   /**
    * 단일 씬 이미지 생성 (3회 자동 재시도)
+   * regenerate: '다시 생성' 버튼 - 서버 이미지 캐시를 건너뛰고 새로 생성
    */
-  async generateSceneImage(idx, retryCount = 0) {
+  async generateSceneImage(idx, retryCount = 0, regenerate = false) {
     const MAX_RETRIES = 3;
     const scene = this.analyzedData?.scenes?.[idx];
     if (!scene || !scene.image_prompt) {
@@ -1386,7 +1387,8 @@ const ImageMain = {
           prompt: scene.image_prompt,
           imageProvider: model,
           style: style,
-          size: ratio
+          size: ratio,
+          regenerate: regenerate
         })
       });
 
@@ -1409,7 +1411,7 @@ const ImageMain = {
       if (retryCount < MAX_RETRIES) {
         console.log(`[ImageMain] Retrying scene ${idx + 1}... (${retryCount + 1}/${MAX_RETRIES})`);
         await this.sleep(1000);  // 1초 대기 후 재시도
-        return await this.generateSceneImage(idx, retryCount + 1);
+        return await this.generateSceneImage(idx, retryCount + 1, regenerate);
       }
 
       // 최대 재시도 실패
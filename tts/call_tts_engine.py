@@ -40,9 +40,9 @@ def generate_tts_output(step1_output: Dict[str, Any]) -> Dict[str, Any]:
         return _generate_rule_based_output(step1_output)
 
     try:
-        from openai import OpenAI
+        from scripts.common.llm_clients import require_client
 
-        client = OpenAI(api_key=api_key)
+        client = require_client("openai", api_key=api_key)
         system_prompt = load_system_prompt()
 
         print("[GPT] Calling GPT for TTS-friendly script generation...")
@@ -403,7 +403,7 @@ def check_youtube_quota_before_pipeline(channel_id=None):
     try:
         from google.oauth2.credentials import Credentials
         from google.auth.transport.requests import Request
-        from googleapiclient.discovery import build
+        from google_clients import build_client
 
         def try_quota_check(project_suffix):
             """특정 프로젝트로 할당량 테스트"""
@@ -440,7 +440,7 @@ def check_youtube_quota_before_pipeline(channel_id=None):
             # API 호출로 할당량 테스트
             # search.list (100 units)를 사용하여 더 정확한 할당량 확인
             # 업로드에 1600 units 필요하므로, 100 units도 못 쓰면 업로드 불가
-            youtube = build('youtube', 'v3', credentials=creds)
+            youtube = build_client('youtube', 'v3', creds)
             try:
                 # search.list 테스트 (100 units) - 더 정확한 할당량 확인
                 youtube.search().list(part='id', q='test', maxResults=1, type='video').execute()